@@ -5,11 +5,12 @@ The main agent that orchestrates all AWS architecture drawing capabilities.
 """
 
 import logging
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from pathlib import Path
 
 from knowledge_base import AWSKnowledgeBase
 from pptx_converter import PPTXToReactFlowConverter
+from validator import ArchitectureValidator, DiagramGraph
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,7 @@ class AWSDrawingAgent:
         
         # Initialize PPTX converter
         self.pptx_converter = PPTXToReactFlowConverter()
+        self.validator = ArchitectureValidator()
         
         # Store API key for LLM operations
         self.openai_api_key = openai_api_key
@@ -60,7 +62,8 @@ class AWSDrawingAgent:
         self.diagram_generator = DiagramGenerator(
             openai_api_key=openai_api_key,
             services_list=services_list,
-            reference_architectures=self.knowledge_base.architectures
+            reference_architectures=self.knowledge_base.architectures,
+            architecture_index=self.knowledge_base.architecture_index,
         )
         
         logger.info(f"Agent initialized with {len(self.knowledge_base.services)} services "
@@ -79,31 +82,29 @@ class AWSDrawingAgent:
         logger.info(f"Converting architecture: {pptx_path}")
         return self.pptx_converter.convert_file(pptx_path)
     
-    def convert_all_architectures(self, output_dir: str = None) -> List[Dict]:
+    def convert_all_architectures(self, output_dir: str = None, force: bool = False) -> List[Dict]:
         """
-        Convert all 70 reference architectures to React Flow format.
+        Convert the reference architectures to React Flow format.
+        Only new or changed PPTX files are reconverted.
         
         Args:
             output_dir: Directory to save converted diagrams
+                (defaults to <architectures_dir>/converted)
+            force: Reconvert every file, even if unchanged
             
         Returns:
             List of conversion results
         """
-        if not output_dir:
-            output_dir = "/home/kingju/Documents/cloudmigrate-saas/aws_architecture_diagrams/converted"
-        
-        # Get architectures directory from knowledge base
-        architectures = self.knowledge_base.list_architectures()
-        if not architectures:
-            logger.warning("No architectures found in knowledge base")
+        arch_dir = self.knowledge_base.architectures_dir
+        if not arch_dir:
+            logger.warning("No architectures directory configured in knowledge base")
             return []
         
-        # Get directory from first architecture
-        first_arch = architectures[0]
-        arch_dir = Path(first_arch["file_path"]).parent
+        if not output_dir:
+            output_dir = str(Path(arch_dir) / "converted")
         
         logger.info(f"Converting all architectures from {arch_dir}")
-        return self.pptx_converter.convert_all_architectures(str(arch_dir), output_dir)
+        return self.pptx_converter.convert_all_architectures(str(arch_dir), output_dir, force=force)
     
     def get_service_info(self, service_id: str) -> Optional[Dict]:
         """
@@ -124,17 +125,19 @@ class AWSDrawingAgent:
         
         return service
     
-    def search_services(self, query: str) -> List[Dict]:
+    def search_services(self, query: str, limit: int = None, category: str = None) -> List[Dict]:
         """
-        Search for AWS services by name or description.
+        Search for AWS services by id, name, alias or documentation name.
         
         Args:
-            query: Search query
+            query: Search query (prefixes and small typos are matched)
+            limit: Maximum number of results (all matches if None)
+            category: Optional category filter
             
         Returns:
-            List of matching services
+            List of matching services, best match first
         """
-        return self.knowledge_base.search_services(query)
+        return self.knowledge_base.search_services(query, limit=limit, category=category)
     
     def list_architectures(self, category: str = None) -> List[Dict]:
         """
@@ -180,35 +183,12 @@ class AWSDrawingAgent:
         Returns:
             Validation results with suggestions and warnings
         """
-        results = {
-            "valid": True,
-            "warnings": [],
-            "suggestions": [],
-            "best_practices": [],
-        }
-        
-        # Extract services from diagram
-        services = []
-        for node in diagram.get("nodes", []):
-            service_id = node.get("data", {}).get("service_id")
-            if service_id:
-                services.append(service_id)
-        
-        # Check for common patterns and best practices
-        if "ec2" in services and "vpc" not in services:
-            results["warnings"].append("EC2 instances should be in a VPC")
-        
-        if "rds" in services and "vpc" not in services:
-            results["warnings"].append("RDS should be in a VPC")
-        
-        if "lambda" in services and "rds" in services:
-            results["suggestions"].append("Lambda accessing RDS should be in a VPC")
-        
-        if "ec2" in services and "alb" not in services and "nlb" not in services:
-            results["suggestions"].append("Consider adding a load balancer for high availability")
+        graph = DiagramGraph.from_react_flow(diagram)
+        results = self.validator.validate_graph(graph).to_dict()
+        results["best_practices"] = []
         
         # Add best practices for each service
-        for service_id in set(services):
+        for service_id in sorted(graph.services):
             practices = self.knowledge_base.get_best_practices(service_id)
             if practices:
                 results["best_practices"].extend([
@@ -216,8 +196,6 @@ class AWSDrawingAgent:
                     for practice in practices
                 ])
         
-        results["valid"] = len(results["warnings"]) == 0
-        
         return results
     
     def suggest_architecture(self, requirements: str) -> List[Dict]:
@@ -232,7 +210,7 @@ class AWSDrawingAgent:
         """
         return self.knowledge_base.suggest_architecture(requirements)
     
-    def generate_diagram_from_text(self, description: str) -> Dict:
+    async def generate_diagram_from_text(self, description: str) -> Dict:
         """
         Generate a diagram from a text description.
         Uses LLM to understand requirements and create diagram.
@@ -256,9 +234,9 @@ class AWSDrawingAgent:
                 }
             }
         
-        return self.diagram_generator.generate(description)
+        return await self.diagram_generator.generate(description)
     
-    def generate_diagram_with_explanation(self, description: str) -> Dict:
+    async def generate_diagram_with_explanation(self, description: str) -> Dict:
         """
         Generate a diagram AND explanation from a text description.
         Uses LLM to create diagram and explain the architecture.
@@ -278,7 +256,28 @@ class AWSDrawingAgent:
                 "metadata": {"status": "error", "error": "Diagram generator not initialized"}
             }
         
-        return self.diagram_generator.generate_with_explanation(description)
+        return await self.diagram_generator.generate_with_explanation(description)
+    
+    async def stream_diagram_with_explanation(self, description: str) -> AsyncIterator[Dict]:
+        """
+        Stream a diagram and its explanation from a text description.
+        Nodes and edges are yielded as the model produces them.
+        
+        Args:
+            description: Text description of desired architecture
+            
+        Yields:
+            Event dicts ("node", "edge", "explanation", "diagram", "complete",
+            or "error")
+        """
+        logger.info(f"Streaming diagram with explanation: {description[:100]}...")
+        
+        if not self.diagram_generator:
+            yield {"type": "error", "message": "Diagram generator not initialized"}
+            return
+        
+        async for event in self.diagram_generator.stream_with_explanation(description):
+            yield event
     
     def export_diagram(self, diagram: Dict, format: str = "json") -> str:
         """
@@ -301,12 +300,5 @@ class AWSDrawingAgent:
         return {
             "services_loaded": len(self.knowledge_base.services),
             "architectures_loaded": len(self.knowledge_base.architectures),
-            "categories": {
-                "compute": len([s for s in self.knowledge_base.services.values() if s["category"] == "compute"]),
-                "storage": len([s for s in self.knowledge_base.services.values() if s["category"] == "storage"]),
-                "database": len([s for s in self.knowledge_base.services.values() if s["category"] == "database"]),
-                "networking": len([s for s in self.knowledge_base.services.values() if s["category"] == "networking"]),
-                "security": len([s for s in self.knowledge_base.services.values() if s["category"] == "security"]),
-                "other": len([s for s in self.knowledge_base.services.values() if s["category"] == "other"]),
-            }
+            "categories": self.knowledge_base.service_index.category_counts(),
         }
@@ -13,7 +13,9 @@ import uuid
 import logging
 from typing import List, Optional, Dict, Any, Set
 from pydantic import BaseModel
-from openai import OpenAI
+
+from arena_auditor import AuditReport, audit_submission, default_feedback
+from async_runtime import get_async_client
 
 from aws_service_url_mapping import AWS_SERVICE_URL_MAPPING
 
@@ -354,12 +356,12 @@ def get_valid_service_ids() -> Set[str]:
 class ArchitectArenaGenerator:
     """Generates Architect Arena puzzles using the Drawing Agent's knowledge base."""
     
-    def __init__(self, openai_api_key: str, model: str = "gpt-4.1"):
+    def __init__(self, openai_api_key: Optional[str], model: str = "gpt-4.1"):
         self.api_key = openai_api_key
         self.model = model
         self.valid_service_ids = get_valid_service_ids()
     
-    def generate_puzzle(
+    async def generate_puzzle(
         self,
         user_level: str = "intermediate",
         cert_code: str = "SAA-C03",
@@ -421,7 +423,7 @@ class ArchitectArenaGenerator:
         ])
         
         # Generate puzzle via LLM
-        result = self._generate_puzzle_json(
+        result = await self._generate_puzzle_json(
             user_level=user_level,
             cert_name=cert_name,
             focus_areas=focus_areas,
@@ -433,7 +435,7 @@ class ArchitectArenaGenerator:
         # Parse and validate the result
         return self._parse_puzzle_result(result, user_level, cert_name, difficulty)
     
-    def _generate_puzzle_json(
+    async def _generate_puzzle_json(
         self,
         user_level: str,
         cert_name: str,
@@ -443,9 +445,7 @@ class ArchitectArenaGenerator:
         services_list: str,
     ) -> Dict:
         """Generate puzzle JSON from LLM."""
-        import httpx
-        http_client = httpx.Client()
-        client = OpenAI(api_key=self.api_key, http_client=http_client)
+        client = get_async_client(self.api_key)
         
         request_id = uuid.uuid4().hex
         
@@ -537,7 +537,7 @@ Requirements:
 
 Generate the puzzle JSON now."""
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=self.model,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -649,7 +649,7 @@ Generate the puzzle JSON now."""
             topics=result.get("topics", []),
         )
     
-    def audit_puzzle(
+    async def audit_puzzle(
         self,
         puzzle_title: str,
         puzzle_brief: str,
@@ -663,6 +663,10 @@ Generate the puzzle JSON now."""
         """
         Audit a user's puzzle submission.
         
+        The score is computed locally by arena_auditor from containment and
+        edge comparisons. The LLM (when an API key is set) only rewrites the
+        findings into feedback and can never change the score.
+        
         Args:
             puzzle_title: The puzzle title
             puzzle_brief: The puzzle brief/scenario
@@ -676,57 +680,67 @@ Generate the puzzle JSON now."""
         Returns:
             Audit result with score, feedback, etc.
         """
-        import httpx
-        http_client = httpx.Client()
-        client = OpenAI(api_key=self.api_key, http_client=http_client)
+        report = audit_submission(expected_hierarchy, expected_connections, nodes, connections)
+        result = {
+            "score": report.score,
+            "correct": report.correct,
+            "missing": report.missing,
+            "suggestions": report.suggestions,
+            "feedback": default_feedback(report),
+            "metrics": report.metrics(),
+        }
         
-        # Build diagram JSON for audit
-        diagram_json = json.dumps({
-            "nodes": nodes,
-            "connections": connections,
-        }, indent=2)
+        if not self.api_key:
+            return result
         
-        audit_prompt = f"""You are auditing an AWS architecture PUZZLE submission.
-
-## CRITICAL: This is a PUZZLE game, NOT a free-form design!
-The user was given PRE-GENERATED puzzle pieces (AWS services) scattered randomly.
-Their job was to:
-1. PLACE pieces correctly (drag into proper containers)
-2. CONNECT pieces correctly (draw edges between related services)
-
-## DO NOT give credit for:
-- Having the services present (they were pre-generated)
-- The types of services used (the puzzle defined these)
-
-## DO give credit/penalties for:
-- Correct PLACEMENT: Is EC2 inside a private subnet? Is ALB in public subnet?
-- Correct CONNECTIONS: Did user connect ALB -> EC2 -> RDS?
-- Correct HIERARCHY: Proper nesting of containers
+        try:
+            prose = await self._audit_feedback(puzzle_title, puzzle_brief, report, user_level)
+        except Exception as e:
+            logger.warning(f"Arena feedback generation failed, using default: {e}")
+            return result
+        
+        if isinstance(prose.get("feedback"), str) and prose["feedback"].strip():
+            result["feedback"] = prose["feedback"].strip()
+        if isinstance(prose.get("suggestions"), list) and prose["suggestions"]:
+            result["suggestions"] = [str(s) for s in prose["suggestions"]][:5]
+        return result
+    
+    async def _audit_feedback(
+        self,
+        puzzle_title: str,
+        puzzle_brief: str,
+        report: AuditReport,
+        user_level: Optional[str],
+    ) -> Dict:
+        """Turn audit findings into encouraging prose (score is already fixed)."""
+        client = get_async_client(self.api_key)
+        
+        findings = json.dumps({
+            "score": report.score,
+            "correct": report.correct[:10],
+            "missing": report.missing[:10],
+            "issues": report.suggestions[:10],
+        })
+        
+        feedback_prompt = f"""You are giving feedback on an AWS architecture PUZZLE submission.
+The submission has already been scored. Do NOT re-score it or invent new problems.
 
-## Puzzle Context
-Title: {puzzle_title}
+Puzzle: {puzzle_title}
 Brief: {puzzle_brief}
-Expected Hierarchy: {json.dumps(expected_hierarchy)}
-Expected Connections: {json.dumps(expected_connections)}
+Player level: {user_level or "intermediate"}
 
-## User's Submission
-```json
-{diagram_json}
-```
+Audit findings:
+{findings}
 
-## Scoring Guide (out of 100)
-- 0-30: Pieces not placed in containers, no connections
-- 31-50: Some correct placements, few connections
-- 51-70: Most placements correct, most connections made
-- 71-90: All placements correct, all connections, good hierarchy
-- 91-100: Perfect placement, connections, and hierarchy
+Write a short encouraging message and up to 3 hints that explain WHY the missing
+placements and connections matter in AWS (do not just repeat the findings).
 
 Return ONLY valid JSON:
-{{"score": <0-100>, "correct": ["achievements"], "missing": ["issues as risks"], "suggestions": ["hints"], "feedback": "encouraging message"}}"""
+{{"feedback": "encouraging message", "suggestions": ["hints"]}}"""
 
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=self.model,
-            messages=[{"role": "user", "content": audit_prompt}],
+            messages=[{"role": "user", "content": feedback_prompt}],
             response_format={"type": "json_object"},
             temperature=0.3,
         )
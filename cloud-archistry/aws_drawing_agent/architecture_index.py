@@ -0,0 +1,274 @@
+"""
+Reference Architecture Index
+============================
+Load-time similarity index over the converted reference architectures.
+
+Everything a lookup needs is computed once when the knowledge base loads:
+per-architecture service sets, layout bounds and compact service/edge lists,
+plus an inverted index from terms to TF-IDF weights over each architecture's
+name (boosted) and diagram labels. A query only touches the postings of its
+own terms, so the cost is O(matched candidates), not O(architectures x nodes).
+
+Candidates are ranked by TF-IDF cosine on text plus Jaccard overlap between
+the services the description mentions and the architecture's services.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+TEXT_WEIGHT = 0.6
+SERVICE_WEIGHT = 0.4
+NAME_BOOST = 3        # name terms count this many times in the document vector
+SYNONYM_WEIGHT = 0.5  # weight of expanded keyword-group terms in the query
+MIN_SCORE = 0.05
+MAX_SERVICE_NODES = 15
+MAX_EDGES = 20
+
+# Terms that describe the same kind of architecture (query expansion)
+KEYWORD_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "serverless": ("serverless", "lambda", "function"),
+    "api": ("api", "gateway", "rest", "graphql"),
+    "data": ("data", "pipeline", "kinesis", "stream", "analytic", "lake"),
+    "web": ("web", "application", "tier", "frontend", "hosting"),
+    "microservices": ("microservice", "ecs", "container", "docker", "kubernete"),
+    "ml": ("machine", "learning", "sagemaker", "ml", "ai", "model"),
+    "iot": ("iot", "sensor", "device", "edge", "connected"),
+    "ecommerce": ("ecommerce", "commerce", "shop", "retail", "payment", "cart"),
+    "mobile": ("mobile", "app", "ios", "android"),
+    "gaming": ("game", "gaming", "multiplayer", "session"),
+    "healthcare": ("health", "medical", "patient", "clinical"),
+    "financial": ("financial", "banking", "payment", "fraud"),
+}
+
+_STOPWORDS = frozenset("""
+a an and are as at be by can for from has have how in into is it its of on or
+that the their this to using use used via was we which will with you your aws
+amazon architecture reference diagram need needs want build create design
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased content words with a light plural strip ("streams" -> "stream")."""
+    tokens = []
+    for word in _TOKEN_RE.findall(text.lower()):
+        if word in _STOPWORDS or (len(word) < 3 and word not in ("ai", "ml", "s3")):
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+_SYNONYMS: Dict[str, Set[str]] = {}
+for _terms in KEYWORD_GROUPS.values():
+    for _term in _terms:
+        _SYNONYMS.setdefault(_term, set()).update(_terms)
+
+
+@dataclass
+class ArchitectureEntry:
+    """Precomputed view of one reference architecture."""
+    id: str
+    name: str
+    services: FrozenSet[str]
+    service_nodes: List[Dict]
+    edges: List[Dict]
+    layout_bounds: Dict[str, float]
+    total_nodes: int
+    norm: float = 0.0
+    terms: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        """JSON-safe form for the packed architecture store."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "services": sorted(self.services),
+            "service_nodes": self.service_nodes,
+            "edges": self.edges,
+            "layout_bounds": self.layout_bounds,
+            "total_nodes": self.total_nodes,
+            "terms": self.terms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ArchitectureEntry":
+        return cls(**{**data, "services": frozenset(data.get("services", ()))})
+
+    def as_reference(self) -> Dict:
+        """Shape returned by DiagramGenerator._find_similar_architecture."""
+        return {
+            "name": self.name,
+            "services": self.service_nodes,
+            "edges": self.edges,
+            "layout_bounds": self.layout_bounds,
+            "total_nodes": self.total_nodes,
+        }
+
+
+def summarize_architecture(arch_id: str, name: str, diagram: Dict) -> ArchitectureEntry:
+    """Reduce a converted diagram to everything the index needs."""
+    nodes = diagram.get("nodes", []) or []
+    service_nodes: List[Dict] = []
+    services: Set[str] = set()
+    xs: List[float] = []
+    ys: List[float] = []
+    terms: Dict[str, int] = {}
+
+    for token in tokenize(name):
+        terms[token] = terms.get(token, 0) + NAME_BOOST
+    for node in nodes:
+        data = node.get("data", {}) or {}
+        service_id = data.get("service_id")
+        if service_id:
+            services.add(service_id)
+            if len(service_nodes) < MAX_SERVICE_NODES:
+                service_nodes.append({
+                    "id": node.get("id"),
+                    "service_id": service_id,
+                    "label": data.get("label", ""),
+                    "position": node.get("position", {}),
+                    "type": node.get("type", "awsService"),
+                })
+        for token in tokenize(str(data.get("label", ""))[:500]):
+            terms[token] = terms.get(token, 0) + 1
+        pos = node.get("position", {}) or {}
+        if pos.get("x") is not None and pos.get("y") is not None:
+            xs.append(pos["x"])
+            ys.append(pos["y"])
+
+    bounds = (
+        {"min_x": min(xs), "max_x": max(xs), "min_y": min(ys), "max_y": max(ys)}
+        if xs else {"min_x": 0, "max_x": 1200, "min_y": 0, "max_y": 800}
+    )
+    return ArchitectureEntry(
+        id=arch_id,
+        name=name,
+        services=frozenset(services),
+        service_nodes=service_nodes,
+        edges=(diagram.get("edges", []) or [])[:MAX_EDGES],
+        layout_bounds=bounds,
+        total_nodes=len(nodes),
+        terms=terms,
+    )
+
+
+class ArchitectureIndex:
+    """Inverted index over reference architectures for similarity lookups."""
+
+    def __init__(self):
+        self.entries: Dict[str, ArchitectureEntry] = {}
+        self.postings: Dict[str, List[Tuple[str, float]]] = {}
+        self.service_postings: Dict[str, Set[str]] = {}
+        self.service_aliases: Dict[str, str] = {}
+        self._idf: Dict[str, float] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, arch_id: str, name: str, diagram: Dict) -> None:
+        """Index one architecture's converted diagram."""
+        self.add_entry(summarize_architecture(arch_id, name, diagram))
+
+    def add_entry(self, entry: ArchitectureEntry) -> None:
+        """Index a precomputed entry (e.g. from the packed architecture store)."""
+        self.entries[entry.id] = entry
+        self._dirty = True
+
+    def build(self) -> None:
+        """(Re)compute IDF weights, postings and service aliases."""
+        total = len(self.entries)
+        document_frequency: Dict[str, int] = {}
+        for entry in self.entries.values():
+            for term in entry.terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        self.postings = {}
+        self.service_postings = {}
+        self.service_aliases = {}
+        for entry in self.entries.values():
+            weights = {
+                term: (1 + math.log(count)) * math.log(1 + total / document_frequency[term])
+                for term, count in entry.terms.items()
+            }
+            entry.norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                self.postings.setdefault(term, []).append((entry.id, weight / entry.norm))
+            for service_id in entry.services:
+                self.service_postings.setdefault(service_id, set()).add(entry.id)
+                self.service_aliases[service_id] = service_id
+                self.service_aliases[service_id.replace("-", "")] = service_id
+                self.service_aliases[service_id.replace("-", " ")] = service_id
+        self._idf = {term: math.log(1 + total / df) for term, df in document_frequency.items()}
+        self._dirty = False
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def services_in(self, text: str) -> Set[str]:
+        """Indexed service ids mentioned in free text ("api gateway" -> api-gateway)."""
+        words = _TOKEN_RE.findall(text.lower())
+        found = set()
+        for i, word in enumerate(words):
+            for candidate in (word, " ".join(words[i:i + 2]), " ".join(words[i:i + 3])):
+                service_id = self.service_aliases.get(candidate)
+                if service_id:
+                    found.add(service_id)
+        return found
+
+    def search(
+        self,
+        description: str,
+        services: Optional[Iterable[str]] = None,
+        limit: int = 5,
+    ) -> List[Tuple[float, ArchitectureEntry]]:
+        """Best matching architectures as (score, entry), highest first."""
+        if self._dirty:
+            self.build()
+        if not self.entries:
+            return []
+
+        query: Dict[str, float] = {}
+        for token in tokenize(description):
+            query[token] = query.get(token, 0.0) + 1.0
+            for synonym in _SYNONYMS.get(token, ()):
+                if synonym != token:
+                    query[synonym] = query.get(synonym, 0.0) + SYNONYM_WEIGHT
+        query_services = set(services or ()) | self.services_in(description)
+
+        # Accumulate cosine numerators from postings of query terms only
+        query_weights = {t: w * self._idf[t] for t, w in query.items() if t in self._idf}
+        query_norm = math.sqrt(sum(w * w for w in query_weights.values())) or 1.0
+        text_scores: Dict[str, float] = {}
+        for term, weight in query_weights.items():
+            for arch_id, doc_weight in self.postings.get(term, ()):
+                text_scores[arch_id] = text_scores.get(arch_id, 0.0) + weight * doc_weight / query_norm
+
+        candidates = set(text_scores)
+        for service_id in query_services:
+            candidates |= self.service_postings.get(service_id, set())
+
+        ranked = []
+        for arch_id in candidates:
+            entry = self.entries[arch_id]
+            text = text_scores.get(arch_id, 0.0)
+            if query_services:
+                union = len(query_services | entry.services)
+                jaccard = len(query_services & entry.services) / union if union else 0.0
+                score = TEXT_WEIGHT * text + SERVICE_WEIGHT * jaccard
+            else:
+                score = text
+            if score >= MIN_SCORE:
+                ranked.append((round(score, 4), entry))
+        ranked.sort(key=lambda item: (-item[0], item[1].id))
+        return ranked[:limit]
+
+    def best_match(self, description: str, services: Optional[Iterable[str]] = None) -> Optional[ArchitectureEntry]:
+        results = self.search(description, services, limit=1)
+        return results[0][1] if results else None
@@ -0,0 +1,198 @@
+"""
+Packed Architecture Store
+=========================
+Single-file, memory-mapped store for the converted reference architectures.
+
+Layout of `architectures.pack`:
+    header   8-byte magic, u64 table offset, u64 table length
+    blobs    each diagram as compact UTF-8 JSON, back to back
+    table    JSON: source fingerprint plus, per architecture, its blob
+             offset/length and the precomputed index summary
+
+Opening the store maps the file read-only and parses only the table, so
+startup costs one small JSON parse instead of decoding every diagram. The
+mapped pages live in the OS page cache and are shared by every worker. A
+diagram is decoded only when it is requested. The pack is rebuilt
+automatically when the converted JSON files change, or ahead of time with:
+
+    python architecture_store.py aws_architecture_diagrams
+
+ARCHITECTURE_PACK overrides the pack location (useful when the diagrams
+directory is mounted read-only).
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from architecture_index import ArchitectureEntry, summarize_architecture
+from conversion_pipeline import MANIFEST_NAME
+
+logger = logging.getLogger(__name__)
+
+PACK_NAME = "architectures.pack"
+MAGIC = b"ARCHPK01"
+_HEADER = struct.Struct("<8sQQ")
+
+
+def _default_name(arch_id: str) -> str:
+    return arch_id.replace("-", " ").title()
+
+
+def _source_files(converted_dir: Path) -> List[Path]:
+    # Skip macOS metadata files and the conversion manifest
+    return sorted(
+        p for p in converted_dir.glob("*.json")
+        if not p.name.startswith("._") and p.name != MANIFEST_NAME
+    )
+
+
+def source_fingerprint(converted_dir: Path) -> str:
+    """Cheap change detector over file names, sizes and mtimes."""
+    digest = hashlib.sha1()
+    for path in _source_files(converted_dir):
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def build_pack(
+    converted_dir: Path,
+    pack_path: Optional[Path] = None,
+    name_for: Callable[[str], str] = _default_name,
+) -> int:
+    """Pack every converted diagram into one file. Returns the number packed."""
+    converted_dir = Path(converted_dir)
+    pack_path = Path(pack_path or converted_dir / PACK_NAME)
+    fingerprint = source_fingerprint(converted_dir)
+    records = []
+
+    # Write to a temp file in the same directory, then atomically replace,
+    # so workers starting concurrently never map a half-written pack
+    fd, tmp_name = tempfile.mkstemp(prefix=".architectures-", suffix=".pack", dir=pack_path.parent)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, 0, 0))
+            for path in _source_files(converted_dir):
+                arch_id = path.stem
+                try:
+                    with open(path, "r") as f:
+                        diagram = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to pack {path}: {e}")
+                    continue
+                blob = json.dumps(diagram, separators=(",", ":")).encode()
+                name = name_for(arch_id)
+                records.append({
+                    "id": arch_id,
+                    "name": name,
+                    "source": path.name,
+                    "offset": out.tell(),
+                    "length": len(blob),
+                    "summary": summarize_architecture(arch_id, name, diagram).to_dict(),
+                })
+                out.write(blob)
+
+            table = json.dumps(
+                {"fingerprint": fingerprint, "architectures": records},
+                separators=(",", ":"),
+            ).encode()
+            table_offset = out.tell()
+            out.write(table)
+            out.seek(0)
+            out.write(_HEADER.pack(MAGIC, table_offset, len(table)))
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, pack_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    logger.info(f"Packed {len(records)} architectures into {pack_path}")
+    return len(records)
+
+
+class ArchitectureStore:
+    """Read-only, memory-mapped view of a pack file."""
+
+    def __init__(self, pack_path: Path):
+        self.path = Path(pack_path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, table_offset, table_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or not table_offset:
+            self._mm.close()
+            raise ValueError(f"Not an architecture pack: {self.path}")
+        table = json.loads(self._mm[table_offset:table_offset + table_length])
+        self.fingerprint: str = table["fingerprint"]
+        self._records: Dict[str, Dict] = {r["id"]: r for r in table["architectures"]}
+
+    def __contains__(self, arch_id: str) -> bool:
+        return arch_id in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def records(self) -> Iterator[Dict]:
+        """Metadata for every packed architecture (id, name, source, ...)."""
+        return iter(self._records.values())
+
+    def summary(self, arch_id: str) -> ArchitectureEntry:
+        return ArchitectureEntry.from_dict(self._records[arch_id]["summary"])
+
+    def get_diagram(self, arch_id: str) -> Optional[Dict]:
+        """Decode one diagram from the mapped file (a fresh dict per call)."""
+        record = self._records.get(arch_id)
+        if record is None:
+            return None
+        start = record["offset"]
+        return json.loads(self._mm[start:start + record["length"]])
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def open_store(
+    converted_dir: Path,
+    pack_path: Optional[Path] = None,
+    name_for: Callable[[str], str] = _default_name,
+) -> Optional[ArchitectureStore]:
+    """
+    Open the pack for a converted/ directory, (re)building it if it is
+    missing or stale. Returns None if no usable pack can be produced
+    (e.g. read-only filesystem), so callers can fall back to plain JSON.
+    """
+    converted_dir = Path(converted_dir)
+    pack_path = Path(pack_path or os.getenv("ARCHITECTURE_PACK") or converted_dir / PACK_NAME)
+
+    if pack_path.exists():
+        try:
+            store = ArchitectureStore(pack_path)
+            if store.fingerprint == source_fingerprint(converted_dir):
+                return store
+            store.close()
+            logger.info("Architecture pack is stale, rebuilding")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable architecture pack {pack_path}: {e}")
+
+    try:
+        build_pack(converted_dir, pack_path, name_for)
+        return ArchitectureStore(pack_path)
+    except Exception as e:
+        logger.warning(f"Could not build architecture pack {pack_path}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    root = Path(sys.argv[1] if len(sys.argv) > 1 else "aws_architecture_diagrams")
+    target = Path(os.getenv("ARCHITECTURE_PACK") or root / "converted" / PACK_NAME)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    build_pack(root / "converted", target)
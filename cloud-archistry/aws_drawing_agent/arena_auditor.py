@@ -0,0 +1,248 @@
+"""
+Architect Arena Auditor
+=======================
+Deterministic scoring for Architect Arena submissions.
+
+The puzzle defines the pieces, so only two things are judged: where pieces
+were placed (containment against `expected_hierarchy`) and how they were
+wired (edges against `expected_connections`). Both are plain set and tree
+comparisons, so the score is computed here, reproducibly, in well under a
+millisecond for puzzle-sized diagrams. The LLM is only used afterwards to
+phrase feedback.
+
+Scoring (out of 100):
+    placement   45   children inside their expected container
+    connections 45   F1 of user edges against expected edges
+    hierarchy   10   nodes nested at their expected depth
+Components with nothing to check are dropped and the rest re-weighted.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+PLACEMENT_WEIGHT = 0.45
+CONNECTION_WEIGHT = 0.45
+HIERARCHY_WEIGHT = 0.10
+
+NESTED_CREDIT = 0.5  # expected container is an ancestor, but not the direct parent
+
+Edge = FrozenSet[str]  # canvas edges are undirected for scoring
+
+
+def _edge(a: str, b: str) -> Edge:
+    return frozenset((a, b))
+
+
+# =============================================================================
+# GRAPHS
+# =============================================================================
+
+class SubmissionGraph:
+    """User diagram indexed once: parents, depths, labels and edge set."""
+
+    def __init__(self, nodes: List[Dict], connections: List[Dict]):
+        self.labels: Dict[str, str] = {}
+        self.parent: Dict[str, str] = {}
+        for node in nodes:
+            node_id = node.get("id")
+            if not node_id:
+                continue
+            self.labels[node_id] = node.get("label") or node.get("service_id") or node_id
+            parent_id = node.get("parentId") or node.get("parent_id") or node.get("parentNode")
+            if parent_id:
+                self.parent[node_id] = parent_id
+
+        self.edges: Set[Edge] = set()
+        for conn in connections:
+            source = conn.get("from") or conn.get("source")
+            target = conn.get("to") or conn.get("target")
+            if source and target and source != target:
+                self.edges.add(_edge(source, target))
+
+    def ancestors(self, node_id: str) -> List[str]:
+        """Containers from the direct parent outwards (cycle-safe)."""
+        chain: List[str] = []
+        current = self.parent.get(node_id)
+        while current and current not in chain and current != node_id:
+            chain.append(current)
+            current = self.parent.get(current)
+        return chain
+
+    def depth(self, node_id: str) -> int:
+        return len(self.ancestors(node_id))
+
+    def label(self, node_id: str) -> str:
+        return self.labels.get(node_id, node_id)
+
+
+class ExpectedGraph:
+    """Puzzle answer key: parent of each expected child, depths and edges."""
+
+    def __init__(self, expected_hierarchy: Dict[str, List[str]], expected_connections: List[Dict]):
+        self.parent: Dict[str, str] = {}
+        for container, children in (expected_hierarchy or {}).items():
+            for child in children or []:
+                if child != container:
+                    self.parent.setdefault(child, container)
+        self.members: Set[str] = set(self.parent) | set(self.parent.values())
+
+        self.required: Dict[Edge, Tuple[str, str]] = {}
+        self.optional: Dict[Edge, Tuple[str, str]] = {}
+        for conn in expected_connections or []:
+            source, target = conn.get("from_piece"), conn.get("to_piece")
+            if not source or not target or source == target:
+                continue
+            bucket = self.required if conn.get("required", True) else self.optional
+            bucket.setdefault(_edge(source, target), (source, target))
+
+    def depth(self, node_id: str) -> int:
+        depth, current, seen = 0, self.parent.get(node_id), {node_id}
+        while current and current not in seen:
+            seen.add(current)
+            depth += 1
+            current = self.parent.get(current)
+        return depth
+
+
+# =============================================================================
+# AUDIT
+# =============================================================================
+
+@dataclass
+class AuditReport:
+    """Numeric audit of one submission plus itemized findings."""
+    score: int
+    placement_accuracy: Optional[float]
+    edge_precision: Optional[float]
+    edge_recall: Optional[float]
+    edge_f1: Optional[float]
+    depth_accuracy: Optional[float]
+    depth_errors: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    correct: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+    audit_ms: float = 0.0
+
+    def metrics(self) -> Dict:
+        return {
+            "placement_accuracy": self.placement_accuracy,
+            "edge_precision": self.edge_precision,
+            "edge_recall": self.edge_recall,
+            "edge_f1": self.edge_f1,
+            "depth_accuracy": self.depth_accuracy,
+            "depth_errors": self.depth_errors,
+            "audit_ms": self.audit_ms,
+        }
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def audit_submission(
+    expected_hierarchy: Dict[str, List[str]],
+    expected_connections: List[Dict],
+    nodes: List[Dict],
+    connections: List[Dict],
+) -> AuditReport:
+    """Score a submission against the puzzle's expected hierarchy and connections."""
+    started = time.perf_counter()
+    user = SubmissionGraph(nodes, connections)
+    expected = ExpectedGraph(expected_hierarchy, expected_connections)
+    correct: List[str] = []
+    missing: List[str] = []
+    suggestions: List[str] = []
+
+    # Placement: is each expected child inside its expected container?
+    placement_credit = 0.0
+    for child, container in expected.parent.items():
+        if child not in user.labels:
+            missing.append(f"{user.label(child)} was never placed on the canvas")
+            continue
+        chain = user.ancestors(child)
+        if chain and chain[0] == container:
+            placement_credit += 1
+            correct.append(f"{user.label(child)} placed in {user.label(container)}")
+        elif container in chain:
+            placement_credit += NESTED_CREDIT
+            suggestions.append(
+                f"{user.label(child)} belongs directly in {user.label(container)}, not in {user.label(chain[0])}"
+            )
+        else:
+            actual = user.label(chain[0]) if chain else "no container"
+            missing.append(f"{user.label(child)} should be in {user.label(container)} (found in {actual})")
+    placement_accuracy = _ratio(placement_credit, len(expected.parent))
+
+    # Hierarchy depth: are containers themselves nested at the right level?
+    depth_errors: Dict[str, Dict[str, int]] = {}
+    for node_id in sorted(expected.members):
+        if node_id not in user.labels:
+            continue
+        want, got = expected.depth(node_id), user.depth(node_id)
+        if want != got:
+            depth_errors[node_id] = {"expected": want, "actual": got}
+    placed_members = sum(1 for n in expected.members if n in user.labels)
+    depth_accuracy = _ratio(placed_members - len(depth_errors), placed_members)
+    for node_id, err in sorted(depth_errors.items()):
+        if node_id not in expected.parent:  # child placements were reported above
+            suggestions.append(
+                f"{user.label(node_id)} is nested {err['actual']} levels deep, expected {err['expected']}"
+            )
+
+    # Connections: precision over user edges, recall over required edges
+    matched_required = user.edges & expected.required.keys()
+    matched_optional = user.edges & expected.optional.keys()
+    edge_precision = _ratio(len(matched_required) + len(matched_optional), len(user.edges))
+    edge_recall = _ratio(len(matched_required), len(expected.required))
+    if edge_precision is not None and edge_recall is not None:
+        total = edge_precision + edge_recall
+        edge_f1: Optional[float] = round(2 * edge_precision * edge_recall / total, 4) if total else 0.0
+    elif expected.required:
+        edge_f1 = 0.0  # expected edges but the user drew none
+    else:
+        edge_f1 = None
+
+    for edge_key, (source, target) in expected.required.items():
+        if edge_key in matched_required:
+            correct.append(f"Connected {user.label(source)} to {user.label(target)}")
+        else:
+            missing.append(f"Missing connection: {user.label(source)} to {user.label(target)}")
+    for edge_key in sorted(user.edges - expected.required.keys() - expected.optional.keys(), key=sorted):
+        a, b = sorted(edge_key)
+        suggestions.append(f"Connection {user.label(a)} to {user.label(b)} is not part of this architecture")
+
+    components = [
+        (PLACEMENT_WEIGHT, placement_accuracy),
+        (CONNECTION_WEIGHT, edge_f1),
+        (HIERARCHY_WEIGHT, depth_accuracy),
+    ]
+    weight = sum(w for w, value in components if value is not None)
+    score = round(100 * sum(w * value for w, value in components if value is not None) / weight) if weight else 0
+
+    return AuditReport(
+        score=score,
+        placement_accuracy=placement_accuracy,
+        edge_precision=edge_precision,
+        edge_recall=edge_recall,
+        edge_f1=edge_f1,
+        depth_accuracy=depth_accuracy,
+        depth_errors=depth_errors,
+        correct=correct,
+        missing=missing,
+        suggestions=suggestions,
+        audit_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
+
+
+def default_feedback(report: AuditReport) -> str:
+    """Plain feedback line used when no LLM is available or it fails."""
+    if report.score >= 91:
+        return "Excellent work - placement and wiring match the reference architecture."
+    if report.score >= 71:
+        return "Strong architecture! A few details to tighten up and it's perfect."
+    if report.score >= 51:
+        return "Good progress - most pieces are in place. Review the missing items below."
+    if report.score >= 31:
+        return "A solid start. Focus on putting services in the right containers and connecting them."
+    return "Keep going - drag pieces into their containers and draw the connections between them."
@@ -0,0 +1,124 @@
+"""
+Async Runtime
+=============
+Shared OpenAI clients and an offload executor for the drawing agent service.
+
+One AsyncOpenAI client per API key shares a single pooled httpx.AsyncClient,
+so LLM calls from async endpoints never block the event loop and never open
+a fresh connection pool per request. Remaining synchronous code (the Bug
+Bounty generator, PPTX conversion) runs through `offload`, a bounded thread
+pool, instead of on the event loop.
+
+Environment (all optional):
+    OPENAI_MAX_CONNECTIONS      Connections shared by all OpenAI clients (default 100)
+    OPENAI_TIMEOUT              Per-request timeout in seconds (default 120)
+    OFFLOAD_THREADS             Worker threads for blocking calls (default 16)
+"""
+
+import os
+import asyncio
+import hashlib
+import logging
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+REQUEST_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+OFFLOAD_THREADS = int(os.getenv("OFFLOAD_THREADS", "16"))
+MAX_CACHED_KEYS = 64  # users may bring their own API keys
+
+T = TypeVar("T")
+
+
+# =============================================================================
+# OPENAI CLIENTS
+# =============================================================================
+
+_async_http: Optional[httpx.AsyncClient] = None
+_sync_http: Optional[httpx.Client] = None
+_async_clients: "OrderedDict[str, AsyncOpenAI]" = OrderedDict()
+_sync_clients: "OrderedDict[str, OpenAI]" = OrderedDict()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS // 5)
+
+
+def _key_id(api_key: str) -> str:
+    # Never keep raw keys as dict keys (they end up in heap dumps and reprs)
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _cached(cache: OrderedDict, api_key: str, factory: Callable[[], Any]) -> Any:
+    key = _key_id(api_key)
+    client = cache.get(key)
+    if client is None:
+        client = factory()
+        cache[key] = client
+        while len(cache) > MAX_CACHED_KEYS:
+            cache.popitem(last=False)
+    cache.move_to_end(key)
+    return client
+
+
+def get_async_client(api_key: str) -> AsyncOpenAI:
+    """AsyncOpenAI client for an API key, sharing one pooled HTTP client."""
+    global _async_http
+    if _async_http is None:
+        _async_http = httpx.AsyncClient(limits=_limits(), timeout=REQUEST_TIMEOUT)
+    return _cached(
+        _async_clients,
+        api_key,
+        lambda: AsyncOpenAI(api_key=api_key, http_client=_async_http, timeout=REQUEST_TIMEOUT),
+    )
+
+
+def get_sync_client(api_key: str) -> OpenAI:
+    """OpenAI client for code that still runs synchronously (call it via offload)."""
+    global _sync_http
+    if _sync_http is None:
+        _sync_http = httpx.Client(limits=_limits(), timeout=REQUEST_TIMEOUT)
+    return _cached(
+        _sync_clients,
+        api_key,
+        lambda: OpenAI(api_key=api_key, http_client=_sync_http, timeout=REQUEST_TIMEOUT),
+    )
+
+
+# =============================================================================
+# OFFLOAD EXECUTOR
+# =============================================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+async def offload(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking or CPU-bound callable off the event loop."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=OFFLOAD_THREADS, thread_name_prefix="offload")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def close_runtime() -> None:
+    """Close shared HTTP clients and the offload executor (app shutdown)."""
+    global _async_http, _sync_http, _executor
+    _async_clients.clear()
+    _sync_clients.clear()
+    if _async_http is not None:
+        await _async_http.aclose()
+        _async_http = None
+    if _sync_http is not None:
+        _sync_http.close()
+        _sync_http = None
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -0,0 +1,72 @@
+"""
+Architecture Store Benchmark
+============================
+Compares knowledge-base startup with the packed, memory-mapped store against
+eagerly decoding every converted JSON diagram.
+
+Each mode runs in a fresh interpreter so import time and RSS are not shared.
+
+Run with: python bench_architecture_store.py [--runs 5]
+"""
+
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+HERE = Path(__file__).parent
+
+PROBE = r"""
+import sys, time, json, resource, logging
+sys.path.insert(0, {here!r})
+logging.disable(logging.CRITICAL)
+import knowledge_base
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+mode = {mode!r}
+if mode == "json":
+    knowledge_base.open_store = lambda *args, **kwargs: None  # force the eager JSON path
+before = rss_kb()
+start = time.perf_counter()
+kb = knowledge_base.AWSKnowledgeBase(architectures_dir={arch_dir!r})
+load_ms = (time.perf_counter() - start) * 1000
+arch_id = next(iter(kb.architecture_index.entries))
+start = time.perf_counter()
+kb.get_architecture(arch_id)["diagram"]
+fetch_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{"load_ms": load_ms, "fetch_ms": fetch_ms, "rss_delta_kb": rss_kb() - before}}))
+"""
+
+
+def run(mode: str, arch_dir: str) -> dict:
+    code = PROBE.format(here=str(HERE), mode=mode, arch_dir=arch_dir)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--dir", default=str(HERE / "aws_architecture_diagrams"))
+    args = parser.parse_args()
+
+    run("pack", args.dir)  # make sure the pack exists before timing
+    for mode in ("json", "pack"):
+        samples = [run(mode, args.dir) for _ in range(args.runs)]
+        print(
+            f"{mode:>4}: load {statistics.median(s['load_ms'] for s in samples):7.1f} ms  "
+            f"first diagram {statistics.median(s['fetch_ms'] for s in samples):5.2f} ms  "
+            f"RSS +{statistics.median(s['rss_delta_kb'] for s in samples) / 1024:5.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Concurrency Benchmark
+=====================
+Fires N simultaneous /diagrams/generate requests at the drawing agent and
+reports whether they overlap or serialize.
+
+The OpenAI API is replaced by a local stub server that answers every
+chat/embedding request after a fixed delay, so the numbers only reflect how
+the service schedules LLM calls. With blocking clients N requests take about
+N x the single-request time. With the async runtime they take about 1x.
+
+Run with: python bench_concurrency.py [--requests 20] [--delay 0.5]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+STUB_DIAGRAM = {
+    "services": [
+        {"id": "svc1", "service_id": "cloudfront", "label": "CDN", "tier": "edge"},
+        {"id": "svc2", "service_id": "alb", "label": "Load Balancer", "tier": "public"},
+        {"id": "svc3", "service_id": "ecs", "label": "App", "tier": "compute"},
+        {"id": "svc4", "service_id": "rds", "label": "Database", "tier": "data"},
+    ],
+    "connections": [
+        {"from": "svc1", "to": "svc2"},
+        {"from": "svc2", "to": "svc3"},
+        {"from": "svc3", "to": "svc4"},
+    ],
+}
+
+
+def start_stub_openai(delay: float) -> str:
+    """Start a fake OpenAI API on a free port and return its base URL."""
+    import uvicorn
+    from fastapi import FastAPI
+
+    stub = FastAPI()
+
+    @stub.post("/v1/chat/completions")
+    async def chat(body: dict):
+        await asyncio.sleep(delay)
+        wants_json = (body.get("response_format") or {}).get("type") in ("json_object", "json_schema")
+        content = json.dumps(STUB_DIAGRAM) if wants_json else "## Overview\nStub explanation."
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    @stub.post("/v1/embeddings")
+    async def embeddings(body: dict):
+        await asyncio.sleep(delay / 5)
+        return {
+            "object": "list",
+            "model": body.get("model", "stub"),
+            "data": [{"object": "embedding", "index": 0, "embedding": [0.0] * 1536}],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+        }
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v1"
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Worst delay seen by a ticker task - large values mean the loop was blocked."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(requests: int, delay: float) -> None:
+    import httpx
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        payload = {"description": "Three tier web application with a CDN, containers and a relational database"}
+
+        start = time.perf_counter()
+        response = await client.post("/diagrams/generate", json=payload)
+        single = time.perf_counter() - start
+        response.raise_for_status()
+        nodes = len(response.json()["nodes"])
+
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(measure_loop_lag(stop))
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/diagrams/generate", json=payload) for _ in range(requests)
+        ])
+        wall = time.perf_counter() - start
+        stop.set()
+        worst_lag = await lag_task
+
+    failed = sum(1 for r in responses if r.status_code != 200)
+    print(f"stub LLM delay:        {delay * 1000:.0f} ms per call")
+    print(f"single request:        {single * 1000:.0f} ms ({nodes} nodes)")
+    print(f"{requests} concurrent:         {wall * 1000:.0f} ms wall ({failed} failed)")
+    print(f"serialized estimate:   {single * requests * 1000:.0f} ms")
+    print(f"overlap factor:        {single * requests / wall:.1f}x (1.0x = fully serialized)")
+    print(f"worst event-loop lag:  {worst_lag * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.5, help="stub LLM latency in seconds")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_BASE_URL"] = start_stub_openai(args.delay)
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    asyncio.run(run(args.requests, args.delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Diagram Streaming Benchmark
+===========================
+Compares /diagrams/generate with /diagrams/generate/stream.
+
+The OpenAI API is replaced by a local stub that emits tokens at a fixed
+rate after a first-token delay, like a real model. It supports both
+streamed and blocking chat completions. The blocking endpoint returns
+after the full diagram plus the explanation. The streaming endpoint sends
+the first node after a few tokens, and runs the explanation while the
+connections are still being generated.
+
+Run with: python bench_diagram_stream.py [--services 24] [--ttft 0.4] [--tps 80]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+SERVICE_IDS = ["cloudfront", "waf", "alb", "ecs", "lambda", "rds", "elasticache", "s3",
+               "sqs", "sns", "cognito", "kms", "cloudwatch", "dynamodb", "nat-gateway", "api-gateway"]
+TIER_OF = {"cloudfront": "edge", "waf": "edge", "alb": "public", "nat-gateway": "public",
+           "api-gateway": "public", "ecs": "compute", "lambda": "compute", "rds": "data",
+           "elasticache": "data", "s3": "data", "dynamodb": "data", "sqs": "integration",
+           "sns": "integration", "cognito": "security", "kms": "security", "cloudwatch": "security"}
+CHARS_PER_TOKEN = 4
+EXPLANATION_TOKENS = 350
+
+
+def stub_diagram(size: int) -> dict:
+    services = []
+    for i in range(size):
+        service_id = SERVICE_IDS[i % len(SERVICE_IDS)]
+        services.append({"id": f"svc{i + 1}", "service_id": service_id,
+                         "label": f"{service_id.upper()} {i + 1}", "tier": TIER_OF[service_id]})
+    connections = [{"from": f"svc{i}", "to": f"svc{i + 1}"} for i in range(1, size)]
+    return {"services": services, "connections": connections}
+
+
+def start_stub_openai(diagram: dict, ttft: float, tps: float) -> str:
+    """Start a fake, token-paced OpenAI API on a free port and return its base URL."""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    stub = FastAPI()
+    diagram_text = json.dumps(diagram, indent=1)
+    explanation_text = "## Overview\n" + "word " * (EXPLANATION_TOKENS * CHARS_PER_TOKEN // 5)
+
+    def chunk(body: dict, content: str, finish_reason=None) -> str:
+        return "data: " + json.dumps({
+            "id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": finish_reason}],
+        }) + "\n\n"
+
+    @stub.post("/v1/chat/completions")
+    async def chat(body: dict):
+        wants_json = (body.get("response_format") or {}).get("type") in ("json_object", "json_schema")
+        content = diagram_text if wants_json else explanation_text
+        if body.get("stream"):
+            async def tokens():
+                await asyncio.sleep(ttft)
+                step = CHARS_PER_TOKEN * 4  # send 4 tokens per chunk
+                for i in range(0, len(content), step):
+                    yield chunk(body, content[i:i + step])
+                    await asyncio.sleep(4 / tps)
+                yield chunk(body, "", "stop")
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(tokens(), media_type="text/event-stream")
+
+        await asyncio.sleep(ttft + len(content) / CHARS_PER_TOKEN / tps)
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    @stub.post("/v1/embeddings")
+    async def embeddings(body: dict):
+        await asyncio.sleep(0.1)
+        return {
+            "object": "list",
+            "model": body.get("model", "stub"),
+            "data": [{"object": "embedding", "index": 0, "embedding": [0.0] * 1536}],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+        }
+
+    return serve(stub) + "/v1"
+
+
+def serve(app) -> str:
+    """Run an ASGI app with uvicorn in a daemon thread and return its base URL."""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run(expected_nodes: int) -> None:
+    import httpx
+    from main import app
+
+    # A real server - the in-process ASGI transport buffers streamed bodies
+    base_url = serve(app)
+    payload = {"description": "Serverless and container web platform with caching, queues and a relational database"}
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        start = time.perf_counter()
+        response = await client.post("/diagrams/generate", json=payload)
+        blocking = time.perf_counter() - start
+        response.raise_for_status()
+        blocking_nodes = len(response.json()["nodes"])
+
+        seen = {}
+        counts = {"node": 0, "edge": 0}
+        start = time.perf_counter()
+        async with client.stream("POST", "/diagrams/generate/stream", json=payload) as stream:
+            async for line in stream.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                event = json.loads(line[6:])
+                kind = event["type"]
+                counts[kind] = counts.get(kind, 0) + 1
+                seen.setdefault(kind, time.perf_counter() - start)
+                if kind == "complete":
+                    streamed_nodes = len(event["nodes"])
+                    timings = event["metadata"]["timings"]
+                elif kind == "error":
+                    raise RuntimeError(event["message"])
+
+    print(f"stub diagram:              {expected_nodes} services, {blocking_nodes} nodes with groups")
+    print(f"blocking /diagrams/generate: {blocking * 1000:7.0f} ms to any output")
+    print("streaming /diagrams/generate/stream:")
+    print(f"  first node               {seen['node'] * 1000:7.0f} ms")
+    print(f"  first edge               {seen['edge'] * 1000:7.0f} ms")
+    print(f"  explanation              {seen['explanation'] * 1000:7.0f} ms")
+    print(f"  final diagram            {seen['diagram'] * 1000:7.0f} ms ({streamed_nodes} nodes)")
+    print(f"  complete                 {seen['complete'] * 1000:7.0f} ms")
+    print(f"  events: {counts['node']} node, {counts['edge']} edge; server timings {timings}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--services", type=int, default=24)
+    parser.add_argument("--ttft", type=float, default=0.4, help="stub time to first token in seconds")
+    parser.add_argument("--tps", type=float, default=80, help="stub output tokens per second")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_BASE_URL"] = start_stub_openai(stub_diagram(args.services), args.ttft, args.tps)
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    asyncio.run(run(args.services))
+
+
+if __name__ == "__main__":
+    main()
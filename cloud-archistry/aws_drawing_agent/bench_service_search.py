@@ -0,0 +1,68 @@
+"""
+Service Search Benchmark
+========================
+Replays autocomplete keystrokes (every prefix of every service name, plus a
+few typos) against the old linear substring scan and the service index,
+with the result cache cold and warm.
+
+Run with: python bench_service_search.py [--rounds 20]
+"""
+
+import time
+import argparse
+import statistics
+
+from knowledge_base import AWSKnowledgeBase
+from service_index import normalize
+
+
+def linear_scan(services, query):
+    """The previous search_services implementation."""
+    query_lower = query.lower()
+    return [
+        service for service_id, service in services.items()
+        if query_lower in service_id.lower() or query_lower in service["name"].lower()
+    ]
+
+
+def keystrokes(services):
+    queries = []
+    for service in services.values():
+        name = service["name"].lower()
+        queries.extend(name[:end] for end in range(1, len(name) + 1))
+    queries.extend(["dynamdb", "lamda", "cloudfrnt", "elasticach", "kubernetes", "simple queue"])
+    return queries
+
+
+def per_query_us(fn, queries, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for query in queries:
+            fn(query)
+        samples.append((time.perf_counter() - start) / len(queries) * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    kb = AWSKnowledgeBase()
+    kb.load_services()
+    index = kb.service_index
+    queries = keystrokes(kb.services)
+
+    def cold(query):
+        # Bypass the result cache: the full prefix/infix/fuzzy lookup every time
+        return index._search_uncached(normalize(query), 25, None)
+
+    print(f"{len(kb.services)} services, {len(queries)} keystrokes")
+    print(f"linear scan   {per_query_us(lambda q: linear_scan(kb.services, q), queries, args.rounds):8.2f} us/query")
+    print(f"index (cold)  {per_query_us(cold, queries, args.rounds):8.2f} us/query")
+    print(f"index (warm)  {per_query_us(lambda q: index.search(q, limit=25), queries, args.rounds):8.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
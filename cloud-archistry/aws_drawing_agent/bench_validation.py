@@ -0,0 +1,104 @@
+"""
+Validation Engine Benchmark
+===========================
+Validates a large generated React Flow diagram (default 500 nodes: VPC,
+three AZs with public/private subnets, mixed services, chained edges) with:
+
+- engine:        parse once into the indexed graph, run every rule
+- reparse/rule:  every rule re-parses the diagram (the old per-rule rescans)
+- list scans:    placement + connection audit with linear node lookups, the
+                 way the client-side audit resolves parents and edge ends
+
+and prints the engine's per-rule timings.
+
+Run with: python bench_validation.py [--nodes 500] [--runs 20]
+"""
+
+import argparse
+import statistics
+import time
+
+from validator import ArchitectureValidator, DiagramGraph, RuleContext
+
+SERVICES = ["ec2", "rds", "lambda", "s3", "alb", "elasticache", "ecs", "dynamodb", "nat-gateway", "sqs"]
+
+
+def build_diagram(size: int) -> dict:
+    nodes = [{"id": "vpc", "type": "group", "data": {"label": "VPC", "isVPC": True}}]
+    subnets = []
+    for az in range(3):
+        nodes.append({"id": f"az{az}", "type": "awsService", "data": {"service_id": "availability-zone"},
+                      "parentId": "vpc"})
+        for kind in ("public", "private"):
+            subnet = f"{kind}{az}"
+            subnets.append(subnet)
+            nodes.append({"id": subnet, "type": "subnet", "data": {"subnetType": kind}, "parentId": f"az{az}"})
+    edges = []
+    for i in range(size - len(nodes)):
+        service_id = SERVICES[i % len(SERVICES)]
+        nodes.append({"id": f"n{i}", "type": "awsService", "parentId": subnets[i % len(subnets)],
+                      "data": {"service_id": service_id, "label": f"{service_id}-{i}"}})
+        if i:
+            edges.append({"id": f"e{i}", "source": f"n{i - 1}", "target": f"n{i}"})
+        if i > 7 and i % 4 == 0:
+            edges.append({"id": f"x{i}", "source": f"n{i}", "target": f"n{i - 7}"})
+    return {"nodes": nodes, "edges": edges}
+
+
+def list_scan_audit(diagram: dict) -> int:
+    """Per-node parent lookup and per-edge endpoint lookup by scanning the node list."""
+    nodes = diagram["nodes"]
+    issues = 0
+    for node in nodes:
+        parent = next((n for n in nodes if n["id"] == node.get("parentId")), None)
+        while parent is not None and parent.get("data", {}).get("subnetType") is None:
+            parent = next((n for n in nodes if n["id"] == parent.get("parentId")), None)
+        if parent is not None and node["data"].get("service_id") == "rds" and parent["data"]["subnetType"] == "public":
+            issues += 1
+    for edge in diagram["edges"]:
+        source = next((n for n in nodes if n["id"] == edge["source"]), None)
+        target = next((n for n in nodes if n["id"] == edge["target"]), None)
+        if source and target and source["data"].get("service_id") == target["data"].get("service_id"):
+            issues += 1
+    return issues
+
+
+def median_ms(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    validator = ArchitectureValidator()
+    engine = validator.engine
+    diagram = build_diagram(args.nodes)
+
+    context = RuleContext()
+
+    def reparse_per_rule():
+        for rule in engine.rules:
+            graph = DiagramGraph.from_react_flow(diagram)
+            if rule.applies(graph, context):
+                list(rule.check(graph, context))
+
+    report = engine.validate(diagram)
+    print(f"{report.node_count} nodes, {report.edge_count} edges, {len(report.findings)} findings")
+    print(f"engine        {median_ms(lambda: engine.validate(diagram), args.runs):8.2f} ms")
+    print(f"reparse/rule  {median_ms(reparse_per_rule, args.runs):8.2f} ms")
+    print(f"list scans    {median_ms(lambda: list_scan_audit(diagram), args.runs):8.2f} ms  (placement + connections only)")
+    print(f"\nparse         {report.parse_ms:8.3f} ms")
+    for rule_id, ms in sorted(report.rule_timings_ms.items(), key=lambda item: -item[1]):
+        print(f"  {rule_id:<22}{ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,8 +15,9 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pydantic import BaseModel
-from openai import OpenAI
-import httpx
+
+from async_runtime import get_async_client, get_sync_client, offload
+from claim_matcher import ClaimMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -47,13 +48,12 @@ async def fetch_knowledge_for_generation(
             return ""
         
         # Generate embedding for the search query
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        client = get_async_client(api_key)
         
         # Create search query combining cert code and topic
         search_query = f"{cert_code} {topic}"
         
-        response = client.embeddings.create(
+        response = await client.embeddings.create(
             model="text-embedding-3-small",
             input=search_query
         )
@@ -308,8 +308,7 @@ class BugBountyGenerator:
         
         if openai_api_key:
             try:
-                http_client = httpx.Client()
-                self.client = OpenAI(api_key=openai_api_key, http_client=http_client)
+                self.client = get_sync_client(openai_api_key)
                 logger.info("BugBountyGenerator initialized with OpenAI")
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI client: {e}")
@@ -369,8 +368,12 @@ class BugBountyGenerator:
                 logger.warning(f"Failed to fetch knowledge: {e}")
                 knowledge_context = ""
         
+        # The generation steps use the synchronous client, so run them on the
+        # offload executor to keep the event loop free while the LLM works
+        
         # Step 1: Generate the use case description with requirements
-        description = self._generate_description(
+        description = await offload(
+            self._generate_description,
             scenario=scenario,
             user_level=user_level,
             target_cert=target_cert,
@@ -379,7 +382,8 @@ class BugBountyGenerator:
         )
         
         # Step 2: Generate the flawed architecture diagram
-        diagram, bugs_in_diagram = self._generate_flawed_diagram(
+        diagram, bugs_in_diagram = await offload(
+            self._generate_flawed_diagram,
             scenario=scenario,
             description=description,
             user_level=user_level,
@@ -388,7 +392,8 @@ class BugBountyGenerator:
         )
         
         # Step 3: Generate hidden bugs (including diagram bugs + additional)
-        hidden_bugs = self._generate_hidden_bugs(
+        hidden_bugs = await offload(
+            self._generate_hidden_bugs,
             diagram=diagram,
             description=description,
             bugs_in_diagram=bugs_in_diagram,
@@ -396,7 +401,8 @@ class BugBountyGenerator:
         )
         
         # Step 4: Generate AWS environment with evidence
-        aws_environment = self._generate_aws_environment(
+        aws_environment = await offload(
+            self._generate_aws_environment,
             diagram=diagram,
             description=description,
             hidden_bugs=hidden_bugs,
@@ -961,8 +967,8 @@ Return ONLY valid JSON, no markdown."""
         user_level: Optional[str] = None,
     ) -> Dict:
         """
-        Validate a user's bug claim using semantic matching with LLM.
-        Provides certification-specific and skill-level appropriate feedback.
+        Validate a user's bug claim against a challenge's hidden bugs.
+        See validate_claim_from_bugs.
         
         Args:
             challenge: The challenge being played
@@ -973,179 +979,55 @@ Return ONLY valid JSON, no markdown."""
         Returns:
             Validation result with scoring and personalized feedback
         """
-        if not self.client:
-            return self._simple_validate(challenge, claim)
-        
-        target = claim.get("target_id", "")
-        bug_type = claim.get("bug_type", "")
-        severity = claim.get("severity", "")
-        user_claim = claim.get("claim", "")
-        evidence = claim.get("evidence", [])
-        confidence = claim.get("confidence", 50)
-        
-        # Prepare hidden bugs for comparison
-        bugs_summary = [
-            {
-                "id": bug.id,
-                "type": bug.type,
-                "severity": bug.severity,
-                "location": bug.location,
-                "description": bug.description,
-            }
-            for bug in challenge.hidden_bugs
-        ]
-        
-        # Build certification and skill level context
-        cert_context = ""
-        if cert_code:
-            cert_context = f"\n\nTARGET CERTIFICATION: {cert_code}\nProvide feedback relevant to this certification's exam focus areas."
-        
-        skill_context = ""
-        if user_level:
-            skill_level_guidance = {
-                "beginner": "Provide explicit, educational feedback. Explain WHY this is/isn't a bug and what to look for.",
-                "intermediate": "Provide feedback with best practices references. Guide them to understand the architectural implications.",
-                "advanced": "Provide concise feedback focused on edge cases and optimization opportunities.",
-                "expert": "Provide minimal feedback. Focus on enterprise-scale implications and compliance considerations."
-            }
-            skill_context = f"\n\nUSER SKILL LEVEL: {user_level}\n{skill_level_guidance.get(user_level, skill_level_guidance['intermediate'])}"
-        
-        prompt = f"""You are a strict Bug Bounty claim validator. Determine if the user ACTUALLY identified a real bug.{cert_context}{skill_context}
-
-HIDDEN BUGS IN THIS CHALLENGE:
-{json.dumps(bugs_summary, indent=2)}
-
-USER'S CLAIM:
-- Target: {target}
-- Bug Type: {bug_type}
-- Severity: {severity}
-- Description: {user_claim}
-- Evidence: {evidence}
-- Confidence: {confidence}%
-
-CRITICAL VALIDATION RULES:
-1. The user's DESCRIPTION is the PRIMARY factor for validation - NOT the metadata fields.
-2. The description MUST meaningfully explain what the bug is and why it's a problem.
-3. Vague, empty, or placeholder descriptions like "test", "bug", "issue", "problem", single words, or gibberish = AUTOMATIC REJECTION.
-4. Just selecting the right target/type/severity is NOT enough - the user must DESCRIBE the actual issue.
-5. The description should demonstrate understanding of the architectural flaw.
-
-MATCHING CRITERIA (all must be satisfied):
-- Description explains a specific issue (not vague or placeholder text)
-- The explained issue matches or relates to one of the hidden bugs
-- Target and bug type are reasonably aligned with the described issue
-
-OUTPUT FORMAT (JSON):
-{{
-  "matches_bug": true/false,
-  "matched_bug_id": "bug_1" or null,
-  "match_quality": "exact" / "partial" / "none",
-  "explanation": "Why this is/isn't a valid bug claim",
-  "pushback": "If rejected, explain what was wrong with the claim",
-  "hint": "If rejected, give a subtle hint to guide their thinking"
-}}
-
-IMPORTANT: Reject claims with lazy or meaningless descriptions. The user must demonstrate they understand the bug.
-Return ONLY valid JSON."""
-
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,  # Lower temperature for consistent validation
-                max_tokens=500,
-            )
-            
-            content = response.choices[0].message.content
-            result = self._extract_json(content)
-            
-            if result.get("matches_bug"):
-                # Find the matched bug for scoring
-                matched_bug = None
-                for bug in challenge.hidden_bugs:
-                    if bug.id == result.get("matched_bug_id"):
-                        matched_bug = bug
-                        break
-                
-                if matched_bug:
-                    # Calculate points
-                    severity_multiplier = {
-                        "critical": 2.0,
-                        "high": 1.5,
-                        "medium": 1.0,
-                        "low": 0.5,
-                    }.get(matched_bug.severity, 1.0)
-                    
-                    quality_multiplier = {
-                        "exact": 1.0,
-                        "partial": 0.7,
-                    }.get(result.get("match_quality", "exact"), 1.0)
-                    
-                    base_points = 100
-                    points = int(base_points * severity_multiplier * quality_multiplier)
-                    
-                    # Bonus for evidence
-                    if len(evidence) >= 2:
-                        points += 30
-                    
-                    # Bonus for high confidence on correct answer
-                    if confidence >= 80:
-                        points += 20
-                    
-                    return {
-                        "correct": True,
-                        "points": points,
-                        "bug_id": matched_bug.id,
-                        "explanation": result.get("explanation", matched_bug.description),
-                        "fix_suggestion": matched_bug.fix_suggestion,
-                        "severity": matched_bug.severity,
-                    }
-            
-            # Incorrect claim
-            return {
-                "correct": False,
-                "points": -50,
-                "pushback": result.get("pushback", "That's not a bug in this architecture."),
-                "hint": result.get("hint", "Review the logs and metrics more carefully."),
-            }
-            
-        except Exception as e:
-            logger.error(f"LLM validation failed: {e}")
-            return self._simple_validate(challenge, claim)
+        return self.validate_claim_from_bugs(
+            challenge.hidden_bugs,
+            claim,
+            cert_code=cert_code,
+            user_level=user_level,
+        )
     
     def _simple_validate(self, challenge: BugBountyChallenge, claim: Dict) -> Dict:
         """Simple string-matching validation as fallback."""
-        target = claim.get("target_id", "")
-        user_claim = claim.get("claim", "").lower()
+        return self._simple_validate_from_bugs(challenge.hidden_bugs, claim)
+    
+    def _award(
+        self,
+        bug: BugDefinition,
+        match_quality: str,
+        claim: Dict,
+        explanation: Optional[str] = None,
+    ) -> Dict:
+        """Build the result for a correct claim, scored by severity, match quality and evidence."""
+        severity_multiplier = {
+            "critical": 2.0,
+            "high": 1.5,
+            "medium": 1.0,
+            "low": 0.5,
+        }.get(bug.severity, 1.0)
         
-        for bug in challenge.hidden_bugs:
-            # Check if target matches
-            if bug.location == target or target in bug.evidence_in_logs:
-                return {
-                    "correct": True,
-                    "points": 100,
-                    "bug_id": bug.id,
-                    "explanation": bug.description,
-                    "fix_suggestion": bug.fix_suggestion,
-                    "severity": bug.severity,
-                }
-            
-            # Check if description matches
-            if any(word in user_claim for word in bug.description.lower().split()[:5]):
-                return {
-                    "correct": True,
-                    "points": 70,
-                    "bug_id": bug.id,
-                    "explanation": bug.description,
-                    "fix_suggestion": bug.fix_suggestion,
-                    "severity": bug.severity,
-                }
+        quality_multiplier = {
+            "exact": 1.0,
+            "partial": 0.7,
+        }.get(match_quality, 1.0)
+        
+        base_points = 100
+        points = int(base_points * severity_multiplier * quality_multiplier)
+        
+        # Bonus for evidence
+        if len(claim.get("evidence", [])) >= 2:
+            points += 30
+        
+        # Bonus for high confidence on correct answer
+        if claim.get("confidence", 50) >= 80:
+            points += 20
         
         return {
-            "correct": False,
-            "points": -50,
-            "pushback": f"No bug found at {target}. This appears to be working as intended.",
-            "hint": "Review the CloudWatch logs and Config rules more carefully.",
+            "correct": True,
+            "points": points,
+            "bug_id": bug.id,
+            "explanation": explanation or bug.description,
+            "fix_suggestion": bug.fix_suggestion,
+            "severity": bug.severity,
         }
     
     def validate_claim_from_bugs(
@@ -1157,8 +1039,11 @@ Return ONLY valid JSON."""
     ) -> Dict:
         """
         Validate a user's bug claim against a list of hidden bugs.
-        Used when challenge is loaded from database instead of memory.
-        Provides certification-specific and skill-level appropriate feedback.
+        
+        Clear matches, and claims that share nothing with any bug, are decided
+        by the deterministic ClaimMatcher (target, type, severity and
+        description overlap). Everything else is sent to the LLM, which also provides
+        certification-specific and skill-level appropriate feedback.
         
         Args:
             hidden_bugs: List of BugDefinition objects (the answers)
@@ -1167,6 +1052,14 @@ Return ONLY valid JSON."""
         Returns:
             Validation result with scoring
         """
+        match = ClaimMatcher(hidden_bugs).match(claim)
+        if match.decision == "accept":
+            logger.info(f"Claim matched {match.bug.id} without LLM (score={match.score:.2f})")
+            return self._award(match.bug, match.match_quality, claim)
+        if match.decision == "reject":
+            logger.info(f"Claim rejected without LLM ({match.reason})")
+            return self._reject(claim, vague=match.reason == "vague")
+        
         if not self.client:
             return self._simple_validate_from_bugs(hidden_bugs, claim)
         
@@ -1262,35 +1155,12 @@ Return ONLY valid JSON."""
                         break
                 
                 if matched_bug:
-                    # Calculate points
-                    severity_multiplier = {
-                        "critical": 2.0,
-                        "high": 1.5,
-                        "medium": 1.0,
-                        "low": 0.5,
-                    }.get(matched_bug.severity, 1.0)
-                    
-                    quality_multiplier = {
-                        "exact": 1.0,
-                        "partial": 0.7,
-                    }.get(result.get("match_quality", "exact"), 1.0)
-                    
-                    base_points = 100
-                    points = int(base_points * severity_multiplier * quality_multiplier)
-                    
-                    if len(evidence) >= 2:
-                        points += 30
-                    if confidence >= 80:
-                        points += 20
-                    
-                    return {
-                        "correct": True,
-                        "points": points,
-                        "bug_id": matched_bug.id,
-                        "explanation": result.get("explanation", matched_bug.description),
-                        "fix_suggestion": matched_bug.fix_suggestion,
-                        "severity": matched_bug.severity,
-                    }
+                    return self._award(
+                        matched_bug,
+                        result.get("match_quality", "exact"),
+                        claim,
+                        explanation=result.get("explanation"),
+                    )
             
             return {
                 "correct": False,
@@ -1303,6 +1173,22 @@ Return ONLY valid JSON."""
             logger.error(f"LLM validation failed: {e}")
             return self._simple_validate_from_bugs(hidden_bugs, claim)
     
+    def _reject(self, claim: Dict, vague: bool = False) -> Dict:
+        """Result for a claim the matcher rejected outright."""
+        if vague:
+            return {
+                "correct": False,
+                "points": -50,
+                "pushback": "Your description is too vague. Explain what is misconfigured and why it is a problem.",
+                "hint": "Point to the specific log entries, metrics or config rules that show the issue.",
+            }
+        return {
+            "correct": False,
+            "points": -50,
+            "pushback": f"No bug found at {claim.get('target_id', '')}. This appears to be working as intended.",
+            "hint": "Review the CloudWatch logs and Config rules more carefully.",
+        }
+    
     def _simple_validate_from_bugs(self, hidden_bugs: List[BugDefinition], claim: Dict) -> Dict:
         """Simple string-matching validation for bugs list."""
         target = claim.get("target_id", "")
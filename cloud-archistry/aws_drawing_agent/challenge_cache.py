@@ -0,0 +1,158 @@
+"""
+Bug Bounty Challenge Cache
+==========================
+Redis-backed store for live Bug Bounty challenges, shared by every worker,
+with a small in-process LRU in front of it.
+
+Each challenge is one Redis key holding its hidden bugs as compact JSON rows
+(BugDefinition field order), expiring with the challenge's time limit. The
+running bugs found and score are kept in the database, which increments them
+atomically per claim (db.record_bug_bounty_claim).
+
+Hidden bugs never change after generation, so the LRU can safely hold them
+until the challenge expires. If Redis is unavailable every call degrades to
+a miss and callers fall back to the database.
+"""
+
+import os
+import json
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import redis.asyncio as redis
+
+from bug_bounty_generator import BugDefinition
+
+logger = logging.getLogger(__name__)
+
+# Redis configuration
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:4379")
+CHALLENGE_PREFIX = "bugbounty:challenge:"
+LRU_SIZE = int(os.getenv("BUG_BOUNTY_LRU_SIZE", "256"))
+
+_BUG_FIELDS = tuple(BugDefinition.model_fields)
+
+
+def encode_bugs(bugs: List[BugDefinition]) -> str:
+    """Serialize hidden bugs as positional rows without repeating field names."""
+    rows = [[getattr(bug, field) for field in _BUG_FIELDS] for bug in bugs]
+    return json.dumps(rows, separators=(",", ":"))
+
+
+def decode_bugs(data: str) -> List[BugDefinition]:
+    """Inverse of encode_bugs. Rows were validated when the challenge was built."""
+    return [BugDefinition.model_construct(**dict(zip(_BUG_FIELDS, row))) for row in json.loads(data)]
+
+
+def remaining_ttl(started_at: Optional[datetime], time_limit: Optional[int]) -> int:
+    """Seconds left on a challenge loaded from the database (0 if expired)."""
+    if not started_at or not time_limit:
+        return 0
+    if started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    elapsed = (datetime.now(timezone.utc) - started_at).total_seconds()
+    return max(0, int(time_limit - elapsed))
+
+
+class BugBountyChallengeCache:
+    """Shared cache of live challenges' hidden bugs."""
+
+    def __init__(self, lru_size: int = LRU_SIZE):
+        self._redis: Optional[redis.Redis] = None
+        self._lru: "OrderedDict[str, Tuple[float, List[BugDefinition]]]" = OrderedDict()
+        self._lru_size = lru_size
+
+    async def get_redis(self) -> redis.Redis:
+        """Get or create Redis connection."""
+        if self._redis is None:
+            self._redis = redis.from_url(REDIS_URL, decode_responses=True)
+            logger.info(f"Bug Bounty challenge cache initialized: {REDIS_URL}")
+        return self._redis
+
+    async def close(self):
+        """Close Redis connection."""
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+
+    # -------------------------------------------------------------------------
+    # In-process LRU
+    # -------------------------------------------------------------------------
+
+    def _remember(self, challenge_id: str, bugs: List[BugDefinition], ttl: float) -> None:
+        self._lru[challenge_id] = (time.monotonic() + ttl, bugs)
+        self._lru.move_to_end(challenge_id)
+        while len(self._lru) > self._lru_size:
+            self._lru.popitem(last=False)
+
+    def _recall(self, challenge_id: str) -> Optional[List[BugDefinition]]:
+        entry = self._lru.get(challenge_id)
+        if entry is None:
+            return None
+        expires_at, bugs = entry
+        if expires_at <= time.monotonic():
+            del self._lru[challenge_id]
+            return None
+        self._lru.move_to_end(challenge_id)
+        return bugs
+
+    # -------------------------------------------------------------------------
+    # Challenge operations
+    # -------------------------------------------------------------------------
+
+    async def put(
+        self,
+        challenge_id: str,
+        hidden_bugs: List[BugDefinition],
+        ttl: int,
+    ) -> bool:
+        """Cache a challenge for `ttl` seconds (normally its time_limit)."""
+        if ttl <= 0:
+            return False
+        self._remember(challenge_id, hidden_bugs, ttl)
+        try:
+            r = await self.get_redis()
+            await r.set(f"{CHALLENGE_PREFIX}{challenge_id}", encode_bugs(hidden_bugs), ex=ttl)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to cache Bug Bounty challenge {challenge_id}: {e}")
+            return False
+
+    async def get_hidden_bugs(self, challenge_id: str) -> Optional[List[BugDefinition]]:
+        """Hidden bugs for a live challenge, or None if it is not cached."""
+        bugs = self._recall(challenge_id)
+        if bugs is not None:
+            return bugs
+        try:
+            r = await self.get_redis()
+            key = f"{CHALLENGE_PREFIX}{challenge_id}"
+            async with r.pipeline(transaction=True) as pipe:
+                pipe.get(key)
+                pipe.ttl(key)
+                data, ttl = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to get Bug Bounty challenge {challenge_id}: {e}")
+            return None
+        if not data:
+            return None
+        bugs = decode_bugs(data)
+        if ttl and ttl > 0:
+            self._remember(challenge_id, bugs, ttl)
+        return bugs
+
+    async def delete(self, challenge_id: str) -> bool:
+        """Drop a challenge from both cache tiers."""
+        self._lru.pop(challenge_id, None)
+        try:
+            r = await self.get_redis()
+            return await r.delete(f"{CHALLENGE_PREFIX}{challenge_id}") > 0
+        except Exception as e:
+            logger.error(f"Failed to delete Bug Bounty challenge {challenge_id}: {e}")
+            return False
+
+
+# Global cache instance
+challenge_cache = BugBountyChallengeCache()
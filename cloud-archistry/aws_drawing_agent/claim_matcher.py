@@ -0,0 +1,185 @@
+"""
+Bug Claim Matcher
+=================
+Deterministic fast path for Bug Bounty claim validation.
+
+Hidden bugs are indexed by target location and bug type, and each claim is
+scored against its candidates by structural agreement (target, type,
+severity) plus token overlap between the claim and the bug's description.
+Clear matches are accepted here, and claims that share nothing with any bug
+are rejected. Everything in between goes to the LLM validator, which can
+credit a correct description with the wrong target or type.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from bug_bounty_generator import BugDefinition
+
+# Scoring weights (sum to 1.0)
+TEXT_WEIGHT = 0.45
+TARGET_WEIGHT = 0.35
+TYPE_WEIGHT = 0.15
+SEVERITY_WEIGHT = 0.05
+
+ACCEPT_SCORE = 0.70     # best candidate at or above this is accepted...
+ACCEPT_MARGIN = 0.15    # ...if it beats the runner-up by this much
+MIN_TEXT_OVERLAP = 0.25  # and the description actually overlaps the bug
+MIN_CLAIM_TOKENS = 3    # and says enough to be judged without the LLM
+
+# Locations the generator uses for bugs that are not tied to a single node
+GLOBAL_LOCATIONS = frozenset({"architecture", "description", "diagram", ""})
+
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could does doing for from has have how
+in into is it its itself may might no not of on or our should so than that the
+their them then there these they this those to too very was we were what when
+where which while who why will with would you your i me my also just only
+bug issue problem wrong broken bad test here some any all there's it's
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Lowercased content words with a light plural strip ("buckets" -> "bucket")."""
+    tokens: Set[str] = set()
+    for word in _TOKEN_RE.findall(text.lower()):
+        # Keep short service names with digits ("s3", "ec2")
+        if len(word) < 2 or (len(word) < 3 and word.isalpha()) or word in _STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return frozenset(tokens)
+
+
+def _normalize(value: str) -> str:
+    return (value or "").strip().lower()
+
+
+@dataclass
+class ClaimMatch:
+    """Outcome of the fast path: accept, reject, or ambiguous (ask the LLM)."""
+    decision: str  # accept, reject, ambiguous
+    bug: Optional["BugDefinition"] = None
+    match_quality: str = "none"  # exact, partial, none
+    score: float = 0.0
+    reason: str = ""
+
+
+@dataclass
+class _IndexedBug:
+    bug: "BugDefinition"
+    location: str
+    evidence: FrozenSet[str]
+    tokens: FrozenSet[str]
+
+
+class ClaimMatcher:
+    """Index of one challenge's hidden bugs for scoring claims."""
+
+    def __init__(self, hidden_bugs: Iterable["BugDefinition"]):
+        self.bugs: List[_IndexedBug] = []
+        self.by_location: Dict[str, List[_IndexedBug]] = {}
+        self.by_type: Dict[str, List[_IndexedBug]] = {}
+        self.global_bugs: List[_IndexedBug] = []
+
+        for bug in hidden_bugs:
+            entry = _IndexedBug(
+                bug=bug,
+                location=_normalize(bug.location),
+                evidence=frozenset(_normalize(e) for e in bug.evidence_in_logs),
+                tokens=tokenize(f"{bug.description} {bug.location}"),
+            )
+            self.bugs.append(entry)
+            self.by_type.setdefault(_normalize(bug.type), []).append(entry)
+            if entry.location in GLOBAL_LOCATIONS:
+                self.global_bugs.append(entry)
+            else:
+                self.by_location.setdefault(entry.location, []).append(entry)
+
+    def _targets(self, entry: _IndexedBug, target: str) -> bool:
+        if not target:
+            return False
+        if entry.location in GLOBAL_LOCATIONS:
+            return target in GLOBAL_LOCATIONS
+        return target == entry.location or target in entry.evidence
+
+    def _candidates(self, target: str, bug_type: str) -> List[_IndexedBug]:
+        seen: Dict[int, _IndexedBug] = {}
+        for entry in (
+            self.by_location.get(target, [])
+            + self.by_type.get(bug_type, [])
+            + self.global_bugs
+        ):
+            seen[id(entry)] = entry
+        # Targets can also be log/evidence references
+        for entry in self.bugs:
+            if target and target in entry.evidence:
+                seen[id(entry)] = entry
+        return list(seen.values())
+
+    @staticmethod
+    def _text_overlap(claim_tokens: FrozenSet[str], entry: _IndexedBug) -> float:
+        """Dice coefficient between claim and bug description tokens."""
+        if not entry.tokens or not claim_tokens:
+            return 0.0
+        overlap = len(claim_tokens & entry.tokens)
+        return 2 * overlap / (len(claim_tokens) + len(entry.tokens))
+
+    def match(self, claim: Dict) -> ClaimMatch:
+        """Score a claim against the hidden bugs and decide if the LLM is needed."""
+        target = _normalize(claim.get("target_id", ""))
+        bug_type = _normalize(claim.get("bug_type", ""))
+        severity = _normalize(claim.get("severity", ""))
+        claim_tokens = tokenize(" ".join([claim.get("claim", "")] + list(claim.get("evidence", []) or [])))
+        description_tokens = tokenize(claim.get("claim", ""))
+
+        # The description is the primary signal - placeholders never pass
+        if not description_tokens:
+            return ClaimMatch(decision="reject", reason="vague")
+
+        scored = []
+        for entry in self._candidates(target, bug_type):
+            text = self._text_overlap(claim_tokens, entry)
+            on_target = self._targets(entry, target)
+            score = (
+                TEXT_WEIGHT * min(1.0, text * 2)
+                + TARGET_WEIGHT * on_target
+                + TYPE_WEIGHT * (bug_type == _normalize(entry.bug.type))
+                + SEVERITY_WEIGHT * (severity == _normalize(entry.bug.severity))
+            )
+            scored.append((score, text, on_target, entry))
+
+        scored.sort(key=lambda s: s[0], reverse=True)
+        if scored:
+            best_score, best_text, on_target, best = scored[0]
+            runner_up = scored[1][0] if len(scored) > 1 else 0.0
+        else:
+            best_score, best_text, on_target, best, runner_up = 0.0, 0.0, False, None, 0.0
+
+        if (
+            best_score >= ACCEPT_SCORE
+            and best_text >= MIN_TEXT_OVERLAP
+            and best_score - runner_up >= ACCEPT_MARGIN
+            and len(description_tokens) >= MIN_CLAIM_TOKENS
+        ):
+            exact = on_target and bug_type == _normalize(best.bug.type)
+            return ClaimMatch(
+                decision="accept",
+                bug=best.bug,
+                match_quality="exact" if exact else "partial",
+                score=best_score,
+                reason="match",
+            )
+
+        # Reject outright only if the claim shares nothing with any bug: not its
+        # target and not a word of its description. A correct description
+        # under the wrong target or type is for the LLM to judge.
+        if not any(self._targets(e, target) or claim_tokens & e.tokens for e in self.bugs):
+            return ClaimMatch(decision="reject", score=best_score, reason="no_match")
+
+        return ClaimMatch(decision="ambiguous", bug=best.bug if best else None, score=best_score, reason="ambiguous")
@@ -0,0 +1,236 @@
+"""
+PPTX Conversion Pipeline
+========================
+Parallel, incremental batch conversion of the reference architecture decks
+into React Flow JSON.
+
+- Decks are fanned out across a process pool (python-pptx parsing is CPU
+  bound, so threads would serialize on the GIL).
+- Each deck is identified by the SHA-256 of its content plus the converter
+  settings. A deck whose hash matches the one recorded for its existing
+  output is skipped, so re-running after adding a couple of decks only
+  converts those.
+- Outputs are written to a temp file and atomically renamed, so readers
+  (and the packed architecture store) never see a half-written diagram.
+- `manifest.json` in the output directory records per-file hashes, status,
+  node/edge counts and timings for the run.
+
+Run with: python conversion_pipeline.py aws_architecture_diagrams [--workers N] [--force]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+CONVERTER_VERSION = 1  # bump when converter output changes, to invalidate every hash
+
+# One converter per worker process, created lazily
+_converter = None
+
+
+def _source_files(architectures_dir: Path) -> List[Path]:
+    # Skip macOS metadata files
+    return sorted(p for p in architectures_dir.glob("*.pptx") if not p.name.startswith("._"))
+
+
+def source_hash(pptx_path: Path, target_width: int, target_height: int) -> str:
+    """Content hash of a deck, salted with everything that shapes the output."""
+    digest = hashlib.sha256(f"v{CONVERTER_VERSION}:{target_width}x{target_height}\n".encode())
+    with open(pptx_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path: Path, data: Dict, indent: Optional[int] = 2) -> None:
+    """Write JSON to a sibling temp file, then rename it over `path`."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem}-", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def load_manifest(output_dir: Path) -> Dict:
+    try:
+        with open(output_dir / MANIFEST_NAME, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _recorded_hash(output_file: Path, manifest_files: Dict) -> Optional[str]:
+    """Hash the existing output was produced from (manifest first, then the file itself)."""
+    if not output_file.exists():
+        return None
+    recorded = manifest_files.get(output_file.stem, {})
+    if recorded.get("source_sha256") and recorded.get("status") != "failed":
+        return recorded["source_sha256"]
+    try:
+        with open(output_file, "r") as f:
+            return json.load(f).get("metadata", {}).get("source_sha256")
+    except (OSError, ValueError):
+        return None
+
+
+def _convert_one(pptx_path: str, output_path: str, digest: str, target_width: int, target_height: int) -> Dict:
+    """Worker: convert one deck and write its JSON. Runs in a pool process."""
+    global _converter
+    from pptx_converter import PPTXToReactFlowConverter
+
+    if _converter is None or (_converter.target_width, _converter.target_height) != (target_width, target_height):
+        _converter = PPTXToReactFlowConverter(target_width, target_height)
+
+    start = time.perf_counter()
+    result = _converter.convert_file(pptx_path)
+    convert_ms = (time.perf_counter() - start) * 1000
+
+    if "error" in result:
+        # Keep whatever output already exists; the deck is retried next run
+        return {"status": "failed", "error": result["error"], "convert_ms": round(convert_ms, 1)}
+
+    result.setdefault("metadata", {})["source_sha256"] = digest
+    write_json_atomic(Path(output_path), result)
+    return {
+        "status": "converted",
+        "nodes": len(result.get("nodes", [])),
+        "edges": len(result.get("edges", [])),
+        "convert_ms": round(convert_ms, 1),
+    }
+
+
+def convert_directory(
+    architectures_dir: str,
+    output_dir: str,
+    workers: Optional[int] = None,
+    force: bool = False,
+    target_width: int = 1200,
+    target_height: int = 800,
+) -> Tuple[List[Dict], Dict]:
+    """
+    Convert every deck in `architectures_dir` whose output is missing or stale.
+
+    Args:
+        architectures_dir: Directory containing PPTX files
+        output_dir: Directory to save JSON outputs and the manifest
+        workers: Process pool size (defaults to the CPU count)
+        force: Reconvert every deck regardless of its hash
+
+    Returns:
+        (per-file results, manifest)
+    """
+    started = time.perf_counter()
+    arch_path = Path(architectures_dir)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    previous = load_manifest(output_path).get("files", {})
+    files: Dict[str, Dict] = {}
+    pending: List[Tuple[Path, Path, str]] = []
+
+    hash_start = time.perf_counter()
+    for pptx_file in _source_files(arch_path):
+        output_file = output_path / f"{pptx_file.stem}.json"
+        digest = source_hash(pptx_file, target_width, target_height)
+        if not force and _recorded_hash(output_file, previous) == digest:
+            files[pptx_file.stem] = {
+                **previous.get(pptx_file.stem, {}),
+                "file": pptx_file.name,
+                "output": str(output_file),
+                "source_sha256": digest,
+                "status": "skipped",
+                "convert_ms": 0.0,
+            }
+        else:
+            pending.append((pptx_file, output_file, digest))
+    hash_ms = (time.perf_counter() - hash_start) * 1000
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending) or 1))
+    logger.info(
+        f"Converting {len(pending)} of {len(pending) + len(files)} architecture files "
+        f"({len(files)} unchanged) with {workers} workers"
+    )
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_convert_one, str(src), str(dst), digest, target_width, target_height): (src, dst, digest)
+                for src, dst, digest in pending
+            }
+            for future in as_completed(futures):
+                src, dst, digest = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logger.error(f"Error converting {src}: {e}")
+                    outcome = {"status": "failed", "error": str(e), "convert_ms": 0.0}
+                files[src.stem] = {
+                    "file": src.name,
+                    "output": str(dst),
+                    "source_sha256": digest,
+                    **outcome,
+                }
+
+    files = dict(sorted(files.items()))
+    counts = {status: 0 for status in ("converted", "skipped", "failed")}
+    for entry in files.values():
+        counts[entry["status"]] += 1
+
+    manifest = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "converter": {
+            "version": CONVERTER_VERSION,
+            "target_width": target_width,
+            "target_height": target_height,
+        },
+        "workers": workers,
+        "counts": counts,
+        "timings_ms": {
+            "hash": round(hash_ms, 1),
+            "convert_sum": round(sum(e.get("convert_ms", 0.0) for e in files.values()), 1),
+            "total": round((time.perf_counter() - started) * 1000, 1),
+        },
+        "files": files,
+    }
+    write_json_atomic(output_path / MANIFEST_NAME, manifest)
+
+    logger.info(
+        f"Converted {counts['converted']}, skipped {counts['skipped']}, failed {counts['failed']} "
+        f"in {manifest['timings_ms']['total'] / 1000:.2f}s"
+    )
+    return list(files.values()), manifest
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Convert reference architecture decks to React Flow JSON")
+    parser.add_argument("architectures_dir", nargs="?", default="aws_architecture_diagrams")
+    parser.add_argument("--output", help="Output directory (default: <architectures_dir>/converted)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="Reconvert every deck")
+    args = parser.parse_args()
+
+    _, summary = convert_directory(
+        args.architectures_dir,
+        args.output or str(Path(args.architectures_dir) / "converted"),
+        workers=args.workers,
+        force=args.force,
+    )
+    print(json.dumps({"counts": summary["counts"], "timings_ms": summary["timings_ms"]}, indent=2))
+    sys.exit(1 if summary["counts"]["failed"] else 0)
@@ -5,55 +5,41 @@ Generates AWS architecture diagrams from text descriptions using LLM.
 Now with RAG support - queries pgvector for architecture knowledge.
 """
 
-import logging
+import os
+import time
 import asyncio
-from typing import Dict, Optional, List
+import logging
+from typing import AsyncIterator, Dict, Optional, List
+
+import db
+from architecture_index import ArchitectureIndex
+from async_runtime import get_async_client
 from llm_generator import LLMDiagramGenerator
 
 logger = logging.getLogger(__name__)
 
+# Streaming requests only wait this long for RAG context before generating
+STREAM_RAG_TIMEOUT = float(os.getenv("DIAGRAM_STREAM_RAG_TIMEOUT", "0.8"))
 
-def get_rag_context_sync(description: str, api_key: str, limit: int = 5) -> str:
+
+async def get_rag_context(description: str, api_key: str, limit: int = 5) -> str:
     """
-    Query pgvector for relevant architecture knowledge (synchronous version).
+    Query pgvector for relevant architecture knowledge.
+    Uses the shared async OpenAI client and the service's asyncpg pool.
     Returns context string to inject into LLM prompt.
     """
-    import os
-    import json
-    import psycopg2
-    from openai import OpenAI
-    
     try:
-        client = OpenAI(api_key=api_key)
+        client = get_async_client(api_key)
         
         # Get embedding for the description
-        embed_response = client.embeddings.create(
+        embed_response = await client.embeddings.create(
             model="text-embedding-3-small",
             input=description[:8000]
         )
         query_embedding = embed_response.data[0].embedding
         
-        # Connect to postgres directly (sync)
-        database_url = os.getenv("DATABASE_URL")
-        if not database_url:
-            logger.warning("DATABASE_URL not set for RAG")
-            return ""
-        
-        conn = psycopg2.connect(database_url)
-        cur = conn.cursor()
-        
-        # Search pgvector
-        embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
-        cur.execute("""
-            SELECT url, content, 1 - (embedding <=> %s::vector) as similarity
-            FROM "AcademyKnowledgeChunk"
-            ORDER BY embedding <=> %s::vector
-            LIMIT %s
-        """, (embedding_str, embedding_str, limit))
-        
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
+        # Search pgvector through the shared pool
+        rows = await db.search_knowledge_chunks(query_embedding=query_embedding, limit=limit)
         
         if not rows:
             logger.info("No RAG results found")
@@ -61,9 +47,9 @@ def get_rag_context_sync(description: str, api_key: str, limit: int = 5) -> str:
         
         # Build context string from top results
         context_parts = []
-        for url, content, similarity in rows:
-            if similarity > 0.4:
-                context_parts.append(f"[From {url}]:\n{content[:800]}")
+        for row in rows:
+            if row["similarity"] > 0.4:
+                context_parts.append(f"[From {row['url']}]:\n{row['content'][:800]}")
         
         if context_parts:
             context = "\n\n".join(context_parts)
@@ -83,7 +69,13 @@ class DiagramGenerator:
     Uses LLM to understand requirements and create React Flow diagrams.
     """
     
-    def __init__(self, openai_api_key: str = None, services_list: list = None, reference_architectures: dict = None):
+    def __init__(
+        self,
+        openai_api_key: str = None,
+        services_list: list = None,
+        reference_architectures: dict = None,
+        architecture_index: ArchitectureIndex = None,
+    ):
         """
         Initialize diagram generator with OpenAI API key.
         
@@ -91,10 +83,19 @@ class DiagramGenerator:
             openai_api_key: OpenAI API key for LLM operations
             services_list: List of available AWS services
             reference_architectures: Dict of reference architectures from PPTX files
+            architecture_index: Prebuilt similarity index (built from
+                reference_architectures if not given)
         """
         self.openai_api_key = openai_api_key
         self.services_list = services_list
         self.reference_architectures = reference_architectures or {}
+        self.architecture_index = architecture_index
+        if self.architecture_index is None:
+            self.architecture_index = ArchitectureIndex()
+            for arch_id, arch_data in self.reference_architectures.items():
+                if arch_data.get("loaded") and arch_data.get("diagram"):
+                    self.architecture_index.add(arch_id, arch_data.get("name", arch_id), arch_data["diagram"])
+            self.architecture_index.build()
         self.llm_generator = None
         
         if openai_api_key:
@@ -104,7 +105,7 @@ class DiagramGenerator:
             except Exception as e:
                 logger.warning(f"Failed to initialize LLM generator: {e}")
     
-    def generate(self, description: str) -> Dict:
+    async def generate(self, description: str) -> Dict:
         """
         Generate a diagram from text description.
         
@@ -128,7 +129,7 @@ class DiagramGenerator:
             }
         
         try:
-            diagram = self.llm_generator.generate_diagram(
+            diagram = await self.llm_generator.generate_diagram(
                 description=description,
                 services_list=self.services_list
             )
@@ -155,7 +156,7 @@ class DiagramGenerator:
                 }
             }
     
-    def generate_with_explanation(self, description: str, use_rag: bool = True) -> Dict:
+    async def generate_with_explanation(self, description: str, use_rag: bool = True) -> Dict:
         """
         Generate a diagram AND explanation from text description.
         Uses RAG (pgvector) for architecture knowledge + reference architectures from PPTX files.
@@ -181,7 +182,7 @@ class DiagramGenerator:
             rag_context = ""
             if use_rag and self.openai_api_key:
                 try:
-                    rag_context = get_rag_context_sync(description, self.openai_api_key, limit=5)
+                    rag_context = await get_rag_context(description, self.openai_api_key, limit=5)
                     if rag_context:
                         logger.info(f"RAG context added: {len(rag_context)} chars")
                 except Exception as e:
@@ -190,7 +191,7 @@ class DiagramGenerator:
             # Combine description with RAG context
             enhanced_description = description + rag_context
             
-            result = self.llm_generator.generate_diagram_with_explanation(
+            result = await self.llm_generator.generate_diagram_with_explanation(
                 description=enhanced_description,
                 services_list=self.services_list
             )
@@ -222,109 +223,85 @@ class DiagramGenerator:
                 "metadata": {"status": "error", "error": str(e)}
             }
     
-    def _find_similar_architecture(self, description: str) -> Optional[Dict]:
+    async def stream_with_explanation(self, description: str, use_rag: bool = True) -> AsyncIterator[Dict]:
         """
-        Find a similar reference architecture from converted JSON data.
-        Returns the full diagram structure (nodes with positions, edges) to use as template.
+        Stream a diagram and its explanation as events (see
+        LLMDiagramGenerator.stream_diagram_with_explanation), ending with a
+        "complete" event that carries the same payload as
+        generate_with_explanation plus timings.
+        
+        RAG context is only awaited for STREAM_RAG_TIMEOUT seconds so it
+        cannot hold back the first node.
         """
-        if not self.reference_architectures:
-            return None
+        logger.info(f"Streaming diagram with explanation: {description[:100]}...")
+        started = time.perf_counter()
         
-        description_lower = description.lower()
+        def elapsed_ms() -> int:
+            return round((time.perf_counter() - started) * 1000)
         
-        # Keywords to match against architecture names
-        keywords = {
-            "serverless": ["serverless", "lambda", "api-gateway", "function"],
-            "api": ["api", "gateway", "rest", "graphql"],
-            "data": ["data", "pipeline", "kinesis", "stream", "analytics", "lake"],
-            "web": ["web", "application", "tier", "frontend", "hosting"],
-            "microservices": ["microservice", "ecs", "container", "docker", "kubernetes"],
-            "ml": ["machine", "learning", "sagemaker", "ml", "ai", "model"],
-            "iot": ["iot", "sensor", "device", "edge", "connected"],
-            "ecommerce": ["ecommerce", "commerce", "shop", "retail", "payment", "cart"],
-            "mobile": ["mobile", "app", "ios", "android"],
-            "gaming": ["game", "gaming", "multiplayer", "session"],
-            "healthcare": ["health", "medical", "patient", "clinical"],
-            "financial": ["financial", "banking", "payment", "fraud"],
-        }
+        if not self.llm_generator:
+            yield {"type": "error", "message": "OpenAI API key not configured"}
+            return
         
-        # Find matching architectures
-        best_match = None
-        best_score = 0
+        rag_context = ""
+        if use_rag and self.openai_api_key:
+            try:
+                rag_context = await asyncio.wait_for(
+                    get_rag_context(description, self.openai_api_key, limit=5),
+                    timeout=STREAM_RAG_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.info(f"RAG context skipped after {STREAM_RAG_TIMEOUT}s")
         
-        for arch_id, arch_data in self.reference_architectures.items():
-            # Only consider architectures with loaded diagrams
-            if not arch_data.get("loaded") or not arch_data.get("diagram"):
-                continue
-                
-            score = 0
-            arch_name = arch_data.get("name", "").lower()
-            
-            # Check keyword matches
-            for keyword_group, terms in keywords.items():
-                if any(term in description_lower for term in terms):
-                    if any(term in arch_name for term in terms):
-                        score += 3
-            
-            # Check direct word matches
-            for word in description_lower.split():
-                if len(word) > 3 and word in arch_name:
-                    score += 1
-            
-            if score > best_score:
-                best_score = score
-                best_match = arch_data
+        timings = {"rag_ms": elapsed_ms()}
+        diagram: Dict = {}
+        explanation = ""
+        async for event in self.llm_generator.stream_diagram_with_explanation(
+            description=description + rag_context,
+            services_list=self.services_list
+        ):
+            if event["type"] == "node":
+                timings.setdefault("first_node_ms", elapsed_ms())
+            elif event["type"] == "diagram":
+                diagram = event["diagram"]
+                timings["diagram_ms"] = elapsed_ms()
+            elif event["type"] == "explanation":
+                explanation = event["explanation"]
+                timings["explanation_ms"] = elapsed_ms()
+            yield event
         
-        if best_match and best_score > 0:
-            diagram = best_match.get("diagram", {})
-            nodes = diagram.get("nodes", [])
-            edges = diagram.get("edges", [])
-            
-            # Extract nodes with service_id and their positions
-            service_nodes = []
-            for node in nodes:
-                data = node.get("data", {})
-                if data.get("service_id"):
-                    service_nodes.append({
-                        "id": node.get("id"),
-                        "service_id": data["service_id"],
-                        "label": data.get("label", ""),
-                        "position": node.get("position", {}),
-                        "type": node.get("type", "awsService"),
-                    })
-            
-            # Extract all positions to understand the layout pattern
-            all_positions = []
-            for node in nodes:
-                pos = node.get("position", {})
-                if pos.get("x") is not None and pos.get("y") is not None:
-                    all_positions.append(pos)
-            
-            # Calculate layout bounds
-            if all_positions:
-                min_x = min(p["x"] for p in all_positions)
-                max_x = max(p["x"] for p in all_positions)
-                min_y = min(p["y"] for p in all_positions)
-                max_y = max(p["y"] for p in all_positions)
-            else:
-                min_x, max_x, min_y, max_y = 0, 1200, 0, 800
-            
-            logger.info(f"Found reference architecture: {best_match.get('name')} with {len(service_nodes)} service nodes")
-            
-            return {
-                "name": best_match.get("name"),
-                "services": service_nodes[:15],  # Service nodes with positions
-                "edges": edges[:20],  # Connection patterns
-                "layout_bounds": {
-                    "min_x": min_x, "max_x": max_x,
-                    "min_y": min_y, "max_y": max_y,
-                },
-                "total_nodes": len(nodes),
-            }
+        timings["total_ms"] = elapsed_ms()
+        yield {
+            "type": "complete",
+            "diagram": diagram,
+            "explanation": explanation,
+            "metadata": {
+                "generated_from": description,
+                "status": "error" if diagram.get("error") else "success",
+                "nodes_count": len(diagram.get("nodes", [])),
+                "edges_count": len(diagram.get("edges", [])),
+                "rag_used": bool(rag_context),
+                "rag_context_length": len(rag_context),
+                "timings": timings,
+            },
+        }
+    
+    def _find_similar_architecture(self, description: str) -> Optional[Dict]:
+        """
+        Find a similar reference architecture from converted JSON data.
+        Returns the full diagram structure (nodes with positions, edges) to use as template.
+        
+        Lookups go through the load-time index, ranked by text similarity
+        plus overlap between mentioned and reference services.
+        """
+        match = self.architecture_index.best_match(description)
+        if not match:
+            return None
         
-        return None
+        logger.info(f"Found reference architecture: {match.name} with {len(match.service_nodes)} service nodes")
+        return match.as_reference()
     
-    def enhance_with_validation(self, diagram: Dict, validation_results: Dict) -> Dict:
+    async def enhance_with_validation(self, diagram: Dict, validation_results: Dict) -> Dict:
         """
         Enhance diagram based on validation results.
         
@@ -340,7 +317,7 @@ class DiagramGenerator:
             return diagram
         
         try:
-            return self.llm_generator.enhance_diagram_with_validation(
+            return await self.llm_generator.enhance_diagram_with_validation(
                 diagram=diagram,
                 validation_results=validation_results
             )
@@ -0,0 +1,97 @@
+"""
+Diagram Streaming
+=================
+Structured-output schema and incremental parsing for streamed diagram
+generation.
+
+The model is constrained to DIAGRAM_SCHEMA ({"services": [...],
+"connections": [...]}), so its output is valid JSON in a known order.
+StreamingArrayParser (shared/streaming) reads the streamed tokens and hands
+back each service and connection object as soon as its closing brace
+arrives. It also reports when an array closes, so callers can act once the
+full service list is known.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict
+
+# Containers ship shared/ next to this file; local checkouts have it at the repo root
+for _parent in Path(__file__).resolve().parents:
+    if (_parent / "shared" / "streaming").is_dir():
+        if str(_parent) not in sys.path:
+            sys.path.append(str(_parent))
+        break
+
+from shared.streaming import StreamingArrayParser, sse  # noqa: E402,F401
+from layout_engine import BAND_TIERS, GAP_X, GAP_Y, NODE_H, NODE_W, TIER_RANK, tier_for  # noqa: E402
+
+TIERS = ["edge", "public", "compute", "data", "security", "integration"]
+
+# JSON schema for OpenAI structured outputs (strict mode: every property
+# required, no additional properties). Property order is generation order.
+DIAGRAM_SCHEMA: Dict = {
+    "type": "object",
+    "properties": {
+        "services": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "service_id": {"type": "string"},
+                    "label": {"type": "string"},
+                    "tier": {"type": "string", "enum": TIERS},
+                },
+                "required": ["id", "service_id", "label", "tier"],
+                "additionalProperties": False,
+            },
+        },
+        "connections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "from": {"type": "string"},
+                    "to": {"type": "string"},
+                },
+                "required": ["from", "to"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["services", "connections"],
+    "additionalProperties": False,
+}
+
+DIAGRAM_RESPONSE_FORMAT: Dict = {
+    "type": "json_schema",
+    "json_schema": {"name": "aws_architecture", "strict": True, "schema": DIAGRAM_SCHEMA},
+}
+
+
+def provisional_node(service: Dict, slots: Dict[str, int]) -> Dict:
+    """
+    React Flow node for a streamed service, placed in its tier column.
+
+    `slots` counts the nodes already placed per tier. The final laid-out
+    diagram replaces these positions once the stream completes.
+    """
+    tier = tier_for(service.get("service_id"), service.get("tier"))
+    row = slots.get(tier, 0)
+    slots[tier] = row + 1
+    if tier in BAND_TIERS:
+        x, y = row * (NODE_W + GAP_X), -(NODE_H + GAP_Y)
+    else:
+        x, y = TIER_RANK.get(tier, 0) * (NODE_W + GAP_X), row * (NODE_H + GAP_Y)
+    return {
+        "id": service["id"],
+        "type": "awsService",
+        "position": {"x": x, "y": y},
+        "data": {
+            "label": service.get("label", ""),
+            "service_id": service.get("service_id", ""),
+            "tier": tier,
+        },
+    }
+
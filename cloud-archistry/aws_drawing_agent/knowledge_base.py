@@ -9,6 +9,11 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import logging
 
+from architecture_index import ArchitectureIndex
+from architecture_store import ArchitectureStore, open_store
+from conversion_pipeline import MANIFEST_NAME
+from service_index import ServiceIndex, category_for
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +38,10 @@ class AWSKnowledgeBase:
         self.architectures = {}
         self.service_relationships = {}
         self.best_practices = {}
+        self.architecture_index = ArchitectureIndex()
+        self.service_index = ServiceIndex()
+        self.architecture_store: Optional[ArchitectureStore] = None
+        self.architectures_dir: Optional[str] = None
         
         if services_file:
             self.load_services(services_file)
@@ -60,6 +69,7 @@ class AWSKnowledgeBase:
                     "category": self._infer_category(service_id),
                 }
             
+            self.service_index.build(self.services)
             logger.info(f"Loaded {len(self.services)} AWS services")
         except ImportError as e:
             logger.warning(f"Could not load AWS service mapping: {e}")
@@ -70,40 +80,35 @@ class AWSKnowledgeBase:
         Load reference architectures from converted JSON files (with full diagram structure).
         Falls back to PPTX file paths if JSON not available.
         """
-        import json
         logger.info(f"Loading architectures from {architectures_dir}")
         
         arch_path = Path(architectures_dir)
         if not arch_path.exists():
             logger.warning(f"Architecture directory not found: {architectures_dir}")
             return
+        self.architectures_dir = str(arch_path)
         
-        # First, try to load from converted JSON files (these have positions and structure)
+        # First, load converted diagrams (these have positions and structure).
+        # The packed store maps them from one file and decodes on demand.
         converted_dir = arch_path / "converted"
         json_loaded = 0
         
         if converted_dir.exists():
-            json_files = list(converted_dir.glob("*.json"))
-            for json_file in json_files:
-                # Skip macOS metadata files
-                if json_file.name.startswith("._"):
-                    continue
-                arch_id = json_file.stem
-                try:
-                    with open(json_file, 'r') as f:
-                        diagram_data = json.load(f)
-                    
-                    self.architectures[arch_id] = {
-                        "id": arch_id,
-                        "name": self._format_architecture_name(arch_id),
-                        "file_path": str(json_file),
-                        "diagram": diagram_data,  # Full diagram with nodes, edges, positions
-                        "loaded": True,
+            self.architecture_store = open_store(converted_dir, name_for=self._format_architecture_name)
+            if self.architecture_store:
+                for record in self.architecture_store.records():
+                    self.architectures[record["id"]] = {
+                        "id": record["id"],
+                        "name": record["name"],
+                        "file_path": str(converted_dir / record["source"]),
+                        "loaded": True,  # Diagram decoded from the pack on request
                     }
+                    self.architecture_index.add_entry(self.architecture_store.summary(record["id"]))
                     json_loaded += 1
-                except Exception as e:
-                    logger.warning(f"Failed to load {json_file}: {e}")
+            else:
+                json_loaded = self._load_json_architectures(converted_dir)
             
+            self.architecture_index.build()
             logger.info(f"Loaded {json_loaded} reference architectures from JSON")
         
         # Also find PPTX files that don't have JSON conversions yet
@@ -123,24 +128,45 @@ class AWSKnowledgeBase:
         
         logger.info(f"Total reference architectures: {len(self.architectures)} ({json_loaded} with full diagrams)")
     
+    def _load_json_architectures(self, converted_dir: Path) -> int:
+        """Fallback when no pack can be built: decode every JSON file up front."""
+        loaded = 0
+        for json_file in converted_dir.glob("*.json"):
+            # Skip macOS metadata files and the conversion manifest
+            if json_file.name.startswith("._") or json_file.name == MANIFEST_NAME:
+                continue
+            arch_id = json_file.stem
+            try:
+                with open(json_file, 'r') as f:
+                    diagram_data = json.load(f)
+                
+                self.architectures[arch_id] = {
+                    "id": arch_id,
+                    "name": self._format_architecture_name(arch_id),
+                    "file_path": str(json_file),
+                    "diagram": diagram_data,  # Full diagram with nodes, edges, positions
+                    "loaded": True,
+                }
+                self.architecture_index.add(arch_id, self.architectures[arch_id]["name"], diagram_data)
+                loaded += 1
+            except Exception as e:
+                logger.warning(f"Failed to load {json_file}: {e}")
+        return loaded
+    
     def get_service(self, service_id: str) -> Optional[Dict]:
         """Get service metadata by ID."""
         return self.services.get(service_id)
     
-    def search_services(self, query: str) -> List[Dict]:
-        """Search services by name or ID."""
-        query_lower = query.lower()
-        results = []
-        
-        for service_id, service in self.services.items():
-            if query_lower in service_id.lower() or query_lower in service["name"].lower():
-                results.append(service)
-        
-        return results
+    def search_services(self, query: str, limit: Optional[int] = None, category: Optional[str] = None) -> List[Dict]:
+        """Search services by ID, name, alias or URL pattern (prefix, infix and typo tolerant)."""
+        return self.service_index.search(query, limit=limit, category=category)
     
     def get_architecture(self, arch_id: str) -> Optional[Dict]:
-        """Get architecture metadata by ID."""
-        return self.architectures.get(arch_id)
+        """Get architecture metadata by ID (with its diagram, decoded on demand)."""
+        arch = self.architectures.get(arch_id)
+        if arch and "diagram" not in arch and self.architecture_store and arch_id in self.architecture_store:
+            return {**arch, "diagram": self.architecture_store.get_diagram(arch_id)}
+        return arch
     
     def list_architectures(self, category: str = None) -> List[Dict]:
         """List all architectures, optionally filtered by category."""
@@ -195,25 +221,7 @@ class AWSKnowledgeBase:
     
     def _infer_category(self, service_id: str) -> str:
         """Infer service category from ID."""
-        # Basic categorization logic
-        compute_services = ["ec2", "lambda", "ecs", "eks", "fargate", "batch", "lightsail"]
-        storage_services = ["s3", "ebs", "efs", "fsx", "glacier", "backup"]
-        database_services = ["rds", "dynamodb", "aurora", "elasticache", "redshift", "neptune", "documentdb"]
-        networking_services = ["vpc", "cloudfront", "route53", "alb", "nlb", "vpn-gateway", "direct-connect"]
-        security_services = ["iam", "kms", "secrets-manager", "cognito", "waf", "shield", "guardduty"]
-        
-        if service_id in compute_services:
-            return "compute"
-        elif service_id in storage_services:
-            return "storage"
-        elif service_id in database_services:
-            return "database"
-        elif service_id in networking_services:
-            return "networking"
-        elif service_id in security_services:
-            return "security"
-        else:
-            return "other"
+        return category_for(service_id)
     
     def get_best_practices(self, service_id: str) -> List[str]:
         """Get best practices for a specific service."""
@@ -244,8 +252,12 @@ class AWSKnowledgeBase:
     def suggest_architecture(self, requirements: str) -> List[Dict]:
         """
         Suggest reference architectures based on requirements.
-        Uses semantic search on architecture descriptions.
+        Ranked by the architecture index (text + service overlap).
         """
-        # This would use embeddings to find similar architectures
-        # For now, return all architectures
-        return list(self.architectures.values())[:5]
+        matches = self.architecture_index.search(requirements, limit=5)
+        if not matches:
+            return list(self.architectures.values())[:5]
+        return [
+            {**self.architectures[entry.id], "score": score, "services": sorted(entry.services)}
+            for score, entry in matches
+        ]
@@ -0,0 +1,443 @@
+"""
+Diagram Layout Engine
+=====================
+Deterministic layered (Sugiyama-style) layout for architecture diagrams.
+
+Every container (AWS Cloud, VPC, subnets, or any React Flow container node)
+is laid out bottom-up on its own:
+1. Children are assigned to columns by tier: edge -> public -> compute ->
+   integration -> data. Sub-containers sit in the column of their
+   left-most descendant. Security services form a band above the columns.
+2. Edges are lifted to the children of the container they cross, and
+   barycenter sweeps reorder each column to reduce crossings. The best
+   ordering seen is kept.
+3. Columns are placed left to right and centred vertically. The container
+   is then sized to fit, so its parent can treat it as one big node.
+
+Sizes match the frontend template engine (lib/aws-diagram-template.ts), so
+server-laid-out diagrams look the same as client-side ones. A 200-node
+diagram lays out in a few milliseconds.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Base units - keep in sync with U in lib/aws-diagram-template.ts
+NODE_W = 100
+NODE_H = 90
+GAP_X = 50
+GAP_Y = 30
+PAD = 40
+HEADER = 45
+
+SWEEPS = 4
+ROOT = ""
+
+# Column order for flow tiers; security is drawn as a band instead
+TIER_RANK: Dict[str, int] = {
+    "edge": 0,
+    "public": 1,
+    "compute": 2,
+    "integration": 3,
+    "data": 4,
+}
+BAND_TIERS = frozenset({"security"})
+DEFAULT_TIER = "compute"
+
+# Tier for nodes that do not carry one (user-drawn React Flow diagrams)
+SERVICE_TIERS: Dict[str, str] = {
+    **dict.fromkeys([
+        "cloudfront", "route53", "global-accelerator", "shield", "waf",
+        "icon-user", "icon-users", "icon-mobile", "icon-laptop", "icon-desktop",
+        "icon-internet", "icon-cloud", "icon-corporate", "icon-onprem",
+    ], "edge"),
+    **dict.fromkeys([
+        "alb", "nlb", "api-gateway", "nat-gateway", "internet-gateway",
+        "appsync", "vpn-gateway", "direct-connect", "transit-gateway",
+    ], "public"),
+    **dict.fromkeys([
+        "ec2", "lambda", "ecs", "eks", "fargate", "auto-scaling", "batch",
+        "elastic-beanstalk", "lightsail", "emr", "glue", "icon-server",
+    ], "compute"),
+    **dict.fromkeys([
+        "sqs", "sns", "eventbridge", "step-functions", "mq", "ses",
+        "kinesis-streams", "kinesis-firehose", "msk",
+    ], "integration"),
+    **dict.fromkeys([
+        "rds", "aurora", "dynamodb", "elasticache", "memorydb", "redshift",
+        "neptune", "documentdb", "s3", "ebs", "efs", "fsx", "glacier",
+        "opensearch", "athena", "backup", "icon-database", "ecr",
+    ], "data"),
+    **dict.fromkeys([
+        "iam", "iam-role", "iam-policy", "kms", "secrets-manager", "cognito",
+        "guardduty", "inspector", "macie", "security-hub", "acm",
+        "cloudwatch", "cloudwatch-logs", "cloudtrail", "config", "xray",
+        "systems-manager", "organizations", "icon-security",
+    ], "security"),
+}
+
+# React Flow node types that hold children (matches the canvas)
+CONTAINER_TYPES = frozenset({
+    "group", "vpc", "subnet", "securityGroup", "autoScaling",
+    "awsCloud", "region", "availabilityZone", "orgNode", "accountNode",
+})
+
+
+def tier_for(service_id: Optional[str], tier: Optional[str] = None) -> str:
+    """Explicit tier if valid, otherwise inferred from the service id."""
+    if tier in TIER_RANK or tier in BAND_TIERS:
+        return tier
+    return SERVICE_TIERS.get((service_id or "").lower(), DEFAULT_TIER)
+
+
+# =============================================================================
+# CORE LAYOUT
+# =============================================================================
+
+@dataclass
+class _Item:
+    id: str
+    tier: str = DEFAULT_TIER
+    container: bool = False
+    children: List[str] = field(default_factory=list)
+    w: float = NODE_W
+    h: float = NODE_H
+    x: float = 0.0  # relative to parent container
+    y: float = 0.0
+    rank: int = TIER_RANK[DEFAULT_TIER]
+
+
+class LayeredLayout:
+    """Compound layered layout over a container tree."""
+
+    def __init__(self):
+        self.items: Dict[str, _Item] = {ROOT: _Item(id=ROOT, container=True, w=0, h=0)}
+        self.parent: Dict[str, str] = {}
+        self.edges: List[Tuple[str, str]] = []
+        self.crossings = 0
+        self.layers = 0
+
+    def add_node(self, node_id: str, tier: str = DEFAULT_TIER, container: bool = False) -> None:
+        self.items[node_id] = _Item(id=node_id, tier=tier, container=container)
+
+    def add_edge(self, source: str, target: str) -> None:
+        if source != target:
+            self.edges.append((source, target))
+
+    def set_parent(self, node_id: str, parent_id: Optional[str]) -> None:
+        self.parent[node_id] = parent_id or ROOT
+
+    # -------------------------------------------------------------------------
+
+    def _link_tree(self) -> List[str]:
+        """Attach children to containers; return containers in post-order."""
+        for node_id in self.items:
+            if node_id == ROOT:
+                continue
+            parent = self.parent.get(node_id, ROOT)
+            # Unknown parents and cycles fall back to the root
+            seen = {node_id}
+            current = parent
+            while current != ROOT and current in self.items and current not in seen:
+                seen.add(current)
+                current = self.parent.get(current, ROOT)
+            if parent not in self.items or current != ROOT or not self.items[parent].container:
+                parent = ROOT
+                self.parent[node_id] = ROOT
+            self.items[parent].children.append(node_id)
+
+        order: List[str] = []
+        stack = [(ROOT, False)]
+        while stack:
+            node_id, done = stack.pop()
+            if done:
+                order.append(node_id)
+                continue
+            stack.append((node_id, True))
+            for child in reversed(self.items[node_id].children):
+                if self.items[child].container:
+                    stack.append((child, False))
+        return order
+
+    def _chain(self, node_id: str) -> List[str]:
+        chain = [node_id]
+        while chain[-1] != ROOT:
+            chain.append(self.parent.get(chain[-1], ROOT))
+        chain.reverse()
+        return chain
+
+    def _lift_edges(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Map each edge onto the pair of siblings it connects, per container."""
+        lifted: Dict[str, List[Tuple[str, str]]] = {}
+        chains: Dict[str, List[str]] = {}
+        for source, target in self.edges:
+            if source not in self.items or target not in self.items:
+                continue
+            cs = chains.get(source) or chains.setdefault(source, self._chain(source))
+            ct = chains.get(target) or chains.setdefault(target, self._chain(target))
+            i = 0
+            while i < len(cs) and i < len(ct) and cs[i] == ct[i]:
+                i += 1
+            if i < len(cs) and i < len(ct):
+                lifted.setdefault(cs[i - 1], []).append((cs[i], ct[i]))
+        return lifted
+
+    @staticmethod
+    def _count_crossings(layers: List[List[str]], adjacency: Dict[str, List[str]], layer_of: Dict[str, int]) -> int:
+        """Crossings between adjacent columns (inversion count per column pair)."""
+        total = 0
+        for li in range(len(layers) - 1):
+            right = {node_id: i for i, node_id in enumerate(layers[li + 1])}
+            pairs = sorted(
+                (i, right[n])
+                for i, node_id in enumerate(layers[li])
+                for n in adjacency.get(node_id, ())
+                if layer_of.get(n) == li + 1
+            )
+            # Fenwick tree inversion count over target positions
+            size = len(layers[li + 1])
+            tree = [0] * (size + 1)
+            for seen, (_, pos) in enumerate(pairs):
+                j, below = pos + 1, 0
+                while j > 0:
+                    below += tree[j]
+                    j -= j & -j
+                total += seen - below
+                j = pos + 1
+                while j <= size:
+                    tree[j] += 1
+                    j += j & -j
+        return total
+
+    def _order(self, layers: List[List[str]], adjacency: Dict[str, List[str]]) -> List[List[str]]:
+        """Barycenter sweeps, keeping the ordering with the fewest crossings."""
+        layer_of = {node_id: li for li, layer in enumerate(layers) for node_id in layer}
+        best = [list(layer) for layer in layers]
+        best_crossings = self._count_crossings(best, adjacency, layer_of)
+        if best_crossings == 0 or len(layers) < 2:
+            return best
+
+        pos = {node_id: i / max(len(layer), 1) for layer in layers for i, node_id in enumerate(layer)}
+        for sweep in range(SWEEPS * 2):
+            downward = sweep % 2 == 0
+            indices = range(1, len(layers)) if downward else range(len(layers) - 2, -1, -1)
+            for li in indices:
+                def barycenter(node_id: str) -> float:
+                    fixed = [
+                        pos[n] for n in adjacency.get(node_id, ())
+                        if (layer_of[n] < li if downward else layer_of[n] > li)
+                    ]
+                    return sum(fixed) / len(fixed) if fixed else pos[node_id]
+                layers[li].sort(key=barycenter)
+                for i, node_id in enumerate(layers[li]):
+                    pos[node_id] = i / len(layers[li])
+            crossings = self._count_crossings(layers, adjacency, layer_of)
+            if crossings < best_crossings:
+                best, best_crossings = [list(layer) for layer in layers], crossings
+                if crossings == 0:
+                    break
+        self.crossings += best_crossings
+        return best
+
+    def _layout_container(self, container_id: str, lifted: List[Tuple[str, str]]) -> None:
+        container = self.items[container_id]
+        kids = [self.items[c] for c in container.children]
+        band = [k for k in kids if not k.container and k.tier in BAND_TIERS]
+        flow = [k for k in kids if k.container or k.tier not in BAND_TIERS]
+
+        # Columns by rank (empty ranks collapse)
+        ranks = sorted({k.rank for k in flow})
+        column_of = {rank: i for i, rank in enumerate(ranks)}
+        layers: List[List[str]] = [[] for _ in ranks]
+        for k in flow:
+            layers[column_of[k.rank]].append(k.id)
+        self.layers = max(self.layers, len(layers))
+
+        adjacency: Dict[str, List[str]] = {}
+        for a, b in lifted:
+            adjacency.setdefault(a, []).append(b)
+            adjacency.setdefault(b, []).append(a)
+        layers = self._order(layers, adjacency)
+
+        origin_x = PAD if container_id != ROOT else 0
+        origin_y = HEADER if container_id != ROOT else 0
+
+        # Security band across the top
+        band_h = 0.0
+        x = origin_x
+        for k in band:
+            k.x, k.y = x, origin_y
+            x += k.w + GAP_X
+            band_h = max(band_h, k.h + GAP_Y)
+        band_w = x - GAP_X - origin_x if band else 0.0
+
+        # Flow columns, centred vertically against the tallest column
+        heights = [sum(self.items[n].h for n in layer) + GAP_Y * (len(layer) - 1) for layer in layers]
+        content_h = max(heights, default=0.0)
+        x = origin_x
+        for layer, height in zip(layers, heights):
+            width = max(self.items[n].w for n in layer)
+            y = origin_y + band_h + (content_h - height) / 2
+            for node_id in layer:
+                item = self.items[node_id]
+                item.x = x + (width - item.w) / 2
+                item.y = y
+                y += item.h + GAP_Y
+            x += width + GAP_X
+        flow_w = x - GAP_X - origin_x if layers else 0.0
+
+        if container_id != ROOT:
+            container.w = max(max(flow_w, band_w) + 2 * PAD, NODE_W + 2 * PAD)
+            container.h = max(HEADER + band_h + content_h + PAD, NODE_H + HEADER)
+            container.rank = min((k.rank for k in flow), default=container.rank)
+
+    def run(self) -> Dict[str, Tuple[float, float]]:
+        """Lay out every container; return absolute positions by node id."""
+        for item in self.items.values():
+            if not item.container:
+                item.rank = TIER_RANK.get(item.tier, TIER_RANK[DEFAULT_TIER])
+        order = self._link_tree()
+        lifted = self._lift_edges()
+        for container_id in order:
+            self._layout_container(container_id, lifted.get(container_id, []))
+
+        absolute: Dict[str, Tuple[float, float]] = {}
+        for container_id in reversed(order):  # parents before children
+            base = absolute.get(container_id, (0.0, 0.0))
+            for child in self.items[container_id].children:
+                item = self.items[child]
+                absolute[child] = (base[0] + item.x, base[1] + item.y)
+        return absolute
+
+    def size(self, node_id: str) -> Tuple[float, float]:
+        item = self.items[node_id]
+        return item.w, item.h
+
+    def relative(self, node_id: str) -> Tuple[float, float]:
+        item = self.items[node_id]
+        return item.x, item.y
+
+
+def _stats(layout: LayeredLayout, started: float, nodes: int) -> Dict:
+    return {
+        "engine": "layered",
+        "nodes": nodes,
+        "layers": layout.layers,
+        "crossings": layout.crossings,
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+def layout_services(services: List[Dict], connections: List[Dict]) -> Tuple[List[Dict], List[Dict], Dict]:
+    """
+    Lay out LLM `services`/`connections` output as React Flow nodes and edges.
+
+    Produces the same structure as the frontend template engine: "group"
+    nodes for AWS Cloud, VPC and public/private subnets (absolute positions,
+    size in data.width/height) and awsService nodes placed inside them.
+    """
+    started = time.perf_counter()
+    layout = LayeredLayout()
+    groups: List[Tuple[str, str, Dict]] = [("aws-cloud", "AWS Cloud", {})]
+    layout.add_node("aws-cloud", container=True)
+
+    tiers: Dict[str, str] = {}
+    for svc in services:
+        tiers[svc["id"]] = tier_for(svc.get("service_id"), svc.get("tier"))
+    used = set(tiers.values())
+
+    if used & {"public", "compute", "data"}:
+        layout.add_node("vpc", container=True)
+        layout.set_parent("vpc", "aws-cloud")
+        groups.append(("vpc", "VPC", {"isVPC": True}))
+    if "public" in used:
+        layout.add_node("public-subnet", container=True)
+        layout.set_parent("public-subnet", "vpc")
+        groups.append(("public-subnet", "Public Subnet", {"isPublic": True}))
+    if used & {"compute", "data"}:
+        layout.add_node("private-subnet", container=True)
+        layout.set_parent("private-subnet", "vpc")
+        groups.append(("private-subnet", "Private Subnet", {"isPrivate": True}))
+
+    subnet_for = {"public": "public-subnet", "compute": "private-subnet", "data": "private-subnet"}
+    for svc in services:
+        tier = tiers[svc["id"]]
+        layout.add_node(svc["id"], tier=tier)
+        layout.set_parent(svc["id"], subnet_for.get(tier, "aws-cloud"))
+
+    edges = []
+    for i, conn in enumerate(connections):
+        layout.add_edge(conn["from"], conn["to"])
+        edges.append({"id": f"edge-{i}", "source": conn["from"], "target": conn["to"], "type": "smoothstep"})
+
+    positions = layout.run()
+    nodes: List[Dict] = []
+    for group_id, label, flags in groups:
+        x, y = positions[group_id]
+        w, h = layout.size(group_id)
+        nodes.append({
+            "id": group_id,
+            "type": "group",
+            "position": {"x": x + PAD / 2, "y": y + PAD / 2},
+            "data": {"label": label, "width": w, "height": h, **flags},
+        })
+    for svc in services:
+        x, y = positions[svc["id"]]
+        nodes.append({
+            "id": svc["id"],
+            "type": "awsService",
+            "position": {"x": x + PAD / 2, "y": y + PAD / 2},
+            "data": {
+                "label": svc.get("label", ""),
+                "service_id": svc.get("service_id", ""),
+                "tier": tiers[svc["id"]],
+            },
+        })
+    return nodes, edges, _stats(layout, started, len(nodes))
+
+
+def layout_diagram(diagram: Dict) -> Dict:
+    """
+    Lay out an existing React Flow diagram in place, keeping its containers.
+
+    Children keep their parentId and get positions relative to it (React
+    Flow convention). Containers are resized to fit. Returns the diagram
+    with a "layout" stats entry.
+    """
+    started = time.perf_counter()
+    nodes = [n for n in diagram.get("nodes", []) if isinstance(n, dict) and n.get("id")]
+    layout = LayeredLayout()
+    for node in nodes:
+        data = node.get("data") or {}
+        service_id = data.get("service_id") or data.get("serviceId")
+        layout.add_node(
+            node["id"],
+            tier=tier_for(service_id, data.get("tier")),
+            container=node.get("type") in CONTAINER_TYPES,
+        )
+    for node in nodes:
+        layout.set_parent(node["id"], node.get("parentId") or node.get("parentNode"))
+    for edge in diagram.get("edges", []):
+        if isinstance(edge, dict) and edge.get("source") and edge.get("target"):
+            layout.add_edge(edge["source"], edge["target"])
+
+    layout.run()
+    for node in nodes:
+        x, y = layout.relative(node["id"])
+        node["position"] = {"x": x, "y": y}
+        if layout.items[node["id"]].container:
+            w, h = layout.size(node["id"])
+            node["width"], node["height"] = w, h
+            node["style"] = {**(node.get("style") or {}), "width": w, "height": h}
+            if node.get("type") == "group":
+                node.setdefault("data", {}).update(width=w, height=h)
+        if layout.parent.get(node["id"], ROOT) == ROOT:
+            node.pop("parentId", None)
+
+    diagram["layout"] = _stats(layout, started, len(nodes))
+    return diagram
@@ -3,13 +3,22 @@ LLM-Based Diagram Generator
 ============================
 Generates AWS architecture diagrams from natural language descriptions using OpenAI.
 Inspired by pptAgent's code generation pattern with retry mechanism.
+
+Diagram output is constrained by a JSON schema (structured outputs), so the
+retry loop only runs on transport errors or truncated output.
+`stream_diagram_with_explanation` streams nodes and edges as the model emits
+them, and starts the explanation call as soon as the service list is known.
 """
 
 import json
 import re
+import asyncio
 import logging
-from typing import Dict, Optional
-from openai import OpenAI
+from typing import AsyncIterator, Dict, Optional
+
+from async_runtime import get_async_client
+from diagram_stream import DIAGRAM_RESPONSE_FORMAT, StreamingArrayParser, provisional_node
+from layout_engine import layout_diagram, layout_services
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +27,7 @@ class LLMDiagramGenerator:
     """
     Generates React Flow diagrams from text descriptions using OpenAI.
     Uses code generation pattern with error feedback and retry mechanism.
+    All LLM calls are async and share the service's pooled OpenAI client.
     """
     
     def __init__(self, api_key: str, model: str = "gpt-4.1"):
@@ -28,14 +38,11 @@ class LLMDiagramGenerator:
             api_key: OpenAI API key
             model: Model to use (default: gpt-4.1)
         """
-        import httpx
-        # Use httpx client without proxies to avoid version conflicts
-        http_client = httpx.Client()
-        self.client = OpenAI(api_key=api_key, http_client=http_client)
+        self.client = get_async_client(api_key)
         self.model = model
         self.max_retries = 3
     
-    def generate_diagram_with_explanation(self, description: str, services_list: list = None) -> Dict:
+    async def generate_diagram_with_explanation(self, description: str, services_list: list = None) -> Dict:
         """
         Generate a React Flow diagram AND an explanation from text description.
         Creates original diagrams dynamically based on the description.
@@ -50,7 +57,7 @@ class LLMDiagramGenerator:
         logger.info(f"Generating diagram with explanation: {description[:100]}...")
         
         # First generate the diagram
-        diagram = self.generate_diagram(description, services_list)
+        diagram = await self.generate_diagram(description, services_list)
         
         if diagram.get("error"):
             return {
@@ -59,14 +66,106 @@ class LLMDiagramGenerator:
             }
         
         # Now generate an explanation of the diagram
-        explanation = self._generate_explanation(description, diagram)
+        explanation = await self._generate_explanation(description, diagram)
         
         return {
             "diagram": diagram,
             "explanation": explanation
         }
     
-    def _generate_explanation(self, description: str, diagram: Dict) -> str:
+    async def stream_diagram_with_explanation(self, description: str, services_list: list = None) -> AsyncIterator[Dict]:
+        """
+        Stream a diagram and its explanation as events.
+        
+        Yields, in arrival order:
+        - {"type": "node", "node": ...} per service (provisional position)
+        - {"type": "edge", "edge": ...} per connection between known services
+        - {"type": "explanation", "explanation": ...} once the concurrent
+          explanation call finishes
+        - {"type": "diagram", "diagram": ...} with the final laid-out diagram
+        
+        Falls back to the blocking generate_diagram (with retries) if the
+        stream fails or its output does not validate.
+        """
+        logger.info(f"Streaming diagram with explanation: {description[:100]}...")
+        
+        parser = StreamingArrayParser(("services", "connections"))
+        services, connections, nodes = [], [], []
+        service_ids = set()
+        slots: Dict[str, int] = {}
+        explanation_task: Optional[asyncio.Task] = None
+        explanation_sent = False
+        diagram = None
+        
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self._build_system_prompt(services_list)},
+                    {"role": "user", "content": self._build_user_prompt(description)}
+                ],
+                temperature=0.7,
+                max_tokens=10000,
+                response_format=DIAGRAM_RESPONSE_FORMAT,
+                stream=True
+            )
+            finish_reason = None
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                for key, item in parser.feed(chunk.choices[0].delta.content or ""):
+                    if key == "services" and item is None:
+                        # Service list complete - explain while connections stream
+                        explanation_task = asyncio.create_task(
+                            self._generate_explanation(description, {"nodes": nodes})
+                        )
+                    elif key == "services":
+                        if isinstance(item, dict) and item.get("id") and item["id"] not in service_ids:
+                            service_ids.add(item["id"])
+                            services.append(item)
+                            nodes.append(provisional_node(item, slots))
+                            yield {"type": "node", "node": nodes[-1]}
+                    elif isinstance(item, dict) and item.get("from") in service_ids and item.get("to") in service_ids:
+                        # Same ids layout_services assigns to the final edges
+                        edge = {"id": f"edge-{len(connections)}", "source": item["from"],
+                                "target": item["to"], "type": "smoothstep"}
+                        connections.append(item)
+                        yield {"type": "edge", "edge": edge}
+                if explanation_task and explanation_task.done() and not explanation_sent:
+                    explanation_sent = True
+                    yield {"type": "explanation", "explanation": explanation_task.result()}
+            
+            if finish_reason not in (None, "stop"):
+                raise ValueError(f"Stream ended early ({finish_reason})")
+            if not services:
+                raise ValueError("Stream produced no services")
+            diagram = {"services": services, "connections": connections}
+            self._validate_diagram(diagram)
+        except Exception as e:
+            logger.warning(f"Streaming generation failed, falling back to blocking generation: {e}")
+            if explanation_task and not explanation_task.done():
+                explanation_task.cancel()
+            # A fresh explanation follows for the regenerated diagram
+            explanation_task, explanation_sent = None, False
+            diagram = await self.generate_diagram(description, services_list)
+        finally:
+            # Client disconnected mid-stream
+            if explanation_task and diagram is None:
+                explanation_task.cancel()
+        
+        yield {"type": "diagram", "diagram": diagram}
+        
+        if not explanation_sent:
+            if diagram.get("error"):
+                explanation = f"Failed to generate diagram: {diagram.get('error')}"
+            elif explanation_task:
+                explanation = await explanation_task
+            else:
+                explanation = await self._generate_explanation(description, diagram)
+            yield {"type": "explanation", "explanation": explanation}
+    
+    async def _generate_explanation(self, description: str, diagram: Dict) -> str:
         """Generate a markdown explanation of the architecture diagram."""
         try:
             # Extract service names from diagram
@@ -96,7 +195,7 @@ Write a clear, educational explanation of this architecture:
 
 Use markdown formatting with headers and bullet points."""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "user", "content": explanation_prompt}
@@ -113,7 +212,7 @@ Use markdown formatting with headers and bullet points."""
             service_names = [s['name'] for s in services] if services else []
             return f"This architecture uses {', '.join(service_names)} to implement {description}."
 
-    def generate_diagram(self, description: str, services_list: list = None) -> Dict:
+    async def generate_diagram(self, description: str, services_list: list = None) -> Dict:
         """
         Generate a React Flow diagram from text description.
         
@@ -138,7 +237,7 @@ Use markdown formatting with headers and bullet points."""
                 logger.info(f"Generation attempt {attempt + 1}/{self.max_retries}")
                 
                 # Call OpenAI
-                response = self.client.chat.completions.create(
+                response = await self.client.chat.completions.create(
                     model=self.model,
                     messages=[
                         {"role": "system", "content": system_prompt},
@@ -146,7 +245,7 @@ Use markdown formatting with headers and bullet points."""
                     ],
                     temperature=0.7,
                     max_tokens=10000,
-                    response_format={"type": "json_object"}
+                    response_format=DIAGRAM_RESPONSE_FORMAT
                 )
                 
                 # Extract JSON from response
@@ -254,35 +353,20 @@ Generate valid React Flow JSON (JSON only, no markdown):"""
             if not isinstance(services, list):
                 raise ValueError("'services' must be a list")
             
-            # Convert services to nodes (frontend will handle positioning)
-            nodes = []
-            for svc in services:
-                if not isinstance(svc, dict) or "id" not in svc:
-                    continue
-                nodes.append({
-                    "id": svc["id"],
-                    "type": "awsService",
-                    "data": {
-                        "label": svc.get("label", ""),
-                        "service_id": svc.get("service_id", ""),
-                        "tier": svc.get("tier", "compute"),
-                    }
-                })
-            
-            # Convert connections to edges
-            edges = []
-            for i, conn in enumerate(connections if isinstance(connections, list) else []):
-                if isinstance(conn, dict) and "from" in conn and "to" in conn:
-                    edges.append({
-                        "id": f"edge-{i}",
-                        "source": conn["from"],
-                        "target": conn["to"],
-                    })
+            # Convert services to positioned nodes inside VPC/subnet groups
+            valid_services = [svc for svc in services if isinstance(svc, dict) and "id" in svc]
+            service_ids = {svc["id"] for svc in valid_services}
+            valid_connections = [
+                conn for conn in (connections if isinstance(connections, list) else [])
+                if isinstance(conn, dict) and conn.get("from") in service_ids and conn.get("to") in service_ids
+            ]
+            nodes, edges, layout = layout_services(valid_services, valid_connections)
+            diagram["layout"] = layout
             
             # Replace with converted format
             diagram["nodes"] = nodes
             diagram["edges"] = edges
-            diagram["services"] = services  # Keep for frontend template engine
+            diagram["services"] = services  # Keep for older frontend builds
             diagram["connections"] = connections
             return
         
@@ -298,8 +382,11 @@ Generate valid React Flow JSON (JSON only, no markdown):"""
         
         if not isinstance(diagram["edges"], list):
             raise ValueError("'edges' must be a list")
+        
+        # Deterministic layout replaces whatever positions the LLM produced
+        layout_diagram(diagram)
     
-    def enhance_diagram_with_validation(
+    async def enhance_diagram_with_validation(
         self, 
         diagram: Dict, 
         validation_results: Dict
@@ -335,7 +422,7 @@ Please improve the diagram by addressing these issues. Add missing components li
 Generate the improved React Flow JSON (JSON only, no markdown):"""
         
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": self._build_system_prompt()},
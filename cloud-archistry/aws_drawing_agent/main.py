@@ -6,10 +6,12 @@ FastAPI service for AWS architecture diagram operations.
 
 import sys
 import os
+import copy
 from pathlib import Path
 from datetime import datetime, timezone
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 import logging
@@ -18,7 +20,11 @@ import logging
 sys.path.insert(0, str(Path(__file__).parent))
 
 from agent import AWSDrawingAgent
-from bug_bounty_generator import BugBountyGenerator
+from bug_bounty_generator import BugBountyGenerator, BugDefinition
+from challenge_cache import challenge_cache, remaining_ttl
+from async_runtime import close_runtime, get_async_client, offload
+from layout_engine import layout_diagram
+from diagram_stream import sse
 import db
 
 # Configure logging
@@ -57,12 +63,11 @@ agent = AWSDrawingAgent(
 # Initialize Bug Bounty Generator
 bug_bounty_generator = BugBountyGenerator(openai_api_key=OPENAI_API_KEY)
 
-# Store active challenges (in production, use Redis or database)
-active_challenges = {}
-
 # Pydantic models
 class ServiceSearchRequest(BaseModel):
     query: str
+    limit: Optional[int] = None
+    category: Optional[str] = None
 
 class DiagramValidationRequest(BaseModel):
     diagram: Dict
@@ -140,8 +145,10 @@ async def startup():
 
 @app.on_event("shutdown")
 async def shutdown():
-    """Close database connection on shutdown."""
+    """Close database and cache connections on shutdown."""
     await db.close_pool()
+    await challenge_cache.close()
+    await close_runtime()
 
 
 @app.get("/health")
@@ -150,6 +157,13 @@ async def health_check():
     return {"status": "healthy", "service": "aws-drawing-agent"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics (database latency, rows, pool wait)."""
+    body, content_type = db.render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/stats")
 async def get_stats():
     """Get agent statistics."""
@@ -174,7 +188,7 @@ async def get_service(service_id: str):
 @app.post("/services/search")
 async def search_services(request: ServiceSearchRequest):
     """Search for AWS services."""
-    results = agent.search_services(request.query)
+    results = agent.search_services(request.query, limit=request.limit, category=request.category)
     return {"query": request.query, "results": results}
 
 
@@ -226,12 +240,46 @@ async def convert_pptx(file_path: str):
         raise HTTPException(status_code=404, detail=f"File not found")
     
     try:
-        diagram = agent.convert_architecture(str(resolved_path))
+        diagram = await offload(agent.convert_architecture, str(resolved_path))
         return diagram
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Conversion failed: {str(e)}")
 
 
+async def _generation_context(request: DiagramGenerationRequest):
+    """Description enhanced with the user's certification target and skill level."""
+    # Get user context if user_id and tenant_id provided
+    user_context = {}
+    if request.user_id and request.tenant_id:
+        user_profile = await db.get_user_profile(request.user_id, request.tenant_id)
+        if user_profile:
+            user_context = {
+                "target_certification": user_profile.get("target_certification") or request.certification_code,
+                "skill_level": user_profile.get("skill_level", "intermediate"),
+                "level": user_profile.get("level", 1),
+            }
+    
+    # Override with request parameters if provided
+    if request.certification_code:
+        user_context["target_certification"] = request.certification_code
+    if request.difficulty:
+        user_context["skill_level"] = request.difficulty
+    
+    # Enhance description with user context
+    enhanced_description = request.description
+    if user_context:
+        context_info = []
+        if user_context.get("target_certification"):
+            context_info.append(f"Target certification: {user_context['target_certification']}")
+        if user_context.get("skill_level"):
+            context_info.append(f"Skill level: {user_context['skill_level']}")
+        
+        if context_info:
+            enhanced_description = f"{request.description}\n\nContext: {', '.join(context_info)}"
+    
+    return enhanced_description, user_context
+
+
 @app.post("/diagrams/generate")
 async def generate_diagram(request: DiagramGenerationRequest):
     """
@@ -241,37 +289,10 @@ async def generate_diagram(request: DiagramGenerationRequest):
     Requires OpenAI API key to be configured.
     """
     try:
-        # Get user context if user_id and tenant_id provided
-        user_context = {}
-        if request.user_id and request.tenant_id:
-            user_profile = await db.get_user_profile(request.user_id, request.tenant_id)
-            if user_profile:
-                user_context = {
-                    "target_certification": user_profile.get("target_certification") or request.certification_code,
-                    "skill_level": user_profile.get("skill_level", "intermediate"),
-                    "level": user_profile.get("level", 1),
-                }
-        
-        # Override with request parameters if provided
-        if request.certification_code:
-            user_context["target_certification"] = request.certification_code
-        if request.difficulty:
-            user_context["skill_level"] = request.difficulty
-        
-        # Enhance description with user context
-        enhanced_description = request.description
-        if user_context:
-            context_info = []
-            if user_context.get("target_certification"):
-                context_info.append(f"Target certification: {user_context['target_certification']}")
-            if user_context.get("skill_level"):
-                context_info.append(f"Skill level: {user_context['skill_level']}")
-            
-            if context_info:
-                enhanced_description = f"{request.description}\n\nContext: {', '.join(context_info)}"
+        enhanced_description, user_context = await _generation_context(request)
         
         # Generate diagram WITH explanation
-        result = agent.generate_diagram_with_explanation(enhanced_description)
+        result = await agent.generate_diagram_with_explanation(enhanced_description)
         
         diagram = result.get("diagram", {})
         explanation = result.get("explanation", "")
@@ -293,6 +314,48 @@ async def generate_diagram(request: DiagramGenerationRequest):
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
 
+@app.post("/diagrams/generate/stream")
+async def generate_diagram_stream(request: DiagramGenerationRequest):
+    """
+    Streaming variant of /diagrams/generate (Server-Sent Events).
+    
+    Events: "node" and "edge" as the model produces them (provisional
+    positions), "explanation" when the concurrent explanation call finishes,
+    "diagram" with the final laid-out nodes/edges, then "complete" with the
+    same payload as /diagrams/generate. Failures are sent as "error".
+    """
+    async def event_stream():
+        try:
+            enhanced_description, user_context = await _generation_context(request)
+            async for event in agent.stream_diagram_with_explanation(enhanced_description):
+                if event["type"] == "complete":
+                    diagram = event["diagram"]
+                    metadata = event["metadata"]
+                    metadata["user_context"] = user_context
+                    metadata["generated_from"] = request.description
+                    event = {
+                        "type": "complete",
+                        "nodes": diagram.get("nodes", []),
+                        "edges": diagram.get("edges", []),
+                        "explanation": event["explanation"],
+                        "metadata": metadata,
+                    }
+                yield sse(event)
+        except Exception as e:
+            logger.error(f"Streaming diagram generation failed: {e}")
+            yield sse({"type": "error", "message": f"Generation failed: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
 @app.post("/bug-bounty/generate")
 async def generate_bug_bounty(request: BugBountyGenerateRequest):
     """
@@ -346,8 +409,13 @@ async def generate_bug_bounty(request: BugBountyGenerateRequest):
             time_limit=challenge.time_limit,
         )
         
-        # Also keep in memory for faster access during active session
-        active_challenges[challenge.challenge_id] = challenge
+        # Cache hidden bugs for the lifetime of the challenge so every worker
+        # can validate claims without going back to the database
+        await challenge_cache.put(
+            challenge.challenge_id,
+            challenge.hidden_bugs,
+            ttl=challenge.time_limit,
+        )
         
         # Return challenge WITHOUT hidden bugs (those are secret!)
         return {
@@ -370,19 +438,23 @@ async def generate_bug_bounty(request: BugBountyGenerateRequest):
 async def validate_bug_claim(request: BugBountyValidateRequest):
     """
     Validate a user's bug claim against the hidden bugs in the challenge.
-    Fetches challenge from database if not in memory.
+    Fetches challenge from database if not in the challenge cache.
     Returns whether the claim is correct, points awarded, and explanation.
     """
     try:
-        # Try memory first, then database
-        challenge = active_challenges.get(request.challenge_id)
-        challenge_data = None
+        # Try the challenge cache first, then database
+        hidden_bugs = await challenge_cache.get_hidden_bugs(request.challenge_id)
         
-        if not challenge:
-            # Fetch from database
+        if hidden_bugs is None:
             challenge_data = await db.get_bug_bounty_challenge(request.challenge_id)
             if not challenge_data:
                 raise HTTPException(status_code=404, detail="Challenge not found or expired")
+            hidden_bugs = [BugDefinition(**bug) for bug in challenge_data["hidden_bugs"]]
+            await challenge_cache.put(
+                request.challenge_id,
+                hidden_bugs,
+                ttl=remaining_ttl(challenge_data["started_at"], challenge_data["time_limit"]),
+            )
         
         # Validate claim
         claim_data = {
@@ -398,35 +470,14 @@ async def validate_bug_claim(request: BugBountyValidateRequest):
         api_key = request.openai_api_key or OPENAI_API_KEY
         generator = BugBountyGenerator(openai_api_key=api_key)
         
-        # Validate using either in-memory challenge or database data
-        if challenge:
-            result = generator.validate_claim(
-                challenge, 
-                claim_data,
-                cert_code=request.cert_code,
-                user_level=request.user_level
-            )
-        else:
-            # Reconstruct minimal challenge object from database for validation
-            from bug_bounty_generator import BugBountyChallenge, BugDefinition, AWSEnvironment
-            hidden_bugs = [
-                BugDefinition(**bug) for bug in challenge_data["hidden_bugs"]
-            ]
-            result = generator.validate_claim_from_bugs(
-                hidden_bugs, 
-                claim_data,
-                cert_code=request.cert_code,
-                user_level=request.user_level
-            )
-        
-        # Update progress in database
-        if challenge_data:
-            new_bugs_found = challenge_data["bugs_found"] + (1 if result.get("correct") else 0)
-            new_score = challenge_data["score"] + result.get("points", 0)
-        else:
-            # Get current state from memory
-            new_bugs_found = result.get("correct", False) and 1 or 0
-            new_score = result.get("points", 0)
+        # Ambiguous claims fall through to a blocking LLM call
+        result = await offload(
+            generator.validate_claim_from_bugs,
+            hidden_bugs, 
+            claim_data,
+            cert_code=request.cert_code,
+            user_level=request.user_level
+        )
         
         claim_entry = {
             "claim": claim_data,
@@ -434,10 +485,14 @@ async def validate_bug_claim(request: BugBountyValidateRequest):
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
         
-        await db.update_bug_bounty_progress(
+        # Apply the claim as increments, never read-modify-write, so
+        # concurrent claims on different workers are all counted
+        correct = bool(result.get("correct"))
+        points = result.get("points", 0)
+        await db.record_bug_bounty_claim(
             challenge_id=request.challenge_id,
-            bugs_found=new_bugs_found,
-            score=new_score,
+            bugs_found_delta=1 if correct else 0,
+            points=points,
             claim_entry=claim_entry,
         )
         
@@ -453,17 +508,16 @@ async def validate_bug_claim(request: BugBountyValidateRequest):
 async def reveal_bugs(challenge_id: str):
     """
     Reveal all bugs in a challenge (after time expires or user gives up).
-    Fetches from database if not in memory.
+    Fetches from database if not in the challenge cache.
     Returns the complete list of bugs with explanations.
     Then DELETES the challenge from database to keep it clean.
     """
     try:
-        # Try memory first
-        challenge = active_challenges.get(challenge_id)
-        challenge_data = None
+        # Try the challenge cache first
+        hidden_bugs = await challenge_cache.get_hidden_bugs(challenge_id)
         
-        if challenge:
-            bugs = [bug.model_dump() for bug in challenge.hidden_bugs]
+        if hidden_bugs is not None:
+            bugs = [bug.model_dump() for bug in hidden_bugs]
         else:
             # Fetch from database
             challenge_data = await db.get_bug_bounty_challenge(challenge_id)
@@ -474,9 +528,8 @@ async def reveal_bugs(challenge_id: str):
         # Delete from database to keep it clean
         await db.delete_bug_bounty_challenge(challenge_id)
         
-        # Remove from memory too
-        if challenge_id in active_challenges:
-            del active_challenges[challenge_id]
+        # Remove from the challenge cache too
+        await challenge_cache.delete(challenge_id)
         
         return {
             "challenge_id": challenge_id,
@@ -493,15 +546,14 @@ async def reveal_bugs(challenge_id: str):
 async def delete_challenge(challenge_id: str):
     """
     Delete a Bug Bounty challenge (user exits without finishing).
-    Cleans up database and memory.
+    Cleans up database and the challenge cache.
     """
     try:
         # Delete from database
         await db.delete_bug_bounty_challenge(challenge_id)
         
-        # Remove from memory
-        if challenge_id in active_challenges:
-            del active_challenges[challenge_id]
+        # Remove from the challenge cache
+        await challenge_cache.delete(challenge_id)
         
         return {"success": True, "message": "Challenge deleted"}
     except Exception as e:
@@ -538,7 +590,7 @@ async def generate_architect_arena(request: ArchitectArenaGenerateRequest):
             difficulty = request.options.get("difficulty")
         
         # Generate puzzle
-        puzzle = generator.generate_puzzle(
+        puzzle = await generator.generate_puzzle(
             user_level=request.user_level,
             cert_code=request.certification_code,
             difficulty=difficulty,
@@ -564,21 +616,20 @@ async def audit_architect_arena(request: ArchitectArenaAuditRequest):
     Audit an Architect Arena puzzle submission.
     
     Evaluates the user's placement and connections against the expected
-    architecture and returns a score with feedback.
+    architecture and returns a score with feedback. Scoring is deterministic;
+    an API key only enables LLM-written feedback.
     """
     try:
         from architect_arena import ArchitectArenaGenerator
         
-        # Use provided API key or fallback to environment
+        # Use provided API key or fallback to environment (optional here)
         api_key = request.openai_api_key or OPENAI_API_KEY
-        if not api_key:
-            raise HTTPException(status_code=400, detail="OpenAI API key required")
         
         model = request.preferred_model or "gpt-4.1"
         generator = ArchitectArenaGenerator(openai_api_key=api_key, model=model)
         
         # Audit the submission
-        result = generator.audit_puzzle(
+        result = await generator.audit_puzzle(
             puzzle_title=request.puzzle_title,
             puzzle_brief=request.puzzle_brief,
             expected_hierarchy=request.expected_hierarchy or {},
@@ -677,21 +728,24 @@ Requirements:
 1. Keep all existing services the user placed
 2. Ensure proper VPC/subnet structure if missing
 3. Add any critical missing components (load balancers, security groups conceptually)
-4. Optimize node positions for clean visual layout
-5. Ensure edges connect logically
+4. Ensure edges connect logically
+5. Give every service a tier - positions are computed by the layout engine
 
 Return the enhanced React Flow diagram JSON with improved structure."""
 
         # Generate enhanced diagram
-        result = llm_gen.generate_diagram_with_explanation(enhancement_prompt)
-        enhanced_diagram = result.get("diagram", diagram)
+        result = await llm_gen.generate_diagram_with_explanation(enhancement_prompt)
+        enhanced_diagram = result.get("diagram") or {}
         explanation = result.get("explanation", "")
+        if enhanced_diagram.get("error") or not enhanced_diagram.get("nodes"):
+            # Generation failed - fall back to the user's own diagram, cleanly laid out
+            enhanced_diagram = layout_diagram(copy.deepcopy(diagram))
         
         # Step 4: Extract services list for portfolio
         services_used = []
         for node in enhanced_diagram.get("nodes", []):
             label = node.get("data", {}).get("label")
-            if label and node.get("type") not in ["vpc", "subnet"]:
+            if label and node.get("type") not in ["vpc", "subnet", "group"]:
                 if label not in services_used:
                     services_used.append(label)
         
@@ -801,8 +855,7 @@ async def generate_console_data(request: ConsoleGeneratorRequest):
         # Search knowledge base for AWS service context
         service_context = {}
         try:
-            from openai import AsyncOpenAI
-            client = AsyncOpenAI(api_key=api_key)
+            client = get_async_client(api_key)
             
             # Build search query from challenge services
             search_query = f"AWS {' '.join(request.aws_services[:5])} architecture best practices {request.industry}"
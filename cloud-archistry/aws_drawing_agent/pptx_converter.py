@@ -8,7 +8,6 @@ from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from typing import Dict, List, Optional, Tuple
 import logging
-import json
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -372,36 +371,26 @@ class PPTXToReactFlowConverter:
         
         return None
     
-    def convert_all_architectures(self, architectures_dir: str, output_dir: str):
+    def convert_all_architectures(self, architectures_dir: str, output_dir: str, workers: int = None, force: bool = False):
         """
         Convert all PowerPoint files in a directory to React Flow format.
+        Runs in parallel and skips files whose converted output is current
+        (see conversion_pipeline).
         
         Args:
             architectures_dir: Directory containing PPTX files
             output_dir: Directory to save JSON outputs
+            workers: Number of worker processes (defaults to CPU count)
+            force: Reconvert every file, even if unchanged
         """
-        arch_path = Path(architectures_dir)
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        pptx_files = list(arch_path.glob("*.pptx"))
-        logger.info(f"Converting {len(pptx_files)} architecture files")
-        
-        results = []
-        for pptx_file in pptx_files:
-            result = self.convert_file(str(pptx_file))
-            
-            # Save to JSON
-            output_file = output_path / f"{pptx_file.stem}.json"
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            results.append({
-                "file": pptx_file.name,
-                "nodes": len(result.get("nodes", [])),
-                "edges": len(result.get("edges", [])),
-                "output": str(output_file),
-            })
-        
-        logger.info(f"Converted {len(results)} files")
+        from conversion_pipeline import convert_directory
+        
+        results, _ = convert_directory(
+            architectures_dir,
+            output_dir,
+            workers=workers,
+            force=force,
+            target_width=self.target_width,
+            target_height=self.target_height,
+        )
         return results
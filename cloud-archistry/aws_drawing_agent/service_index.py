@@ -0,0 +1,294 @@
+"""
+AWS Service Search Index
+========================
+Load-time search index over the service catalogue, built for the diagram
+canvas autocomplete.
+
+Every service contributes searchable terms: its id (with and without
+separators), display name, common aliases ("simple queue service", "k8s")
+and the documentation URL patterns from aws_service_url_mapping. Two
+structures are built once:
+
+- a prefix table (a flattened trie): every prefix of every term and word
+  maps straight to its ranked service ids, and an infix table does the same
+  for inner substrings of 3+ characters ("balancing" in
+  "elasticloadbalancing"), so a keystroke costs a couple of dict hits;
+- a padded bigram index over terms, used only when nothing matches, to find
+  typo-tolerant candidates ("dynamdb" -> dynamodb) that are then ranked by
+  bounded edit distance.
+
+Results per (query, limit, category) are memoized in an LRU, since many
+users typing produce the same short prefixes over and over.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Field weights: an id hit outranks a name hit, which outranks an alias, ...
+ID_WEIGHT = 1.0
+NAME_WEIGHT = 0.9
+ALIAS_WEIGHT = 0.8
+URL_WEIGHT = 0.6
+
+EXACT_SCORE = 100     # query equals a whole term
+PREFIX_SCORE = 80     # query is a prefix of a whole term
+WORD_SCORE = 60       # query is a prefix of a later word in a term
+INFIX_SCORE = 40      # query occurs inside a term
+FUZZY_SCORE = 30      # query is within edit distance of a term (minus 10 per edit)
+MULTI_WORD_FACTOR = 0.9
+MIN_INFIX = 3
+CACHE_SIZE = 4096
+
+# Basic categorisation, precomputed once instead of per lookup
+SERVICE_CATEGORIES: Dict[str, str] = {
+    **dict.fromkeys(["ec2", "lambda", "ecs", "eks", "fargate", "batch", "lightsail"], "compute"),
+    **dict.fromkeys(["s3", "ebs", "efs", "fsx", "glacier", "backup"], "storage"),
+    **dict.fromkeys(["rds", "dynamodb", "aurora", "elasticache", "redshift", "neptune", "documentdb"], "database"),
+    **dict.fromkeys(["vpc", "cloudfront", "route53", "alb", "nlb", "vpn-gateway", "direct-connect"], "networking"),
+    **dict.fromkeys(["iam", "kms", "secrets-manager", "cognito", "waf", "shield", "guardduty"], "security"),
+}
+CATEGORIES = ("compute", "storage", "database", "networking", "security", "other")
+
+# Names people type that appear nowhere in the id or URL patterns
+SERVICE_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "ec2": ("elastic compute cloud", "virtual machine", "instance", "server"),
+    "lambda": ("serverless function", "function"),
+    "ecs": ("elastic container service", "container", "docker"),
+    "eks": ("elastic kubernetes service", "kubernetes", "k8s"),
+    "ecr": ("elastic container registry", "container registry"),
+    "s3": ("simple storage service", "bucket", "object storage"),
+    "ebs": ("elastic block store", "block storage", "volume"),
+    "efs": ("elastic file system", "file storage", "nfs"),
+    "rds": ("relational database service", "postgres", "mysql", "sql database"),
+    "aurora": ("aurora serverless",),
+    "dynamodb": ("nosql", "dynamo"),
+    "elasticache": ("redis", "memcached", "cache"),
+    "redshift": ("data warehouse",),
+    "documentdb": ("mongodb",),
+    "alb": ("application load balancer", "elb", "load balancer"),
+    "nlb": ("network load balancer", "elb", "load balancer"),
+    "route53": ("dns",),
+    "cloudfront": ("cdn", "content delivery"),
+    "vpc": ("virtual private cloud", "network"),
+    "nacl": ("network acl",),
+    "iam": ("identity and access management",),
+    "iam-identity-center": ("sso", "single sign on"),
+    "kms": ("key management service", "encryption"),
+    "acm": ("certificate manager", "ssl", "tls"),
+    "waf": ("web application firewall", "firewall"),
+    "shield": ("ddos",),
+    "cognito": ("user pool", "authentication"),
+    "sqs": ("simple queue service", "queue"),
+    "sns": ("simple notification service", "notification", "pub sub"),
+    "ses": ("simple email service", "email"),
+    "mq": ("amazon mq", "activemq", "rabbitmq"),
+    "step-functions": ("state machine", "workflow"),
+    "eventbridge": ("event bus", "cloudwatch events"),
+    "api-gateway": ("rest api", "http api", "websocket api"),
+    "msk": ("kafka", "managed streaming for kafka"),
+    "kinesis-streams": ("data streams",),
+    "opensearch": ("elasticsearch",),
+    "cloudwatch": ("monitoring", "metrics"),
+    "cloudtrail": ("audit log",),
+    "cloudformation": ("infrastructure as code", "iac"),
+    "systems-manager": ("ssm", "parameter store"),
+    "xray": ("tracing",),
+}
+
+_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse every run of punctuation/whitespace to one space."""
+    return _SEPARATOR_RE.sub(" ", text.lower()).strip()
+
+
+def category_for(service_id: str) -> str:
+    return SERVICE_CATEGORIES.get(service_id, "other")
+
+
+def _bigrams(term: str) -> Set[str]:
+    padded = f"^{term}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _ranked(buckets: Dict[str, Dict[str, float]]) -> Dict[str, Tuple[Tuple[str, float], ...]]:
+    return {
+        key: tuple(sorted(bucket.items(), key=lambda item: (-item[1], item[0])))
+        for key, bucket in buckets.items()
+    }
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, giving up once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class ServiceIndex:
+    """Prefix table plus bigram index over the service catalogue."""
+
+    def __init__(self):
+        self.services: Dict[str, Dict] = {}
+        self.by_category: Dict[str, Tuple[str, ...]] = {}
+        self._prefixes: Dict[str, Tuple[Tuple[str, float], ...]] = {}
+        self._infixes: Dict[str, Tuple[Tuple[str, float], ...]] = {}
+        self._terms: Dict[str, Dict[str, float]] = {}   # term -> {service_id: field weight}
+        self._grams: Dict[str, Set[str]] = {}           # bigram -> terms containing it
+        self._search = lru_cache(maxsize=CACHE_SIZE)(self._search_uncached)
+
+    def __len__(self) -> int:
+        return len(self.services)
+
+    def build(self, services: Dict[str, Dict]) -> None:
+        """Index a catalogue of {service_id: {"id", "name", "url_patterns", "category"}}."""
+        self.services = dict(services)
+        prefixes: Dict[str, Dict[str, float]] = {}
+        self._terms = {}
+        self._grams = {}
+        categories: Dict[str, List[str]] = {}
+
+        def add_prefixes(text: str, service_id: str, score: float) -> None:
+            for end in range(1, len(text) + 1):
+                prefix = text[:end]
+                value = score * (EXACT_SCORE if end == len(text) else PREFIX_SCORE) / PREFIX_SCORE
+                bucket = prefixes.setdefault(prefix, {})
+                if value > bucket.get(service_id, 0.0):
+                    bucket[service_id] = value
+
+        for service_id, service in self.services.items():
+            categories.setdefault(service.get("category") or category_for(service_id), []).append(service_id)
+            fields = [(service_id, ID_WEIGHT), (service.get("name", ""), NAME_WEIGHT)]
+            fields += [(alias, ALIAS_WEIGHT) for alias in SERVICE_ALIASES.get(service_id, ())]
+            fields += [(pattern, URL_WEIGHT) for pattern in service.get("url_patterns", ())]
+
+            for text, weight in fields:
+                phrase = normalize(text)
+                if not phrase:
+                    continue
+                # Shorter terms win ties ("s3" above "s3-bucket-policy" for "s3")
+                score = weight * PREFIX_SCORE - len(phrase) * 0.01
+                words = phrase.split()
+                for term in {phrase, "".join(words)}:
+                    add_prefixes(term, service_id, score)
+                    self._add_term(term, service_id, weight)
+                for word in words[1:]:
+                    add_prefixes(word, service_id, weight * WORD_SCORE - len(phrase) * 0.01)
+                    self._add_term(word, service_id, weight)
+
+        infixes: Dict[str, Dict[str, float]] = {}
+        for term, services in self._terms.items():
+            for start in range(1, len(term) - MIN_INFIX + 1):
+                for end in range(start + MIN_INFIX, len(term) + 1):
+                    bucket = infixes.setdefault(term[start:end], {})
+                    for service_id, weight in services.items():
+                        score = weight * INFIX_SCORE - len(term) * 0.01
+                        if score > bucket.get(service_id, 0.0):
+                            bucket[service_id] = score
+
+        self._prefixes = _ranked(prefixes)
+        self._infixes = _ranked(infixes)
+        self.by_category = {category: tuple(sorted(ids)) for category, ids in categories.items()}
+        self._search.cache_clear()
+
+    def _add_term(self, term: str, service_id: str, weight: float) -> None:
+        services = self._terms.setdefault(term, {})
+        if weight > services.get(service_id, 0.0):
+            services[service_id] = weight
+        for gram in _bigrams(term):
+            self._grams.setdefault(gram, set()).add(term)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def search(self, query: str, limit: Optional[int] = None, category: Optional[str] = None) -> List[Dict]:
+        """
+        Services matching `query`, best first (all matches when limit is None).
+
+        An empty query matches every service, in catalogue order.
+        """
+        if not query:
+            services = [
+                service for service_id, service in self.services.items()
+                if not category or (service.get("category") or category_for(service_id)) == category
+            ]
+            return services[:limit]
+        ids = self._search(normalize(query), limit, category)
+        return [self.services[service_id] for service_id in ids]
+
+    def category_counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(CATEGORIES, 0)
+        counts.update({category: len(ids) for category, ids in self.by_category.items()})
+        return counts
+
+    def _search_uncached(self, query: str, limit: Optional[int], category: Optional[str]) -> Tuple[str, ...]:
+        if not query:
+            return ()
+        scores = self._match(query)
+        words = query.split()
+        if len(words) > 1:
+            # Every word must match something ("gateway api" -> api-gateway)
+            per_word = [self._match(word) for word in words]
+            shared = set.intersection(*(set(hits) for hits in per_word))
+            for service_id in shared:
+                score = MULTI_WORD_FACTOR * sum(hits[service_id] for hits in per_word) / len(per_word)
+                if score > scores.get(service_id, 0.0):
+                    scores[service_id] = score
+
+        if category:
+            allowed = set(self.by_category.get(category, ()))
+            scores = {sid: score for sid, score in scores.items() if sid in allowed}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return tuple(service_id for service_id, _ in ranked[:limit])
+
+    def _match(self, text: str) -> Dict[str, float]:
+        """Prefix and infix hits for one query string, falling back to fuzzy hits."""
+        scores: Dict[str, float] = {}
+        compact = text.replace(" ", "")
+        for key in {text, compact}:
+            for service_id, score in self._prefixes.get(key, ()):
+                if score > scores.get(service_id, 0.0):
+                    scores[service_id] = score
+
+        for service_id, score in self._infixes.get(compact, ()):
+            if score > scores.get(service_id, 0.0):
+                scores[service_id] = score
+
+        if not scores and len(compact) >= MIN_INFIX:
+            max_edits = 1 if len(compact) <= 5 else 2
+            for term in self._candidates(compact):
+                edits = min(
+                    edit_distance(compact, term, max_edits),
+                    edit_distance(compact, term[:len(compact)], max_edits),
+                )
+                if edits <= max_edits:
+                    self._credit(scores, term, FUZZY_SCORE - 10 * edits)
+        return scores
+
+    def _candidates(self, text: str) -> Iterable[str]:
+        """Terms sharing at least one bigram with `text`."""
+        found: Set[str] = set()
+        for gram in _bigrams(text):
+            found |= self._grams.get(gram, set())
+        return found
+
+    def _credit(self, scores: Dict[str, float], term: str, base: float) -> None:
+        for service_id, weight in self._terms[term].items():
+            score = weight * base - len(term) * 0.01
+            if score > scores.get(service_id, 0.0):
+                scores[service_id] = score
@@ -0,0 +1,125 @@
+"""
+Test Challenge Cache
+====================
+Bug Bounty challenge cache against a throwaway redis-server: the compact bug
+encoding, sharing between workers, expiry and degrading to a miss.
+
+Run with: pytest test_challenge_cache.py -v
+"""
+
+import sys
+import time
+import shutil
+import socket
+import asyncio
+import subprocess
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import challenge_cache  # noqa: E402
+from bug_bounty_generator import BugDefinition  # noqa: E402
+from challenge_cache import BugBountyChallengeCache, decode_bugs, encode_bugs, remaining_ttl  # noqa: E402
+
+BUGS = [
+    BugDefinition(
+        id="bug_1",
+        type="security",
+        severity="critical",
+        location="s3-assets",
+        description="S3 bucket allows public read access",
+        evidence_in_logs=["config-rule-s3-public-read"],
+        blast_radius="high",
+        fix_suggestion="Enable Block Public Access",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def redis_url():
+    if not shutil.which("redis-server"):
+        pytest.skip("redis-server not installed")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    proc = subprocess.Popen(
+        ["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    yield f"redis://127.0.0.1:{port}"
+    proc.terminate()
+    proc.wait()
+
+
+@pytest.fixture
+def workers(redis_url, monkeypatch):
+    """Two caches on the same Redis, as two gunicorn workers would have."""
+    monkeypatch.setattr(challenge_cache, "REDIS_URL", redis_url)
+    return [BugBountyChallengeCache(), BugBountyChallengeCache()]
+
+
+def test_bug_encoding_round_trip():
+    assert decode_bugs(encode_bugs(BUGS)) == BUGS
+    assert '"id"' not in encode_bugs(BUGS)
+
+
+def test_remaining_ttl():
+    started = datetime.now(timezone.utc) - timedelta(seconds=100)
+    assert 299 <= remaining_ttl(started, 400) <= 300
+    assert remaining_ttl(started.replace(tzinfo=None), 60) == 0
+    assert remaining_ttl(None, 400) == 0
+
+
+def test_challenge_is_shared_between_workers(workers):
+    async def scenario():
+        first, second = workers
+        assert await first.put("ch_1", BUGS, ttl=60)
+        assert await second.get_hidden_bugs("ch_1") == BUGS
+        assert await (await second.get_redis()).ttl(f"{challenge_cache.CHALLENGE_PREFIX}ch_1") > 0
+
+        assert await second.delete("ch_1")
+        assert await first.get_hidden_bugs("ch_1") is not None  # still in the first worker's LRU
+        assert await second.get_hidden_bugs("ch_1") is None
+
+        assert not await first.put("ch_2", BUGS, ttl=0)  # already expired
+        assert await second.get_hidden_bugs("ch_2") is None
+
+        await first.close()
+        await second.close()
+
+    asyncio.run(scenario())
+
+
+def test_lru_is_bounded_and_expires():
+    cache = BugBountyChallengeCache(lru_size=2)
+    cache._remember("a", BUGS, 60)
+    cache._remember("b", BUGS, 60)
+    cache._remember("c", BUGS, 60)
+    assert list(cache._lru) == ["b", "c"]
+
+    cache._remember("d", BUGS, -1)
+    assert cache._recall("d") is None
+    assert "d" not in cache._lru
+
+
+def test_redis_down_is_a_miss(monkeypatch):
+    monkeypatch.setattr(challenge_cache, "REDIS_URL", "redis://127.0.0.1:1")
+    cache = BugBountyChallengeCache()
+
+    async def scenario():
+        assert not await cache.put("ch_1", BUGS, ttl=60)
+        cache._lru.clear()
+        assert await cache.get_hidden_bugs("ch_1") is None
+        await cache.close()
+
+    asyncio.run(scenario())
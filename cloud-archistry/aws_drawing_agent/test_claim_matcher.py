@@ -0,0 +1,94 @@
+"""
+Test Claim Matcher
+==================
+Unit tests for the deterministic Bug Bounty claim fast path: what is decided
+without the LLM and what is handed to it.
+
+Run with: pytest test_claim_matcher.py -v
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bug_bounty_generator import BugDefinition  # noqa: E402
+from claim_matcher import ClaimMatcher, tokenize  # noqa: E402
+
+BUGS = [
+    BugDefinition(
+        id="bug_1",
+        type="security",
+        severity="critical",
+        location="s3-assets",
+        description="S3 bucket allows public read access to customer uploads",
+        evidence_in_logs=["config-rule-s3-public-read"],
+        blast_radius="high",
+        fix_suggestion="Enable Block Public Access",
+    ),
+    BugDefinition(
+        id="bug_2",
+        type="reliability",
+        severity="high",
+        location="rds-primary",
+        description="RDS database runs in a single availability zone without failover",
+        evidence_in_logs=[],
+        blast_radius="high",
+        fix_suggestion="Enable Multi-AZ",
+    ),
+    BugDefinition(
+        id="bug_3",
+        type="mismatch",
+        severity="medium",
+        location="description",
+        description="Description promises global low latency but there is no CDN",
+        evidence_in_logs=[],
+        blast_radius="medium",
+        fix_suggestion="Add CloudFront",
+    ),
+]
+
+
+def _claim(claim, target_id="", bug_type="", severity="", evidence=None):
+    return {"target_id": target_id, "bug_type": bug_type, "severity": severity,
+            "claim": claim, "evidence": evidence or []}
+
+
+def test_tokenize_keeps_short_service_names():
+    assert tokenize("The S3 bucket is public") == {"s3", "bucket", "public"}
+
+
+def test_clear_match_is_accepted():
+    match = ClaimMatcher(BUGS).match(_claim(
+        "The S3 bucket allows public read access to uploads", "s3-assets", "security", "critical",
+    ))
+    assert (match.decision, match.bug.id, match.match_quality) == ("accept", "bug_1", "exact")
+
+
+def test_short_valid_claims_are_not_rejected():
+    matcher = ClaimMatcher(BUGS)
+    match = matcher.match(_claim("The S3 bucket is public", "s3-assets", "security"))
+    assert (match.decision, match.bug.id) == ("accept", "bug_1")
+
+    # Too short to accept here, but not vague - the LLM decides
+    assert matcher.match(_claim("Public bucket", "s3-assets", "security")).decision == "ambiguous"
+
+
+def test_correct_description_on_wrong_target_goes_to_llm():
+    match = ClaimMatcher(BUGS).match(_claim(
+        "Database runs in a single availability zone with no failover", "s3-assets", "cost", "low",
+    ))
+    assert match.decision == "ambiguous"
+
+    match = ClaimMatcher(BUGS).match(_claim("No CDN in front of the app for global users", "alb-web", "performance"))
+    assert match.decision == "ambiguous"
+
+
+def test_placeholder_is_rejected_as_vague():
+    match = ClaimMatcher(BUGS).match(_claim("bug here", "s3-assets", "security"))
+    assert (match.decision, match.reason) == ("reject", "vague")
+
+
+def test_unrelated_claim_is_rejected():
+    match = ClaimMatcher(BUGS).match(_claim("Lambda timeout too short for batch jobs", "lambda-worker", "performance"))
+    assert (match.decision, match.reason) == ("reject", "no_match")
@@ -0,0 +1,100 @@
+"""
+Test Architecture Index
+=======================
+Reference architecture lookup: tokenizing, per-diagram summaries, TF-IDF
+plus service-overlap ranking, synonym expansion and rebuilding after new
+entries are added.
+
+Run with: pytest tests/test_architecture_index.py -v
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from architecture_index import (  # noqa: E402
+    MAX_SERVICE_NODES,
+    ArchitectureEntry,
+    ArchitectureIndex,
+    summarize_architecture,
+    tokenize,
+)
+
+
+def _diagram(*services, labels=()):
+    nodes = [
+        {"id": f"n{i}", "type": "awsService", "position": {"x": i * 100, "y": 50},
+         "data": {"service_id": service_id, "label": service_id.upper()}}
+        for i, service_id in enumerate(services)
+    ]
+    nodes += [{"id": f"t{i}", "type": "text", "data": {"label": label}} for i, label in enumerate(labels)]
+    edges = [{"id": f"e{i}", "source": f"n{i}", "target": f"n{i + 1}"} for i in range(len(services) - 1)]
+    return {"nodes": nodes, "edges": edges}
+
+
+def _index():
+    index = ArchitectureIndex()
+    index.add("serverless-api", "Serverless API Backend", _diagram("api-gateway", "lambda", "dynamodb"))
+    index.add("web-tier", "Three Tier Web Application", _diagram("alb", "ec2", "rds"))
+    index.add("streaming", "Clickstream Analytics", _diagram("kinesis-streams", "lambda", "s3",
+                                                                 labels=["Real-time event streams"]))
+    return index
+
+
+def test_tokenize():
+    assert tokenize("The AWS Streams and Pipelines for S3 ML") == ["stream", "pipeline", "s3", "ml"]
+    assert tokenize("access class") == ["access", "class"]  # double s is not a plural
+
+
+def test_summary_collects_services_bounds_and_terms():
+    diagram = _diagram(*[f"svc-{i}" for i in range(MAX_SERVICE_NODES + 2)], labels=["Data lake"])
+    entry = summarize_architecture("lake", "Data Lake", diagram)
+
+    assert len(entry.services) == MAX_SERVICE_NODES + 2
+    assert len(entry.service_nodes) == MAX_SERVICE_NODES
+    assert entry.total_nodes == MAX_SERVICE_NODES + 3
+    assert entry.layout_bounds == {"min_x": 0, "max_x": (MAX_SERVICE_NODES + 1) * 100, "min_y": 50, "max_y": 50}
+    assert entry.terms["lake"] == 4  # name terms are boosted over label terms
+    assert summarize_architecture("empty", "Empty", {}).layout_bounds["max_x"] == 1200
+
+    restored = ArchitectureEntry.from_dict(entry.to_dict())
+    assert restored.services == entry.services and restored.terms == entry.terms
+    assert set(entry.as_reference()) == {"name", "services", "edges", "layout_bounds", "total_nodes"}
+
+
+def test_text_query_ranks_by_name_and_labels():
+    index = _index()
+    assert index.best_match("serverless backend").id == "serverless-api"
+    assert index.best_match("three tier web app").id == "web-tier"
+    assert index.best_match("real-time event streams").id == "streaming"
+    assert index.search("quantum teleportation") == []
+
+
+def test_synonyms_and_services_widen_the_match():
+    index = _index()
+    # "function" only reaches the serverless architecture through its keyword group
+    assert index.best_match("function").id == "serverless-api"
+    # No text match at all, the service overlap alone finds it
+    assert index.services_in("put an api gateway in front of dynamodb") == {"api-gateway", "dynamodb"}
+    assert index.best_match("put an api gateway in front of dynamodb").id == "serverless-api"
+    assert index.best_match("anything", services=["alb", "rds"]).id == "web-tier"
+
+    scores = [score for score, _ in index.search("lambda functions", limit=5)]
+    assert scores == sorted(scores, reverse=True) and len(scores) == 2
+
+
+def test_adding_entries_rebuilds_on_next_search():
+    index = _index()
+    assert index.best_match("kubernetes cluster") is None
+
+    index.add("eks-platform", "Kubernetes Platform", _diagram("eks", "ecr"))
+    assert len(index) == 4
+    assert index.best_match("kubernetes cluster").id == "eks-platform"
+    assert "eks" in index.service_postings
+
+    # Replacing an entry drops its old terms from the postings
+    index.add_entry(summarize_architecture("eks-platform", "Nightly Batch Jobs", _diagram("batch")))
+    assert index.best_match("kubernetes cluster") is None
+    assert "eks" not in index.service_postings
+    assert ArchitectureIndex().search("anything") == []
@@ -0,0 +1,115 @@
+"""
+Test Architecture Store
+=======================
+Packed architecture store: diagrams and index summaries survive a pack and
+reopen unchanged, and a stale, corrupt or unwritable pack is rebuilt or
+skipped instead of served.
+
+Run with: pytest tests/test_architecture_store.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from architecture_index import ArchitectureIndex, summarize_architecture  # noqa: E402
+from architecture_store import PACK_NAME, ArchitectureStore, build_pack, open_store  # noqa: E402
+
+DIAGRAMS = {
+    "serverless-api": {
+        "nodes": [
+            {"id": "api", "type": "awsService", "position": {"x": 0, "y": 0},
+             "data": {"service_id": "api-gateway", "label": "API Gateway"}},
+            {"id": "fn", "type": "awsService", "position": {"x": 200, "y": 0},
+             "data": {"service_id": "lambda", "label": "Orders – λ"}},
+        ],
+        "edges": [{"id": "e0", "source": "api", "target": "fn"}],
+    },
+    "web-tier": {
+        "nodes": [{"id": "db", "type": "awsService", "position": {"x": 10, "y": 20},
+                   "data": {"service_id": "rds", "label": "Database"}}],
+        "edges": [],
+    },
+}
+
+
+@pytest.fixture
+def converted(tmp_path):
+    for arch_id, diagram in DIAGRAMS.items():
+        (tmp_path / f"{arch_id}.json").write_text(json.dumps(diagram, indent=2))
+    (tmp_path / "manifest.json").write_text("{}")
+    (tmp_path / "._web-tier.json").write_bytes(b"\x00\x05\x16\x07")
+    return tmp_path
+
+
+def test_pack_round_trip(converted):
+    assert build_pack(converted) == 2
+    store = ArchitectureStore(converted / PACK_NAME)
+    try:
+        assert len(store) == 2 and "manifest" not in store and "._web-tier" not in store
+        for arch_id, diagram in DIAGRAMS.items():
+            assert store.get_diagram(arch_id) == diagram
+            expected = summarize_architecture(arch_id, arch_id.replace("-", " ").title(), diagram)
+            assert store.summary(arch_id).to_dict() == expected.to_dict()
+        assert store.get_diagram("missing") is None
+
+        # Each call decodes a fresh copy, so callers cannot corrupt the pack
+        store.get_diagram("web-tier")["nodes"].clear()
+        assert store.get_diagram("web-tier") == DIAGRAMS["web-tier"]
+
+        index = ArchitectureIndex()
+        for record in store.records():
+            index.add_entry(store.summary(record["id"]))
+        assert index.best_match("serverless api").id == "serverless-api"
+    finally:
+        store.close()
+
+
+def test_open_reuses_a_fresh_pack(converted):
+    build_pack(converted, name_for=str.upper)
+    store = open_store(converted)
+    assert next(store.records())["name"] == "SERVERLESS-API"  # not rebuilt with the default names
+    store.close()
+
+
+def test_open_rebuilds_a_stale_pack(converted):
+    build_pack(converted)
+    changed = {**DIAGRAMS["web-tier"], "edges": [{"id": "new", "source": "db", "target": "db"}]}
+    (converted / "web-tier.json").write_text(json.dumps(changed))
+    (converted / "data-lake.json").write_text(json.dumps({"nodes": [], "edges": []}))
+
+    store = open_store(converted)
+    assert len(store) == 3
+    assert store.get_diagram("web-tier") == changed
+    store.close()
+
+    (converted / "data-lake.json").unlink()
+    store = open_store(converted)
+    assert "data-lake" not in store
+    store.close()
+
+
+def test_open_replaces_a_corrupt_pack(converted):
+    (converted / PACK_NAME).write_bytes(b"not a pack at all, just some bytes")
+    with pytest.raises(ValueError):
+        ArchitectureStore(converted / PACK_NAME)
+
+    store = open_store(converted)
+    assert store.get_diagram("serverless-api") == DIAGRAMS["serverless-api"]
+    store.close()
+
+
+def test_pack_location_override_and_unwritable_fallback(converted, tmp_path_factory, monkeypatch):
+    elsewhere = tmp_path_factory.mktemp("packs") / "custom.pack"
+    monkeypatch.setenv("ARCHITECTURE_PACK", str(elsewhere))
+    store = open_store(converted)
+    assert store.path == elsewhere and not (converted / PACK_NAME).exists()
+    store.close()
+
+    monkeypatch.setenv("ARCHITECTURE_PACK", str(converted / "missing-dir" / PACK_NAME))
+    assert open_store(converted) is None
+    assert not list(converted.glob(".architectures-*"))
@@ -0,0 +1,86 @@
+"""
+Test Arena Auditor
+==================
+Deterministic Architect Arena scoring: verdicts on a correct and a flawed
+three-tier submission, partial credit for over-nesting and re-weighting
+when the puzzle has no connections to check.
+
+Run with: pytest tests/test_arena_auditor.py -v
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from arena_auditor import audit_submission, default_feedback  # noqa: E402
+
+HIERARCHY = {
+    "vpc": ["subnet-public", "subnet-private"],
+    "subnet-public": ["alb"],
+    "subnet-private": ["ec2", "rds"],
+}
+CONNECTIONS = [
+    {"from_piece": "alb", "to_piece": "ec2"},
+    {"from_piece": "ec2", "to_piece": "rds"},
+    {"from_piece": "ec2", "to_piece": "s3", "required": False},
+]
+
+
+def _node(node_id, parent=None):
+    node = {"id": node_id, "label": node_id.upper()}
+    if parent:
+        node["parentId"] = parent
+    return node
+
+
+NETWORK = [_node("vpc"), _node("subnet-public", "vpc"), _node("subnet-private", "vpc"), _node("alb", "subnet-public")]
+
+
+def test_correct_submission_scores_full_marks():
+    nodes = NETWORK + [_node("ec2", "subnet-private"), _node("rds", "subnet-private"), _node("s3")]
+    # Edges are undirected, either key style is accepted and optional edges are not penalised
+    connections = [{"from": "ec2", "to": "alb"}, {"source": "rds", "target": "ec2"}, {"from": "ec2", "to": "s3"}]
+    report = audit_submission(HIERARCHY, CONNECTIONS, nodes, connections)
+
+    assert report.score == 100
+    assert (report.placement_accuracy, report.edge_f1, report.depth_accuracy) == (1.0, 1.0, 1.0)
+    assert report.missing == [] and report.suggestions == []
+    assert len(report.correct) == 7
+    assert default_feedback(report).startswith("Excellent")
+
+
+def test_flawed_submission_is_itemized():
+    nodes = NETWORK + [_node("ec2", "vpc")]  # ec2 outside its subnet, rds never placed
+    connections = [{"from": "alb", "to": "ec2"}, {"from": "alb", "to": "vpc"}]
+    report = audit_submission(HIERARCHY, CONNECTIONS, nodes, connections)
+
+    assert report.placement_accuracy == 0.6
+    assert (report.edge_precision, report.edge_recall, report.edge_f1) == (0.5, 0.5, 0.5)
+    assert report.depth_accuracy == 0.8
+    assert report.depth_errors == {"ec2": {"expected": 2, "actual": 1}}
+    assert report.score == 57
+    assert report.missing == [
+        "EC2 should be in SUBNET-PRIVATE (found in VPC)",
+        "rds was never placed on the canvas",
+        "Missing connection: EC2 to rds",
+    ]
+    assert report.suggestions == ["Connection ALB to VPC is not part of this architecture"]
+    assert default_feedback(report).startswith("Good progress")
+
+
+def test_over_nesting_gets_partial_credit_without_connections():
+    nodes = NETWORK + [_node("asg", "subnet-private"), _node("ec2", "asg"), _node("rds", "subnet-private")]
+    report = audit_submission(HIERARCHY, [], nodes, [])
+
+    assert report.placement_accuracy == 0.9  # ec2 earns half credit inside the extra container
+    assert report.edge_f1 is None  # nothing to check, so placement and depth are re-weighted
+    assert report.score == 89
+    assert report.suggestions == ["EC2 belongs directly in SUBNET-PRIVATE, not in ASG"]
+
+
+def test_empty_canvas_scores_zero():
+    report = audit_submission(HIERARCHY, CONNECTIONS, [], [])
+    assert (report.score, report.placement_accuracy, report.edge_f1) == (0, 0.0, 0.0)
+    assert report.depth_accuracy is None
+    assert default_feedback(report).startswith("Keep going")
@@ -0,0 +1,150 @@
+"""
+Test Layout Engine
+==================
+Layered diagram layout: identical output for identical input, no two boxes
+overlapping, children inside their containers, tier columns left to right
+and crossing reduction.
+
+Run with: pytest tests/test_layout_engine.py -v
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from layout_engine import NODE_H, NODE_W, LayeredLayout, layout_diagram, layout_services, tier_for  # noqa: E402
+
+SERVICES = [
+    {"id": "cdn", "service_id": "cloudfront", "label": "CloudFront"},
+    {"id": "lb", "service_id": "alb", "label": "ALB"},
+    {"id": "web-1", "service_id": "ec2", "label": "Web 1"},
+    {"id": "web-2", "service_id": "ec2", "label": "Web 2"},
+    {"id": "fn", "service_id": "lambda", "label": "Lambda"},
+    {"id": "queue", "service_id": "sqs", "label": "SQS"},
+    {"id": "db", "service_id": "rds", "label": "RDS"},
+    {"id": "cache", "service_id": "elasticache", "label": "Cache"},
+    {"id": "bucket", "service_id": "s3", "label": "S3"},
+    {"id": "keys", "service_id": "kms", "label": "KMS"},
+    {"id": "logs", "service_id": "cloudwatch", "label": "CloudWatch"},
+]
+CONNECTIONS = [
+    {"from": "cdn", "to": "lb"},
+    {"from": "lb", "to": "web-1"},
+    {"from": "lb", "to": "web-2"},
+    {"from": "web-1", "to": "cache"},
+    {"from": "web-2", "to": "db"},
+    {"from": "web-1", "to": "queue"},
+    {"from": "queue", "to": "fn"},
+    {"from": "fn", "to": "bucket"},
+]
+PARENT = {
+    "cdn": "aws-cloud", "queue": "aws-cloud", "keys": "aws-cloud", "logs": "aws-cloud",
+    "lb": "public-subnet", "web-1": "private-subnet", "web-2": "private-subnet", "fn": "private-subnet",
+    "db": "private-subnet", "cache": "private-subnet", "bucket": "private-subnet",
+    "vpc": "aws-cloud", "public-subnet": "vpc", "private-subnet": "vpc",
+}
+
+
+def _box(node):
+    data = node["data"]
+    w, h = (data["width"], data["height"]) if node["type"] == "group" else (NODE_W, NODE_H)
+    return node["position"]["x"], node["position"]["y"], w, h
+
+
+def _overlap(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def _inside(inner, outer):
+    return (outer[0] <= inner[0] and inner[0] + inner[2] <= outer[0] + outer[2]
+            and outer[1] <= inner[1] and inner[1] + inner[3] <= outer[1] + outer[3])
+
+
+def test_tier_for():
+    assert tier_for("ALB") == "public"
+    assert tier_for("s3", "edge") == "edge"  # explicit tier wins
+    assert tier_for("s3", "bogus") == "data"
+    assert tier_for("unknown-service") == tier_for(None) == "compute"
+
+
+def test_layout_is_deterministic():
+    first = layout_services(copy.deepcopy(SERVICES), copy.deepcopy(CONNECTIONS))
+    second = layout_services(copy.deepcopy(SERVICES), copy.deepcopy(CONNECTIONS))
+    assert first[0] == second[0] and first[1] == second[1]
+    assert {key: value for key, value in first[2].items() if key != "ms"} == \
+        {key: value for key, value in second[2].items() if key != "ms"}
+
+
+def test_services_do_not_overlap_and_sit_in_their_containers():
+    nodes, edges, stats = layout_services(SERVICES, CONNECTIONS)
+    boxes = {node["id"]: _box(node) for node in nodes}
+    assert [node["id"] for node in nodes if node["type"] == "group"] == \
+        ["aws-cloud", "vpc", "public-subnet", "private-subnet"]
+    assert len(edges) == len(CONNECTIONS) and stats["nodes"] == len(nodes)
+
+    for child, parent in PARENT.items():
+        assert _inside(boxes[child], boxes[parent]), child
+
+    # Siblings never overlap; nodes in different containers are kept apart by them
+    siblings = {}
+    for child, parent in PARENT.items():
+        siblings.setdefault(parent, []).append(child)
+    for group in siblings.values():
+        for i, a in enumerate(group):
+            for b in group[i + 1:]:
+                assert not _overlap(boxes[a], boxes[b]), (a, b)
+
+
+def test_columns_follow_tiers_and_security_forms_a_band():
+    boxes = {node["id"]: _box(node) for node in layout_services(SERVICES, CONNECTIONS)[0]}
+    # Inside the private subnet: compute column left of data column
+    assert boxes["web-1"][0] == boxes["web-2"][0] == boxes["fn"][0]
+    assert boxes["web-1"][0] < boxes["db"][0] == boxes["cache"][0] == boxes["bucket"][0]
+    # Inside AWS Cloud: edge left of the VPC, integration right of it
+    assert boxes["cdn"][0] < boxes["vpc"][0] < boxes["queue"][0]
+    # Security services sit above everything else in AWS Cloud
+    assert boxes["keys"][1] == boxes["logs"][1] < boxes["vpc"][1]
+
+
+def test_barycenter_ordering_removes_crossings():
+    layout = LayeredLayout()
+    for node_id, tier in [("a", "public"), ("b", "public"), ("x", "compute"), ("y", "compute")]:
+        layout.add_node(node_id, tier=tier)
+    # Insertion order puts x below y's partner: one crossing until reordered
+    layout.add_edge("a", "y")
+    layout.add_edge("b", "x")
+    positions = layout.run()
+    assert layout.crossings == 0
+    assert (positions["a"][1] < positions["b"][1]) == (positions["y"][1] < positions["x"][1])
+
+
+def test_layout_diagram_keeps_containers_and_fixes_parents():
+    diagram = {
+        "nodes": [
+            {"id": "vpc", "type": "vpc", "data": {"label": "VPC"}},
+            {"id": "web", "type": "awsService", "parentId": "vpc", "data": {"service_id": "ec2"}},
+            {"id": "db", "type": "awsService", "parentId": "vpc", "data": {"serviceId": "rds"}},
+            {"id": "orphan", "type": "awsService", "parentId": "missing", "data": {"service_id": "s3"}},
+            {"id": "loop-a", "type": "group", "parentId": "loop-b", "data": {}},
+            {"id": "loop-b", "type": "group", "parentId": "loop-a", "data": {}},
+        ],
+        "edges": [{"source": "web", "target": "db"}, {"source": "web"}],
+    }
+    result = layout_diagram(diagram)
+    nodes = {node["id"]: node for node in result["nodes"]}
+
+    assert nodes["web"]["parentId"] == "vpc"
+    assert "parentId" not in nodes["orphan"]  # unknown parent falls back to the root
+    # A parent cycle is broken at its first node
+    assert "parentId" not in nodes["loop-a"] and nodes["loop-b"]["parentId"] == "loop-a"
+    # Children are relative to the resized container and fit inside it
+    vpc = nodes["vpc"]
+    assert vpc["style"]["width"] == vpc["width"] and vpc["style"]["height"] == vpc["height"]
+    for child in ("web", "db"):
+        position = nodes[child]["position"]
+        assert 0 < position["x"] and position["x"] + NODE_W <= vpc["width"]
+        assert 0 < position["y"] and position["y"] + NODE_H <= vpc["height"]
+    assert nodes["web"]["position"]["x"] < nodes["db"]["position"]["x"]
+    assert result["layout"]["engine"] == "layered"
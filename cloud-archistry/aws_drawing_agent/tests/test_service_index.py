@@ -0,0 +1,81 @@
+"""
+Test Service Index
+==================
+Service search over the real catalogue: ranking of ids, names, aliases and
+typos, the limit/category filters, the empty query and rebuilding.
+
+Run with: pytest tests/test_service_index.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from knowledge_base import AWSKnowledgeBase  # noqa: E402
+from service_index import ServiceIndex, edit_distance, normalize  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def kb():
+    kb = AWSKnowledgeBase()
+    kb.load_services()
+    return kb
+
+
+def _ids(results):
+    return [service["id"] for service in results]
+
+
+def test_normalize_and_edit_distance():
+    assert normalize("  API-Gateway / v2 ") == "api gateway v2"
+    assert edit_distance("dynamdb", "dynamodb", 2) == 1
+    assert edit_distance("sqs", "sns", 1) == 1
+    assert edit_distance("lambda", "kinesis", 2) == 3  # gives up past the limit
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("s3", "s3"),                  # exact id outranks s3-* ids
+    ("dyn", "dynamodb"),           # prefix
+    ("DynamoDB", "dynamodb"),      # case
+    ("k8s", "eks"),                # alias
+    ("simple queue", "sqs"),       # alias prefix
+    ("dynamdb", "dynamodb"),       # typo
+    ("cloudfrnt", "cloudfront"),   # typo
+    ("gateway api", "api-gateway"),  # words in any order
+])
+def test_best_match_ranks_first(kb, query, expected):
+    assert _ids(kb.search_services(query))[0] == expected
+
+
+def test_infix_matches_inside_a_term(kb):
+    # Only in the "elasticloadbalancing" URL pattern
+    assert _ids(kb.search_services("balancing")) == ["alb", "nlb"]
+    assert _ids(kb.search_services("watch"))[:3] == ["cloudwatch", "cloudwatch-logs", "cloudwatch-alarms"]
+
+
+def test_limit_and_category(kb):
+    everything = kb.search_services("a")
+    assert _ids(kb.search_services("a", limit=3)) == _ids(everything)[:3]
+
+    databases = kb.search_services("d", category="database")
+    assert databases and all(service["category"] == "database" for service in databases)
+
+
+def test_empty_query_returns_every_service(kb):
+    assert _ids(kb.search_services("")) == list(kb.services)
+    assert _ids(kb.search_services("", limit=5)) == list(kb.services)[:5]
+    assert {service["category"] for service in kb.search_services("", category="storage")} == {"storage"}
+
+
+def test_rebuild_drops_cached_results():
+    index = ServiceIndex()
+    index.build({"sqs": {"id": "sqs", "name": "SQS"}})
+    assert _ids(index.search("sq")) == ["sqs"]
+
+    index.build({"sns": {"id": "sns", "name": "SNS"}})
+    assert index.search("sq") == []
+    assert _ids(index.search("sn")) == ["sns"]
+    assert index.category_counts()["other"] == 1
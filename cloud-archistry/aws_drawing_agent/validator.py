@@ -2,10 +2,24 @@
 Architecture Validator
 ======================
 Validates AWS architectures against best practices and security standards.
+
+Backed by the shared validation engine (shared/validation): the diagram is
+parsed once into an indexed graph and every rule runs against it.
 """
 
+import sys
 import logging
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Optional
+
+# Containers ship shared/ next to this file; local checkouts have it at the repo root
+for _parent in Path(__file__).resolve().parents:
+    if (_parent / "shared" / "validation").is_dir():
+        if str(_parent) not in sys.path:
+            sys.path.append(str(_parent))
+        break
+
+from shared.validation import DiagramGraph, RuleContext, ValidationEngine, ValidationReport  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -18,94 +32,27 @@ class ArchitectureValidator:
     - Cost optimization
     - Performance guidelines
     """
-    
-    def __init__(self):
-        """Initialize validator with rules and best practices."""
-        self.rules = self._load_validation_rules()
-    
-    def validate(self, diagram: Dict) -> Dict:
+
+    def __init__(self, engine: Optional[ValidationEngine] = None):
+        """Initialize validator with the rule engine."""
+        self.engine = engine or ValidationEngine()
+
+    def validate(self, diagram: Dict, context: Optional[RuleContext] = None) -> Dict:
         """
         Validate a diagram against all rules.
-        
+
         Args:
             diagram: React Flow diagram with nodes and edges
-            
+            context: Optional service catalogue for placement/connection rules
+
         Returns:
-            Validation results with warnings and suggestions
+            Validation results with warnings, suggestions, structured
+            findings and per-rule timings
         """
-        logger.info("Validating architecture diagram")
-        
-        results = {
-            "valid": True,
-            "warnings": [],
-            "suggestions": [],
-            "best_practices": [],
-        }
-        
-        # Extract services from diagram
-        services = self._extract_services(diagram)
-        
-        # Run validation rules
-        for rule in self.rules:
-            rule_result = rule(services, diagram)
-            if rule_result:
-                results["warnings"].extend(rule_result.get("warnings", []))
-                results["suggestions"].extend(rule_result.get("suggestions", []))
-        
-        results["valid"] = len(results["warnings"]) == 0
-        
-        return results
-    
-    def _extract_services(self, diagram: Dict) -> List[str]:
-        """Extract service IDs from diagram nodes."""
-        services = []
-        for node in diagram.get("nodes", []):
-            service_id = node.get("data", {}).get("service_id")
-            if service_id:
-                services.append(service_id)
-        return services
-    
-    def _load_validation_rules(self) -> List:
-        """Load validation rules."""
-        # Return list of validation functions
-        return [
-            self._validate_vpc_usage,
-            self._validate_high_availability,
-            self._validate_security,
-        ]
-    
-    def _validate_vpc_usage(self, services: List[str], diagram: Dict) -> Dict:
-        """Validate VPC usage for services that require it."""
-        warnings = []
-        
-        if "ec2" in services and "vpc" not in services:
-            warnings.append("EC2 instances should be in a VPC")
-        
-        if "rds" in services and "vpc" not in services:
-            warnings.append("RDS should be in a VPC")
-        
-        return {"warnings": warnings}
-    
-    def _validate_high_availability(self, services: List[str], diagram: Dict) -> Dict:
-        """Validate high availability setup."""
-        suggestions = []
-        
-        if "ec2" in services and "alb" not in services and "nlb" not in services:
-            suggestions.append("Consider adding a load balancer for high availability")
-        
-        if "rds" in services:
-            suggestions.append("Consider using Multi-AZ for RDS in production")
-        
-        return {"suggestions": suggestions}
-    
-    def _validate_security(self, services: List[str], diagram: Dict) -> Dict:
-        """Validate security best practices."""
-        suggestions = []
-        
-        if "lambda" in services and "rds" in services:
-            suggestions.append("Lambda accessing RDS should be in a VPC")
-        
-        if "ec2" in services and "s3" in services:
-            suggestions.append("Consider using IAM roles instead of access keys")
-        
-        return {"suggestions": suggestions}
+        graph = DiagramGraph.from_react_flow(diagram)
+        return self.validate_graph(graph, context).to_dict()
+
+    def validate_graph(self, graph: DiagramGraph, context: Optional[RuleContext] = None) -> ValidationReport:
+        """Run the rules against an already-parsed diagram."""
+        logger.info(f"Validating architecture diagram ({len(graph)} nodes)")
+        return self.engine.validate(graph, context)
@@ -14,10 +14,10 @@ export async function POST(request: NextRequest) {
 
     const body = await request.json();
 
-    // Get user's API key for AI-powered validation
+    // Get user's API key for AI feedback (scoring is deterministic)
     const aiConfig = await getAiConfigForRequest(session.user.academyProfileId || session.user.id);
 
-    // AI-powered validation for cert-specific feedback
+    // Scored against the stored brief, with cert-specific AI feedback
     const response = await fetch(`${LEARNING_AGENT_URL}/api/speed-deploy/validate`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
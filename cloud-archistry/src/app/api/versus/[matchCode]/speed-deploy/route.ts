@@ -139,9 +139,6 @@ export async function POST(
             industry: string;
             requirements: Array<{ category: string; description: string; priority: string }>;
             available_services: string[];
-            optimal_solution: string[];
-            acceptable_solutions: string[][];
-            trap_services?: Array<{ service_id: string; why_suboptimal: string; penalty: number }>;
             time_limit: number;
             user_level: string;
             target_cert?: string;
@@ -189,28 +186,16 @@ export async function POST(
           // Validate both submissions and calculate scores
           const brief = submitMatchState.brief;
           
-          // Get API key for AI-powered validation
+          // Get API key for AI feedback (scoring is deterministic)
           const aiConfig = await getAiConfigForRequest(session.user.academyProfileId || session.user.id);
           
-          // Validate player 1 with AI
+          // Score player 1 against the stored brief
           console.log("[PvP Speed Deploy] Validating player 1 submission:", newMatchState.player1Services);
           const p1Response = await fetch(`${LEARNING_AGENT_URL}/api/speed-deploy/validate`, {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             body: JSON.stringify({
               brief_id: brief.id,
-              client_name: brief.client_name,
-              industry: brief.industry,
-              requirements: brief.requirements,
-              available_services: brief.available_services,
-              optimal_solution: brief.optimal_solution,
-              acceptable_solutions: brief.acceptable_solutions,
-              trap_services: brief.trap_services || [],
-              time_limit: brief.time_limit,
-              user_level: brief.user_level,
-              target_cert: brief.target_cert || "",
-              max_score: brief.max_score,
-              learning_point: brief.learning_point || "",
               submitted_services: newMatchState.player1Services || [],
               time_remaining: newMatchState.player1TimeRemaining || 0,
               openai_api_key: aiConfig?.key || null,
@@ -220,25 +205,13 @@ export async function POST(
           const p1Result = await p1Response.json();
           console.log("[PvP Speed Deploy] Player 1 result:", p1Result);
 
-          // Validate player 2 with AI
+          // Score player 2 against the stored brief
           console.log("[PvP Speed Deploy] Validating player 2 submission:", newMatchState.player2Services);
           const p2Response = await fetch(`${LEARNING_AGENT_URL}/api/speed-deploy/validate`, {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             body: JSON.stringify({
               brief_id: brief.id,
-              client_name: brief.client_name,
-              industry: brief.industry,
-              requirements: brief.requirements,
-              available_services: brief.available_services,
-              optimal_solution: brief.optimal_solution,
-              acceptable_solutions: brief.acceptable_solutions,
-              trap_services: brief.trap_services || [],
-              time_limit: brief.time_limit,
-              user_level: brief.user_level,
-              target_cert: brief.target_cert || "",
-              max_score: brief.max_score,
-              learning_point: brief.learning_point || "",
               submitted_services: newMatchState.player2Services || [],
               time_remaining: newMatchState.player2TimeRemaining || 0,
               openai_api_key: aiConfig?.key || null,
@@ -60,9 +60,6 @@ interface Brief {
   icon: string;
   requirements: Requirement[];
   available_services: string[];
-  optimal_solution: string[];
-  acceptable_solutions: string[][];
-  trap_services: TrapService[];
   time_limit: number;
   user_level: string;
   target_cert: string;
@@ -587,18 +584,6 @@ export default function SpeedDeployPage() {
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
           brief_id: brief.id,
-          client_name: brief.client_name,
-          industry: brief.industry,
-          requirements: brief.requirements,
-          available_services: brief.available_services,
-          optimal_solution: brief.optimal_solution,
-          acceptable_solutions: brief.acceptable_solutions,
-          trap_services: brief.trap_services || [],
-          time_limit: brief.time_limit,
-          user_level: brief.user_level,
-          target_cert: brief.target_cert || "",
-          max_score: brief.max_score,
-          learning_point: brief.learning_point || "",
           submitted_services: submittedServices,
           time_remaining: timeLeft,
         }),
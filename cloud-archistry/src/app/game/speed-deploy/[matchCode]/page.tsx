@@ -50,12 +50,6 @@ interface Requirement {
   priority: string;
 }
 
-interface TrapService {
-  service_id: string;
-  why_suboptimal: string;
-  penalty: number;
-}
-
 interface Brief {
   id: string;
   client_name: string;
@@ -63,9 +57,6 @@ interface Brief {
   icon: string;
   requirements: Requirement[];
   available_services: string[];
-  optimal_solution: string[];
-  acceptable_solutions: string[][];
-  trap_services: TrapService[];
   time_limit: number;
   user_level: string;
   target_cert?: string;
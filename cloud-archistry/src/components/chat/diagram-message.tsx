@@ -332,8 +332,10 @@ function DiagramCanvas({ diagram, onEdit, onExpand, fullscreen }: DiagramMessage
         return result;
       }
       
-      // If payload has "services" array directly, use template engine
-      if (isNewPayloadFormat(diagram)) {
+      // If payload has "services" array directly, use template engine -
+      // unless the drawing agent already laid the nodes out server-side
+      const serverLaidOut = diagram.nodes.length > 0 && diagram.nodes.every(n => n.position);
+      if (isNewPayloadFormat(diagram) && !serverLaidOut) {
         return buildAWSDiagram(diagram);
       }
       
@@ -0,0 +1,131 @@
+"""
+Browser Pool Benchmark
+======================
+Per-URL crawl latency: cold browsers vs the warm BrowserPool.
+
+Serves a small local site so only browser cost is measured, then crawls
+it three ways:
+  cold      - new AsyncWebCrawler per URL (what research_company did)
+  first     - lazily started crawler, first URL after a worker (re)start
+  warm pool - BrowserPool started up front, sequential and concurrent
+
+Needs crawl4ai with Chromium installed (crawl4ai-setup).
+
+Run with: python bench_browser_pool.py [--urls 20] [--pool 2] [--concurrency 4]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+PARAGRAPH = "Amazon S3 stores objects in buckets; Lambda runs code without servers. " * 20
+
+
+class _Site(BaseHTTPRequestHandler):
+    def do_GET(self):
+        n = int(self.path.strip("/").split("/")[-1] or 0)
+        links = "".join(f'<a href="/page/{n + i}">page {n + i}</a> ' for i in range(1, 6))
+        body = f"<html><head><title>Page {n}</title></head><body><h1>Page {n}</h1>" \
+               f"<p>{PARAGRAPH}</p><nav>{links}</nav></body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_site() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def summarize(name: str, samples: list) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(f"{name:28s} n={len(ms):3d}  mean {statistics.mean(ms):7.0f} ms  "
+          f"p50 {statistics.median(ms):7.0f} ms  p95 {p95:7.0f} ms")
+
+
+async def run(url_count: int, pool_size: int, concurrency: int) -> None:
+    from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+    from crawl.browser_pool import BrowserPool
+
+    base = serve_site()
+    urls = [f"{base}/page/{i}" for i in range(url_count)]
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+
+    # Cold: launch and tear down a browser per URL
+    cold = []
+    for url in urls[: max(3, url_count // 4)]:
+        start = time.perf_counter()
+        async with AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False)) as crawler:
+            result = await crawler.arun(url=url, config=config)
+        assert result.success, result.error_message
+        cold.append(time.perf_counter() - start)
+
+    # First crawl after a (re)start: lazy launch + one page
+    start = time.perf_counter()
+    crawler = AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False))
+    await crawler.start()
+    await crawler.arun(url=urls[0], config=config)
+    first = time.perf_counter() - start
+    await crawler.close()
+
+    # Warm pool, launched before any request arrives
+    pool = BrowserPool(size=pool_size, recycle_pages=0)
+    start = time.perf_counter()
+    await pool.start()
+    warmup = time.perf_counter() - start
+
+    warm = []
+    for url in urls:
+        start = time.perf_counter()
+        result = await pool.arun(url=url, config=config)
+        assert result.success, result.error_message
+        warm.append(time.perf_counter() - start)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    concurrent = []
+
+    async def timed(url):
+        async with semaphore:
+            start = time.perf_counter()
+            await pool.arun(url=url, config=config)
+            concurrent.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(url) for url in urls))
+    wall = time.perf_counter() - start
+    await pool.close()
+
+    print(f"local site, {url_count} URLs, pool of {pool_size} browsers")
+    summarize("cold (browser per URL)", cold)
+    print(f"{'first crawl after start':28s}        {first * 1000:7.0f} ms")
+    print(f"{'pool warm-up (at startup)':28s}        {warmup * 1000:7.0f} ms")
+    summarize("warm pool, sequential", warm)
+    summarize(f"warm pool, {concurrency} concurrent", concurrent)
+    print(f"{'':28s} wall {wall * 1000:.0f} ms, {url_count / wall:.1f} pages/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--urls", type=int, default=20)
+    parser.add_argument("--pool", type=int, default=2, help="browsers in the pool")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.urls, args.pool, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Startup Benchmark
+=================
+Import time, time-to-first-ready and per-worker memory of the Learning
+Agent under gunicorn, with and without preload_app.
+
+  import    - python -X importtime on crawl4ai_mcp: total, heaviest
+              top-level packages, whether optional heavy dependencies
+              (sentence_transformers / torch / neo4j) got loaded, and how
+              many generators.* modules the import pulled in (should be 0:
+              route handlers import them on first use)
+  routing   - endpoints registered and the mean / worst time to match a
+              request to its route, over every registered path
+  ready     - gunicorn spawn -> first /health 200, and -> every worker's
+              lifespan finished ("Worker <pid> ready" log line)
+  memory    - per-worker RSS and PSS (PSS splits shared pages between the
+              processes sharing them, so it shows what preloading saves)
+
+Needs the full environment (crawl4ai, gunicorn, Postgres/Redis reachable or
+not - failed warm-ups are logged, not fatal). Linux only (/proc).
+
+Run with: python bench_startup.py [--workers 4] [--browsers]
+"""
+
+import os
+import re
+import sys
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import urllib.request
+from pathlib import Path
+
+HERE = Path(__file__).parent
+HEAVY_OPTIONAL = ("sentence_transformers", "torch", "neo4j")
+
+
+def measure_imports() -> None:
+    probe = (
+        "import sys, time; t = time.perf_counter(); import crawl4ai_mcp; "
+        "print(time.perf_counter() - t); "
+        f"print(','.join(m for m in {HEAVY_OPTIONAL!r} if m in sys.modules)); "
+        "print(sum(m.startswith('generators.') for m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=HERE, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-2000:])
+    wall, loaded, generators = (proc.stdout.strip().splitlines() + ["", ""])[:3]
+
+    roots = {}
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+        if match and "." not in match.group(4):
+            name, cumulative = match.group(4), int(match.group(2))
+            roots[name] = max(roots.get(name, 0), cumulative)
+
+    print(f"import crawl4ai_mcp: {float(wall) * 1000:.0f} ms")
+    for name, us in sorted(roots.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"  {name:28s} {us / 1000:8.0f} ms")
+    print(f"  optional heavy deps loaded: {loaded or 'none'}")
+    print(f"  generator modules loaded: {generators or '?'}")
+
+
+def _endpoints(routes) -> list:
+    # include_router keeps each router as one entry; expand to its routes
+    found = []
+    for route in routes:
+        if hasattr(route, "effective_candidates"):
+            found.extend(_endpoints(route.effective_candidates()))
+        elif getattr(route, "path", None):
+            found.append(route)
+    return found
+
+
+def measure_routing(rounds: int = 200) -> None:
+    sys.path.insert(0, str(HERE))
+    from starlette.routing import Match
+    from crawl4ai_mcp import app
+
+    endpoints = _endpoints(app.routes)
+    requests = []
+    for route in endpoints:
+        methods = getattr(getattr(route, "original_route", route), "methods", None) or {"GET"}
+        path = re.sub(r"\{[^}]+\}", "x", route.path)
+        requests.append({"type": "http", "path": path, "method": sorted(methods)[0], "root_path": ""})
+
+    timings = []
+    for scope in requests:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for route in app.router.routes:
+                if route.matches(scope)[0] == Match.FULL:
+                    break
+        timings.append((time.perf_counter() - started) / rounds * 1e6)
+    print(f"routing: {len(app.routes)} top-level entries, {len(endpoints)} endpoints")
+    print(f"  match mean {sum(timings) / len(timings):.0f} us, worst {max(timings):.0f} us")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _memory_kb(pid: int) -> tuple:
+    rss = pss = 0
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1])
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, pss
+
+
+def _children(pid: int) -> list:
+    kids = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        kids.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                pass
+    return kids
+
+
+def measure_gunicorn(workers: int, preload: bool, browsers: bool) -> None:
+    port = _free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_PRELOAD="true" if preload else "false",
+        BROWSER_POOL_WARM="true" if browsers else "false",
+    )
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "crawl4ai_mcp:app"],
+        cwd=HERE, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    ready = []
+    all_ready = threading.Event()
+
+    def follow():
+        for line in proc.stdout:
+            if re.search(r"Worker \d+ ready in", line):
+                ready.append(time.perf_counter() - started)
+                if len(ready) >= workers:
+                    all_ready.set()
+
+    threading.Thread(target=follow, daemon=True).start()
+
+    first = None
+    deadline = time.time() + 180
+    while first is None and time.time() < deadline and proc.poll() is None:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as resp:
+                if resp.status == 200:
+                    first = time.perf_counter() - started
+        except OSError:
+            time.sleep(0.05)
+    all_ready.wait(timeout=max(1, deadline - time.time()))
+
+    pids = _children(proc.pid)
+    memory = [_memory_kb(pid) for pid in pids]
+    master = _memory_kb(proc.pid)
+    proc.terminate()
+    proc.wait(timeout=60)
+
+    label = f"preload={'on' if preload else 'off'}"
+    if first is None:
+        print(f"{label}: never became ready")
+        return
+    last = f"{ready[-1]:.2f}s" if len(ready) >= workers else f"{len(ready)}/{workers} workers logged ready"
+    print(f"{label}: first /health {first:.2f}s, all workers ready {last}")
+    if memory:
+        rss = sum(m[0] for m in memory) / len(memory) / 1024
+        pss = sum(m[1] for m in memory) / len(memory) / 1024
+        total = (sum(m[1] for m in memory) + master[1]) / 1024
+        print(f"  per worker: RSS {rss:.0f} MB, PSS {pss:.0f} MB   "
+              f"master RSS {master[0] / 1024:.0f} MB   total PSS {total:.0f} MB ({len(memory)} workers)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--browsers", action="store_true", help="warm the browser pool at startup too")
+    args = parser.parse_args()
+
+    measure_imports()
+    measure_routing()
+    print()
+    for preload in (False, True):
+        measure_gunicorn(args.workers, preload, args.browsers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Streamed Generation Benchmark
+=============================
+Time to first item and to completion for generators with a -stream twin.
+
+The OpenAI API is replaced by a local stub that emits tokens at a fixed
+rate after a first-token delay, like a real model. It supports both
+streamed and blocking chat completions. Each blocking endpoint is timed
+against its -stream twin: the blocking response arrives only when the
+whole completion is done, while the stream sends each question, card or
+business as soon as the model closes it.
+
+Needs the full environment (crawl4ai importable); Postgres is optional -
+knowledge-base lookups fail and are skipped.
+
+Run with: python bench_streaming.py [--ttft 0.5] [--tps 80] [--items 10]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+CHARS_PER_TOKEN = 4
+SERVICES = ["ec2", "s3", "rds", "lambda", "dynamodb", "cloudfront", "sqs", "alb"]
+
+
+def stub_documents(items: int) -> dict:
+    """The JSON each generator asks for, with `items` array entries."""
+    question = lambda i: {
+        "id": f"q{i}", "question": f"A company needs durable storage for workload {i}. " * 3,
+        "question_type": "multiple_choice",
+        "options": [{"id": c, "text": f"Option {c} " * 6, "is_correct": c == "a"} for c in "abcd"],
+        "explanation": "Because of durability and cost. " * 6, "difficulty": "medium", "points": 10,
+        "aws_services": ["S3"], "tags": ["storage"],
+    }
+    card = lambda i: {
+        "front": f"What does service {i} provide? " * 2, "back": "It provides a managed capability. " * 5,
+        "difficulty": "medium", "tags": ["core"], "awsServices": ["S3"],
+    }
+    business = lambda i: {
+        "id": f"biz_{i}", "business_name": f"Company {i}", "industry": "Retail", "icon": "🏪",
+        "use_case_title": f"Modernise platform {i}", "use_case_description": "They need to scale. " * 10,
+        "required_services": [
+            {"service_id": s, "service_name": s.upper(), "category": "core", "reason": "Needed. " * 4}
+            for s in SERVICES[i % 4:i % 4 + 3]
+        ],
+        "contract_value": 250000, "difficulty": "medium", "hints": ["Think about scale"] * 3,
+    }
+    return {
+        "quiz": {"title": "Practice Quiz", "description": "Stub", "questions": [question(i) for i in range(items)]},
+        "flashcards": {"title": "Deck", "description": "Stub", "cards": [card(i) for i in range(items * 2)]},
+        "tycoon": {"journey_name": "Stub Journey", "theme": "retail", "businesses": [business(i) for i in range(items)]},
+    }
+
+
+def start_stub_openai(documents: dict, ttft: float, tps: float) -> str:
+    """Start a fake, token-paced OpenAI API on a free port and return its base URL."""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    stub = FastAPI()
+    texts = {name: json.dumps(doc, indent=1) for name, doc in documents.items()}
+
+    def pick(body: dict) -> str:
+        prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", [])).lower()
+        if "tycoon" in prompt:
+            return texts["tycoon"]
+        if "flashcard" in prompt:
+            return texts["flashcards"]
+        return texts["quiz"]
+
+    def chunk(body: dict, content: str, finish_reason=None) -> str:
+        return "data: " + json.dumps({
+            "id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": finish_reason}],
+        }) + "\n\n"
+
+    @stub.post("/v1/chat/completions")
+    async def chat(body: dict):
+        content = pick(body)
+        if body.get("stream"):
+            async def tokens():
+                await asyncio.sleep(ttft)
+                step = CHARS_PER_TOKEN * 4  # send 4 tokens per chunk
+                for i in range(0, len(content), step):
+                    yield chunk(body, content[i:i + step])
+                    await asyncio.sleep(4 / tps)
+                yield chunk(body, "", "stop")
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(tokens(), media_type="text/event-stream")
+
+        await asyncio.sleep(ttft + len(content) / CHARS_PER_TOKEN / tps)
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    @stub.post("/v1/embeddings")
+    async def embeddings(body: dict):
+        return {
+            "object": "list",
+            "model": body.get("model", "stub"),
+            "data": [{"object": "embedding", "index": 0, "embedding": [0.0] * 1536}],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1},
+        }
+
+    return serve(stub) + "/v1"
+
+
+def serve(app) -> str:
+    """Run an ASGI app with uvicorn in a daemon thread and return its base URL."""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+CASES = [
+    ("quiz", "/api/learning/generate-quiz", {"certification_code": "SAA", "options": {"question_count": 10}}),
+    ("flashcards", "/api/learning/generate-flashcards", {"certification_code": "SAA", "card_count": 20}),
+    ("tycoon", "/api/tycoon/journey/generate", {"cert_code": "SAA-C03"}),
+]
+
+
+async def run() -> None:
+    import httpx
+    from crawl4ai_mcp import app
+
+    # A real server - the in-process ASGI transport buffers streamed bodies
+    base_url = serve(app)
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        for name, path, payload in CASES:
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            blocking = time.perf_counter() - start
+            response.raise_for_status()
+
+            first = done = None
+            items = 0
+            start = time.perf_counter()
+            async with client.stream("POST", path + "-stream", json=payload) as stream:
+                async for line in stream.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    event = json.loads(line[6:])
+                    if event["type"] == "item":
+                        items += 1
+                        first = first or time.perf_counter() - start
+                    elif event["type"] == "complete":
+                        done = time.perf_counter() - start
+                    elif event["type"] == "error":
+                        raise RuntimeError(f"{name}: {event['message']}")
+
+            print(f"{name:11s} blocking {blocking * 1000:6.0f} ms | stream: first item "
+                  f"{(first or 0) * 1000:5.0f} ms, complete {(done or 0) * 1000:6.0f} ms ({items} items)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[3])
+    parser.add_argument("--ttft", type=float, default=0.5, help="seconds to first token")
+    parser.add_argument("--tps", type=float, default=80, help="tokens per second")
+    parser.add_argument("--items", type=int, default=10, help="questions / businesses per response")
+    args = parser.parse_args()
+
+    os.environ["OPENAI_BASE_URL"] = start_stub_openai(stub_documents(args.items), args.ttft, args.tps)
+    os.environ["OPENAI_API_KEY"] = "sk-bench"
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ from .utils import (
 )
 from .jobs import (
     create_crawl_job,
+    enqueue_crawl_job,
     update_crawl_job,
     get_crawl_job,
 )
@@ -0,0 +1,201 @@
+"""
+Warm headless-browser pool for Crawl4AI.
+
+Holds BROWSER_POOL_SIZE started AsyncWebCrawler instances (one Chromium
+each), launched at app startup instead of on the first crawl. A crawl
+borrows a slot for one page. Each slot keeps a crawl4ai session, so its
+page (tab) is reused from one URL to the next rather than opened and
+closed every time. After BROWSER_POOL_RECYCLE_PAGES pages a slot's browser
+is closed and relaunched in the background, which caps the memory a
+long-lived Chromium accumulates.
+
+BrowserPool.arun() has the same call shape as AsyncWebCrawler.arun(), so
+the pool is what Crawl4AIContext.crawler holds and what crawl jobs,
+research_company and the resource fetcher all crawl through.
+"""
+import os
+import time
+import uuid
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+RECYCLE_PAGES = int(os.getenv("BROWSER_POOL_RECYCLE_PAGES", "200"))
+REUSE_PAGES = os.getenv("BROWSER_POOL_REUSE_PAGES", "true") == "true"
+
+
+@dataclass
+class _Slot:
+    index: int
+    crawler: Optional[AsyncWebCrawler] = None
+    session_id: str = ""
+    pages: int = 0
+    launches: int = 0
+    launched_at: float = field(default_factory=time.monotonic)
+
+
+class BrowserPool:
+    """Fixed set of warm crawlers handed out one page at a time."""
+
+    def __init__(self, size: int = POOL_SIZE, recycle_pages: int = RECYCLE_PAGES, reuse_pages: bool = REUSE_PAGES):
+        self.size = max(1, size)
+        self.recycle_pages = recycle_pages
+        self.reuse_pages = reuse_pages
+        self._slots: List[_Slot] = [_Slot(i) for i in range(self.size)]
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._background: set = set()
+        self._started = False
+        self._start_lock = asyncio.Lock()
+        self.pages_served = 0
+        self.recycled = 0
+
+    async def _launch(self, slot: _Slot):
+        crawler = AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False))
+        await crawler.start()
+        slot.crawler = crawler
+        slot.session_id = f"pool-{slot.index}-{uuid.uuid4().hex[:8]}"
+        slot.pages = 0
+        slot.launches += 1
+        slot.launched_at = time.monotonic()
+
+    async def start(self):
+        """Launch every browser (in parallel). Safe to call more than once."""
+        async with self._start_lock:
+            if self._started:
+                return
+            started = time.perf_counter()
+            results = await asyncio.gather(*(self._launch(slot) for slot in self._slots), return_exceptions=True)
+            failures = [r for r in results if isinstance(r, BaseException)]
+            if failures:
+                # Don't leave the browsers that did launch running unowned
+                await self._close_slots()
+                raise failures[0]
+            for slot in self._slots:
+                self._idle.put_nowait(slot)
+            self._started = True
+            logger.info(f"Browser pool warm: {self.size} browsers in {time.perf_counter() - started:.1f}s")
+
+    async def _close_slots(self):
+        for slot in self._slots:
+            if slot.crawler:
+                try:
+                    await slot.crawler.close()
+                except Exception as e:
+                    logger.warning(f"Closing browser {slot.index} failed: {e}")
+                slot.crawler = None
+
+    async def close(self):
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        await self._close_slots()
+        # Fresh queue so a restart doesn't hand out the closed slots twice
+        self._idle = asyncio.Queue()
+        self._started = False
+
+    async def _recycle(self, slot: _Slot):
+        """Relaunch a slot's browser, then make the slot available again."""
+        old = slot.crawler
+        try:
+            if old:
+                await old.close()
+        except Exception as e:
+            logger.warning(f"Closing browser {slot.index} for recycle failed: {e}")
+        try:
+            await self._launch(slot)
+            self.recycled += 1
+        except Exception as e:
+            logger.error(f"Relaunching browser {slot.index} failed: {e}")
+            await asyncio.sleep(5)
+            task = asyncio.create_task(self._recycle(slot))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+            return
+        self._idle.put_nowait(slot)
+
+    async def _drop_session(self, slot: _Slot):
+        """Close a slot's reused page after a failed or cancelled crawl; the next one opens fresh."""
+        try:
+            await slot.crawler.crawler_strategy.kill_session(slot.session_id)
+        except Exception:
+            pass
+        slot.session_id = f"pool-{slot.index}-{uuid.uuid4().hex[:8]}"
+
+    def _release(self, slot: _Slot, failed: bool):
+        slot.pages += 1
+        self.pages_served += 1
+        if self.recycle_pages and slot.pages >= self.recycle_pages:
+            task = asyncio.create_task(self._recycle(slot))
+        elif failed and self.reuse_pages:
+            async def reset():
+                await self._drop_session(slot)
+                self._idle.put_nowait(slot)
+            task = asyncio.create_task(reset())
+        else:
+            self._idle.put_nowait(slot)
+            return
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[_Slot]:
+        """Borrow a warm browser for one page."""
+        if not self._started:
+            await self.start()
+        slot = await self._idle.get()
+        failed = True
+        try:
+            yield slot
+            failed = False
+        finally:
+            self._release(slot, failed)
+
+    async def arun(self, url: str, config: Optional[CrawlerRunConfig] = None, **kwargs) -> Any:
+        """Crawl one URL on a pooled browser (same call shape as AsyncWebCrawler.arun)."""
+        async with self.slot() as slot:
+            if self.reuse_pages:
+                config = config or CrawlerRunConfig()
+                if not config.session_id:
+                    config = config.clone(session_id=slot.session_id)
+            return await slot.crawler.arun(url=url, config=config, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "pages_served": self.pages_served,
+            "recycled": self.recycled,
+            "recycle_pages": self.recycle_pages,
+            "slots": [{"index": s.index, "pages": s.pages, "launches": s.launches} for s in self._slots],
+        }
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """The process-wide pool (launched by start_browser_pool or on first crawl)."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def start_browser_pool() -> BrowserPool:
+    pool = get_browser_pool()
+    await pool.start()
+    return pool
+
+
+async def close_browser_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -1,21 +1,24 @@
 """
 Application context for the crawler.
+
+The reranking model (sentence_transformers, which pulls in torch) and the
+Neo4j driver are imported only when USE_RERANKING / USE_KNOWLEDGE_GRAPH
+turn them on, so a worker that uses neither never loads them.
 """
 import os
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Optional
-from sentence_transformers import CrossEncoder
-from crawl4ai import AsyncWebCrawler, BrowserConfig
-from neo4j import AsyncGraphDatabase
 
 from aws.neo4j_graph import format_neo4j_error
+from crawl.browser_pool import BrowserPool, start_browser_pool
 
 
 @dataclass
 class Crawl4AIContext:
     """Context for the Crawl4AI API server."""
-    crawler: AsyncWebCrawler
-    reranking_model: Optional[CrossEncoder] = None
+    crawler: BrowserPool  # Warm browsers; .arun() like AsyncWebCrawler
+    reranking_model: Optional[Any] = None  # sentence_transformers.CrossEncoder
     neo4j_driver: Optional[Any] = None  # Neo4j driver for AWS services graph
 
 
@@ -27,18 +30,16 @@ async def get_context() -> Crawl4AIContext:
     """Get or initialize the application context."""
     global _app_context
     if _app_context is None:
-        # Create browser configuration
-        browser_config = BrowserConfig(headless=True, verbose=False)
-        
-        # Initialize the crawler
-        crawler = AsyncWebCrawler(config=browser_config)
-        await crawler.__aenter__()
+        # Shared browser pool (already warm if started at app startup)
+        crawler = await start_browser_pool()
         
         # Initialize cross-encoder model for reranking if enabled
         reranking_model = None
         if os.getenv("USE_RERANKING", "false") == "true":
             try:
-                reranking_model = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+                from sentence_transformers import CrossEncoder
+                # Loading the model is blocking (disk + torch init)
+                reranking_model = await asyncio.to_thread(CrossEncoder, "cross-encoder/ms-marco-MiniLM-L-6-v2")
                 print("✓ Reranking model loaded")
             except Exception as e:
                 print(f"Failed to load reranking model: {e}")
@@ -54,6 +55,7 @@ async def get_context() -> Crawl4AIContext:
             
             if neo4j_uri and neo4j_user and neo4j_password:
                 try:
+                    from neo4j import AsyncGraphDatabase
                     print("Initializing Neo4j driver for AWS services graph...")
                     neo4j_driver = AsyncGraphDatabase.driver(
                         neo4j_uri,
@@ -77,3 +79,11 @@ async def get_context() -> Crawl4AIContext:
             neo4j_driver=neo4j_driver
         )
     return _app_context
+
+
+async def close_context():
+    """Close what get_context opened (the browser pool is closed separately)."""
+    global _app_context
+    if _app_context is not None and _app_context.neo4j_driver is not None:
+        await _app_context.neo4j_driver.close()
+    _app_context = None
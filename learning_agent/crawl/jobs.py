@@ -7,6 +7,7 @@ from redis_jobs import (
     create_crawl_job as redis_create_job,
     get_crawl_job as redis_get_job,
     update_crawl_job as redis_update_job,
+    enqueue_crawl_job as redis_enqueue_job,
 )
 
 
@@ -15,6 +16,11 @@ async def create_crawl_job(url: str, tenant_id: str, params: Dict = None) -> Dic
     return await redis_create_job(url, tenant_id, params)
 
 
+async def enqueue_crawl_job(job_id: str) -> str:
+    """Queue a created job for the crawl workers (crawl/worker.py)."""
+    return await redis_enqueue_job(job_id)
+
+
 async def update_crawl_job(job_id: str, status: str, result: Dict = None, error: str = None):
     """Update a crawl job's status."""
     updates = {"status": status}
@@ -0,0 +1,209 @@
+"""
+Crawl job execution.
+
+Runs one crawl job (page, sitemap, sitemap index or URL list, with
+optional recursive link following) for the crawl worker. Every page is
+stored as soon as it is crawled and recorded in the job's CrawlCheckpoint,
+so a job taken over from a dead worker skips the pages already done.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urldefrag, urlparse
+
+from crawl4ai import CrawlerRunConfig, CacheMode
+
+from crawl.utils import (
+    is_sitemap,
+    is_sitemap_index,
+    is_txt,
+    parse_sitemap,
+    parse_all_sitemaps_from_index,
+    smart_chunk_markdown,
+    extract_section_info,
+)
+from redis_jobs import CrawlCheckpoint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_URLS = 100  # Default limit for recursive crawls
+
+# store_page(result, url, job) -> counters for the page
+StorePage = Callable[[Any, str, Dict[str, Any]], Awaitable[Dict[str, int]]]
+
+
+def normalize_url(u: str) -> str:
+    """Remove fragment from URL for deduplication."""
+    return urldefrag(u)[0]
+
+
+def is_same_domain(base_url: str, link_url: str) -> bool:
+    """Check if link is on the same domain as base URL."""
+    try:
+        return urlparse(base_url).netloc == urlparse(link_url).netloc
+    except ValueError:
+        return False
+
+
+def internal_links(result, crawl_url: str) -> List[str]:
+    """Same-domain links of a crawled page, normalized."""
+    links = []
+    if getattr(result, "links", None):
+        for link in result.links.get("internal", []):
+            link_url = link.get("href", "")
+            if link_url and is_same_domain(crawl_url, link_url):
+                links.append(normalize_url(link_url))
+    return links
+
+
+def resolve_seed_urls(url: str, preset: Optional[str] = None, max_urls: Optional[int] = None) -> tuple:
+    """
+    Starting URLs for a job and whether to follow links from them.
+    Blocking (fetches sitemaps) - run in a thread.
+    """
+    from config.crawl_presets import filter_sitemap_urls
+
+    if is_sitemap_index(url):
+        logger.info(f"Sitemap index detected: {url}")
+        urls = parse_all_sitemaps_from_index(url, max_sitemaps=50)
+        logger.info(f"Sitemap index parsed: {len(urls)} total URLs found")
+    elif is_sitemap(url):
+        urls = parse_sitemap(url)
+        logger.info(f"Sitemap found with {len(urls)} URLs")
+    elif is_txt(url):
+        # Assume it's a list of URLs
+        import requests
+        resp = requests.get(url, timeout=30)
+        return [u.strip() for u in resp.text.split("\n") if u.strip()][:max_urls or None], False
+    else:
+        return [url], True
+
+    if preset:
+        urls = filter_sitemap_urls(urls, preset_name=preset)
+        logger.info(f"After filtering with preset '{preset}': {len(urls)} URLs")
+    if max_urls and len(urls) > max_urls:
+        logger.info(f"Limiting crawl to {max_urls} URLs (from {len(urls)})")
+        urls = urls[:max_urls]
+    return urls, False
+
+
+async def store_page(result, crawl_url: str, job: Dict[str, Any]) -> Dict[str, int]:
+    """Chunk, embed and store one crawled page; extract code examples and AWS services."""
+    from utils import add_documents_to_db, add_code_examples_to_db, extract_code_blocks
+    from aws.neo4j_graph import extract_aws_services_to_neo4j
+    from crawl.context import get_context
+
+    tenant_id = job.get("tenant_id")
+    chunk_size = job.get("params", {}).get("chunk_size") or 5000
+    chunks = smart_chunk_markdown(result.markdown, chunk_size)
+    metadatas = []
+    for chunk in chunks:
+        section_info = extract_section_info(chunk)
+        metadatas.append({
+            "title": result.metadata.get("title", "") if result.metadata else "",
+            "headers": section_info["headers"],
+        })
+    if chunks:
+        await add_documents_to_db(
+            [crawl_url] * len(chunks), list(range(len(chunks))), chunks, metadatas,
+            {crawl_url: result.markdown}, tenant_id=tenant_id,
+        )
+
+    code_blocks = extract_code_blocks(result.markdown)
+    if code_blocks:
+        parsed = urlparse(crawl_url)
+        await add_code_examples_to_db(crawl_url, code_blocks, parsed.netloc or parsed.path, tenant_id=tenant_id)
+
+    ctx = await get_context()
+    if ctx.neo4j_driver:
+        await extract_aws_services_to_neo4j(
+            content=result.markdown,
+            source_url=crawl_url,
+            neo4j_driver=ctx.neo4j_driver,
+            tenant_id=tenant_id,
+        )
+
+    return {
+        "documents_stored": len(chunks),
+        "code_examples": len(code_blocks),
+        "total_words": sum(len(c.split()) for c in chunks),
+    }
+
+
+async def run_crawl_job(
+    job: Dict[str, Any],
+    checkpoint: CrawlCheckpoint,
+    crawler,
+    store: StorePage = store_page,
+    on_page: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Crawl a job breadth-first, depth by depth, resuming from `checkpoint`.
+
+    Args:
+        job: Job record from redis_jobs (url, tenant_id, params)
+        checkpoint: The job's CrawlCheckpoint
+        crawler: An AsyncWebCrawler (anything with `arun(url=, config=)`)
+        store: Stores a crawled page and returns its counters
+        on_page: Called with the checkpoint state after each page
+
+    Returns:
+        The job result (urls_crawled, documents_stored, code_examples, total_words)
+    """
+    params = job.get("params") or {}
+    max_depth = params.get("max_depth") or 1
+    max_urls = params.get("max_urls")
+
+    state = await checkpoint.state()
+    if not state["seeded"]:
+        seeds, recursive = await asyncio.to_thread(resolve_seed_urls, job["url"], params.get("preset"), max_urls)
+        await checkpoint.seed((normalize_url(u) for u in seeds), recursive)
+        state = await checkpoint.state()
+    else:
+        logger.info(f"Resuming crawl job {job['id']} at depth {state['depth'] + 1} "
+                    f"after {state['pages_crawled']} pages")
+
+    levels = max_depth if state["recursive"] else 1
+    limit = (max_urls or DEFAULT_MAX_URLS) if state["recursive"] else None
+    run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, stream=False)
+    done = await checkpoint.done()
+    depth = state["depth"]
+    frontier = await checkpoint.frontier()
+
+    while frontier and depth < levels:
+        follow_links = depth + 1 < levels
+        todo = [u for u in frontier if u not in done]
+        logger.info(f"Depth {depth + 1}/{levels}: Crawling {len(todo)} URLs")
+        for crawl_url in todo:
+            if limit is not None and len(done) >= limit:
+                logger.info(f"Reached max URLs limit ({limit}), stopping")
+                follow_links = False
+                break
+            counters: Dict[str, int] = {}
+            links: List[str] = []
+            try:
+                result = await crawler.arun(url=crawl_url, config=run_config)
+                if result.success and result.markdown:
+                    counters = {"pages_crawled": 1, **await store(result, crawl_url, job)}
+                    if follow_links:
+                        links = internal_links(result, crawl_url)
+            except Exception as e:
+                logger.warning(f"Failed to crawl {crawl_url}: {e}")
+            # Failed pages are checkpointed too - they are not retried on resume
+            await checkpoint.page_done(crawl_url, links, **counters)
+            done.add(crawl_url)
+            if on_page:
+                await on_page(await checkpoint.state())
+        if not follow_links:
+            break
+        frontier = await checkpoint.advance()
+        depth += 1
+
+    state = await checkpoint.state()
+    return {
+        "urls_crawled": state["pages_crawled"],
+        "pages_crawled": state["pages_crawled"],
+        "documents_stored": state["documents_stored"],
+        "code_examples": state["code_examples"],
+        "total_words": state["total_words"],
+    }
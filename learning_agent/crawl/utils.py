@@ -3,13 +3,15 @@ Crawling utility functions.
 """
 import re
 import requests
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any
 from urllib.parse import urlparse
 from xml.etree import ElementTree
-from sentence_transformers import CrossEncoder
 
+if TYPE_CHECKING:  # sentence_transformers is only loaded when reranking is on
+    from sentence_transformers import CrossEncoder
 
-def rerank_results(model: CrossEncoder, query: str, results: List[Dict[str, Any]], content_key: str = "content") -> List[Dict[str, Any]]:
+
+def rerank_results(model: "CrossEncoder", query: str, results: List[Dict[str, Any]], content_key: str = "content") -> List[Dict[str, Any]]:
     """
     Rerank search results using a cross-encoder model.
     
@@ -0,0 +1,168 @@
+"""
+Crawl worker.
+
+Consumes crawl jobs from the Redis Stream that /api/crawl/smart enqueues
+into, outside the gunicorn web workers. Run one or more of these next to
+the API (each process is its own consumer in the group, so adding
+processes adds throughput):
+
+    python -m crawl.worker
+
+Delivery is at-least-once: an entry stays pending until its job finishes
+and is then acked and deleted. A running job refreshes its entry's idle
+time every CRAWL_HEARTBEAT_SECONDS; if a worker dies, its entries go idle
+and another worker reclaims them after CRAWL_CLAIM_IDLE_SECONDS and
+resumes from the job's per-URL checkpoint.
+"""
+import os
+import socket
+import signal
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+from redis_jobs import CrawlCheckpoint, CrawlQueue, get_job_manager
+from crawl.jobs import update_crawl_job
+from crawl.runner import run_crawl_job
+from crawl.browser_pool import close_browser_pool, start_browser_pool
+from db import close_pool
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY = int(os.getenv("CRAWL_WORKER_CONCURRENCY", "2"))
+CLAIM_IDLE_SECONDS = int(os.getenv("CRAWL_CLAIM_IDLE_SECONDS", "300"))
+HEARTBEAT_SECONDS = int(os.getenv("CRAWL_HEARTBEAT_SECONDS", str(max(1, CLAIM_IDLE_SECONDS // 5))))
+MAX_ATTEMPTS = int(os.getenv("CRAWL_MAX_ATTEMPTS", "3"))
+BLOCK_MS = 5000
+
+
+class CrawlWorker:
+    """One consumer in the crawl-workers group, running up to `concurrency` jobs at a time."""
+
+    def __init__(self, consumer: Optional[str] = None, concurrency: int = CONCURRENCY):
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = concurrency
+        self.queue: Optional[CrawlQueue] = None
+        self.tasks: Set[asyncio.Task] = set()
+        self.stopping = asyncio.Event()
+
+    async def _heartbeat(self, entry_id: str):
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            try:
+                await self.queue.heartbeat(self.consumer, entry_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat for {entry_id} failed: {e}")
+
+    async def handle(self, entry_id: str, fields: Dict[str, str], crawler=None):
+        """Run the job behind one stream entry; ack unless the worker is shutting down mid-job."""
+        from utils import set_request_api_key
+        from config import get_tenant_openai_config
+
+        manager = await get_job_manager()
+        job_id = fields.get("job_id", "")
+        job = await manager.get_job(job_id)
+        if not job or job.get("status") in ("completed", "failed"):
+            await self.queue.ack(entry_id)
+            return
+
+        attempts = job.get("attempts", 0) + 1
+        if attempts > MAX_ATTEMPTS:
+            logger.error(f"Crawl job {job_id} abandoned after {MAX_ATTEMPTS} attempts")
+            await update_crawl_job(job_id, "failed", error=f"Crawl abandoned after {MAX_ATTEMPTS} attempts")
+            await self.queue.ack(entry_id)
+            return
+        await manager.update_job(job_id, status="running", attempts=attempts, worker=self.consumer)
+
+        heartbeat = asyncio.create_task(self._heartbeat(entry_id))
+        checkpoint = CrawlCheckpoint(await manager.get_redis(), job_id)
+        try:
+            # The key never travels on the stream; resolve it from the job's tenant
+            config = await get_tenant_openai_config(job.get("tenant_id"))
+            if config and config.get("openai_api_key"):
+                set_request_api_key(config["openai_api_key"])
+            if crawler is None:
+                from crawl.context import get_context
+                crawler = (await get_context()).crawler  # the shared browser pool
+
+            async def on_page(state):
+                await manager.update_job(job_id, progress=state)
+
+            result = await run_crawl_job(job, checkpoint, crawler, on_page=on_page)
+            await update_crawl_job(job_id, "completed", result=result)
+            await checkpoint.clear()
+        except asyncio.CancelledError:
+            # Shutting down: leave the entry pending for another worker to resume
+            logger.info(f"Crawl job {job_id} interrupted; it will be resumed from its checkpoint")
+            raise
+        except Exception as e:
+            logger.error(f"Crawl job {job_id} failed: {e}")
+            await update_crawl_job(job_id, "failed", error=str(e))
+        finally:
+            heartbeat.cancel()
+            set_request_api_key(None)
+        await self.queue.ack(entry_id)
+
+    def _spawn(self, entry_id: str, fields: Dict[str, str]):
+        task = asyncio.create_task(self.handle(entry_id, fields))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def run(self):
+        manager = await get_job_manager()
+        self.queue = CrawlQueue(await manager.get_redis())
+        await self.queue.ensure_group()
+        logger.info(f"Crawl worker {self.consumer} consuming {self.queue.stream} "
+                    f"(concurrency {self.concurrency})")
+
+        while not self.stopping.is_set():
+            free = self.concurrency - len(self.tasks)
+            if free <= 0:
+                await asyncio.wait(self.tasks, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            try:
+                entries = await self.queue.reclaim(self.consumer, CLAIM_IDLE_SECONDS * 1000, free)
+                for entry_id, _ in entries:
+                    logger.info(f"Reclaimed stale crawl entry {entry_id}")
+                if not entries:
+                    entries = await self.queue.read(self.consumer, free, BLOCK_MS)
+            except Exception as e:
+                logger.error(f"Crawl queue read failed: {e}")
+                await asyncio.sleep(1)
+                continue
+            for entry_id, fields in entries:
+                self._spawn(entry_id, fields)
+
+    async def shutdown(self, grace_seconds: float = 25):
+        """Stop reading; give running jobs `grace_seconds`, then leave them to be reclaimed."""
+        self.stopping.set()
+        if self.tasks:
+            _, pending = await asyncio.wait(self.tasks, timeout=grace_seconds)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def main():
+    await start_browser_pool()
+    try:
+        worker = CrawlWorker()
+        loop = asyncio.get_running_loop()
+        runner = asyncio.create_task(worker.run())
+        stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        await stop.wait()
+        logger.info("Crawl worker stopping")
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
+        await worker.shutdown()
+    finally:
+        await close_browser_pool()
+        await close_pool()
+        await (await get_job_manager()).close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
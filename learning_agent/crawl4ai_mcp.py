@@ -8,248 +8,36 @@ Unified AI agent combining:
 - Flashcards, notes, quizzes generation
 - Interactive coaching chat
 
-REFACTORED: Core logic moved to modules, this file contains FastAPI endpoints only.
+This module only builds the FastAPI app. Endpoints live in routes/, one
+router per feature area; generators are imported by the handlers on first
+use (see routes/__init__.py).
 """
-import asyncio
-import json
 import os
-import uuid
-import concurrent.futures
-from typing import Dict, List, Any, Optional
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, BackgroundTasks, HTTPException, Request
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from openai import AsyncOpenAI
-from pydantic import BaseModel
 
-from crawl4ai import CrawlerRunConfig, CacheMode
-
-# ============================================
-# IMPORTS FROM MODULES
-# ============================================
-
-# Config
-from config.settings import (
-    AVAILABLE_MODELS,
-    DEFAULT_MODEL,
-    AWS_SERVICES,
-    AWS_RELATIONSHIP_PATTERNS,
-    DEFAULT_TENANT_ID,
-    logger,
-)
-from config.openai_config import (
-    get_tenant_openai_config,
-    get_openai_client_for_tenant,
-    get_async_openai,
-    _tenant_clients,
-)
-
-# AWS/Neo4j
-from aws.neo4j_graph import (
-    validate_neo4j_connection,
-    format_neo4j_error,
-    extract_aws_services_to_neo4j,
-)
-from aws.journey_graph import (
-    track_learner_scenario_start,
-    track_challenge_completion,
-    track_flashcard_study,
-    track_quiz_attempt,
-    get_learner_journey,
-    get_recommended_next_steps,
-)
-
-# Crawl
-from crawl.context import Crawl4AIContext, get_context
-from crawl.jobs import create_crawl_job, update_crawl_job, get_crawl_job
-from crawl.utils import (
-    rerank_results,
-    is_sitemap,
-    is_sitemap_index,
-    is_txt,
-    parse_sitemap,
-    parse_sitemap_index,
-    parse_all_sitemaps_from_index,
-    smart_chunk_markdown,
-    extract_section_info,
-)
-
-# Crawl presets
-from config.crawl_presets import (
-    get_preset,
-    get_all_presets,
-    filter_sitemap_urls,
-    CRAWL_PRESETS,
-)
-
-# Models
-from models.learning import (
-    CompanyInfo,
-    ScenarioChallenge,
-    CloudScenario,
-    LocationRequest,
-    ResearchResult,
-    ScenarioResponse,
-    GenerateContentRequest,
-    LearningChatRequestWithSession,
-)
-from models.diagram import (
-    DiagramNode,
-    DiagramConnection,
-    AuditDiagramRequest,
-    AuditDiagramResponse,
-)
-from models.challenge import (
-    ChallengeQuestionsRequest,
-    GradeChallengeAnswerRequest,
-)
-from models.cli import (
-    CLISimulatorRequest,
-    CLIHelpRequest,
-    CLIValidateRequest,
-)
-from models.journey import (
-    LearningJourneyRequest,
-    TrackScenarioRequest,
-    TrackChallengeRequest,
-    TrackFlashcardRequest,
-    TrackQuizRequest,
-    GenerateReportRequest,
-)
-from models.config import (
-    UpdateAIConfigRequest,
-    SetPersonaRequest,
-)
-from models.chat import ChatRequest
-
-# Services
-from services.deps import AgentDeps, get_agent_deps
-from services.openai_service import (
-    async_chat_completion,
-    async_chat_completion_json,
-    detect_skill_level,
-)
-from services.web_search import search_web
-from services.research import research_company
-
-# Utils
-from utils import (
-    add_documents_to_supabase as add_documents_to_db,
-    search_documents,
-    extract_code_blocks,
-    generate_code_example_summary,
-    add_code_examples_to_supabase as add_code_examples_to_db,
-    update_source_info,
-    extract_source_summary,
-    search_code_examples,
-    ApiKeyRequiredError,
-)
-
-# Redis jobs
-from redis_jobs import (
-    check_tenant_rate_limit,
-    get_tenant_crawl_stats,
-    list_tenant_jobs,
-)
-
-# Prompts
-from agent_prompt import SYSTEM_PROMPT, TOOL_DESCRIPTIONS
-from prompts import (
-    SOPHIA_PERSONA,
-    SKILL_DETECTOR_PROMPT,
-    SCENARIO_GENERATOR_PROMPT,
-    COACH_CHAT_PROMPT,
-    SOLUTION_EVALUATOR_PROMPT,
-    RAG_CONTEXT_PROMPT,
-    AWS_PERSONAS,
-    DEFAULT_PERSONA,
-    get_persona_prompt,
-    get_persona_info,
-    get_persona_context,
-    PERSONA_SCENARIO_PROMPT,
-    PERSONA_FLASHCARD_PROMPT,
-    PERSONA_QUIZ_PROMPT,
-    PERSONA_NOTES_PROMPT,
-    PERSONA_COACH_PROMPT,
-    CERTIFICATION_PERSONAS,
-)
-
-# Generators
-from generators import (
-    generate_scenario,
-    generate_flashcards,
-    generate_notes,
-    generate_quiz,
-    generate_challenge_questions,
-    grade_challenge_answer,
-    simulate_cli_command,
-    get_cli_help,
-    create_session as create_cli_session,
-    validate_cli_challenge,
-    get_session_stats as get_cli_session_stats,
-)
-from generators.architect_arena import generate_architect_arena_puzzle
-from generators.scenario import CompanyInfo as GenCompanyInfo
-import random
+from lifecycle import start_worker_resources, close_worker_resources
+from routes import register_routes
+from utils import ApiKeyRequiredError
 
-# Database
-import db
 
 # ============================================
-# CONSTANTS
+# FASTAPI APP SETUP
 # ============================================
 
-# Map short cert codes (stored in DB) to full persona IDs (used in CERTIFICATION_PERSONAS)
-CERT_CODE_TO_PERSONA = {
-    # Foundational
-    "CLF": "cloud-practitioner",
-    "AIF": "ai-practitioner",
-    # Associate
-    "SAA": "solutions-architect-associate",
-    "DVA": "developer-associate",
-    "SOA": "sysops-associate",
-    "DEA": "data-engineer-associate",
-    "MLA": "machine-learning-engineer-associate",
-    # Professional
-    "SAP": "solutions-architect-professional",
-    "DOP": "devops-professional",
-    # Specialty
-    "ANS": "networking-specialty",
-    "SCS": "security-specialty",
-    "MLS": "machine-learning-specialty",
-    "PAS": "sap-specialty",
-    "PAS-C01": "sap-specialty",
-    # Legacy (retired but kept for backward compatibility)
-    "DBS": "database-specialty",
-}
-
-
-def _resolve_persona_id(persona_id: Optional[str], certification_code: Optional[str] = None) -> str:
-    """
-    Resolve persona ID from short code or full ID.
-    Priority: persona_id > certification_code > default
-    """
-    if persona_id:
-        upper = persona_id.upper()
-        if upper in CERT_CODE_TO_PERSONA:
-            return CERT_CODE_TO_PERSONA[upper]
-        if persona_id in CERTIFICATION_PERSONAS:
-            return persona_id
-    
-    if certification_code:
-        upper = certification_code.upper()
-        if upper in CERT_CODE_TO_PERSONA:
-            return CERT_CODE_TO_PERSONA[upper]
-    
-    return DEFAULT_PERSONA
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Per-worker pools and clients; importing this module opens none of them,
+    # so gunicorn can preload it in the master and fork (see lifecycle.py)
+    app.state.startup_timings = await start_worker_resources()
+    yield
+    await close_worker_resources()
 
 
-# ============================================
-# FASTAPI APP SETUP
-# ============================================
-
-app = FastAPI(title="CloudArchistry Learning Agent", description="AI-powered learning agent for AWS cloud architecture")
+app = FastAPI(title="CloudArchistry Learning Agent", description="AI-powered learning agent for AWS cloud architecture", lifespan=lifespan)
 
 # Security: Restrict CORS to trusted origins only
 ALLOWED_ORIGINS = [
@@ -260,8 +48,6 @@ ALLOWED_ORIGINS = [
 ]
 app.add_middleware(CORSMiddleware, allow_origins=ALLOWED_ORIGINS, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
-# Register routes from routes/ directory
-from routes import register_routes
 register_routes(app)
 
 
@@ -279,3925 +65,6 @@ async def api_key_required_handler(request: Request, exc: ApiKeyRequiredError):
     )
 
 
-@app.get("/health")
-async def health():
-    return {"status": "ok", "service": "crawl4ai-rag"}
-
-
-# ============================================
-# CRAWL ENDPOINTS
-# ============================================
-
-def process_code_example(args):
-    """Process a single code example to generate its summary."""
-    code, context_before, context_after = args
-    return generate_code_example_summary(code, context_before, context_after)
-
-
-@app.post("/api/crawl/single")
-async def crawl_single_page(url: str, openai_api_key: str = None, tenant_id: str = None) -> str:
-    """Crawl a single web page and store its content."""
-    from utils import set_request_api_key
-    
-    try:
-        # Set request-scoped API key for embeddings
-        if openai_api_key:
-            set_request_api_key(openai_api_key)
-        
-        ctx = await get_context()
-        crawler = ctx.crawler
-        
-        run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, stream=False)
-        result = await crawler.arun(url=url, config=run_config)
-        
-        if not result.success:
-            return json.dumps({"success": False, "url": url, "error": result.error_message or "Failed to crawl page"}, indent=2)
-        
-        markdown = result.markdown
-        if not markdown:
-            return json.dumps({"success": False, "url": url, "error": "No content extracted from page"}, indent=2)
-        
-        chunks = smart_chunk_markdown(markdown)
-        
-        # Build separate lists for add_documents_to_db
-        urls = []
-        chunk_numbers = []
-        contents = []
-        metadatas = []
-        url_to_full_document = {url: markdown}
-        
-        for i, chunk in enumerate(chunks):
-            section_info = extract_section_info(chunk)
-            urls.append(url)
-            chunk_numbers.append(i)
-            contents.append(chunk)
-            metadatas.append({
-                "title": result.metadata.get("title", ""),
-                "headers": section_info["headers"],
-                "char_count": section_info["char_count"],
-                "word_count": section_info["word_count"],
-            })
-        
-        await add_documents_to_db(urls, chunk_numbers, contents, metadatas, url_to_full_document, tenant_id)
-        
-        neo4j_result = {"extracted": 0, "relationships": 0}
-        if ctx.neo4j_driver:
-            neo4j_result = await extract_aws_services_to_neo4j(
-                content=markdown,
-                source_url=url,
-                neo4j_driver=ctx.neo4j_driver
-            )
-        
-        return json.dumps({"success": True, "url": url, "chunks_stored": len(chunks), "aws_services": neo4j_result}, indent=2)
-        
-    except Exception as e:
-        logger.error(f"Crawl single page error: {e}")
-        return json.dumps({"success": False, "url": url, "error": str(e)}, indent=2)
-    finally:
-        set_request_api_key(None)
-
-
-async def _execute_crawl_job(job_id: str, url: str, max_depth: int, max_concurrent: int, chunk_size: int, tenant_id: str = None, openai_api_key: str = None, preset: str = None, max_urls: int = None):
-    """Execute a crawl job in the background with optional filtering and recursive link following."""
-    from utils import set_request_api_key
-    from urllib.parse import urldefrag, urlparse
-    
-    def normalize_url(u: str) -> str:
-        """Remove fragment from URL for deduplication."""
-        return urldefrag(u)[0]
-    
-    def is_same_domain(base_url: str, link_url: str) -> bool:
-        """Check if link is on the same domain as base URL."""
-        try:
-            base_domain = urlparse(base_url).netloc
-            link_domain = urlparse(link_url).netloc
-            return base_domain == link_domain
-        except:
-            return False
-    
-    try:
-        # Set request-scoped API key for embeddings
-        if openai_api_key:
-            set_request_api_key(openai_api_key)
-        
-        await update_crawl_job(job_id, "running")
-        ctx = await get_context()
-        crawler = ctx.crawler
-        
-        # Build separate lists for add_documents_to_db
-        all_urls = []
-        all_chunk_numbers = []
-        all_contents = []
-        all_metadatas = []
-        url_to_full_document = {}
-        all_code_examples = []
-        crawled_urls = set()
-        
-        # Helper function to process a crawl result
-        async def process_crawl_result(result, crawl_url: str):
-            """Process a successful crawl result and extract data."""
-            if not result.success or not result.markdown:
-                return []
-            
-            crawled_urls.add(normalize_url(crawl_url))
-            url_to_full_document[crawl_url] = result.markdown
-            
-            chunks = smart_chunk_markdown(result.markdown, chunk_size)
-            for i, chunk in enumerate(chunks):
-                section_info = extract_section_info(chunk)
-                all_urls.append(crawl_url)
-                all_chunk_numbers.append(i)
-                all_contents.append(chunk)
-                all_metadatas.append({
-                    "title": result.metadata.get("title", "") if result.metadata else "",
-                    "headers": section_info["headers"],
-                })
-            
-            # Extract code examples
-            code_blocks = extract_code_blocks(result.markdown)
-            for code in code_blocks:
-                all_code_examples.append({
-                    "url": crawl_url,
-                    "code": code["code"],
-                    "language": code.get("language", ""),
-                })
-            
-            # Extract AWS services to Neo4j
-            if ctx.neo4j_driver:
-                await extract_aws_services_to_neo4j(
-                    content=result.markdown,
-                    source_url=crawl_url,
-                    neo4j_driver=ctx.neo4j_driver,
-                    tenant_id=tenant_id
-                )
-            
-            # Return internal links for recursive crawling
-            internal_links = []
-            if hasattr(result, 'links') and result.links:
-                for link in result.links.get("internal", []):
-                    link_url = link.get("href", "")
-                    if link_url and is_same_domain(crawl_url, link_url):
-                        internal_links.append(normalize_url(link_url))
-            return internal_links
-        
-        # Determine crawl strategy based on URL type
-        use_recursive_crawl = False
-        
-        if is_sitemap_index(url):
-            # Parse sitemap index and all child sitemaps
-            logger.info(f"Sitemap index detected: {url}")
-            urls_to_crawl = parse_all_sitemaps_from_index(url, max_sitemaps=50)
-            logger.info(f"Sitemap index parsed: {len(urls_to_crawl)} total URLs found")
-            
-            # Apply filtering if preset is specified
-            if preset:
-                urls_to_crawl = filter_sitemap_urls(urls_to_crawl, preset_name=preset)
-                logger.info(f"After filtering with preset '{preset}': {len(urls_to_crawl)} URLs")
-        elif is_sitemap(url):
-            urls_to_crawl = parse_sitemap(url)
-            logger.info(f"Sitemap found with {len(urls_to_crawl)} URLs")
-            
-            # Apply filtering if preset is specified
-            if preset:
-                urls_to_crawl = filter_sitemap_urls(urls_to_crawl, preset_name=preset)
-                logger.info(f"After filtering with preset '{preset}': {len(urls_to_crawl)} URLs")
-        elif is_txt(url):
-            # Assume it's a list of URLs
-            import requests
-            resp = requests.get(url)
-            urls_to_crawl = [u.strip() for u in resp.text.split('\n') if u.strip()]
-        else:
-            # Regular URL - use recursive crawling with depth
-            urls_to_crawl = [url]
-            use_recursive_crawl = True
-            logger.info(f"Regular URL detected, will crawl recursively up to depth {max_depth}")
-        
-        # Apply max_urls limit
-        effective_max_urls = max_urls if max_urls else 100  # Default limit for recursive crawls
-        if not use_recursive_crawl and max_urls and len(urls_to_crawl) > max_urls:
-            logger.info(f"Limiting crawl to {max_urls} URLs (from {len(urls_to_crawl)})")
-            urls_to_crawl = urls_to_crawl[:max_urls]
-        
-        # Crawl URLs
-        run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, stream=False)
-        
-        if use_recursive_crawl and max_depth > 1:
-            # Recursive crawl with depth-based link following
-            current_level_urls = set([normalize_url(u) for u in urls_to_crawl])
-            
-            for depth in range(max_depth):
-                # Filter out already crawled URLs
-                urls_this_level = [u for u in current_level_urls if normalize_url(u) not in crawled_urls]
-                
-                if not urls_this_level:
-                    logger.info(f"Depth {depth + 1}: No new URLs to crawl")
-                    break
-                
-                # Respect max_urls limit
-                if len(crawled_urls) >= effective_max_urls:
-                    logger.info(f"Reached max URLs limit ({effective_max_urls}), stopping")
-                    break
-                
-                remaining_slots = effective_max_urls - len(crawled_urls)
-                urls_this_level = urls_this_level[:remaining_slots]
-                
-                logger.info(f"Depth {depth + 1}/{max_depth}: Crawling {len(urls_this_level)} URLs")
-                
-                next_level_urls = set()
-                
-                for crawl_url in urls_this_level:
-                    if normalize_url(crawl_url) in crawled_urls:
-                        continue
-                    
-                    try:
-                        result = await crawler.arun(url=crawl_url, config=run_config)
-                        internal_links = await process_crawl_result(result, crawl_url)
-                        
-                        # Add discovered links for next depth level
-                        for link in internal_links:
-                            if link not in crawled_urls:
-                                next_level_urls.add(link)
-                                
-                    except Exception as e:
-                        logger.warning(f"Failed to crawl {crawl_url}: {e}")
-                
-                current_level_urls = next_level_urls
-                logger.info(f"Depth {depth + 1} complete: {len(crawled_urls)} total pages crawled, {len(next_level_urls)} links discovered for next level")
-        else:
-            # Simple crawl without recursive link following (sitemaps, txt files, or depth=1)
-            for crawl_url in urls_to_crawl:
-                if normalize_url(crawl_url) in crawled_urls:
-                    continue
-                
-                try:
-                    result = await crawler.arun(url=crawl_url, config=run_config)
-                    await process_crawl_result(result, crawl_url)
-                except Exception as e:
-                    logger.warning(f"Failed to crawl {crawl_url}: {e}")
-        
-        # Store documents
-        if all_contents:
-            await add_documents_to_db(all_urls, all_chunk_numbers, all_contents, all_metadatas, url_to_full_document, tenant_id)
-        
-        # Generate code summaries and store
-        if all_code_examples:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                args_list = [(ex["code"], "", "") for ex in all_code_examples]
-                summaries = list(executor.map(process_code_example, args_list))
-                for i, summary in enumerate(summaries):
-                    all_code_examples[i]["summary"] = summary
-            await add_code_examples_to_db(all_code_examples)
-        
-        await update_crawl_job(job_id, "completed", result={
-            "urls_crawled": len(crawled_urls),
-            "pages_crawled": len(crawled_urls),
-            "documents_stored": len(all_contents),
-            "code_examples": len(all_code_examples),
-            "total_words": sum(len(c.split()) for c in all_contents),
-        })
-        
-    except Exception as e:
-        logger.error(f"Crawl job {job_id} failed: {e}")
-        await update_crawl_job(job_id, "failed", error=str(e))
-    finally:
-        set_request_api_key(None)
-
-
-@app.post("/api/crawl/smart")
-async def smart_crawl_url(
-    background_tasks: BackgroundTasks,
-    url: str,
-    tenant_id: str = None,
-    openai_api_key: str = None,
-    max_depth: int = 2,
-    max_concurrent: int = 5,
-    chunk_size: int = 5000,
-    preset: str = None,
-    max_urls: int = None,
-):
-    """
-    Smart crawl that handles sitemaps, sitemap indexes, URL lists, and recursive crawling.
-    
-    Args:
-        url: URL to crawl (can be a page, sitemap, sitemap index, or .txt file with URLs)
-        preset: Crawl preset name (architecture-only, core-services, learning-essentials, intermediate, comprehensive)
-        max_urls: Maximum number of URLs to crawl (overrides preset default)
-    """
-    tenant_id = tenant_id or DEFAULT_TENANT_ID
-    
-    # Check rate limit
-    rate_check = await check_tenant_rate_limit(tenant_id)
-    if not rate_check.get("allowed", True):
-        return {"success": False, "error": rate_check.get("reason", "Rate limit exceeded")}
-    
-    # Create job
-    job = await create_crawl_job(url, tenant_id, {
-        "max_depth": max_depth,
-        "max_concurrent": max_concurrent,
-        "chunk_size": chunk_size,
-        "preset": preset,
-        "max_urls": max_urls,
-    })
-    
-    if not job.get("success", True):
-        return job
-    
-    job_id = job["job"]["id"]
-    
-    # Start background task
-    background_tasks.add_task(_execute_crawl_job, job_id, url, max_depth, max_concurrent, chunk_size, tenant_id, openai_api_key, preset, max_urls)
-    
-    return {
-        "success": True,
-        "job_id": job_id,
-        "status": "queued",
-        "message": f"Crawl job started for {url}" + (f" with preset '{preset}'" if preset else ""),
-        "preset": preset,
-        "max_urls": max_urls,
-    }
-
-
-@app.get("/api/crawl/status/{job_id}")
-async def get_crawl_status(job_id: str):
-    """Get the status of a crawl job."""
-    job = await get_crawl_job(job_id)
-    if not job:
-        return {"success": False, "error": "Job not found"}
-    return {"success": True, **job}
-
-
-@app.get("/api/crawl/jobs")
-async def list_crawl_jobs_endpoint(tenant_id: str = None):
-    """List all crawl jobs for a tenant."""
-    tenant_id = tenant_id or DEFAULT_TENANT_ID
-    jobs = await list_tenant_jobs(tenant_id)
-    return {"success": True, "tenant_id": tenant_id, "jobs": jobs, "count": len(jobs)}
-
-
-@app.get("/api/crawl/stats")
-async def get_crawl_stats(tenant_id: str = None):
-    """Get crawl statistics for a tenant."""
-    tenant_id = tenant_id or DEFAULT_TENANT_ID
-    stats = await get_tenant_crawl_stats(tenant_id)
-    return {"success": True, "tenant_id": tenant_id, **stats}
-
-
-@app.get("/api/crawl/presets")
-async def list_crawl_presets():
-    """List available crawl presets with their configurations."""
-    presets = get_all_presets()
-    return {
-        "success": True,
-        "presets": {
-            name: {
-                "description": config["description"],
-                "max_urls": config["max_urls"],
-                "services_count": len(config.get("services", [])),
-                "include_patterns_count": len(config.get("include_patterns", [])),
-                "exclude_patterns_count": len(config.get("exclude_patterns", [])),
-            }
-            for name, config in presets.items()
-        },
-        "available_presets": list(presets.keys()),
-    }
-
-
-@app.get("/api/crawl/extract-files")
-async def extract_files_from_sitemap(
-    sitemap_url: str = "https://docs.aws.amazon.com/sitemap_index.xml",
-    file_extension: str = ".zip",
-    max_sitemaps: int = None,
-):
-    """
-    Extract all files with a specific extension from AWS documentation sitemap.
-    
-    Args:
-        sitemap_url: URL of sitemap or sitemap index (default: AWS docs sitemap index)
-        file_extension: File extension to filter (default: .zip)
-        max_sitemaps: Maximum number of child sitemaps to parse from index (optional)
-        
-    Returns:
-        List of all URLs matching the file extension
-    """
-    try:
-        all_urls = []
-        
-        # Check if it's a sitemap index
-        if is_sitemap_index(sitemap_url):
-            logger.info(f"Parsing sitemap index: {sitemap_url}")
-            all_urls = parse_all_sitemaps_from_index(sitemap_url, max_sitemaps=max_sitemaps)
-        elif is_sitemap(sitemap_url):
-            logger.info(f"Parsing sitemap: {sitemap_url}")
-            all_urls = parse_sitemap(sitemap_url)
-        else:
-            return {
-                "success": False,
-                "error": "URL must be a sitemap or sitemap index"
-            }
-        
-        # Filter URLs by file extension
-        file_urls = [url for url in all_urls if url.endswith(file_extension)]
-        
-        return {
-            "success": True,
-            "sitemap_url": sitemap_url,
-            "file_extension": file_extension,
-            "total_urls_found": len(all_urls),
-            "file_urls_found": len(file_urls),
-            "files": file_urls,
-        }
-        
-    except Exception as e:
-        logger.error(f"Error extracting files from sitemap: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        }
-
-
-# ============================================
-# RAG/SEARCH ENDPOINTS
-# ============================================
-
-@app.get("/api/sources")
-async def get_available_sources(tenant_id: str = None) -> str:
-    """Get list of available sources for RAG queries."""
-    try:
-        sources = await db.get_available_sources(tenant_id)
-        return json.dumps({"success": True, "sources": sources}, indent=2)
-    except Exception as e:
-        return json.dumps({"success": False, "error": str(e)}, indent=2)
-
-
-@app.post("/api/search")
-async def perform_rag_query(query: str, source: str = None, match_count: int = 5) -> str:
-    """Perform RAG query against stored documents."""
-    try:
-        ctx = await get_context()
-        
-        # Search documents
-        results = await search_documents(query, source_id=source, match_count=match_count * 2)
-        
-        # Rerank if model available
-        if ctx.reranking_model and results:
-            results = rerank_results(ctx.reranking_model, query, results)
-        
-        # Limit to requested count
-        results = results[:match_count]
-        
-        return json.dumps({
-            "success": True,
-            "query": query,
-            "results": results,
-            "count": len(results),
-        }, indent=2)
-        
-    except Exception as e:
-        return json.dumps({"success": False, "error": str(e)}, indent=2)
-
-
-# ============================================
-# CHAT/RAG AGENT ENDPOINT
-# ============================================
-
-async def execute_tool(tool_name: str, tool_args: dict) -> str:
-    """Execute a tool and return the result."""
-    try:
-        if tool_name == "search_documentation":
-            results = await search_documents(
-                query=tool_args.get("query", ""),
-                source_id=tool_args.get("source"),
-                match_count=5
-            )
-            if results:
-                formatted = []
-                for r in results:
-                    formatted.append(f"**Source:** {r.get('url', 'Unknown')}\n{r.get('content', '')[:1000]}")
-                return "\n\n---\n\n".join(formatted)
-            return "No relevant documentation found."
-        elif tool_name == "get_sources":
-            sources = await db.get_knowledge_sources(limit=50)
-            if sources:
-                return "\n".join([f"- **{s['id']}**: {s.get('summary', 'No summary')[:100]}..." for s in sources])
-            return "No sources available."
-        elif tool_name == "get_aws_services":
-            return await list_aws_services(
-                category=tool_args.get("category"),
-                tenant_id=tool_args.get("tenant_id")
-            )
-        elif tool_name == "get_aws_service_details":
-            return await get_aws_service(
-                service_name=tool_args.get("service_name", ""),
-                tenant_id=tool_args.get("tenant_id")
-            )
-        elif tool_name == "get_aws_architecture":
-            return await get_aws_architecture(
-                use_case=tool_args.get("use_case", ""),
-                tenant_id=tool_args.get("tenant_id")
-            )
-        elif tool_name == "generate_flashcards":
-            from generators.flashcards import generate_flashcards_from_knowledge
-            return await generate_flashcards_from_knowledge(
-                topic=tool_args.get("topic", ""),
-                count=tool_args.get("count", 10)
-            )
-        elif tool_name == "generate_quiz":
-            from generators.quiz import generate_quiz_from_knowledge
-            return await generate_quiz_from_knowledge(
-                topic=tool_args.get("topic", ""),
-                question_count=tool_args.get("question_count", 5)
-            )
-        else:
-            return json.dumps({"error": f"Unknown tool: {tool_name}"})
-    except Exception as e:
-        return json.dumps({"error": str(e)})
-
-
-@app.post("/api/chat")
-async def chat(request: ChatRequest):
-    """Chat with the RAG agent."""
-    from utils import set_request_api_key, set_request_model, get_request_model
-    
-    try:
-        # Set request context if BYOK provided
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        # Use get_async_openai() which checks: request context -> .env -> error
-        client = get_async_openai()
-        model = get_request_model() or DEFAULT_MODEL
-        
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-        
-        if request.conversation_history:
-            messages.extend(request.conversation_history)
-        
-        messages.append({"role": "user", "content": request.message})
-        
-        # First call - may request tools
-        response = await client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=TOOL_DESCRIPTIONS,
-            tool_choice="auto",
-        )
-        
-        assistant_message = response.choices[0].message
-        
-        # Handle tool calls
-        if assistant_message.tool_calls:
-            messages.append(assistant_message)
-            
-            for tool_call in assistant_message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_args = json.loads(tool_call.function.arguments)
-                
-                tool_result = await execute_tool(tool_name, tool_args)
-                
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": tool_result,
-                })
-            
-            # Second call with tool results
-            response = await client.chat.completions.create(
-                model=model,
-                messages=messages,
-            )
-            assistant_message = response.choices[0].message
-        
-        return {
-            "response": assistant_message.content,
-            "model": model,
-        }
-        
-    except ApiKeyRequiredError:
-        raise
-    except Exception as e:
-        logger.error(f"Chat error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# ============================================
-# AWS KNOWLEDGE GRAPH ENDPOINTS
-# ============================================
-
-@app.get("/api/aws/services")
-async def list_aws_services(category: str = None, tenant_id: str = None) -> str:
-    """List all AWS services in the knowledge graph."""
-    try:
-        ctx = await get_context()
-        tenant_id = tenant_id or DEFAULT_TENANT_ID
-        
-        if not ctx.neo4j_driver:
-            return json.dumps({"success": False, "error": "AWS Services graph not available"}, indent=2)
-        
-        async with ctx.neo4j_driver.session() as session:
-            if category:
-                query = """
-                MATCH (s:AWSService {category: $category, tenant_id: $tenant_id})
-                RETURN s.name as name, s.category as category, s.description as description
-                ORDER BY s.name
-                """
-                result = await session.run(query, category=category, tenant_id=tenant_id)
-            else:
-                query = """
-                MATCH (s:AWSService {tenant_id: $tenant_id})
-                RETURN s.name as name, s.category as category, s.description as description
-                ORDER BY s.category, s.name
-                """
-                result = await session.run(query, tenant_id=tenant_id)
-            
-            services = [{"name": r["name"], "category": r["category"], "description": r["description"]} async for r in result]
-            
-            cat_result = await session.run(
-                "MATCH (s:AWSService {tenant_id: $tenant_id}) RETURN DISTINCT s.category as category ORDER BY category",
-                tenant_id=tenant_id
-            )
-            categories = [r["category"] async for r in cat_result]
-            
-            return json.dumps({"success": True, "services": services, "count": len(services), "categories": categories}, indent=2)
-            
-    except Exception as e:
-        return json.dumps({"success": False, "error": str(e)}, indent=2)
-
-
-@app.get("/api/aws/service/{service_name}")
-async def get_aws_service(service_name: str, tenant_id: str = None) -> str:
-    """Get details for a specific AWS service."""
-    try:
-        ctx = await get_context()
-        tenant_id = tenant_id or DEFAULT_TENANT_ID
-        
-        if not ctx.neo4j_driver:
-            return json.dumps({"success": False, "error": "AWS Services graph not available"}, indent=2)
-        
-        async with ctx.neo4j_driver.session() as session:
-            query = """
-            MATCH (s:AWSService {tenant_id: $tenant_id})
-            WHERE toLower(s.name) = toLower($name)
-            RETURN s.name as name, s.category as category, s.description as description
-            """
-            result = await session.run(query, name=service_name, tenant_id=tenant_id)
-            record = await result.single()
-            
-            if not record:
-                return json.dumps({"success": False, "error": f"Service '{service_name}' not found"}, indent=2)
-            
-            service = {"name": record["name"], "category": record["category"], "description": record["description"]}
-            
-            # Get relationships
-            rel_query = """
-            MATCH (s:AWSService {tenant_id: $tenant_id})-[r]-(other:AWSService {tenant_id: $tenant_id})
-            WHERE toLower(s.name) = toLower($name)
-            RETURN type(r) as relationship, other.name as service
-            """
-            rel_result = await session.run(rel_query, name=service_name, tenant_id=tenant_id)
-            relationships = [{"type": r["relationship"], "service": r["service"]} async for r in rel_result]
-            
-            return json.dumps({"success": True, "service": service, "relationships": relationships}, indent=2)
-            
-    except Exception as e:
-        return json.dumps({"success": False, "error": str(e)}, indent=2)
-
-
-@app.post("/api/aws/architecture")
-async def get_aws_architecture(use_case: str, tenant_id: str = None) -> str:
-    """Get recommended AWS architecture for a use case."""
-    try:
-        ctx = await get_context()
-        tenant_id = tenant_id or DEFAULT_TENANT_ID
-        
-        if not ctx.neo4j_driver:
-            return json.dumps({"success": False, "error": "AWS Services graph not available"}, indent=2)
-        
-        async with ctx.neo4j_driver.session() as session:
-            query = """
-            MATCH (s:AWSService {tenant_id: $tenant_id})
-            WHERE toLower(s.description) CONTAINS toLower($use_case)
-               OR toLower(s.name) CONTAINS toLower($use_case)
-            RETURN s.name as name, s.category as category, s.description as description
-            ORDER BY s.category
-            """
-            result = await session.run(query, use_case=use_case, tenant_id=tenant_id)
-            services = [{"name": r["name"], "category": r["category"], "description": r["description"]} async for r in result]
-            
-            return json.dumps({"success": True, "use_case": use_case, "recommended_services": services}, indent=2)
-            
-    except Exception as e:
-        return json.dumps({"success": False, "error": str(e)}, indent=2)
-
-
-@app.post("/api/aws/query")
-async def query_aws_graph(cypher: str, tenant_id: str = None) -> str:
-    """Execute a custom Cypher query."""
-    try:
-        ctx = await get_context()
-        tenant_id = tenant_id or DEFAULT_TENANT_ID
-        
-        if not ctx.neo4j_driver:
-            return json.dumps({"success": False, "error": "AWS Services graph not available"}, indent=2)
-        
-        async with ctx.neo4j_driver.session() as session:
-            result = await session.run(cypher, tenant_id=tenant_id)
-            records = [dict(r) async for r in result][:50]
-            
-            return json.dumps({"success": True, "results": records, "count": len(records)}, indent=2)
-            
-    except Exception as e:
-        return json.dumps({"success": False, "error": str(e)}, indent=2)
-
-
-# ============================================
-# LEARNING ENDPOINTS
-# ============================================
-
-@app.get("/api/learning/certifications")
-async def list_certifications():
-    """List available AWS certifications."""
-    certs = []
-    for code, persona in CERTIFICATION_PERSONAS.items():
-        certs.append({
-            "code": code,
-            "name": persona["cert"],
-            "level": persona["level"],
-            "focus": persona["focus"],
-        })
-    
-    level_order = {"foundational": 0, "associate": 1, "professional": 2, "specialty": 3}
-    certs.sort(key=lambda x: (level_order.get(x["level"], 99), x["name"]))
-    
-    return {"certifications": certs}
-
-
-@app.post("/api/learning/research", response_model=ResearchResult)
-async def research_endpoint(request: LocationRequest):
-    """Research a company."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        result = await research_company(request.company_name, request.industry)
-        return result
-    except Exception as e:
-        logger.error(f"Research error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/learning/generate-scenario-stream")
-async def generate_scenario_stream_endpoint(request: LocationRequest):
-    """Generate scenario with SSE streaming for real-time progress updates"""
-
-    async def event_stream():
-        from utils import set_request_api_key, set_request_model, get_request_api_key
-        from generators.scenario import generate_scenario as gen_scenario, CompanyInfo as GenCompanyInfo
-        from prompts import CERTIFICATION_PERSONAS
-
-        try:
-            # Set request-scoped API key
-            if request.openai_api_key:
-                set_request_api_key(request.openai_api_key)
-            if request.preferred_model:
-                set_request_model(request.preferred_model)
-
-            # Step 1: Starting
-            yield f"data: {json.dumps({'type': 'status', 'message': '🚀 Starting scenario generation...', 'step': 1, 'total_steps': 5})}\n\n"
-            await asyncio.sleep(0.1)
-
-            # Step 2: Research
-            yield f"data: {json.dumps({'type': 'status', 'message': f'🔍 Researching {request.company_name}...', 'step': 2, 'total_steps': 5})}\n\n"
-
-            # Perform web search
-            queries = [
-                f"{request.company_name} company overview business",
-                f"{request.company_name} technology infrastructure cloud",
-            ]
-            if request.industry:
-                queries.append(f"{request.company_name} {request.industry} industry")
-
-            all_sources = []
-            for query in queries:
-                yield f"data: {json.dumps({'type': 'search', 'message': f'🌐 Searching: {query}'})}\n\n"
-                results = await search_web(query, max_results=3)
-                for r in results:
-                    if r.get("url"):
-                        all_sources.append(r["url"])
-                        yield f"data: {json.dumps({'type': 'source', 'url': r['url'], 'title': r.get('title', 'Source')})}\n\n"
-                await asyncio.sleep(0.1)
-
-            # Step 3: Analyzing
-            yield f"data: {json.dumps({'type': 'status', 'message': '🧠 Analyzing company information...', 'step': 3, 'total_steps': 5})}\n\n"
-
-            research = await research_company(
-                company_name=request.company_name,
-                industry=request.industry
-            )
-
-            yield f"data: {json.dumps({'type': 'research', 'company': research.company_info.model_dump(), 'sources': list(set(all_sources))[:5]})}\n\n"
-
-            # Step 3.5: Search AWS knowledge base for relevant content
-            yield f"data: {json.dumps({'type': 'status', 'message': '📚 Searching AWS knowledge base...', 'step': 3, 'total_steps': 6})}\n\n"
-
-            knowledge_context = ""
-            knowledge_topics = []
-            try:
-                import random as kb_random
-                from openai import AsyncOpenAI
-
-                skill_keywords = {
-                    "beginner": "basics fundamentals getting started",
-                    "intermediate": "best practices configuration",
-                    "advanced": "optimization multi-region high availability",
-                    "expert": "enterprise scale architecture patterns",
-                }
-                skill_context = skill_keywords.get(request.user_level, "best practices")
-
-                # Resolve short cert code (e.g., "CLF") to long persona ID (e.g., "cloud-practitioner")
-                resolved_cert = _resolve_persona_id(request.cert_code) if request.cert_code else None
-                
-                if resolved_cert and resolved_cert in CERTIFICATION_PERSONAS:
-                    cert_focus = CERTIFICATION_PERSONAS[resolved_cert]["focus"]
-                    selected_focus = kb_random.sample(cert_focus, min(3, len(cert_focus)))
-                    kb_query = f"{' '.join(selected_focus)} {skill_context} AWS {research.company_info.industry}"
-                    focus_str = ", ".join(selected_focus)
-                    yield f"data: {json.dumps({'type': 'status', 'message': f'🎲 Focus: {focus_str} ({request.user_level})'})}\n\n"
-                else:
-                    kb_query = f"{research.company_info.industry} {skill_context} AWS architecture"
-
-                client = get_async_openai()
-                embed_response = await client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=kb_query
-                )
-                query_embedding = embed_response.data[0].embedding
-
-                kb_results = await db.search_knowledge_chunks(
-                    query_embedding=query_embedding,
-                    limit=5
-                )
-
-                if kb_results:
-                    yield f"data: {json.dumps({'type': 'status', 'message': f'📖 Found {len(kb_results)} relevant AWS knowledge chunks'})}\n\n"
-                    for chunk in kb_results:
-                        yield f"data: {json.dumps({'type': 'knowledge', 'url': chunk['url'], 'similarity': round(chunk['similarity'], 2)})}\n\n"
-                        knowledge_context += f"\n\nAWS Knowledge ({chunk['url']}):\n{chunk['content'][:500]}"
-                        chunk_content = chunk['content'].lower()
-                        for svc in ['s3', 'ec2', 'lambda', 'rds', 'dynamodb', 'cloudwatch', 'iam', 'vpc', 'cloudfront', 'sns', 'sqs', 'kms', 'cloudtrail', 'config']:
-                            if svc in chunk_content and svc.upper() not in knowledge_topics:
-                                knowledge_topics.append(svc.upper())
-
-                    if knowledge_topics:
-                        knowledge_context += f"\n\n⚡ IMPORTANT: Base your challenge titles on these specific AWS topics found: {', '.join(knowledge_topics[:5])}. Create action-oriented titles like 'Secure the S3 Buckets' or 'Configure CloudWatch Alarms' - NOT generic titles like 'Understanding X'."
-                else:
-                    yield f"data: {json.dumps({'type': 'status', 'message': '📖 No specific knowledge chunks found, using general AWS knowledge'})}\n\n"
-            except Exception as kb_err:
-                logger.warning(f"Knowledge base search failed: {kb_err}")
-                yield f"data: {json.dumps({'type': 'status', 'message': '⚠️ Knowledge base search skipped'})}\n\n"
-
-            # Step 4: Validate and resolve cert_code (required by generator)
-            if not request.cert_code:
-                yield f"data: {json.dumps({'type': 'error', 'message': 'cert_code is required for scenario generation'})}\n\n"
-                return
-            
-            # Resolve short cert code to long persona ID for the generator
-            resolved_cert_code = _resolve_persona_id(request.cert_code)
-            
-            # Get cert name for status messages
-            cert_name = None
-            if resolved_cert_code in CERTIFICATION_PERSONAS:
-                cert_name = CERTIFICATION_PERSONAS[resolved_cert_code]["cert"]
-                yield f"data: {json.dumps({'type': 'status', 'message': f'🎯 Applying {cert_name} certification focus...', 'step': 4, 'total_steps': 5})}\n\n"
-            else:
-                yield f"data: {json.dumps({'type': 'error', 'message': f'Invalid cert_code: {request.cert_code}. Could not resolve to a valid certification.'})}\n\n"
-                return
-
-            await asyncio.sleep(0.1)
-
-            # Step 5: Generating scenario
-            yield f"data: {json.dumps({'type': 'status', 'message': '⚡ Generating challenges and learning objectives...', 'step': 5, 'total_steps': 5})}\n\n"
-
-            company_info = GenCompanyInfo(
-                name=research.company_info.name,
-                industry=research.company_info.industry,
-                description=research.company_info.description,
-                key_services=research.company_info.key_services,
-                technology_stack=research.company_info.technology_stack,
-                compliance_requirements=research.company_info.compliance_requirements,
-                data_types=research.company_info.data_types,
-                employee_count=research.company_info.employee_count,
-            )
-
-            scenario = await gen_scenario(
-                company_info=company_info,
-                target_cert=resolved_cert_code,  # Use resolved long code, not short code
-                user_level=request.user_level,
-                knowledge_context=knowledge_context if knowledge_context else None,
-            )
-
-            # Save to database if place_id provided
-            if request.place_id:
-                try:
-                    await db.save_scenario(
-                        location_id=request.place_id,
-                        scenario_data=scenario.model_dump(),
-                        company_info=research.company_info.model_dump(),
-                    )
-                except Exception as db_err:
-                    logger.warning(f"Failed to save scenario to DB: {db_err}")
-
-            # Final result
-            yield f"data: {json.dumps({'type': 'complete', 'scenario': scenario.model_dump(), 'company_info': research.company_info.model_dump(), 'cert_code': request.cert_code, 'cert_name': cert_name})}\n\n"
-
-        except Exception as e:
-            logger.error(f"Stream generation error: {e}")
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
-        finally:
-            set_request_api_key(None)
-            set_request_model(None)
-
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        }
-    )
-
-@app.post("/api/learning/generate-scenario", response_model=ScenarioResponse)
-async def generate_scenario_endpoint(request: LocationRequest):
-    """Generate a training scenario."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        research = await research_company(request.company_name, request.industry)
-        
-        company_info = GenCompanyInfo(
-            name=research.company_info.name,
-            industry=research.company_info.industry,
-            description=research.company_info.description,
-            key_services=research.company_info.key_services,
-            technology_stack=research.company_info.technology_stack,
-            compliance_requirements=research.company_info.compliance_requirements,
-            data_types=research.company_info.data_types,
-            employee_count=research.company_info.employee_count,
-        )
-        
-        # Ensure cert_code is provided (required by generator)
-        if not request.cert_code:
-            raise HTTPException(
-                status_code=400,
-                detail="cert_code is required for scenario generation"
-            )
-        
-        # Resolve short cert code to long persona ID
-        resolved_cert_code = _resolve_persona_id(request.cert_code)
-        if resolved_cert_code not in CERTIFICATION_PERSONAS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid cert_code: {request.cert_code}. Could not resolve to a valid certification."
-            )
-        
-        scenario = await generate_scenario(
-            company_info=company_info,
-            target_cert=resolved_cert_code,  # Use resolved long code
-            user_level=request.user_level,
-        )
-        
-        # Get cert name for response
-        cert_name = CERTIFICATION_PERSONAS[resolved_cert_code]["cert"]
-        
-        if request.place_id:
-            try:
-                await db.save_scenario(
-                    location_id=request.place_id,
-                    scenario_data=scenario.model_dump(),
-                    company_info=research.company_info.model_dump(),
-                )
-            except Exception as db_err:
-                logger.warning(f"Failed to save scenario: {db_err}")
-        
-        return ScenarioResponse(
-            success=True,
-            scenario=scenario,
-            company_info=research.company_info,
-            cert_code=request.cert_code,
-            cert_name=cert_name,
-        )
-    except Exception as e:
-        logger.error(f"Scenario generation error: {e}")
-        return ScenarioResponse(success=False, error=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-# Continue in next part due to size...
-# The remaining endpoints follow the same pattern - import from modules, thin endpoint handlers
-
-# ============================================
-# CHAT TOOLS FOR FUNCTION CALLING
-# ============================================
-
-CHAT_TOOLS = [
-    {
-        "type": "function",
-        "function": {
-            "name": "search_documentation",
-            "description": TOOL_DESCRIPTIONS["search_documentation"],
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "query": {"type": "string", "description": "The search query"},
-                    "source": {"type": "string", "description": "Optional: filter by source domain"}
-                },
-                "required": ["query"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_sources",
-            "description": TOOL_DESCRIPTIONS["get_sources"],
-            "parameters": {"type": "object", "properties": {}, "required": []}
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_aws_services",
-            "description": TOOL_DESCRIPTIONS["get_aws_services"],
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "category": {"type": "string", "description": "Optional: filter by category"}
-                },
-                "required": []
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_aws_service_details",
-            "description": TOOL_DESCRIPTIONS["get_aws_service_details"],
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "service_name": {"type": "string", "description": "The AWS service name"}
-                },
-                "required": ["service_name"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "get_aws_architecture",
-            "description": TOOL_DESCRIPTIONS["get_aws_architecture"],
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "use_case": {"type": "string", "description": "Description of what you want to build"}
-                },
-                "required": ["use_case"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "generate_flashcards",
-            "description": TOOL_DESCRIPTIONS["generate_flashcards"],
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "topic": {"type": "string", "description": "Topic for flashcards"},
-                    "card_count": {"type": "integer", "description": "Number of flashcards"}
-                },
-                "required": ["topic"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "generate_quiz",
-            "description": TOOL_DESCRIPTIONS["generate_quiz"],
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "topic": {"type": "string", "description": "Topic for the quiz"},
-                    "question_count": {"type": "integer", "description": "Number of questions"},
-                    "difficulty": {"type": "string", "description": "Difficulty level"}
-                },
-                "required": ["topic"]
-            }
-        }
-    },
-    {
-        "type": "function",
-        "function": {
-            "name": "generate_study_notes",
-            "description": "Generate comprehensive study notes on an AWS topic.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "topic": {"type": "string", "description": "Topic for study notes"}
-                },
-                "required": ["topic"]
-            }
-        }
-    },
-]
-
-
-# ============================================
-# COACHING RESPONSE (BIG FUNCTION)
-# ============================================
-
-from openai import OpenAI
-
-async def get_coaching_response(
-    message: str,
-    scenario: Optional[CloudScenario] = None,
-    challenge_id: Optional[str] = None,
-    context: Optional[Dict[str, Any]] = None
-) -> dict:
-    """Get a coaching response with dynamic persona switching."""
-    from agent_prompt import SYSTEM_PROMPT as BASE_AGENT_PROMPT
-    
-    CERT_TO_PERSONA = {
-        # Foundational
-        "CLF": "cloud-practitioner", "AIF": "ai-practitioner",
-        # Associate
-        "SAA": "solutions-architect-associate", "DVA": "developer-associate",
-        "SOA": "sysops-associate", "DEA": "data-engineer-associate",
-        "MLA": "machine-learning-engineer-associate",
-        # Professional
-        "SAP": "solutions-architect-professional", "DOP": "devops-professional",
-        # Specialty
-        "ANS": "networking-specialty", "SCS": "security-specialty",
-        "MLS": "machine-learning-specialty", "PAS": "sap-specialty",
-        # Legacy
-        "DBS": "database-specialty",
-    }
-    
-    target_cert = context.get("target_certification") if context else None
-    persona_id = CERT_TO_PERSONA.get(target_cert, "solutions-architect-associate")
-    persona_prompt = get_persona_prompt(persona_id)
-    persona_info = get_persona_info(persona_id)
-    persona_name = persona_info['name']
-    
-    # Build learner context
-    context_parts = []
-    if context:
-        learner_parts = []
-        if context.get("user_name"):
-            learner_parts.append(f"Name: {context['user_name']}")
-        if context.get("skill_level"):
-            learner_parts.append(f"Skill Level: {context['skill_level']}")
-        if context.get("target_certification"):
-            learner_parts.append(f"Studying for: {context['target_certification']}")
-        
-        stats = context.get("stats", {})
-        if stats:
-            learner_parts.append(f"Level {stats.get('level', 1)} | {stats.get('total_points', 0)} points")
-        
-        practiced = context.get("practiced_services", [])
-        if practiced:
-            learner_parts.append(f"AWS services practiced: {', '.join(practiced[:10])}")
-        
-        if learner_parts:
-            context_parts.append("LEARNER PROFILE:\n" + "\n".join(learner_parts))
-    
-    # Use context-provided challenge info (more complete) or fall back to scenario lookup
-    if context and context.get("challenge_title"):
-        # Full challenge context from frontend
-        context_parts.append(f"\n=== CURRENT CHALLENGE ===")
-        context_parts.append(f"Challenge: {context.get('challenge_title')}")
-        if context.get("challenge_description"):
-            context_parts.append(f"Description: {context.get('challenge_description')}")
-        if context.get("challenge_brief"):
-            context_parts.append(f"Brief: {context.get('challenge_brief')}")
-        if context.get("success_criteria"):
-            criteria = context.get("success_criteria")
-            if isinstance(criteria, list):
-                context_parts.append(f"Success Criteria: {', '.join(criteria)}")
-        if context.get("aws_services_relevant"):
-            services = context.get("aws_services_relevant")
-            if isinstance(services, list):
-                context_parts.append(f"Required AWS Services: {', '.join(services)}")
-        
-        # Business context
-        context_parts.append(f"\n=== BUSINESS CONTEXT ===")
-        context_parts.append(f"Company: {context.get('company_name', 'Unknown')}")
-        context_parts.append(f"Industry: {context.get('industry', 'Technology')}")
-        if context.get("business_context"):
-            context_parts.append(f"Business Context: {context.get('business_context')}")
-        
-        # User's current progress
-        context_parts.append(f"\n=== USER'S CURRENT WORK ===")
-        diagram_services = context.get("diagram_services", [])
-        if diagram_services:
-            context_parts.append(f"Services in their diagram: {', '.join(diagram_services)}")
-        else:
-            context_parts.append("Services in their diagram: None yet")
-        context_parts.append(f"Diagram nodes: {context.get('diagram_node_count', 0)}")
-        context_parts.append(f"Questions answered: {context.get('questions_answered', 0)}/{context.get('questions_total', 0)}")
-        if context.get("drawing_passed"):
-            context_parts.append("Drawing audit: PASSED ✓")
-        elif context.get("last_audit_score") is not None:
-            context_parts.append(f"Last audit score: {context.get('last_audit_score')}/100")
-        if context.get("current_question"):
-            context_parts.append(f"Current question: {context.get('current_question')}")
-        
-        # CLI objectives (for anti-cheat detection)
-        cli_objectives = context.get("cli_objectives", [])
-        if cli_objectives and context.get("mode") == "cli_tutor":
-            context_parts.append(f"\n=== ACTIVE CLI OBJECTIVES (DO NOT GIVE DIRECT ANSWERS) ===")
-            context_parts.append("The user must complete these objectives by figuring out the commands themselves:")
-            for obj in cli_objectives:
-                desc = obj.get("description", "")
-                pattern = obj.get("command_pattern", "")
-                context_parts.append(f"  - {desc}")
-                if pattern:
-                    context_parts.append(f"    (Pattern hint: {pattern})")
-            context_parts.append("REMEMBER: Guide them, don't give them the exact commands!")
-    elif scenario:
-        # Fall back to scenario lookup
-        context_parts.append(f"\nCURRENT SCENARIO: {scenario.scenario_title}")
-        context_parts.append(f"Company: {scenario.company_name}")
-        context_parts.append(f"Business Context: {scenario.business_context}")
-        
-        if challenge_id:
-            challenge = next((c for c in scenario.challenges if c.id == challenge_id), None)
-            if challenge:
-                context_parts.append(f"\nCurrent Challenge: {challenge.title}")
-                context_parts.append(f"Success Criteria: {', '.join(challenge.success_criteria)}")
-    
-    learner_context = "\n".join(context_parts) if context_parts else ""
-    
-    system_prompt = f"""## YOUR PERSONA FOR THIS SESSION
-You are {persona_name}, an AWS learning coach specializing in the {persona_info['cert']}.
-
-YOUR IDENTITY:
-- Your name is {persona_name}
-- You specialize in: {', '.join(persona_info['focus'])}
-- Your coaching style: {persona_info['style']}
-
-{persona_prompt}
-
-## BASE AGENT CAPABILITIES & TOOLS
-{BASE_AGENT_PROMPT}
-
-## CURRENT LEARNER CONTEXT
-{learner_context}
-
-## INSTRUCTIONS
-- Use your tools when they would help the learner
-- Adapt your responses to the learner's skill level
-- Be {persona_name} - stay in character
-
-## ANTI-CHEAT RULES (CRITICAL - NEVER VIOLATE)
-If the user is in CLI tutor mode with active objectives:
-1. NEVER give the exact AWS CLI command that completes an objective
-2. If the user's message contains text that matches or closely resembles an objective description, they are likely trying to cheat by copy-pasting the objective
-3. Instead of giving the answer, guide them with:
-   - Explain the CONCEPT behind what they need to do
-   - Point them to AWS documentation
-   - Give PARTIAL hints (e.g., "You'll need the aws dynamodb command...")
-   - Ask them what they've tried so far
-4. You can explain what a command DOES after they've run it, but don't give commands BEFORE they attempt them
-5. If they explicitly ask "what is the command for X" or paste an objective, respond with guidance, not the answer"""
-
-    try:
-        from utils import get_request_model
-        model = get_request_model()
-        
-        # Use get_async_openai() which checks: request context -> .env -> error
-        # Note: Using sync OpenAI client here, so we get the client from get_async_openai and use its api_key
-        async_client = get_async_openai()
-        client = OpenAI(api_key=async_client.api_key)
-        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": message}]
-        
-        response = client.chat.completions.create(
-            model=model, messages=messages, tools=CHAT_TOOLS, tool_choice="auto",
-            temperature=0.5, max_tokens=2000  # Lower temp for reliable tool selection
-        )
-        
-        assistant_message = response.choices[0].message
-        tools_used = []
-        
-        while assistant_message.tool_calls:
-            tool_results = []
-            for tool_call in assistant_message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_args = json.loads(tool_call.function.arguments)
-                result = await execute_tool(tool_name, tool_args)
-                tools_used.append({"tool": tool_name, "args": tool_args})
-                tool_results.append({"tool_call_id": tool_call.id, "role": "tool", "content": result})
-            
-            messages.append({
-                "role": "assistant", "content": assistant_message.content,
-                "tool_calls": [{"id": tc.id, "type": "function", "function": {"name": tc.function.name, "arguments": tc.function.arguments}} for tc in assistant_message.tool_calls]
-            })
-            messages.extend(tool_results)
-            
-            response = client.chat.completions.create(
-                model=model, messages=messages, tools=CHAT_TOOLS, tool_choice="auto",
-                temperature=0.5, max_tokens=2000  # Lower temp for reliable tool selection
-            )
-            assistant_message = response.choices[0].message
-        
-        final_content = assistant_message.content or "I apologize, but I couldn't generate a response."
-        
-        # Extract key terms
-        key_terms = []
-        try:
-            extraction_response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "Extract 3-8 key AWS services or technical concepts mentioned in the response. Return a JSON object with a 'terms' array: {\"terms\": [{\"term\": \"VPC\", \"category\": \"Networking\"}, {\"term\": \"S3\", \"category\": \"Storage\"}]}. Categories: Networking, Compute, Storage, Database, Security, Monitoring, Other."},
-                    {"role": "user", "content": f"Extract key AWS terms from this response:\n\n{final_content[:1500]}"}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3,
-                max_tokens=500
-            )
-            content = extraction_response.choices[0].message.content
-            parsed = json.loads(content)
-            key_terms = parsed.get("terms", [])
-            logger.info(f"Extracted {len(key_terms)} key terms: {[t.get('term') for t in key_terms]}")
-        except Exception as e:
-            logger.warning(f"Key terms extraction failed: {e}")
-            key_terms = []
-        
-        return {"response": final_content, "key_terms": key_terms, "tools_used": tools_used}
-            
-    except Exception as e:
-        logger.error(f"Coach response failed: {e}")
-        return {"response": "I'm having trouble processing that. Could you rephrase?", "key_terms": [], "tools_used": []}
-
-
-# ============================================
-# LEARNING CHAT ENDPOINT
-# ============================================
-
-@app.post("/api/learning/chat")
-async def learning_chat_endpoint(request: LearningChatRequestWithSession):
-    """Interactive coaching chat with Sophia"""
-    try:
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        session_id = request.session_id
-        if not session_id:
-            session_id = str(uuid.uuid4())
-            try:
-                await db.create_coaching_session(session_id=session_id, scenario_id=request.scenario_id, user_id=request.user_id)
-            except Exception as db_err:
-                logger.warning(f"Failed to create session: {db_err}")
-        
-        scenario = None
-        if request.scenario_id:
-            scenario_data = await db.get_scenario(request.scenario_id)
-            if scenario_data:
-                scenario = CloudScenario(**scenario_data)
-        
-        try:
-            await db.save_coaching_message(session_id=session_id, role="user", content=request.message,
-                metadata={"challenge_id": request.challenge_id} if request.challenge_id else None)
-        except:
-            pass
-        
-        result = await get_coaching_response(
-            message=request.message, scenario=scenario,
-            challenge_id=request.challenge_id, context=request.context
-        )
-        
-        response_text = result.get("response", "") if isinstance(result, dict) else result
-        key_terms = result.get("key_terms", []) if isinstance(result, dict) else []
-        tools_used = result.get("tools_used", []) if isinstance(result, dict) else []
-        
-        try:
-            await db.save_coaching_message(session_id=session_id, role="assistant", content=response_text,
-                metadata={"tools_used": tools_used} if tools_used else None)
-        except:
-            pass
-        
-        return {
-            "response": response_text, "key_terms": key_terms, "tools_used": tools_used,
-            "session_id": session_id, "scenario_id": request.scenario_id, "challenge_id": request.challenge_id
-        }
-    except Exception as e:
-        logger.error(f"Learning chat error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.get("/api/learning/chat/history/{session_id}")
-async def get_chat_history(session_id: str, limit: int = 50):
-    """Get chat history for a session"""
-    try:
-        messages = await db.get_session_history(session_id, limit=limit)
-        return {"session_id": session_id, "messages": messages}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/api/learning/evaluate-solution")
-async def evaluate_solution_endpoint(scenario_id: str, challenge_id: str, solution: Dict[str, Any]):
-    """Evaluate a user's solution"""
-    from utils import get_request_model
-    scenario = await db.get_scenario(scenario_id)
-    if not scenario:
-        raise HTTPException(status_code=404, detail="Scenario not found")
-    
-    challenge = next((c for c in scenario.get("challenges", []) if c["id"] == challenge_id), None)
-    if not challenge:
-        raise HTTPException(status_code=404, detail="Challenge not found")
-    
-    system_prompt = f"""{SOLUTION_EVALUATOR_PROMPT.format(
-        challenge_title=challenge["title"], challenge_description=challenge["description"],
-        success_criteria=", ".join(challenge.get("success_criteria", [])),
-        aws_services=", ".join(challenge.get("aws_services_relevant", [])),
-        solution=json.dumps(solution),
-    )}
-Return JSON with: score (0-100), passed (boolean), strengths (list), improvements (list), feedback (string)"""
-    
-    result = await async_chat_completion_json(
-        messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": "Evaluate this solution."}],
-        model=get_request_model(),
-    )
-    
-    return {"score": result.get("score", 0), "feedback": result.get("feedback", ""), "passed": result.get("passed", False),
-            "strengths": result.get("strengths", []), "improvements": result.get("improvements", [])}
-
-
-# ============================================
-# DIAGRAM AUDIT
-# ============================================
-
-DIAGRAM_AUDIT_PROMPT = """You are Sophia, an expert AWS Solutions Architect coaching a learner on their architecture diagram.
-
-## Challenge Context
-Title: {challenge_title}
-Brief: {challenge_brief}
-Expected AWS Services: {expected_services}
-
-**IMPORTANT**: Your audit MUST be based on the challenge brief above. Judge the diagram against what the brief is asking for, not against a generic "perfect" architecture.
-
-## User's Architecture Diagram
-```json
-{diagram_json}
-```
-
-## ⚠️ CRITICAL: SYSTEM SERVICE REGISTRY ⚠️
-The learner can ONLY use these services. This is the COMPLETE list of what exists in the system:
-{available_services_list}
-
-## ⚠️ CRITICAL: CONNECTION & PLACEMENT RULES ⚠️
-These are the VALID connection and placement rules from aws-placement-rules.ts (SINGLE SOURCE OF TRUTH):
-{service_rules}
-
-## AWS Service Scope Reference
-- **global**: IAM, Route 53, CloudFront - exist outside regions
-- **edge**: CloudFront, Global Accelerator, WAF - edge locations
-- **regional**: Most services - exist in a region but outside VPCs
-- **az**: Subnets, EBS - scoped to a single Availability Zone
-- **vpc**: EC2, RDS, ALB - require VPC placement
-
-## Valid Relationship Types (Edge Types)
-{edge_types}
-
-## Client-Side Audit Results (Already Validated)
-{local_audit}
-
-## ⚠️ CRITICAL: ISSUE SEVERITY CLASSIFICATION ⚠️
-
-### ERROR (severity: "error") — CAN fail the diagram
-Only these placement violations are hard failures:
-- Global/edge service inside VPC (CloudFront, Route53, IAM in VPC)
-- Regional service inside subnet (S3, DynamoDB in subnet)
-- VPC resource in wrong container (RDS in public subnet, EC2 in Security Group)
-- Non-container used as container (EC2 inside Security Group)
-
-### WARNING (severity: "warning") — NEVER fails, only suggests
-Architectural improvements that should NOT block completion:
-- Single NAT Gateway (HA suggestion)
-- Single-AZ database or cache (resilience suggestion)
-- Missing Auto Scaling (scalability suggestion)
-- ASG shown in one subnet (ASG logically spans subnets)
-
-### NOTE (severity: "note") — Informational only, NO penalty
-Diagram abstraction nuances that are ALLOWED:
-- IGW → ALB connection (visually implies IGW → VPC → ALB ENIs)
-- RDS primary → standby edge (replication is managed internally, but diagram shows intent)
-- CloudWatch → resource edges (monitoring relationship, not data flow)
-- PrivateLink at VPC level (ENIs are in subnets, but VPC-level abstraction is valid)
-
-## ⚠️ THE GOLDEN RULE ⚠️
-**Only placement ERRORS can invalidate a diagram.**
-**Connectivity and resilience issues can NEVER fail it — only suggest improvements.**
-
-If ASG exists AND multiple subnets exist → assume HA intent, do NOT penalize.
-If diagram shows logical relationships → accept the abstraction, add a note at most.
-
-## ⚠️ COMPLETION CRITERIA (75% = PASS) ⚠️
-**A diagram is COMPLETE when it meets the challenge brief requirements.**
-
-Scoring guide:
-- **75-100%**: PASSING - The diagram meets the challenge brief. Congratulate them!
-  - If score >= 75: Set "is_complete": true and celebrate their success
-  - Only mention minor optional improvements, don't invent new requirements
-- **50-74%**: CLOSE - Core components present but missing key elements for the brief
-- **0-49%**: NEEDS WORK - Significant gaps relative to the challenge brief
-
-**DO NOT keep finding issues once the challenge brief is satisfied.**
-If the diagram fulfills what the brief asked for with valid placements, give 75%+ and mark complete.
-Warnings and notes should NOT reduce the score below passing.
-
-## ⚠️ ABSOLUTE RULE: NEVER GIVE AWAY THE ANSWER ⚠️
-You are a COACH helping someone LEARN, not a cheat sheet giving answers.
-
-**REQUIRED - Always use these coaching patterns:**
-- ✅ Ask "What happens if...?" questions
-- ✅ Describe the PROBLEM or RISK, never the solution
-- ✅ Hint at concepts: "Think about high availability..." not "Add redundancy"
-- ✅ Point out placement/connection issues as learning opportunities
-
-## Response Format
-Return ONLY valid JSON:
-{{
-  "score": <0-100>,
-  "is_complete": <true if score >= 75 and challenge brief is satisfied>,
-  "correct": ["what they got right - valid placements, good connections, etc."],
-  "incorrect": ["ONLY severity:error issues - hard placement violations"],
-  "missing": ["warnings and notes - describe RISK not solution"],
-  "suggestions": ["discovery questions about architecture decisions"],
-  "feedback": "encouraging message - if complete, congratulate them!"
-}}"""
-
-
-@app.post("/api/learning/audit-diagram", response_model=AuditDiagramResponse)
-async def audit_diagram_endpoint(request: AuditDiagramRequest):
-    """Audit a user's AWS architecture diagram"""
-    try:
-        from utils import set_request_api_key, set_request_model, get_request_api_key, get_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        nodes_by_id = {n.id: n for n in request.nodes}
-        
-        def build_node_data(node):
-            data = {"id": node.id, "type": node.type, "label": node.label}
-            if node.config:
-                data["config"] = node.config
-            if node.parent_id:
-                data["inside"] = node.parent_id
-            return data
-        
-        hierarchy = {}
-        for node in request.nodes:
-            if not node.parent_id:
-                if node.id not in hierarchy:
-                    hierarchy[node.id] = {"node": build_node_data(node), "children": []}
-            else:
-                if node.parent_id not in hierarchy:
-                    parent = nodes_by_id.get(node.parent_id)
-                    if parent:
-                        hierarchy[node.parent_id] = {"node": build_node_data(parent), "children": []}
-                if node.parent_id in hierarchy:
-                    hierarchy[node.parent_id]["children"].append(build_node_data(node))
-        
-        diagram_data = {
-            "architecture_hierarchy": [{**h["node"], "contains": h["children"] if h["children"] else None} for h in hierarchy.values()],
-            "all_nodes": [build_node_data(n) for n in request.nodes],
-            "connections": [{"from": c.from_node, "to": c.to_node} for c in request.connections]
-        }
-        
-        # Build available services list for the prompt (compact format)
-        available_services_text = "Not specified - use your best judgment"
-        service_rules_text = "No rules specified"
-        edge_types_text = "No edge types specified"
-        local_audit_text = "No local audit provided"
-        
-        if request.available_services:
-            # Compact list of available service IDs and names with scope
-            available_services_text = ", ".join([
-                f"{s.id} ({s.name}, scope={s.scope or 'regional'})"
-                for s in request.available_services
-            ])
-            
-            # Detailed rules for services that have constraints
-            # Enhanced with scope, is_vpc_resource, and eni_info
-            rules_list = []
-            for s in request.available_services:
-                rules = []
-                if s.scope and s.scope != "regional":
-                    rules.append(f"scope: {s.scope}")
-                if s.is_vpc_resource:
-                    rules.append("is_vpc_resource: true")
-                if s.can_connect_to:
-                    rules.append(f"can_connect_to: [{', '.join(s.can_connect_to)}]")
-                if s.must_be_inside:
-                    rules.append(f"must_be_inside: [{', '.join(s.must_be_inside)}]")
-                if s.is_container:
-                    rules.append("is_container: true")
-                if s.eni_info:
-                    rules.append(f"creates_eni: {s.eni_info.eni_count} ({s.eni_info.description})")
-                if rules:
-                    rules_list.append(f"- {s.id}: {'; '.join(rules)}")
-            
-            service_rules_text = "\n".join(rules_list) if rules_list else "No placement/connection constraints defined"
-        
-        # Include edge types if provided
-        if request.edge_types:
-            edge_list = []
-            if request.edge_types.attachment:
-                for e in request.edge_types.attachment:
-                    edge_list.append(f"- ATTACHMENT: {e.name} ({e.id}): {', '.join(e.valid_sources)} → {', '.join(e.valid_targets)}")
-            if request.edge_types.endpoint:
-                for e in request.edge_types.endpoint:
-                    edge_list.append(f"- ENDPOINT: {e.name} ({e.id}): {', '.join(e.valid_sources)} → {', '.join(e.valid_targets)}")
-            if request.edge_types.data_flow:
-                for e in request.edge_types.data_flow:
-                    edge_list.append(f"- DATA_FLOW: {e.name} ({e.id}): {', '.join(e.valid_sources)} → {', '.join(e.valid_targets)}")
-            edge_types_text = "\n".join(edge_list[:20]) if edge_list else "No edge types defined"  # Limit to 20 to avoid token overflow
-        
-        # Include local audit results if provided (already validated client-side)
-        if request.local_audit:
-            la = request.local_audit
-            local_audit_text = f"Score: {la.score}/{la.max_score}"
-            if la.placement_issues:
-                local_audit_text += f"\nPlacement Issues ({len(la.placement_issues)}):"
-                for issue in la.placement_issues[:5]:
-                    local_audit_text += f"\n  - {issue.service_id}: {issue.issue}"
-            if la.connection_issues:
-                local_audit_text += f"\nConnection Issues ({len(la.connection_issues)}):"
-                for issue in la.connection_issues[:5]:
-                    local_audit_text += f"\n  - {issue.source_id} → {issue.target_id}: {issue.issue}"
-        
-        system_prompt = DIAGRAM_AUDIT_PROMPT.format(
-            challenge_title=request.challenge_title or "AWS Architecture Challenge",
-            challenge_brief=request.challenge_brief or "Design a secure, scalable AWS architecture.",
-            expected_services=", ".join(request.expected_services) if request.expected_services else "Not specified",
-            diagram_json=json.dumps(diagram_data, indent=2),
-            available_services_list=available_services_text,
-            service_rules=service_rules_text,
-            edge_types=edge_types_text,
-            local_audit=local_audit_text,
-        )
-        
-        # Use get_async_openai() which checks: request context -> .env -> error
-        client = get_async_openai()
-        response = await client.chat.completions.create(
-            model=get_request_model() or "gpt-4o",
-            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": "Audit this diagram."}],
-            response_format={"type": "json_object"}, temperature=0.3,
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        score = result.get("score", 50)
-        
-        # Include local audit data in response if available
-        max_score = 100
-        placement_issues = []
-        connection_issues = []
-        is_valid = True
-        
-        if request.local_audit:
-            max_score = request.local_audit.max_score
-            placement_issues = request.local_audit.placement_issues or []
-            connection_issues = request.local_audit.connection_issues or []
-            # GOLDEN RULE: Only severity="error" issues can invalidate a diagram
-            # Warnings and notes should NEVER fail the diagram
-            error_placements = [p for p in placement_issues if getattr(p, 'severity', 'error') == 'error']
-            error_connections = [c for c in connection_issues if getattr(c, 'severity', 'warning') == 'error']
-            is_valid = len(error_placements) == 0 and len(error_connections) == 0
-        
-        return AuditDiagramResponse(
-            score=score,
-            max_score=max_score,
-            is_complete=result.get("is_complete", score >= 75),
-            is_valid=is_valid,
-            correct=result.get("correct", []),
-            incorrect=result.get("incorrect", []),
-            missing=result.get("missing", []), 
-            suggestions=result.get("suggestions", []),
-            placement_issues=placement_issues,
-            connection_issues=connection_issues,
-            feedback=result.get("feedback", ""), 
-            session_id=request.session_id,
-        )
-    except Exception as e:
-        logger.error(f"Diagram audit error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-# ============================================
-# CHALLENGE QUESTIONS ENDPOINTS
-# ============================================
-
-@app.post("/api/learning/challenge-questions")
-async def generate_challenge_questions_endpoint(request: ChallengeQuestionsRequest):
-    """Generate questions for a challenge"""
-    try:
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        # Resolve short cert code (e.g., "CLF") to long persona ID (e.g., "cloud-practitioner")
-        resolved_cert_code = _resolve_persona_id(request.cert_code) if request.cert_code else None
-        if not resolved_cert_code or resolved_cert_code not in CERTIFICATION_PERSONAS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid cert_code: {request.cert_code}. Could not resolve to a valid certification."
-            )
-        
-        result = await generate_challenge_questions(
-            challenge=request.challenge, company_name=request.company_name,
-            industry=request.industry, business_context=request.business_context,
-            user_level=request.user_level, cert_code=resolved_cert_code,
-            question_count=request.question_count,
-        )
-        
-        return {
-            "success": True, "challenge_id": result.challenge_id, "challenge_title": result.challenge_title,
-            "brief": result.brief, "questions": [q.model_dump() for q in result.questions],
-            "total_points": result.total_points, "estimated_time_minutes": result.estimated_time_minutes,
-        }
-    except Exception as e:
-        logger.error(f"Challenge questions error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/learning/grade-challenge-answer")
-async def grade_challenge_answer_endpoint(request: GradeChallengeAnswerRequest):
-    """Grade a challenge answer"""
-    from generators.challenge_questions import ChallengeQuestion, QuestionOption
-    
-    try:
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        q = request.question
-        options = [QuestionOption(**o) for o in q["options"]] if q.get("options") else None
-        
-        question = ChallengeQuestion(
-            id=q.get("id", ""), question=q.get("question", ""),
-            question_type=q.get("question_type", "multiple_choice"), options=options,
-            correct_answer=q.get("correct_answer", ""), explanation=q.get("explanation", ""),
-            hint=q.get("hint"), points=q.get("points", 20),
-            aws_services=q.get("aws_services", []), difficulty=q.get("difficulty", "intermediate"),
-        )
-        
-        result = await grade_challenge_answer(
-            question=question, user_answer=request.user_answer,
-            company_context=request.company_context, user_level=request.user_level,
-        )
-        
-        return {"success": True, **result}
-    except Exception as e:
-        logger.error(f"Grade answer error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-# ============================================
-# CLI SIMULATOR ENDPOINTS
-# ============================================
-
-from redis_sessions import get_cli_session, save_cli_session, delete_cli_session, session_exists
-
-
-@app.post("/api/learning/cli-simulate")
-async def cli_simulate_endpoint(request: CLISimulatorRequest):
-    """
-    Simulate an AWS CLI command in a sandboxed environment.
-    Returns realistic AWS CLI output with teaching content.
-    """
-    from generators.cli_simulator import simulate_cli_command, create_session, CLISession
-    
-    try:
-        # Set request-scoped API key and model if provided (BYOK)
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        # Get or create session
-        session_id = request.session_id
-        if session_id:
-            session_data = await get_cli_session(session_id)
-            if session_data:
-                session = CLISession(**session_data)
-            else:
-                session = create_session(
-                    challenge_id=request.challenge_context.get("id") if request.challenge_context else None
-                )
-                session_id = session.session_id
-        else:
-            session = create_session(
-                challenge_id=request.challenge_context.get("id") if request.challenge_context else None
-            )
-            session_id = session.session_id
-        
-        # Normalize cert_code: Convert database format (SAA, SAA-C03) to persona ID (solutions-architect-associate)
-        cert_code = request.cert_code
-        if cert_code and cert_code in CERT_CODE_TO_PERSONA:
-            cert_code = CERT_CODE_TO_PERSONA[cert_code]
-        
-        # Simulate the command
-        result = await simulate_cli_command(
-            command=request.command,
-            session=session,
-            challenge_context=request.challenge_context,
-            user_level=request.user_level,
-            cert_code=cert_code,
-            company_name=request.company_name,
-            industry=request.industry,
-            business_context=request.business_context,
-            objectives=request.objectives,
-            api_key=request.openai_api_key,
-            model=request.preferred_model,
-        )
-        
-        # Save session state to Redis
-        await save_cli_session(session_id, session.model_dump())
-        
-        return {
-            "success": True,
-            "session_id": session_id,
-            "command": result.command,
-            "output": result.output,
-            "exit_code": result.exit_code,
-            "explanation": result.explanation,
-            "next_steps": result.next_steps,
-            "is_dangerous": result.is_dangerous,
-            "warning": result.warning,
-            # Validation and progress fields
-            "is_correct_for_challenge": result.is_correct_for_challenge,
-            "objective_id": result.objective_id,
-            "objective_completed": result.objective_completed,
-            "points_earned": result.points_earned,
-            "aws_service": result.aws_service,
-            "command_type": result.command_type,
-            # Session progress
-            "session_progress": {
-                "total_commands": session.total_commands,
-                "correct_commands": session.correct_commands,
-                "current_streak": session.current_streak,
-                "best_streak": session.best_streak,
-                "objectives_completed": session.objectives_completed,
-                "total_points": session.points_earned,
-            }
-        }
-    except Exception as e:
-        logger.error(f"CLI simulate error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/learning/cli-help")
-async def cli_help_endpoint(request: CLIHelpRequest):
-    """Get contextual CLI help for a topic."""
-    from generators.cli_simulator import get_cli_help
-    
-    try:
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        result = await get_cli_help(
-            topic=request.topic,
-            user_level=request.user_level,
-            cert_code=request.cert_code,
-            challenge_context=request.challenge_context,
-            api_key=request.openai_api_key,
-            model=request.preferred_model,
-        )
-        
-        return {"success": True, **result}
-    except Exception as e:
-        logger.error(f"CLI help error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.delete("/api/learning/cli-session/{session_id}")
-async def cli_session_delete(session_id: str):
-    """Delete CLI session"""
-    deleted = await delete_cli_session(session_id)
-    if deleted:
-        return {"success": True}
-    return {"success": False, "message": "Session not found"}
-
-
-@app.get("/api/learning/cli-session/{session_id}/stats")
-async def cli_session_stats(session_id: str):
-    """Get CLI session stats"""
-    from generators.cli_simulator import CLISession
-    session_data = await get_cli_session(session_id)
-    if not session_data:
-        raise HTTPException(status_code=404, detail="Session not found")
-    session = CLISession(**session_data)
-    stats = get_cli_session_stats(session)
-    return {"success": True, **stats}
-
-
-@app.post("/api/learning/cli-validate")
-async def cli_validate_endpoint(request: CLIValidateRequest):
-    """Validate CLI challenge"""
-    from generators.cli_simulator import CLISession
-    
-    session_data = await get_cli_session(request.session_id)
-    if not session_data:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    try:
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        session = CLISession(**session_data)
-        result = await validate_cli_challenge(session=session, challenge_context=request.challenge_context)
-        
-        return {
-            "success": True, "is_complete": result.is_complete, "score": result.score,
-            "objectives_met": result.objectives_met, "objectives_missing": result.objectives_missing,
-            "feedback": result.feedback, "suggestions": result.suggestions,
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-# ============================================
-# CONTENT GENERATION ENDPOINTS
-# ============================================
-
-@app.post("/api/learning/generate-flashcards")
-async def generate_flashcards_endpoint(request: GenerateContentRequest):
-    """
-    Generate flashcards - supports two modes:
-    1. Scenario-based: Pass scenario_id to generate from a specific scenario
-    2. Certification-based: Pass certification_code to generate from user's target cert + telemetry
-    """
-    import random
-    
-    try:
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        card_count = request.card_count or (request.options.get("card_count", 20) if request.options else 20)
-        user_level = request.user_level or "intermediate"
-        
-        # MODE 1: Scenario-based generation (legacy)
-        if request.scenario_id:
-            from generators.flashcards import (
-                format_flashcards,
-                FlashcardStructuredContent,
-                calculate_difficulty_distribution,
-                extract_facts_from_knowledge,
-                generate_flashcards,
-            )
-            
-            scenario = await db.get_scenario(request.scenario_id)
-            if not scenario:
-                raise HTTPException(status_code=404, detail="Scenario not found")
-            
-            persona_id = request.persona_id
-            if not persona_id and request.user_id:
-                persona_id = await db.get_user_persona(request.user_id)
-            if not persona_id:
-                persona_id = DEFAULT_PERSONA
-            
-            persona_ctx = get_persona_context(persona_id)
-            cert_name = persona_ctx.get("cert_name", "AWS Certification")
-            cert_level = persona_ctx.get("level", "associate")
-            
-            aws_services = set()
-            for c in scenario.get("challenges", []):
-                aws_services.update(c.get("aws_services_relevant", []))
-            aws_services_list = list(aws_services) if aws_services else ["EC2", "S3", "IAM", "VPC"]
-            
-            difficulty_dist = calculate_difficulty_distribution(user_level, cert_level, card_count)
-            
-            knowledge_facts = []
-            try:
-                search_query = f"{cert_name} {' '.join(aws_services_list[:5])} {scenario.get('scenario_title', '')}"
-                client = get_async_openai()
-                embed_response = await client.embeddings.create(model="text-embedding-3-small", input=search_query)
-                query_embedding = embed_response.data[0].embedding
-                kb_results = await db.search_knowledge_chunks(query_embedding=query_embedding, limit=10)
-                if kb_results:
-                    knowledge_facts = extract_facts_from_knowledge(kb_results, aws_services_list, max_facts=card_count + 5)
-            except Exception as kb_err:
-                logger.warning(f"Knowledge base search failed: {kb_err}")
-            
-            if knowledge_facts and len(knowledge_facts) >= card_count // 2:
-                structured_content = FlashcardStructuredContent(
-                    scenario_title=scenario["scenario_title"],
-                    business_context=scenario.get("business_context", ""),
-                    certification=cert_name,
-                    cert_level=cert_level,
-                    skill_level=user_level,
-                    aws_services=aws_services_list,
-                    knowledge_facts=knowledge_facts,
-                    card_count=card_count,
-                    difficulty_distribution=difficulty_dist,
-                )
-                deck = await format_flashcards(structured_content)
-            else:
-                deck = await generate_flashcards(
-                    scenario_title=scenario["scenario_title"],
-                    business_context=scenario.get("business_context", ""),
-                    aws_services=aws_services_list,
-                    user_level=user_level,
-                    card_count=card_count,
-                    challenges=scenario.get("challenges"),
-                    persona_context=persona_ctx,
-                )
-            
-            deck_id = await db.save_flashcard_deck(
-                deck_data=deck.model_dump(),
-                scenario_id=request.scenario_id,
-                deck_type="scenario",
-            )
-            return {"success": True, "deck_id": deck_id, "deck": deck.model_dump(), "generation_method": "scenario"}
-        
-        # MODE 2: Certification-based generation (uses telemetry)
-        else:
-            short_code = (request.certification_code or "SAA").upper()
-            persona_id = CERT_CODE_TO_PERSONA.get(short_code, "solutions-architect-associate")
-            
-            persona = CERTIFICATION_PERSONAS[persona_id]
-            cert_name = persona["cert"]
-            focus_areas = persona["focus"]
-            
-            # Difficulty distribution based on skill level
-            if user_level == "beginner":
-                difficulty_dist = {"easy": 0.5, "medium": 0.4, "hard": 0.1}
-            elif user_level == "advanced":
-                difficulty_dist = {"easy": 0.1, "medium": 0.4, "hard": 0.5}
-            else:
-                difficulty_dist = {"easy": 0.25, "medium": 0.5, "hard": 0.25}
-            
-            # Search knowledge base
-            knowledge_context = ""
-            try:
-                selected_focus = random.sample(focus_areas, min(3, len(focus_areas)))
-                search_query = f"{cert_name} {' '.join(selected_focus)} AWS best practices"
-                client = get_async_openai()
-                embed_response = await client.embeddings.create(model="text-embedding-3-small", input=search_query)
-                kb_results = await db.search_knowledge_chunks(query_embedding=embed_response.data[0].embedding, limit=8)
-                if kb_results:
-                    for chunk in kb_results[:5]:
-                        knowledge_context += f"\n\n{chunk['content'][:600]}"
-            except Exception as kb_err:
-                logger.warning(f"Knowledge base search failed: {kb_err}")
-            
-            # Build telemetry context
-            telemetry_context = ""
-            if request.telemetry:
-                t = request.telemetry
-                telemetry_context = f"""
-User Progress:
-- Skill Level: {t.get('skillLevel', 'intermediate')}
-- Challenges Completed: {t.get('challengesCompleted', 0)}
-- Scenarios Completed: {t.get('scenariosCompleted', 0)}
-- Total Points: {t.get('totalPoints', 0)}
-- Level: {t.get('level', 1)}
-"""
-            
-            # Get existing flashcard topics to avoid duplicates
-            existing_topics = []
-            try:
-                existing_topics = await db.get_existing_flashcard_topics(short_code, limit=30)
-            except Exception as e:
-                logger.warning(f"Could not get existing topics: {e}")
-            
-            # Build avoid list for prompt
-            avoid_context = ""
-            if existing_topics:
-                avoid_context = f"\n\nAVOID these topics (already covered in previous decks):\n" + "\n".join(f"- {t[:80]}" for t in existing_topics[:20])
-            
-            # Use the existing PERSONA_FLASHCARD_PROMPT
-            base_prompt = PERSONA_FLASHCARD_PROMPT.format(
-                cert_name=cert_name,
-                scenario_title=f"{cert_name} Practice",
-                business_context="Certification exam preparation",
-                focus_areas=', '.join(selected_focus),
-                level=persona.get("level", "associate"),
-                card_count=card_count,
-            )
-            
-            client = get_async_openai()
-            model = request.preferred_model or "gpt-4o"
-            
-            prompt = f"""{base_prompt}
-{avoid_context}
-{telemetry_context}
-
-Return JSON: {{"title": "...", "description": "...", "cards": [{{"front": "...", "back": "...", "difficulty": "easy|medium|hard", "tags": [...], "awsServices": [...]}}]}}"""
-
-            response = await client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are an AWS certification exam preparation expert. Return valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.7,
-            )
-            
-            deck_data = json.loads(response.choices[0].message.content)
-            if not deck_data.get("title"):
-                deck_data["title"] = f"{cert_name} Flashcards"
-            if not deck_data.get("description"):
-                deck_data["description"] = f"AI-generated flashcards for {cert_name} certification"
-            
-            # Return deck data - Next.js will save via Prisma
-            return {
-                "success": True,
-                "deck": deck_data,
-                "certification": short_code,
-                "cert_name": cert_name,
-                "card_count": len(deck_data.get("cards", [])),
-                "generation_method": "certification",
-            }
-    
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/learning/generate-notes")
-async def generate_notes_endpoint(request: GenerateContentRequest):
-    """Generate study notes from certification + telemetry + skill level."""
-    from utils import set_request_api_key, set_request_model
-    from generators.notes import generate_notes_for_certification
-    
-    try:
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        short_code = (request.certification_code or "SAA").upper()
-        persona_id = CERT_CODE_TO_PERSONA.get(short_code, "solutions-architect-associate")
-        persona = CERTIFICATION_PERSONAS[persona_id]
-        
-        notes_data = await generate_notes_for_certification(
-            cert_code=persona_id,
-            user_level=request.user_level or "intermediate",
-            telemetry=request.telemetry,
-        )
-        
-        return {
-            "success": True,
-            "notes": notes_data,
-            "certification": short_code,
-            "cert_name": persona["cert"],
-        }
-    finally:
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/learning/generate-quiz")
-async def generate_quiz_endpoint(request: GenerateContentRequest):
-    """Generate quiz from certification + telemetry + skill level."""
-    from utils import set_request_api_key, set_request_model
-    from generators.quiz import generate_quiz_for_certification
-    
-    try:
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        short_code = (request.certification_code or "SAA").upper()
-        persona_id = CERT_CODE_TO_PERSONA.get(short_code, "solutions-architect-associate")
-        persona = CERTIFICATION_PERSONAS[persona_id]
-        question_count = request.options.get("question_count", 10) if request.options else 10
-        
-        # Get existing questions to avoid duplicates
-        existing_questions = []
-        try:
-            existing_questions = await db.get_existing_quiz_questions(short_code, limit=30)
-        except Exception as e:
-            logger.warning(f"Could not get existing questions: {e}")
-        
-        quiz_data = await generate_quiz_for_certification(
-            cert_code=persona_id,
-            user_level=request.user_level or "intermediate",
-            question_count=question_count,
-            telemetry=request.telemetry,
-            existing_questions=existing_questions,
-        )
-        
-        return {
-            "success": True,
-            "quiz": quiz_data,
-            "certification": short_code,
-            "cert_name": persona["cert"],
-            "question_count": len(quiz_data.get("questions", [])),
-        }
-    finally:
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/gaming/hot-streak/generate")
-async def generate_hot_streak_endpoint(request: GenerateContentRequest):
-    """Generate quick-fire questions for Hot Streak game mode."""
-    from generators.game_modes import generate_hot_streak_questions
-    
-    short_code = (request.certification_code or "SAA").upper()
-    question_count = request.options.get("question_count", 25) if request.options else 25
-    exclude_ids = request.options.get("exclude_ids", []) if request.options else []
-    
-    result = await generate_hot_streak_questions(
-        user_level=request.user_level or "intermediate",
-        cert_code=short_code,
-        question_count=question_count,
-        exclude_ids=exclude_ids,
-    )
-    
-    return {
-        "success": True,
-        "questions": [
-            {
-                "id": q.id,
-                "question": q.question,
-                "options": q.options,
-                "correct_index": q.correct_index,
-                "topic": q.topic,
-                "difficulty": q.difficulty,
-                "explanation": q.explanation,
-            }
-            for q in result.questions
-        ],
-        "topics_covered": result.topics_covered,
-        "certification": short_code,
-    }
-
-
-@app.post("/api/gaming/ticking-bomb/generate")
-async def generate_ticking_bomb_endpoint(request: GenerateContentRequest):
-    """Generate quick-fire questions for Ticking Bomb party game."""
-    from utils import set_request_api_key, set_request_model
-    from generators.game_modes import generate_ticking_bomb_questions
-    
-    try:
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        short_code = (request.certification_code or "SAA").upper()
-        question_count = request.options.get("question_count", 30) if request.options else 30
-        
-        result = await generate_ticking_bomb_questions(
-            user_level=request.user_level or "intermediate",
-            cert_code=short_code,
-            question_count=question_count,
-        )
-        
-        return {
-            "success": True,
-            "questions": [
-                {
-                    "id": q.id,
-                    "question": q.question,
-                    "options": q.options,
-                    "correct_index": q.correct_index,
-                    "topic": q.topic,
-                    "difficulty": q.difficulty,
-                    "explanation": q.explanation,
-                }
-                for q in result.questions
-            ],
-            "topics_covered": result.topics_covered,
-            "certification": short_code,
-        }
-    finally:
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/architect-arena/generate")
-async def generate_architect_arena_endpoint(request: GenerateContentRequest):
-    """Generate Architect Arena puzzle payload."""
-    from utils import set_request_api_key, set_request_model
-
-    try:
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-
-        short_code = (request.certification_code or "SAA").upper()
-        difficulty = request.options.get("difficulty") if request.options else None
-
-        puzzle = await generate_architect_arena_puzzle(
-            user_level=request.user_level or "intermediate",
-            cert_code=short_code,
-            difficulty=difficulty,
-        )
-
-        return {
-            "success": True,
-            "puzzle": puzzle.model_dump(),
-            "certification": short_code,
-        }
-    except ApiKeyRequiredError as e:
-        raise HTTPException(status_code=402, detail=str(e))
-    except Exception as e:
-        logger.error(f"Architect Arena generation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate puzzle: {str(e)}")
-    finally:
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-ARCHITECT_ARENA_AUDIT_PROMPT = """You are auditing an AWS architecture PUZZLE submission.
-
-## CRITICAL: This is a PUZZLE game, NOT a free-form design!
-The user was given PRE-GENERATED puzzle pieces (AWS services) scattered randomly on a canvas.
-Their job was to:
-1. PLACE pieces correctly (drag into proper containers - e.g., EC2 into private subnet, ALB into public subnet)
-2. CONNECT pieces correctly (draw edges between related services)
-
-## DO NOT give credit for:
-- Having the services present (they were pre-generated, not chosen by the user)
-- The types of services used (the puzzle defined these)
-
-## DO give credit/penalties for:
-- Correct PLACEMENT: Is EC2 inside a private subnet? Is ALB in public subnet? Are subnets inside VPC?
-- Correct CONNECTIONS: Did user connect ALB -> EC2 -> RDS? Are there logical data flows?
-- Correct HIERARCHY: Proper nesting of containers
-
-## Puzzle Context
-Title: {puzzle_title}
-Brief: {puzzle_brief}
-Expected Hierarchy: {expected_hierarchy}
-Expected Connections: {expected_connections}
-
-## User's Submission
-```json
-{diagram_json}
-```
-
-## Scoring Guide (out of 100)
-- 0-30: Pieces not placed in containers, no connections
-- 31-50: Some correct placements, few connections
-- 51-70: Most placements correct, most connections made
-- 71-90: All placements correct, all connections, good hierarchy
-- 91-100: Perfect placement, connections, and hierarchy
-
-Return ONLY valid JSON:
-{{"score": <0-100>, "correct": ["placement/connection achievements"], "missing": ["placement/connection issues - describe as risks"], "suggestions": ["hints about placement/connections"], "feedback": "encouraging message about their puzzle-solving"}}"""
-
-
-ARCHITECT_ARENA_AUDIT_PROMPT_ENHANCED = """You are auditing an AWS architecture PUZZLE submission with DETAILED, PERSONALIZED feedback.
-
-## USER CONTEXT
-- **Target Certification:** {cert_name}
-- **Certification Focus Areas:** {focus_areas}
-- **Skill Level:** {user_level}
-
-## CRITICAL: This is a PUZZLE game, NOT a free-form design!
-The user was given PRE-GENERATED puzzle pieces (AWS services) scattered randomly on a canvas.
-Their job was to:
-1. PLACE pieces correctly (drag into proper containers - e.g., EC2 into private subnet, ALB into public subnet)
-2. CONNECT pieces correctly (draw edges between related services)
-
-## DO NOT give credit for:
-- Having the services present (they were pre-generated, not chosen by the user)
-- The types of services used (the puzzle defined these)
-
-## DO give credit/penalties for:
-- Correct PLACEMENT: Is EC2 inside a private subnet? Is ALB in public subnet? Are subnets inside VPC?
-- Correct CONNECTIONS: Did user connect ALB -> EC2 -> RDS? Are there logical data flows?
-- Correct HIERARCHY: Proper nesting of containers
-
-## Puzzle Context
-Title: {puzzle_title}
-Brief: {puzzle_brief}
-Expected Hierarchy: {expected_hierarchy}
-Expected Connections: {expected_connections}
-
-## User's Submission
-```json
-{diagram_json}
-```
-
-## AWS Knowledge Base Context (for detailed feedback)
-{knowledge_context}
-
-## Scoring Guide (out of 100)
-- 0-30: Pieces not placed in containers, no connections
-- 31-50: Some correct placements, few connections
-- 51-70: Most placements correct, most connections made
-- 71-90: All placements correct, all connections, good hierarchy
-- 91-100: Perfect placement, connections, and hierarchy
-
-## DETAILED FEEDBACK REQUIREMENTS
-
-### For {user_level} skill level:
-- **beginner**: Provide explicit step-by-step guidance, explain WHY each placement matters, use simple language
-- **intermediate**: Explain trade-offs, reference best practices, suggest optimizations
-- **advanced**: Focus on edge cases, multi-AZ considerations, cost vs performance trade-offs
-- **expert**: Discuss enterprise patterns, compliance implications, disaster recovery strategies
-
-### Certification-Specific Feedback ({cert_name}):
-- Reference topics from the certification focus areas: {focus_areas}
-- Mention specific exam domains where applicable
-- Connect architectural decisions to certification exam objectives
-
-### Knowledge References:
-- When suggesting improvements, reference specific AWS documentation from the knowledge base
-- Provide URLs or service names for further reading
-- Connect suggestions to Well-Architected Framework pillars where relevant
-
-## OUTPUT FORMAT
-Return ONLY valid JSON with these fields:
-
-{{
-  "score": <0-100>,
-  "correct": [
-    "Detailed achievement with WHY it's correct for {cert_name}",
-    "Another correct placement with certification context"
-  ],
-  "missing": [
-    "Specific issue described as a RISK (e.g., 'Security boundary violation - EC2 exposed to internet')",
-    "Another issue with architectural impact explanation"
-  ],
-  "suggestions": [
-    "Actionable suggestion with AWS service reference",
-    "Improvement tip with Well-Architected Framework context"
-  ],
-  "feedback": "Encouraging, skill-appropriate message that references their certification goals and provides next steps",
-  "knowledge_refs": [
-    "AWS service or documentation topic relevant to their mistakes/successes",
-    "Another reference for deeper learning"
-  ],
-  "cert_specific_notes": [
-    "Note about how this architecture pattern relates to {cert_name} exam",
-    "Exam tip or common pitfall for this certification"
-  ],
-  "skill_level_guidance": "Personalized guidance appropriate for {user_level} level - what to focus on next"
-}}
-
-## EXAMPLES OF DETAILED FEEDBACK
-
-### Good "correct" entry:
-"VPC properly contains all subnets - demonstrates understanding of network isolation, a key concept for {cert_name}. This follows the Well-Architected Framework's Security pillar."
-
-### Good "missing" entry:
-"EC2 instances in public subnet - Security risk: Direct internet exposure without bastion host. For {cert_name}, remember that compute resources should typically reside in private subnets with controlled egress via NAT Gateway."
-
-### Good "suggestions" entry:
-"Consider adding a NAT Gateway in the public subnet to allow private subnet resources to access the internet securely. Review AWS VPC documentation on NAT Gateways for {cert_name} exam preparation."
-
-### Good "cert_specific_notes" entry:
-"For {cert_name} exam: Multi-AZ deployment patterns are heavily tested. Your current architecture could be enhanced by distributing resources across multiple Availability Zones for high availability."
-
-Be SPECIFIC, DETAILED, and EDUCATIONAL. Help the user learn, not just score points."""
-
-
-@app.post("/api/architect-arena/audit")
-async def audit_architect_arena_endpoint(request: dict):
-    """Audit Architect Arena puzzle with personalized, detailed feedback based on certification and skill level."""
-    from utils import set_request_api_key, set_request_model, get_request_api_key, get_request_model, fetch_knowledge_for_generation
-    from prompts import CERTIFICATION_PERSONAS
-    
-    try:
-        if request.get("openai_api_key"):
-            set_request_api_key(request["openai_api_key"])
-        if request.get("preferred_model"):
-            set_request_model(request["preferred_model"])
-        
-        # Extract user context for personalized feedback
-        user_level = request.get("user_level", "intermediate")
-        cert_code = request.get("cert_code", "SAA")
-        
-        # Map cert code to persona
-        from generators.architect_arena import CERT_CODE_TO_PERSONA
-        upper_code = cert_code.upper()
-        persona_id = CERT_CODE_TO_PERSONA.get(upper_code)
-        if not persona_id:
-            base_code = upper_code.split("-")[0] if "-" in upper_code else upper_code
-            persona_id = CERT_CODE_TO_PERSONA.get(base_code, "solutions-architect-associate")
-        
-        # Get certification context
-        persona = CERTIFICATION_PERSONAS.get(persona_id, CERTIFICATION_PERSONAS["solutions-architect-associate"])
-        cert_name = persona["cert"]
-        focus_areas = persona["focus"]
-        
-        nodes = request.get("nodes", [])
-        connections = request.get("connections", [])
-        
-        # Build hierarchy - so AI knows what's inside what
-        nodes_by_id = {n.get("id"): n for n in nodes}
-        
-        def build_node_data(node):
-            data = {"id": node.get("id"), "type": node.get("type"), "label": node.get("label")}
-            if node.get("config"):
-                data["config"] = node.get("config")
-            if node.get("parent_id"):
-                data["inside"] = node.get("parent_id")
-            return data
-        
-        hierarchy = {}
-        for node in nodes:
-            if not node.get("parent_id"):
-                if node.get("id") not in hierarchy:
-                    hierarchy[node.get("id")] = {"node": build_node_data(node), "children": []}
-            else:
-                parent_id = node.get("parent_id")
-                if parent_id not in hierarchy:
-                    parent = nodes_by_id.get(parent_id)
-                    if parent:
-                        hierarchy[parent_id] = {"node": build_node_data(parent), "children": []}
-                if parent_id in hierarchy:
-                    hierarchy[parent_id]["children"].append(build_node_data(node))
-        
-        diagram_data = {
-            "architecture_hierarchy": [{**h["node"], "contains": h["children"] if h["children"] else None} for h in hierarchy.values()],
-            "all_nodes": [build_node_data(n) for n in nodes],
-            "connections": [{"from": c.get("source"), "to": c.get("target")} for c in connections]
-        }
-        
-        # Fetch AWS knowledge for validation context
-        puzzle_brief = request.get("puzzle_brief", "Build the architecture")
-        knowledge_context = await fetch_knowledge_for_generation(
-            cert_code=persona_id,
-            topic=f"AWS architecture best practices {puzzle_brief[:100]}",
-            limit=3,
-            api_key=request.get("openai_api_key")
-        )
-        
-        system_prompt = ARCHITECT_ARENA_AUDIT_PROMPT_ENHANCED.format(
-            puzzle_title=request.get("puzzle_title", "Architecture Puzzle"),
-            puzzle_brief=puzzle_brief,
-            expected_hierarchy=json.dumps(request.get("expected_hierarchy", {}), indent=2),
-            expected_connections=json.dumps(request.get("expected_connections", []), indent=2),
-            diagram_json=json.dumps(diagram_data, indent=2),
-            cert_name=cert_name,
-            focus_areas=", ".join(focus_areas[:3]),
-            user_level=user_level,
-            knowledge_context=knowledge_context,
-        )
-        
-        # Use get_async_openai() which checks: request context -> .env -> error
-        client = get_async_openai()
-        response = await client.chat.completions.create(
-            model=get_request_model() or "gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": "Evaluate this puzzle submission."}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.3,
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        
-        return {
-            "score": result.get("score", 0),
-            "correct": result.get("correct", []),
-            "missing": result.get("missing", []),
-            "suggestions": result.get("suggestions", []),
-            "feedback": result.get("feedback", ""),
-            "knowledge_refs": result.get("knowledge_refs", []),
-            "cert_specific_notes": result.get("cert_specific_notes", []),
-            "skill_level_guidance": result.get("skill_level_guidance", ""),
-        }
-    except Exception as e:
-        logger.error(f"Architect Arena audit error: {e}")
-        raise HTTPException(status_code=500, detail=f"Audit failed: {str(e)}")
-    finally:
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/learning/detect-skill")
-async def detect_skill_endpoint(message: str):
-    """Detect skill level"""
-    level = await detect_skill_level(message)
-    return {"skill_level": level}
-
-
-@app.post("/api/learning/generate-diagnostics")
-async def generate_diagnostics_endpoint(request: dict):
-    """
-    Generate comprehensive learner diagnostics based on their platform activity.
-    
-    Analyzes all user data to identify:
-    - Strengths and weaknesses
-    - Exam readiness score
-    - Domain-specific scores
-    - Learning patterns
-    - Personalized recommendations
-    """
-    from utils import set_request_api_key, set_request_model
-    from generators.diagnostics import generate_diagnostics, DiagnosticsContext
-    
-    try:
-        if request.get("openai_api_key"):
-            set_request_api_key(request["openai_api_key"])
-        if request.get("preferred_model"):
-            set_request_model(request["preferred_model"])
-        
-        # Build context from request
-        context = DiagnosticsContext(
-            profile_id=request.get("profile_id", ""),
-            display_name=request.get("display_name"),
-            skill_level=request.get("skill_level", "intermediate"),
-            target_certification=request.get("target_certification"),
-            subscription_tier=request.get("subscription_tier", "free"),
-            total_points=request.get("total_points", 0),
-            level=request.get("level", 1),
-            xp=request.get("xp", 0),
-            current_streak=request.get("current_streak", 0),
-            longest_streak=request.get("longest_streak", 0),
-            achievements_count=request.get("achievements_count", 0),
-            challenges_total=request.get("challenges_total", 0),
-            challenges_completed=request.get("challenges_completed", 0),
-            challenges_completion_rate=request.get("challenges_completion_rate", 0),
-            challenges_avg_score=request.get("challenges_avg_score", 0),
-            challenges_hints_used=request.get("challenges_hints_used", 0),
-            challenges_avg_hints=request.get("challenges_avg_hints", 0.0),
-            difficulty_breakdown=request.get("difficulty_breakdown", {}),
-            scenarios_total=request.get("scenarios_total", 0),
-            scenarios_completed=request.get("scenarios_completed", 0),
-            scenarios_completion_rate=request.get("scenarios_completion_rate", 0),
-            top_services=request.get("top_services", []),
-            industry_breakdown=request.get("industry_breakdown", []),
-            chat_sessions=request.get("chat_sessions", 0),
-            questions_asked=request.get("questions_asked", 0),
-            top_keywords=request.get("top_keywords", []),
-            total_time_minutes=request.get("total_time_minutes", 0),
-            avg_time_per_scenario=request.get("avg_time_per_scenario", 0),
-            activity_timeline=request.get("activity_timeline", []),
-            recent_scenarios=request.get("recent_scenarios", []),
-            previous_diagnostics=request.get("previous_diagnostics", []),
-            # Flashcard stats
-            flashcards_studied=request.get("flashcards_studied", 0),
-            flashcards_mastered=request.get("flashcards_mastered", 0),
-            flashcard_reviews=request.get("flashcard_reviews", 0),
-            flashcard_time_minutes=request.get("flashcard_time_minutes", 0),
-            flashcard_mastery_rate=request.get("flashcard_mastery_rate", 0),
-            # Quiz stats
-            quizzes_attempted=request.get("quizzes_attempted", 0),
-            quizzes_completed=request.get("quizzes_completed", 0),
-            quizzes_passed=request.get("quizzes_passed", 0),
-            quiz_pass_rate=request.get("quiz_pass_rate", 0),
-            quiz_avg_score=request.get("quiz_avg_score", 0),
-            quiz_accuracy=request.get("quiz_accuracy", 0),
-        )
-        
-        result = await generate_diagnostics(context)
-        
-        return {
-            "success": True,
-            "diagnostics": result.model_dump(),
-        }
-    except ApiKeyRequiredError as key_err:
-        raise HTTPException(status_code=402, detail=str(key_err))
-    except Exception as exc:
-        logger.error(f"Diagnostics generation failed: {exc}")
-        raise HTTPException(status_code=500, detail=f"Diagnostics generation failed: {str(exc)}")
-    finally:
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-@app.post("/api/learning/format-study-guide")
-async def format_study_guide_endpoint(request: dict):
-    """FORMAT a study guide from pre-selected content.
-    
-    The tool has already decided what content goes in the plan.
-    The AI just formats it nicely with themes, descriptions, and accountability tips.
-    """
-    try:
-        from utils import set_request_api_key, set_request_model
-        from generators.study_plan import format_study_guide
-
-        if request.get("openai_api_key"):
-            set_request_api_key(request["openai_api_key"])
-        if request.get("preferred_model"):
-            set_request_model(request["preferred_model"])
-
-        # Map short cert code (e.g., "MLS") to full persona ID (e.g., "machine-learning-specialty")
-        target_cert = request.get("target_certification", "")
-        cert_code = _resolve_persona_id(target_cert)
-
-        plan = await format_study_guide(
-            cert_code=cert_code,
-            skill_level=request.get("skill_level", "intermediate"),
-            time_horizon_weeks=request.get("time_horizon_weeks", 6),
-            hours_per_week=request.get("hours_per_week", 6),
-            learning_styles=request.get("learning_styles", ["hands_on"]),
-            coach_notes=request.get("coach_notes"),
-            structured_content=request.get("structured_content", {}),
-            exam_date=request.get("exam_date"),
-            progress_summary=request.get("progress_summary"),
-        )
-        return {"success": True, "plan": plan}
-    except ApiKeyRequiredError as key_err:
-        raise HTTPException(status_code=402, detail=str(key_err)) from key_err
-    except Exception as exc:
-        logger.error("Study guide formatting failed: %s", exc)
-        raise HTTPException(status_code=500, detail=f"Study guide formatting failed: {str(exc)}") from exc
-    finally:
-        from utils import set_request_api_key, set_request_model
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-# ============================================
-# LEARNING JOURNEY ENDPOINTS
-# ============================================
-
-@app.post("/api/learning/journey/track-scenario")
-async def track_scenario_start_endpoint(request: TrackScenarioRequest):
-    """Track scenario start"""
-    ctx = await get_context()
-    return await track_learner_scenario_start(
-        neo4j_driver=ctx.neo4j_driver, profile_id=request.profile_id, tenant_id=request.tenant_id,
-        scenario_id=request.scenario_id, scenario_title=request.scenario_title,
-        company_name=request.company_name, difficulty=request.difficulty, aws_services=request.aws_services
-    )
-
-
-@app.post("/api/learning/journey/track-challenge")
-async def track_challenge_endpoint(request: TrackChallengeRequest):
-    """Track challenge completion"""
-    ctx = await get_context()
-    return await track_challenge_completion(
-        neo4j_driver=ctx.neo4j_driver, profile_id=request.profile_id, tenant_id=request.tenant_id,
-        scenario_id=request.scenario_id, challenge_id=request.challenge_id,
-        challenge_title=request.challenge_title, score=request.score, passed=request.passed,
-        aws_services=request.aws_services
-    )
-
-
-@app.post("/api/learning/journey/track-flashcards")
-async def track_flashcard_endpoint(request: TrackFlashcardRequest):
-    """Track flashcard study"""
-    ctx = await get_context()
-    return await track_flashcard_study(
-        neo4j_driver=ctx.neo4j_driver, profile_id=request.profile_id, tenant_id=request.tenant_id,
-        deck_id=request.deck_id, deck_title=request.deck_title,
-        cards_studied=request.cards_studied, aws_services=request.aws_services
-    )
-
-
-@app.post("/api/learning/journey/track-quiz")
-async def track_quiz_endpoint(request: TrackQuizRequest):
-    """Track quiz attempt"""
-    ctx = await get_context()
-    return await track_quiz_attempt(
-        neo4j_driver=ctx.neo4j_driver, profile_id=request.profile_id, tenant_id=request.tenant_id,
-        quiz_id=request.quiz_id, quiz_title=request.quiz_title,
-        score=request.score, passed=request.passed, aws_services=request.aws_services
-    )
-
-
-@app.get("/api/learning/journey/{profile_id}")
-async def get_journey_endpoint(profile_id: str, tenant_id: str):
-    """Get learner journey"""
-    ctx = await get_context()
-    return await get_learner_journey(neo4j_driver=ctx.neo4j_driver, profile_id=profile_id, tenant_id=tenant_id)
-
-
-@app.get("/api/learning/journey/{profile_id}/recommendations")
-async def get_recommendations_endpoint(profile_id: str, tenant_id: str, limit: int = 5):
-    """Get recommendations"""
-    ctx = await get_context()
-    return await get_recommended_next_steps(neo4j_driver=ctx.neo4j_driver, profile_id=profile_id, tenant_id=tenant_id, limit=limit)
-
-
-@app.post("/api/learning/journey/{profile_id}/report")
-async def generate_journey_report(profile_id: str, request: GenerateReportRequest):
-    """Generate journey report"""
-    from utils import get_request_model
-    
-    journey_data = await db.get_learner_journey_data(profile_id)
-    if not journey_data:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    analysis = await db.get_learner_strengths_weaknesses(profile_id)
-    persona_id = await db.get_user_persona(profile_id)
-    persona = get_persona_info(persona_id or DEFAULT_PERSONA)
-    
-    system_prompt = f"""Generate a {request.report_type} learning journey report.
-Learner: {journey_data['profile'].get('displayName', 'Learner')}
-Level: {journey_data['profile'].get('currentLevel', 1)}
-Points: {journey_data['profile'].get('totalPoints', 0)}
-Cert Track: {persona['cert']}
-Strengths: {json.dumps(analysis.get('strong_areas', []))}
-Weaknesses: {json.dumps(analysis.get('weak_areas', []))}
-
-Format in clean Markdown. Be specific and actionable."""
-
-    report_content = await async_chat_completion(
-        messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": f"Generate {request.report_type} report."}],
-        model=get_request_model(),
-    )
-    
-    report_id = await db.save_journey_report(
-        profile_id=profile_id, report_type=request.report_type, content=report_content,
-        summary=f"{request.report_type.title()} Report", metadata={"persona": persona_id}
-    )
-    
-    return {"success": True, "report_id": report_id, "report_type": request.report_type, "content": report_content}
-
-
-@app.get("/api/learning/journey/{profile_id}/reports")
-async def get_journey_reports_endpoint(profile_id: str, limit: int = 10):
-    """Get journey reports"""
-    reports = await db.get_journey_reports(profile_id, limit)
-    return {"success": True, "reports": reports, "count": len(reports)}
-
-
-@app.get("/api/learning/journey/{profile_id}/data")
-async def get_journey_data_endpoint(profile_id: str):
-    """Get journey data"""
-    data = await db.get_learner_journey_data(profile_id)
-    if not data:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    analysis = await db.get_learner_strengths_weaknesses(profile_id)
-    return {"success": True, "journey": data, "analysis": analysis}
-
-
-# ============================================
-# PORTFOLIO GENERATION ENDPOINT
-# ============================================
-
-from models.portfolio import GeneratePortfolioRequest, GeneratePortfolioResponse
-from generators.portfolio import generate_portfolio_content
-
-
-@app.post("/api/learning/generate-portfolio", response_model=GeneratePortfolioResponse)
-async def generate_portfolio_endpoint(request: GeneratePortfolioRequest):
-    """
-    Generate AI-powered portfolio content from a completed challenge.
-    
-    Takes diagram data, CLI progress, and scenario context to generate:
-    - Professional title
-    - Solution summary
-    - Key architectural decisions
-    - Compliance achievements
-    - AWS services used
-    
-    The generated content can be saved to AcademyPortfolio table by the caller.
-    """
-    from utils import set_request_api_key, set_request_model
-    
-    try:
-        # Set request-scoped API key and model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        # Get OpenAI client (uses request context API key set above)
-        client = get_async_openai(request.openai_api_key)
-        
-        # Determine model to use
-        model = request.preferred_model or DEFAULT_MODEL
-        
-        # Generate portfolio content
-        content = await generate_portfolio_content(
-            request=request,
-            openai_client=client,
-            model=model
-        )
-        
-        logger.info(f"Generated portfolio content for profile {request.profileId}")
-        
-        return GeneratePortfolioResponse(
-            success=True,
-            portfolioId=None,  # Caller saves to DB and gets ID
-            content=content,
-            error=None
-        )
-        
-    except Exception as e:
-        logger.error(f"Portfolio generation failed: {e}")
-        return GeneratePortfolioResponse(
-            success=False,
-            portfolioId=None,
-            content=None,
-            error=str(e)
-        )
-    finally:
-        set_request_api_key(None)
-        set_request_model(None)
-
-
-# ============================================
-# AI CONFIG ENDPOINTS
-# ============================================
-
-@app.get("/api/models")
-async def list_available_models():
-    """List available models"""
-    return {"models": list(AVAILABLE_MODELS.values()), "default": DEFAULT_MODEL}
-
-
-@app.get("/api/tenant/{tenant_id}/ai-config")
-async def get_tenant_ai_config_endpoint(tenant_id: str):
-    """Get tenant AI config"""
-    config = await db.get_tenant_ai_config(tenant_id)
-    if not config:
-        return {"success": False, "error": "Tenant not found"}
-    
-    if config.get("openai_api_key"):
-        key = config["openai_api_key"]
-        config["openai_api_key_masked"] = f"sk-...{key[-4:]}" if len(key) > 4 else "***"
-        config["has_custom_key"] = True
-        del config["openai_api_key"]
-    else:
-        config["has_custom_key"] = False
-    
-    return {"success": True, **config}
-
-
-@app.put("/api/tenant/{tenant_id}/ai-config")
-async def update_tenant_ai_config_endpoint(tenant_id: str, request: UpdateAIConfigRequest):
-    """Update tenant AI config"""
-    if request.preferred_model and request.preferred_model not in AVAILABLE_MODELS:
-        return {"success": False, "error": f"Invalid model. Available: {list(AVAILABLE_MODELS.keys())}"}
-    
-    if request.openai_api_key and not request.openai_api_key.startswith("sk-"):
-        return {"success": False, "error": "Invalid API key format"}
-    
-    success = await db.update_tenant_ai_config(tenant_id=tenant_id, openai_api_key=request.openai_api_key, preferred_model=request.preferred_model)
-    
-    if success:
-        keys_to_remove = [k for k in _tenant_clients.keys() if k.startswith(f"{tenant_id}:")]
-        for k in keys_to_remove:
-            del _tenant_clients[k]
-        return {"success": True, "message": "AI configuration updated"}
-    
-    return {"success": False, "error": "Failed to update configuration"}
-
-
-@app.delete("/api/tenant/{tenant_id}/ai-config/key")
-async def remove_tenant_api_key(tenant_id: str):
-    """Remove tenant API key"""
-    success = await db.update_tenant_ai_config(tenant_id=tenant_id, openai_api_key="")
-    if success:
-        keys_to_remove = [k for k in _tenant_clients.keys() if k.startswith(f"{tenant_id}:")]
-        for k in keys_to_remove:
-            del _tenant_clients[k]
-        return {"success": True}
-    return {"success": False, "error": "Failed to remove API key"}
-
-
-@app.get("/api/user/{user_id}/ai-config")
-async def get_user_ai_config_endpoint(user_id: str):
-    """Get user AI config"""
-    config = await db.get_user_ai_config(user_id)
-    if not config:
-        return {"success": False, "error": "User not found"}
-    
-    if config.get("openai_api_key"):
-        key = config["openai_api_key"]
-        config["openai_api_key_masked"] = f"sk-...{key[-4:]}" if len(key) > 4 else "***"
-        config["has_custom_key"] = True
-        del config["openai_api_key"]
-    else:
-        config["has_custom_key"] = False
-    
-    return {"success": True, **config}
-
-
-@app.put("/api/user/{user_id}/ai-config")
-async def update_user_ai_config_endpoint(user_id: str, request: UpdateAIConfigRequest):
-    """Update user AI config"""
-    if request.preferred_model and request.preferred_model not in AVAILABLE_MODELS:
-        return {"success": False, "error": f"Invalid model"}
-    
-    if request.openai_api_key and not request.openai_api_key.startswith("sk-"):
-        return {"success": False, "error": "Invalid API key format"}
-    
-    success = await db.update_user_ai_config(user_id=user_id, openai_api_key=request.openai_api_key, preferred_model=request.preferred_model)
-    
-    if success:
-        keys_to_remove = [k for k in _tenant_clients.keys() if f":{user_id}:" in k]
-        for k in keys_to_remove:
-            del _tenant_clients[k]
-        return {"success": True}
-    
-    return {"success": False, "error": "Failed to update"}
-
-
-# ============================================
-# PERSONA ENDPOINTS
-# ============================================
-
-@app.get("/api/personas")
-async def list_personas():
-    """List personas"""
-    personas = [{"id": p["id"], "name": p["name"], "cert": p["cert"], "level": p["level"], "focus": p["focus"], "style": p["style"]} for p in AWS_PERSONAS.values()]
-    grouped = {
-        "foundational": [p for p in personas if p["level"] == "foundational"],
-        "associate": [p for p in personas if p["level"] == "associate"],
-        "professional": [p for p in personas if p["level"] == "professional"],
-        "specialty": [p for p in personas if p["level"] == "specialty"],
-    }
-    return {"personas": personas, "grouped": grouped, "default": DEFAULT_PERSONA, "count": len(personas)}
-
-
-@app.get("/api/personas/{persona_id}")
-async def get_persona(persona_id: str):
-    """Get persona"""
-    if persona_id not in AWS_PERSONAS:
-        return {"success": False, "error": f"Persona '{persona_id}' not found"}
-    return {"success": True, **get_persona_info(persona_id)}
-
-
-@app.put("/api/user/{user_id}/persona")
-async def set_user_persona(user_id: str, request: SetPersonaRequest):
-    """Set user persona"""
-    if request.persona_id not in AWS_PERSONAS:
-        return {"success": False, "error": f"Invalid persona"}
-    
-    success = await db.update_user_persona(user_id, request.persona_id)
-    if success:
-        persona = get_persona_info(request.persona_id)
-        return {"success": True, "message": f"Persona set to {persona['name']}", "persona": persona}
-    return {"success": False, "error": "Failed to update persona"}
-
-
-@app.get("/api/user/{user_id}/persona")
-async def get_user_persona(user_id: str):
-    """Get user persona"""
-    persona_id = await db.get_user_persona(user_id)
-    if not persona_id:
-        persona_id = DEFAULT_PERSONA
-    return {"success": True, "persona_id": persona_id, **get_persona_info(persona_id)}
-
-
-# ============================================
-# CLOUD TYCOON GAME ENDPOINTS
-# ============================================
-
-from pydantic import BaseModel as PydanticBaseModel
-from generators.cloud_tycoon import (
-    generate_tycoon_journey,
-    validate_service_match,
-    TycoonJourney,
-    BusinessUseCase,
-    RequiredService,
-    JOURNEY_THEMES,
-)
-
-class TycoonJourneyRequest(PydanticBaseModel):
-    user_level: str = "intermediate"
-    cert_code: Optional[str] = None
-    theme: Optional[str] = None
-    openai_api_key: Optional[str] = None
-    preferred_model: Optional[str] = None
-
-class TycoonValidateRequest(PydanticBaseModel):
-    use_case_id: str
-    business_name: str
-    use_case_title: str
-    use_case_description: str
-    required_services: List[Dict[str, Any]]
-    contract_value: int
-    difficulty: str
-    cert_code: Optional[str] = None
-    user_level: Optional[str] = None
-    submitted_services: List[str]
-
-
-@app.post("/api/tycoon/journey/generate")
-async def generate_tycoon_journey_endpoint(request: TycoonJourneyRequest):
-    """Generate a Cloud Tycoon journey with 10 business use cases."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        journey = await generate_tycoon_journey(
-            user_level=request.user_level,
-            cert_code=request.cert_code,
-            theme=request.theme,
-            api_key=request.openai_api_key,
-        )
-        
-        return {
-            "id": journey.id,
-            "journey_name": journey.journey_name,
-            "theme": journey.theme,
-            "businesses": [
-                {
-                    "id": biz.id,
-                    "business_name": biz.business_name,
-                    "industry": biz.industry,
-                    "icon": biz.icon,
-                    "use_case_title": biz.use_case_title,
-                    "use_case_description": biz.use_case_description,
-                    "required_services": [
-                        {
-                            "service_id": svc.service_id,
-                            "service_name": svc.service_name,
-                            "category": svc.category,
-                            "reason": svc.reason,
-                        }
-                        for svc in biz.required_services
-                    ],
-                    "contract_value": biz.contract_value,
-                    "difficulty": biz.difficulty,
-                    "hints": biz.hints,
-                    "compliance_requirements": biz.compliance_requirements,
-                }
-                for biz in journey.businesses
-            ],
-            "total_contract_value": journey.total_contract_value,
-            "difficulty_distribution": journey.difficulty_distribution,
-        }
-    except ApiKeyRequiredError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Tycoon journey generation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate journey: {str(e)}")
-
-
-@app.post("/api/tycoon/validate")
-async def validate_tycoon_services(request: TycoonValidateRequest):
-    """Validate if submitted services match the use case requirements."""
-    try:
-        use_case = BusinessUseCase(
-            id=request.use_case_id,
-            business_name=request.business_name,
-            industry="",
-            icon="",
-            use_case_title=request.use_case_title,
-            use_case_description=request.use_case_description,
-            required_services=[
-                RequiredService(
-                    service_id=svc.get("service_id", ""),
-                    service_name=svc.get("service_name", ""),
-                    category=svc.get("category", ""),
-                    reason=svc.get("reason", ""),
-                )
-                for svc in request.required_services
-            ],
-            contract_value=request.contract_value,
-            difficulty=request.difficulty,
-            hints=[],
-        )
-        
-        result = await validate_service_match(
-            use_case=use_case,
-            submitted_services=request.submitted_services,
-            cert_code=request.cert_code,
-            user_level=request.user_level,
-        )
-        
-        return result
-    except Exception as e:
-        logger.error(f"Tycoon validation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
-
-
-@app.get("/api/tycoon/themes")
-async def get_tycoon_themes():
-    """Get available journey themes."""
-    return {"themes": JOURNEY_THEMES}
-
-
-# ============================================
-# SERVICE SLOTS ENDPOINTS
-# ============================================
-
-class SlotsGenerateRequest(PydanticBaseModel):
-    user_level: str = "intermediate"
-    cert_code: Optional[str] = None
-    openai_api_key: Optional[str] = None
-    preferred_model: Optional[str] = None
-
-
-class SlotsValidateRequest(PydanticBaseModel):
-    challenge_id: str
-    services: List[Dict[str, Any]]
-    pattern_name: str
-    options: List[Dict[str, Any]]
-    user_level: str
-    cert_code: Optional[str] = None
-    base_payout: int
-    selected_option_id: str
-    bet_amount: int
-
-
-@app.post("/api/slots/challenge/generate")
-async def generate_slots_challenge_endpoint(request: SlotsGenerateRequest):
-    """Generate a Service Slots challenge with 3 services and 4 options."""
-    try:
-        from generators.service_slots import generate_slot_challenge
-        
-        challenge = await generate_slot_challenge(
-            user_level=request.user_level,
-            cert_code=request.cert_code,
-        )
-        
-        return {
-            "id": challenge.id,
-            "services": [
-                {
-                    "service_id": svc.service_id,
-                    "service_name": svc.service_name,
-                    "category": svc.category,
-                }
-                for svc in challenge.services
-            ],
-            "pattern_name": challenge.pattern_name,
-            "pattern_description": challenge.pattern_description,
-            "options": [
-                {
-                    "id": opt.id,
-                    "text": opt.text,
-                    "is_correct": opt.is_correct,
-                    "explanation": opt.explanation,
-                }
-                for opt in challenge.options
-            ],
-            "user_level": challenge.user_level,
-            "base_payout": challenge.base_payout,
-        }
-    except ApiKeyRequiredError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Slots challenge generation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate challenge: {str(e)}")
-
-
-@app.post("/api/slots/validate")
-async def validate_slots_answer_endpoint(request: SlotsValidateRequest):
-    """Validate the player's answer and calculate winnings."""
-    try:
-        from generators.service_slots import validate_slot_answer, SlotChallenge, SlotService, AnswerOption
-        
-        # Reconstruct challenge from request
-        challenge = SlotChallenge(
-            id=request.challenge_id,
-            services=[
-                SlotService(
-                    service_id=svc.get("service_id", ""),
-                    service_name=svc.get("service_name", ""),
-                    category=svc.get("category", ""),
-                )
-                for svc in request.services
-            ],
-            pattern_name=request.pattern_name,
-            pattern_description="",
-            options=[
-                AnswerOption(
-                    id=opt.get("id", ""),
-                    text=opt.get("text", ""),
-                    is_correct=opt.get("is_correct", False),
-                    explanation=opt.get("explanation", ""),
-                )
-                for opt in request.options
-            ],
-            user_level=request.user_level,
-            base_payout=request.base_payout,
-        )
-        
-        result = validate_slot_answer(
-            challenge=challenge,
-            selected_option_id=request.selected_option_id,
-            bet_amount=request.bet_amount,
-            cert_code=request.cert_code,
-        )
-        
-        return result
-    except Exception as e:
-        logger.error(f"Slots validation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
-
-
-# ============================================
-# SPEED DEPLOY ENDPOINTS
-# ============================================
-
-class SpeedDeployGenerateRequest(PydanticBaseModel):
-    user_level: str = "intermediate"
-    cert_code: Optional[str] = None
-    openai_api_key: Optional[str] = None
-    preferred_model: Optional[str] = None
-
-
-class SpeedDeployValidateRequest(PydanticBaseModel):
-    brief_id: str
-    client_name: str
-    industry: str
-    requirements: List[Dict[str, Any]]
-    available_services: List[str]
-    optimal_solution: List[str]
-    acceptable_solutions: List[List[str]]
-    trap_services: List[Dict[str, Any]] = []
-    time_limit: int
-    user_level: str
-    target_cert: str = ""  # For AI-powered validation context
-    max_score: int
-    learning_point: str = ""
-    submitted_services: List[str]
-    time_remaining: int
-    openai_api_key: Optional[str] = None  # For AI-powered validation
-    preferred_model: Optional[str] = None
-
-
-@app.post("/api/speed-deploy/brief/generate")
-async def generate_speed_deploy_brief(request: SpeedDeployGenerateRequest):
-    """Generate a Speed Deploy challenge brief."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        from generators.speed_deploy import generate_deploy_brief
-        
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        brief = await generate_deploy_brief(
-            user_level=request.user_level,
-            cert_code=request.cert_code,
-            api_key=request.openai_api_key,
-            model=request.preferred_model,
-        )
-        
-        return {
-            "id": brief.id,
-            "client_name": brief.client_name,
-            "industry": brief.industry,
-            "icon": brief.icon,
-            "requirements": [
-                {
-                    "category": req.category,
-                    "description": req.description,
-                    "priority": req.priority,
-                }
-                for req in brief.requirements
-            ],
-            "available_services": brief.available_services,
-            "optimal_solution": brief.optimal_solution,
-            "acceptable_solutions": brief.acceptable_solutions,
-            "trap_services": [
-                {
-                    "service_id": trap.service_id,
-                    "why_suboptimal": trap.why_suboptimal,
-                    "penalty": trap.penalty,
-                }
-                for trap in brief.trap_services
-            ],
-            "time_limit": brief.time_limit,
-            "user_level": brief.user_level,
-            "target_cert": brief.target_cert,
-            "max_score": brief.max_score,
-            "learning_point": brief.learning_point,
-        }
-    except ApiKeyRequiredError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Speed Deploy brief generation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate brief: {str(e)}")
-
-
-@app.post("/api/speed-deploy/validate")
-async def validate_speed_deploy(request: SpeedDeployValidateRequest):
-    """Validate the player's deployment with AI-powered GRADED scoring."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        from generators.speed_deploy import validate_deployment_with_ai, DeployBrief, ClientRequirement, ServiceTrap
-        
-        # Set API key for AI validation
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        # Reconstruct brief from request
-        requirements = [
-            ClientRequirement(
-                category=req.get("category", "general"),
-                description=req.get("description", ""),
-                priority=req.get("priority", "important"),
-            )
-            for req in request.requirements
-        ]
-        
-        # Reconstruct trap services
-        trap_services = [
-            ServiceTrap(
-                service_id=trap.get("service_id", ""),
-                why_suboptimal=trap.get("why_suboptimal", ""),
-                penalty=trap.get("penalty", 10),
-            )
-            for trap in request.trap_services
-        ]
-        
-        brief = DeployBrief(
-            id=request.brief_id,
-            client_name=request.client_name,
-            industry=request.industry,
-            icon="",
-            requirements=requirements,
-            available_services=request.available_services,
-            optimal_solution=request.optimal_solution,
-            acceptable_solutions=request.acceptable_solutions,
-            trap_services=trap_services,
-            time_limit=request.time_limit,
-            user_level=request.user_level,
-            target_cert=request.target_cert,
-            max_score=request.max_score,
-            learning_point=request.learning_point,
-        )
-        
-        # Use AI-powered validation for cert-specific feedback
-        result = await validate_deployment_with_ai(
-            brief=brief,
-            submitted_services=request.submitted_services,
-            time_remaining=request.time_remaining,
-            api_key=request.openai_api_key,
-            model=request.preferred_model,
-        )
-        
-        return {
-            # Core result
-            "grade": result.grade,
-            "score": result.score,
-            "max_score": result.max_score,
-            
-            # Score breakdown
-            "correctness_score": result.correctness_score,
-            "speed_bonus": result.speed_bonus,
-            "cost_efficiency_bonus": result.cost_efficiency_bonus,
-            "overengineering_penalty": result.overengineering_penalty,
-            "trap_penalty": result.trap_penalty,
-            "missed_requirement_penalty": result.missed_requirement_penalty,
-            
-            # Analysis
-            "met_requirements": result.met_requirements,
-            "is_optimal": result.is_optimal,
-            "is_acceptable": result.is_acceptable,
-            "requirements_met": result.requirements_met,
-            "requirements_missed": result.requirements_missed,
-            "trap_services_used": result.trap_services_used,
-            "missing_services": result.missing_services,
-            "extra_services": result.extra_services,
-            
-            # Feedback
-            "feedback": result.feedback,
-            "optimal_solution": result.optimal_solution,
-            "learning_point": result.learning_point,
-        }
-    except Exception as e:
-        logger.error(f"Speed Deploy validation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
-
-
-# ============================================
-# PROFICIENCY TEST ENDPOINTS
-# ============================================
-
-class ProficiencyTestStartRequest(BaseModel):
-    """Request to start a proficiency test."""
-    challenge_id: str
-    challenge_title: str
-    challenge_description: str
-    challenge_brief: str
-    success_criteria: List[str]
-    aws_services: List[str]
-    diagram_data: Optional[Dict[str, Any]] = None
-    diagram_services: Optional[List[str]] = None
-    diagram_audit: Optional[Dict[str, Any]] = None  # Full audit results: score, correct, missing, suggestions, feedback
-    diagram_score: Optional[Dict[str, Any]] = None  # Placement score breakdown
-    question_answers: Optional[List[Dict]] = None  # Full question data with user answers
-    company_name: str
-    industry: str
-    business_context: str
-    user_level: str = "intermediate"
-    cert_code: Optional[str] = None
-    previous_chat_history: Optional[List[Dict[str, str]]] = None  # General chat before proficiency test
-    openai_api_key: Optional[str] = None
-    preferred_model: Optional[str] = None
-
-
-class ProficiencyTestChatRequest(BaseModel):
-    """Request to continue proficiency test conversation."""
-    challenge_id: str
-    challenge_title: str
-    challenge_description: str
-    challenge_brief: str
-    success_criteria: List[str]
-    aws_services: List[str]
-    diagram_data: Optional[Dict[str, Any]] = None
-    diagram_services: Optional[List[str]] = None
-    company_name: str
-    industry: str
-    business_context: str
-    user_level: str = "intermediate"
-    chat_history: List[Dict[str, str]]  # [{role, content, timestamp}]
-    user_message: str
-    questions_asked: int = 1
-    openai_api_key: Optional[str] = None
-    preferred_model: Optional[str] = None
-
-
-class ProficiencyTestEvaluateRequest(BaseModel):
-    """Request to evaluate proficiency test."""
-    challenge_id: str
-    challenge_title: str
-    success_criteria: List[str]
-    aws_services: List[str]
-    diagram_services: Optional[List[str]] = None
-    company_name: str
-    industry: str
-    chat_history: List[Dict[str, str]]
-    openai_api_key: Optional[str] = None
-    preferred_model: Optional[str] = None
-
-
-@app.post("/api/proficiency-test/start")
-async def start_proficiency_test_endpoint(request: ProficiencyTestStartRequest):
-    """Start a proficiency test conversation."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        from generators.proficiency_test import (
-            start_proficiency_test,
-            ProficiencyTestContext,
-        )
-        
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        # Build diagram audit if provided
-        diagram_audit = None
-        if request.diagram_audit:
-            from generators.proficiency_test import DiagramAuditResult
-            diagram_audit = DiagramAuditResult(
-                score=request.diagram_audit.get("score", 0),
-                correct=request.diagram_audit.get("correct", []),
-                missing=request.diagram_audit.get("missing", []),
-                suggestions=request.diagram_audit.get("suggestions", []),
-                feedback=request.diagram_audit.get("feedback", ""),
-            )
-        
-        context = ProficiencyTestContext(
-            challenge_id=request.challenge_id,
-            challenge_title=request.challenge_title,
-            challenge_description=request.challenge_description,
-            challenge_brief=request.challenge_brief,
-            success_criteria=request.success_criteria,
-            aws_services=request.aws_services,
-            diagram_data=request.diagram_data,
-            diagram_services=request.diagram_services or [],
-            diagram_audit=diagram_audit,
-            diagram_score=request.diagram_score,
-            question_answers=request.question_answers,
-            company_name=request.company_name,
-            industry=request.industry,
-            business_context=request.business_context,
-            user_level=request.user_level,
-            cert_code=request.cert_code,
-            previous_chat_history=request.previous_chat_history,
-        )
-        
-        result = await start_proficiency_test(context, model=request.preferred_model)
-        
-        return {
-            "success": True,
-            "test_id": result["test_id"],
-            "initial_message": result["initial_message"],
-            "context_summary": result["context_summary"],
-            "questions_asked": result["questions_asked"],
-        }
-    except Exception as e:
-        logger.error(f"Proficiency test start error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to start proficiency test: {str(e)}")
-
-
-@app.post("/api/proficiency-test/chat")
-async def continue_proficiency_test_endpoint(request: ProficiencyTestChatRequest):
-    """Continue the proficiency test conversation."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        from generators.proficiency_test import (
-            continue_proficiency_test,
-            ProficiencyTestContext,
-            ChatMessage,
-        )
-        
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        context = ProficiencyTestContext(
-            challenge_id=request.challenge_id,
-            challenge_title=request.challenge_title,
-            challenge_description=request.challenge_description,
-            challenge_brief=request.challenge_brief,
-            success_criteria=request.success_criteria,
-            aws_services=request.aws_services,
-            diagram_data=request.diagram_data,
-            diagram_services=request.diagram_services or [],
-            company_name=request.company_name,
-            industry=request.industry,
-            business_context=request.business_context,
-            user_level=request.user_level,
-        )
-        
-        # Convert chat history to ChatMessage objects
-        chat_history = [
-            ChatMessage(
-                role=msg.get("role", "user"),
-                content=msg.get("content", ""),
-                timestamp=msg.get("timestamp", ""),
-            )
-            for msg in request.chat_history
-        ]
-        
-        result = await continue_proficiency_test(
-            context=context,
-            chat_history=chat_history,
-            user_message=request.user_message,
-            questions_asked=request.questions_asked,
-            model=request.preferred_model,
-        )
-        
-        return {
-            "success": True,
-            "agent_response": result["agent_response"],
-            "questions_asked": result["questions_asked"],
-            "ready_to_evaluate": result["ready_to_evaluate"],
-        }
-    except Exception as e:
-        logger.error(f"Proficiency test chat error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to continue proficiency test: {str(e)}")
-
-
-@app.post("/api/proficiency-test/evaluate")
-async def evaluate_proficiency_test_endpoint(request: ProficiencyTestEvaluateRequest):
-    """Evaluate the proficiency test and generate final score."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        from generators.proficiency_test import (
-            evaluate_proficiency_test,
-            ProficiencyTestContext,
-            ChatMessage,
-        )
-        
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        context = ProficiencyTestContext(
-            challenge_id=request.challenge_id,
-            challenge_title=request.challenge_title,
-            challenge_description="",
-            challenge_brief="",
-            success_criteria=request.success_criteria,
-            aws_services=request.aws_services,
-            diagram_services=request.diagram_services or [],
-            company_name=request.company_name,
-            industry=request.industry,
-            business_context="",
-        )
-        
-        chat_history = [
-            ChatMessage(
-                role=msg.get("role", "user"),
-                content=msg.get("content", ""),
-                timestamp=msg.get("timestamp", ""),
-            )
-            for msg in request.chat_history
-        ]
-        
-        result = await evaluate_proficiency_test(
-            context=context,
-            chat_history=chat_history,
-            model=request.preferred_model,
-        )
-        
-        return {
-            "success": True,
-            "test_id": result.test_id,
-            "challenge_id": result.challenge_id,
-            "score": result.score,
-            "summary": result.summary,
-            "strengths": result.strengths,
-            "areas_for_improvement": result.areas_for_improvement,
-            "questions_asked": result.questions_asked,
-            "completed_at": result.completed_at,
-        }
-    except Exception as e:
-        logger.error(f"Proficiency test evaluation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to evaluate proficiency test: {str(e)}")
-
-
-# ============================================
-# CLI OBJECTIVES ENDPOINTS
-# ============================================
-
-class CLIObjectivesGenerateRequest(BaseModel):
-    """Request to generate CLI objectives."""
-    challenge_id: str
-    challenge_title: str
-    challenge_description: str
-    success_criteria: List[str]
-    aws_services_relevant: List[str]
-    company_name: str
-    industry: str
-    business_context: str
-    diagram_data: Optional[Dict[str, Any]] = None
-    diagram_services: Optional[List[str]] = None
-    user_level: str = "intermediate"
-    objective_count: int = 3
-    openai_api_key: Optional[str] = None
-    preferred_model: Optional[str] = None
-
-
-class CLIValidateRequest(BaseModel):
-    """Request to validate a CLI command."""
-    command: str
-    command_output: str
-    objectives: List[Dict[str, Any]]  # List of objective dicts
-    openai_api_key: Optional[str] = None
-    preferred_model: Optional[str] = None
-
-
-@app.post("/api/cli-objectives/generate")
-async def generate_cli_objectives_endpoint(request: CLIObjectivesGenerateRequest):
-    """Generate CLI objectives for a challenge."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        from generators.cli_objectives import generate_cli_objectives
-        
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        challenge = {
-            "id": request.challenge_id,
-            "title": request.challenge_title,
-            "description": request.challenge_description,
-            "success_criteria": request.success_criteria,
-            "aws_services_relevant": request.aws_services_relevant,
-        }
-        
-        result = await generate_cli_objectives(
-            challenge=challenge,
-            company_name=request.company_name,
-            industry=request.industry,
-            business_context=request.business_context,
-            diagram_data=request.diagram_data,
-            diagram_services=request.diagram_services,
-            user_level=request.user_level,
-            objective_count=request.objective_count,
-            model=request.preferred_model,
-        )
-        
-        return {
-            "success": True,
-            "challenge_id": result.challenge_id,
-            "challenge_title": result.challenge_title,
-            "context_message": result.context_message,
-            "objectives": [obj.model_dump() for obj in result.objectives],
-            "total_points": result.total_points,
-            "estimated_time_minutes": result.estimated_time_minutes,
-        }
-    except Exception as e:
-        logger.error(f"CLI objectives generation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate CLI objectives: {str(e)}")
-
-
-@app.post("/api/cli-objectives/validate")
-async def validate_cli_command_endpoint(request: CLIValidateRequest):
-    """Validate if a CLI command completes an objective."""
-    try:
-        from utils import set_request_api_key, set_request_model
-        from generators.cli_objectives import validate_cli_command, CLIObjective
-        
-        if request.openai_api_key:
-            set_request_api_key(request.openai_api_key)
-        if request.preferred_model:
-            set_request_model(request.preferred_model)
-        
-        # Convert dict objectives to CLIObjective objects
-        objectives = [
-            CLIObjective(
-                id=obj.get("id", ""),
-                description=obj.get("description", ""),
-                command_pattern=obj.get("command_pattern", ""),
-                example_command=obj.get("example_command", ""),
-                hint=obj.get("hint"),
-                points=obj.get("points", 20),
-                service=obj.get("service", ""),
-                difficulty=obj.get("difficulty", "intermediate"),
-            )
-            for obj in request.objectives
-        ]
-        
-        result = await validate_cli_command(
-            command=request.command,
-            command_output=request.command_output,
-            objectives=objectives,
-            model=request.preferred_model,
-        )
-        
-        return {
-            "success": True,
-            "command": result.command,
-            "is_valid": result.is_valid,
-            "objective_id": result.objective_id,
-            "feedback": result.feedback,
-            "points_earned": result.points_earned,
-        }
-    except Exception as e:
-        logger.error(f"CLI validation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to validate CLI command: {str(e)}")
-
-
 # ============================================
 # MAIN
 # ============================================
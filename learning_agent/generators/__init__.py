@@ -1,48 +1,78 @@
 # Learning content generators
-from .scenario import generate_scenario, generate_scenario_from_location, evaluate_solution, CloudScenario, Challenge, CompanyInfo
-from .flashcards import generate_flashcards, generate_flashcards_for_service, FlashcardDeck, Flashcard
-from .notes import generate_notes, StudyNotes
-from .quiz import generate_quiz, Quiz
-from .challenge_questions import generate_challenge_questions, grade_challenge_answer, ChallengeQuestions, ChallengeQuestion
-from .cli_simulator import (
-    simulate_cli_command, 
-    get_cli_help, 
-    create_session, 
-    validate_cli_challenge,
-    get_session_stats,
-    calculate_cli_score,
-    CLISession, 
-    CLIResponse,
-    CLIValidationResult,
-)
-from .study_plan import (
-    generate_study_plan,
-    StudyPlanContext,
-    generate_study_guide,
-    StudyGuideContext,
-    format_study_guide,
-)
-from .resource_fetcher import fetch_study_resources
-from .game_modes import (
-    generate_sniper_quiz_questions,
-    generate_speed_round_questions,
-    GameQuestion,
-    SniperQuizQuestions,
-)
-from .architect_arena import (
-    generate_architect_arena_puzzle,
-    ArchitectArenaPuzzle,
-    PuzzlePiece,
-    ExpectedConnection,
-    PuzzleObjective,
-    PuzzlePenalty,
-)
-from .portfolio import generate_portfolio_content
-from .diagnostics import (
-    generate_diagnostics,
-    DiagnosticsContext,
-    DiagnosticsResult,
-    StrengthWeakness,
-    Recommendation,
-    LearningPattern,
-)
+#
+# Each generator module carries its own prompts, pydantic models and client
+# setup, so they are imported on first use rather than with the package:
+# `from generators import generate_quiz` loads generators.quiz only.
+import importlib
+
+_EXPORTS = {
+    ".scenario": (
+        "generate_scenario", "generate_scenario_from_location", "evaluate_solution",
+        "CloudScenario", "Challenge", "CompanyInfo",
+    ),
+    ".flashcards": ("generate_flashcards", "generate_flashcards_for_service", "FlashcardDeck", "Flashcard"),
+    ".notes": ("generate_notes", "StudyNotes"),
+    ".quiz": ("generate_quiz", "Quiz"),
+    ".challenge_questions": (
+        "generate_challenge_questions", "grade_challenge_answer", "ChallengeQuestions", "ChallengeQuestion",
+    ),
+    ".cli_simulator": (
+        "simulate_cli_command",
+        "get_cli_help",
+        "create_session",
+        "validate_cli_challenge",
+        "get_session_stats",
+        "calculate_cli_score",
+        "CLISession",
+        "CLIResponse",
+        "CLIValidationResult",
+    ),
+    ".study_plan": (
+        "generate_study_plan",
+        "StudyPlanContext",
+        "generate_study_guide",
+        "StudyGuideContext",
+        "format_study_guide",
+    ),
+    ".resource_fetcher": ("fetch_study_resources",),
+    ".game_modes": (
+        "generate_sniper_quiz_questions",
+        "generate_speed_round_questions",
+        "GameQuestion",
+        "SniperQuizQuestions",
+    ),
+    ".architect_arena": (
+        "generate_architect_arena_puzzle",
+        "ArchitectArenaPuzzle",
+        "PuzzlePiece",
+        "ExpectedConnection",
+        "PuzzleObjective",
+        "PuzzlePenalty",
+    ),
+    ".portfolio": ("generate_portfolio_content",),
+    ".diagnostics": (
+        "generate_diagnostics",
+        "DiagnosticsContext",
+        "DiagnosticsResult",
+        "StrengthWeakness",
+        "Recommendation",
+        "LearningPattern",
+    ),
+}
+
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
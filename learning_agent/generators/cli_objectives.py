@@ -12,6 +12,8 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 from openai import AsyncOpenAI
 
+from services.llm_cache import CachePolicy
+from services.streaming import complete_json
 from utils import get_request_model, ApiKeyRequiredError, DEFAULT_MODEL
 
 
@@ -177,8 +179,9 @@ async def _chat_completion(
     model: Optional[str] = None,
     json_mode: bool = False,
     temperature: float = 0.7,
+    cache: Optional[CachePolicy] = None,
 ) -> str:
-    """Get chat completion from OpenAI."""
+    """Get chat completion from OpenAI (cached per `cache`)."""
     key = os.getenv("OPENAI_API_KEY")
     if not key:
         raise ApiKeyRequiredError("OpenAI API key required")
@@ -195,8 +198,7 @@ async def _chat_completion(
     if json_mode:
         kwargs["response_format"] = {"type": "json_object"}
     
-    response = await client.chat.completions.create(**kwargs)
-    return response.choices[0].message.content
+    return await complete_json(client, cache=cache, **kwargs)
 
 
 # =============================================================================
@@ -328,7 +330,9 @@ async def validate_cli_command(
         {"role": "user", "content": prompt},
     ]
     
-    response = await _chat_completion(messages, model=model, json_mode=True, temperature=0.3)
+    response = await _chat_completion(
+        messages, model=model, json_mode=True, temperature=0.3, cache=CachePolicy("validate_cli_command")
+    )
     data = json.loads(response)
     
     return CLICommandResult(
@@ -9,12 +9,14 @@ to their use cases to earn contract money.
 import json
 import os
 import uuid
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from pydantic import BaseModel
 from openai import AsyncOpenAI
 
 from prompts import CERTIFICATION_PERSONAS
 from utils import get_request_model, ApiKeyRequiredError, DEFAULT_MODEL
+from services.aws_pricing import estimate_architecture_cost
+from services.streaming import ItemCallback, complete_json
 
 
 # Valid user levels
@@ -126,6 +128,7 @@ class BusinessUseCase(BaseModel):
     difficulty: str  # easy, medium, hard
     hints: List[str]  # Optional hints for the player
     compliance_requirements: Optional[List[str]] = None  # HIPAA, PCI-DSS, etc.
+    infrastructure_monthly_usd: Optional[float] = None  # Estimated AWS bill for the required services
 
 
 class TycoonJourney(BaseModel):
@@ -660,9 +663,11 @@ JOURNEY_THEMES = [
 async def _chat_json(
     messages: List[Dict],
     model: Optional[str] = None,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
+    item_keys: Tuple[str, ...] = (),
 ) -> Dict:
-    """JSON chat completion with .env only."""
+    """JSON chat completion with .env only (streamed to on_item when given)."""
     key = os.getenv("OPENAI_API_KEY")
     if not key:
         raise ApiKeyRequiredError(
@@ -672,13 +677,51 @@ async def _chat_json(
     model = model or get_request_model() or DEFAULT_MODEL
     client = AsyncOpenAI(api_key=key)
     
-    response = await client.chat.completions.create(
+    content = await complete_json(
+        client,
+        on_item,
+        item_keys,
         model=model,
         messages=messages,
         response_format={"type": "json_object"},
         temperature=0.9,  # Higher for variety in business scenarios
     )
-    return json.loads(response.choices[0].message.content)
+    return json.loads(content)
+
+
+def _parse_business(biz: Dict) -> Optional[BusinessUseCase]:
+    """Build a business from the model's JSON; None if it has no valid services."""
+    # Filter and validate required services - only keep valid IDs
+    valid_services = []
+    for svc in biz.get("required_services", []):
+        service_id = svc.get("service_id", "").lower().strip()
+        if service_id in VALID_SERVICE_IDS:
+            valid_services.append(RequiredService(
+                service_id=service_id,
+                service_name=svc.get("service_name", ""),
+                category=svc.get("category", ""),
+                reason=svc.get("reason", ""),
+            ))
+    
+    if not valid_services:
+        return None
+    
+    return BusinessUseCase(
+        id=biz.get("id", f"biz_{uuid.uuid4().hex[:8]}"),
+        business_name=biz.get("business_name", "Unknown Corp"),
+        industry=biz.get("industry", "Technology"),
+        icon=biz.get("icon", "🏢"),
+        use_case_title=biz.get("use_case_title", "Cloud Migration"),
+        use_case_description=biz.get("use_case_description", ""),
+        required_services=valid_services,
+        contract_value=biz.get("contract_value", 200000),
+        difficulty=biz.get("difficulty", "medium"),
+        hints=biz.get("hints", []),
+        compliance_requirements=biz.get("compliance_requirements"),
+        infrastructure_monthly_usd=estimate_architecture_cost(
+            [svc.service_id for svc in valid_services]
+        )["total_monthly"],
+    )
 
 
 async def generate_tycoon_journey(
@@ -686,6 +729,7 @@ async def generate_tycoon_journey(
     cert_code: str,
     theme: Optional[str] = None,
     api_key: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> TycoonJourney:
     """
     Generate a complete Cloud Tycoon journey with 10 business use cases.
@@ -698,6 +742,8 @@ async def generate_tycoon_journey(
         cert_code: Certification persona ID (REQUIRED, e.g., 'solutions-architect-associate')
         theme: Optional journey theme (random if not provided)
         api_key: Optional OpenAI API key
+        on_item: Optional callback, streamed each BusinessUseCase as soon as
+            the model finishes it
     
     Returns:
         TycoonJourney with 10 businesses tailored to cert and level
@@ -754,57 +800,48 @@ Skill level: {user_level}
 Create 10 diverse, realistic business use cases that test AWS architecture knowledge.
 Make the journey feel like a real consulting trip through different companies."""
 
-    result = await _chat_json(
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        api_key=api_key,
-    )
-    
     # Parse businesses
     businesses = []
     difficulty_counts = {"easy": 0, "medium": 0, "hard": 0}
     total_value = 0
-    
-    # Limit to exactly 10 businesses (AI sometimes returns more)
-    raw_businesses = result.get("businesses", [])[:10]
-    
-    for biz in raw_businesses:
+    raw_count = 0
+    
+    def add_business(biz: Dict) -> Optional[BusinessUseCase]:
+        nonlocal total_value, raw_count
+        # Limit to exactly 10 businesses (AI sometimes returns more)
+        raw_count += 1
+        if raw_count > 10:
+            return None
         difficulty = biz.get("difficulty", "medium")
         difficulty_counts[difficulty] = difficulty_counts.get(difficulty, 0) + 1
-        contract_value = biz.get("contract_value", 200000)
-        total_value += contract_value
-        
-        # Filter and validate required services - only keep valid IDs
-        valid_services = []
-        for svc in biz.get("required_services", []):
-            service_id = svc.get("service_id", "").lower().strip()
-            if service_id in VALID_SERVICE_IDS:
-                valid_services.append(RequiredService(
-                    service_id=service_id,
-                    service_name=svc.get("service_name", ""),
-                    category=svc.get("category", ""),
-                    reason=svc.get("reason", ""),
-                ))
+        total_value += biz.get("contract_value", 200000)
         
         # Skip businesses with no valid services
-        if not valid_services:
-            continue
-            
-        businesses.append(BusinessUseCase(
-            id=biz.get("id", f"biz_{uuid.uuid4().hex[:8]}"),
-            business_name=biz.get("business_name", "Unknown Corp"),
-            industry=biz.get("industry", "Technology"),
-            icon=biz.get("icon", "🏢"),
-            use_case_title=biz.get("use_case_title", "Cloud Migration"),
-            use_case_description=biz.get("use_case_description", ""),
-            required_services=valid_services,
-            contract_value=contract_value,
-            difficulty=difficulty,
-            hints=biz.get("hints", []),
-            compliance_requirements=biz.get("compliance_requirements"),
-        ))
+        business = _parse_business(biz)
+        if business:
+            businesses.append(business)
+        return business
+    
+    def stream_business(key: str, biz) -> None:
+        if isinstance(biz, dict):
+            business = add_business(biz)
+            if business:
+                on_item(key, business)
+    
+    result = await _chat_json(
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        api_key=api_key,
+        on_item=stream_business if on_item else None,
+        item_keys=("businesses",),
+    )
+    
+    # Streamed businesses were parsed as they arrived
+    if not on_item:
+        for biz in result.get("businesses", []):
+            add_business(biz)
     
     return TycoonJourney(
         id=f"journey_{uuid.uuid4().hex[:8]}",
@@ -841,7 +878,9 @@ async def validate_service_match(
             "missing": ["rds"],
             "extra": ["ec2"],
             "contract_earned": int,
-            "feedback": str
+            "feedback": str,
+            "estimated_monthly_usd": float,  # submitted services
+            "required_monthly_usd": float,  # required services
         }
     """
     required_ids = {svc.service_id for svc in use_case.required_services}
@@ -871,6 +910,10 @@ async def validate_service_match(
     else:
         feedback = f"This solution doesn't quite fit the requirements. Contract: ${contract_earned:,}"
     
+    # Infrastructure cost of the submission vs. what the client needs
+    estimated_monthly = estimate_architecture_cost(list(submitted_set))["total_monthly"]
+    required_monthly = estimate_architecture_cost(list(required_ids))["total_monthly"]
+    
     # Add specific feedback about missing services
     if missing:
         missing_names = [
@@ -905,6 +948,8 @@ async def validate_service_match(
         "extra": list(extra),
         "contract_earned": contract_earned,
         "feedback": feedback,
+        "estimated_monthly_usd": estimated_monthly,
+        "required_monthly_usd": required_monthly,
         "required_services": [
             {
                 "service_id": svc.service_id,
@@ -20,6 +20,7 @@ from pydantic import BaseModel
 
 from config.settings import logger
 from prompts import CERTIFICATION_PERSONAS
+from services.streaming import ItemCallback, complete_json
 from utils import (
     get_request_model,
     DEFAULT_MODEL,
@@ -308,6 +309,7 @@ async def generate_cohort_program(
     target_certification: Optional[str] = None,
     openai_api_key: Optional[str] = None,
     knowledge_context: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> Dict[str, Any]:
     """
     Generate a cohort learning program with platform-aware actions.
@@ -322,6 +324,7 @@ async def generate_cohort_program(
         skill_level: beginner, intermediate, or advanced
         target_certification: Optional AWS certification code
         openai_api_key: Optional API key override
+        on_item: Optional callback, streamed each week and milestone as it is generated
     
     Returns:
         Generated cohort program as dict with platform links and completion tracking
@@ -374,7 +377,10 @@ async def generate_cohort_program(
     client = AsyncOpenAI(api_key=api_key)
     
     try:
-        completion = await client.chat.completions.create(
+        content = await complete_json(
+            client,
+            on_item,
+            ("weeks", "milestones"),
             model=model,
             messages=[
                 {"role": "system", "content": COHORT_PROGRAM_SYSTEM_PROMPT},
@@ -384,7 +390,6 @@ async def generate_cohort_program(
             temperature=0.7,
         )
         
-        content = completion.choices[0].message.content
         if not content:
             raise ValueError("No response from AI")
         
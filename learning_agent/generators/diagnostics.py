@@ -16,6 +16,8 @@ from pydantic import BaseModel
 
 from config.settings import logger
 from prompts import CERTIFICATION_PERSONAS
+from services.llm_cache import CachePolicy
+from services.streaming import ItemCallback, complete_json
 from utils import (
     ApiKeyRequiredError,
     get_request_model,
@@ -362,6 +364,7 @@ async def generate_diagnostics(
     *,
     model: Optional[str] = None,
     api_key: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> DiagnosticsResult:
     """
     Generate comprehensive learner diagnostics based on their platform activity.
@@ -370,6 +373,8 @@ async def generate_diagnostics(
         context: DiagnosticsContext with all learner data
         model: Optional model override
         api_key: Optional OpenAI API key
+        on_item: Optional callback, streamed each strength, weakness, pattern
+            and recommendation as it is generated
     
     Returns:
         DiagnosticsResult with analysis, strengths, weaknesses, and recommendations
@@ -488,15 +493,17 @@ async def generate_diagnostics(
     
     client = AsyncOpenAI(api_key=key)
     
-    response = await client.chat.completions.create(
+    content = await complete_json(
+        client,
+        on_item,
+        ("strengths", "weaknesses", "patterns", "recommendations"),
+        cache=CachePolicy("diagnostics"),  # unchanged telemetry, same assessment
         model=model_name,
         messages=messages,
         response_format={"type": "json_object"},
         temperature=0.5,  # Assessments should be consistent/deterministic
     )
     
-    content = response.choices[0].message.content
-    
     try:
         result_data = json.loads(content)
     except json.JSONDecodeError as err:
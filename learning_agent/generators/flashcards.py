@@ -11,12 +11,13 @@ PATTERN: "Tool uses AI" - The tool pre-gathers all data, AI just formats.
 
 import json
 import os
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel
 from openai import AsyncOpenAI
 
 from config.settings import logger
 from prompts import FLASHCARD_GENERATOR_PROMPT, PERSONA_FLASHCARD_PROMPT, CERTIFICATION_PERSONAS
+from services.streaming import ItemCallback, complete_json
 from utils import get_request_model, ApiKeyRequiredError, DEFAULT_MODEL
 
 
@@ -138,8 +139,14 @@ class FlashcardStructuredContent(BaseModel):
     difficulty_distribution: Dict[str, int]  # {"easy": 5, "medium": 10, "hard": 5}
 
 
-async def _chat_json(messages: List[Dict], model: Optional[str] = None, api_key: Optional[str] = None) -> Dict:
-    """Simple JSON chat completion."""
+async def _chat_json(
+    messages: List[Dict],
+    model: Optional[str] = None,
+    api_key: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
+    item_keys: Tuple[str, ...] = (),
+) -> Dict:
+    """Simple JSON chat completion (streamed to on_item when given)."""
     key = os.getenv("OPENAI_API_KEY")
     if not key:
         raise ApiKeyRequiredError(
@@ -147,13 +154,16 @@ async def _chat_json(messages: List[Dict], model: Optional[str] = None, api_key:
         )
     model = model or get_request_model() or DEFAULT_MODEL
     client = AsyncOpenAI(api_key=key)
-    response = await client.chat.completions.create(
+    content = await complete_json(
+        client,
+        on_item,
+        item_keys,
         model=model,
         messages=messages,
         response_format={"type": "json_object"},
         temperature=0.6,  # Educational content needs factual accuracy
     )
-    return json.loads(response.choices[0].message.content)
+    return json.loads(content)
 
 
 async def generate_flashcards(
@@ -164,6 +174,7 @@ async def generate_flashcards(
     cert_code: str,
     card_count: int = 20,
     challenges: Optional[List[dict]] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> FlashcardDeck:
     """
     Generate flashcards for a scenario.
@@ -179,6 +190,7 @@ async def generate_flashcards(
         cert_code: Certification persona ID (REQUIRED, e.g., 'solutions-architect-associate')
         card_count: Number of cards to generate (default 20)
         challenges: Optional list of challenges to cover
+        on_item: Optional callback, streamed each card as it is generated
     
     Returns:
         FlashcardDeck tailored to cert and level
@@ -226,7 +238,7 @@ Return JSON with: title, description, cards (array of: front, back, difficulty,
     result = await _chat_json([
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
-    ])
+    ], on_item=on_item, item_keys=("cards",))
     
     cards = [Flashcard(**c) for c in result.get("cards", [])]
     
@@ -382,6 +394,7 @@ async def format_flashcards(
     *,
     model: Optional[str] = None,
     api_key: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> FlashcardDeck:
     """
     FORMAT flashcards from pre-gathered knowledge.
@@ -419,15 +432,16 @@ async def format_flashcards(
     ]
     
     client = AsyncOpenAI(api_key=key)
-    response = await client.chat.completions.create(
+    content = await complete_json(
+        client,
+        on_item,
+        ("cards",),
         model=model_name,
         messages=messages,
         response_format={"type": "json_object"},
         temperature=0.3,  # Lower temperature for consistent formatting
     )
     
-    content = response.choices[0].message.content
-    
     try:
         result = json.loads(content)
     except json.JSONDecodeError as err:
@@ -11,12 +11,13 @@ PATTERN: "Tool uses AI" - The tool pre-gathers all data, AI just formats.
 
 import json
 import os
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel
 from openai import AsyncOpenAI
 
 from config.settings import logger
 from prompts import NOTES_GENERATOR_PROMPT, PERSONA_NOTES_PROMPT, CERTIFICATION_PERSONAS
+from services.streaming import ItemCallback, complete_json
 from utils import get_request_model, ApiKeyRequiredError, DEFAULT_MODEL
 
 
@@ -141,8 +142,14 @@ class NotesStructuredContent(BaseModel):
     challenges: List[Dict[str, str]]  # [{"title": "...", "description": "..."}]
 
 
-async def _chat_json(messages: List[Dict], model: Optional[str] = None, api_key: Optional[str] = None) -> Dict:
-    """Simple JSON chat completion."""
+async def _chat_json(
+    messages: List[Dict],
+    model: Optional[str] = None,
+    api_key: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
+    item_keys: Tuple[str, ...] = (),
+) -> Dict:
+    """Simple JSON chat completion (streamed to on_item when given)."""
     key = os.getenv("OPENAI_API_KEY")
     if not key:
         raise ApiKeyRequiredError(
@@ -150,13 +157,16 @@ async def _chat_json(messages: List[Dict], model: Optional[str] = None, api_key:
         )
     model = model or get_request_model() or DEFAULT_MODEL
     client = AsyncOpenAI(api_key=key)
-    response = await client.chat.completions.create(
+    content = await complete_json(
+        client,
+        on_item,
+        item_keys,
         model=model,
         messages=messages,
         response_format={"type": "json_object"},
         temperature=0.5,  # Study notes should prioritize accuracy
     )
-    return json.loads(response.choices[0].message.content)
+    return json.loads(content)
 
 
 async def generate_notes(
@@ -383,6 +393,7 @@ async def generate_notes_for_certification(
     cert_code: str,
     user_level: str,
     telemetry: Optional[Dict] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> Dict:
     """
     Generate study notes from certification + telemetry + skill level.
@@ -393,6 +404,7 @@ async def generate_notes_for_certification(
         cert_code: Certification persona ID (REQUIRED, e.g., 'solutions-architect-associate')
         user_level: User's skill level (REQUIRED: 'beginner', 'intermediate', 'advanced', 'expert')
         telemetry: Optional user progress telemetry
+        on_item: Optional callback, streamed each section as it is generated
     
     Returns:
         Dict with study notes data
@@ -443,8 +455,8 @@ User Progress:
 Return a JSON object with these fields:
 - title: A descriptive title for the study notes
 - summary: A 2-3 sentence summary of what the notes cover
-- content: The FULL study notes content in markdown format (at least 500 words with headers, bullet points, code examples where relevant)
 - sections: Array of section objects with id, title, level, content, aws_services
+- content: The FULL study notes content in markdown format (at least 500 words with headers, bullet points, code examples where relevant)
 - aws_services: Array of AWS service names covered
 - key_takeaways: Array of 3-5 key points to remember
 
@@ -453,7 +465,7 @@ The content field MUST contain actual detailed study material, not placeholder t
     result = await _chat_json([
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": f"Generate study notes for {cert_name}"},
-    ])
+    ], on_item=on_item, item_keys=("sections",))
     
     if not result.get("title"):
         result["title"] = f"{cert_name} Study Notes"
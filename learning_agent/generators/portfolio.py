@@ -17,6 +17,8 @@ from models.portfolio import (
     PitchDeckData,
     PitchDeckSlide,
 )
+from services.llm_cache import CachePolicy
+from services.streaming import ItemCallback, complete_json
 
 logger = logging.getLogger(__name__)
 
@@ -368,7 +370,8 @@ def _summarize_placement_journey(placement_journey: Optional[Dict[str, Any]]) ->
 async def generate_portfolio_content(
     request: GeneratePortfolioRequest,
     openai_client,
-    model: str = "gpt-4.1"
+    model: str = "gpt-4.1",
+    on_item: Optional[ItemCallback] = None,
 ) -> PortfolioContent:
     """
     Generate portfolio content from completed challenge data.
@@ -377,6 +380,8 @@ async def generate_portfolio_content(
         request: The portfolio generation request with all context
         openai_client: AsyncOpenAI client
         model: Model to use for generation
+        on_item: Optional callback, streamed each decision, highlight and
+            pitch deck slide as it is generated
         
     Returns:
         PortfolioContent with AI-generated fields
@@ -420,7 +425,11 @@ async def generate_portfolio_content(
     logger.info(f"Generating portfolio content for profile {request.profileId}")
     
     try:
-        response = await openai_client.chat.completions.create(
+        content = await complete_json(
+            openai_client,
+            on_item,
+            ("keyDecisions", "complianceAchieved", "technicalHighlights"),
+            cache=CachePolicy("portfolio"),  # unchanged diagram and progress, same write-up
             model=model,
             messages=[
                 {"role": "system", "content": "You are an AWS Solutions Architect creating professional portfolio documentation. Return only valid JSON."},
@@ -430,17 +439,20 @@ async def generate_portfolio_content(
             max_tokens=2000,
             response_format={"type": "json_object"}
         )
-        
-        content = response.choices[0].message.content
         result = json.loads(content)
         
         # Use only services detected from the user's diagram (not AI suggestions)
         all_services = list(services_used)
         
-        # Calculate live pricing estimate based on services used
-        from services.aws_pricing import estimate_architecture_cost
-        pricing_estimate = estimate_architecture_cost(all_services)
-        logger.info(f"Pricing estimate: ${pricing_estimate['total_monthly']}/mo for {len(all_services)} services")
+        # Price the diagram's nodes (with their configs) from the offline catalogue
+        from services.aws_pricing import estimate_diagram_cost
+        pricing_estimate = estimate_diagram_cost([
+            node for node in diagram.get("nodes", []) if node.get("type") not in ("vpc", "subnet")
+        ])
+        logger.info(
+            f"Pricing estimate: ${pricing_estimate['total_monthly']}/mo for {len(all_services)} services "
+            f"({pricing_estimate['elapsed_ms']}ms)"
+        )
         
         # Now generate pitch deck content (second OpenAI call)
         pitch_deck = await _generate_pitch_deck(
@@ -453,6 +465,7 @@ async def generate_portfolio_content(
             solution_summary=result["solutionSummary"],
             key_decisions=", ".join(result["keyDecisions"][:3]) if result.get("keyDecisions") else "",
             pricing_estimate=pricing_estimate,
+            on_item=on_item,
         )
         
         return PortfolioContent(
@@ -486,6 +499,7 @@ async def _generate_pitch_deck(
     solution_summary: str,
     key_decisions: str,
     pricing_estimate: Optional[Dict[str, Any]] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> Optional[PitchDeckData]:
     """Generate pitch deck slides for business presentation."""
     from datetime import datetime
@@ -527,7 +541,11 @@ IMPORTANT: Use the EXACT pricing figures above in the Investment & ROI slide. Do
         if pricing_context:
             prompt = prompt.replace("## Your Task", f"{pricing_context}\n## Your Task")
         
-        response = await openai_client.chat.completions.create(
+        content = await complete_json(
+            openai_client,
+            on_item,
+            ("slides",),
+            cache=CachePolicy("pitch_deck"),
             model=model,
             messages=[
                 {"role": "system", "content": "You are a cloud solutions consultant creating pitch decks. Return only valid JSON."},
@@ -537,8 +555,6 @@ IMPORTANT: Use the EXACT pricing figures above in the Investment & ROI slide. Do
             max_tokens=2000,
             response_format={"type": "json_object"}
         )
-        
-        content = response.choices[0].message.content
         result = json.loads(content)
         
         slides = []
@@ -12,12 +12,14 @@ PATTERN: "Tool uses AI" - The tool pre-gathers all data, AI just formats.
 import json
 import os
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel
 from openai import AsyncOpenAI
 
 from config.settings import logger
 from prompts import QUIZ_GENERATOR_PROMPT, PERSONA_QUIZ_PROMPT, CERTIFICATION_PERSONAS
+from services.llm_cache import CachePolicy
+from services.streaming import ItemCallback, complete_json
 from utils import get_request_model, ApiKeyRequiredError, DEFAULT_MODEL
 
 
@@ -155,8 +157,15 @@ class QuizStructuredContent(BaseModel):
     question_types: Dict[str, int]  # {"multiple_choice": 7, "true_false": 2, "multi_select": 1}
 
 
-async def _chat_json(messages: List[Dict], model: Optional[str] = None, api_key: Optional[str] = None) -> Dict:
-    """Simple JSON chat completion."""
+async def _chat_json(
+    messages: List[Dict],
+    model: Optional[str] = None,
+    api_key: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
+    item_keys: Tuple[str, ...] = (),
+    cache: Optional[CachePolicy] = None,
+) -> Dict:
+    """Simple JSON chat completion (streamed to on_item when given, cached per `cache`)."""
     key = os.getenv("OPENAI_API_KEY")
     if not key:
         raise ApiKeyRequiredError(
@@ -164,13 +173,17 @@ async def _chat_json(messages: List[Dict], model: Optional[str] = None, api_key:
         )
     model = model or get_request_model() or DEFAULT_MODEL
     client = AsyncOpenAI(api_key=key)
-    response = await client.chat.completions.create(
+    content = await complete_json(
+        client,
+        on_item,
+        item_keys,
+        cache,
         model=model,
         messages=messages,
         response_format={"type": "json_object"},
         temperature=0.5,  # Quiz questions need factual accuracy
     )
-    return json.loads(response.choices[0].message.content)
+    return json.loads(content)
 
 
 async def generate_quiz(
@@ -410,6 +423,7 @@ async def generate_quiz_for_certification(
     question_count: int = 10,
     telemetry: Optional[Dict] = None,
     existing_questions: Optional[List[str]] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> Dict:
     """
     Generate quiz from certification + telemetry + skill level.
@@ -422,6 +436,7 @@ async def generate_quiz_for_certification(
         question_count: Number of questions (default 10)
         telemetry: Optional user progress telemetry
         existing_questions: Optional list of questions to avoid
+        on_item: Optional callback, streamed each question as it is generated
     
     Returns:
         Dict with quiz data
@@ -488,7 +503,7 @@ Return JSON: {{"title": "...", "description": "...", "questions": [{{"id": "q1",
     result = await _chat_json([
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": f"Generate {question_count} questions for {cert_name}"},
-    ])
+    ], on_item=on_item, item_keys=("questions",))
     
     if not result.get("title"):
         result["title"] = f"{cert_name} Practice Quiz"
@@ -540,6 +555,8 @@ Be fair - partial credit for partial understanding."""
             {"role": "user", "content": f"User's answer: {user_answer}"},
         ],
         model=get_request_model(),
+        # Near-identical answers to the same question share a verdict
+        cache=CachePolicy("grade_free_text", similar_text=user_answer, similar_scope=system_prompt),
     )
     
     return {
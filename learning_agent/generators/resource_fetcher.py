@@ -1,14 +1,88 @@
 """
 Resource fetcher for study guide - uses existing Crawl4AI crawler.
 Fetches diverse resources: YouTube, AWS docs, blogs, courses, community content.
+
+Study plans are served from a resource catalogue in Redis, one entry per
+(certification, skill level) with the time it was fetched. A request never
+waits on a crawl: a fresh entry is returned as-is, a stale one (older than
+RESOURCE_FRESH_SECONDS) is returned and re-crawled in the background, and a
+missing one gets the official AWS links while the first crawl runs.
 """
-from typing import List, Dict
+import os
+import json
+import time
+from typing import List, Dict, Optional, Set
 from config.settings import logger
 import re
 import asyncio
 
-from crawl.context import get_context
-from crawl4ai import CrawlerRunConfig, CacheMode
+RESOURCE_CATALOG_PREFIX = "resources:catalog:"
+# Older entries are still served, but trigger a background refresh
+RESOURCE_FRESH_SECONDS = int(os.getenv("RESOURCE_FRESH_SECONDS", str(7 * 24 * 3600)))
+# Entries nobody has asked for in this long are dropped
+RESOURCE_RETAIN_SECONDS = 90 * 24 * 3600
+# One refresh per entry at a time; a failed refresh is retried after this
+REFRESH_LOCK_SECONDS = 600
+
+_refreshing: Set[asyncio.Task] = set()
+
+SKILL_BUILDER_COURSE = {
+    "title": "AWS Skill Builder - Official Free Training",
+    "url": "https://explore.skillbuilder.aws/learn/course/external/view/elearning/134/aws-cloud-practitioner-essentials",
+    "type": "course",
+    "description": "Free official AWS training with hands-on labs"
+}
+
+
+# ============================================
+# RESOURCE CATALOGUE
+# ============================================
+
+def _catalog_key(certification: str, skill_level: str) -> str:
+    return f"{RESOURCE_CATALOG_PREFIX}{certification.lower()}:{skill_level.lower()}"
+
+
+async def _get_redis():
+    from redis_jobs import get_job_manager
+    return await (await get_job_manager()).get_redis()
+
+
+async def get_catalog_entry(certification: str, skill_level: str) -> Optional[Dict]:
+    """The stored {"resources": [...], "fetched_at": epoch seconds}, or None."""
+    try:
+        r = await _get_redis()
+        raw = await r.get(_catalog_key(certification, skill_level))
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.warning(f"Resource catalogue read failed: {e}")
+        return None
+
+
+async def refresh_resources(certification: str, skill_level: str) -> Optional[List[Dict]]:
+    """Crawl one catalogue entry and store it, unless another worker is already on it."""
+    key = _catalog_key(certification, skill_level)
+    try:
+        r = await _get_redis()
+        if not await r.set(f"{key}:refreshing", "1", nx=True, ex=REFRESH_LOCK_SECONDS):
+            return None
+        resources = await _crawl_study_resources(certification, skill_level)
+        if not resources:
+            # Keep the previous entry; the lock expiring spaces out retries
+            logger.warning(f"Resource refresh for {key} found nothing, keeping previous entry")
+            return None
+        await r.set(key, json.dumps({"resources": resources, "fetched_at": time.time()}), ex=RESOURCE_RETAIN_SECONDS)
+        await r.delete(f"{key}:refreshing")
+        logger.info(f"Resource catalogue refreshed: {key} ({len(resources)} resources)")
+        return resources
+    except Exception as e:
+        logger.error(f"Resource refresh for {key} failed: {type(e).__name__}: {e}")
+        return None
+
+
+def _schedule_refresh(certification: str, skill_level: str):
+    task = asyncio.create_task(refresh_resources(certification, skill_level))
+    _refreshing.add(task)
+    task.add_done_callback(_refreshing.discard)
 
 
 async def fetch_study_resources(
@@ -17,95 +91,120 @@ async def fetch_study_resources(
     learning_styles: List[str],
     max_resources: int = 8
 ) -> List[Dict]:
+    """
+    Learning resources for a certification, from the catalogue (never crawls inline).
+    """
+    entry = await get_catalog_entry(certification, skill_level)
+    if entry is None or time.time() - entry.get("fetched_at", 0) > RESOURCE_FRESH_SECONDS:
+        _schedule_refresh(certification, skill_level)
+
+    if entry is None:
+        resources = _official_resources(certification)
+    else:
+        resources = entry["resources"]
+    return resources[:max_resources]
+
+
+# ============================================
+# CRAWLING
+# ============================================
+
+async def _crawl_study_resources(certification: str, skill_level: str) -> List[Dict]:
     """
     Fetch diverse learning resources for a certification.
     Searches multiple sources: YouTube, AWS docs, blogs, courses, community.
     """
+    from crawl.context import get_context
+    from crawl4ai import CrawlerRunConfig, CacheMode
+
     resources = []
     cert_name = certification.replace('-', ' ')
     cert_title = cert_name.title()
     
-    try:
-        ctx = await get_context()
-        crawler = ctx.crawler
-        run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, stream=False)
-        
-        logger.info(f"Fetching diverse resources for {cert_name}, level: {skill_level}, styles: {learning_styles}")
-        
-        # Tailor search queries based on skill level
-        level_terms = {
-            "beginner": ["beginner", "introduction", "basics", "getting started", "from scratch"],
-            "intermediate": ["deep dive", "hands on", "practical", "real world"],
-            "advanced": ["advanced", "expert", "professional", "in depth", "architecture patterns"],
-        }
-        level_modifiers = level_terms.get(skill_level.lower(), level_terms["intermediate"])
-        
-        # Run multiple searches in parallel for speed
-        search_tasks = []
-        
-        # 1. YouTube - varied search queries tailored to skill level
-        youtube_queries = [
-            f"AWS {cert_name} certification {level_modifiers[0]} course 2024",
-            f"AWS {cert_name} exam tips {skill_level}",
-            f"AWS {cert_name} {level_modifiers[1]} tutorial",
-        ]
-        for query in youtube_queries[:2]:  # Limit to 2 YouTube searches
-            search_tasks.append(_fetch_youtube_videos(crawler, run_config, query, cert_title, max_per_query=2))
-        
-        # 2. AWS official resources
-        search_tasks.append(_fetch_aws_resources(crawler, run_config, certification, cert_title))
-        
-        # 3. Blog/article search tailored to skill level
-        blog_queries = [
-            f"AWS {cert_name} {skill_level} study guide",
-            f"AWS {cert_name} exam preparation {level_modifiers[0]}",
-        ]
-        for query in blog_queries[:1]:
-            search_tasks.append(_fetch_blog_resources(crawler, run_config, query, cert_title))
-        
-        # 4. Community resources (Reddit, dev.to)
-        search_tasks.append(_fetch_community_resources(crawler, run_config, cert_name, cert_title, skill_level))
-        
-        # 5. Free course platforms
-        search_tasks.append(_fetch_course_resources(crawler, run_config, cert_name, cert_title, skill_level))
-        
-        # Execute all searches in parallel
-        results = await asyncio.gather(*search_tasks, return_exceptions=True)
-        
-        # Flatten results
-        for result in results:
-            if isinstance(result, list):
-                resources.extend(result)
-            elif isinstance(result, Exception):
-                logger.warning(f"Search task failed: {result}")
-        
-        # Deduplicate by URL AND by similar titles
-        seen_urls = set()
-        seen_titles = set()
-        unique_resources = []
-        for r in resources:
-            # Normalize title for comparison (lowercase, remove common words)
-            title_normalized = r["title"].lower()
-            for word in ["aws", "certified", "certification", "tutorial", "course", "guide", "-", "|"]:
-                title_normalized = title_normalized.replace(word, "")
-            title_normalized = " ".join(title_normalized.split())[:30]  # First 30 chars after cleanup
-            
-            if r["url"] not in seen_urls and title_normalized not in seen_titles:
-                seen_urls.add(r["url"])
-                seen_titles.add(title_normalized)
-                unique_resources.append(r)
-        
-        # Sort by type priority: video, course, whitepaper, documentation, article, community
-        type_priority = {"video": 0, "course": 1, "whitepaper": 2, "documentation": 3, "article": 4, "community": 5}
-        unique_resources.sort(key=lambda x: type_priority.get(x["type"], 6))
-        
-        logger.info(f"Total unique resources fetched: {len(unique_resources)}")
-        return unique_resources[:max_resources]
-        
-    except Exception as e:
-        logger.error(f"Resource fetching failed: {type(e).__name__}: {e}")
+    ctx = await get_context()
+    crawler = ctx.crawler
+    run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, stream=False)
+    
+    logger.info(f"Fetching diverse resources for {cert_name}, level: {skill_level}")
+    
+    # Tailor search queries based on skill level
+    level_terms = {
+        "beginner": ["beginner", "introduction", "basics", "getting started", "from scratch"],
+        "intermediate": ["deep dive", "hands on", "practical", "real world"],
+        "advanced": ["advanced", "expert", "professional", "in depth", "architecture patterns"],
+    }
+    level_modifiers = level_terms.get(skill_level.lower(), level_terms["intermediate"])
+    
+    # Run multiple searches in parallel for speed
+    search_tasks = []
+    
+    # 1. YouTube - varied search queries tailored to skill level
+    youtube_queries = [
+        f"AWS {cert_name} certification {level_modifiers[0]} course 2024",
+        f"AWS {cert_name} exam tips {skill_level}",
+        f"AWS {cert_name} {level_modifiers[1]} tutorial",
+    ]
+    for query in youtube_queries[:2]:  # Limit to 2 YouTube searches
+        search_tasks.append(_fetch_youtube_videos(crawler, run_config, query, cert_title, max_per_query=2))
+    
+    # 2. AWS official resources
+    search_tasks.append(_fetch_aws_resources(crawler, run_config, certification, cert_title))
+    
+    # 3. Blog/article search tailored to skill level
+    blog_queries = [
+        f"AWS {cert_name} {skill_level} study guide",
+        f"AWS {cert_name} exam preparation {level_modifiers[0]}",
+    ]
+    for query in blog_queries[:1]:
+        search_tasks.append(_fetch_blog_resources(crawler, run_config, query, cert_title))
+    
+    # 4. Community resources (Reddit, dev.to)
+    search_tasks.append(_fetch_community_resources(crawler, run_config, cert_name, cert_title, skill_level))
+    
+    # 5. Free course platforms
+    search_tasks.append(_fetch_course_resources(crawler, run_config, cert_name, cert_title, skill_level))
+    
+    # Execute all searches in parallel
+    results = await asyncio.gather(*search_tasks, return_exceptions=True)
+    
+    # Flatten results
+    for result in results:
+        if isinstance(result, list):
+            resources.extend(result)
+        elif isinstance(result, Exception):
+            logger.warning(f"Search task failed: {result}")
+    
+    # Only the static links came back: every crawl failed
+    if all(r["url"] in {s["url"] for s in _official_resources(certification)} for r in resources):
         return []
 
+    unique_resources = _dedupe(resources)
+    logger.info(f"Total unique resources fetched: {len(unique_resources)}")
+    return unique_resources
+
+
+def _dedupe(resources: List[Dict]) -> List[Dict]:
+    """Deduplicate by URL and by similar titles, then order by resource type."""
+    seen_urls = set()
+    seen_titles = set()
+    unique_resources = []
+    for r in resources:
+        # Normalize title for comparison (lowercase, remove common words)
+        title_normalized = r["title"].lower()
+        for word in ["aws", "certified", "certification", "tutorial", "course", "guide", "-", "|"]:
+            title_normalized = title_normalized.replace(word, "")
+        title_normalized = " ".join(title_normalized.split())[:30]  # First 30 chars after cleanup
+        
+        if r["url"] not in seen_urls and title_normalized not in seen_titles:
+            seen_urls.add(r["url"])
+            seen_titles.add(title_normalized)
+            unique_resources.append(r)
+    
+    # Sort by type priority: video, course, whitepaper, documentation, article, community
+    type_priority = {"video": 0, "course": 1, "whitepaper": 2, "documentation": 3, "article": 4, "community": 5}
+    unique_resources.sort(key=lambda x: type_priority.get(x["type"], 6))
+    return unique_resources
+
 
 async def _fetch_youtube_videos(crawler, config, query: str, cert_title: str, max_per_query: int = 2) -> List[Dict]:
     """Fetch YouTube videos for a search query."""
@@ -143,6 +242,67 @@ async def _fetch_youtube_videos(crawler, config, query: str, cert_title: str, ma
     return resources
 
 
+def _aws_whitepapers(certification: str) -> List[Dict]:
+    """Key AWS whitepapers based on certification."""
+    resources = []
+    cert_lower = certification.lower()
+    
+    # Well-Architected Framework - essential for all certs
+    resources.append({
+        "title": "AWS Well-Architected Framework",
+        "url": "https://docs.aws.amazon.com/wellarchitected/latest/framework/welcome.html",
+        "type": "whitepaper",
+        "description": "Essential reading - AWS best practices for cloud architecture"
+    })
+    
+    # Certification-specific whitepapers
+    if "solutions-architect" in cert_lower or "saa" in cert_lower:
+        resources.append({
+            "title": "AWS Security Best Practices",
+            "url": "https://docs.aws.amazon.com/prescriptive-guidance/latest/security-reference-architecture/welcome.html",
+            "type": "whitepaper",
+            "description": "Security reference architecture and best practices"
+        })
+    elif "developer" in cert_lower or "dva" in cert_lower:
+        resources.append({
+            "title": "AWS Serverless Applications Lens",
+            "url": "https://docs.aws.amazon.com/wellarchitected/latest/serverless-applications-lens/welcome.html",
+            "type": "whitepaper",
+            "description": "Best practices for serverless application development"
+        })
+    elif "sysops" in cert_lower or "soa" in cert_lower:
+        resources.append({
+            "title": "AWS Operational Excellence Pillar",
+            "url": "https://docs.aws.amazon.com/wellarchitected/latest/operational-excellence-pillar/welcome.html",
+            "type": "whitepaper",
+            "description": "Operational best practices for running workloads"
+        })
+    elif "cloud-practitioner" in cert_lower or "clf" in cert_lower:
+        resources.append({
+            "title": "AWS Overview Whitepaper",
+            "url": "https://docs.aws.amazon.com/whitepapers/latest/aws-overview/introduction.html",
+            "type": "whitepaper",
+            "description": "Introduction to AWS services and cloud concepts"
+        })
+    
+    return resources
+
+
+def _official_resources(certification: str) -> List[Dict]:
+    """Links that need no crawling; served until an entry's first crawl lands."""
+    cert_title = certification.replace('-', ' ').title()
+    return [
+        {
+            "title": f"AWS {cert_title} - Official Certification Page",
+            "url": f"https://aws.amazon.com/certification/{certification}/",
+            "type": "documentation",
+            "description": "Official AWS certification details, exam info, and registration"
+        },
+        *_aws_whitepapers(certification),
+        dict(SKILL_BUILDER_COURSE),
+    ]
+
+
 async def _fetch_aws_resources(crawler, config, certification: str, cert_title: str) -> List[Dict]:
     """Fetch AWS official resources: cert page, exam guide, whitepapers."""
     resources = []
@@ -192,47 +352,7 @@ async def _fetch_aws_resources(crawler, config, certification: str, cert_title:
     except Exception as e:
         logger.warning(f"AWS resources fetch failed: {e}")
     
-    # Add key AWS whitepapers based on certification
-    cert_lower = certification.lower()
-    
-    # Well-Architected Framework - essential for all certs
-    resources.append({
-        "title": "AWS Well-Architected Framework",
-        "url": "https://docs.aws.amazon.com/wellarchitected/latest/framework/welcome.html",
-        "type": "whitepaper",
-        "description": "Essential reading - AWS best practices for cloud architecture"
-    })
-    
-    # Certification-specific whitepapers
-    if "solutions-architect" in cert_lower or "saa" in cert_lower:
-        resources.append({
-            "title": "AWS Security Best Practices",
-            "url": "https://docs.aws.amazon.com/prescriptive-guidance/latest/security-reference-architecture/welcome.html",
-            "type": "whitepaper",
-            "description": "Security reference architecture and best practices"
-        })
-    elif "developer" in cert_lower or "dva" in cert_lower:
-        resources.append({
-            "title": "AWS Serverless Applications Lens",
-            "url": "https://docs.aws.amazon.com/wellarchitected/latest/serverless-applications-lens/welcome.html",
-            "type": "whitepaper",
-            "description": "Best practices for serverless application development"
-        })
-    elif "sysops" in cert_lower or "soa" in cert_lower:
-        resources.append({
-            "title": "AWS Operational Excellence Pillar",
-            "url": "https://docs.aws.amazon.com/wellarchitected/latest/operational-excellence-pillar/welcome.html",
-            "type": "whitepaper",
-            "description": "Operational best practices for running workloads"
-        })
-    elif "cloud-practitioner" in cert_lower or "clf" in cert_lower:
-        resources.append({
-            "title": "AWS Overview Whitepaper",
-            "url": "https://docs.aws.amazon.com/whitepapers/latest/aws-overview/introduction.html",
-            "type": "whitepaper",
-            "description": "Introduction to AWS services and cloud concepts"
-        })
-    
+    resources.extend(_aws_whitepapers(certification))
     return resources
 
 
@@ -359,11 +479,6 @@ async def _fetch_course_resources(crawler, config, cert_name: str, cert_title: s
         logger.warning(f"FreeCodeCamp search failed: {e}")
     
     # AWS Skill Builder (always relevant)
-    resources.append({
-        "title": "AWS Skill Builder - Official Free Training",
-        "url": f"https://explore.skillbuilder.aws/learn/course/external/view/elearning/134/aws-cloud-practitioner-essentials",
-        "type": "course",
-        "description": "Free official AWS training with hands-on labs"
-    })
+    resources.append(dict(SKILL_BUILDER_COURSE))
     
     return resources
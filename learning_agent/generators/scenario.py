@@ -12,6 +12,8 @@ from pydantic import BaseModel
 from openai import AsyncOpenAI
 
 from prompts import SCENARIO_GENERATOR_PROMPT, PERSONA_SCENARIO_PROMPT, AWS_PERSONAS
+from services.llm_cache import CachePolicy
+from services.streaming import complete_json
 from utils import get_request_model, ApiKeyRequiredError, DEFAULT_MODEL
 
 # Import shared models from models/learning.py to ensure type consistency
@@ -79,9 +81,10 @@ def validate_scenario_params(target_cert: str, user_level: str) -> None:
 async def _chat_json(
     messages: List[Dict], 
     model: Optional[str] = None, 
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    cache: Optional[CachePolicy] = None,
 ) -> Dict:
-    """JSON chat completion with .env only."""
+    """JSON chat completion with .env only (cached per `cache`)."""
     key = os.getenv("OPENAI_API_KEY")
     if not key:
         raise ApiKeyRequiredError(
@@ -91,13 +94,15 @@ async def _chat_json(
     model = model or get_request_model() or DEFAULT_MODEL
     client = AsyncOpenAI(api_key=key)
     
-    response = await client.chat.completions.create(
+    content = await complete_json(
+        client,
+        cache=cache,
         model=model,
         messages=messages,
         response_format={"type": "json_object"},
         temperature=0.9,  # Higher temp for more creative/varied scenarios
     )
-    return json.loads(response.choices[0].message.content)
+    return json.loads(content)
 
 
 async def generate_scenario(
@@ -323,6 +328,6 @@ Evaluate the solution and return JSON with:
     result = await _chat_json([
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": f"Evaluate this solution:\n\n{user_solution}"},
-    ])
+    ], cache=CachePolicy("evaluate_solution"))
     
     return result
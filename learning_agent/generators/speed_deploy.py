@@ -21,13 +21,17 @@ import json
 import os
 import uuid
 import random
-from typing import List, Optional, Dict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from pydantic import BaseModel
 from openai import AsyncOpenAI
 
 from prompts import CERTIFICATION_PERSONAS
 from utils import get_request_model, ApiKeyRequiredError, DEFAULT_MODEL
 from generators.cloud_tycoon import VALID_SERVICE_IDS, AWS_SERVICES_REFERENCE
+from services.aws_pricing import estimate_architecture_cost
+from services.llm_cache import CachePolicy
+from services.streaming import complete_json
 
 
 # Valid user levels
@@ -180,6 +184,15 @@ class DeployResult(BaseModel):
     feedback: str
     optimal_solution: List[str]
     learning_point: str  # Key architectural lesson from this round
+    
+    # Offline catalogue estimates (default usage per service)
+    estimated_monthly_usd: Optional[float] = None  # Submitted architecture
+    optimal_monthly_usd: Optional[float] = None  # Optimal solution
+
+
+def solution_monthly_cost(services: List[str]) -> float:
+    """Estimated monthly USD for a set of service ids (offline catalogue, no network)."""
+    return estimate_architecture_cost(services)["total_monthly"]
 
 
 # =============================================================================
@@ -434,6 +447,10 @@ Remember:
     # Get learning point
     learning_point = result.get("learning_point", "Consider the tradeoffs between cost, performance, and complexity.")
     
+    # Is the optimal solution also the cheapest valid one?
+    optimal_cost = solution_monthly_cost(optimal)
+    cost_optimal = all(optimal_cost <= solution_monthly_cost(sol) for sol in acceptable if sol)
+    
     return DeployBrief(
         id=f"deploy_{uuid.uuid4().hex[:8]}",
         client_name=result.get("client_name", "Client Corp"),
@@ -448,240 +465,70 @@ Remember:
         user_level=user_level,
         target_cert=cert_name,
         max_score=max_score,
+        cost_optimal=cost_optimal,
         learning_point=learning_point,
     )
 
 
-async def validate_deployment_with_ai(
-    brief: DeployBrief,
-    submitted_services: List[str],
-    time_remaining: int,
-    api_key: Optional[str] = None,
-    model: Optional[str] = None,
-) -> DeployResult:
+# =============================================================================
+# SCORING
+# =============================================================================
+
+@dataclass(frozen=True)
+class ScoringTable:
     """
-    AI-powered validation that evaluates the submission in context of the 
-    target certification and user skill level.
-    
-    The AI evaluates:
-    - Does this architecture meet the requirements for THIS certification?
-    - What's missing or suboptimal for THIS cert's exam focus?
-    - Cert-specific feedback (e.g., "For SAA, Multi-AZ is required for 99.9% SLA")
-    
-    Scoring model:
-    - AI correctness score (0-60% of max)
-    - Speed bonus (up to 20% of max)
-    - Cost efficiency bonus (up to 10% of max)
-    - Penalties from AI evaluation
-    
-    Grades: S (95%+), A (85%+), B (70%+), C (50%+), D (30%+), F (<30%)
+    A brief's answer key compiled once for scoring, so grading a
+    submission is set and dict lookups rather than rebuilding sets from
+    lists (acceptable solutions are matched by frozenset hash).
     """
-    key = os.getenv("OPENAI_API_KEY")
-    if not key:
-        return validate_deployment_deterministic(brief, submitted_services, time_remaining)
-    
-    submitted_set = set(s.lower().strip() for s in submitted_services)
-    optimal_set = set(brief.optimal_solution)
-    
-    # Quick checks for exact matches (no AI needed)
-    is_optimal = submitted_set == optimal_set
-    is_acceptable = any(submitted_set == set(acc) for acc in brief.acceptable_solutions)
-    
-    # Calculate what's missing/extra compared to optimal
-    missing = list(optimal_set - submitted_set)
-    extra = list(submitted_set - optimal_set)
-    
-    # Build the AI evaluation prompt
-    requirements_text = "\n".join([
-        f"- [{req.priority.upper()}] {req.category}: {req.description}"
-        for req in brief.requirements
-    ])
-    
-    trap_info = ""
-    if brief.trap_services:
-        trap_info = "\nKnown suboptimal services in palette:\n" + "\n".join([
-            f"- {t.service_id}: {t.why_suboptimal}"
-            for t in brief.trap_services
-        ])
-    
-    eval_prompt = f"""You are an AWS certification exam grader evaluating a Speed Deploy architecture challenge.
-
-TARGET CERTIFICATION: {brief.target_cert or "AWS Solutions Architect"}
-USER SKILL LEVEL: {brief.user_level}
-CLIENT: {brief.client_name} ({brief.industry})
-
-REQUIREMENTS:
-{requirements_text}
-
-OPTIMAL SOLUTION: {', '.join(brief.optimal_solution)}
-ACCEPTABLE ALTERNATIVES: {brief.acceptable_solutions}
-{trap_info}
-
-SUBMITTED ARCHITECTURE: {', '.join(submitted_services) if submitted_services else "EMPTY (no services selected)"}
-
-Evaluate this submission specifically for the {brief.target_cert or "AWS Solutions Architect"} certification exam context.
-
-Return JSON:
-{{
-  "correctness_percent": <0-100, how well does this meet requirements for THIS cert>,
-  "requirements_met": ["list", "of", "requirement", "categories", "satisfied"],
-  "requirements_missed": ["list", "of", "requirement", "categories", "NOT", "satisfied"],
-  "is_valid_solution": <true if it would work, even if not optimal>,
-  "is_cost_efficient": <true if cost-optimized for the requirements>,
-  "trap_services_used": [
-    {{"service_id": "...", "why_suboptimal": "cert-specific reason why this is wrong"}}
-  ],
-  "missing_critical": ["services that are REQUIRED for this cert's focus areas"],
-  "unnecessary_services": ["services that add cost/complexity without benefit"],
-  "feedback": "2-3 sentence cert-specific feedback explaining the grade",
-  "learning_point": "Key architectural lesson for THIS certification"
-}}
-
-Be strict but fair. Consider what the {brief.target_cert or "AWS"} exam would expect."""
-
-    # Call OpenAI for evaluation
-    model_to_use = model or get_request_model() or DEFAULT_MODEL
-    client = AsyncOpenAI(api_key=key)
-    
-    try:
-        response = await client.chat.completions.create(
-            model=model_to_use,
-            messages=[
-                {"role": "system", "content": "You are an AWS certification exam grader. Return only valid JSON."},
-                {"role": "user", "content": eval_prompt},
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.3,  # Lower temperature for more consistent grading
+    brief: DeployBrief
+    optimal: FrozenSet[str]
+    acceptable: FrozenSet[FrozenSet[str]]
+    traps: Dict[str, ServiceTrap]
+    categories: Tuple[str, ...]
+    critical_categories: Tuple[str, ...]
+    optimal_cost: float
+
+    @classmethod
+    def from_brief(cls, brief: DeployBrief) -> "ScoringTable":
+        return cls(
+            brief=brief,
+            optimal=frozenset(brief.optimal_solution),
+            acceptable=frozenset(frozenset(acc) for acc in brief.acceptable_solutions),
+            traps={trap.service_id: trap for trap in brief.trap_services},
+            categories=tuple(req.category for req in brief.requirements),
+            critical_categories=tuple(req.category for req in brief.requirements if req.priority == "critical"),
+            optimal_cost=solution_monthly_cost(brief.optimal_solution),
         )
-        
-        eval_result = json.loads(response.choices[0].message.content or "{}")
-    except Exception as e:
-        # Fallback to deterministic if AI fails
-        print(f"AI validation failed, using deterministic: {e}")
-        return validate_deployment_deterministic(brief, submitted_services, time_remaining)
-    
-    # =========================================================================
-    # SCORING BREAKDOWN (using AI evaluation)
-    # =========================================================================
-    
-    # 1. CORRECTNESS SCORE (base: 0-60% of max) - from AI
-    ai_correctness = eval_result.get("correctness_percent", 50)
-    correctness_score = int(brief.max_score * 0.60 * (ai_correctness / 100))
-    
-    # Override for exact matches
-    if is_optimal:
-        correctness_score = int(brief.max_score * 0.60)
-    elif is_acceptable:
-        correctness_score = max(correctness_score, int(brief.max_score * 0.50))
-    
-    # 2. SPEED BONUS (up to 20% of max)
-    speed_ratio = time_remaining / brief.time_limit if brief.time_limit > 0 else 0
-    is_valid = eval_result.get("is_valid_solution", False) or is_optimal or is_acceptable
-    if is_valid:
-        speed_bonus = int(brief.max_score * 0.20 * speed_ratio)
-    else:
-        speed_bonus = 0
-    
-    # 3. COST EFFICIENCY BONUS (up to 10% of max)
-    if is_optimal or eval_result.get("is_cost_efficient", False):
-        cost_efficiency_bonus = int(brief.max_score * 0.10)
-    elif is_acceptable:
-        cost_efficiency_bonus = int(brief.max_score * 0.05)
-    else:
-        cost_efficiency_bonus = 0
-    
-    # 4. OVERENGINEERING PENALTY
-    unnecessary = eval_result.get("unnecessary_services", [])
-    overengineering_penalty = len(unnecessary) * 5 if not is_optimal else 0
-    
-    # 5. TRAP PENALTY - from AI evaluation
-    trap_services_used = eval_result.get("trap_services_used", [])
-    trap_penalty = len(trap_services_used) * 10
-    
-    # 6. MISSED REQUIREMENT PENALTY
-    requirements_met = eval_result.get("requirements_met", [])
-    requirements_missed = eval_result.get("requirements_missed", [])
-    missed_requirement_penalty = 0
-    for req in brief.requirements:
-        if req.category in requirements_missed:
-            if req.priority == "critical":
-                missed_requirement_penalty += 15
-            else:
-                missed_requirement_penalty += 8
-    
-    # =========================================================================
-    # FINAL SCORE & GRADE
-    # =========================================================================
-    
-    final_score = max(0, (
-        correctness_score 
-        + speed_bonus 
-        + cost_efficiency_bonus 
-        - overengineering_penalty 
-        - trap_penalty 
-        - missed_requirement_penalty
-    ))
-    
-    percentage = (final_score / brief.max_score) * 100 if brief.max_score > 0 else 0
-    
-    if percentage >= 95:
-        grade = "S"
-    elif percentage >= 85:
-        grade = "A"
-    elif percentage >= 70:
-        grade = "B"
-    elif percentage >= 50:
-        grade = "C"
-    elif percentage >= 30:
-        grade = "D"
-    else:
-        grade = "F"
-    
-    # Get feedback from AI
-    feedback = eval_result.get("feedback", "Architecture evaluated.")
-    learning_point = eval_result.get("learning_point", brief.learning_point)
-    
-    return DeployResult(
-        grade=grade,
-        score=final_score,
-        max_score=brief.max_score,
-        correctness_score=correctness_score,
-        speed_bonus=speed_bonus,
-        cost_efficiency_bonus=cost_efficiency_bonus,
-        overengineering_penalty=overengineering_penalty,
-        trap_penalty=trap_penalty,
-        missed_requirement_penalty=missed_requirement_penalty,
-        met_requirements=len(requirements_missed) == 0,
-        is_optimal=is_optimal,
-        is_acceptable=is_acceptable or eval_result.get("is_valid_solution", False),
-        requirements_met=requirements_met,
-        requirements_missed=requirements_missed,
-        trap_services_used=trap_services_used,
-        missing_services=eval_result.get("missing_critical", missing),
-        extra_services=eval_result.get("unnecessary_services", extra),
-        feedback=feedback,
-        optimal_solution=brief.optimal_solution,
-        learning_point=learning_point,
-    )
 
 
-def validate_deployment_deterministic(
-    brief: DeployBrief,
+def score_deployment(
+    table: ScoringTable,
     submitted_services: List[str],
     time_remaining: int,
 ) -> DeployResult:
     """
-    Deterministic validation fallback (no AI).
-    Used when API key is not available or AI call fails.
+    Deterministic graded scoring against a compiled brief (no AI).
+
+    Scoring model:
+    - Correctness (15-60% of max) by how close the submission is to optimal
+    - Speed bonus (up to 20% of max) for valid or nearly valid submissions
+    - Cost efficiency bonus (up to 10% of max)
+    - Penalties for extra services, traps and missed critical requirements
+
+    Grades: S (95%+), A (85%+), B (70%+), C (50%+), D (30%+), F (<30%)
     """
-    submitted_set = set(s.lower().strip() for s in submitted_services)
-    optimal_set = set(brief.optimal_solution)
+    brief = table.brief
+    submitted_set = frozenset(s.lower().strip() for s in submitted_services)
     
-    is_optimal = submitted_set == optimal_set
-    is_acceptable = any(submitted_set == set(acc) for acc in brief.acceptable_solutions)
+    is_optimal = submitted_set == table.optimal
+    is_acceptable = submitted_set in table.acceptable
     
-    missing = list(optimal_set - submitted_set)
-    extra = list(submitted_set - optimal_set)
+    missing = list(table.optimal - submitted_set)
+    extra = list(submitted_set - table.optimal)
+    
+    submitted_cost = solution_monthly_cost(list(submitted_set))
+    optimal_cost = table.optimal_cost
     
     # Correctness score
     if is_optimal:
@@ -703,12 +550,18 @@ def validate_deployment_deterministic(
         correctness_score = int(brief.max_score * 0.15)
         feedback = "❌ Architecture doesn't meet requirements."
     
-    # Speed bonus
+    # Speed bonus - time_remaining comes from the client, so cap it at the brief's limit
+    time_remaining = min(max(time_remaining, 0), brief.time_limit)
     speed_ratio = time_remaining / brief.time_limit if brief.time_limit > 0 else 0
     speed_bonus = int(brief.max_score * 0.20 * speed_ratio) if is_optimal or is_acceptable or len(missing) <= 1 else 0
     
-    # Cost efficiency bonus
-    cost_efficiency_bonus = int(brief.max_score * 0.10) if is_optimal else (int(brief.max_score * 0.05) if is_acceptable else 0)
+    # Cost efficiency bonus - a valid alternative that is no pricier than optimal earns the full bonus
+    if is_optimal or (is_acceptable and submitted_cost <= optimal_cost):
+        cost_efficiency_bonus = int(brief.max_score * 0.10)
+    elif is_acceptable:
+        cost_efficiency_bonus = int(brief.max_score * 0.05)
+    else:
+        cost_efficiency_bonus = 0
     
     # Overengineering penalty
     overengineering_penalty = len(extra) * 5 if not is_optimal else 0
@@ -716,10 +569,9 @@ def validate_deployment_deterministic(
     # Trap penalty
     trap_services_used = []
     trap_penalty = 0
-    trap_ids = {trap.service_id for trap in brief.trap_services}
     for svc in submitted_set:
-        if svc in trap_ids:
-            trap = next(t for t in brief.trap_services if t.service_id == svc)
+        trap = table.traps.get(svc)
+        if trap is not None:
             trap_services_used.append({
                 "service_id": svc,
                 "why_suboptimal": trap.why_suboptimal,
@@ -728,8 +580,8 @@ def validate_deployment_deterministic(
             trap_penalty += trap.penalty
     
     # Requirements check (simplified - just check if optimal/acceptable)
-    requirements_met = [req.category for req in brief.requirements] if is_optimal or is_acceptable else []
-    requirements_missed = [] if is_optimal or is_acceptable else [req.category for req in brief.requirements if req.priority == "critical"]
+    requirements_met = list(table.categories) if is_optimal or is_acceptable else []
+    requirements_missed = [] if is_optimal or is_acceptable else list(table.critical_categories)
     missed_requirement_penalty = len(requirements_missed) * 15
     
     final_score = max(0, correctness_score + speed_bonus + cost_efficiency_bonus - overengineering_penalty - trap_penalty - missed_requirement_penalty)
@@ -763,9 +615,131 @@ def validate_deployment_deterministic(
         feedback=feedback,
         optimal_solution=brief.optimal_solution,
         learning_point=brief.learning_point,
+        estimated_monthly_usd=submitted_cost,
+        optimal_monthly_usd=optimal_cost,
     )
 
 
+async def narrate_deployment(
+    table: ScoringTable,
+    result: DeployResult,
+    submitted_services: List[str],
+    model: Optional[str] = None,
+) -> DeployResult:
+    """
+    Replace a scored result's feedback and learning point with
+    cert-specific commentary from the model. The score is not changed.
+    Keeps the deterministic feedback when no API key is set or the call fails.
+    """
+    key = os.getenv("OPENAI_API_KEY")
+    if not key:
+        return result
+    
+    brief = table.brief
+    requirements_text = "\n".join([
+        f"- [{req.priority.upper()}] {req.category}: {req.description}"
+        for req in brief.requirements
+    ])
+    
+    if result.is_optimal:
+        outcome = "OPTIMAL - matches the optimal solution"
+    elif result.is_acceptable:
+        outcome = "ACCEPTABLE - a valid alternative, but not optimal"
+    else:
+        outcome = "DOES NOT MEET REQUIREMENTS"
+    
+    # Sorted so the same architecture for the same brief reuses cached feedback
+    submitted = sorted({s.lower().strip() for s in submitted_services})
+    traps_text = "\n".join([
+        f"- {trap['service_id']}: {trap['why_suboptimal']}"
+        for trap in sorted(result.trap_services_used, key=lambda t: t["service_id"])
+    ]) or "- none"
+    
+    feedback_prompt = f"""You are an AWS certification exam coach explaining a graded Speed Deploy architecture challenge.
+
+TARGET CERTIFICATION: {brief.target_cert or "AWS Solutions Architect"}
+USER SKILL LEVEL: {brief.user_level}
+CLIENT: {brief.client_name} ({brief.industry})
+
+REQUIREMENTS:
+{requirements_text}
+
+OPTIMAL SOLUTION: {', '.join(brief.optimal_solution)}
+SUBMITTED ARCHITECTURE: {', '.join(submitted) if submitted else "EMPTY (no services selected)"}
+RESULT: {outcome}
+MISSING: {', '.join(sorted(result.missing_services)) or "nothing"}
+UNNECESSARY: {', '.join(sorted(result.extra_services)) or "nothing"}
+TRAP SERVICES USED:
+{traps_text}
+
+ESTIMATED MONTHLY COST (on-demand list prices, typical usage):
+- Submitted: ${result.estimated_monthly_usd or 0:,.2f}
+- Optimal: ${result.optimal_monthly_usd or 0:,.2f}
+
+The score is already decided. Explain this result specifically for the {brief.target_cert or "AWS Solutions Architect"} certification exam context.
+
+Return JSON:
+{{
+  "feedback": "2-3 sentence cert-specific feedback explaining the result",
+  "learning_point": "Key architectural lesson for THIS certification"
+}}"""
+
+    model_to_use = model or get_request_model() or DEFAULT_MODEL
+    client = AsyncOpenAI(api_key=key)
+    
+    try:
+        content = await complete_json(
+            client,
+            cache=CachePolicy("deploy_feedback"),
+            model=model_to_use,
+            messages=[
+                {"role": "system", "content": "You are an AWS certification exam coach. Return only valid JSON."},
+                {"role": "user", "content": feedback_prompt},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.3,
+        )
+        narrative = json.loads(content or "{}")
+    except Exception as e:
+        print(f"AI feedback failed, keeping deterministic feedback: {e}")
+        return result
+    
+    return result.model_copy(update={
+        "feedback": narrative.get("feedback") or result.feedback,
+        "learning_point": narrative.get("learning_point") or result.learning_point,
+    })
+
+
+async def validate_deployment_with_ai(
+    brief: DeployBrief,
+    submitted_services: List[str],
+    time_remaining: int,
+    api_key: Optional[str] = None,
+    model: Optional[str] = None,
+) -> DeployResult:
+    """
+    Deterministic scoring with cert-specific feedback from the model.
+
+    The grade comes from score_deployment(); the model only writes the
+    feedback and learning point (see narrate_deployment()).
+    """
+    table = ScoringTable.from_brief(brief)
+    result = score_deployment(table, submitted_services, time_remaining)
+    return await narrate_deployment(table, result, submitted_services, model)
+
+
+def validate_deployment_deterministic(
+    brief: DeployBrief,
+    submitted_services: List[str],
+    time_remaining: int,
+) -> DeployResult:
+    """
+    Deterministic validation (no AI) of a brief that hasn't been compiled.
+    Briefs held by the brief store are scored with score_deployment().
+    """
+    return score_deployment(ScoringTable.from_brief(brief), submitted_services, time_remaining)
+
+
 def validate_deployment(
     brief: DeployBrief,
     submitted_services: List[str],
@@ -774,7 +748,7 @@ def validate_deployment(
     """
     Synchronous wrapper for backward compatibility.
     Uses deterministic validation (no AI).
-    For AI-powered validation, use validate_deployment_with_ai().
+    For cert-specific AI feedback, use validate_deployment_with_ai().
     """
     return validate_deployment_deterministic(brief, submitted_services, time_remaining)
 
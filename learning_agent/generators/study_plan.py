@@ -17,6 +17,7 @@ from pydantic import BaseModel
 
 from config.settings import logger
 from prompts import CERTIFICATION_PERSONAS
+from services.streaming import ItemCallback, complete_json
 from utils import (
     ApiKeyRequiredError,
     get_request_model,
@@ -955,6 +956,7 @@ async def format_study_guide(
     *,
     model: Optional[str] = None,
     api_key: Optional[str] = None,
+    on_item: Optional[ItemCallback] = None,
 ) -> Dict[str, Any]:
     """
     FORMAT a study guide from pre-selected content.
@@ -974,6 +976,7 @@ async def format_study_guide(
         previous_plan_context: Optional previous plan context for variation
         model: Optional model override
         api_key: Optional OpenAI API key
+        on_item: Optional callback, streamed each week and milestone as it is generated
     
     Returns:
         Formatted study guide JSON
@@ -1044,15 +1047,16 @@ async def format_study_guide(
 
     client = AsyncOpenAI(api_key=key)
 
-    response = await client.chat.completions.create(
+    content = await complete_json(
+        client,
+        on_item,
+        ("weeks", "milestones"),
         model=model_name,
         messages=messages,
         response_format={"type": "json_object"},
         temperature=0.5,  # Lower temperature for more consistent formatting
     )
 
-    content = response.choices[0].message.content
-
     try:
         plan = json.loads(content)
     except json.JSONDecodeError as err:
@@ -1062,7 +1066,7 @@ async def format_study_guide(
     # Validate that actions weren't changed (safety check)
     plan = validate_and_fix_actions(plan, structured_content)
 
-    # Fetch real resources in parallel using crawler
+    # Resources come from the catalogue (crawled in the background, never inline)
     try:
         from generators.resource_fetcher import fetch_study_resources
         resources = await fetch_study_resources(
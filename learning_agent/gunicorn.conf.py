@@ -16,8 +16,15 @@ worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 100
 
-# Timeouts - increased for long-running crawl jobs
-timeout = 3600  # 1 hour for crawl jobs
+# Import the app once in the master and fork workers from it: workers share
+# the imported code and data copy-on-write, and a recycled worker starts
+# without re-importing. The app opens no connections at import time; each
+# worker opens its own in the FastAPI lifespan (lifecycle.py).
+preload_app = os.getenv("GUNICORN_PRELOAD", "true") == "true"
+
+# Timeouts - crawl jobs run in the crawl worker (crawl/worker.py), so web
+# workers only need to outlive the slowest LLM request
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "300"))
 keepalive = 5
 graceful_timeout = 30
 
@@ -38,6 +45,36 @@ user = None
 group = None
 tmp_upload_dir = None
 
+# Prometheus multiprocess mode: each worker writes its metrics to
+# PROMETHEUS_MULTIPROC_DIR and /metrics aggregates them. The directory is
+# reset here, when the config loads, because a preloaded app creates its
+# metric files on import - before gunicorn's on_starting hook runs.
+_metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _metrics_dir:
+    import shutil
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+# Offline AWS price catalogue: built/refreshed from the master in a
+# subprocess; workers only read the SQLite file
+def when_ready(server):
+    from services.pricing_catalog import start_background_refresh
+    start_background_refresh()
+
+    if preload_app:
+        # Move everything imported so far out of the collector's reach, so
+        # gc passes in the workers don't write to (and un-share) those pages
+        import gc
+        gc.collect()
+        gc.freeze()
+
 # SSL (if needed in future)
 keyfile = None
 certfile = None
@@ -0,0 +1,95 @@
+"""
+Per-worker startup and shutdown for the Learning Agent.
+
+gunicorn imports the app once in the master (preload_app) and forks the
+workers from it, so the forks share the imported code read-only. That only
+works if importing the app opens nothing: no database or Redis
+connections, HTTP clients, browsers, threads or event-loop objects. All of
+those are per process and are opened here, from the FastAPI lifespan, in
+each worker after the fork. They are also closed here on shutdown.
+
+Warm-up steps run concurrently. A failed step is logged, not fatal: that
+resource connects lazily on first use, as it did before.
+"""
+import os
+import time
+import asyncio
+from typing import Awaitable, Dict, Optional
+
+from config.settings import logger
+
+# Launch browsers at startup rather than on the first crawl. Off by default:
+# queued crawls run in crawl/worker.py, which starts its own pool, so a web
+# worker only needs Chromium for the occasional inline crawl.
+WARM_BROWSERS = os.getenv("BROWSER_POOL_WARM", "false") == "true"
+
+
+async def _warm_db():
+    import db
+    await db.get_pool()
+
+
+async def _warm_redis():
+    from redis_jobs import get_job_manager
+    from redis_sessions import get_session_manager
+
+    for manager in (await get_job_manager(), await get_session_manager()):
+        await (await manager.get_redis()).ping()
+
+
+async def _warm_http():
+    from services.deps import get_agent_deps
+    get_agent_deps()
+
+
+async def _warm_crawler():
+    # Browser pool, plus the reranker / Neo4j driver when enabled
+    from crawl.context import get_context
+    await get_context()
+
+
+async def _timed(name: str, step: Awaitable, timings: Dict[str, Optional[float]]):
+    start = time.perf_counter()
+    try:
+        await step
+        timings[name] = round(time.perf_counter() - start, 3)
+    except Exception as e:
+        timings[name] = None
+        logger.warning(f"Startup: {name} warm-up failed, it will connect on first use: {e}")
+
+
+async def start_worker_resources() -> Dict[str, Optional[float]]:
+    """Open this worker's pools and clients; returns seconds per step (None = failed)."""
+    started = time.perf_counter()
+    steps = {"db": _warm_db(), "redis": _warm_redis(), "http": _warm_http()}
+    if WARM_BROWSERS:
+        steps["crawler"] = _warm_crawler()
+
+    timings: Dict[str, Optional[float]] = {}
+    await asyncio.gather(*(_timed(name, step, timings) for name, step in steps.items()))
+    logger.info(f"Worker {os.getpid()} ready in {time.perf_counter() - started:.2f}s: {timings}")
+    return timings
+
+
+async def close_worker_resources():
+    """Close everything start_worker_resources (or first use) opened."""
+    from crawl.browser_pool import close_browser_pool
+    from crawl.context import close_context
+    from services.deps import close_agent_deps
+    from redis_jobs import get_job_manager
+    from redis_sessions import get_session_manager
+    import db
+
+    closers = {
+        "crawler context": close_context(),
+        "browser pool": close_browser_pool(),
+        "http client": close_agent_deps(),
+        "redis jobs": (await get_job_manager()).close(),
+        "redis sessions": (await get_session_manager()).close(),
+        "db pool": db.close_pool(),
+    }
+    for name, closer in closers.items():
+        try:
+            await closer
+        except Exception as e:
+            logger.warning(f"Shutdown: closing {name} failed: {e}")
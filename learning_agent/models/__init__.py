@@ -25,6 +25,8 @@ from .cli import (
     CLISimulatorRequest,
     CLIHelpRequest,
     CLIValidateRequest,
+    CLIObjectivesGenerateRequest,
+    CLICommandValidateRequest,
 )
 from .journey import (
     LearningJourneyRequest,
@@ -39,6 +41,11 @@ from .config import (
     SetPersonaRequest,
 )
 from .chat import ChatRequest
+from .proficiency import (
+    ProficiencyTestStartRequest,
+    ProficiencyTestChatRequest,
+    ProficiencyTestEvaluateRequest,
+)
 from .portfolio import (
     GeneratePortfolioRequest,
     GeneratePortfolioResponse,
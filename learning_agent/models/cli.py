@@ -1,7 +1,7 @@
 """
 CLI Simulator Pydantic models (legacy shape used by crawler and frontend).
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 
 
@@ -36,3 +36,30 @@ class CLIValidateRequest(BaseModel):
     challenge_context: Dict[str, Any]
     openai_api_key: Optional[str] = None
     preferred_model: Optional[str] = None
+
+
+class CLIObjectivesGenerateRequest(BaseModel):
+    """Request to generate CLI objectives."""
+    challenge_id: str
+    challenge_title: str
+    challenge_description: str
+    success_criteria: List[str]
+    aws_services_relevant: List[str]
+    company_name: str
+    industry: str
+    business_context: str
+    diagram_data: Optional[Dict[str, Any]] = None
+    diagram_services: Optional[List[str]] = None
+    user_level: str = "intermediate"
+    objective_count: int = 3
+    openai_api_key: Optional[str] = None
+    preferred_model: Optional[str] = None
+
+
+class CLICommandValidateRequest(BaseModel):
+    """Request to validate a CLI command."""
+    command: str
+    command_output: str
+    objectives: List[Dict[str, Any]]  # List of objective dicts
+    openai_api_key: Optional[str] = None
+    preferred_model: Optional[str] = None
@@ -0,0 +1,63 @@
+"""
+Proficiency test Pydantic models.
+"""
+from typing import List, Dict, Any, Optional
+from pydantic import BaseModel
+
+
+class ProficiencyTestStartRequest(BaseModel):
+    """Request to start a proficiency test."""
+    challenge_id: str
+    challenge_title: str
+    challenge_description: str
+    challenge_brief: str
+    success_criteria: List[str]
+    aws_services: List[str]
+    diagram_data: Optional[Dict[str, Any]] = None
+    diagram_services: Optional[List[str]] = None
+    diagram_audit: Optional[Dict[str, Any]] = None  # Full audit results: score, correct, missing, suggestions, feedback
+    diagram_score: Optional[Dict[str, Any]] = None  # Placement score breakdown
+    question_answers: Optional[List[Dict]] = None  # Full question data with user answers
+    company_name: str
+    industry: str
+    business_context: str
+    user_level: str = "intermediate"
+    cert_code: Optional[str] = None
+    previous_chat_history: Optional[List[Dict[str, str]]] = None  # General chat before proficiency test
+    openai_api_key: Optional[str] = None
+    preferred_model: Optional[str] = None
+
+
+class ProficiencyTestChatRequest(BaseModel):
+    """Request to continue proficiency test conversation."""
+    challenge_id: str
+    challenge_title: str
+    challenge_description: str
+    challenge_brief: str
+    success_criteria: List[str]
+    aws_services: List[str]
+    diagram_data: Optional[Dict[str, Any]] = None
+    diagram_services: Optional[List[str]] = None
+    company_name: str
+    industry: str
+    business_context: str
+    user_level: str = "intermediate"
+    chat_history: List[Dict[str, str]]  # [{role, content, timestamp}]
+    user_message: str
+    questions_asked: int = 1
+    openai_api_key: Optional[str] = None
+    preferred_model: Optional[str] = None
+
+
+class ProficiencyTestEvaluateRequest(BaseModel):
+    """Request to evaluate proficiency test."""
+    challenge_id: str
+    challenge_title: str
+    success_criteria: List[str]
+    aws_services: List[str]
+    diagram_services: Optional[List[str]] = None
+    company_name: str
+    industry: str
+    chat_history: List[Dict[str, str]]
+    openai_api_key: Optional[str] = None
+    preferred_model: Optional[str] = None
@@ -6,12 +6,15 @@ Provides:
 - Per-tenant rate limiting
 - Concurrent crawl limits
 - Job expiration (auto-cleanup)
+- Durable work queue (Redis Stream + consumer group) for crawl workers
+- Per-URL crawl checkpoints, so a reclaimed job resumes where it stopped
 """
 
 import os
 import json
 import redis.asyncio as redis
-from typing import Dict, Any, Optional, List
+from redis.exceptions import ResponseError
+from typing import Dict, Any, Optional, List, Iterable, Tuple
 from datetime import datetime, timedelta
 import uuid
 
@@ -27,6 +30,11 @@ JOB_EXPIRY_HOURS = int(os.getenv("JOB_EXPIRY_HOURS", "24"))
 JOB_PREFIX = "crawl:job:"
 TENANT_ACTIVE_PREFIX = "crawl:active:"
 TENANT_HOURLY_PREFIX = "crawl:hourly:"
+CHECKPOINT_PREFIX = "crawl:checkpoint:"
+
+# Work queue: the API XADDs, crawl workers (crawl/worker.py) XREADGROUP
+CRAWL_STREAM = os.getenv("CRAWL_STREAM", "crawl:queue")
+CRAWL_GROUP = os.getenv("CRAWL_GROUP", "crawl-workers")
 
 
 class RedisJobManager:
@@ -239,6 +247,141 @@ class RedisJobManager:
         }
 
 
+class CrawlQueue:
+    """
+    Crawl work queue on a Redis Stream with one consumer group.
+    
+    Each entry carries only a job id; the worker looks up everything else,
+    including the tenant's OpenAI key, itself. A worker reads an entry, keeps it "pending"
+    while it crawls (heartbeat() resets its idle time), then acks and
+    deletes it. Entries whose worker died go idle and are taken over by
+    another worker with reclaim().
+    """
+    
+    def __init__(self, redis_client: redis.Redis, stream: str = CRAWL_STREAM, group: str = CRAWL_GROUP):
+        self.r = redis_client
+        self.stream = stream
+        self.group = group
+    
+    async def ensure_group(self):
+        """Create the stream and consumer group if they don't exist."""
+        try:
+            await self.r.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+    
+    async def enqueue(self, job_id: str) -> str:
+        return await self.r.xadd(self.stream, {"job_id": job_id})
+    
+    async def read(self, consumer: str, count: int, block_ms: int) -> List[Tuple[str, Dict[str, str]]]:
+        """New entries for this consumer (blocks up to block_ms)."""
+        response = await self.r.xreadgroup(self.group, consumer, {self.stream: ">"}, count=count, block=block_ms)
+        return [entry for _, entries in response or [] for entry in entries]
+    
+    async def reclaim(self, consumer: str, min_idle_ms: int, count: int) -> List[Tuple[str, Dict[str, str]]]:
+        """Take over entries that have been pending longer than min_idle_ms."""
+        _, entries, *_ = await self.r.xautoclaim(self.stream, self.group, consumer, min_idle_ms, "0-0", count=count)
+        # Entries deleted while pending come back empty
+        return [(entry_id, fields) for entry_id, fields in entries if fields]
+    
+    async def heartbeat(self, consumer: str, entry_id: str):
+        """Reset an entry's idle time so it isn't reclaimed mid-crawl."""
+        await self.r.xclaim(self.stream, self.group, consumer, 0, [entry_id], justid=True)
+    
+    async def ack(self, entry_id: str):
+        async with self.r.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, entry_id)
+            pipe.xdel(self.stream, entry_id)
+            await pipe.execute()
+    
+    async def depth(self) -> Dict[str, int]:
+        """Queued (not yet delivered) and pending (being crawled) entries."""
+        await self.ensure_group()
+        group = next(g for g in await self.r.xinfo_groups(self.stream) if g["name"] == self.group)
+        pending = group["pending"]
+        return {"queued": max(0, await self.r.xlen(self.stream) - pending), "pending": pending}
+
+
+class CrawlCheckpoint:
+    """
+    Progress of one crawl job, saved after every page.
+    
+    Keys (all expire with the job):
+        crawl:checkpoint:<job>           hash - seeded, recursive, depth, counters
+        crawl:checkpoint:<job>:done      set  - normalized URLs already crawled
+        crawl:checkpoint:<job>:frontier  set  - URLs of the current depth
+        crawl:checkpoint:<job>:next      set  - links found for the next depth
+    """
+    
+    COUNTERS = ("pages_crawled", "documents_stored", "code_examples", "total_words")
+    
+    def __init__(self, redis_client: redis.Redis, job_id: str):
+        self.r = redis_client
+        self.key = f"{CHECKPOINT_PREFIX}{job_id}"
+        self.done_key = f"{self.key}:done"
+        self.frontier_key = f"{self.key}:frontier"
+        self.next_key = f"{self.key}:next"
+        self.ttl = 3600 * JOB_EXPIRY_HOURS
+    
+    def _keys(self):
+        return (self.key, self.done_key, self.frontier_key, self.next_key)
+    
+    def _expire(self, pipe):
+        for key in self._keys():
+            pipe.expire(key, self.ttl)
+    
+    async def state(self) -> Dict[str, Any]:
+        data = await self.r.hgetall(self.key)
+        return {
+            "seeded": data.get("seeded") == "1",
+            "recursive": data.get("recursive") == "1",
+            "depth": int(data.get("depth", 0)),
+            **{name: int(data.get(name, 0)) for name in self.COUNTERS},
+        }
+    
+    async def seed(self, urls: Iterable[str], recursive: bool = False):
+        """Record the starting URLs (depth 0); done once per job."""
+        urls = list(urls)
+        async with self.r.pipeline(transaction=True) as pipe:
+            if urls:
+                pipe.sadd(self.frontier_key, *urls)
+            pipe.hset(self.key, mapping={"seeded": "1", "recursive": int(recursive), "depth": 0})
+            self._expire(pipe)
+            await pipe.execute()
+    
+    async def frontier(self) -> List[str]:
+        return sorted(await self.r.smembers(self.frontier_key))
+    
+    async def done(self) -> set:
+        return set(await self.r.smembers(self.done_key))
+    
+    async def page_done(self, url: str, links: Iterable[str] = (), **counters: int):
+        """Atomically mark a URL done, queue its links and add its counters."""
+        links = list(links)
+        async with self.r.pipeline(transaction=True) as pipe:
+            pipe.sadd(self.done_key, url)
+            if links:
+                pipe.sadd(self.next_key, *links)
+            for name, value in counters.items():
+                if value:
+                    pipe.hincrby(self.key, name, value)
+            await pipe.execute()
+    
+    async def advance(self) -> List[str]:
+        """Move to the next depth: its frontier is the links found minus pages done."""
+        async with self.r.pipeline(transaction=True) as pipe:
+            pipe.sdiffstore(self.frontier_key, [self.next_key, self.done_key])
+            pipe.delete(self.next_key)
+            pipe.hincrby(self.key, "depth", 1)
+            self._expire(pipe)
+            await pipe.execute()
+        return await self.frontier()
+    
+    async def clear(self):
+        await self.r.delete(*self._keys())
+
+
 # Global instance
 _job_manager: Optional[RedisJobManager] = None
 
@@ -286,3 +429,9 @@ async def list_tenant_jobs(tenant_id: str, limit: int = 20) -> List[Dict[str, An
     """List recent jobs for a tenant."""
     manager = await get_job_manager()
     return await manager.list_jobs(tenant_id, limit)
+
+
+async def enqueue_crawl_job(job_id: str) -> str:
+    """Hand a created job to the crawl workers."""
+    manager = await get_job_manager()
+    return await CrawlQueue(await manager.get_redis()).enqueue(job_id)
@@ -1,8 +1,10 @@
 """
 API Routes for the Learning Agent.
-"""
-from fastapi import APIRouter
 
+Every endpoint lives in one of these routers. Route modules import their
+generators inside the handlers, so a route's generator (and its prompts)
+is loaded on the first request that needs it.
+"""
 from .health import router as health_router
 from .crawl import router as crawl_router
 from .aws import router as aws_router
@@ -11,9 +13,12 @@ from .journey import router as journey_router
 from .config import router as config_router
 from .chat import router as chat_router
 from .game import router as game_router
+from .architect_arena import router as architect_arena_router
 from .cloud_tycoon import router as cloud_tycoon_router
 from .service_slots import router as service_slots_router
 from .speed_deploy import router as speed_deploy_router
+from .proficiency import router as proficiency_router
+from .cli import router as cli_router
 
 # Create main router that includes all sub-routers
 def register_routes(app):
@@ -25,7 +30,10 @@ def register_routes(app):
     app.include_router(journey_router, prefix="/api/learning/journey", tags=["Journey"])
     app.include_router(config_router, prefix="/api", tags=["Config"])
     app.include_router(chat_router, prefix="/api", tags=["Chat"])
-    app.include_router(game_router, prefix="/api/game", tags=["Game Modes"])
+    app.include_router(game_router, prefix="/api", tags=["Game Modes"])
+    app.include_router(architect_arena_router, prefix="/api/architect-arena", tags=["Architect Arena"])
     app.include_router(cloud_tycoon_router, prefix="/api/tycoon", tags=["Cloud Tycoon"])
     app.include_router(service_slots_router, prefix="/api/slots", tags=["Service Slots"])
     app.include_router(speed_deploy_router, prefix="/api/speed-deploy", tags=["Speed Deploy"])
+    app.include_router(proficiency_router, prefix="/api/proficiency-test", tags=["Proficiency Test"])
+    app.include_router(cli_router, prefix="/api", tags=["CLI"])
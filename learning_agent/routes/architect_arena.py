@@ -0,0 +1,274 @@
+"""
+Architect Arena API Routes
+===========================
+Puzzle generation and auditing for the Architect Arena game mode.
+"""
+import json
+
+from fastapi import APIRouter, HTTPException
+
+from config.openai_config import get_async_openai
+from config.settings import logger
+from models.learning import GenerateContentRequest
+from utils import ApiKeyRequiredError
+
+router = APIRouter()
+
+
+@router.post("/generate")
+async def generate_architect_arena_endpoint(request: GenerateContentRequest):
+    """Generate Architect Arena puzzle payload."""
+    from utils import set_request_api_key, set_request_model
+    from generators.architect_arena import generate_architect_arena_puzzle
+
+    try:
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+
+        short_code = (request.certification_code or "SAA").upper()
+        difficulty = request.options.get("difficulty") if request.options else None
+
+        puzzle = await generate_architect_arena_puzzle(
+            user_level=request.user_level or "intermediate",
+            cert_code=short_code,
+            difficulty=difficulty,
+        )
+
+        return {
+            "success": True,
+            "puzzle": puzzle.model_dump(),
+            "certification": short_code,
+        }
+    except ApiKeyRequiredError as e:
+        raise HTTPException(status_code=402, detail=str(e))
+    except Exception as e:
+        logger.error(f"Architect Arena generation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate puzzle: {str(e)}")
+    finally:
+        set_request_api_key(None)
+        set_request_model(None)
+
+
+ARCHITECT_ARENA_AUDIT_PROMPT_ENHANCED = """You are auditing an AWS architecture PUZZLE submission with DETAILED, PERSONALIZED feedback.
+
+## USER CONTEXT
+- **Target Certification:** {cert_name}
+- **Certification Focus Areas:** {focus_areas}
+- **Skill Level:** {user_level}
+
+## CRITICAL: This is a PUZZLE game, NOT a free-form design!
+The user was given PRE-GENERATED puzzle pieces (AWS services) scattered randomly on a canvas.
+Their job was to:
+1. PLACE pieces correctly (drag into proper containers - e.g., EC2 into private subnet, ALB into public subnet)
+2. CONNECT pieces correctly (draw edges between related services)
+
+## DO NOT give credit for:
+- Having the services present (they were pre-generated, not chosen by the user)
+- The types of services used (the puzzle defined these)
+
+## DO give credit/penalties for:
+- Correct PLACEMENT: Is EC2 inside a private subnet? Is ALB in public subnet? Are subnets inside VPC?
+- Correct CONNECTIONS: Did user connect ALB -> EC2 -> RDS? Are there logical data flows?
+- Correct HIERARCHY: Proper nesting of containers
+
+## Puzzle Context
+Title: {puzzle_title}
+Brief: {puzzle_brief}
+Expected Hierarchy: {expected_hierarchy}
+Expected Connections: {expected_connections}
+
+## User's Submission
+```json
+{diagram_json}
+```
+
+## AWS Knowledge Base Context (for detailed feedback)
+{knowledge_context}
+
+## Scoring Guide (out of 100)
+- 0-30: Pieces not placed in containers, no connections
+- 31-50: Some correct placements, few connections
+- 51-70: Most placements correct, most connections made
+- 71-90: All placements correct, all connections, good hierarchy
+- 91-100: Perfect placement, connections, and hierarchy
+
+## DETAILED FEEDBACK REQUIREMENTS
+
+### For {user_level} skill level:
+- **beginner**: Provide explicit step-by-step guidance, explain WHY each placement matters, use simple language
+- **intermediate**: Explain trade-offs, reference best practices, suggest optimizations
+- **advanced**: Focus on edge cases, multi-AZ considerations, cost vs performance trade-offs
+- **expert**: Discuss enterprise patterns, compliance implications, disaster recovery strategies
+
+### Certification-Specific Feedback ({cert_name}):
+- Reference topics from the certification focus areas: {focus_areas}
+- Mention specific exam domains where applicable
+- Connect architectural decisions to certification exam objectives
+
+### Knowledge References:
+- When suggesting improvements, reference specific AWS documentation from the knowledge base
+- Provide URLs or service names for further reading
+- Connect suggestions to Well-Architected Framework pillars where relevant
+
+## OUTPUT FORMAT
+Return ONLY valid JSON with these fields:
+
+{{
+  "score": <0-100>,
+  "correct": [
+    "Detailed achievement with WHY it's correct for {cert_name}",
+    "Another correct placement with certification context"
+  ],
+  "missing": [
+    "Specific issue described as a RISK (e.g., 'Security boundary violation - EC2 exposed to internet')",
+    "Another issue with architectural impact explanation"
+  ],
+  "suggestions": [
+    "Actionable suggestion with AWS service reference",
+    "Improvement tip with Well-Architected Framework context"
+  ],
+  "feedback": "Encouraging, skill-appropriate message that references their certification goals and provides next steps",
+  "knowledge_refs": [
+    "AWS service or documentation topic relevant to their mistakes/successes",
+    "Another reference for deeper learning"
+  ],
+  "cert_specific_notes": [
+    "Note about how this architecture pattern relates to {cert_name} exam",
+    "Exam tip or common pitfall for this certification"
+  ],
+  "skill_level_guidance": "Personalized guidance appropriate for {user_level} level - what to focus on next"
+}}
+
+## EXAMPLES OF DETAILED FEEDBACK
+
+### Good "correct" entry:
+"VPC properly contains all subnets - demonstrates understanding of network isolation, a key concept for {cert_name}. This follows the Well-Architected Framework's Security pillar."
+
+### Good "missing" entry:
+"EC2 instances in public subnet - Security risk: Direct internet exposure without bastion host. For {cert_name}, remember that compute resources should typically reside in private subnets with controlled egress via NAT Gateway."
+
+### Good "suggestions" entry:
+"Consider adding a NAT Gateway in the public subnet to allow private subnet resources to access the internet securely. Review AWS VPC documentation on NAT Gateways for {cert_name} exam preparation."
+
+### Good "cert_specific_notes" entry:
+"For {cert_name} exam: Multi-AZ deployment patterns are heavily tested. Your current architecture could be enhanced by distributing resources across multiple Availability Zones for high availability."
+
+Be SPECIFIC, DETAILED, and EDUCATIONAL. Help the user learn, not just score points."""
+
+
+@router.post("/audit")
+async def audit_architect_arena_endpoint(request: dict):
+    """Audit Architect Arena puzzle with personalized, detailed feedback based on certification and skill level."""
+    from utils import set_request_api_key, set_request_model, get_request_model, fetch_knowledge_for_generation
+    from prompts import CERTIFICATION_PERSONAS
+    
+    try:
+        if request.get("openai_api_key"):
+            set_request_api_key(request["openai_api_key"])
+        if request.get("preferred_model"):
+            set_request_model(request["preferred_model"])
+        
+        # Extract user context for personalized feedback
+        user_level = request.get("user_level", "intermediate")
+        cert_code = request.get("cert_code", "SAA")
+        
+        # Map cert code to persona
+        from generators.architect_arena import CERT_CODE_TO_PERSONA
+        upper_code = cert_code.upper()
+        persona_id = CERT_CODE_TO_PERSONA.get(upper_code)
+        if not persona_id:
+            base_code = upper_code.split("-")[0] if "-" in upper_code else upper_code
+            persona_id = CERT_CODE_TO_PERSONA.get(base_code, "solutions-architect-associate")
+        
+        # Get certification context
+        persona = CERTIFICATION_PERSONAS.get(persona_id, CERTIFICATION_PERSONAS["solutions-architect-associate"])
+        cert_name = persona["cert"]
+        focus_areas = persona["focus"]
+        
+        nodes = request.get("nodes", [])
+        connections = request.get("connections", [])
+        
+        # Build hierarchy - so AI knows what's inside what
+        nodes_by_id = {n.get("id"): n for n in nodes}
+        
+        def build_node_data(node):
+            data = {"id": node.get("id"), "type": node.get("type"), "label": node.get("label")}
+            if node.get("config"):
+                data["config"] = node.get("config")
+            if node.get("parent_id"):
+                data["inside"] = node.get("parent_id")
+            return data
+        
+        hierarchy = {}
+        for node in nodes:
+            if not node.get("parent_id"):
+                if node.get("id") not in hierarchy:
+                    hierarchy[node.get("id")] = {"node": build_node_data(node), "children": []}
+            else:
+                parent_id = node.get("parent_id")
+                if parent_id not in hierarchy:
+                    parent = nodes_by_id.get(parent_id)
+                    if parent:
+                        hierarchy[parent_id] = {"node": build_node_data(parent), "children": []}
+                if parent_id in hierarchy:
+                    hierarchy[parent_id]["children"].append(build_node_data(node))
+        
+        diagram_data = {
+            "architecture_hierarchy": [{**h["node"], "contains": h["children"] if h["children"] else None} for h in hierarchy.values()],
+            "all_nodes": [build_node_data(n) for n in nodes],
+            "connections": [{"from": c.get("source"), "to": c.get("target")} for c in connections]
+        }
+        
+        # Fetch AWS knowledge for validation context
+        puzzle_brief = request.get("puzzle_brief", "Build the architecture")
+        knowledge_context = await fetch_knowledge_for_generation(
+            cert_code=persona_id,
+            topic=f"AWS architecture best practices {puzzle_brief[:100]}",
+            limit=3,
+            api_key=request.get("openai_api_key")
+        )
+        
+        system_prompt = ARCHITECT_ARENA_AUDIT_PROMPT_ENHANCED.format(
+            puzzle_title=request.get("puzzle_title", "Architecture Puzzle"),
+            puzzle_brief=puzzle_brief,
+            expected_hierarchy=json.dumps(request.get("expected_hierarchy", {}), indent=2),
+            expected_connections=json.dumps(request.get("expected_connections", []), indent=2),
+            diagram_json=json.dumps(diagram_data, indent=2),
+            cert_name=cert_name,
+            focus_areas=", ".join(focus_areas[:3]),
+            user_level=user_level,
+            knowledge_context=knowledge_context,
+        )
+        
+        # Use get_async_openai() which checks: request context -> .env -> error
+        client = get_async_openai()
+        response = await client.chat.completions.create(
+            model=get_request_model() or "gpt-4o",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": "Evaluate this puzzle submission."}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.3,
+        )
+        
+        result = json.loads(response.choices[0].message.content)
+        
+        return {
+            "score": result.get("score", 0),
+            "correct": result.get("correct", []),
+            "missing": result.get("missing", []),
+            "suggestions": result.get("suggestions", []),
+            "feedback": result.get("feedback", ""),
+            "knowledge_refs": result.get("knowledge_refs", []),
+            "cert_specific_notes": result.get("cert_specific_notes", []),
+            "skill_level_guidance": result.get("skill_level_guidance", ""),
+        }
+    except Exception as e:
+        logger.error(f"Architect Arena audit error: {e}")
+        raise HTTPException(status_code=500, detail=f"Audit failed: {str(e)}")
+    finally:
+        set_request_api_key(None)
+        set_request_model(None)
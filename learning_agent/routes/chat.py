@@ -1,29 +1,123 @@
 """
 Chat API routes - RAG search and chat completion.
 """
-from fastapi import APIRouter
+import json
 
+from fastapi import APIRouter, HTTPException
+
+from agent_prompt import SYSTEM_PROMPT, TOOL_DESCRIPTIONS
+from config.openai_config import get_async_openai
+from config.settings import DEFAULT_MODEL, logger
+from crawl.context import get_context
+from crawl.utils import rerank_results
 from models.chat import ChatRequest
+from services.coaching import execute_tool
+from utils import search_documents, ApiKeyRequiredError
+import db
 
 router = APIRouter()
 
 
 @router.get("/sources")
-async def get_available_sources(tenant_id: str = None):
-    """Get available sources for RAG"""
-    from crawl4ai_mcp import get_available_sources as original_endpoint
-    return await original_endpoint(tenant_id)
+async def get_available_sources(tenant_id: str = None) -> str:
+    """Get list of available sources for RAG queries."""
+    try:
+        sources = await db.get_available_sources(tenant_id)
+        return json.dumps({"success": True, "sources": sources}, indent=2)
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)}, indent=2)
 
 
 @router.post("/search")
-async def perform_rag_query(query: str, source: str = None, match_count: int = 5):
-    """Perform RAG query"""
-    from crawl4ai_mcp import perform_rag_query as original_endpoint
-    return await original_endpoint(query, source, match_count)
+async def perform_rag_query(query: str, source: str = None, match_count: int = 5) -> str:
+    """Perform RAG query against stored documents."""
+    try:
+        ctx = await get_context()
+        
+        # Search documents
+        results = await search_documents(query, source_id=source, match_count=match_count * 2)
+        
+        # Rerank if model available
+        if ctx.reranking_model and results:
+            results = rerank_results(ctx.reranking_model, query, results)
+        
+        # Limit to requested count
+        results = results[:match_count]
+        
+        return json.dumps({
+            "success": True,
+            "query": query,
+            "results": results,
+            "count": len(results),
+        }, indent=2)
+        
+    except Exception as e:
+        return json.dumps({"success": False, "error": str(e)}, indent=2)
 
 
 @router.post("/chat")
 async def chat(request: ChatRequest):
-    """Chat completion with RAG"""
-    from crawl4ai_mcp import chat as original_endpoint
-    return await original_endpoint(request)
+    """Chat with the RAG agent."""
+    from utils import set_request_api_key, set_request_model, get_request_model
+    
+    try:
+        # Set request context if BYOK provided
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        # Use get_async_openai() which checks: request context -> .env -> error
+        client = get_async_openai()
+        model = get_request_model() or DEFAULT_MODEL
+        
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        
+        if request.conversation_history:
+            messages.extend(request.conversation_history)
+        
+        messages.append({"role": "user", "content": request.message})
+        
+        # First call - may request tools
+        response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            tools=TOOL_DESCRIPTIONS,
+            tool_choice="auto",
+        )
+        
+        assistant_message = response.choices[0].message
+        
+        # Handle tool calls
+        if assistant_message.tool_calls:
+            messages.append(assistant_message)
+            
+            for tool_call in assistant_message.tool_calls:
+                tool_name = tool_call.function.name
+                tool_args = json.loads(tool_call.function.arguments)
+                
+                tool_result = await execute_tool(tool_name, tool_args)
+                
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "content": tool_result,
+                })
+            
+            # Second call with tool results
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+            )
+            assistant_message = response.choices[0].message
+        
+        return {
+            "response": assistant_message.content,
+            "model": model,
+        }
+        
+    except ApiKeyRequiredError:
+        raise
+    except Exception as e:
+        logger.error(f"Chat error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
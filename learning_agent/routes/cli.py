@@ -0,0 +1,288 @@
+"""
+CLI API Routes
+===============
+AWS CLI simulator sessions (/api/learning/cli-*) and CLI objectives
+(/api/cli-objectives/*).
+"""
+from fastapi import APIRouter, HTTPException
+
+from config.settings import logger
+from models.cli import (
+    CLISimulatorRequest,
+    CLIHelpRequest,
+    CLIValidateRequest,
+    CLIObjectivesGenerateRequest,
+    CLICommandValidateRequest,
+)
+from redis_sessions import get_cli_session, save_cli_session, delete_cli_session
+
+router = APIRouter()
+
+
+@router.post("/learning/cli-simulate")
+async def cli_simulate_endpoint(request: CLISimulatorRequest):
+    """
+    Simulate an AWS CLI command in a sandboxed environment.
+    Returns realistic AWS CLI output with teaching content.
+    """
+    from generators.cli_simulator import simulate_cli_command, create_session, CLISession, CERT_CODE_TO_PERSONA
+    
+    try:
+        # Set request-scoped API key and model if provided (BYOK)
+        from utils import set_request_api_key, set_request_model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        # Get or create session
+        session_id = request.session_id
+        if session_id:
+            session_data = await get_cli_session(session_id)
+            if session_data:
+                session = CLISession(**session_data)
+            else:
+                session = create_session(
+                    challenge_id=request.challenge_context.get("id") if request.challenge_context else None
+                )
+                session_id = session.session_id
+        else:
+            session = create_session(
+                challenge_id=request.challenge_context.get("id") if request.challenge_context else None
+            )
+            session_id = session.session_id
+        
+        # Normalize cert_code: Convert database format (SAA, SAA-C03) to persona ID (solutions-architect-associate)
+        cert_code = request.cert_code
+        if cert_code and cert_code in CERT_CODE_TO_PERSONA:
+            cert_code = CERT_CODE_TO_PERSONA[cert_code]
+        
+        # Simulate the command
+        result = await simulate_cli_command(
+            command=request.command,
+            session=session,
+            challenge_context=request.challenge_context,
+            user_level=request.user_level,
+            cert_code=cert_code,
+            company_name=request.company_name,
+            industry=request.industry,
+            business_context=request.business_context,
+            objectives=request.objectives,
+            api_key=request.openai_api_key,
+            model=request.preferred_model,
+        )
+        
+        # Save session state to Redis
+        await save_cli_session(session_id, session.model_dump())
+        
+        return {
+            "success": True,
+            "session_id": session_id,
+            "command": result.command,
+            "output": result.output,
+            "exit_code": result.exit_code,
+            "explanation": result.explanation,
+            "next_steps": result.next_steps,
+            "is_dangerous": result.is_dangerous,
+            "warning": result.warning,
+            # Validation and progress fields
+            "is_correct_for_challenge": result.is_correct_for_challenge,
+            "objective_id": result.objective_id,
+            "objective_completed": result.objective_completed,
+            "points_earned": result.points_earned,
+            "aws_service": result.aws_service,
+            "command_type": result.command_type,
+            # Session progress
+            "session_progress": {
+                "total_commands": session.total_commands,
+                "correct_commands": session.correct_commands,
+                "current_streak": session.current_streak,
+                "best_streak": session.best_streak,
+                "objectives_completed": session.objectives_completed,
+                "total_points": session.points_earned,
+            }
+        }
+    except Exception as e:
+        logger.error(f"CLI simulate error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        from utils import set_request_api_key, set_request_model
+        set_request_api_key(None)
+        set_request_model(None)
+
+
+@router.post("/learning/cli-help")
+async def cli_help_endpoint(request: CLIHelpRequest):
+    """Get contextual CLI help for a topic."""
+    from generators.cli_simulator import get_cli_help
+    
+    try:
+        from utils import set_request_api_key, set_request_model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        result = await get_cli_help(
+            topic=request.topic,
+            user_level=request.user_level,
+            cert_code=request.cert_code,
+            challenge_context=request.challenge_context,
+            api_key=request.openai_api_key,
+            model=request.preferred_model,
+        )
+        
+        return {"success": True, **result}
+    except Exception as e:
+        logger.error(f"CLI help error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        from utils import set_request_api_key, set_request_model
+        set_request_api_key(None)
+        set_request_model(None)
+
+
+@router.delete("/learning/cli-session/{session_id}")
+async def cli_session_delete(session_id: str):
+    """Delete CLI session"""
+    deleted = await delete_cli_session(session_id)
+    if deleted:
+        return {"success": True}
+    return {"success": False, "message": "Session not found"}
+
+
+@router.get("/learning/cli-session/{session_id}/stats")
+async def cli_session_stats(session_id: str):
+    """Get CLI session stats"""
+    from generators.cli_simulator import CLISession, get_session_stats
+    session_data = await get_cli_session(session_id)
+    if not session_data:
+        raise HTTPException(status_code=404, detail="Session not found")
+    session = CLISession(**session_data)
+    stats = get_session_stats(session)
+    return {"success": True, **stats}
+
+
+@router.post("/learning/cli-validate")
+async def cli_validate_endpoint(request: CLIValidateRequest):
+    """Validate CLI challenge"""
+    from generators.cli_simulator import CLISession, validate_cli_challenge
+    
+    session_data = await get_cli_session(request.session_id)
+    if not session_data:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    try:
+        from utils import set_request_api_key, set_request_model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        session = CLISession(**session_data)
+        result = await validate_cli_challenge(session=session, challenge_context=request.challenge_context)
+        
+        return {
+            "success": True, "is_complete": result.is_complete, "score": result.score,
+            "objectives_met": result.objectives_met, "objectives_missing": result.objectives_missing,
+            "feedback": result.feedback, "suggestions": result.suggestions,
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        from utils import set_request_api_key, set_request_model
+        set_request_api_key(None)
+        set_request_model(None)
+
+
+@router.post("/cli-objectives/generate")
+async def generate_cli_objectives_endpoint(request: CLIObjectivesGenerateRequest):
+    """Generate CLI objectives for a challenge."""
+    try:
+        from utils import set_request_api_key, set_request_model
+        from generators.cli_objectives import generate_cli_objectives
+        
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        challenge = {
+            "id": request.challenge_id,
+            "title": request.challenge_title,
+            "description": request.challenge_description,
+            "success_criteria": request.success_criteria,
+            "aws_services_relevant": request.aws_services_relevant,
+        }
+        
+        result = await generate_cli_objectives(
+            challenge=challenge,
+            company_name=request.company_name,
+            industry=request.industry,
+            business_context=request.business_context,
+            diagram_data=request.diagram_data,
+            diagram_services=request.diagram_services,
+            user_level=request.user_level,
+            objective_count=request.objective_count,
+            model=request.preferred_model,
+        )
+        
+        return {
+            "success": True,
+            "challenge_id": result.challenge_id,
+            "challenge_title": result.challenge_title,
+            "context_message": result.context_message,
+            "objectives": [obj.model_dump() for obj in result.objectives],
+            "total_points": result.total_points,
+            "estimated_time_minutes": result.estimated_time_minutes,
+        }
+    except Exception as e:
+        logger.error(f"CLI objectives generation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate CLI objectives: {str(e)}")
+
+
+@router.post("/cli-objectives/validate")
+async def validate_cli_command_endpoint(request: CLICommandValidateRequest):
+    """Validate if a CLI command completes an objective."""
+    try:
+        from utils import set_request_api_key, set_request_model
+        from generators.cli_objectives import validate_cli_command, CLIObjective
+        
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        # Convert dict objectives to CLIObjective objects
+        objectives = [
+            CLIObjective(
+                id=obj.get("id", ""),
+                description=obj.get("description", ""),
+                command_pattern=obj.get("command_pattern", ""),
+                example_command=obj.get("example_command", ""),
+                hint=obj.get("hint"),
+                points=obj.get("points", 20),
+                service=obj.get("service", ""),
+                difficulty=obj.get("difficulty", "intermediate"),
+            )
+            for obj in request.objectives
+        ]
+        
+        result = await validate_cli_command(
+            command=request.command,
+            command_output=request.command_output,
+            objectives=objectives,
+            model=request.preferred_model,
+        )
+        
+        return {
+            "success": True,
+            "command": result.command,
+            "is_valid": result.is_valid,
+            "objective_id": result.objective_id,
+            "feedback": result.feedback,
+            "points_earned": result.points_earned,
+        }
+    except Exception as e:
+        logger.error(f"CLI validation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to validate CLI command: {str(e)}")
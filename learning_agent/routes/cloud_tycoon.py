@@ -8,13 +8,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 
-from generators.cloud_tycoon import (
-    generate_tycoon_journey,
-    validate_service_match,
-    TycoonJourney,
-    BusinessUseCase,
-    RequiredService,
-)
+from services.streaming import ItemCallback, stream_generation
 from utils import ApiKeyRequiredError
 
 router = APIRouter()
@@ -100,41 +94,55 @@ async def generate_journey(request: GenerateJourneyRequest):
     Each business has a use case requiring 2-5 AWS services.
     Player must match the correct services to earn contract money.
     """
+    return await _generate_journey(request)
+
+
+@router.post("/journey/generate-stream")
+async def generate_journey_stream(request: GenerateJourneyRequest):
+    """Generate a journey, streaming each business over SSE as it is written"""
+    return stream_generation(lambda on_item: _generate_journey(request, on_item))
+
+
+def _business_response(biz) -> BusinessUseCaseResponse:
+    return BusinessUseCaseResponse(
+        id=biz.id,
+        business_name=biz.business_name,
+        industry=biz.industry,
+        icon=biz.icon,
+        use_case_title=biz.use_case_title,
+        use_case_description=biz.use_case_description,
+        required_services=[
+            RequiredServiceResponse(
+                service_id=svc.service_id,
+                service_name=svc.service_name,
+                category=svc.category,
+                reason=svc.reason,
+            )
+            for svc in biz.required_services
+        ],
+        contract_value=biz.contract_value,
+        difficulty=biz.difficulty,
+        hints=biz.hints,
+        compliance_requirements=biz.compliance_requirements,
+    )
+
+
+async def _generate_journey(request: GenerateJourneyRequest, on_item: Optional[ItemCallback] = None) -> JourneyResponse:
     try:
+        from generators.cloud_tycoon import generate_tycoon_journey
+
         journey = await generate_tycoon_journey(
             user_level=request.user_level,
             cert_code=request.cert_code,
             theme=request.theme,
+            on_item=(lambda key, biz: on_item(key, _business_response(biz))) if on_item else None,
         )
         
         return JourneyResponse(
             id=journey.id,
             journey_name=journey.journey_name,
             theme=journey.theme,
-            businesses=[
-                BusinessUseCaseResponse(
-                    id=biz.id,
-                    business_name=biz.business_name,
-                    industry=biz.industry,
-                    icon=biz.icon,
-                    use_case_title=biz.use_case_title,
-                    use_case_description=biz.use_case_description,
-                    required_services=[
-                        RequiredServiceResponse(
-                            service_id=svc.service_id,
-                            service_name=svc.service_name,
-                            category=svc.category,
-                            reason=svc.reason,
-                        )
-                        for svc in biz.required_services
-                    ],
-                    contract_value=biz.contract_value,
-                    difficulty=biz.difficulty,
-                    hints=biz.hints,
-                    compliance_requirements=biz.compliance_requirements,
-                )
-                for biz in journey.businesses
-            ],
+            businesses=[_business_response(biz) for biz in journey.businesses],
             total_contract_value=journey.total_contract_value,
             difficulty_distribution=journey.difficulty_distribution,
         )
@@ -152,6 +160,8 @@ async def validate_services(request: ServiceMatchRequest):
     Returns score, matched/missing/extra services, and contract earned.
     """
     try:
+        from generators.cloud_tycoon import validate_service_match, BusinessUseCase, RequiredService
+
         # Reconstruct the use case from request data
         use_case = BusinessUseCase(
             id=request.use_case_id,
@@ -5,6 +5,9 @@ from fastapi import APIRouter
 
 from models.config import UpdateAIConfigRequest, SetPersonaRequest
 from config.settings import AVAILABLE_MODELS
+from config.openai_config import _tenant_clients
+from prompts import AWS_PERSONAS, DEFAULT_PERSONA, get_persona_info
+import db
 
 router = APIRouter()
 
@@ -18,61 +21,129 @@ async def list_available_models():
 @router.get("/tenant/{tenant_id}/ai-config")
 async def get_tenant_ai_config_endpoint(tenant_id: str):
     """Get tenant AI config"""
-    from crawl4ai_mcp import get_tenant_ai_config_endpoint as original_endpoint
-    return await original_endpoint(tenant_id)
+    config = await db.get_tenant_ai_config(tenant_id)
+    if not config:
+        return {"success": False, "error": "Tenant not found"}
+    
+    if config.get("openai_api_key"):
+        key = config["openai_api_key"]
+        config["openai_api_key_masked"] = f"sk-...{key[-4:]}" if len(key) > 4 else "***"
+        config["has_custom_key"] = True
+        del config["openai_api_key"]
+    else:
+        config["has_custom_key"] = False
+    
+    return {"success": True, **config}
 
 
 @router.put("/tenant/{tenant_id}/ai-config")
 async def update_tenant_ai_config_endpoint(tenant_id: str, request: UpdateAIConfigRequest):
     """Update tenant AI config"""
-    from crawl4ai_mcp import update_tenant_ai_config_endpoint as original_endpoint
-    return await original_endpoint(tenant_id, request)
+    if request.preferred_model and request.preferred_model not in AVAILABLE_MODELS:
+        return {"success": False, "error": f"Invalid model. Available: {list(AVAILABLE_MODELS.keys())}"}
+    
+    if request.openai_api_key and not request.openai_api_key.startswith("sk-"):
+        return {"success": False, "error": "Invalid API key format"}
+    
+    success = await db.update_tenant_ai_config(tenant_id=tenant_id, openai_api_key=request.openai_api_key, preferred_model=request.preferred_model)
+    
+    if success:
+        keys_to_remove = [k for k in _tenant_clients.keys() if k.startswith(f"{tenant_id}:")]
+        for k in keys_to_remove:
+            del _tenant_clients[k]
+        return {"success": True, "message": "AI configuration updated"}
+    
+    return {"success": False, "error": "Failed to update configuration"}
 
 
 @router.delete("/tenant/{tenant_id}/ai-config/key")
 async def remove_tenant_api_key(tenant_id: str):
     """Remove tenant API key"""
-    from crawl4ai_mcp import remove_tenant_api_key as original_endpoint
-    return await original_endpoint(tenant_id)
+    success = await db.update_tenant_ai_config(tenant_id=tenant_id, openai_api_key="")
+    if success:
+        keys_to_remove = [k for k in _tenant_clients.keys() if k.startswith(f"{tenant_id}:")]
+        for k in keys_to_remove:
+            del _tenant_clients[k]
+        return {"success": True}
+    return {"success": False, "error": "Failed to remove API key"}
 
 
 @router.get("/user/{user_id}/ai-config")
 async def get_user_ai_config_endpoint(user_id: str):
     """Get user AI config"""
-    from crawl4ai_mcp import get_user_ai_config_endpoint as original_endpoint
-    return await original_endpoint(user_id)
+    config = await db.get_user_ai_config(user_id)
+    if not config:
+        return {"success": False, "error": "User not found"}
+    
+    if config.get("openai_api_key"):
+        key = config["openai_api_key"]
+        config["openai_api_key_masked"] = f"sk-...{key[-4:]}" if len(key) > 4 else "***"
+        config["has_custom_key"] = True
+        del config["openai_api_key"]
+    else:
+        config["has_custom_key"] = False
+    
+    return {"success": True, **config}
 
 
 @router.put("/user/{user_id}/ai-config")
 async def update_user_ai_config_endpoint(user_id: str, request: UpdateAIConfigRequest):
     """Update user AI config"""
-    from crawl4ai_mcp import update_user_ai_config_endpoint as original_endpoint
-    return await original_endpoint(user_id, request)
+    if request.preferred_model and request.preferred_model not in AVAILABLE_MODELS:
+        return {"success": False, "error": "Invalid model"}
+    
+    if request.openai_api_key and not request.openai_api_key.startswith("sk-"):
+        return {"success": False, "error": "Invalid API key format"}
+    
+    success = await db.update_user_ai_config(user_id=user_id, openai_api_key=request.openai_api_key, preferred_model=request.preferred_model)
+    
+    if success:
+        keys_to_remove = [k for k in _tenant_clients.keys() if f":{user_id}:" in k]
+        for k in keys_to_remove:
+            del _tenant_clients[k]
+        return {"success": True}
+    
+    return {"success": False, "error": "Failed to update"}
 
 
 @router.get("/personas")
 async def list_personas():
-    """List available personas"""
-    from crawl4ai_mcp import list_personas as original_endpoint
-    return await original_endpoint()
+    """List personas"""
+    personas = [{"id": p["id"], "name": p["name"], "cert": p["cert"], "level": p["level"], "focus": p["focus"], "style": p["style"]} for p in AWS_PERSONAS.values()]
+    grouped = {
+        "foundational": [p for p in personas if p["level"] == "foundational"],
+        "associate": [p for p in personas if p["level"] == "associate"],
+        "professional": [p for p in personas if p["level"] == "professional"],
+        "specialty": [p for p in personas if p["level"] == "specialty"],
+    }
+    return {"personas": personas, "grouped": grouped, "default": DEFAULT_PERSONA, "count": len(personas)}
 
 
 @router.get("/personas/{persona_id}")
 async def get_persona(persona_id: str):
-    """Get persona details"""
-    from crawl4ai_mcp import get_persona as original_endpoint
-    return await original_endpoint(persona_id)
+    """Get persona"""
+    if persona_id not in AWS_PERSONAS:
+        return {"success": False, "error": f"Persona '{persona_id}' not found"}
+    return {"success": True, **get_persona_info(persona_id)}
 
 
 @router.put("/user/{user_id}/persona")
 async def set_user_persona(user_id: str, request: SetPersonaRequest):
     """Set user persona"""
-    from crawl4ai_mcp import set_user_persona as original_endpoint
-    return await original_endpoint(user_id, request)
+    if request.persona_id not in AWS_PERSONAS:
+        return {"success": False, "error": "Invalid persona"}
+    
+    success = await db.update_user_persona(user_id, request.persona_id)
+    if success:
+        persona = get_persona_info(request.persona_id)
+        return {"success": True, "message": f"Persona set to {persona['name']}", "persona": persona}
+    return {"success": False, "error": "Failed to update persona"}
 
 
 @router.get("/user/{user_id}/persona")
 async def get_user_persona(user_id: str):
     """Get user persona"""
-    from crawl4ai_mcp import get_user_persona as original_endpoint
-    return await original_endpoint(user_id)
+    persona_id = await db.get_user_persona(user_id)
+    if not persona_id:
+        persona_id = DEFAULT_PERSONA
+    return {"success": True, "persona_id": persona_id, **get_persona_info(persona_id)}
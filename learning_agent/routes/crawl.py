@@ -2,32 +2,30 @@
 Crawl API routes.
 """
 import json
-from typing import Dict, List, Any
-from fastapi import APIRouter, BackgroundTasks
+from typing import Any, Dict
 
-from crawl.context import get_context
-from crawl.jobs import create_crawl_job, get_crawl_job
-from crawl.utils import is_sitemap, is_txt, parse_sitemap, smart_chunk_markdown, extract_section_info
-from aws.neo4j_graph import extract_aws_services_to_neo4j
-from config.settings import DEFAULT_TENANT_ID, logger
+from fastapi import APIRouter
 
-from utils import (
-    add_documents_to_supabase as add_documents_to_db,
-    search_documents,
-    extract_code_blocks,
-    generate_code_example_summary,
-    add_code_examples_to_supabase as add_code_examples_to_db,
-    update_source_info,
-    extract_source_summary,
+from aws.neo4j_graph import extract_aws_services_to_neo4j
+from crawl.context import get_context
+from crawl.jobs import create_crawl_job, enqueue_crawl_job, get_crawl_job
+from crawl.utils import (
+    is_sitemap,
+    is_sitemap_index,
+    parse_sitemap,
+    parse_all_sitemaps_from_index,
+    smart_chunk_markdown,
+    extract_section_info,
 )
-
+from config.crawl_presets import get_all_presets
+from config.settings import DEFAULT_TENANT_ID, logger
+from utils import add_documents_to_db
 from redis_jobs import (
+    check_tenant_rate_limit,
     get_tenant_crawl_stats,
     list_tenant_jobs,
 )
 
-from crawl4ai import CrawlerRunConfig, CacheMode
-
 router = APIRouter()
 
 
@@ -35,53 +33,44 @@ router = APIRouter()
 async def crawl_single_page(url: str) -> str:
     """Crawl a single web page and store its content."""
     try:
+        from crawl4ai import CrawlerRunConfig, CacheMode
+
         ctx = await get_context()
         crawler = ctx.crawler
         
-        # Configure the crawl
         run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, stream=False)
-        
-        # Crawl the page
         result = await crawler.arun(url=url, config=run_config)
         
         if not result.success:
-            return json.dumps({
-                "success": False,
-                "url": url,
-                "error": result.error_message or "Failed to crawl page"
-            }, indent=2)
+            return json.dumps({"success": False, "url": url, "error": result.error_message or "Failed to crawl page"}, indent=2)
         
-        # Get the markdown content
         markdown = result.markdown
         if not markdown:
-            return json.dumps({
-                "success": False,
-                "url": url,
-                "error": "No content extracted from page"
-            }, indent=2)
+            return json.dumps({"success": False, "url": url, "error": "No content extracted from page"}, indent=2)
         
-        # Chunk the content
         chunks = smart_chunk_markdown(markdown)
         
-        # Add to database
-        documents = []
+        # Build separate lists for add_documents_to_db
+        urls = []
+        chunk_numbers = []
+        contents = []
+        metadatas = []
+        url_to_full_document = {url: markdown}
+        
         for i, chunk in enumerate(chunks):
             section_info = extract_section_info(chunk)
-            documents.append({
-                "url": url,
-                "chunk_number": i,
-                "content": chunk,
-                "metadata": {
-                    "title": result.metadata.get("title", ""),
-                    "headers": section_info["headers"],
-                    "char_count": section_info["char_count"],
-                    "word_count": section_info["word_count"],
-                }
+            urls.append(url)
+            chunk_numbers.append(i)
+            contents.append(chunk)
+            metadatas.append({
+                "title": result.metadata.get("title", ""),
+                "headers": section_info["headers"],
+                "char_count": section_info["char_count"],
+                "word_count": section_info["word_count"],
             })
         
-        await add_documents_to_db(documents)
+        await add_documents_to_db(urls, chunk_numbers, contents, metadatas, url_to_full_document)
         
-        # Extract AWS services to Neo4j if enabled
         neo4j_result = {"extracted": 0, "relationships": 0}
         if ctx.neo4j_driver:
             neo4j_result = await extract_aws_services_to_neo4j(
@@ -90,20 +79,66 @@ async def crawl_single_page(url: str) -> str:
                 neo4j_driver=ctx.neo4j_driver
             )
         
-        return json.dumps({
-            "success": True,
-            "url": url,
-            "chunks_stored": len(documents),
-            "aws_services": neo4j_result
-        }, indent=2)
+        return json.dumps({"success": True, "url": url, "chunks_stored": len(chunks), "aws_services": neo4j_result}, indent=2)
         
     except Exception as e:
         logger.error(f"Crawl single page error: {e}")
-        return json.dumps({
-            "success": False,
-            "url": url,
-            "error": str(e)
-        }, indent=2)
+        return json.dumps({"success": False, "url": url, "error": str(e)}, indent=2)
+
+
+@router.post("/smart")
+async def smart_crawl_url(
+    url: str,
+    tenant_id: str = None,
+    max_depth: int = 2,
+    max_concurrent: int = 5,
+    chunk_size: int = 5000,
+    preset: str = None,
+    max_urls: int = None,
+):
+    """
+    Smart crawl that handles sitemaps, sitemap indexes, URL lists, and recursive crawling.
+    
+    Args:
+        url: URL to crawl (can be a page, sitemap, sitemap index, or .txt file with URLs)
+        preset: Crawl preset name (architecture-only, core-services, learning-essentials, intermediate, comprehensive)
+        max_urls: Maximum number of URLs to crawl (overrides preset default)
+    
+    The job runs in a crawl worker (crawl/worker.py) with the tenant's configured
+    OpenAI key; poll /api/crawl/status/{job_id}.
+    """
+    tenant_id = tenant_id or DEFAULT_TENANT_ID
+    
+    # Check rate limit
+    rate_check = await check_tenant_rate_limit(tenant_id)
+    if not rate_check.get("allowed", True):
+        return {"success": False, "error": rate_check.get("reason", "Rate limit exceeded")}
+    
+    # Create job
+    job = await create_crawl_job(url, tenant_id, {
+        "max_depth": max_depth,
+        "max_concurrent": max_concurrent,
+        "chunk_size": chunk_size,
+        "preset": preset,
+        "max_urls": max_urls,
+    })
+    
+    if not job.get("success", True):
+        return job
+    
+    job_id = job["job"]["id"]
+    
+    # Hand off to the crawl workers
+    await enqueue_crawl_job(job_id)
+    
+    return {
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "message": f"Crawl job queued for {url}" + (f" with preset '{preset}'" if preset else ""),
+        "preset": preset,
+        "max_urls": max_urls,
+    }
 
 
 @router.get("/status/{job_id}")
@@ -130,12 +165,7 @@ async def list_crawl_jobs_endpoint(tenant_id: str = None) -> Dict[str, Any]:
     """List all crawl jobs for a tenant."""
     tenant_id = tenant_id or DEFAULT_TENANT_ID
     jobs = await list_tenant_jobs(tenant_id)
-    return {
-        "success": True,
-        "tenant_id": tenant_id,
-        "jobs": jobs,
-        "count": len(jobs),
-    }
+    return {"success": True, "tenant_id": tenant_id, "jobs": jobs, "count": len(jobs)}
 
 
 @router.get("/stats")
@@ -143,8 +173,77 @@ async def get_crawl_stats(tenant_id: str = None) -> Dict[str, Any]:
     """Get crawl statistics for a tenant."""
     tenant_id = tenant_id or DEFAULT_TENANT_ID
     stats = await get_tenant_crawl_stats(tenant_id)
+    return {"success": True, "tenant_id": tenant_id, **stats}
+
+
+@router.get("/presets")
+async def list_crawl_presets():
+    """List available crawl presets with their configurations."""
+    presets = get_all_presets()
     return {
         "success": True,
-        "tenant_id": tenant_id,
-        **stats,
+        "presets": {
+            name: {
+                "description": config["description"],
+                "max_urls": config["max_urls"],
+                "services_count": len(config.get("services", [])),
+                "include_patterns_count": len(config.get("include_patterns", [])),
+                "exclude_patterns_count": len(config.get("exclude_patterns", [])),
+            }
+            for name, config in presets.items()
+        },
+        "available_presets": list(presets.keys()),
     }
+
+
+@router.get("/extract-files")
+async def extract_files_from_sitemap(
+    sitemap_url: str = "https://docs.aws.amazon.com/sitemap_index.xml",
+    file_extension: str = ".zip",
+    max_sitemaps: int = None,
+):
+    """
+    Extract all files with a specific extension from AWS documentation sitemap.
+    
+    Args:
+        sitemap_url: URL of sitemap or sitemap index (default: AWS docs sitemap index)
+        file_extension: File extension to filter (default: .zip)
+        max_sitemaps: Maximum number of child sitemaps to parse from index (optional)
+        
+    Returns:
+        List of all URLs matching the file extension
+    """
+    try:
+        all_urls = []
+        
+        # Check if it's a sitemap index
+        if is_sitemap_index(sitemap_url):
+            logger.info(f"Parsing sitemap index: {sitemap_url}")
+            all_urls = parse_all_sitemaps_from_index(sitemap_url, max_sitemaps=max_sitemaps)
+        elif is_sitemap(sitemap_url):
+            logger.info(f"Parsing sitemap: {sitemap_url}")
+            all_urls = parse_sitemap(sitemap_url)
+        else:
+            return {
+                "success": False,
+                "error": "URL must be a sitemap or sitemap index"
+            }
+        
+        # Filter URLs by file extension
+        file_urls = [url for url in all_urls if url.endswith(file_extension)]
+        
+        return {
+            "success": True,
+            "sitemap_url": sitemap_url,
+            "file_extension": file_extension,
+            "total_urls_found": len(all_urls),
+            "file_urls_found": len(file_urls),
+            "files": file_urls,
+        }
+        
+    except Exception as e:
+        logger.error(f"Error extracting files from sitemap: {e}")
+        return {
+            "success": False,
+            "error": str(e)
+        }
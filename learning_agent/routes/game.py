@@ -8,13 +8,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 
-from generators.game_modes import (
-    generate_sniper_quiz_questions,
-    generate_speed_round_questions,
-    generate_hot_streak_questions,
-    GameQuestion,
-    HotStreakQuestions,
-)
+from models.learning import GenerateContentRequest
 from utils import ApiKeyRequiredError
 
 router = APIRouter()
@@ -58,7 +52,7 @@ class SniperQuizResponse(BaseModel):
     topics_covered: List[str]
 
 
-@router.post("/sniper-quiz/generate", response_model=SniperQuizResponse)
+@router.post("/game/sniper-quiz/generate", response_model=SniperQuizResponse)
 async def generate_sniper_quiz(request: SniperQuizRequest):
     """
     Generate personalized Sniper Quiz questions.
@@ -70,6 +64,8 @@ async def generate_sniper_quiz(request: SniperQuizRequest):
     - Recent study topics
     """
     try:
+        from generators.game_modes import generate_sniper_quiz_questions
+
         result = await generate_sniper_quiz_questions(
             user_level=request.user_level,
             cert_code=request.cert_code,
@@ -102,12 +98,14 @@ async def generate_sniper_quiz(request: SniperQuizRequest):
         raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
 
 
-@router.post("/speed-round/generate", response_model=SniperQuizResponse)
+@router.post("/game/speed-round/generate", response_model=SniperQuizResponse)
 async def generate_speed_round(request: SpeedRoundRequest):
     """
     Generate Speed Round questions - rapid-fire, shorter questions.
     """
     try:
+        from generators.game_modes import generate_speed_round_questions
+
         result = await generate_speed_round_questions(
             user_level=request.user_level,
             cert_code=request.cert_code,
@@ -166,13 +164,15 @@ class HotStreakResponse(BaseModel):
     topics_covered: List[str]
 
 
-@router.post("/hot-streak/generate", response_model=HotStreakResponse)
+@router.post("/game/hot-streak/generate", response_model=HotStreakResponse)
 async def generate_hot_streak(request: HotStreakRequest):
     """
     Generate Hot Streak questions - quick-fire questions for 60-second timed gameplay.
     Uses .env OPENAI_API_KEY by default, with optional BYOK fallback.
     """
     try:
+        from generators.game_modes import generate_hot_streak_questions
+
         result = await generate_hot_streak_questions(
             user_level=request.user_level,
             cert_code=request.cert_code,
@@ -203,3 +203,81 @@ async def generate_hot_streak(request: HotStreakRequest):
         raise HTTPException(status_code=402, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
+
+
+@router.post("/gaming/hot-streak/generate")
+async def generate_hot_streak_endpoint(request: GenerateContentRequest):
+    """Generate quick-fire questions for Hot Streak game mode."""
+    from generators.game_modes import generate_hot_streak_questions
+    
+    short_code = (request.certification_code or "SAA").upper()
+    question_count = request.options.get("question_count", 25) if request.options else 25
+    exclude_ids = request.options.get("exclude_ids", []) if request.options else []
+    
+    result = await generate_hot_streak_questions(
+        user_level=request.user_level or "intermediate",
+        cert_code=short_code,
+        question_count=question_count,
+        exclude_ids=exclude_ids,
+    )
+    
+    return {
+        "success": True,
+        "questions": [
+            {
+                "id": q.id,
+                "question": q.question,
+                "options": q.options,
+                "correct_index": q.correct_index,
+                "topic": q.topic,
+                "difficulty": q.difficulty,
+                "explanation": q.explanation,
+            }
+            for q in result.questions
+        ],
+        "topics_covered": result.topics_covered,
+        "certification": short_code,
+    }
+
+
+@router.post("/gaming/ticking-bomb/generate")
+async def generate_ticking_bomb_endpoint(request: GenerateContentRequest):
+    """Generate quick-fire questions for Ticking Bomb party game."""
+    from utils import set_request_api_key, set_request_model
+    from generators.game_modes import generate_ticking_bomb_questions
+    
+    try:
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        short_code = (request.certification_code or "SAA").upper()
+        question_count = request.options.get("question_count", 30) if request.options else 30
+        
+        result = await generate_ticking_bomb_questions(
+            user_level=request.user_level or "intermediate",
+            cert_code=short_code,
+            question_count=question_count,
+        )
+        
+        return {
+            "success": True,
+            "questions": [
+                {
+                    "id": q.id,
+                    "question": q.question,
+                    "options": q.options,
+                    "correct_index": q.correct_index,
+                    "topic": q.topic,
+                    "difficulty": q.difficulty,
+                    "explanation": q.explanation,
+                }
+                for q in result.questions
+            ],
+            "topics_covered": result.topics_covered,
+            "certification": short_code,
+        }
+    finally:
+        set_request_api_key(None)
+        set_request_model(None)
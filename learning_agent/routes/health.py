@@ -1,7 +1,10 @@
 """
-Health check endpoint.
+Health check and metrics endpoints.
 """
 from fastapi import APIRouter
+from fastapi.responses import Response
+
+import db
 
 router = APIRouter()
 
@@ -9,3 +12,10 @@ router = APIRouter()
 @router.get("/health")
 async def health():
     return {"status": "ok", "service": "crawl4ai-rag"}
+
+
+@router.get("/metrics")
+async def metrics():
+    """Prometheus metrics (database latency, rows, pool wait)."""
+    body, content_type = db.render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,8 +1,19 @@
 """
 Learning Journey API routes - tracking and reports.
 """
-from fastapi import APIRouter
+import json
 
+from fastapi import APIRouter, HTTPException
+
+from aws.journey_graph import (
+    track_learner_scenario_start,
+    track_challenge_completion,
+    track_flashcard_study,
+    track_quiz_attempt,
+    get_learner_journey,
+    get_recommended_next_steps,
+)
+from crawl.context import get_context
 from models.journey import (
     TrackScenarioRequest,
     TrackChallengeRequest,
@@ -10,6 +21,9 @@ from models.journey import (
     TrackQuizRequest,
     GenerateReportRequest,
 )
+from prompts import DEFAULT_PERSONA, get_persona_info
+from services.openai_service import async_chat_completion
+import db
 
 router = APIRouter()
 
@@ -17,61 +31,109 @@ router = APIRouter()
 @router.post("/track-scenario")
 async def track_scenario_start_endpoint(request: TrackScenarioRequest):
     """Track scenario start"""
-    from crawl4ai_mcp import track_scenario_start_endpoint as original_endpoint
-    return await original_endpoint(request)
+    ctx = await get_context()
+    return await track_learner_scenario_start(
+        neo4j_driver=ctx.neo4j_driver, profile_id=request.profile_id, tenant_id=request.tenant_id,
+        scenario_id=request.scenario_id, scenario_title=request.scenario_title,
+        company_name=request.company_name, difficulty=request.difficulty, aws_services=request.aws_services
+    )
 
 
 @router.post("/track-challenge")
 async def track_challenge_endpoint(request: TrackChallengeRequest):
     """Track challenge completion"""
-    from crawl4ai_mcp import track_challenge_endpoint as original_endpoint
-    return await original_endpoint(request)
+    ctx = await get_context()
+    return await track_challenge_completion(
+        neo4j_driver=ctx.neo4j_driver, profile_id=request.profile_id, tenant_id=request.tenant_id,
+        scenario_id=request.scenario_id, challenge_id=request.challenge_id,
+        challenge_title=request.challenge_title, score=request.score, passed=request.passed,
+        aws_services=request.aws_services
+    )
 
 
 @router.post("/track-flashcards")
 async def track_flashcard_endpoint(request: TrackFlashcardRequest):
     """Track flashcard study"""
-    from crawl4ai_mcp import track_flashcard_endpoint as original_endpoint
-    return await original_endpoint(request)
+    ctx = await get_context()
+    return await track_flashcard_study(
+        neo4j_driver=ctx.neo4j_driver, profile_id=request.profile_id, tenant_id=request.tenant_id,
+        deck_id=request.deck_id, deck_title=request.deck_title,
+        cards_studied=request.cards_studied, aws_services=request.aws_services
+    )
 
 
 @router.post("/track-quiz")
 async def track_quiz_endpoint(request: TrackQuizRequest):
     """Track quiz attempt"""
-    from crawl4ai_mcp import track_quiz_endpoint as original_endpoint
-    return await original_endpoint(request)
+    ctx = await get_context()
+    return await track_quiz_attempt(
+        neo4j_driver=ctx.neo4j_driver, profile_id=request.profile_id, tenant_id=request.tenant_id,
+        quiz_id=request.quiz_id, quiz_title=request.quiz_title,
+        score=request.score, passed=request.passed, aws_services=request.aws_services
+    )
 
 
 @router.get("/{profile_id}")
 async def get_journey_endpoint(profile_id: str, tenant_id: str):
     """Get learner journey"""
-    from crawl4ai_mcp import get_journey_endpoint as original_endpoint
-    return await original_endpoint(profile_id, tenant_id)
+    ctx = await get_context()
+    return await get_learner_journey(neo4j_driver=ctx.neo4j_driver, profile_id=profile_id, tenant_id=tenant_id)
 
 
 @router.get("/{profile_id}/recommendations")
 async def get_recommendations_endpoint(profile_id: str, tenant_id: str, limit: int = 5):
-    """Get learning recommendations"""
-    from crawl4ai_mcp import get_recommendations_endpoint as original_endpoint
-    return await original_endpoint(profile_id, tenant_id, limit)
+    """Get recommendations"""
+    ctx = await get_context()
+    return await get_recommended_next_steps(neo4j_driver=ctx.neo4j_driver, profile_id=profile_id, tenant_id=tenant_id, limit=limit)
 
 
 @router.post("/{profile_id}/report")
 async def generate_journey_report(profile_id: str, request: GenerateReportRequest):
     """Generate journey report"""
-    from crawl4ai_mcp import generate_journey_report as original_endpoint
-    return await original_endpoint(profile_id, request)
+    from utils import get_request_model
+    
+    snapshot = await db.get_learner_snapshot(profile_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    journey_data, analysis = snapshot["journey"], snapshot["analysis"]
+    persona_id = await db.get_user_persona(profile_id)
+    persona = get_persona_info(persona_id or DEFAULT_PERSONA)
+    
+    system_prompt = f"""Generate a {request.report_type} learning journey report.
+Learner: {journey_data['profile'].get('displayName', 'Learner')}
+Level: {journey_data['profile'].get('currentLevel', 1)}
+Points: {journey_data['profile'].get('totalPoints', 0)}
+Cert Track: {persona['cert']}
+Strengths: {json.dumps(analysis.get('strong_areas', []))}
+Weaknesses: {json.dumps(analysis.get('weak_areas', []))}
+
+Format in clean Markdown. Be specific and actionable."""
+
+    report_content = await async_chat_completion(
+        messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": f"Generate {request.report_type} report."}],
+        model=get_request_model(),
+    )
+    
+    report_id = await db.save_journey_report(
+        profile_id=profile_id, report_type=request.report_type, content=report_content,
+        summary=f"{request.report_type.title()} Report", metadata={"persona": persona_id}
+    )
+    
+    return {"success": True, "report_id": report_id, "report_type": request.report_type, "content": report_content}
 
 
 @router.get("/{profile_id}/reports")
 async def get_journey_reports_endpoint(profile_id: str, limit: int = 10):
     """Get journey reports"""
-    from crawl4ai_mcp import get_journey_reports_endpoint as original_endpoint
-    return await original_endpoint(profile_id, limit)
+    reports = await db.get_journey_reports(profile_id, limit)
+    return {"success": True, "reports": reports, "count": len(reports)}
 
 
 @router.get("/{profile_id}/data")
 async def get_journey_data_endpoint(profile_id: str):
     """Get journey data"""
-    from crawl4ai_mcp import get_journey_data_endpoint as original_endpoint
-    return await original_endpoint(profile_id)
+    snapshot = await db.get_learner_snapshot(profile_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {"success": True, "journey": snapshot["journey"], "analysis": snapshot["analysis"]}
@@ -1,14 +1,17 @@
 """
 Learning API routes - scenarios, chat, challenges, content generation.
 """
+import os
 import json
 import uuid
-import asyncio
-from typing import Dict, Any, Optional, List
+import random
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
+from openai import AsyncOpenAI
 
-from config.settings import logger, DEFAULT_TENANT_ID
+from config.openai_config import get_async_openai
+from config.settings import logger, DEFAULT_MODEL
 from models.learning import (
     LocationRequest,
     ResearchResult,
@@ -17,7 +20,6 @@ from models.learning import (
     LearningChatRequestWithSession,
     CloudScenario,
     StudyPlanRequest,
-    StudyGuideRequest,
     FormatStudyGuideRequest,
     GenerateFlashcardsFromCertRequest,
     DiagnosticsRequest,
@@ -25,16 +27,25 @@ from models.learning import (
 )
 from models.diagram import AuditDiagramRequest, AuditDiagramResponse
 from models.challenge import ChallengeQuestionsRequest, GradeChallengeAnswerRequest
-from models.cli import CLISimulatorRequest, CLIHelpRequest, CLIValidateRequest
-from services.research import research_company
-from services.web_search import search_web
+from models.portfolio import GeneratePortfolioRequest, GeneratePortfolioResponse
+from services.coaching import get_coaching_response
+from services.openai_service import async_chat_completion_json, detect_skill_level
+from services.research import research_company, research_company_events, knowledge_events, merge_events
+from services.streaming import ItemCallback, complete_json, stream_generation
 
 import db
-from prompts import CERTIFICATION_PERSONAS, SOLUTION_EVALUATOR_PROMPT, DEFAULT_PERSONA
-from generators import generate_study_plan, StudyPlanContext
-from generators.study_plan import generate_study_guide, StudyGuideContext
+from prompts import (
+    CERTIFICATION_PERSONAS,
+    SOLUTION_EVALUATOR_PROMPT,
+    DEFAULT_PERSONA,
+    PERSONA_FLASHCARD_PROMPT,
+    get_persona_context,
+)
 from utils import ApiKeyRequiredError
 
+# Diagram rule engine (shared/, put on sys.path by db)
+from shared.validation import DiagramGraph, RuleContext, validate_diagram
+
 # Map short cert codes (stored in DB) to full persona IDs (used in CERTIFICATION_PERSONAS)
 CERT_CODE_TO_PERSONA = {
     # Foundational
@@ -200,10 +211,9 @@ async def generate_scenario_stream_endpoint(request: LocationRequest):
     """Generate scenario with SSE streaming for real-time progress updates"""
 
     async def event_stream():
-        from utils import set_request_api_key, set_request_model, get_request_api_key
+        from utils import set_request_api_key, set_request_model
         from generators.scenario import generate_scenario as gen_scenario, CompanyInfo as GenCompanyInfo
         from prompts import CERTIFICATION_PERSONAS
-        from openai import AsyncOpenAI
 
         try:
             # Set request-scoped API key
@@ -214,96 +224,44 @@ async def generate_scenario_stream_endpoint(request: LocationRequest):
 
             # Step 1: Starting
             yield f"data: {json.dumps({'type': 'status', 'message': '🚀 Starting scenario generation...', 'step': 1, 'total_steps': 5})}\n\n"
-            await asyncio.sleep(0.1)
 
-            # Step 2: Research
+            # Step 2: Research - web searches, page crawls and the knowledge base
+            # run concurrently; events go out as each step completes
             yield f"data: {json.dumps({'type': 'status', 'message': f'🔍 Researching {request.company_name}...', 'step': 2, 'total_steps': 5})}\n\n"
 
-            # Perform web search
-            queries = [
-                f"{request.company_name} company overview business",
-                f"{request.company_name} technology infrastructure cloud",
-            ]
-            if request.industry:
-                queries.append(f"{request.company_name} {request.industry} industry")
-
-            all_sources = []
-            for query in queries:
-                yield f"data: {json.dumps({'type': 'search', 'message': f'🌐 Searching: {query}'})}\n\n"
-                results = await search_web(query, max_results=3)
-                for r in results:
-                    if r.get("url"):
-                        all_sources.append(r["url"])
-                        yield f"data: {json.dumps({'type': 'source', 'url': r['url'], 'title': r.get('title', 'Source')})}\n\n"
-                await asyncio.sleep(0.1)
-
-            # Step 3: Analyzing
-            yield f"data: {json.dumps({'type': 'status', 'message': '🧠 Analyzing company information...', 'step': 3, 'total_steps': 5})}\n\n"
-
-            research = await research_company(
-                company_name=request.company_name,
-                industry=request.industry
-            )
-
-            yield f"data: {json.dumps({'type': 'research', 'company': research.company_info.model_dump(), 'sources': list(set(all_sources))[:5]})}\n\n"
-
-            # Step 3.5: Search AWS knowledge base for relevant content
-            yield f"data: {json.dumps({'type': 'status', 'message': '📚 Searching AWS knowledge base...', 'step': 3, 'total_steps': 6})}\n\n"
+            skill_keywords = {
+                "beginner": "basics fundamentals getting started",
+                "intermediate": "best practices configuration",
+                "advanced": "optimization multi-region high availability",
+                "expert": "enterprise scale architecture patterns",
+            }
+            skill_context = skill_keywords.get(request.user_level, "best practices")
+
+            # Resolve short cert code to long persona ID
+            resolved_cert = _resolve_persona_id(request.cert_code) if request.cert_code else None
+
+            if resolved_cert and resolved_cert in CERTIFICATION_PERSONAS:
+                cert_focus = CERTIFICATION_PERSONAS[resolved_cert]["focus"]
+                selected_focus = random.sample(cert_focus, min(3, len(cert_focus)))
+                kb_query = f"{' '.join(selected_focus)} {skill_context} AWS {request.industry or ''}".strip()
+                focus_str = ", ".join(selected_focus)
+                yield f"data: {json.dumps({'type': 'status', 'message': f'🎲 Focus: {focus_str} ({request.user_level})'})}\n\n"
+            else:
+                kb_query = f"{request.industry or 'cloud'} {skill_context} AWS architecture"
 
+            research = None
             knowledge_context = ""
-            knowledge_topics = []
-            try:
-                import random as kb_random
-
-                skill_keywords = {
-                    "beginner": "basics fundamentals getting started",
-                    "intermediate": "best practices configuration",
-                    "advanced": "optimization multi-region high availability",
-                    "expert": "enterprise scale architecture patterns",
-                }
-                skill_context = skill_keywords.get(request.user_level, "best practices")
-
-                # Resolve short cert code to long persona ID
-                resolved_cert = _resolve_persona_id(request.cert_code) if request.cert_code else None
-                
-                if resolved_cert and resolved_cert in CERTIFICATION_PERSONAS:
-                    cert_focus = CERTIFICATION_PERSONAS[resolved_cert]["focus"]
-                    selected_focus = kb_random.sample(cert_focus, min(3, len(cert_focus)))
-                    kb_query = f"{' '.join(selected_focus)} {skill_context} AWS {research.company_info.industry}"
-                    focus_str = ", ".join(selected_focus)
-                    yield f"data: {json.dumps({'type': 'status', 'message': f'🎲 Focus: {focus_str} ({request.user_level})'})}\n\n"
-                else:
-                    kb_query = f"{research.company_info.industry} {skill_context} AWS architecture"
-
-                client = AsyncOpenAI(api_key=get_request_api_key())
-                embed_response = await client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=kb_query
-                )
-                query_embedding = embed_response.data[0].embedding
-
-                kb_results = await db.search_knowledge_chunks(
-                    query_embedding=query_embedding,
-                    limit=5
-                )
-
-                if kb_results:
-                    yield f"data: {json.dumps({'type': 'status', 'message': f'📖 Found {len(kb_results)} relevant AWS knowledge chunks'})}\n\n"
-                    for chunk in kb_results:
-                        yield f"data: {json.dumps({'type': 'knowledge', 'url': chunk['url'], 'similarity': round(chunk['similarity'], 2)})}\n\n"
-                        knowledge_context += f"\n\nAWS Knowledge ({chunk['url']}):\n{chunk['content'][:500]}"
-                        chunk_content = chunk['content'].lower()
-                        for svc in ['s3', 'ec2', 'lambda', 'rds', 'dynamodb', 'cloudwatch', 'iam', 'vpc', 'cloudfront', 'sns', 'sqs', 'kms', 'cloudtrail', 'config']:
-                            if svc in chunk_content and svc.upper() not in knowledge_topics:
-                                knowledge_topics.append(svc.upper())
-
-                    if knowledge_topics:
-                        knowledge_context += f"\n\n⚡ IMPORTANT: Base your challenge titles on these specific AWS topics found: {', '.join(knowledge_topics[:5])}. Create action-oriented titles like 'Secure the S3 Buckets' or 'Configure CloudWatch Alarms' - NOT generic titles like 'Understanding X'."
-                else:
-                    yield f"data: {json.dumps({'type': 'status', 'message': '📖 No specific knowledge chunks found, using general AWS knowledge'})}\n\n"
-            except Exception as kb_err:
-                logger.warning(f"Knowledge base search failed: {kb_err}")
-                yield f"data: {json.dumps({'type': 'status', 'message': '⚠️ Knowledge base search skipped'})}\n\n"
+            async for event in merge_events(
+                research_company_events(request.company_name, request.industry),
+                knowledge_events(kb_query),
+            ):
+                if event["type"] == "knowledge_context":
+                    knowledge_context = event["context"]
+                    continue
+                if event["type"] == "research":
+                    research = event.pop("result")
+                    yield f"data: {json.dumps({'type': 'status', 'message': '🧠 Company research complete', 'step': 3, 'total_steps': 5})}\n\n"
+                yield f"data: {json.dumps(event)}\n\n"
 
             # Step 4: Validate and resolve cert_code (required by generator)
             if not request.cert_code:
@@ -322,8 +280,6 @@ async def generate_scenario_stream_endpoint(request: LocationRequest):
                 yield f"data: {json.dumps({'type': 'error', 'message': f'Invalid cert_code: {request.cert_code}. Could not resolve to a valid certification.'})}\n\n"
                 return
 
-            await asyncio.sleep(0.1)
-
             # Step 5: Generating scenario
             yield f"data: {json.dumps({'type': 'status', 'message': '⚡ Generating challenges and learning objectives...', 'step': 5, 'total_steps': 5})}\n\n"
 
@@ -378,10 +334,59 @@ async def generate_scenario_stream_endpoint(request: LocationRequest):
 @router.post("/chat")
 async def learning_chat_endpoint(request: LearningChatRequestWithSession):
     """Interactive coaching chat with Sophia"""
-    # Import the full implementation from the original file for now
-    # This will be fully migrated in a future refactor
-    from crawl4ai_mcp import learning_chat_endpoint as original_endpoint
-    return await original_endpoint(request)
+    try:
+        from utils import set_request_api_key, set_request_model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        session_id = request.session_id
+        if not session_id:
+            session_id = str(uuid.uuid4())
+            try:
+                await db.create_coaching_session(session_id=session_id, scenario_id=request.scenario_id, user_id=request.user_id)
+            except Exception as db_err:
+                logger.warning(f"Failed to create session: {db_err}")
+        
+        scenario = None
+        if request.scenario_id:
+            scenario_data = await db.get_scenario(request.scenario_id)
+            if scenario_data:
+                scenario = CloudScenario(**scenario_data)
+        
+        try:
+            await db.save_coaching_message(session_id=session_id, role="user", content=request.message,
+                metadata={"challenge_id": request.challenge_id} if request.challenge_id else None)
+        except:
+            pass
+        
+        result = await get_coaching_response(
+            message=request.message, scenario=scenario,
+            challenge_id=request.challenge_id, context=request.context
+        )
+        
+        response_text = result.get("response", "") if isinstance(result, dict) else result
+        key_terms = result.get("key_terms", []) if isinstance(result, dict) else []
+        tools_used = result.get("tools_used", []) if isinstance(result, dict) else []
+        
+        try:
+            await db.save_coaching_message(session_id=session_id, role="assistant", content=response_text,
+                metadata={"tools_used": tools_used} if tools_used else None)
+        except:
+            pass
+        
+        return {
+            "response": response_text, "key_terms": key_terms, "tools_used": tools_used,
+            "session_id": session_id, "scenario_id": request.scenario_id, "challenge_id": request.challenge_id
+        }
+    except Exception as e:
+        logger.error(f"Learning chat error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        from utils import set_request_api_key, set_request_model
+        set_request_api_key(None)
+        set_request_model(None)
 
 
 @router.get("/chat/history/{session_id}")
@@ -396,77 +401,613 @@ async def get_chat_history(session_id: str, limit: int = 50):
 
 
 @router.post("/evaluate-solution")
-async def evaluate_solution_endpoint(
-    scenario_id: str,
-    challenge_id: str,
-    solution: Dict[str, Any]
-):
-    """Evaluate a user's solution to a challenge"""
-    from crawl4ai_mcp import evaluate_solution_endpoint as original_endpoint
-    return await original_endpoint(scenario_id, challenge_id, solution)
+async def evaluate_solution_endpoint(scenario_id: str, challenge_id: str, solution: Dict[str, Any]):
+    """Evaluate a user's solution"""
+    from utils import get_request_model
+    scenario = await db.get_scenario(scenario_id)
+    if not scenario:
+        raise HTTPException(status_code=404, detail="Scenario not found")
+    
+    challenge = next((c for c in scenario.get("challenges", []) if c["id"] == challenge_id), None)
+    if not challenge:
+        raise HTTPException(status_code=404, detail="Challenge not found")
+    
+    system_prompt = f"""{SOLUTION_EVALUATOR_PROMPT.format(
+        challenge_title=challenge["title"], challenge_description=challenge["description"],
+        success_criteria=", ".join(challenge.get("success_criteria", [])),
+        aws_services=", ".join(challenge.get("aws_services_relevant", [])),
+        solution=json.dumps(solution),
+    )}
+Return JSON with: score (0-100), passed (boolean), strengths (list), improvements (list), feedback (string)"""
+    
+    result = await async_chat_completion_json(
+        messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": "Evaluate this solution."}],
+        model=get_request_model(),
+    )
+    
+    return {"score": result.get("score", 0), "feedback": result.get("feedback", ""), "passed": result.get("passed", False),
+            "strengths": result.get("strengths", []), "improvements": result.get("improvements", [])}
+
+
+# ============================================
+# DIAGRAM AUDIT
+# ============================================
+
+DIAGRAM_AUDIT_PROMPT = """You are Sophia, an expert AWS Solutions Architect coaching a learner on their architecture diagram.
+
+## Challenge Context
+Title: {challenge_title}
+Brief: {challenge_brief}
+Expected AWS Services: {expected_services}
+
+**IMPORTANT**: Your audit MUST be based on the challenge brief above. Judge the diagram against what the brief is asking for, not against a generic "perfect" architecture.
+
+## User's Architecture Diagram
+```json
+{diagram_json}
+```
+
+## ⚠️ CRITICAL: SYSTEM SERVICE REGISTRY ⚠️
+The learner can ONLY use these services. This is the COMPLETE list of what exists in the system:
+{available_services_list}
+
+## ⚠️ CRITICAL: CONNECTION & PLACEMENT RULES ⚠️
+These are the VALID connection and placement rules from aws-placement-rules.ts (SINGLE SOURCE OF TRUTH):
+{service_rules}
+
+## AWS Service Scope Reference
+- **global**: IAM, Route 53, CloudFront - exist outside regions
+- **edge**: CloudFront, Global Accelerator, WAF - edge locations
+- **regional**: Most services - exist in a region but outside VPCs
+- **az**: Subnets, EBS - scoped to a single Availability Zone
+- **vpc**: EC2, RDS, ALB - require VPC placement
+
+## Valid Relationship Types (Edge Types)
+{edge_types}
+
+## Client-Side Audit Results (Already Validated)
+{local_audit}
+
+## ⚠️ CRITICAL: ISSUE SEVERITY CLASSIFICATION ⚠️
+
+### ERROR (severity: "error") — CAN fail the diagram
+Only these placement violations are hard failures:
+- Global/edge service inside VPC (CloudFront, Route53, IAM in VPC)
+- Regional service inside subnet (S3, DynamoDB in subnet)
+- VPC resource in wrong container (RDS in public subnet, EC2 in Security Group)
+- Non-container used as container (EC2 inside Security Group)
+
+### WARNING (severity: "warning") — NEVER fails, only suggests
+Architectural improvements that should NOT block completion:
+- Single NAT Gateway (HA suggestion)
+- Single-AZ database or cache (resilience suggestion)
+- Missing Auto Scaling (scalability suggestion)
+- ASG shown in one subnet (ASG logically spans subnets)
+
+### NOTE (severity: "note") — Informational only, NO penalty
+Diagram abstraction nuances that are ALLOWED:
+- IGW → ALB connection (visually implies IGW → VPC → ALB ENIs)
+- RDS primary → standby edge (replication is managed internally, but diagram shows intent)
+- CloudWatch → resource edges (monitoring relationship, not data flow)
+- PrivateLink at VPC level (ENIs are in subnets, but VPC-level abstraction is valid)
+
+## ⚠️ THE GOLDEN RULE ⚠️
+**Only placement ERRORS can invalidate a diagram.**
+**Connectivity and resilience issues can NEVER fail it — only suggest improvements.**
+
+If ASG exists AND multiple subnets exist → assume HA intent, do NOT penalize.
+If diagram shows logical relationships → accept the abstraction, add a note at most.
+
+## ⚠️ COMPLETION CRITERIA (75% = PASS) ⚠️
+**A diagram is COMPLETE when it meets the challenge brief requirements.**
+
+Scoring guide:
+- **75-100%**: PASSING - The diagram meets the challenge brief. Congratulate them!
+  - If score >= 75: Set "is_complete": true and celebrate their success
+  - Only mention minor optional improvements, don't invent new requirements
+- **50-74%**: CLOSE - Core components present but missing key elements for the brief
+- **0-49%**: NEEDS WORK - Significant gaps relative to the challenge brief
+
+**DO NOT keep finding issues once the challenge brief is satisfied.**
+If the diagram fulfills what the brief asked for with valid placements, give 75%+ and mark complete.
+Warnings and notes should NOT reduce the score below passing.
+
+## ⚠️ ABSOLUTE RULE: NEVER GIVE AWAY THE ANSWER ⚠️
+You are a COACH helping someone LEARN, not a cheat sheet giving answers.
+
+**REQUIRED - Always use these coaching patterns:**
+- ✅ Ask "What happens if...?" questions
+- ✅ Describe the PROBLEM or RISK, never the solution
+- ✅ Hint at concepts: "Think about high availability..." not "Add redundancy"
+- ✅ Point out placement/connection issues as learning opportunities
+
+## Response Format
+Return ONLY valid JSON:
+{{
+  "score": <0-100>,
+  "is_complete": <true if score >= 75 and challenge brief is satisfied>,
+  "correct": ["what they got right - valid placements, good connections, etc."],
+  "incorrect": ["ONLY severity:error issues - hard placement violations"],
+  "missing": ["warnings and notes - describe RISK not solution"],
+  "suggestions": ["discovery questions about architecture decisions"],
+  "feedback": "encouraging message - if complete, congratulate them!"
+}}"""
 
 
 @router.post("/audit-diagram", response_model=AuditDiagramResponse)
 async def audit_diagram_endpoint(request: AuditDiagramRequest):
     """Audit a user's AWS architecture diagram"""
-    from crawl4ai_mcp import audit_diagram_endpoint as original_endpoint
-    return await original_endpoint(request)
+    try:
+        from utils import set_request_api_key, set_request_model, get_request_model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        # Parse the diagram once: containment, adjacency and service buckets
+        graph = DiagramGraph.from_nodes(
+            [n.model_dump() for n in request.nodes],
+            [{"from": c.from_node, "to": c.to_node} for c in request.connections],
+        )
+        
+        def build_node_data(node_id):
+            node = graph.nodes[node_id]
+            data = {"id": node_id, "type": node["type"], "label": node.get("label")}
+            if node.get("config"):
+                data["config"] = node["config"]
+            if graph.parent[node_id]:
+                data["inside"] = graph.parent[node_id]
+            return data
+        
+        # Top-level nodes and every container, each with its direct children
+        hierarchy_ids = [n for n in graph.nodes if not graph.parent[n] or graph.children.get(n)]
+        diagram_data = {
+            "architecture_hierarchy": [
+                {**build_node_data(n), "contains": [build_node_data(c) for c in graph.children.get(n, [])] or None}
+                for n in hierarchy_ids
+            ],
+            "all_nodes": [build_node_data(n) for n in graph.nodes],
+            "connections": [{"from": s, "to": t} for s, t in graph.edges]
+        }
+        
+        # Deterministic rule engine over the same graph, using the client's placement rules
+        rule_context = RuleContext.from_available_services(
+            [s.model_dump() for s in request.available_services or []],
+            [e.model_dump() for group in (request.edge_types.attachment, request.edge_types.endpoint,
+                                          request.edge_types.data_flow) for e in group or []]
+            if request.edge_types else None,
+        )
+        engine_report = validate_diagram(graph, rule_context)
+        
+        # Build available services list for the prompt (compact format)
+        available_services_text = "Not specified - use your best judgment"
+        service_rules_text = "No rules specified"
+        edge_types_text = "No edge types specified"
+        local_audit_text = "No local audit provided"
+        
+        if request.available_services:
+            # Compact list of available service IDs and names with scope
+            available_services_text = ", ".join([
+                f"{s.id} ({s.name}, scope={s.scope or 'regional'})"
+                for s in request.available_services
+            ])
+            
+            # Detailed rules for services that have constraints
+            # Enhanced with scope, is_vpc_resource, and eni_info
+            rules_list = []
+            for s in request.available_services:
+                rules = []
+                if s.scope and s.scope != "regional":
+                    rules.append(f"scope: {s.scope}")
+                if s.is_vpc_resource:
+                    rules.append("is_vpc_resource: true")
+                if s.can_connect_to:
+                    rules.append(f"can_connect_to: [{', '.join(s.can_connect_to)}]")
+                if s.must_be_inside:
+                    rules.append(f"must_be_inside: [{', '.join(s.must_be_inside)}]")
+                if s.is_container:
+                    rules.append("is_container: true")
+                if s.eni_info:
+                    rules.append(f"creates_eni: {s.eni_info.eni_count} ({s.eni_info.description})")
+                if rules:
+                    rules_list.append(f"- {s.id}: {'; '.join(rules)}")
+            
+            service_rules_text = "\n".join(rules_list) if rules_list else "No placement/connection constraints defined"
+        
+        # Include edge types if provided
+        if request.edge_types:
+            edge_list = []
+            if request.edge_types.attachment:
+                for e in request.edge_types.attachment:
+                    edge_list.append(f"- ATTACHMENT: {e.name} ({e.id}): {', '.join(e.valid_sources)} → {', '.join(e.valid_targets)}")
+            if request.edge_types.endpoint:
+                for e in request.edge_types.endpoint:
+                    edge_list.append(f"- ENDPOINT: {e.name} ({e.id}): {', '.join(e.valid_sources)} → {', '.join(e.valid_targets)}")
+            if request.edge_types.data_flow:
+                for e in request.edge_types.data_flow:
+                    edge_list.append(f"- DATA_FLOW: {e.name} ({e.id}): {', '.join(e.valid_sources)} → {', '.join(e.valid_targets)}")
+            edge_types_text = "\n".join(edge_list[:20]) if edge_list else "No edge types defined"  # Limit to 20 to avoid token overflow
+        
+        # Include local audit results if provided (already validated client-side)
+        if request.local_audit:
+            la = request.local_audit
+            local_audit_text = f"Score: {la.score}/{la.max_score}"
+            if la.placement_issues:
+                local_audit_text += f"\nPlacement Issues ({len(la.placement_issues)}):"
+                for issue in la.placement_issues[:5]:
+                    local_audit_text += f"\n  - {issue.service_id}: {issue.issue}"
+            if la.connection_issues:
+                local_audit_text += f"\nConnection Issues ({len(la.connection_issues)}):"
+                for issue in la.connection_issues[:5]:
+                    local_audit_text += f"\n  - {issue.source_id} → {issue.target_id}: {issue.issue}"
+            # Architecture checks (HA, VPC access, ...) the client audit doesn't cover
+            architecture_findings = [f for f in engine_report.findings if f.kind == "architecture"]
+            if architecture_findings:
+                local_audit_text += f"\nArchitecture Checks ({len(architecture_findings)}):"
+                for finding in architecture_findings[:5]:
+                    local_audit_text += f"\n  - [{finding.severity}] {finding.message}"
+        else:
+            # No client audit - fall back to the server-side rule engine
+            local_audit_text = "\n".join(
+                f"- [{f.severity}] {f.message}" for f in engine_report.findings[:15]
+            ) or "No issues found by the rule engine"
+        
+        system_prompt = DIAGRAM_AUDIT_PROMPT.format(
+            challenge_title=request.challenge_title or "AWS Architecture Challenge",
+            challenge_brief=request.challenge_brief or "Design a secure, scalable AWS architecture.",
+            expected_services=", ".join(request.expected_services) if request.expected_services else "Not specified",
+            diagram_json=json.dumps(diagram_data, indent=2),
+            available_services_list=available_services_text,
+            service_rules=service_rules_text,
+            edge_types=edge_types_text,
+            local_audit=local_audit_text,
+        )
+        
+        # Use get_async_openai() which checks: request context -> .env -> error
+        client = get_async_openai()
+        response = await client.chat.completions.create(
+            model=get_request_model() or "gpt-4o",
+            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": "Audit this diagram."}],
+            response_format={"type": "json_object"}, temperature=0.3,
+        )
+        
+        result = json.loads(response.choices[0].message.content)
+        score = result.get("score", 50)
+        
+        # Include local audit data in response if available
+        max_score = 100
+        placement_issues = []
+        connection_issues = []
+        is_valid = True
+        
+        if request.local_audit:
+            max_score = request.local_audit.max_score
+            placement_issues = request.local_audit.placement_issues or []
+            connection_issues = request.local_audit.connection_issues or []
+            # GOLDEN RULE: Only severity="error" issues can invalidate a diagram
+            # Warnings and notes should NEVER fail the diagram
+            error_placements = [p for p in placement_issues if getattr(p, 'severity', 'error') == 'error']
+            error_connections = [c for c in connection_issues if getattr(c, 'severity', 'warning') == 'error']
+            is_valid = len(error_placements) == 0 and len(error_connections) == 0
+        else:
+            placement_issues = engine_report.placement_issues(graph)
+            connection_issues = engine_report.connection_issues()
+            is_valid = not engine_report.has_errors
+        
+        return AuditDiagramResponse(
+            score=score,
+            max_score=max_score,
+            is_complete=result.get("is_complete", score >= 75),
+            is_valid=is_valid,
+            correct=result.get("correct", []),
+            incorrect=result.get("incorrect", []),
+            missing=result.get("missing", []), 
+            suggestions=result.get("suggestions", []),
+            placement_issues=placement_issues,
+            connection_issues=connection_issues,
+            feedback=result.get("feedback", ""), 
+            session_id=request.session_id,
+        )
+    except Exception as e:
+        logger.error(f"Diagram audit error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        from utils import set_request_api_key, set_request_model
+        set_request_api_key(None)
+        set_request_model(None)
 
 
 @router.post("/challenge-questions")
 async def generate_challenge_questions_endpoint(request: ChallengeQuestionsRequest):
-    """Generate challenge questions"""
-    from crawl4ai_mcp import generate_challenge_questions_endpoint as original_endpoint
-    return await original_endpoint(request)
+    """Generate questions for a challenge"""
+    try:
+        from utils import set_request_api_key, set_request_model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        # Resolve short cert code (e.g., "CLF") to long persona ID (e.g., "cloud-practitioner")
+        resolved_cert_code = _resolve_persona_id(request.cert_code) if request.cert_code else None
+        if not resolved_cert_code or resolved_cert_code not in CERTIFICATION_PERSONAS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid cert_code: {request.cert_code}. Could not resolve to a valid certification."
+            )
+        
+        from generators.challenge_questions import generate_challenge_questions
+
+        result = await generate_challenge_questions(
+            challenge=request.challenge, company_name=request.company_name,
+            industry=request.industry, business_context=request.business_context,
+            user_level=request.user_level, cert_code=resolved_cert_code,
+            question_count=request.question_count,
+        )
+        
+        return {
+            "success": True, "challenge_id": result.challenge_id, "challenge_title": result.challenge_title,
+            "brief": result.brief, "questions": [q.model_dump() for q in result.questions],
+            "total_points": result.total_points, "estimated_time_minutes": result.estimated_time_minutes,
+        }
+    except Exception as e:
+        logger.error(f"Challenge questions error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        from utils import set_request_api_key, set_request_model
+        set_request_api_key(None)
+        set_request_model(None)
 
 
 @router.post("/grade-challenge-answer")
 async def grade_challenge_answer_endpoint(request: GradeChallengeAnswerRequest):
     """Grade a challenge answer"""
-    from crawl4ai_mcp import grade_challenge_answer_endpoint as original_endpoint
-    return await original_endpoint(request)
-
-
-@router.post("/cli-simulate")
-async def cli_simulate_endpoint(request: CLISimulatorRequest):
-    """Simulate CLI command"""
-    from crawl4ai_mcp import cli_simulate_endpoint as original_endpoint
-    return await original_endpoint(request)
-
-
-@router.post("/cli-help")
-async def cli_help_endpoint(request: CLIHelpRequest):
-    """Get CLI help"""
-    from crawl4ai_mcp import cli_help_endpoint as original_endpoint
-    return await original_endpoint(request)
-
+    from generators.challenge_questions import ChallengeQuestion, QuestionOption, grade_challenge_answer
+    
+    try:
+        from utils import set_request_api_key, set_request_model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        q = request.question
+        options = [QuestionOption(**o) for o in q["options"]] if q.get("options") else None
+        
+        question = ChallengeQuestion(
+            id=q.get("id", ""), question=q.get("question", ""),
+            question_type=q.get("question_type", "multiple_choice"), options=options,
+            correct_answer=q.get("correct_answer", ""), explanation=q.get("explanation", ""),
+            hint=q.get("hint"), points=q.get("points", 20),
+            aws_services=q.get("aws_services", []), difficulty=q.get("difficulty", "intermediate"),
+        )
+        
+        result = await grade_challenge_answer(
+            question=question, user_answer=request.user_answer,
+            company_context=request.company_context, user_level=request.user_level,
+        )
+        
+        return {"success": True, **result}
+    except Exception as e:
+        logger.error(f"Grade answer error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        from utils import set_request_api_key, set_request_model
+        set_request_api_key(None)
+        set_request_model(None)
 
-@router.delete("/cli-session/{session_id}")
-async def cli_session_delete(session_id: str):
-    """Delete CLI session"""
-    from crawl4ai_mcp import cli_session_delete as original_endpoint
-    return await original_endpoint(session_id)
 
+@router.post("/generate-flashcards")
+async def generate_flashcards_endpoint(request: GenerateContentRequest):
+    """
+    Generate flashcards - supports two modes:
+    1. Scenario-based: Pass scenario_id to generate from a specific scenario
+    2. Certification-based: Pass certification_code to generate from user's target cert + telemetry
+    """
+    return await _generate_flashcards(request)
 
-@router.get("/cli-session/{session_id}/stats")
-async def cli_session_stats(session_id: str):
-    """Get CLI session stats"""
-    from crawl4ai_mcp import cli_session_stats as original_endpoint
-    return await original_endpoint(session_id)
 
+@router.post("/generate-flashcards-stream")
+async def generate_flashcards_stream_endpoint(request: GenerateContentRequest):
+    """Generate flashcards, streaming each card over SSE as it is written"""
+    return stream_generation(lambda on_item: _generate_flashcards(request, on_item))
 
-@router.post("/cli-validate")
-async def cli_validate_endpoint(request: CLIValidateRequest):
-    """Validate CLI challenge"""
-    from crawl4ai_mcp import cli_validate_endpoint as original_endpoint
-    return await original_endpoint(request)
 
+async def _generate_flashcards(request: GenerateContentRequest, on_item: Optional[ItemCallback] = None):
+    import random
+    
+    try:
+        from utils import set_request_api_key, set_request_model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        card_count = request.card_count or (request.options.get("card_count", 20) if request.options else 20)
+        user_level = request.user_level or "intermediate"
+        
+        # MODE 1: Scenario-based generation (legacy)
+        if request.scenario_id:
+            from generators.flashcards import (
+                format_flashcards,
+                FlashcardStructuredContent,
+                calculate_difficulty_distribution,
+                extract_facts_from_knowledge,
+                generate_flashcards,
+            )
+            
+            scenario = await db.get_scenario(request.scenario_id)
+            if not scenario:
+                raise HTTPException(status_code=404, detail="Scenario not found")
+            
+            persona_id = request.persona_id
+            if not persona_id and request.user_id:
+                persona_id = await db.get_user_persona(request.user_id)
+            if not persona_id:
+                persona_id = DEFAULT_PERSONA
+            
+            persona_ctx = get_persona_context(persona_id)
+            cert_name = persona_ctx.get("cert_name", "AWS Certification")
+            cert_level = persona_ctx.get("level", "associate")
+            
+            aws_services = set()
+            for c in scenario.get("challenges", []):
+                aws_services.update(c.get("aws_services_relevant", []))
+            aws_services_list = list(aws_services) if aws_services else ["EC2", "S3", "IAM", "VPC"]
+            
+            difficulty_dist = calculate_difficulty_distribution(user_level, cert_level, card_count)
+            
+            knowledge_facts = []
+            try:
+                search_query = f"{cert_name} {' '.join(aws_services_list[:5])} {scenario.get('scenario_title', '')}"
+                client = get_async_openai()
+                embed_response = await client.embeddings.create(model="text-embedding-3-small", input=search_query)
+                query_embedding = embed_response.data[0].embedding
+                kb_results = await db.search_knowledge_chunks(query_embedding=query_embedding, limit=10)
+                if kb_results:
+                    knowledge_facts = extract_facts_from_knowledge(kb_results, aws_services_list, max_facts=card_count + 5)
+            except Exception as kb_err:
+                logger.warning(f"Knowledge base search failed: {kb_err}")
+            
+            if knowledge_facts and len(knowledge_facts) >= card_count // 2:
+                structured_content = FlashcardStructuredContent(
+                    scenario_title=scenario["scenario_title"],
+                    business_context=scenario.get("business_context", ""),
+                    certification=cert_name,
+                    cert_level=cert_level,
+                    skill_level=user_level,
+                    aws_services=aws_services_list,
+                    knowledge_facts=knowledge_facts,
+                    card_count=card_count,
+                    difficulty_distribution=difficulty_dist,
+                )
+                deck = await format_flashcards(structured_content, on_item=on_item)
+            else:
+                deck = await generate_flashcards(
+                    scenario_title=scenario["scenario_title"],
+                    business_context=scenario.get("business_context", ""),
+                    aws_services=aws_services_list,
+                    user_level=user_level,
+                    card_count=card_count,
+                    challenges=scenario.get("challenges"),
+                    persona_context=persona_ctx,
+                    on_item=on_item,
+                )
+            
+            deck_id = await db.save_flashcard_deck(
+                deck_data=deck.model_dump(),
+                scenario_id=request.scenario_id,
+                deck_type="scenario",
+            )
+            return {"success": True, "deck_id": deck_id, "deck": deck.model_dump(), "generation_method": "scenario"}
+        
+        # MODE 2: Certification-based generation (uses telemetry)
+        else:
+            short_code = (request.certification_code or "SAA").upper()
+            persona_id = CERT_CODE_TO_PERSONA.get(short_code, "solutions-architect-associate")
+            
+            persona = CERTIFICATION_PERSONAS[persona_id]
+            cert_name = persona["cert"]
+            focus_areas = persona["focus"]
+            
+            # Difficulty distribution based on skill level
+            if user_level == "beginner":
+                difficulty_dist = {"easy": 0.5, "medium": 0.4, "hard": 0.1}
+            elif user_level == "advanced":
+                difficulty_dist = {"easy": 0.1, "medium": 0.4, "hard": 0.5}
+            else:
+                difficulty_dist = {"easy": 0.25, "medium": 0.5, "hard": 0.25}
+            
+            # Search knowledge base
+            knowledge_context = ""
+            try:
+                selected_focus = random.sample(focus_areas, min(3, len(focus_areas)))
+                search_query = f"{cert_name} {' '.join(selected_focus)} AWS best practices"
+                client = get_async_openai()
+                embed_response = await client.embeddings.create(model="text-embedding-3-small", input=search_query)
+                kb_results = await db.search_knowledge_chunks(query_embedding=embed_response.data[0].embedding, limit=8)
+                if kb_results:
+                    for chunk in kb_results[:5]:
+                        knowledge_context += f"\n\n{chunk['content'][:600]}"
+            except Exception as kb_err:
+                logger.warning(f"Knowledge base search failed: {kb_err}")
+            
+            # Build telemetry context
+            telemetry_context = ""
+            if request.telemetry:
+                t = request.telemetry
+                telemetry_context = f"""
+User Progress:
+- Skill Level: {t.get('skillLevel', 'intermediate')}
+- Challenges Completed: {t.get('challengesCompleted', 0)}
+- Scenarios Completed: {t.get('scenariosCompleted', 0)}
+- Total Points: {t.get('totalPoints', 0)}
+- Level: {t.get('level', 1)}
+"""
+            
+            # Get existing flashcard topics to avoid duplicates
+            existing_topics = []
+            try:
+                existing_topics = await db.get_existing_flashcard_topics(short_code, limit=30)
+            except Exception as e:
+                logger.warning(f"Could not get existing topics: {e}")
+            
+            # Build avoid list for prompt
+            avoid_context = ""
+            if existing_topics:
+                avoid_context = "\n\nAVOID these topics (already covered in previous decks):\n" + "\n".join(f"- {t[:80]}" for t in existing_topics[:20])
+            
+            # Use the existing PERSONA_FLASHCARD_PROMPT
+            base_prompt = PERSONA_FLASHCARD_PROMPT.format(
+                cert_name=cert_name,
+                scenario_title=f"{cert_name} Practice",
+                business_context="Certification exam preparation",
+                focus_areas=', '.join(selected_focus),
+                level=persona.get("level", "associate"),
+                card_count=card_count,
+            )
+            
+            client = get_async_openai()
+            model = request.preferred_model or "gpt-4o"
+            
+            prompt = f"""{base_prompt}
+{avoid_context}
+{telemetry_context}
 
-@router.post("/generate-flashcards")
-async def generate_flashcards_endpoint(request: GenerateContentRequest):
-    """Generate flashcards (legacy - scenario-based)"""
-    from crawl4ai_mcp import generate_flashcards_endpoint as original_endpoint
-    return await original_endpoint(request)
+Return JSON: {{"title": "...", "description": "...", "cards": [{{"front": "...", "back": "...", "difficulty": "easy|medium|hard", "tags": [...], "awsServices": [...]}}]}}"""
+
+            content = await complete_json(
+                client,
+                on_item,
+                ("cards",),
+                model=model,
+                messages=[
+                    {"role": "system", "content": "You are an AWS certification exam preparation expert. Return valid JSON only."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.7,
+            )
+            
+            deck_data = json.loads(content)
+            if not deck_data.get("title"):
+                deck_data["title"] = f"{cert_name} Flashcards"
+            if not deck_data.get("description"):
+                deck_data["description"] = f"AI-generated flashcards for {cert_name} certification"
+            
+            # Return deck data - Next.js will save via Prisma
+            return {
+                "success": True,
+                "deck": deck_data,
+                "certification": short_code,
+                "cert_name": cert_name,
+                "card_count": len(deck_data.get("cards", [])),
+                "generation_method": "certification",
+            }
+    
+    finally:
+        from utils import set_request_api_key, set_request_model
+        set_request_api_key(None)
+        set_request_model(None)
 
 
 @router.post("/generate-flashcards-from-cert")
@@ -481,6 +1022,16 @@ async def generate_flashcards_from_cert_endpoint(request: GenerateFlashcardsFrom
     4. Searches knowledge base for relevant AWS content
     5. AI generates flashcards based on cert focus areas
     """
+    return await _generate_flashcards_from_cert(request)
+
+
+@router.post("/generate-flashcards-from-cert-stream")
+async def generate_flashcards_from_cert_stream_endpoint(request: GenerateFlashcardsFromCertRequest):
+    """Generate flashcards from certification, streaming each card over SSE"""
+    return stream_generation(lambda on_item: _generate_flashcards_from_cert(request, on_item))
+
+
+async def _generate_flashcards_from_cert(request: GenerateFlashcardsFromCertRequest, on_item: Optional[ItemCallback] = None):
     from utils import set_request_api_key, set_request_model, get_request_api_key, ApiKeyRequiredError
     from openai import AsyncOpenAI
     
@@ -503,7 +1054,6 @@ async def generate_flashcards_from_cert_endpoint(request: GenerateFlashcardsFrom
         
         persona = CERTIFICATION_PERSONAS[cert_code]
         cert_name = persona["cert"]
-        cert_level = persona["level"]
         focus_areas = persona["focus"]
         
         # Build difficulty distribution based on skill level
@@ -595,7 +1145,10 @@ Return a JSON object with this structure:
 
 Return ONLY valid JSON, no markdown or explanation."""
 
-        response = await client.chat.completions.create(
+        content = await complete_json(
+            client,
+            on_item,
+            ("cards",),
             model=model,
             messages=[
                 {"role": "system", "content": "You are an AWS certification exam preparation expert. Generate high-quality flashcards that help learners prepare for AWS certification exams."},
@@ -606,7 +1159,7 @@ Return ONLY valid JSON, no markdown or explanation."""
         )
         
         import json
-        deck_data = json.loads(response.choices[0].message.content)
+        deck_data = json.loads(content)
         
         # Ensure title and description
         if not deck_data.get("title"):
@@ -634,16 +1187,101 @@ Return ONLY valid JSON, no markdown or explanation."""
 
 @router.post("/generate-notes")
 async def generate_notes_endpoint(request: GenerateContentRequest):
-    """Generate study notes"""
-    from crawl4ai_mcp import generate_notes_endpoint as original_endpoint
-    return await original_endpoint(request)
+    """Generate study notes from certification + telemetry + skill level."""
+    return await _generate_notes(request)
+
+
+@router.post("/generate-notes-stream")
+async def generate_notes_stream_endpoint(request: GenerateContentRequest):
+    """Generate study notes, streaming each section over SSE as it is written"""
+    return stream_generation(lambda on_item: _generate_notes(request, on_item))
+
+
+async def _generate_notes(request: GenerateContentRequest, on_item: Optional[ItemCallback] = None):
+    from utils import set_request_api_key, set_request_model
+    from generators.notes import generate_notes_for_certification
+    
+    try:
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        short_code = (request.certification_code or "SAA").upper()
+        persona_id = CERT_CODE_TO_PERSONA.get(short_code, "solutions-architect-associate")
+        persona = CERTIFICATION_PERSONAS[persona_id]
+        
+        notes_data = await generate_notes_for_certification(
+            cert_code=persona_id,
+            user_level=request.user_level or "intermediate",
+            telemetry=request.telemetry,
+            on_item=on_item,
+        )
+        
+        return {
+            "success": True,
+            "notes": notes_data,
+            "certification": short_code,
+            "cert_name": persona["cert"],
+        }
+    finally:
+        set_request_api_key(None)
+        set_request_model(None)
 
 
 @router.post("/generate-quiz")
 async def generate_quiz_endpoint(request: GenerateContentRequest):
-    """Generate quiz"""
-    from crawl4ai_mcp import generate_quiz_endpoint as original_endpoint
-    return await original_endpoint(request)
+    """Generate quiz from certification + telemetry + skill level."""
+    return await _generate_quiz(request)
+
+
+@router.post("/generate-quiz-stream")
+async def generate_quiz_stream_endpoint(request: GenerateContentRequest):
+    """Generate a quiz, streaming each question over SSE as it is written"""
+    return stream_generation(lambda on_item: _generate_quiz(request, on_item))
+
+
+async def _generate_quiz(request: GenerateContentRequest, on_item: Optional[ItemCallback] = None):
+    from utils import set_request_api_key, set_request_model
+    from generators.quiz import generate_quiz_for_certification
+    
+    try:
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        short_code = (request.certification_code or "SAA").upper()
+        persona_id = CERT_CODE_TO_PERSONA.get(short_code, "solutions-architect-associate")
+        persona = CERTIFICATION_PERSONAS[persona_id]
+        question_count = request.options.get("question_count", 10) if request.options else 10
+        
+        # Get existing questions to avoid duplicates
+        existing_questions = []
+        try:
+            existing_questions = await db.get_existing_quiz_questions(short_code, limit=30)
+        except Exception as e:
+            logger.warning(f"Could not get existing questions: {e}")
+        
+        quiz_data = await generate_quiz_for_certification(
+            cert_code=persona_id,
+            user_level=request.user_level or "intermediate",
+            question_count=question_count,
+            telemetry=request.telemetry,
+            existing_questions=existing_questions,
+            on_item=on_item,
+        )
+        
+        return {
+            "success": True,
+            "quiz": quiz_data,
+            "certification": short_code,
+            "cert_name": persona["cert"],
+            "question_count": len(quiz_data.get("questions", [])),
+        }
+    finally:
+        set_request_api_key(None)
+        set_request_model(None)
 
 
 @router.post("/generate-study-plan")
@@ -657,6 +1295,8 @@ async def generate_study_plan_endpoint(request: StudyPlanRequest):
         if request.preferred_model:
             set_request_model(request.preferred_model)
 
+        from generators.study_plan import generate_study_plan, StudyPlanContext
+
         telemetry_summary = request.telemetry_summary or "No telemetry available"
 
         context = StudyPlanContext(
@@ -692,6 +1332,16 @@ async def format_study_guide_endpoint(request: FormatStudyGuideRequest):
     The tool has already decided what content goes in the plan.
     The AI just formats it nicely with themes, descriptions, and accountability tips.
     """
+    return await _format_study_guide(request)
+
+
+@router.post("/format-study-guide-stream")
+async def format_study_guide_stream_endpoint(request: FormatStudyGuideRequest):
+    """Format a study guide, streaming each week and milestone over SSE"""
+    return stream_generation(lambda on_item: _format_study_guide(request, on_item))
+
+
+async def _format_study_guide(request: FormatStudyGuideRequest, on_item: Optional[ItemCallback] = None):
     try:
         from utils import set_request_api_key, set_request_model
 
@@ -714,6 +1364,7 @@ async def format_study_guide_endpoint(request: FormatStudyGuideRequest):
             progress_summary=getattr(request, 'progress_summary', ''),
             structured_content=request.structured_content,
             previous_plan_context=request.previous_plan_context,
+            on_item=on_item,
         )
         return {"success": True, "plan": plan}
     except ApiKeyRequiredError as key_err:
@@ -730,9 +1381,9 @@ async def format_study_guide_endpoint(request: FormatStudyGuideRequest):
 
 @router.post("/detect-skill")
 async def detect_skill_endpoint(message: str):
-    """Detect user skill level"""
-    from crawl4ai_mcp import detect_skill_endpoint as original_endpoint
-    return await original_endpoint(message)
+    """Detect skill level"""
+    level = await detect_skill_level(message)
+    return {"skill_level": level}
 
 
 @router.post("/generate-diagnostics")
@@ -747,6 +1398,16 @@ async def generate_diagnostics_endpoint(request: DiagnosticsRequest):
     - Learning patterns
     - Personalized recommendations
     """
+    return await _generate_diagnostics(request)
+
+
+@router.post("/generate-diagnostics-stream")
+async def generate_diagnostics_stream_endpoint(request: DiagnosticsRequest):
+    """Generate diagnostics, streaming each finding and recommendation over SSE"""
+    return stream_generation(lambda on_item: _generate_diagnostics(request, on_item))
+
+
+async def _generate_diagnostics(request: DiagnosticsRequest, on_item: Optional[ItemCallback] = None):
     try:
         from utils import set_request_api_key, set_request_model
         from generators.diagnostics import generate_diagnostics, DiagnosticsContext
@@ -790,7 +1451,7 @@ async def generate_diagnostics_endpoint(request: DiagnosticsRequest):
             recent_scenarios=request.recent_scenarios,
         )
         
-        result = await generate_diagnostics(context)
+        result = await generate_diagnostics(context, on_item=on_item)
         
         return {
             "success": True,
@@ -810,6 +1471,16 @@ async def generate_diagnostics_endpoint(request: DiagnosticsRequest):
 @router.post("/generate-cohort-program")
 async def generate_cohort_program_endpoint(request: CohortProgramRequest):
     """Generate a cohort learning program for tutors"""
+    return await _generate_cohort_program(request)
+
+
+@router.post("/generate-cohort-program-stream")
+async def generate_cohort_program_stream_endpoint(request: CohortProgramRequest):
+    """Generate a cohort program, streaming each week and milestone over SSE"""
+    return stream_generation(lambda on_item: _generate_cohort_program(request, on_item))
+
+
+async def _generate_cohort_program(request: CohortProgramRequest, on_item: Optional[ItemCallback] = None):
     try:
         from utils import set_request_api_key, set_request_model
         from generators.cohort_program import generate_cohort_program
@@ -867,6 +1538,7 @@ async def generate_cohort_program_endpoint(request: CohortProgramRequest):
             target_certification=request.target_certification,
             openai_api_key=request.openai_api_key,
             knowledge_context=knowledge_context if knowledge_context else None,
+            on_item=on_item,
         )
         
         return {
@@ -882,3 +1554,73 @@ async def generate_cohort_program_endpoint(request: CohortProgramRequest):
         from utils import set_request_api_key, set_request_model
         set_request_api_key(None)
         set_request_model(None)
+
+
+@router.post("/generate-portfolio", response_model=GeneratePortfolioResponse)
+async def generate_portfolio_endpoint(request: GeneratePortfolioRequest):
+    """
+    Generate AI-powered portfolio content from a completed challenge.
+    
+    Takes diagram data, CLI progress, and scenario context to generate:
+    - Professional title
+    - Solution summary
+    - Key architectural decisions
+    - Compliance achievements
+    - AWS services used
+    
+    The generated content can be saved to AcademyPortfolio table by the caller.
+    """
+    return await _generate_portfolio(request)
+
+
+@router.post("/generate-portfolio-stream")
+async def generate_portfolio_stream_endpoint(request: GeneratePortfolioRequest):
+    """Generate portfolio content, streaming decisions, highlights and slides over SSE"""
+    return stream_generation(lambda on_item: _generate_portfolio(request, on_item))
+
+
+async def _generate_portfolio(request: GeneratePortfolioRequest, on_item: Optional[ItemCallback] = None):
+    from utils import set_request_api_key, set_request_model
+    from generators.portfolio import generate_portfolio_content
+    
+    try:
+        # Set request-scoped API key and model
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        # Get OpenAI client (uses request context API key set above)
+        client = get_async_openai(request.openai_api_key)
+        
+        # Determine model to use
+        model = request.preferred_model or DEFAULT_MODEL
+        
+        # Generate portfolio content
+        content = await generate_portfolio_content(
+            request=request,
+            openai_client=client,
+            model=model,
+            on_item=on_item,
+        )
+        
+        logger.info(f"Generated portfolio content for profile {request.profileId}")
+        
+        return GeneratePortfolioResponse(
+            success=True,
+            portfolioId=None,  # Caller saves to DB and gets ID
+            content=content,
+            error=None
+        )
+        
+    except Exception as e:
+        logger.error(f"Portfolio generation failed: {e}")
+        return GeneratePortfolioResponse(
+            success=False,
+            portfolioId=None,
+            content=None,
+            error=str(e)
+        )
+    finally:
+        set_request_api_key(None)
+        set_request_model(None)
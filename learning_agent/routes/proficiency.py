@@ -0,0 +1,196 @@
+"""
+Proficiency Test API Routes
+============================
+Conversational proficiency test run after a challenge: start, chat, evaluate.
+"""
+from fastapi import APIRouter, HTTPException
+
+from config.settings import logger
+from models.proficiency import (
+    ProficiencyTestStartRequest,
+    ProficiencyTestChatRequest,
+    ProficiencyTestEvaluateRequest,
+)
+
+router = APIRouter()
+
+
+@router.post("/start")
+async def start_proficiency_test_endpoint(request: ProficiencyTestStartRequest):
+    """Start a proficiency test conversation."""
+    try:
+        from utils import set_request_api_key, set_request_model
+        from generators.proficiency_test import (
+            start_proficiency_test,
+            ProficiencyTestContext,
+        )
+        
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        # Build diagram audit if provided
+        diagram_audit = None
+        if request.diagram_audit:
+            from generators.proficiency_test import DiagramAuditResult
+            diagram_audit = DiagramAuditResult(
+                score=request.diagram_audit.get("score", 0),
+                correct=request.diagram_audit.get("correct", []),
+                missing=request.diagram_audit.get("missing", []),
+                suggestions=request.diagram_audit.get("suggestions", []),
+                feedback=request.diagram_audit.get("feedback", ""),
+            )
+        
+        context = ProficiencyTestContext(
+            challenge_id=request.challenge_id,
+            challenge_title=request.challenge_title,
+            challenge_description=request.challenge_description,
+            challenge_brief=request.challenge_brief,
+            success_criteria=request.success_criteria,
+            aws_services=request.aws_services,
+            diagram_data=request.diagram_data,
+            diagram_services=request.diagram_services or [],
+            diagram_audit=diagram_audit,
+            diagram_score=request.diagram_score,
+            question_answers=request.question_answers,
+            company_name=request.company_name,
+            industry=request.industry,
+            business_context=request.business_context,
+            user_level=request.user_level,
+            cert_code=request.cert_code,
+            previous_chat_history=request.previous_chat_history,
+        )
+        
+        result = await start_proficiency_test(context, model=request.preferred_model)
+        
+        return {
+            "success": True,
+            "test_id": result["test_id"],
+            "initial_message": result["initial_message"],
+            "context_summary": result["context_summary"],
+            "questions_asked": result["questions_asked"],
+        }
+    except Exception as e:
+        logger.error(f"Proficiency test start error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to start proficiency test: {str(e)}")
+
+
+@router.post("/chat")
+async def continue_proficiency_test_endpoint(request: ProficiencyTestChatRequest):
+    """Continue the proficiency test conversation."""
+    try:
+        from utils import set_request_api_key, set_request_model
+        from generators.proficiency_test import (
+            continue_proficiency_test,
+            ProficiencyTestContext,
+            ChatMessage,
+        )
+        
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        context = ProficiencyTestContext(
+            challenge_id=request.challenge_id,
+            challenge_title=request.challenge_title,
+            challenge_description=request.challenge_description,
+            challenge_brief=request.challenge_brief,
+            success_criteria=request.success_criteria,
+            aws_services=request.aws_services,
+            diagram_data=request.diagram_data,
+            diagram_services=request.diagram_services or [],
+            company_name=request.company_name,
+            industry=request.industry,
+            business_context=request.business_context,
+            user_level=request.user_level,
+        )
+        
+        # Convert chat history to ChatMessage objects
+        chat_history = [
+            ChatMessage(
+                role=msg.get("role", "user"),
+                content=msg.get("content", ""),
+                timestamp=msg.get("timestamp", ""),
+            )
+            for msg in request.chat_history
+        ]
+        
+        result = await continue_proficiency_test(
+            context=context,
+            chat_history=chat_history,
+            user_message=request.user_message,
+            questions_asked=request.questions_asked,
+            model=request.preferred_model,
+        )
+        
+        return {
+            "success": True,
+            "agent_response": result["agent_response"],
+            "questions_asked": result["questions_asked"],
+            "ready_to_evaluate": result["ready_to_evaluate"],
+        }
+    except Exception as e:
+        logger.error(f"Proficiency test chat error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to continue proficiency test: {str(e)}")
+
+
+@router.post("/evaluate")
+async def evaluate_proficiency_test_endpoint(request: ProficiencyTestEvaluateRequest):
+    """Evaluate the proficiency test and generate final score."""
+    try:
+        from utils import set_request_api_key, set_request_model
+        from generators.proficiency_test import (
+            evaluate_proficiency_test,
+            ProficiencyTestContext,
+            ChatMessage,
+        )
+        
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
+        context = ProficiencyTestContext(
+            challenge_id=request.challenge_id,
+            challenge_title=request.challenge_title,
+            challenge_description="",
+            challenge_brief="",
+            success_criteria=request.success_criteria,
+            aws_services=request.aws_services,
+            diagram_services=request.diagram_services or [],
+            company_name=request.company_name,
+            industry=request.industry,
+            business_context="",
+        )
+        
+        chat_history = [
+            ChatMessage(
+                role=msg.get("role", "user"),
+                content=msg.get("content", ""),
+                timestamp=msg.get("timestamp", ""),
+            )
+            for msg in request.chat_history
+        ]
+        
+        result = await evaluate_proficiency_test(
+            context=context,
+            chat_history=chat_history,
+            model=request.preferred_model,
+        )
+        
+        return {
+            "success": True,
+            "test_id": result.test_id,
+            "challenge_id": result.challenge_id,
+            "score": result.score,
+            "summary": result.summary,
+            "strengths": result.strengths,
+            "areas_for_improvement": result.areas_for_improvement,
+            "questions_asked": result.questions_asked,
+            "completed_at": result.completed_at,
+        }
+    except Exception as e:
+        logger.error(f"Proficiency test evaluation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to evaluate proficiency test: {str(e)}")
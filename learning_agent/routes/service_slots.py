@@ -8,14 +8,6 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 
-from generators.service_slots import (
-    generate_slot_challenge,
-    generate_slot_batch,
-    validate_slot_answer,
-    SlotChallenge,
-    SlotService,
-    AnswerOption,
-)
 from utils import ApiKeyRequiredError
 
 router = APIRouter()
@@ -104,6 +96,8 @@ async def generate_challenge(request: GenerateChallengeRequest):
     Player must identify what architecture pattern the services represent.
     """
     try:
+        from generators.service_slots import generate_slot_challenge
+
         challenge = await generate_slot_challenge(
             user_level=request.user_level,
             cert_code=request.cert_code,
@@ -148,6 +142,8 @@ async def generate_challenges_batch(request: GenerateBatchRequest):
     Useful for preloading the next few spins.
     """
     try:
+        from generators.service_slots import generate_slot_batch
+
         challenges = await generate_slot_batch(
             count=request.count,
             user_level=request.user_level,
@@ -198,6 +194,8 @@ async def validate_answer(request: ValidateAnswerRequest):
     If wrong: winnings = -bet_amount (they lose their bet)
     """
     try:
+        from generators.service_slots import validate_slot_answer, SlotChallenge, SlotService, AnswerOption
+
         # Reconstruct challenge from request
         challenge = SlotChallenge(
             id=request.challenge_id,
@@ -5,15 +5,10 @@ Endpoints for the Speed Deploy game mode.
 """
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional, Dict
-
-from generators.speed_deploy import (
-    generate_deploy_brief,
-    validate_deployment,
-    DeployBrief,
-    ClientRequirement,
-)
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+from config.settings import logger
 from utils import ApiKeyRequiredError
 
 router = APIRouter()
@@ -23,29 +18,20 @@ router = APIRouter()
 # REQUEST/RESPONSE MODELS
 # =============================================================================
 
-class GenerateBriefRequest(BaseModel):
-    """Request to generate a deployment brief"""
+class SpeedDeployGenerateRequest(BaseModel):
     user_level: str = "intermediate"
     cert_code: Optional[str] = None
-    difficulty: Optional[str] = None  # easy, medium, hard - random if not provided
     openai_api_key: Optional[str] = None
     preferred_model: Optional[str] = None
 
 
-class ValidateDeploymentRequest(BaseModel):
-    """Request to validate a player's deployment"""
-    brief_id: str
-    client_name: str
-    industry: str
-    requirements: List[Dict]
-    available_services: List[str]
-    optimal_solution: List[str]
-    acceptable_solutions: List[List[str]]
-    time_limit: int
-    user_level: str
-    max_score: int
+class SpeedDeployValidateRequest(BaseModel):
+    brief_id: str  # The brief is looked up server-side; its answer key never leaves the agent
     submitted_services: List[str]
-    time_remaining: int
+    time_remaining: int = Field(ge=0)
+    ai_feedback: bool = True  # Cert-specific feedback from the model (scoring is deterministic)
+    openai_api_key: Optional[str] = None
+    preferred_model: Optional[str] = None
 
 
 class RequirementResponse(BaseModel):
@@ -56,34 +42,42 @@ class RequirementResponse(BaseModel):
 
 
 class BriefResponse(BaseModel):
-    """Response for a generated brief"""
+    """Response for a generated brief (no answer key)"""
     id: str
     client_name: str
     industry: str
     icon: str
     requirements: List[RequirementResponse]
     available_services: List[str]
-    optimal_solution: List[str]
-    acceptable_solutions: List[List[str]]
     time_limit: int
     user_level: str
+    target_cert: str
     max_score: int
+    learning_point: str
 
 
 class ValidateResponse(BaseModel):
     """Response for deployment validation"""
-    met_requirements: bool
-    is_optimal: bool
-    is_acceptable: bool
+    grade: str
     score: int
     max_score: int
+    correctness_score: int
     speed_bonus: int
+    cost_efficiency_bonus: int
     overengineering_penalty: int
+    trap_penalty: int
+    missed_requirement_penalty: int
+    met_requirements: bool
+    is_optimal: bool
+    is_acceptable: bool
+    requirements_met: List[str]
+    requirements_missed: List[str]
+    trap_services_used: List[Dict]
     missing_services: List[str]
     extra_services: List[str]
     feedback: str
     optimal_solution: List[str]
-    requirement_analysis: List[Dict]
+    learning_point: str
 
 
 # =============================================================================
@@ -91,98 +85,110 @@ class ValidateResponse(BaseModel):
 # =============================================================================
 
 @router.post("/brief/generate", response_model=BriefResponse)
-async def generate_brief(request: GenerateBriefRequest):
+async def generate_brief(request: SpeedDeployGenerateRequest):
     """
     Generate a Speed Deploy challenge brief.
     
     Returns a client brief with requirements and a palette of services to choose from.
     """
     try:
+        from utils import set_request_api_key, set_request_model
+        from generators.speed_deploy import generate_deploy_brief
+        from services.deploy_briefs import save_brief
+        
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
+        
         brief = await generate_deploy_brief(
             user_level=request.user_level,
             cert_code=request.cert_code,
             api_key=request.openai_api_key,
             model=request.preferred_model,
         )
+        await save_brief(brief)
         
-        return BriefResponse(
-            id=brief.id,
-            client_name=brief.client_name,
-            industry=brief.industry,
-            icon=brief.icon,
-            requirements=[
-                RequirementResponse(
-                    category=req.category,
-                    description=req.description,
-                    priority=req.priority,
-                )
+        # The answer key stays server-side; /validate scores against the stored brief
+        return {
+            "id": brief.id,
+            "client_name": brief.client_name,
+            "industry": brief.industry,
+            "icon": brief.icon,
+            "requirements": [
+                {
+                    "category": req.category,
+                    "description": req.description,
+                    "priority": req.priority,
+                }
                 for req in brief.requirements
             ],
-            available_services=brief.available_services,
-            optimal_solution=brief.optimal_solution,
-            acceptable_solutions=brief.acceptable_solutions,
-            time_limit=brief.time_limit,
-            user_level=brief.user_level,
-            max_score=brief.max_score,
-        )
+            "available_services": brief.available_services,
+            "time_limit": brief.time_limit,
+            "user_level": brief.user_level,
+            "target_cert": brief.target_cert,
+            "max_score": brief.max_score,
+            "learning_point": brief.learning_point,
+        }
     except ApiKeyRequiredError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        logger.error(f"Speed Deploy brief generation error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate brief: {str(e)}")
 
 
 @router.post("/validate", response_model=ValidateResponse)
-async def validate_deploy(request: ValidateDeploymentRequest):
-    """
-    Validate the player's deployment against the brief requirements.
+async def validate_deploy(request: SpeedDeployValidateRequest):
+    """Score the player's deployment against the stored brief, with optional AI feedback."""
+    from services.deploy_briefs import get_scoring_table
+    
+    table = await get_scoring_table(request.brief_id)
+    if table is None:
+        raise HTTPException(status_code=404, detail="Brief not found or expired - generate a new one")
     
-    Returns score, feedback, and analysis of which requirements were met.
-    """
     try:
-        # Reconstruct brief from request
-        requirements = [
-            ClientRequirement(
-                category=req.get("category", "general"),
-                description=req.get("description", ""),
-                priority=req.get("priority", "important"),
-            )
-            for req in request.requirements
-        ]
+        from utils import set_request_api_key, set_request_model
+        from generators.speed_deploy import score_deployment, narrate_deployment
         
-        brief = DeployBrief(
-            id=request.brief_id,
-            client_name=request.client_name,
-            industry=request.industry,
-            icon="",
-            requirements=requirements,
-            available_services=request.available_services,
-            optimal_solution=request.optimal_solution,
-            acceptable_solutions=request.acceptable_solutions,
-            time_limit=request.time_limit,
-            user_level=request.user_level,
-            target_cert="",
-            max_score=request.max_score,
-        )
+        if request.openai_api_key:
+            set_request_api_key(request.openai_api_key)
+        if request.preferred_model:
+            set_request_model(request.preferred_model)
         
-        result = validate_deployment(
-            brief=brief,
-            submitted_services=request.submitted_services,
-            time_remaining=request.time_remaining,
-        )
+        # Deterministic: set and dict lookups against the precomputed table
+        result = score_deployment(table, request.submitted_services, request.time_remaining)
+        if request.ai_feedback:
+            result = await narrate_deployment(table, result, request.submitted_services, request.preferred_model)
         
-        return ValidateResponse(
-            met_requirements=result.met_requirements,
-            is_optimal=result.is_optimal,
-            is_acceptable=result.is_acceptable,
-            score=result.score,
-            max_score=result.max_score,
-            speed_bonus=result.speed_bonus,
-            overengineering_penalty=result.overengineering_penalty,
-            missing_services=result.missing_services,
-            extra_services=result.extra_services,
-            feedback=result.feedback,
-            optimal_solution=result.optimal_solution,
-            requirement_analysis=result.requirement_analysis,
-        )
+        return {
+            # Core result
+            "grade": result.grade,
+            "score": result.score,
+            "max_score": result.max_score,
+            
+            # Score breakdown
+            "correctness_score": result.correctness_score,
+            "speed_bonus": result.speed_bonus,
+            "cost_efficiency_bonus": result.cost_efficiency_bonus,
+            "overengineering_penalty": result.overengineering_penalty,
+            "trap_penalty": result.trap_penalty,
+            "missed_requirement_penalty": result.missed_requirement_penalty,
+            
+            # Analysis
+            "met_requirements": result.met_requirements,
+            "is_optimal": result.is_optimal,
+            "is_acceptable": result.is_acceptable,
+            "requirements_met": result.requirements_met,
+            "requirements_missed": result.requirements_missed,
+            "trap_services_used": result.trap_services_used,
+            "missing_services": result.missing_services,
+            "extra_services": result.extra_services,
+            
+            # Feedback
+            "feedback": result.feedback,
+            "optimal_solution": result.optimal_solution,
+            "learning_point": result.learning_point,
+        }
     except Exception as e:
+        logger.error(f"Speed Deploy validation error: {e}")
         raise HTTPException(status_code=500, detail=f"Validation failed: {str(e)}")
@@ -1,15 +1,25 @@
 """
 AWS Pricing Service
 ====================
-Fetches live pricing from AWS Price List API for architecture cost estimation.
+Estimates architecture costs from the offline price catalogue
+(services/pricing_catalog.py), without calling AWS.
+
+A diagram is priced in one pass: every node is expanded into usage line
+items (usage type x monthly quantity, from USAGE_MODELS and the node's
+config such as instance type or storage GB), quantities are summed per
+rate key, each key is priced once against its tiers, and the cost is
+shared back to the nodes. Rates come from the catalogue when it has been
+built, otherwise from SEED_RATES (us-east-1 on-demand list prices), and
+services without a usage model fall back to USAGE_ASSUMPTIONS.
 """
+import math
+import time
 import logging
-import os
-from typing import Dict, List, Optional
-from functools import lru_cache
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+from services.pricing_catalog import GLOBAL_REGION, PriceCatalog, get_price_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -199,131 +209,516 @@ USAGE_ASSUMPTIONS = {
 }
 
 
+# =============================================================================
+# RATES
+# =============================================================================
+
+SEED_PRICING_DATE = "January 2026"
+
+# Built-in us-east-1 on-demand rates, used for keys the catalogue does not
+# have (or before it is first built). (service_code, usage_type, operation)
+# -> [(begin_range, usd_per_unit)]; operation "" matches any.
+SEED_RATES: Dict[Tuple[str, str, str], List[Tuple[float, float]]] = {
+    **{("AmazonEC2", f"BoxUsage:{it}", "RunInstances"): [(0, usd)] for it, usd in {
+        "t3.nano": 0.0052, "t3.micro": 0.0104, "t3.small": 0.0208, "t3.medium": 0.0416,
+        "t3.large": 0.0832, "t3.xlarge": 0.1664, "t4g.micro": 0.0084, "t4g.small": 0.0168,
+        "t4g.medium": 0.0336, "m5.large": 0.096, "m5.xlarge": 0.192, "m6i.large": 0.096,
+        "m7g.large": 0.0816, "c5.large": 0.085, "c6i.large": 0.085, "r5.large": 0.126,
+        "r6i.large": 0.126,
+    }.items()},
+    **{("AmazonEC2", f"EBS:VolumeUsage.{vt}", ""): [(0, usd)] for vt, usd in {
+        "gp3": 0.08, "gp2": 0.10, "io1": 0.125, "st1": 0.045, "sc1": 0.015,
+    }.items()},
+    ("AmazonEC2", "NatGateway-Hours", ""): [(0, 0.045)],
+    ("AmazonEC2", "NatGateway-Bytes", ""): [(0, 0.045)],
+    **{("AmazonRDS", f"InstanceUsage:{it}", ""): [(0, usd)] for it, usd in {
+        "db.t3.micro": 0.017, "db.t3.small": 0.034, "db.t3.medium": 0.068, "db.t3.large": 0.136,
+        "db.t4g.micro": 0.016, "db.t4g.medium": 0.065, "db.m5.large": 0.171, "db.m6g.large": 0.152,
+        "db.r5.large": 0.25, "db.r6g.large": 0.225,
+    }.items()},
+    **{("AmazonRDS", f"Multi-AZUsage:{it}", ""): [(0, usd)] for it, usd in {
+        "db.t3.micro": 0.034, "db.t3.small": 0.068, "db.t3.medium": 0.136, "db.t3.large": 0.272,
+        "db.t4g.micro": 0.032, "db.t4g.medium": 0.13, "db.m5.large": 0.342, "db.m6g.large": 0.304,
+        "db.r5.large": 0.50, "db.r6g.large": 0.45,
+    }.items()},
+    **{("AmazonRDS", f"InstanceUsage:{it}", "CreateDBInstance:0016"): [(0, usd)] for it, usd in {
+        "db.t3.medium": 0.082, "db.t4g.medium": 0.073, "db.r5.large": 0.29, "db.r6g.large": 0.26,
+    }.items()},
+    ("AmazonRDS", "RDS:GP2-Storage", ""): [(0, 0.115)],
+    ("AmazonRDS", "RDS:GP3-Storage", ""): [(0, 0.115)],
+    ("AmazonRDS", "RDS:Multi-AZ-GP2-Storage", ""): [(0, 0.23)],
+    ("AmazonRDS", "RDS:Multi-AZ-GP3-Storage", ""): [(0, 0.23)],
+    ("AmazonRDS", "Aurora:StorageUsage", ""): [(0, 0.10)],
+    ("AmazonRDS", "Aurora:StorageIOUsage", ""): [(0, 0.0000002)],
+    ("AWSLambda", "Request", ""): [(0, 0.0000002)],
+    ("AWSLambda", "Lambda-GB-Second", ""): [(0, 0.0000166667)],
+    ("AmazonApiGateway", "ApiGatewayRequest", ""): [(0, 0.0000035), (333e6, 0.0000028), (1e9, 0.00000238), (20e9, 0.00000151)],
+    ("AmazonS3", "TimedStorage-ByteHrs", ""): [(0, 0.023), (51200, 0.022), (512000, 0.021)],
+    ("AmazonS3", "Requests-Tier1", ""): [(0, 0.000005)],
+    ("AmazonS3", "Requests-Tier2", ""): [(0, 0.0000004)],
+    ("AmazonDynamoDB", "WriteCapacityUnit-Hrs", ""): [(0, 0.00065)],
+    ("AmazonDynamoDB", "ReadCapacityUnit-Hrs", ""): [(0, 0.00013)],
+    ("AmazonDynamoDB", "WriteRequestUnits", ""): [(0, 0.000000625)],
+    ("AmazonDynamoDB", "ReadRequestUnits", ""): [(0, 0.000000125)],
+    ("AmazonDynamoDB", "TimedStorage-ByteHrs", ""): [(0, 0.0), (25, 0.25)],
+    **{("AmazonElastiCache", f"NodeUsage:{nt}", ""): [(0, usd)] for nt, usd in {
+        "cache.t3.micro": 0.017, "cache.t3.small": 0.034, "cache.t3.medium": 0.068,
+        "cache.t4g.micro": 0.016, "cache.t4g.small": 0.032, "cache.m5.large": 0.156,
+        "cache.r6g.large": 0.206,
+    }.items()},
+    ("AWSELB", "LoadBalancerUsage", "LoadBalancing:Application"): [(0, 0.0225)],
+    ("AWSELB", "LCUUsage", "LoadBalancing:Application"): [(0, 0.008)],
+    ("AWSELB", "LoadBalancerUsage", "LoadBalancing:Network"): [(0, 0.0225)],
+    ("AWSELB", "LCUUsage", "LoadBalancing:Network"): [(0, 0.006)],
+    ("AmazonECS", "Fargate-vCPU-Hours:perCPU", ""): [(0, 0.04048)],
+    ("AmazonECS", "Fargate-GB-Hours", ""): [(0, 0.004445)],
+    ("AmazonEKS", "AmazonEKS-Hours:perCluster", ""): [(0, 0.10)],
+    ("AmazonCloudFront", "US-DataTransfer-Out-Bytes", ""): [(0, 0.085), (10240, 0.080), (51200, 0.060)],
+    ("AmazonCloudFront", "US-Requests-Tier2-HTTPS", ""): [(0, 0.000001)],
+    ("AmazonCloudWatch", "CW:MetricMonitorUsage", ""): [(0, 0.30), (10000, 0.10), (250000, 0.05), (1e6, 0.02)],
+    ("AmazonCloudWatch", "DataProcessing-Bytes", ""): [(0, 0.50)],
+    ("AmazonCloudWatch", "TimedStorage-ByteHrs", ""): [(0, 0.03)],
+    ("AWSQueueService", "Requests-RBP", ""): [(0, 0.0000004)],
+    ("AmazonSNS", "Requests-Tier1", ""): [(0, 0.0000005)],
+    ("AmazonCognito", "CognitoUserPoolsMAU", ""): [(0, 0.0), (50000, 0.0055), (100000, 0.0046), (1e6, 0.00325), (1e7, 0.0025)],
+    ("AWSSecretsManager", "AWSSecretsManager-Secrets", ""): [(0, 0.40)],
+    ("AWSSecretsManager", "AWSSecretsManager-APIRequest", ""): [(0, 0.000005)],
+    ("awskms", "KMS-Keys", ""): [(0, 1.00)],
+    ("awskms", "KMS-Requests", ""): [(0, 0.000003)],
+    ("AmazonRoute53", "HostedZone", ""): [(0, 0.50), (25, 0.10)],
+    ("AmazonRoute53", "DNS-Queries", ""): [(0, 0.0000004), (1e9, 0.0000002)],
+    ("AWSStepFunctions", "StateTransition", ""): [(0, 0.000025)],
+    ("AWSGlue", "ETL-DPU-Hour", ""): [(0, 0.44)],
+    ("AmazonAthena", "DataScannedInTB", ""): [(0, 5.00)],
+    ("AmazonKinesis", "Storage-ShardHour", ""): [(0, 0.015)],
+    ("awswaf", "WebACL", ""): [(0, 5.00)],
+    ("awswaf", "Rule", ""): [(0, 1.00)],
+    ("awswaf", "Request", ""): [(0, 0.0000006)],
+    ("AmazonEFS", "TimedStorage-ByteHrs", ""): [(0, 0.30)],
+    ("AmazonEventBridge", "Event-64K-Chunks", ""): [(0, 0.000001)],
+}
+
+
+# =============================================================================
+# USAGE MODELS
+# =============================================================================
+
+HOURS_PER_MONTH = 730
+
+# (service_code, usage_type, monthly_quantity, operation or "")
+LineItem = Tuple[str, str, float, str]
+
+RDS_ENGINE_OPERATIONS = {
+    "mysql": "CreateDBInstance:0002",
+    "postgres": "CreateDBInstance:0014",
+    "postgresql": "CreateDBInstance:0014",
+    "mariadb": "CreateDBInstance:0018",
+}
+
+
+def _ec2(c: Dict) -> List[LineItem]:
+    return [
+        ("AmazonEC2", f"BoxUsage:{c['instance_type']}", c["hours"] * c["count"], "RunInstances"),
+        ("AmazonEC2", f"EBS:VolumeUsage.{c['volume_type']}", c["storage_gb"] * c["count"], ""),
+    ]
+
+
+def _rds(c: Dict) -> List[LineItem]:
+    prefix = "Multi-AZUsage" if c["multi_az"] else "InstanceUsage"
+    storage = f"RDS:{'Multi-AZ-' if c['multi_az'] else ''}{c['storage_type'].upper()}-Storage"
+    return [
+        ("AmazonRDS", f"{prefix}:{c['instance_type']}", c["hours"] * c["count"],
+         RDS_ENGINE_OPERATIONS.get(str(c["engine"]).lower(), "")),
+        ("AmazonRDS", storage, c["storage_gb"] * c["count"], ""),
+    ]
+
+
+def _aurora(c: Dict) -> List[LineItem]:
+    return [
+        ("AmazonRDS", f"InstanceUsage:{c['instance_type']}", c["hours"] * c["count"], "CreateDBInstance:0016"),
+        ("AmazonRDS", "Aurora:StorageUsage", c["storage_gb"], ""),
+        ("AmazonRDS", "Aurora:StorageIOUsage", c["io_requests"], ""),
+    ]
+
+
+def _lambda(c: Dict) -> List[LineItem]:
+    gb_seconds = c["requests"] * c["duration_ms"] / 1000 * c["memory_mb"] / 1024
+    return [
+        ("AWSLambda", "Request", c["requests"], ""),
+        ("AWSLambda", "Lambda-GB-Second", gb_seconds, ""),
+    ]
+
+
+def _dynamodb(c: Dict) -> List[LineItem]:
+    items = [("AmazonDynamoDB", "TimedStorage-ByteHrs", c["storage_gb"], "")]
+    if c["capacity_mode"] == "on_demand":
+        items += [
+            ("AmazonDynamoDB", "WriteRequestUnits", c["write_requests"], ""),
+            ("AmazonDynamoDB", "ReadRequestUnits", c["read_requests"], ""),
+        ]
+    else:
+        items += [
+            ("AmazonDynamoDB", "WriteCapacityUnit-Hrs", c["wcu"] * c["hours"], ""),
+            ("AmazonDynamoDB", "ReadCapacityUnit-Hrs", c["rcu"] * c["hours"], ""),
+        ]
+    return items
+
+
+def _load_balancer(operation: str) -> Callable[[Dict], List[LineItem]]:
+    def model(c: Dict) -> List[LineItem]:
+        return [
+            ("AWSELB", "LoadBalancerUsage", c["hours"] * c["count"], operation),
+            ("AWSELB", "LCUUsage", c["lcu"] * c["hours"] * c["count"], operation),
+        ]
+    return model
+
+
+def _fargate(c: Dict) -> List[LineItem]:
+    return [
+        ("AmazonECS", "Fargate-vCPU-Hours:perCPU", c["vcpu"] * c["hours"] * c["count"], ""),
+        ("AmazonECS", "Fargate-GB-Hours", c["memory_gb"] * c["hours"] * c["count"], ""),
+    ]
+
+
+def _cloudwatch(c: Dict) -> List[LineItem]:
+    return [
+        ("AmazonCloudWatch", "CW:MetricMonitorUsage", c["metrics"], ""),
+        ("AmazonCloudWatch", "DataProcessing-Bytes", c["logs_gb"], ""),
+        ("AmazonCloudWatch", "TimedStorage-ByteHrs", c["logs_gb"], ""),
+    ]
+
+
+def _simple(*items: Tuple[str, str, str]) -> Callable[[Dict], List[LineItem]]:
+    """Model whose line items are (service_code, usage_type, config key) quantities."""
+    def model(c: Dict) -> List[LineItem]:
+        return [(code, usage_type, c[key], "") for code, usage_type, key in items]
+    return model
+
+
+# service_id -> (default config, model). Defaults mirror USAGE_ASSUMPTIONS.
+USAGE_MODELS: Dict[str, Tuple[Dict[str, Any], Callable[[Dict], List[LineItem]]]] = {
+    "ec2": ({"instance_type": "t3.medium", "count": 1, "hours": HOURS_PER_MONTH, "storage_gb": 30, "volume_type": "gp3"}, _ec2),
+    "rds": ({"instance_type": "db.t3.medium", "count": 1, "hours": HOURS_PER_MONTH, "storage_gb": 100,
+             "storage_type": "gp2", "multi_az": False, "engine": "mysql"}, _rds),
+    "aurora": ({"instance_type": "db.r6g.large", "count": 1, "hours": HOURS_PER_MONTH, "storage_gb": 100,
+                "io_requests": 10_000_000}, _aurora),
+    "lambda": ({"requests": 1_000_000, "duration_ms": 200, "memory_mb": 256}, _lambda),
+    "api-gateway": ({"requests": 1_000_000}, _simple(("AmazonApiGateway", "ApiGatewayRequest", "requests"))),
+    "s3": ({"storage_gb": 100, "put_requests": 10_000, "get_requests": 90_000}, _simple(
+        ("AmazonS3", "TimedStorage-ByteHrs", "storage_gb"),
+        ("AmazonS3", "Requests-Tier1", "put_requests"),
+        ("AmazonS3", "Requests-Tier2", "get_requests"),
+    )),
+    "dynamodb": ({"capacity_mode": "provisioned", "wcu": 25, "rcu": 25, "hours": HOURS_PER_MONTH, "storage_gb": 25,
+                  "write_requests": 10_000_000, "read_requests": 50_000_000}, _dynamodb),
+    "elasticache": ({"instance_type": "cache.t3.micro", "count": 1, "hours": HOURS_PER_MONTH}, lambda c: [
+        ("AmazonElastiCache", f"NodeUsage:{c['instance_type']}", c["hours"] * c["count"], ""),
+    ]),
+    "alb": ({"count": 1, "hours": HOURS_PER_MONTH, "lcu": 1}, _load_balancer("LoadBalancing:Application")),
+    "nlb": ({"count": 1, "hours": HOURS_PER_MONTH, "lcu": 1}, _load_balancer("LoadBalancing:Network")),
+    "nat-gateway": ({"count": 1, "hours": HOURS_PER_MONTH, "data_processed_gb": 100}, lambda c: [
+        ("AmazonEC2", "NatGateway-Hours", c["hours"] * c["count"], ""),
+        ("AmazonEC2", "NatGateway-Bytes", c["data_processed_gb"], ""),
+    ]),
+    "ebs": ({"storage_gb": 100, "volume_type": "gp3"}, lambda c: [
+        ("AmazonEC2", f"EBS:VolumeUsage.{c['volume_type']}", c["storage_gb"], ""),
+    ]),
+    "ecs": ({"vcpu": 1, "memory_gb": 4, "count": 1, "hours": HOURS_PER_MONTH}, _fargate),
+    "fargate": ({"vcpu": 1, "memory_gb": 4, "count": 1, "hours": HOURS_PER_MONTH}, _fargate),
+    "eks": ({"hours": HOURS_PER_MONTH}, _simple(("AmazonEKS", "AmazonEKS-Hours:perCluster", "hours"))),
+    "cloudfront": ({"data_transfer_gb": 100, "requests": 1_000_000}, _simple(
+        ("AmazonCloudFront", "US-DataTransfer-Out-Bytes", "data_transfer_gb"),
+        ("AmazonCloudFront", "US-Requests-Tier2-HTTPS", "requests"),
+    )),
+    "cloudwatch": ({"metrics": 50, "logs_gb": 10}, _cloudwatch),
+    "cloudwatch-logs": ({"metrics": 0, "logs_gb": 10}, _cloudwatch),
+    "sqs": ({"requests": 1_000_000}, _simple(("AWSQueueService", "Requests-RBP", "requests"))),
+    "sns": ({"requests": 100_000}, _simple(("AmazonSNS", "Requests-Tier1", "requests"))),
+    "cognito": ({"mau": 1000}, _simple(("AmazonCognito", "CognitoUserPoolsMAU", "mau"))),
+    "secrets-manager": ({"secrets": 10, "api_calls": 10_000}, _simple(
+        ("AWSSecretsManager", "AWSSecretsManager-Secrets", "secrets"),
+        ("AWSSecretsManager", "AWSSecretsManager-APIRequest", "api_calls"),
+    )),
+    "kms": ({"keys": 5, "requests": 10_000}, _simple(
+        ("awskms", "KMS-Keys", "keys"),
+        ("awskms", "KMS-Requests", "requests"),
+    )),
+    "route53": ({"hosted_zones": 1, "queries": 1_000_000}, _simple(
+        ("AmazonRoute53", "HostedZone", "hosted_zones"),
+        ("AmazonRoute53", "DNS-Queries", "queries"),
+    )),
+    "step-functions": ({"state_transitions": 100_000}, _simple(("AWSStepFunctions", "StateTransition", "state_transitions"))),
+    "glue": ({"dpu_hours": 10}, _simple(("AWSGlue", "ETL-DPU-Hour", "dpu_hours"))),
+    "athena": ({"data_scanned_tb": 0.1}, _simple(("AmazonAthena", "DataScannedInTB", "data_scanned_tb"))),
+    "kinesis": ({"shards": 1, "hours": HOURS_PER_MONTH}, lambda c: [
+        ("AmazonKinesis", "Storage-ShardHour", c["shards"] * c["hours"], ""),
+    ]),
+    "waf": ({"web_acls": 1, "rules": 10, "requests": 1_000_000}, _simple(
+        ("awswaf", "WebACL", "web_acls"),
+        ("awswaf", "Rule", "rules"),
+        ("awswaf", "Request", "requests"),
+    )),
+    "efs": ({"storage_gb": 100}, _simple(("AmazonEFS", "TimedStorage-ByteHrs", "storage_gb"))),
+    "eventbridge": ({"events": 1_000_000}, _simple(("AmazonEventBridge", "Event-64K-Chunks", "events"))),
+}
+USAGE_MODELS["elb"] = USAGE_MODELS["alb"]
+USAGE_MODELS["vpc"] = ({}, lambda c: [])  # VPCs are free; NAT gateways are priced as their own nodes
+
+# Node config keys as the canvas and generators spell them -> model keys
+CONFIG_ALIASES = {
+    "instanceType": "instance_type", "nodeType": "instance_type", "node_type": "instance_type",
+    "instanceClass": "instance_type", "instance_class": "instance_type",
+    "storageGB": "storage_gb", "storageGb": "storage_gb", "storage": "storage_gb", "allocatedStorage": "storage_gb",
+    "volumeType": "volume_type", "storageType": "storage_type",
+    "multiAZ": "multi_az", "multiAz": "multi_az",
+    "instanceCount": "count", "instances": "count", "nodes": "count", "desiredCount": "count", "tasks": "count",
+    "memoryMB": "memory_mb", "memorySize": "memory_mb", "memory": "memory_mb",
+    "durationMs": "duration_ms", "capacityMode": "capacity_mode", "billingMode": "capacity_mode",
+    "dataTransferGB": "data_transfer_gb",
+}
+
+NodeInput = Union[str, Dict[str, Any]]
+
+
+def _normalize_service_id(service_id: str) -> str:
+    return service_id.lower().replace(" ", "-").replace("amazon", "").replace("aws", "").strip("-")
+
+
+def _node_input(node: NodeInput) -> Tuple[str, str, Optional[str], Dict[str, Any]]:
+    """(service_id, label, node_id, config) for a service id, a React Flow node or a plain dict."""
+    if isinstance(node, str):
+        return _normalize_service_id(node), node, None, {}
+    data = node.get("data") or {}
+    raw_id = (data.get("serviceId") or data.get("service_id") or node.get("service_id")
+              or node.get("serviceId") or node.get("service") or node.get("type") or "")
+    config: Dict[str, Any] = {}
+    for source in (data, data.get("config") or {}, node.get("config") or {}):
+        for key, value in source.items():
+            key = CONFIG_ALIASES.get(key, key)
+            if value is not None and value != "":
+                config[key] = value
+    if config.get("capacity_mode") in ("PAY_PER_REQUEST", "on-demand", "ondemand"):
+        config["capacity_mode"] = "on_demand"
+    label = data.get("label") or node.get("label") or raw_id
+    return _normalize_service_id(str(raw_id)), label, node.get("id"), config
+
+
+_TRUE_VALUES = frozenset({"true", "yes", "on", "1", "enabled"})
+_FALSE_VALUES = frozenset({"false", "no", "off", "0", "disabled"})
+
+
+def _coerce(value: Any, default: Any) -> Any:
+    """Convert a node config value (often a form string) to the type of the model default."""
+    if isinstance(default, bool):
+        if isinstance(value, str):
+            text = value.strip().lower()
+            if text in _TRUE_VALUES or text in _FALSE_VALUES:
+                return text in _TRUE_VALUES
+            raise ValueError(f"not a boolean: {value!r}")
+        return bool(value)
+    if isinstance(default, (int, float)):
+        number = float(value)
+        if not math.isfinite(number) or number < 0:
+            raise ValueError(f"not a usable quantity: {value!r}")
+        return int(number) if number.is_integer() else number
+    return str(value)
+
+
+def _usage_config(service_id: str, defaults: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Model defaults overridden by the node config keys the model knows, converted to the default types."""
+    usage = dict(defaults)
+    for key, value in config.items():
+        if key not in defaults:
+            continue
+        try:
+            usage[key] = _coerce(value, defaults[key])
+        except (TypeError, ValueError):
+            logger.warning(f"Bad pricing config {key}={value!r} for {service_id}; using {defaults[key]!r}")
+    return usage
+
+
+def _tiered_cost(tiers: Sequence[Tuple[float, float]], quantity: float) -> float:
+    cost = 0.0
+    for i, (begin, price) in enumerate(tiers):
+        end = tiers[i + 1][0] if i + 1 < len(tiers) else float("inf")
+        if quantity <= begin:
+            break
+        cost += (min(quantity, end) - begin) * price
+    return cost
+
+
+def _select_tiers(rows, operation: str) -> List[Tuple[float, float]]:
+    """Cheapest price per tier, preferring rows for the requested operation."""
+    matching = [r for r in rows if r[0] == operation] if operation else rows
+    best: Dict[float, float] = {}
+    for _, begin, price in matching or rows:
+        if begin not in best or price < best[begin]:
+            best[begin] = price
+    return sorted(best.items())
+
+
 class AWSPricingService:
-    """Service to fetch and calculate AWS pricing estimates."""
+    """Prices architectures from the offline catalogue (no network calls)."""
     
-    def __init__(self, region: str = "us-east-1"):
+    def __init__(self, region: str = "us-east-1", catalog: Optional[PriceCatalog] = None):
         self.region = region
-        self._client = None
-        self._initialized = False
-        
-    def _get_client(self):
-        """Lazy initialization of boto3 pricing client."""
-        if self._client is None:
-            try:
-                # Pricing API is only available in us-east-1 and ap-south-1
-                self._client = boto3.client(
-                    'pricing',
-                    region_name='us-east-1',
-                    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                )
-                self._initialized = True
-            except (NoCredentialsError, ClientError) as e:
-                logger.warning(f"AWS credentials not available for pricing API: {e}")
-                self._initialized = False
-        return self._client
+        self.catalog = catalog or get_price_catalog()
     
-    def get_service_price(self, service_code: str) -> Optional[Dict]:
+    def get_service_price(self, service_code: str, usage_type: Optional[str] = None,
+                          region: Optional[str] = None) -> List[Dict]:
         """
-        Get pricing information for an AWS service.
-        
-        Note: The AWS Pricing API is complex and returns detailed SKU-level pricing.
-        For simplicity, we use pre-calculated estimates based on typical usage.
+        On-demand catalogue rows for an AWS service code (e.g. "AmazonEC2"),
+        optionally for one usage type (e.g. "BoxUsage:t3.micro").
         """
-        client = self._get_client()
-        if not client:
-            return None
-            
-        try:
-            # This is a simplified example - real implementation would need
-            # to filter by specific attributes (region, instance type, etc.)
-            response = client.get_products(
-                ServiceCode=service_code,
-                Filters=[
-                    {
-                        'Type': 'TERM_MATCH',
-                        'Field': 'location',
-                        'Value': 'US East (N. Virginia)'
-                    }
-                ],
-                MaxResults=1
-            )
-            
-            if response.get('PriceList'):
-                return response['PriceList'][0]
-            return None
-            
-        except ClientError as e:
-            logger.error(f"Error fetching price for {service_code}: {e}")
-            return None
+        region = region or self.region
+        return (self.catalog.rows(service_code, region, usage_type)
+                or self.catalog.rows(service_code, GLOBAL_REGION, usage_type))
     
-    def estimate_architecture_cost(
-        self,
-        services: List[str],
-        region: str = "us-east-1"
-    ) -> Dict:
+    def _rates(self, keys, region: str) -> Dict[Tuple[str, str, str], Tuple[List[Tuple[float, float]], str]]:
+        """(service_code, usage_type, operation) -> (tiers, source) with one catalogue lookup."""
+        found = {}
+        if self.catalog.available:
+            lookup = {(code, r, usage_type) for code, usage_type, _ in keys for r in (region, GLOBAL_REGION)}
+            found = self.catalog.rates(lookup)
+        resolved = {}
+        for code, usage_type, operation in keys:
+            rows = found.get((code, region, usage_type)) or found.get((code, GLOBAL_REGION, usage_type))
+            if rows:
+                resolved[(code, usage_type, operation)] = (_select_tiers(rows, operation), "catalog")
+                continue
+            seed = SEED_RATES.get((code, usage_type, operation)) or SEED_RATES.get((code, usage_type, ""))
+            resolved[(code, usage_type, operation)] = (seed, "seed") if seed else ([], "unpriced")
+        return resolved
+    
+    def estimate_diagram_cost(self, nodes: Sequence[NodeInput], region: Optional[str] = None,
+                              buffer: float = 0.15) -> Dict:
         """
-        Estimate monthly cost for an architecture based on services used.
+        Estimate the monthly cost of a whole diagram in one pass.
         
         Args:
-            services: List of service IDs from the diagram (e.g., ['lambda', 'api-gateway', 's3'])
+            nodes: Service ids, React Flow nodes ({"id", "data": {"serviceId",
+                "config": {"instanceType": ..., "storageGB": ...}}}) or plain
+                dicts ({"service_id", "config"}); config overrides the
+                USAGE_MODELS defaults
             region: AWS region for pricing
+            buffer: Extra share for data transfer and misc charges
             
         Returns:
-            Dict with cost breakdown and total
+            Dict with per-node breakdown and totals (same keys as
+            estimate_architecture_cost)
         """
-        cost_breakdown = []
-        total_monthly = 0.0
-        total_yearly = 0.0
+        started = time.perf_counter()
+        region = region or self.region
         
-        # Track unique services to avoid double-counting
-        seen_service_codes = set()
+        # 1. Expand nodes into usage line items
+        priced_nodes = []
+        line_items: List[Tuple[int, LineItem]] = []
+        for node in nodes:
+            service_id, label, node_id, config = _node_input(node)
+            service_code = SERVICE_CODE_MAP.get(service_id)
+            if service_id in USAGE_MODELS:
+                defaults, model = USAGE_MODELS[service_id]
+                usage = _usage_config(service_id, defaults, config)
+                try:
+                    items = model(usage)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Bad pricing config for {service_id} ({e}); using defaults")
+                    usage, items = defaults, model(defaults)
+                if not items:
+                    continue  # modelled as free (VPC)
+            elif service_code and "estimated_monthly_usd" in USAGE_ASSUMPTIONS.get(service_code, {}):
+                usage, items = {}, []
+            else:
+                continue  # free (IAM, VPC...) or unknown
+            index = len(priced_nodes)
+            priced_nodes.append({"node_id": node_id, "service": label, "service_id": service_id,
+                                 "service_code": service_code, "usage": usage})
+            line_items.extend((index, item) for item in items)
         
-        for service_id in services:
-            # Normalize service ID
-            service_id_lower = service_id.lower().replace(" ", "-").replace("amazon", "").replace("aws", "").strip("-")
-            
-            # Map to AWS service code
-            service_code = SERVICE_CODE_MAP.get(service_id_lower)
-            
-            if not service_code or service_code in seen_service_codes:
-                continue
-                
-            seen_service_codes.add(service_code)
-            
-            # Get usage assumptions and estimated cost
-            usage = USAGE_ASSUMPTIONS.get(service_code, {})
-            monthly_cost = usage.get("estimated_monthly_usd", 0)
-            
-            if monthly_cost > 0:
-                cost_breakdown.append({
-                    "service": service_id,
-                    "service_code": service_code,
-                    "monthly_usd": monthly_cost,
-                    "usage_assumptions": {k: v for k, v in usage.items() if k != "estimated_monthly_usd"}
-                })
-                total_monthly += monthly_cost
+        # 2. Sum quantities per rate key and price each key once (tiers apply to the total)
+        totals: Dict[Tuple[str, str, str], float] = defaultdict(float)
+        for _, (code, usage_type, quantity, operation) in line_items:
+            totals[(code, usage_type, operation)] += float(quantity)
+        rates = self._rates(totals.keys(), region)
+        unit_cost = {}
+        for key, quantity in totals.items():
+            tiers, _ = rates[key]
+            unit_cost[key] = _tiered_cost(tiers, quantity) / quantity if quantity > 0 and tiers else 0.0
         
-        total_yearly = total_monthly * 12
+        # 3. Share key costs back to the nodes
+        node_items: Dict[int, List[Dict]] = defaultdict(list)
+        for index, (code, usage_type, quantity, operation) in line_items:
+            key = (code, usage_type, operation)
+            node_items[index].append({
+                "usage_type": usage_type,
+                "quantity": round(float(quantity), 4),
+                "monthly_usd": float(quantity) * unit_cost[key],
+                "source": rates[key][1],
+            })
         
-        # Add 15% buffer for data transfer, misc charges
-        buffer_monthly = total_monthly * 0.15
-        buffer_yearly = total_yearly * 0.15
+        breakdown = []
+        sources = set()
+        total_monthly = 0.0
+        for index, node in enumerate(priced_nodes):
+            items = node_items.get(index, [])
+            if items:
+                monthly = sum(item["monthly_usd"] for item in items)
+                node_sources = {item["source"] for item in items}
+            else:
+                monthly = USAGE_ASSUMPTIONS[node["service_code"]]["estimated_monthly_usd"]
+                node_sources = {"assumption"}
+            sources |= node_sources
+            if monthly <= 0 and not items:
+                continue
+            total_monthly += monthly
+            breakdown.append({
+                "node_id": node["node_id"],
+                "service": node["service"],
+                "service_code": node["service_code"],
+                "monthly_usd": round(monthly, 2),
+                "usage_assumptions": node["usage"],
+                "line_items": [{**item, "monthly_usd": round(item["monthly_usd"], 4)} for item in items],
+                "source": "+".join(sorted(node_sources)),
+            })
         
+        refreshed_at = self.catalog.refreshed_at() if "catalog" in sources else None
+        pricing_date = (datetime.fromtimestamp(refreshed_at, timezone.utc).strftime("%B %Y")
+                        if refreshed_at else SEED_PRICING_DATE)
+        total_yearly = total_monthly * 12
         return {
-            "breakdown": cost_breakdown,
+            "breakdown": breakdown,
             "subtotal_monthly": round(total_monthly, 2),
             "subtotal_yearly": round(total_yearly, 2),
-            "buffer_monthly": round(buffer_monthly, 2),
-            "buffer_yearly": round(buffer_yearly, 2),
-            "total_monthly": round(total_monthly + buffer_monthly, 2),
-            "total_yearly": round(total_yearly + buffer_yearly, 2),
+            "buffer_monthly": round(total_monthly * buffer, 2),
+            "buffer_yearly": round(total_yearly * buffer, 2),
+            "total_monthly": round(total_monthly * (1 + buffer), 2),
+            "total_yearly": round(total_yearly * (1 + buffer), 2),
             "currency": "USD",
             "region": region,
-            "disclaimer": "Estimates based on typical small-to-medium workload usage patterns. Actual costs vary based on usage, configuration, and current AWS pricing.",
-            "pricing_date": "January 2026",
+            "disclaimer": "Estimates based on on-demand list prices and typical small-to-medium workload usage. Actual costs vary based on usage, configuration, and current AWS pricing.",
+            "pricing_date": pricing_date,
+            "pricing_sources": sorted(sources),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
         }
+    
+    def estimate_architecture_cost(
+        self,
+        services: List[str],
+        region: str = "us-east-1"
+    ) -> Dict:
+        """
+        Estimate monthly cost for an architecture based on services used.
+        
+        Args:
+            services: List of service IDs from the diagram (e.g., ['lambda', 'api-gateway', 's3'])
+            region: AWS region for pricing
+            
+        Returns:
+            Dict with cost breakdown and total
+        """
+        # Each service priced once, at its default usage
+        unique = list({_normalize_service_id(s): s for s in services}.values())
+        return self.estimate_diagram_cost(unique, region)
 
 
 # Singleton instance
@@ -351,3 +746,11 @@ def estimate_architecture_cost(services: List[str], region: str = "us-east-1") -
     """
     service = get_pricing_service()
     return service.estimate_architecture_cost(services, region)
+
+
+def estimate_diagram_cost(nodes: Sequence[NodeInput], region: str = "us-east-1") -> Dict:
+    """
+    Convenience function to price a diagram's nodes, honouring per-node
+    config (instance type, storage GB, counts...).
+    """
+    return get_pricing_service().estimate_diagram_cost(nodes, region)
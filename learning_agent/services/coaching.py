@@ -0,0 +1,412 @@
+"""
+Coaching chat: the tool-calling loop behind the learning chat and the
+RAG agent chat.
+"""
+import json
+from typing import Any, Dict, Optional
+
+from openai import OpenAI
+
+from agent_prompt import TOOL_DESCRIPTIONS
+from config.openai_config import get_async_openai
+from config.settings import logger
+from models.learning import CloudScenario
+from prompts import get_persona_prompt, get_persona_info
+from utils import search_documents
+import db
+
+
+async def execute_tool(tool_name: str, tool_args: dict) -> str:
+    """Execute a tool and return the result."""
+    try:
+        if tool_name == "search_documentation":
+            results = await search_documents(
+                query=tool_args.get("query", ""),
+                source_id=tool_args.get("source"),
+                match_count=5
+            )
+            if results:
+                formatted = []
+                for r in results:
+                    formatted.append(f"**Source:** {r.get('url', 'Unknown')}\n{r.get('content', '')[:1000]}")
+                return "\n\n---\n\n".join(formatted)
+            return "No relevant documentation found."
+        elif tool_name == "get_sources":
+            sources = await db.get_knowledge_sources(limit=50)
+            if sources:
+                return "\n".join([f"- **{s['id']}**: {s.get('summary', 'No summary')[:100]}..." for s in sources])
+            return "No sources available."
+        elif tool_name == "get_aws_services":
+            from routes.aws import list_aws_services
+            return await list_aws_services(
+                category=tool_args.get("category"),
+                tenant_id=tool_args.get("tenant_id")
+            )
+        elif tool_name == "get_aws_service_details":
+            from routes.aws import get_aws_service
+            return await get_aws_service(
+                service_name=tool_args.get("service_name", ""),
+                tenant_id=tool_args.get("tenant_id")
+            )
+        elif tool_name == "get_aws_architecture":
+            from routes.aws import get_aws_architecture
+            return await get_aws_architecture(
+                use_case=tool_args.get("use_case", ""),
+                tenant_id=tool_args.get("tenant_id")
+            )
+        elif tool_name == "generate_flashcards":
+            from generators.flashcards import generate_flashcards_from_knowledge
+            return await generate_flashcards_from_knowledge(
+                topic=tool_args.get("topic", ""),
+                count=tool_args.get("count", 10)
+            )
+        elif tool_name == "generate_quiz":
+            from generators.quiz import generate_quiz_from_knowledge
+            return await generate_quiz_from_knowledge(
+                topic=tool_args.get("topic", ""),
+                question_count=tool_args.get("question_count", 5)
+            )
+        else:
+            return json.dumps({"error": f"Unknown tool: {tool_name}"})
+    except Exception as e:
+        return json.dumps({"error": str(e)})
+
+
+# ============================================
+# CHAT TOOLS FOR FUNCTION CALLING
+# ============================================
+
+CHAT_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "search_documentation",
+            "description": TOOL_DESCRIPTIONS["search_documentation"],
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "The search query"},
+                    "source": {"type": "string", "description": "Optional: filter by source domain"}
+                },
+                "required": ["query"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_sources",
+            "description": TOOL_DESCRIPTIONS["get_sources"],
+            "parameters": {"type": "object", "properties": {}, "required": []}
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_aws_services",
+            "description": TOOL_DESCRIPTIONS["get_aws_services"],
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "category": {"type": "string", "description": "Optional: filter by category"}
+                },
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_aws_service_details",
+            "description": TOOL_DESCRIPTIONS["get_aws_service_details"],
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "service_name": {"type": "string", "description": "The AWS service name"}
+                },
+                "required": ["service_name"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_aws_architecture",
+            "description": TOOL_DESCRIPTIONS["get_aws_architecture"],
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "use_case": {"type": "string", "description": "Description of what you want to build"}
+                },
+                "required": ["use_case"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "generate_flashcards",
+            "description": TOOL_DESCRIPTIONS["generate_flashcards"],
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "topic": {"type": "string", "description": "Topic for flashcards"},
+                    "card_count": {"type": "integer", "description": "Number of flashcards"}
+                },
+                "required": ["topic"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "generate_quiz",
+            "description": TOOL_DESCRIPTIONS["generate_quiz"],
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "topic": {"type": "string", "description": "Topic for the quiz"},
+                    "question_count": {"type": "integer", "description": "Number of questions"},
+                    "difficulty": {"type": "string", "description": "Difficulty level"}
+                },
+                "required": ["topic"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "generate_study_notes",
+            "description": "Generate comprehensive study notes on an AWS topic.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "topic": {"type": "string", "description": "Topic for study notes"}
+                },
+                "required": ["topic"]
+            }
+        }
+    },
+]
+
+
+async def get_coaching_response(
+    message: str,
+    scenario: Optional[CloudScenario] = None,
+    challenge_id: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> dict:
+    """Get a coaching response with dynamic persona switching."""
+    from agent_prompt import SYSTEM_PROMPT as BASE_AGENT_PROMPT
+    
+    CERT_TO_PERSONA = {
+        # Foundational
+        "CLF": "cloud-practitioner", "AIF": "ai-practitioner",
+        # Associate
+        "SAA": "solutions-architect-associate", "DVA": "developer-associate",
+        "SOA": "sysops-associate", "DEA": "data-engineer-associate",
+        "MLA": "machine-learning-engineer-associate",
+        # Professional
+        "SAP": "solutions-architect-professional", "DOP": "devops-professional",
+        # Specialty
+        "ANS": "networking-specialty", "SCS": "security-specialty",
+        "MLS": "machine-learning-specialty", "PAS": "sap-specialty",
+        # Legacy
+        "DBS": "database-specialty",
+    }
+    
+    target_cert = context.get("target_certification") if context else None
+    persona_id = CERT_TO_PERSONA.get(target_cert, "solutions-architect-associate")
+    persona_prompt = get_persona_prompt(persona_id)
+    persona_info = get_persona_info(persona_id)
+    persona_name = persona_info['name']
+    
+    # Build learner context
+    context_parts = []
+    if context:
+        learner_parts = []
+        if context.get("user_name"):
+            learner_parts.append(f"Name: {context['user_name']}")
+        if context.get("skill_level"):
+            learner_parts.append(f"Skill Level: {context['skill_level']}")
+        if context.get("target_certification"):
+            learner_parts.append(f"Studying for: {context['target_certification']}")
+        
+        stats = context.get("stats", {})
+        if stats:
+            learner_parts.append(f"Level {stats.get('level', 1)} | {stats.get('total_points', 0)} points")
+        
+        practiced = context.get("practiced_services", [])
+        if practiced:
+            learner_parts.append(f"AWS services practiced: {', '.join(practiced[:10])}")
+        
+        if learner_parts:
+            context_parts.append("LEARNER PROFILE:\n" + "\n".join(learner_parts))
+    
+    # Use context-provided challenge info (more complete) or fall back to scenario lookup
+    if context and context.get("challenge_title"):
+        # Full challenge context from frontend
+        context_parts.append("\n=== CURRENT CHALLENGE ===")
+        context_parts.append(f"Challenge: {context.get('challenge_title')}")
+        if context.get("challenge_description"):
+            context_parts.append(f"Description: {context.get('challenge_description')}")
+        if context.get("challenge_brief"):
+            context_parts.append(f"Brief: {context.get('challenge_brief')}")
+        if context.get("success_criteria"):
+            criteria = context.get("success_criteria")
+            if isinstance(criteria, list):
+                context_parts.append(f"Success Criteria: {', '.join(criteria)}")
+        if context.get("aws_services_relevant"):
+            services = context.get("aws_services_relevant")
+            if isinstance(services, list):
+                context_parts.append(f"Required AWS Services: {', '.join(services)}")
+        
+        # Business context
+        context_parts.append("\n=== BUSINESS CONTEXT ===")
+        context_parts.append(f"Company: {context.get('company_name', 'Unknown')}")
+        context_parts.append(f"Industry: {context.get('industry', 'Technology')}")
+        if context.get("business_context"):
+            context_parts.append(f"Business Context: {context.get('business_context')}")
+        
+        # User's current progress
+        context_parts.append("\n=== USER'S CURRENT WORK ===")
+        diagram_services = context.get("diagram_services", [])
+        if diagram_services:
+            context_parts.append(f"Services in their diagram: {', '.join(diagram_services)}")
+        else:
+            context_parts.append("Services in their diagram: None yet")
+        context_parts.append(f"Diagram nodes: {context.get('diagram_node_count', 0)}")
+        context_parts.append(f"Questions answered: {context.get('questions_answered', 0)}/{context.get('questions_total', 0)}")
+        if context.get("drawing_passed"):
+            context_parts.append("Drawing audit: PASSED ✓")
+        elif context.get("last_audit_score") is not None:
+            context_parts.append(f"Last audit score: {context.get('last_audit_score')}/100")
+        if context.get("current_question"):
+            context_parts.append(f"Current question: {context.get('current_question')}")
+        
+        # CLI objectives (for anti-cheat detection)
+        cli_objectives = context.get("cli_objectives", [])
+        if cli_objectives and context.get("mode") == "cli_tutor":
+            context_parts.append("\n=== ACTIVE CLI OBJECTIVES (DO NOT GIVE DIRECT ANSWERS) ===")
+            context_parts.append("The user must complete these objectives by figuring out the commands themselves:")
+            for obj in cli_objectives:
+                desc = obj.get("description", "")
+                pattern = obj.get("command_pattern", "")
+                context_parts.append(f"  - {desc}")
+                if pattern:
+                    context_parts.append(f"    (Pattern hint: {pattern})")
+            context_parts.append("REMEMBER: Guide them, don't give them the exact commands!")
+    elif scenario:
+        # Fall back to scenario lookup
+        context_parts.append(f"\nCURRENT SCENARIO: {scenario.scenario_title}")
+        context_parts.append(f"Company: {scenario.company_name}")
+        context_parts.append(f"Business Context: {scenario.business_context}")
+        
+        if challenge_id:
+            challenge = next((c for c in scenario.challenges if c.id == challenge_id), None)
+            if challenge:
+                context_parts.append(f"\nCurrent Challenge: {challenge.title}")
+                context_parts.append(f"Success Criteria: {', '.join(challenge.success_criteria)}")
+    
+    learner_context = "\n".join(context_parts) if context_parts else ""
+    
+    system_prompt = f"""## YOUR PERSONA FOR THIS SESSION
+You are {persona_name}, an AWS learning coach specializing in the {persona_info['cert']}.
+
+YOUR IDENTITY:
+- Your name is {persona_name}
+- You specialize in: {', '.join(persona_info['focus'])}
+- Your coaching style: {persona_info['style']}
+
+{persona_prompt}
+
+## BASE AGENT CAPABILITIES & TOOLS
+{BASE_AGENT_PROMPT}
+
+## CURRENT LEARNER CONTEXT
+{learner_context}
+
+## INSTRUCTIONS
+- Use your tools when they would help the learner
+- Adapt your responses to the learner's skill level
+- Be {persona_name} - stay in character
+
+## ANTI-CHEAT RULES (CRITICAL - NEVER VIOLATE)
+If the user is in CLI tutor mode with active objectives:
+1. NEVER give the exact AWS CLI command that completes an objective
+2. If the user's message contains text that matches or closely resembles an objective description, they are likely trying to cheat by copy-pasting the objective
+3. Instead of giving the answer, guide them with:
+   - Explain the CONCEPT behind what they need to do
+   - Point them to AWS documentation
+   - Give PARTIAL hints (e.g., "You'll need the aws dynamodb command...")
+   - Ask them what they've tried so far
+4. You can explain what a command DOES after they've run it, but don't give commands BEFORE they attempt them
+5. If they explicitly ask "what is the command for X" or paste an objective, respond with guidance, not the answer"""
+
+    try:
+        from utils import get_request_model
+        model = get_request_model()
+        
+        # Use get_async_openai() which checks: request context -> .env -> error
+        # Note: Using sync OpenAI client here, so we get the client from get_async_openai and use its api_key
+        async_client = get_async_openai()
+        client = OpenAI(api_key=async_client.api_key)
+        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": message}]
+        
+        response = client.chat.completions.create(
+            model=model, messages=messages, tools=CHAT_TOOLS, tool_choice="auto",
+            temperature=0.5, max_tokens=2000  # Lower temp for reliable tool selection
+        )
+        
+        assistant_message = response.choices[0].message
+        tools_used = []
+        
+        while assistant_message.tool_calls:
+            tool_results = []
+            for tool_call in assistant_message.tool_calls:
+                tool_name = tool_call.function.name
+                tool_args = json.loads(tool_call.function.arguments)
+                result = await execute_tool(tool_name, tool_args)
+                tools_used.append({"tool": tool_name, "args": tool_args})
+                tool_results.append({"tool_call_id": tool_call.id, "role": "tool", "content": result})
+            
+            messages.append({
+                "role": "assistant", "content": assistant_message.content,
+                "tool_calls": [{"id": tc.id, "type": "function", "function": {"name": tc.function.name, "arguments": tc.function.arguments}} for tc in assistant_message.tool_calls]
+            })
+            messages.extend(tool_results)
+            
+            response = client.chat.completions.create(
+                model=model, messages=messages, tools=CHAT_TOOLS, tool_choice="auto",
+                temperature=0.5, max_tokens=2000  # Lower temp for reliable tool selection
+            )
+            assistant_message = response.choices[0].message
+        
+        final_content = assistant_message.content or "I apologize, but I couldn't generate a response."
+        
+        # Extract key terms
+        key_terms = []
+        try:
+            extraction_response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": "Extract 3-8 key AWS services or technical concepts mentioned in the response. Return a JSON object with a 'terms' array: {\"terms\": [{\"term\": \"VPC\", \"category\": \"Networking\"}, {\"term\": \"S3\", \"category\": \"Storage\"}]}. Categories: Networking, Compute, Storage, Database, Security, Monitoring, Other."},
+                    {"role": "user", "content": f"Extract key AWS terms from this response:\n\n{final_content[:1500]}"}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=500
+            )
+            content = extraction_response.choices[0].message.content
+            parsed = json.loads(content)
+            key_terms = parsed.get("terms", [])
+            logger.info(f"Extracted {len(key_terms)} key terms: {[t.get('term') for t in key_terms]}")
+        except Exception as e:
+            logger.warning(f"Key terms extraction failed: {e}")
+            key_terms = []
+        
+        return {"response": final_content, "key_terms": key_terms, "tools_used": tools_used}
+            
+    except Exception as e:
+        logger.error(f"Coach response failed: {e}")
+        return {"response": "I'm having trouble processing that. Could you rephrase?", "key_terms": [], "tools_used": []}
@@ -0,0 +1,67 @@
+"""
+Server-side store for Speed Deploy briefs.
+
+Generated briefs are kept in Redis under their id for BRIEF_TTL_SECONDS,
+so /validate only needs the brief id and the submission. The answer key
+(optimal and acceptable solutions, traps) never goes to the client, so
+the client can't change it. Each worker keeps the compiled ScoringTable of
+its LOCAL_BRIEFS most recently used briefs, so scoring a repeat submission
+(a replay, or both players of a versus match) needs no Redis round trip.
+"""
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from config.settings import logger
+from generators.speed_deploy import DeployBrief, ScoringTable
+
+BRIEF_TTL = int(os.getenv("SPEED_DEPLOY_BRIEF_TTL_SECONDS", str(24 * 3600)))
+BRIEF_PREFIX = "speed_deploy:brief:"
+LOCAL_BRIEFS = 256
+
+_tables: "OrderedDict[str, ScoringTable]" = OrderedDict()
+
+
+async def _get_redis():
+    from redis_jobs import get_job_manager
+    return await (await get_job_manager()).get_redis()
+
+
+def _remember(table: ScoringTable) -> None:
+    _tables[table.brief.id] = table
+    _tables.move_to_end(table.brief.id)
+    while len(_tables) > LOCAL_BRIEFS:
+        _tables.popitem(last=False)
+
+
+async def save_brief(brief: DeployBrief) -> ScoringTable:
+    """Store a generated brief and return its compiled scoring table."""
+    table = ScoringTable.from_brief(brief)
+    _remember(table)
+    try:
+        r = await _get_redis()
+        await r.set(f"{BRIEF_PREFIX}{brief.id}", brief.model_dump_json(), ex=BRIEF_TTL)
+    except Exception as e:
+        logger.warning(f"Brief store unavailable, {brief.id} kept on this worker only: {e}")
+    return table
+
+
+async def get_scoring_table(brief_id: str) -> Optional[ScoringTable]:
+    """The compiled scoring table of a stored brief, or None if unknown or expired."""
+    table = _tables.get(brief_id)
+    if table is not None:
+        _tables.move_to_end(brief_id)
+        return table
+
+    try:
+        r = await _get_redis()
+        data = await r.get(f"{BRIEF_PREFIX}{brief_id}")
+    except Exception as e:
+        logger.warning(f"Brief store unavailable: {e}")
+        return None
+    if data is None:
+        return None
+
+    table = ScoringTable.from_brief(DeployBrief.model_validate_json(data))
+    _remember(table)
+    return table
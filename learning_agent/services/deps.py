@@ -26,3 +26,10 @@ def get_agent_deps() -> AgentDeps:
     if _agent_deps is None:
         _agent_deps = AgentDeps()
     return _agent_deps
+
+
+async def close_agent_deps():
+    global _agent_deps
+    if _agent_deps is not None:
+        await _agent_deps.close()
+        _agent_deps = None
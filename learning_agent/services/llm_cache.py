@@ -0,0 +1,224 @@
+"""
+Response cache for deterministic LLM calls.
+
+Grading, validation and summary calls are effectively pure functions of
+their prompt: the same answer to the same question gets the same verdict.
+Call sites opt in by passing a CachePolicy to complete_json(); the
+completion is then cached in Redis under a hash of its canonicalized
+request (model, temperature, messages, response format - everything sent
+to the API) for the policy's TTL.
+
+The cache is bounded to LLM_CACHE_MAX_ENTRIES: every entry is indexed in a
+sorted set by last access, and writes past the limit evict the least
+recently used entries (Redis runs without a maxmemory policy).
+
+A policy with `similar_text` also matches near-identical inputs: the text
+(a learner's free-text answer) is embedded, and a cached verdict for an
+answer within `similarity` cosine of it, under the same `similar_scope`
+(the question) and request settings, is reused. Embeddings barely move
+for small edits such as a dropped "not", so the threshold is kept high.
+
+Redis or embedding failures are logged and the call goes to the model
+uncached. Outcomes are exported on /metrics.
+"""
+import os
+import json
+import math
+import time
+import base64
+import hashlib
+from array import array
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter
+
+from config.settings import logger
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true") == "true"
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_SIMILARITY = float(os.getenv("LLM_CACHE_SIMILARITY", "0.98"))
+# Most recent answers compared per scope (question) in a similarity lookup
+SIMILAR_MAX_PER_SCOPE = int(os.getenv("LLM_CACHE_SIMILAR_MAX_PER_SCOPE", "64"))
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+LLM_CACHE_PREFIX = "llm:cache:"
+LLM_CACHE_INDEX = f"{LLM_CACHE_PREFIX}index"
+
+LLM_CACHE_REQUESTS = Counter(
+    "archistry_llm_cache_requests",
+    "Cached LLM calls by call site and outcome (hit, similar, miss, error)",
+    ["site", "outcome"],
+)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Opt-in response caching for one call site."""
+    site: str  # metrics label and key namespace, e.g. "grade_free_text"
+    ttl: int = LLM_CACHE_TTL
+    similar_text: Optional[str] = None  # embedded for near-duplicate lookup
+    similar_scope: str = ""  # near-duplicates only match within this scope
+    similarity: float = LLM_CACHE_SIMILARITY
+
+
+def _canonical_content(content: Any) -> Any:
+    if not isinstance(content, str):
+        return content
+    return "\n".join(line.rstrip() for line in content.strip().splitlines())
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def llm_cache_key(site: str, create_kwargs: Dict[str, Any]) -> str:
+    """Key for a chat.completions.create() request; insensitive to trailing whitespace and kwarg order."""
+    messages = [
+        {**message, "content": _canonical_content(message.get("content"))}
+        for message in create_kwargs.get("messages", [])
+    ]
+    return f"{LLM_CACHE_PREFIX}{site}:{_digest({**create_kwargs, 'messages': messages})}"
+
+
+def _similar_key(policy: CachePolicy, create_kwargs: Dict[str, Any]) -> str:
+    settings = {k: v for k, v in create_kwargs.items() if k != "messages"}
+    digest = _digest({"scope": policy.similar_scope, **settings})
+    return f"{LLM_CACHE_PREFIX}{policy.site}:similar:{digest}"
+
+
+async def _get_redis():
+    from redis_jobs import get_job_manager
+    return await (await get_job_manager()).get_redis()
+
+
+# ============================================
+# EMBEDDING SIMILARITY
+# ============================================
+
+def _pack(vector: List[float]) -> str:
+    return base64.b64encode(array("f", vector).tobytes()).decode()
+
+
+def _unpack(packed: str) -> array:
+    vector = array("f")
+    vector.frombytes(base64.b64decode(packed))
+    return vector
+
+
+def _cosine(a, b) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+async def _embed(client, text: str) -> Optional[List[float]]:
+    try:
+        response = await client.embeddings.create(model=EMBEDDING_MODEL, input=" ".join(text.split()))
+        return response.data[0].embedding
+    except Exception as e:
+        logger.warning(f"LLM cache embedding failed, exact match only: {e}")
+        return None
+
+
+async def _nearest(r, similar_key: str, vector: List[float], threshold: float) -> Optional[str]:
+    """Cached content of the closest stored input at or above `threshold`."""
+    candidates = await r.hgetall(similar_key)
+    best_key, best = None, threshold
+    for key, packed in candidates.items():
+        score = _cosine(vector, _unpack(packed))
+        if score >= best:
+            best_key, best = key, score
+    if best_key is None:
+        return None
+    content = await r.get(best_key)
+    if content is None:
+        # Evicted or expired since: forget it
+        await r.hdel(similar_key, best_key)
+    return content
+
+
+# ============================================
+# CACHE
+# ============================================
+
+async def _store(
+    r,
+    key: str,
+    content: str,
+    policy: CachePolicy,
+    similar_key: Optional[str],
+    vector: Optional[List[float]],
+) -> None:
+    now = time.time()
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.set(key, content, ex=policy.ttl)
+        pipe.zadd(LLM_CACHE_INDEX, {key: now})
+        if similar_key and vector:
+            pipe.hset(similar_key, key, _pack(vector))
+            pipe.expire(similar_key, policy.ttl)
+        pipe.zcard(LLM_CACHE_INDEX)
+        size = (await pipe.execute())[-1]
+
+    if similar_key and vector and await r.hlen(similar_key) > SIMILAR_MAX_PER_SCOPE:
+        # Keep the scope's most recently used answers
+        fields = await r.hkeys(similar_key)
+        scores = await r.zmscore(LLM_CACHE_INDEX, fields)
+        by_age = sorted(zip(fields, scores), key=lambda pair: pair[1] or 0)
+        await r.hdel(similar_key, *[field for field, _ in by_age[:len(fields) - SIMILAR_MAX_PER_SCOPE]])
+
+    if size > LLM_CACHE_MAX_ENTRIES:
+        evicted = await r.zpopmin(LLM_CACHE_INDEX, size - LLM_CACHE_MAX_ENTRIES)
+        if evicted:
+            await r.delete(*[member for member, _ in evicted])
+
+
+async def cached(
+    client,
+    policy: CachePolicy,
+    create_kwargs: Dict[str, Any],
+    complete: Callable[[], Awaitable[str]],
+) -> Tuple[str, bool]:
+    """
+    Return (content, hit): the cached completion for this request, or
+    complete()'s result, which is cached for next time.
+    """
+    if not LLM_CACHE_ENABLED:
+        return await complete(), False
+
+    key = llm_cache_key(policy.site, create_kwargs)
+    try:
+        r = await _get_redis()
+        content = await r.get(key)
+        if content is not None:
+            await r.zadd(LLM_CACHE_INDEX, {key: time.time()})
+            LLM_CACHE_REQUESTS.labels(policy.site, "hit").inc()
+            return content, True
+    except Exception as e:
+        logger.warning(f"LLM cache unavailable: {e}")
+        LLM_CACHE_REQUESTS.labels(policy.site, "error").inc()
+        return await complete(), False
+
+    similar_key = vector = None
+    if policy.similar_text:
+        similar_key = _similar_key(policy, create_kwargs)
+        vector = await _embed(client, policy.similar_text)
+        if vector:
+            try:
+                content = await _nearest(r, similar_key, vector, policy.similarity)
+            except Exception as e:
+                logger.warning(f"LLM cache similarity lookup failed: {e}")
+                content = None
+            if content is not None:
+                LLM_CACHE_REQUESTS.labels(policy.site, "similar").inc()
+                return content, True
+
+    LLM_CACHE_REQUESTS.labels(policy.site, "miss").inc()
+    content = await complete()
+    try:
+        await _store(r, key, content, policy, similar_key, vector)
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {e}")
+    return content, False
@@ -5,6 +5,8 @@ import json
 from typing import List, Dict, Optional
 from config.openai_config import get_async_openai
 from prompts import SKILL_DETECTOR_PROMPT
+from .llm_cache import CachePolicy
+from .streaming import complete_json
 
 # System default model for learning agent - hardcoded to ensure consistency
 # Users pay monthly subscription, so we control the model used
@@ -17,6 +19,7 @@ async def async_chat_completion(
     temperature: float = 0.9,
     response_format: Optional[Dict] = None,
     api_key: Optional[str] = None,
+    cache: Optional[CachePolicy] = None,
 ) -> str:
     """
     Async chat completion wrapper.
@@ -24,6 +27,7 @@ async def async_chat_completion(
     Note: Model is hardcoded to gpt-4.1 by default.
     This ensures all learning agent operations use the platform's chosen model.
     User preferred models are ignored for consistency.
+    Pass `cache` to reuse the response to an identical earlier request.
     """
     client = get_async_openai(api_key)
     
@@ -35,8 +39,7 @@ async def async_chat_completion(
     if response_format:
         kwargs["response_format"] = response_format
     
-    response = await client.chat.completions.create(**kwargs)
-    return response.choices[0].message.content
+    return await complete_json(client, cache=cache, **kwargs)
 
 
 async def async_chat_completion_json(
@@ -75,6 +78,7 @@ async def detect_skill_level(message: str, api_key: Optional[str] = None) -> str
             model=SYSTEM_DEFAULT_MODEL,
             temperature=0.3,
             api_key=api_key,
+            cache=CachePolicy("skill_level"),
         )
         level = response.strip().lower()
         if level in ["beginner", "intermediate", "advanced", "expert"]:
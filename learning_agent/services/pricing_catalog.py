@@ -0,0 +1,475 @@
+"""
+AWS Price Catalogue
+===================
+Offline on-demand price table built from the AWS bulk price list.
+
+`refresh` downloads the regional offer files
+(pricing.us-east-1.amazonaws.com/offers/v1.0/aws/<ServiceCode>/current/<region>/index.json),
+keeps only OnDemand terms and writes a compact SQLite table:
+
+    prices(service_code, region, usage_type, operation, begin_range, unit, price_usd)
+    indexed by (service_code, region, usage_type)
+
+Offer files are parsed as a stream - the EC2 files are several GB - and the
+new table is swapped in atomically, so readers never see a partial
+catalogue. Usage types are stored without their region prefix
+("USW2-BoxUsage:t3.micro" -> "BoxUsage:t3.micro"), so lookups are the
+same in every region.
+
+`PriceCatalog` is the read side. Rates are looked up in batches and
+cached in memory until the file changes, so pricing a diagram needs no
+network access.
+
+Refresh in the background (the gunicorn master does this every
+PRICING_REFRESH_HOURS), or by hand:
+
+    python -m services.pricing_catalog refresh --regions us-east-1 eu-west-1
+    python -m services.pricing_catalog refresh --from-dir ./offers   # pre-downloaded index.json files
+"""
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = Path(os.getenv(
+    "PRICING_CATALOG_PATH",
+    Path(__file__).resolve().parent.parent / "data" / "pricing_catalog.sqlite3",
+))
+REFRESH_HOURS = float(os.getenv("PRICING_REFRESH_HOURS", "24"))
+REGIONS = os.getenv("PRICING_REGIONS", "us-east-1").split(",")
+OFFER_URL = "https://pricing.us-east-1.amazonaws.com/offers/v1.0/aws/{service_code}/current/{region}/index.json"
+GLOBAL_OFFER_URL = "https://pricing.us-east-1.amazonaws.com/offers/v1.0/aws/{service_code}/current/index.json"
+GLOBAL_REGION = "global"
+
+# Offers priced by the estimator (services/aws_pricing.USAGE_MODELS)
+DEFAULT_SERVICE_CODES = [
+    "AmazonEC2", "AmazonRDS", "AWSLambda", "AmazonApiGateway", "AmazonS3", "AmazonDynamoDB",
+    "AmazonElastiCache", "AWSELB", "AmazonECS", "AmazonEKS", "AmazonCloudFront", "AmazonCloudWatch",
+    "AWSQueueService", "AmazonSNS", "AmazonCognito", "AWSSecretsManager", "awskms", "AmazonRoute53",
+    "AWSStepFunctions", "AWSGlue", "AmazonAthena", "AmazonKinesis", "awswaf", "AmazonEFS",
+    "AmazonEventBridge",
+]
+
+# "USE1-", "USW2-", "EUC1-", "APS3-" ... (CloudFront's "US-"/"EU-" edge prefixes are kept)
+_REGION_PREFIX = re.compile(r"^[A-Z]{2,4}[0-9]-")
+
+SCHEMA = """
+CREATE TABLE prices (
+    service_code TEXT NOT NULL,
+    region       TEXT NOT NULL,
+    usage_type   TEXT NOT NULL,
+    operation    TEXT NOT NULL,
+    begin_range  REAL NOT NULL,
+    unit         TEXT,
+    price_usd    REAL NOT NULL
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# (operation, begin_range, price_usd) rows for one usage type
+Rates = List[Tuple[str, float, float]]
+
+
+def normalize_usage_type(usage_type: str) -> str:
+    return _REGION_PREFIX.sub("", usage_type, count=1)
+
+
+# =============================================================================
+# STREAMING OFFER PARSER
+# =============================================================================
+
+class _StreamReader:
+    """
+    Walks a JSON document member by member with JSONDecoder.raw_decode, so
+    only the value being decoded is held in memory.
+    """
+
+    _WS = re.compile(r"[\s,]*")
+
+    def __init__(self, fp: TextIO, chunk_size: int = 1 << 20):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> None:
+        data = self.fp.read(self.chunk_size)
+        self.eof = not data
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+
+    def _peek(self) -> str:
+        """Next significant character (whitespace and commas skipped)."""
+        while True:
+            self.pos = self._WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def _expect(self, ch: str) -> None:
+        if self._peek() != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+                # A number could continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def members(self) -> Iterator[str]:
+        """Yield the keys of the object at the cursor; the caller consumes each value."""
+        self._expect("{")
+        while self._peek() != "}":
+            key = self.value()
+            self._expect(":")
+            yield key
+        self.pos += 1
+
+
+def iter_offer(fp: TextIO) -> Iterator[Tuple[str, str, Dict]]:
+    """
+    Yield ("meta", key, value), ("product", sku, product) and
+    ("term", sku, on_demand_terms) from an offer file. Reading stops after
+    the OnDemand terms (reserved terms are not priced).
+    """
+    reader = _StreamReader(fp)
+    for key in reader.members():
+        if key == "products":
+            for sku in reader.members():
+                yield "product", sku, reader.value()
+        elif key == "terms":
+            seen_on_demand = False
+            for term_type in reader.members():
+                if term_type == "OnDemand":
+                    seen_on_demand = True
+                    for sku in reader.members():
+                        yield "term", sku, reader.value()
+                elif seen_on_demand:
+                    return
+                else:
+                    reader.value()
+        else:
+            yield "meta", key, reader.value()
+
+
+def parse_offer(fp: TextIO, region: str, meta: Dict[str, str]) -> Iterator[Tuple]:
+    """
+    Yield price rows (service_code, region, usage_type, operation, begin,
+    unit, usd); file metadata (offerCode, publicationDate...) goes to `meta`.
+    """
+    products: Dict[str, Tuple[str, str, str]] = {}
+    service_code = ""
+    for kind, key, value in iter_offer(fp):
+        if kind == "meta":
+            meta[key] = value if isinstance(value, str) else json.dumps(value)
+            service_code = meta.get("offerCode", service_code)
+        elif kind == "product":
+            attrs = value.get("attributes", {})
+            usage_type = attrs.get("usagetype")
+            if usage_type:
+                products[key] = (
+                    normalize_usage_type(usage_type),
+                    attrs.get("operation", ""),
+                    attrs.get("regionCode") or (region if attrs.get("location") else GLOBAL_REGION),
+                )
+        else:
+            product = products.get(key)
+            if product is None:
+                continue
+            usage_type, operation, product_region = product
+            for term in value.values():
+                for dimension in term.get("priceDimensions", {}).values():
+                    try:
+                        price = float(dimension.get("pricePerUnit", {})["USD"])
+                        begin = float(dimension.get("beginRange") or 0)
+                    except (KeyError, ValueError):
+                        continue
+                    yield (service_code, product_region, usage_type, operation,
+                           begin, dimension.get("unit"), price)
+
+
+# =============================================================================
+# BUILD / REFRESH
+# =============================================================================
+
+def _download(url: str, dest: Path) -> bool:
+    import httpx
+
+    with httpx.stream("GET", url, timeout=httpx.Timeout(60.0, read=300.0), follow_redirects=True) as response:
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        with open(dest, "wb") as out:
+            for chunk in response.iter_bytes(1 << 20):
+                out.write(chunk)
+    return True
+
+
+def _offer_files(regions: Sequence[str], service_codes: Sequence[str], from_dir: Optional[Path],
+                 workdir: Path) -> Iterator[Tuple[str, str, Path]]:
+    if from_dir:
+        # <dir>/<ServiceCode>/<region>/index.json, or <dir>/<ServiceCode>-<region>.json
+        for path in sorted(from_dir.rglob("*.json")):
+            parts = path.relative_to(from_dir).parts
+            if len(parts) >= 3:
+                yield parts[0], parts[1], path
+            elif "-" in path.stem:
+                code, region = path.stem.split("-", 1)
+                yield code, region, path
+        return
+    global_codes = set()
+    for region in regions:
+        for code in service_codes:
+            dest = workdir / f"{code}-{region}.json"
+            try:
+                if _download(OFFER_URL.format(service_code=code, region=region), dest):
+                    yield code, region, dest
+                elif code not in global_codes:
+                    # Global services (CloudFront, Route 53) only publish one offer file
+                    global_codes.add(code)
+                    dest = workdir / f"{code}-{GLOBAL_REGION}.json"
+                    if _download(GLOBAL_OFFER_URL.format(service_code=code), dest):
+                        yield code, GLOBAL_REGION, dest
+            except Exception as e:
+                logger.warning(f"Download failed for {code} in {region}: {e}")
+
+
+def build_catalog(
+    path: Path = CATALOG_PATH,
+    regions: Sequence[str] = REGIONS,
+    service_codes: Sequence[str] = DEFAULT_SERVICE_CODES,
+    from_dir: Optional[Path] = None,
+) -> Dict[str, int]:
+    """
+    Build a fresh catalogue and atomically replace `path`. Offers that fail
+    to download keep their rows from the previous catalogue.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".pricing-", suffix=".sqlite3", dir=path.parent)
+    os.close(fd)
+    tmp = Path(tmp_name)
+    counts: Dict[str, int] = {}
+    started = time.time()
+    try:
+        conn = sqlite3.connect(tmp)
+        conn.executescript(SCHEMA)
+        with tempfile.TemporaryDirectory(prefix="offers-") as workdir:
+            for code, region, offer_path in _offer_files(regions, service_codes, from_dir, Path(workdir)):
+                meta: Dict[str, str] = {}
+                before = conn.total_changes
+                with open(offer_path, encoding="utf-8") as fp:
+                    conn.executemany("INSERT INTO prices VALUES (?, ?, ?, ?, ?, ?, ?)", parse_offer(fp, region, meta))
+                counts[f"{code}:{region}"] = conn.total_changes - before
+                conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                             (f"published:{code}:{region}", meta.get("publicationDate", "")))
+                logger.info(f"Ingested {counts[f'{code}:{region}']} on-demand rates for {code} in {region}")
+                if not from_dir:
+                    offer_path.unlink()
+
+        # Carry over offers this run could not fetch
+        if path.exists():
+            conn.execute("ATTACH DATABASE ? AS previous", (str(path),))
+            conn.execute("""
+                INSERT INTO prices SELECT * FROM previous.prices p
+                WHERE NOT EXISTS (SELECT 1 FROM prices c WHERE c.service_code = p.service_code AND c.region = p.region)
+            """)
+            conn.execute("INSERT OR IGNORE INTO meta SELECT * FROM previous.meta")
+            conn.commit()
+            conn.execute("DETACH DATABASE previous")
+
+        # Compact: one row per rate key and tier - the cheapest, which for
+        # EC2/RDS is the Linux / shared-tenancy / open-source-engine price
+        conn.executescript("""
+            CREATE TABLE compact AS
+                SELECT service_code, region, usage_type, operation, begin_range, MIN(unit) AS unit, MIN(price_usd) AS price_usd
+                FROM prices GROUP BY service_code, region, usage_type, operation, begin_range;
+            DROP TABLE prices;
+            ALTER TABLE compact RENAME TO prices;
+            CREATE INDEX prices_key ON prices (service_code, region, usage_type);
+        """)
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (str(int(started)),))
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    logger.info(f"Price catalogue written to {path} in {time.time() - started:.1f}s")
+    return counts
+
+
+def catalog_age_hours(path: Path = CATALOG_PATH) -> Optional[float]:
+    try:
+        return (time.time() - path.stat().st_mtime) / 3600
+    except OSError:
+        return None
+
+
+def start_background_refresh(interval_hours: float = REFRESH_HOURS, path: Path = CATALOG_PATH) -> Optional[threading.Thread]:
+    """
+    Refresh the catalogue in a subprocess every `interval_hours` (started
+    from the gunicorn master, so workers only ever read the file).
+    """
+    if interval_hours <= 0:
+        return None
+
+    def loop():
+        while True:
+            age = catalog_age_hours(path)
+            wait = 0 if age is None else max(0.0, interval_hours - age) * 3600
+            time.sleep(wait)
+            result = subprocess.run(
+                [sys.executable, "-m", "services.pricing_catalog", "refresh", "--path", str(path)],
+                cwd=Path(__file__).resolve().parent.parent,
+            )
+            if result.returncode != 0:
+                logger.warning(f"Price catalogue refresh exited with {result.returncode}")
+                # Retry in an hour rather than a full interval
+                time.sleep(min(3600, interval_hours * 3600))
+
+    thread = threading.Thread(target=loop, name="pricing-refresh", daemon=True)
+    thread.start()
+    return thread
+
+
+# =============================================================================
+# READ SIDE
+# =============================================================================
+
+class PriceCatalog:
+    """
+    Read-only view of the catalogue with an in-memory rate cache.
+
+    `rates()` resolves many keys with one query per (service, region) and
+    remembers misses, so a repeated key never touches SQLite again. The
+    cache is dropped when the file is replaced by a refresh.
+    """
+
+    def __init__(self, path: Path = CATALOG_PATH):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._mtime: Optional[float] = None
+        self._checked = 0.0
+        self._cache: Dict[Tuple[str, str, str], Rates] = {}
+        self._lock = threading.Lock()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # Re-stat the file at most every 30s to pick up refreshes
+        now = time.monotonic()
+        if now - self._checked < 30:
+            return self._conn
+        self._checked = now
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            if self._conn:
+                self._conn.close()
+            self._conn = None
+            self._cache.clear()
+            self._mtime = mtime
+            if mtime is not None:
+                uri = f"file:{self.path}?mode=ro"
+                self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return self._conn
+
+    @property
+    def available(self) -> bool:
+        return self._connection() is not None
+
+    def rates(self, keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Rates]:
+        """(service_code, region, usage_type) -> [(operation, begin_range, price_usd)] ([] if unknown)."""
+        keys = set(keys)
+        with self._lock:
+            conn = self._connection()
+            missing = [key for key in keys if key not in self._cache]
+            if missing and conn is not None:
+                groups: Dict[Tuple[str, str], List[str]] = {}
+                for code, region, usage_type in missing:
+                    groups.setdefault((code, region), []).append(usage_type)
+                for (code, region), usage_types in groups.items():
+                    placeholders = ",".join("?" * len(usage_types))
+                    for usage_type, operation, begin, price in conn.execute(
+                        f"SELECT usage_type, operation, begin_range, price_usd FROM prices "
+                        f"WHERE service_code = ? AND region = ? AND usage_type IN ({placeholders}) "
+                        f"ORDER BY begin_range",
+                        (code, region, *usage_types),
+                    ):
+                        self._cache.setdefault((code, region, usage_type), []).append((operation, begin, price))
+            for key in missing:
+                self._cache.setdefault(key, [])
+            return {key: self._cache[key] for key in keys}
+
+    def rows(self, service_code: str, region: str, usage_type: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Catalogue rows for a service (optionally one usage type)."""
+        conn = self._connection()
+        if conn is None:
+            return []
+        sql = "SELECT usage_type, operation, begin_range, unit, price_usd FROM prices WHERE service_code = ? AND region = ?"
+        params: List = [service_code, region]
+        if usage_type:
+            sql += " AND usage_type = ?"
+            params.append(usage_type)
+        sql += " ORDER BY usage_type, begin_range LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            cursor = conn.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def refreshed_at(self) -> Optional[int]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        with self._lock:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        return int(row[0]) if row else None
+
+
+_catalog: Optional[PriceCatalog] = None
+
+
+def get_price_catalog() -> PriceCatalog:
+    """Get or create the process-wide catalogue reader."""
+    global _catalog
+    if _catalog is None:
+        _catalog = PriceCatalog()
+    return _catalog
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="AWS price catalogue")
+    sub = parser.add_subparsers(dest="command", required=True)
+    refresh = sub.add_parser("refresh", help="Download offer files and rebuild the catalogue")
+    refresh.add_argument("--regions", nargs="+", default=REGIONS)
+    refresh.add_argument("--services", nargs="+", default=DEFAULT_SERVICE_CODES)
+    refresh.add_argument("--from-dir", type=Path, help="Ingest pre-downloaded offer files instead")
+    refresh.add_argument("--path", type=Path, default=CATALOG_PATH)
+    args = parser.parse_args()
+    build_catalog(args.path, args.regions, args.services, args.from_dir)
@@ -1,159 +1,246 @@
 """
 Company research service with enhanced Crawl4AI integration.
+
+Research runs as a task graph: every web search starts at once, each URL a
+search returns is crawled as soon as it arrives, and results are merged in
+completion order, with a timeout on every step. Results are cached in Redis
+by normalized company name and industry.
 """
-from typing import Optional, List, Dict, Any
+import os
+import re
+import asyncio
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple
 from config.settings import logger
 from models.learning import CompanyInfo, ResearchResult
 from .web_search import search_web
 from .openai_service import async_chat_completion_json
-import asyncio
+
+SEARCH_TIMEOUT = float(os.getenv("RESEARCH_SEARCH_TIMEOUT", "8"))
+CRAWL_TIMEOUT = float(os.getenv("RESEARCH_CRAWL_TIMEOUT", "10"))
+KB_TIMEOUT = float(os.getenv("RESEARCH_KB_TIMEOUT", "8"))
+MAX_CRAWL_URLS = 5
+
+RESEARCH_CACHE_PREFIX = "research:company:"
+RESEARCH_CACHE_TTL = int(os.getenv("RESEARCH_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+# Below this the result was inferred without search data (or is the fallback): don't cache it
+MIN_CACHE_CONFIDENCE = 0.5
+
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co",
+    "company", "plc", "gmbh", "ag", "sa", "bv", "nv", "pty", "group", "holdings",
+}
+
+
+# ============================================
+# TASK GRAPH
+# ============================================
+
+class TaskGraph:
+    """
+    Concurrent steps, each with its own timeout, consumed in completion order.
+
+    Steps can be added while iterating (a crawl for a URL a search just
+    returned joins the same graph). A step that raises or times out completes
+    with the exception as its result, like gather(return_exceptions=True).
+    """
+
+    def __init__(self):
+        self._pending: Dict[asyncio.Task, Hashable] = {}
+
+    def add(self, key: Hashable, coro, timeout: float):
+        task = asyncio.create_task(asyncio.wait_for(coro, timeout))
+        self._pending[task] = key
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def completed(self) -> AsyncIterator[Tuple[Hashable, Any]]:
+        """Yield (key, result) as each step finishes; pending steps are cancelled if the consumer stops."""
+        try:
+            while self._pending:
+                done, _ = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    key = self._pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = e
+                    yield key, result
+        finally:
+            self.cancel()
+
+    def cancel(self):
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
+
+
+async def merge_events(*streams: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    """Interleave several event streams in arrival order."""
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def pump(stream):
+        try:
+            async for event in stream:
+                queue.put_nowait(event)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(finished)
+
+    tasks = [asyncio.create_task(pump(stream)) for stream in streams]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            event = await queue.get()
+            if event is finished:
+                remaining -= 1
+            elif isinstance(event, Exception):
+                raise event
+            else:
+                yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# ============================================
+# RESEARCH CACHE
+# ============================================
+
+def research_cache_key(company_name: str, industry: Optional[str] = None) -> str:
+    """'Acme, Inc.' + 'FinTech' -> 'research:company:acme:fintech'."""
+    words = re.findall(r"\w+", company_name.casefold())
+    if words and words[0] == "the" and len(words) > 1:
+        words = words[1:]
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    industry_words = re.findall(r"\w+", (industry or "").casefold())
+    return f"{RESEARCH_CACHE_PREFIX}{'-'.join(words)}:{'-'.join(industry_words)}"
 
 
-async def _crawl_url(url: str, timeout: int = 10) -> Optional[Dict[str, str]]:
-    """Crawl a single URL and extract content using Crawl4AI."""
+async def _cached_research(key: str) -> Optional[ResearchResult]:
     try:
-        from crawl4ai import AsyncWebCrawler
-        
-        async with AsyncWebCrawler(verbose=False) as crawler:
-            result = await asyncio.wait_for(
-                crawler.arun(url=url),
-                timeout=timeout
-            )
-            
-            if result.success and result.markdown:
-                # Extract first 8000 chars of markdown content
-                content = result.markdown[:8000]
-                return {
-                    "url": url,
-                    "content": content,
-                    "title": result.url,  # Use URL as fallback title
-                }
-    except asyncio.TimeoutError:
-        logger.warning(f"Crawl timeout for {url}")
+        from redis_jobs import get_job_manager
+        r = await (await get_job_manager()).get_redis()
+        raw = await r.get(key)
+        return ResearchResult.model_validate_json(raw) if raw else None
+    except Exception as e:
+        logger.warning(f"Research cache read failed: {e}")
+        return None
+
+
+async def _cache_research(key: str, result: ResearchResult):
+    if result.confidence < MIN_CACHE_CONFIDENCE:
+        return
+    try:
+        from redis_jobs import get_job_manager
+        r = await (await get_job_manager()).get_redis()
+        await r.set(key, result.model_dump_json(), ex=RESEARCH_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Research cache write failed: {e}")
+
+
+# ============================================
+# RESEARCH STEPS
+# ============================================
+
+async def _crawl_url(url: str) -> Optional[Dict[str, str]]:
+    """Crawl a single URL and extract content using the shared Crawl4AI browser pool."""
+    try:
+        from crawl.browser_pool import get_browser_pool
+
+        result = await get_browser_pool().arun(url=url)
+
+        if result.success and result.markdown:
+            # Extract first 8000 chars of markdown content
+            content = result.markdown[:8000]
+            return {
+                "url": url,
+                "content": content,
+                "title": result.url,  # Use URL as fallback title
+            }
     except Exception as e:
         logger.warning(f"Failed to crawl {url}: {e}")
-    
+
     return None
 
 
-async def _enrich_with_aws_knowledge(company_info: CompanyInfo, industry: Optional[str] = None) -> str:
-    """Enrich company research with AWS knowledge base patterns."""
+async def _search_knowledge(kb_query: str, limit: int) -> List[Dict[str, Any]]:
+    import db
+    from config.openai_config import get_async_openai
+
+    client = get_async_openai()
+    embed_response = await client.embeddings.create(
+        model="text-embedding-3-small",
+        input=kb_query
+    )
+    return await db.search_knowledge_chunks(
+        query_embedding=embed_response.data[0].embedding,
+        limit=limit
+    )
+
+
+async def knowledge_events(kb_query: str, limit: int = 5) -> AsyncIterator[Dict[str, Any]]:
+    """
+    AWS knowledge base retrieval as scenario events.
+
+    Ends with a 'knowledge_context' event carrying the prompt context; that
+    one is for the caller, not the client.
+    """
+    knowledge_context = ""
+    knowledge_topics = []
     try:
-        import db
-        from openai import AsyncOpenAI
-        import os
-        
-        # Build query for AWS knowledge
-        kb_query_parts = []
-        if industry:
-            kb_query_parts.append(industry)
-        if company_info.compliance_requirements:
-            kb_query_parts.extend(company_info.compliance_requirements[:2])
-        
-        kb_query = f"{' '.join(kb_query_parts)} AWS architecture patterns best practices"
-        
-        # Get embedding
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return ""
-        
-        client = AsyncOpenAI(api_key=api_key)
-        embed_response = await client.embeddings.create(
-            model="text-embedding-3-small",
-            input=kb_query
-        )
-        query_embedding = embed_response.data[0].embedding
-        
-        # Search knowledge base
-        kb_results = await db.search_knowledge_chunks(
-            query_embedding=query_embedding,
-            limit=3
-        )
-        
+        kb_results = await asyncio.wait_for(_search_knowledge(kb_query, limit), KB_TIMEOUT)
         if kb_results:
-            aws_context = "\n\n=== AWS BEST PRACTICES FOR THIS INDUSTRY ===\n"
+            yield {"type": "status", "message": f"📖 Found {len(kb_results)} relevant AWS knowledge chunks"}
             for chunk in kb_results:
-                aws_context += f"\nAWS Knowledge ({chunk['url']}):\n{chunk['content'][:1000]}\n"
-            return aws_context
-    except Exception as e:
-        logger.warning(f"AWS knowledge enrichment failed: {e}")
-    
-    return ""
+                yield {"type": "knowledge", "url": chunk["url"], "similarity": round(chunk["similarity"], 2)}
+                knowledge_context += f"\n\nAWS Knowledge ({chunk['url']}):\n{chunk['content'][:500]}"
+                chunk_content = chunk["content"].lower()
+                for svc in ['s3', 'ec2', 'lambda', 'rds', 'dynamodb', 'cloudwatch', 'iam', 'vpc', 'cloudfront', 'sns', 'sqs', 'kms', 'cloudtrail', 'config']:
+                    if svc in chunk_content and svc.upper() not in knowledge_topics:
+                        knowledge_topics.append(svc.upper())
 
+            if knowledge_topics:
+                knowledge_context += f"\n\n⚡ IMPORTANT: Base your challenge titles on these specific AWS topics found: {', '.join(knowledge_topics[:5])}. Create action-oriented titles like 'Secure the S3 Buckets' or 'Configure CloudWatch Alarms' - NOT generic titles like 'Understanding X'."
+        else:
+            yield {"type": "status", "message": "📖 No specific knowledge chunks found, using general AWS knowledge"}
+    except Exception as kb_err:
+        logger.warning(f"Knowledge base search failed: {kb_err!r}")
+        yield {"type": "status", "message": "⚠️ Knowledge base search skipped"}
+    yield {"type": "knowledge_context", "context": knowledge_context}
 
-async def research_company(company_name: str, industry: Optional[str] = None, api_key: Optional[str] = None) -> ResearchResult:
-    """
-    Research a company using:
-    1. Brave web search for discovery
-    2. Crawl4AI for full page content extraction
-    3. AWS knowledge base for industry patterns
-    4. AI analysis for structured output
-    """
+
+async def _analyze(
+    company_name: str,
+    industry: Optional[str],
+    snippets: List[str],
+    pages: List[Dict[str, str]],
+    sources: List[str],
+    api_key: Optional[str],
+) -> ResearchResult:
+    """Merge search snippets and crawled pages and have the model structure them."""
     from utils import get_request_model
-    logger.info(f"🔍 Researching company: {company_name}")
-    
-    # Step 1: Comprehensive web searches
-    queries = [
-        f"{company_name} company overview business model",
-        f"{company_name} technology stack infrastructure cloud",
-        f"{company_name} AWS services cloud architecture",
-        f"{company_name} security compliance certifications HIPAA PCI GDPR SOC2",
-        f"{company_name} data privacy regulations",
-        f"{company_name} scalability traffic patterns",
-    ]
-    
-    if industry:
-        queries.extend([
-            f"{company_name} {industry} industry challenges",
-            f"{company_name} {industry} digital transformation cloud",
-        ])
-    
-    # Step 2: Gather URLs from search results
-    logger.info(f"📡 Running {len(queries)} targeted searches...")
-    all_snippets = []
-    top_urls = []
-    sources = []
-    
-    for query in queries:
-        results = await search_web(query, max_results=2)
-        for r in results:
-            snippet = r.get("content", "")
-            if snippet:
-                all_snippets.append(snippet)
-            url = r.get("url")
-            if url and url not in top_urls:
-                top_urls.append(url)
-                sources.append(url)
-    
-    # Step 3: Crawl top URLs for full content
-    logger.info(f"🕷️ Crawling {min(len(top_urls), 5)} pages for full content...")
-    crawl_tasks = [_crawl_url(url) for url in top_urls[:5]]
-    crawled_results = await asyncio.gather(*crawl_tasks, return_exceptions=True)
-    
-    full_content = []
-    for result in crawled_results:
-        if isinstance(result, dict) and result:
-            full_content.append(result)
-    
-    logger.info(f"✅ Successfully crawled {len(full_content)} pages")
-    
-    # Step 4: Combine all information
+
     combined_info = ""
-    
+
     # Add search snippets
-    if all_snippets:
+    if snippets:
         combined_info += "=== SEARCH RESULTS OVERVIEW ===\n"
-        combined_info += "\n".join(all_snippets[:10])
+        combined_info += "\n".join(snippets[:10])
         combined_info += "\n\n"
-    
+
     # Add full crawled content
-    if full_content:
+    if pages:
         combined_info += "=== DETAILED PAGE CONTENT ===\n"
-        for idx, page in enumerate(full_content, 1):
+        for idx, page in enumerate(pages, 1):
             combined_info += f"\n--- Source {idx}: {page['url']} ---\n"
             combined_info += page['content']
             combined_info += "\n\n"
-    
+
     # Fallback if no content found
     if not combined_info:
         logger.warning(f"⚠️ No research data found for {company_name}, using inference")
@@ -162,15 +249,14 @@ async def research_company(company_name: str, industry: Optional[str] = None, ap
     else:
         # Calculate confidence based on data richness
         confidence = 0.5  # Base
-        if len(full_content) > 0:
+        if len(pages) > 0:
             confidence += 0.2
-        if len(full_content) >= 3:
+        if len(pages) >= 3:
             confidence += 0.1
-        if len(all_snippets) >= 8:
+        if len(snippets) >= 8:
             confidence += 0.1
         confidence = min(confidence, 0.95)
-    
-    # Step 5: AI analysis with rich context
+
     logger.info("🤖 Analyzing research data with AI...")
     try:
         system_prompt = """You are an expert business and cloud architecture research analyst.
@@ -212,23 +298,13 @@ Provide comprehensive analysis based on all available information."""},
             model=get_request_model(),
             api_key=api_key,
         )
-        
+
         company_info = CompanyInfo(**result)
-        
-        # Step 6: Enrich with AWS knowledge base (async, don't block on failure)
-        logger.info("📚 Enriching with AWS knowledge base...")
-        try:
-            aws_context = await _enrich_with_aws_knowledge(company_info, industry)
-            if aws_context:
-                logger.info("✅ Added AWS best practices context")
-        except Exception as kb_err:
-            logger.warning(f"AWS knowledge enrichment skipped: {kb_err}")
-        
         logger.info(f"✅ Research complete for {company_name} (confidence: {confidence:.0%})")
-        
+
         return ResearchResult(
             company_info=company_info,
-            sources=list(set(sources))[:10],  # Return up to 10 sources
+            sources=list(dict.fromkeys(sources))[:10],  # Return up to 10 sources
             confidence=confidence
         )
     except Exception as e:
@@ -248,3 +324,91 @@ Provide comprehensive analysis based on all available information."""},
             sources=[],
             confidence=0.2
         )
+
+
+# ============================================
+# COMPANY RESEARCH
+# ============================================
+
+async def research_company_events(
+    company_name: str,
+    industry: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Research a company, yielding progress events as steps complete:
+    1. Brave web searches (all at once)
+    2. Crawl4AI page extraction for the first URLs the searches return
+    3. AI analysis of the merged results
+
+    'search', 'source' and 'status' events are client-ready. The last event
+    is {'type': 'research', 'company': ..., 'sources': ..., 'result': ResearchResult}.
+    """
+    key = research_cache_key(company_name, industry)
+    cached = await _cached_research(key)
+    if cached:
+        logger.info(f"🔍 Research cache hit for {company_name}")
+        for url in cached.sources[:5]:
+            yield {"type": "source", "url": url, "title": "Source (cached)"}
+        yield {"type": "research", "company": cached.company_info.model_dump(), "sources": cached.sources[:5], "result": cached}
+        return
+
+    logger.info(f"🔍 Researching company: {company_name}")
+    queries = [
+        f"{company_name} company overview business model",
+        f"{company_name} technology stack infrastructure cloud",
+        f"{company_name} AWS services cloud architecture",
+        f"{company_name} security compliance certifications HIPAA PCI GDPR SOC2",
+        f"{company_name} data privacy regulations",
+        f"{company_name} scalability traffic patterns",
+    ]
+
+    if industry:
+        queries.extend([
+            f"{company_name} {industry} industry challenges",
+            f"{company_name} {industry} digital transformation cloud",
+        ])
+
+    graph = TaskGraph()
+    for query in queries:
+        graph.add(("search", query), search_web(query, max_results=2), SEARCH_TIMEOUT)
+
+    snippets: List[str] = []
+    sources: List[str] = []
+    pages: List[Dict[str, str]] = []
+    crawls_started = 0
+
+    async for (step, target), result in graph.completed():
+        if isinstance(result, Exception):
+            logger.warning(f"Research {step} for {target} failed: {result!r}")
+            continue
+
+        if step == "search":
+            yield {"type": "search", "message": f"🌐 Searched: {target}"}
+            for r in result:
+                if r.get("content"):
+                    snippets.append(r["content"])
+                url = r.get("url")
+                if url and url not in sources:
+                    sources.append(url)
+                    yield {"type": "source", "url": url, "title": r.get("title", "Source")}
+                    if crawls_started < MAX_CRAWL_URLS:
+                        crawls_started += 1
+                        graph.add(("crawl", url), _crawl_url(url), CRAWL_TIMEOUT)
+        elif step == "crawl" and result:
+            pages.append(result)
+            yield {"type": "status", "message": f"📄 Read {target}"}
+
+    logger.info(f"✅ {len(sources)} sources, crawled {len(pages)}/{crawls_started} pages")
+    yield {"type": "status", "message": "🧠 Analyzing company information..."}
+
+    research = await _analyze(company_name, industry, snippets, pages, sources, api_key)
+    await _cache_research(key, research)
+    yield {"type": "research", "company": research.company_info.model_dump(), "sources": research.sources[:5], "result": research}
+
+
+async def research_company(company_name: str, industry: Optional[str] = None, api_key: Optional[str] = None) -> ResearchResult:
+    """Research a company (see research_company_events) and return the result."""
+    async for event in research_company_events(company_name, industry, api_key):
+        if event["type"] == "research":
+            return event["result"]
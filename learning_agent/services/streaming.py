@@ -0,0 +1,120 @@
+"""
+Streamed generation over server-sent events.
+
+Generators opt in by taking an `on_item` callback and making their JSON
+completion through complete_json(). Without a callback that is the usual
+blocking call. With one, the completion is streamed and each finished
+element of the named top-level arrays (cards, questions, sections, weeks,
+businesses) is handed to the callback as soon as its closing bracket
+arrives, typically a second or two into a 20-60 s completion.
+
+Endpoints expose a generator with stream_generation(): the usual endpoint
+body runs as a task with the callback wired to an SSE response.
+
+    start    {"type": "status", "message": "started"}
+    item     {"type": "item", "key": "cards", "index": 0, "item": {...}}
+    complete {"type": "complete", "result": <the blocking endpoint's JSON>}
+    error    {"type": "error", "status": 500, "message": "..."}
+
+Items are the model's output as parsed, or whatever the generator passes
+on; the complete event carries the validated final payload and is the
+source of truth.
+
+complete_json() is also where deterministic calls opt into the response
+cache (services/llm_cache.py) with a CachePolicy. A cached completion is
+replayed through the parser, so streamed endpoints still get their items.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from config.settings import logger
+from shared.streaming import SSE_HEADERS, StreamingArrayParser, sse
+from utils import ApiKeyRequiredError
+from .llm_cache import CachePolicy, cached
+
+ItemCallback = Callable[[str, Any], None]
+
+
+async def complete_json(
+    client,
+    on_item: Optional[ItemCallback] = None,
+    item_keys: Iterable[str] = (),
+    cache: Optional[CachePolicy] = None,
+    **create_kwargs,
+) -> str:
+    """
+    Run a chat completion and return the message content.
+
+    With `on_item`, the completion is streamed and on_item(key, item) is
+    called for every element of the `item_keys` arrays as it completes.
+    With `cache`, an identical earlier request's content is returned
+    instead of calling the model.
+    """
+    if cache is not None:
+        content, hit = await cached(
+            client, cache, create_kwargs, lambda: complete_json(client, on_item, item_keys, **create_kwargs)
+        )
+        if hit and on_item is not None:
+            for key, item in StreamingArrayParser(item_keys).feed(content):
+                if item is not None:
+                    on_item(key, item)
+        return content
+
+    if on_item is None:
+        response = await client.chat.completions.create(**create_kwargs)
+        return response.choices[0].message.content
+
+    parser = StreamingArrayParser(item_keys)
+    parts = []
+    stream = await client.chat.completions.create(stream=True, **create_kwargs)
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        parts.append(delta)
+        for key, item in parser.feed(delta):
+            if item is not None:
+                on_item(key, item)
+    return "".join(parts)
+
+
+def stream_generation(run: Callable[[ItemCallback], Awaitable[Any]]) -> StreamingResponse:
+    """
+    Stream `run(on_item)` as server-sent events.
+
+    `run` is the endpoint body: it sets up the request (API key, model),
+    passes on_item to the generator and returns the blocking endpoint's
+    response. HTTPException and ApiKeyRequiredError become error events
+    with the status the blocking endpoint would have returned.
+    """
+
+    async def events():
+        queue: asyncio.Queue = asyncio.Queue()
+        counts: Dict[str, int] = {}
+        task = asyncio.create_task(run(lambda key, item: queue.put_nowait((key, item))))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            yield sse({"type": "status", "message": "started"})
+            while (entry := await queue.get()) is not None:
+                key, item = entry
+                index = counts.get(key, 0)
+                counts[key] = index + 1
+                yield sse({"type": "item", "key": key, "index": index, "item": jsonable_encoder(item)})
+            yield sse({"type": "complete", "result": jsonable_encoder(task.result())})
+        except HTTPException as e:
+            yield sse({"type": "error", "status": e.status_code, "message": str(e.detail)})
+        except ApiKeyRequiredError as e:
+            yield sse({"type": "error", "status": 402, "message": str(e)})
+        except Exception as e:
+            logger.error(f"Stream generation error: {e}")
+            yield sse({"type": "error", "status": 500, "message": str(e)})
+        finally:
+            # Client disconnected mid-stream
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
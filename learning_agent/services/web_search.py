@@ -1,36 +1,162 @@
 """
 Web search service using Brave Search API.
+
+Results are cached in Redis for SEARCH_CACHE_TTL_SECONDS, keyed by the
+normalized (query, count, language). Identical searches in flight at the
+same time share one upstream request: within a process through a shared
+task, across gunicorn workers through a short Redis lock the others wait
+on. Upstream calls are rate limited per Brave API key to
+BRAVE_RATE_PER_SECOND, and a 429 or an exhausted quota window pauses the
+key until Brave's reported reset time. Outcomes are exported on /metrics.
 """
-from typing import List, Dict, Any
+import os
+import json
+import time
+import asyncio
+import hashlib
+import uuid
+from typing import List, Dict, Any, Optional
+from prometheus_client import Counter, Histogram
 from config.settings import logger
 from .deps import get_agent_deps
 
+BRAVE_SEARCH_URL = os.getenv("BRAVE_SEARCH_URL", "https://api.search.brave.com/res/v1/web/search")
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(24 * 3600)))
+# Brave Free allows 1 request/second, Base 20, Pro 50
+BRAVE_RATE_PER_SECOND = int(os.getenv("BRAVE_RATE_PER_SECOND", "1"))
+# Longest a search waits for a rate-limit slot before giving up
+BRAVE_RATE_WAIT_SECONDS = float(os.getenv("BRAVE_RATE_WAIT_SECONDS", "10"))
+LOCK_MS = 15000
 
-async def search_web(query: str, max_results: int = 5, language: str = "en") -> List[Dict[str, Any]]:
-    """Search the web using Brave Search API"""
-    deps = get_agent_deps()
-    if not deps.brave_api_key:
-        logger.warning("No Brave API key configured")
-        return []
-    
+# Delete the lock only if it still holds our token
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+SEARCH_CACHE_PREFIX = "search:brave:"
+
+SEARCH_REQUESTS = Counter(
+    "archistry_search_requests",
+    "Web searches by outcome (hit, miss, coalesced, error, rate_limited)",
+    ["outcome"],
+)
+UPSTREAM_SECONDS = Histogram(
+    "archistry_search_upstream_seconds",
+    "Brave Search API latency",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+def search_cache_key(query: str, count: int, language: str) -> str:
+    normalized = " ".join(query.casefold().split())
+    digest = hashlib.sha1(f"{normalized}\n{count}\n{language.lower()}".encode()).hexdigest()
+    return f"{SEARCH_CACHE_PREFIX}{digest}"
+
+
+async def _get_redis():
+    from redis_jobs import get_job_manager
+    return await (await get_job_manager()).get_redis()
+
+
+# ============================================
+# RATE LIMITING
+# ============================================
+
+def _key_id(api_key: str) -> str:
+    return hashlib.sha1(api_key.encode()).hexdigest()[:12]
+
+
+async def _acquire_rate_slot(r, api_key: str) -> bool:
+    """Wait for a slot in this API key's per-second budget (shared by all workers)."""
+    key_id = _key_id(api_key)
+    cooldown_key = f"{SEARCH_CACHE_PREFIX}cooldown:{key_id}"
+    deadline = time.monotonic() + BRAVE_RATE_WAIT_SECONDS
+    while True:
+        now = time.time()
+        cooldown_ms = await r.pttl(cooldown_key)
+        if cooldown_ms > 0:
+            wait = cooldown_ms / 1000
+        else:
+            window = int(now)
+            rate_key = f"{SEARCH_CACHE_PREFIX}rate:{key_id}:{window}"
+            async with r.pipeline(transaction=True) as pipe:
+                used, _ = await pipe.incr(rate_key).expire(rate_key, 2).execute()
+            if used <= BRAVE_RATE_PER_SECOND:
+                return True
+            wait = window + 1 - now
+        if time.monotonic() + wait > deadline:
+            return False
+        await asyncio.sleep(wait + 0.01)
+
+
+async def _note_quota(r, api_key: str, response) -> None:
+    """
+    Pause the key when Brave says a quota window is used up.
+
+    Brave reports each window (per second, per month) as a comma-separated
+    list: X-RateLimit-Remaining "0, 14999", X-RateLimit-Reset "1, 1419704".
+    """
+    pause = 0.0
     try:
-        response = await deps.http_client.get(
-            "https://api.search.brave.com/res/v1/web/search",
-            params={
-                "q": query,
-                "count": max_results,
-                "search_lang": language,
-                "result_filter": "web",
-            },
-            headers={
-                "Accept": "application/json",
-                "Accept-Language": "en-US,en;q=0.9",
-                "X-Subscription-Token": deps.brave_api_key
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-        
+        remaining = [int(v) for v in response.headers.get("X-RateLimit-Remaining", "").split(",") if v.strip()]
+        reset = [int(v) for v in response.headers.get("X-RateLimit-Reset", "").split(",") if v.strip()]
+        for left, seconds in zip(remaining, reset):
+            if left <= 0:
+                pause = max(pause, seconds)
+        if response.status_code == 429:
+            pause = max(pause, float(response.headers.get("Retry-After", 0) or 0), 1.0)
+    except ValueError:
+        pause = 1.0 if response.status_code == 429 else 0.0
+    if pause > 0:
+        logger.warning(f"Brave quota reached, pausing searches for {pause:.0f}s")
+        await r.set(f"{SEARCH_CACHE_PREFIX}cooldown:{_key_id(api_key)}", "1", px=int(pause * 1000))
+
+
+# ============================================
+# SEARCH
+# ============================================
+
+async def _fetch(r, query: str, count: int, language: str) -> Optional[List[Dict[str, Any]]]:
+    """Call Brave (within the rate limit). None means failed - don't cache."""
+    deps = get_agent_deps()
+    for attempt in range(2):
+        if r is not None and not await _acquire_rate_slot(r, deps.brave_api_key):
+            SEARCH_REQUESTS.labels("rate_limited").inc()
+            logger.warning(f"Brave search rate limited, skipping: {query}")
+            return None
+
+        try:
+            with UPSTREAM_SECONDS.time():
+                response = await deps.http_client.get(
+                    BRAVE_SEARCH_URL,
+                    params={
+                        "q": query,
+                        "count": count,
+                        "search_lang": language,
+                        "result_filter": "web",
+                    },
+                    headers={
+                        "Accept": "application/json",
+                        "Accept-Language": "en-US,en;q=0.9",
+                        "X-Subscription-Token": deps.brave_api_key
+                    }
+                )
+            if r is not None:
+                await _note_quota(r, deps.brave_api_key, response)
+            if response.status_code == 429 and attempt == 0 and r is not None:
+                continue  # wait out the cooldown once
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            SEARCH_REQUESTS.labels("error").inc()
+            logger.error(f"Brave search failed: {e}")
+            return None
+
         # Transform Brave results to match expected format
         results = []
         for item in data.get("web", {}).get("results", []):
@@ -40,6 +166,74 @@ async def search_web(query: str, max_results: int = 5, language: str = "en") ->
                 "content": item.get("description", ""),
             })
         return results
+
+
+async def _cached_search(key: str, query: str, count: int, language: str) -> List[Dict[str, Any]]:
+    try:
+        r = await _get_redis()
+        cached = await r.get(key)
+    except Exception as e:
+        logger.warning(f"Search cache unavailable: {e}")
+        SEARCH_REQUESTS.labels("miss").inc()
+        return await _fetch(None, query, count, language) or []
+
+    if cached is not None:
+        SEARCH_REQUESTS.labels("hit").inc()
+        return json.loads(cached)
+
+    # Another worker may already be fetching this query: wait for its result.
+    # The lock value is ours alone, so we never release a lock that expired
+    # and was taken by another worker while we were fetching.
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + LOCK_MS / 1000
+    waited = False
+    while not (held := await r.set(lock_key, token, nx=True, px=LOCK_MS)):
+        if time.monotonic() >= deadline:
+            break  # the holder is stuck - fetch without the lock
+        waited = True
+        await asyncio.sleep(0.05)
+        cached = await r.get(key)
+        if cached is not None:
+            SEARCH_REQUESTS.labels("coalesced").inc()
+            return json.loads(cached)
+    if held and waited:
+        # The holder stores the result before releasing the lock
+        cached = await r.get(key)
+        if cached is not None:
+            await r.eval(_RELEASE_LOCK, 1, lock_key, token)
+            SEARCH_REQUESTS.labels("coalesced").inc()
+            return json.loads(cached)
+
+    SEARCH_REQUESTS.labels("miss").inc()
+    try:
+        results = await _fetch(r, query, count, language)
+        if results is not None:
+            await r.set(key, json.dumps(results), ex=SEARCH_CACHE_TTL)
+    finally:
+        if held:
+            await r.eval(_RELEASE_LOCK, 1, lock_key, token)
+    return results or []
+
+
+async def search_web(query: str, max_results: int = 5, language: str = "en") -> List[Dict[str, Any]]:
+    """Search the web using Brave Search API (cached, coalesced, rate limited)"""
+    deps = get_agent_deps()
+    if not deps.brave_api_key:
+        logger.warning("No Brave API key configured")
+        return []
+
+    key = search_cache_key(query, max_results, language)
+    task = _inflight.get(key)
+    if task is not None:
+        SEARCH_REQUESTS.labels("coalesced").inc()
+    else:
+        task = asyncio.create_task(_cached_search(key, query, max_results, language))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded so one caller timing out doesn't cancel the search for the others
+    try:
+        return list(await asyncio.shield(task))
     except Exception as e:
-        logger.error(f"Brave search failed: {e}")
+        logger.error(f"Web search failed: {e}")
         return []
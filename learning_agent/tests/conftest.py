@@ -0,0 +1,43 @@
+"""
+Shared fixtures: a throwaway redis-server for tests that need real Redis
+semantics (streams, pipelines, key expiry).
+"""
+import time
+import shutil
+import socket
+import subprocess
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def redis_url():
+    if not shutil.which("redis-server"):
+        pytest.skip("redis-server not installed")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    proc = subprocess.Popen(
+        ["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    yield f"redis://127.0.0.1:{port}"
+    proc.terminate()
+    proc.wait()
+
+
+@pytest.fixture
+async def r(redis_url):
+    import redis.asyncio as redis
+
+    client = redis.from_url(redis_url, decode_responses=True)
+    await client.flushdb()
+    yield client
+    await client.aclose()
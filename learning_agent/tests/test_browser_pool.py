@@ -0,0 +1,122 @@
+"""
+Browser Pool Tests
+==================
+Slot hand-out, page reuse and recycling of crawl/browser_pool.py, with
+AsyncWebCrawler replaced by an in-memory fake (no Chromium needed).
+
+Run with: pytest tests/test_browser_pool.py -v
+"""
+import sys
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("crawl4ai")
+pytest.importorskip("sentence_transformers")
+
+from crawl import browser_pool  # noqa: E402
+from crawl.browser_pool import BrowserPool  # noqa: E402
+
+
+class FakeCrawler:
+    launched = 0
+
+    def __init__(self, config=None):
+        self.closed = False
+        self.sessions_killed = []
+        self.crawler_strategy = SimpleNamespace(kill_session=self._kill)
+        self.active = 0
+        self.max_active = 0
+
+    async def _kill(self, session_id):
+        self.sessions_killed.append(session_id)
+
+    async def start(self):
+        FakeCrawler.launched += 1
+
+    async def close(self):
+        self.closed = True
+
+    async def arun(self, url, config=None):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if "fail" in url:
+            raise RuntimeError("navigation failed")
+        return SimpleNamespace(success=True, url=url, session_id=config.session_id)
+
+
+@pytest.fixture(autouse=True)
+def fake_crawler(monkeypatch):
+    FakeCrawler.launched = 0
+    monkeypatch.setattr(browser_pool, "AsyncWebCrawler", FakeCrawler)
+
+
+async def test_pages_reuse_one_session_per_slot():
+    pool = BrowserPool(size=2, recycle_pages=0)
+    await pool.start()
+    assert FakeCrawler.launched == 2
+
+    results = await asyncio.gather(*(pool.arun(f"https://a/{i}") for i in range(8)))
+    assert len({r.session_id for r in results}) == 2
+    # One page at a time per browser
+    assert all(slot.crawler.max_active == 1 for slot in pool._slots)
+    assert pool.stats()["pages_served"] == 8
+    await pool.close()
+
+
+async def test_slot_recycled_after_page_budget():
+    pool = BrowserPool(size=1, recycle_pages=3)
+    await pool.start()
+    first = pool._slots[0].crawler
+    for i in range(4):
+        await pool.arun(f"https://a/{i}")
+    assert first.closed
+    assert FakeCrawler.launched == 2
+    assert pool.recycled == 1 and pool._slots[0].pages == 1
+    await pool.close()
+
+
+async def test_failed_page_drops_reused_session():
+    pool = BrowserPool(size=1, recycle_pages=0)
+    ok = await pool.arun("https://a/ok")  # starts the pool lazily
+    with pytest.raises(RuntimeError):
+        await pool.arun("https://a/fail")
+    after = await pool.arun("https://a/ok")
+    assert pool._slots[0].crawler.sessions_killed == [ok.session_id]
+    assert after.session_id != ok.session_id
+    await pool.close()
+
+
+async def test_restart_after_close_hands_out_each_slot_once():
+    pool = BrowserPool(size=2, recycle_pages=0)
+    await pool.start()
+    await pool.close()
+    await pool.start()
+    assert pool.stats()["idle"] == 2
+    assert all(slot.crawler and not slot.crawler.closed for slot in pool._slots)
+    await pool.close()
+
+
+async def test_failed_launch_closes_the_browsers_that_started(monkeypatch):
+    started = []
+
+    class FlakyCrawler(FakeCrawler):
+        async def start(self):
+            await super().start()
+            if FakeCrawler.launched == 2:
+                raise RuntimeError("chromium crashed")
+            started.append(self)
+
+    monkeypatch.setattr(browser_pool, "AsyncWebCrawler", FlakyCrawler)
+    pool = BrowserPool(size=3, recycle_pages=0)
+    with pytest.raises(RuntimeError, match="chromium crashed"):
+        await pool.start()
+    assert len(started) == 2 and all(crawler.closed for crawler in started)
+    assert all(slot.crawler is None for slot in pool._slots)
+    assert pool.stats()["idle"] == 0 and not pool._started
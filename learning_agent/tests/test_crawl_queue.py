@@ -0,0 +1,132 @@
+"""
+Crawl Queue Tests
+=================
+Runs the crawl work queue and per-URL checkpoints against a throwaway
+redis-server (conftest.py; skipped if it is not installed).
+
+Run with: pytest tests/test_crawl_queue.py -v
+"""
+import os
+import sys
+import asyncio
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from redis_jobs import CrawlCheckpoint, CrawlQueue  # noqa: E402
+
+
+async def test_entries_are_acked_and_deleted(r):
+    queue = CrawlQueue(r)
+    await queue.enqueue("job1")
+    await queue.ensure_group()  # group created after the enqueue still sees it
+
+    entries = await queue.read("worker-a", count=10, block_ms=100)
+    assert [fields for _, fields in entries] == [{"job_id": "job1"}]  # no API keys on the stream
+    assert await queue.depth() == {"queued": 0, "pending": 1}
+
+    await queue.ack(entries[0][0])
+    assert await queue.depth() == {"queued": 0, "pending": 0}
+    assert await r.xlen(queue.stream) == 0
+
+
+async def test_stale_entries_are_reclaimed_unless_heartbeating(r):
+    queue = CrawlQueue(r)
+    await queue.ensure_group()
+    await queue.enqueue("alive")
+    await queue.enqueue("dead")
+    entries = await queue.read("worker-a", count=10, block_ms=100)
+    ids = {fields["job_id"]: entry_id for entry_id, fields in entries}
+
+    await asyncio.sleep(0.2)
+    await queue.heartbeat("worker-a", ids["alive"])
+    reclaimed = await queue.reclaim("worker-b", min_idle_ms=150, count=10)
+    assert [fields["job_id"] for _, fields in reclaimed] == ["dead"]
+
+    # Nothing new for other consumers
+    assert await queue.read("worker-c", count=10, block_ms=50) == []
+
+
+async def test_checkpoint_tracks_frontier_and_counters(r):
+    checkpoint = CrawlCheckpoint(r, "job1")
+    assert not (await checkpoint.state())["seeded"]
+
+    await checkpoint.seed(["https://a/", "https://a/docs"], recursive=True)
+    await checkpoint.page_done("https://a/", ["https://a/docs", "https://a/x"], pages_crawled=1, documents_stored=3)
+    await checkpoint.page_done("https://a/docs", ["https://a/y"])  # failed page: no counters
+
+    state = await checkpoint.state()
+    assert state["seeded"] and state["recursive"] and state["depth"] == 0
+    assert state["pages_crawled"] == 1 and state["documents_stored"] == 3
+
+    assert await checkpoint.advance() == ["https://a/x", "https://a/y"]
+    assert (await checkpoint.state())["depth"] == 1
+
+    await checkpoint.clear()
+    assert await r.keys("crawl:checkpoint:*") == []
+
+
+class _Crawler:
+    """Fake AsyncWebCrawler over a link graph; can 'die' after N pages."""
+
+    def __init__(self, graph, die_after=None):
+        self.graph = graph
+        self.die_after = die_after
+        self.calls = []
+
+    async def arun(self, url, config=None):
+        if self.die_after is not None and len(self.calls) >= self.die_after:
+            raise asyncio.CancelledError()
+        self.calls.append(url)
+        return SimpleNamespace(
+            success=True,
+            markdown=f"# {url}",
+            metadata={},
+            links={"internal": [{"href": link} for link in self.graph.get(url, [])]},
+        )
+
+
+async def test_job_resumes_from_checkpoint(r):
+    pytest.importorskip("crawl4ai")
+    pytest.importorskip("sentence_transformers")
+    from crawl.runner import run_crawl_job
+
+    async def store(result, url, job):
+        return {"documents_stored": 1, "total_words": 2}
+
+    graph = {
+        "https://a/": ["https://a/1", "https://a/2", "https://a/3#top"],
+        "https://a/1": ["https://a/4", "https://a/"],
+        "https://a/2": ["https://a/5"],
+    }
+    job = {"id": "job1", "url": "https://a/", "tenant_id": "t", "params": {"max_depth": 3, "max_urls": 50}}
+    checkpoint = CrawlCheckpoint(r, "job1")
+
+    first = _Crawler(graph, die_after=3)
+    with pytest.raises(asyncio.CancelledError):
+        await run_crawl_job(job, checkpoint, first, store=store)
+
+    second = _Crawler(graph)
+    result = await run_crawl_job(job, checkpoint, second, store=store)
+
+    assert not set(first.calls) & set(second.calls)
+    assert sorted(first.calls + second.calls) == [f"https://a/{p}" for p in ("", "1", "2", "3", "4", "5")]
+    assert result["pages_crawled"] == 6 and result["documents_stored"] == 6
+
+
+@pytest.mark.parametrize("module", ["db", "crawl.worker"])
+def test_worker_imports_without_metrics_dir(module, tmp_path):
+    # The image sets PROMETHEUS_MULTIPROC_DIR, but only gunicorn.conf.py creates it;
+    # crawl.worker reaches shared/db/metrics.py through redis_jobs -> utils -> db
+    if module == "crawl.worker":
+        pytest.importorskip("crawl4ai")
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path / "missing"))
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=Path(__file__).resolve().parent.parent, env=env, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,69 @@
+"""
+Database Instrumentation Tests
+==============================
+Runs the shared data access layer against a real Postgres (with pgvector)
+and checks what /metrics reports.
+
+Run with: DATABASE_URL=postgresql://... pytest tests/test_db_metrics.py -v
+"""
+import os
+import sys
+import logging
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"),
+    reason="DATABASE_URL not set - needs a Postgres with pgvector",
+)
+
+
+@pytest.fixture
+async def metered_db(monkeypatch):
+    import db
+
+    monkeypatch.setenv("DB_EXPLAIN_MS", "0.001")
+    db.configure_pool(db.PoolSettings.from_env("learning-agent-test", workers=1))
+    await db.get_pool()
+    yield db
+    await db.close_pool()
+
+
+def _sample(name: str, **labels) -> float:
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_function_and_pool_metrics(metered_db):
+    db = metered_db
+    before = _sample("archistry_db_function_seconds_count", function="search_knowledge_chunks")
+    waits = _sample("archistry_db_pool_wait_seconds_count")
+
+    results = await asyncio.gather(*[
+        db.search_knowledge_chunks([0.0] * 1536, limit=3) for _ in range(5)
+    ])
+
+    assert _sample("archistry_db_function_seconds_count", function="search_knowledge_chunks") == before + 5
+    assert _sample("archistry_db_function_rows_total", function="search_knowledge_chunks") >= sum(len(r) for r in results)
+    assert _sample("archistry_db_pool_wait_seconds_count") >= waits + 5
+
+    body, content_type = db.render_metrics()
+    assert content_type.startswith("text/plain")
+    assert b'archistry_db_query_seconds_count{function="search_knowledge_chunks"}' in body
+
+
+async def test_explain_sampler_logs_plan(metered_db, caplog):
+    db = metered_db
+    with caplog.at_level(logging.WARNING, logger="cloud-academy-db"):
+        await db.get_learner_snapshot("missing-profile")
+        for _ in range(50):
+            if any("Slow query plan" in r.message for r in caplog.records):
+                break
+            await asyncio.sleep(0.05)
+
+    plans = [r.message for r in caplog.records if "Slow query plan" in r.message]
+    assert plans and "actual time" in plans[0]
@@ -0,0 +1,134 @@
+"""
+Speed Deploy Brief Store Tests
+==============================
+Deterministic scoring against a compiled ScoringTable, the Redis brief
+store (conftest.py) and model feedback that leaves the score alone.
+
+Run with: pytest tests/test_deploy_briefs.py -v
+"""
+import sys
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from generators import speed_deploy  # noqa: E402
+from generators.speed_deploy import (  # noqa: E402
+    ClientRequirement, DeployBrief, ScoringTable, ServiceTrap, narrate_deployment, score_deployment,
+)
+from services import deploy_briefs, llm_cache  # noqa: E402
+
+BRIEF = DeployBrief(
+    id="deploy_test0001",
+    client_name="PhotoShare",
+    industry="Media",
+    icon="📷",
+    requirements=[
+        ClientRequirement(category="traffic", description="Spiky uploads", priority="critical"),
+        ClientRequirement(category="cost", description="Pay per use", priority="important"),
+    ],
+    available_services=["s3", "lambda", "api-gateway", "ec2", "rds", "dynamodb", "cloudfront"],
+    optimal_solution=["s3", "lambda", "api-gateway", "dynamodb"],
+    acceptable_solutions=[["s3", "lambda", "api-gateway", "rds"]],
+    trap_services=[ServiceTrap(service_id="ec2", why_suboptimal="Idle servers between spikes", penalty=12)],
+    time_limit=120,
+    user_level="intermediate",
+    target_cert="AWS Solutions Architect Associate",
+    max_score=1000,
+    learning_point="Serverless fits spiky traffic.",
+)
+
+
+def test_scoring_uses_set_lookups():
+    table = ScoringTable.from_brief(BRIEF)
+
+    optimal = score_deployment(table, ["DynamoDB", "api-gateway ", "lambda", "s3"], 60)
+    assert optimal.is_optimal and optimal.grade == "B"
+    assert optimal.score == 600 + 100 + 100
+
+    acceptable = score_deployment(table, ["rds", "s3", "api-gateway", "lambda"], 0)
+    assert acceptable.is_acceptable and not acceptable.is_optimal
+    assert acceptable.requirements_met == ["traffic", "cost"]
+
+    trapped = score_deployment(table, ["ec2", "rds", "s3"], 60)
+    assert trapped.trap_services_used == [{"service_id": "ec2", "why_suboptimal": "Idle servers between spikes", "penalty": 12}]
+    assert trapped.requirements_missed == ["traffic"]
+    assert trapped.grade == "F"
+
+    # Same result as the uncompiled path
+    assert speed_deploy.validate_deployment_deterministic(BRIEF, ["ec2", "rds", "s3"], 60) == trapped
+
+
+def test_speed_bonus_is_clamped_to_time_limit():
+    table = ScoringTable.from_brief(BRIEF)
+    full = score_deployment(table, BRIEF.optimal_solution, BRIEF.time_limit)
+
+    assert score_deployment(table, BRIEF.optimal_solution, 10 ** 6).score == full.score == 900
+    assert score_deployment(table, BRIEF.optimal_solution, -500).score == score_deployment(table, BRIEF.optimal_solution, 0).score == 700
+
+
+def test_validate_request_rejects_negative_time():
+    pytest.importorskip("crawl4ai")  # routes package imports the crawler
+    from pydantic import ValidationError
+    from routes.speed_deploy import SpeedDeployValidateRequest
+
+    with pytest.raises(ValidationError):
+        SpeedDeployValidateRequest(brief_id=BRIEF.id, submitted_services=["s3"], time_remaining=-1)
+
+
+@pytest.fixture
+def store(r, monkeypatch):
+    async def get_redis():
+        return r
+
+    monkeypatch.setattr(deploy_briefs, "_get_redis", get_redis)
+    monkeypatch.setattr(deploy_briefs, "_tables", deploy_briefs.OrderedDict())
+    return deploy_briefs
+
+
+async def test_store_round_trip(store, r):
+    await store.save_brief(BRIEF)
+    assert await r.ttl(f"{store.BRIEF_PREFIX}{BRIEF.id}") > 0
+
+    # Another worker: nothing compiled locally, loaded from Redis
+    store._tables.clear()
+    table = await store.get_scoring_table(BRIEF.id)
+    assert table.brief == BRIEF
+    assert table.acceptable == frozenset({frozenset({"s3", "lambda", "api-gateway", "rds"})})
+    assert await store.get_scoring_table(BRIEF.id) is table
+
+    assert await store.get_scoring_table("deploy_unknown") is None
+
+
+async def test_local_tables_are_bounded(store, monkeypatch):
+    monkeypatch.setattr(store, "LOCAL_BRIEFS", 2)
+    for i in range(3):
+        await store.save_brief(BRIEF.model_copy(update={"id": f"deploy_{i}"}))
+    assert list(store._tables) == ["deploy_1", "deploy_2"]
+    assert (await store.get_scoring_table("deploy_0")).brief.id == "deploy_0"
+
+
+async def test_feedback_does_not_change_the_score(monkeypatch):
+    class FakeOpenAI:
+        def __init__(self, api_key):
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+        async def create(self, **kwargs):
+            content = json.dumps({"feedback": "For SAA, prefer on-demand scaling.", "learning_point": "Match capacity to load."})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(speed_deploy, "AsyncOpenAI", FakeOpenAI)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", False)
+
+    table = ScoringTable.from_brief(BRIEF)
+    scored = score_deployment(table, ["ec2", "s3"], 30)
+    narrated = await narrate_deployment(table, scored, ["ec2", "s3"])
+
+    assert narrated.feedback == "For SAA, prefer on-demand scaling."
+    assert narrated.learning_point == "Match capacity to load."
+    assert narrated.model_dump(exclude={"feedback", "learning_point"}) == scored.model_dump(exclude={"feedback", "learning_point"})
@@ -0,0 +1,184 @@
+"""
+Learner Stats Tests
+===================
+Runs the learner aggregates against a real Postgres: the rebuild from
+history, the incremental quiz, challenge and flashcard paths and the
+journey snapshot.
+Challenge progress belongs to a profile through its ScenarioAttempt.
+
+Run with: DATABASE_URL=postgresql://... pytest tests/test_learner_stats.py -v
+"""
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"),
+    reason="DATABASE_URL not set - needs a Postgres with pgvector",
+)
+
+
+@pytest.fixture
+async def learner():
+    """A profile with one scenario attempt (two challenges), one flashcard deck and one quiz."""
+    import db
+
+    db.configure_pool(db.PoolSettings.from_env("learning-agent-test", workers=1))
+    pool = await db.get_pool()
+    ids = {key: f"test-{key}-{uuid.uuid4().hex[:8]}" for key in (
+        "profile", "location", "scenario", "attempt", "challenge1", "challenge2", "deck", "card",
+        "quiz", "question",
+    )}
+
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "AcademyUserProfile" (id, "updatedAt") VALUES ($1, NOW())
+        """, ids["profile"])
+        await conn.execute("""
+            INSERT INTO "AcademyLocation" (id, slug, name, company, industry, description, lat, lng, "updatedAt")
+            VALUES ($1, $1, 'HQ', 'Acme', 'Retail', 'Test location', 0, 0, NOW())
+        """, ids["location"])
+        await conn.execute("""
+            INSERT INTO "AcademyScenario" (id, "locationId", title, description, "businessContext", difficulty, "updatedAt")
+            VALUES ($1, $2, 'Scale out', 'Test scenario', 'Test context', 'beginner', NOW())
+        """, ids["scenario"], ids["location"])
+        for key, services in (("challenge1", ["s3", "cloudfront"]), ("challenge2", ["s3"])):
+            await conn.execute("""
+                INSERT INTO "AcademyChallenge" (id, "scenarioId", title, description, difficulty, "awsServices", "updatedAt")
+                VALUES ($1, $2, 'Challenge', 'Test challenge', 'beginner', $3, NOW())
+            """, ids[key], ids["scenario"], services)
+        await conn.execute("""
+            INSERT INTO "ScenarioAttempt" (id, "profileId", "scenarioId") VALUES ($1, $2, $3)
+        """, ids["attempt"], ids["profile"], ids["scenario"])
+        await conn.execute("""
+            INSERT INTO "ChallengeProgress" (id, "attemptId", "challengeId", status, "pointsEarned", "attemptsCount", "startedAt")
+            VALUES (gen_random_uuid()::text, $1, $2, 'completed', 100, 3, NOW() - INTERVAL '1 hour'),
+                   (gen_random_uuid()::text, $1, $3, 'in_progress', 0, 1, NOW())
+        """, ids["attempt"], ids["challenge1"], ids["challenge2"])
+        await conn.execute("""
+            INSERT INTO "FlashcardDeck" (id, title, "updatedAt") VALUES ($1, 'Storage', NOW())
+        """, ids["deck"])
+        await conn.execute("""
+            INSERT INTO "Flashcard" (id, "deckId", front, back, "awsServices", "updatedAt")
+            VALUES ($1, $2, 'What is S3?', 'Object storage', $3, NOW())
+        """, ids["card"], ids["deck"], ["s3"])
+        await conn.execute("""
+            INSERT INTO "Quiz" (id, title, "questionCount", "updatedAt") VALUES ($1, 'Storage quiz', 1, NOW())
+        """, ids["quiz"])
+        await conn.execute("""
+            INSERT INTO "QuizQuestion" (id, "quizId", question, "awsServices", "updatedAt")
+            VALUES ($1, $2, 'Which service stores objects?', $3, NOW())
+        """, ids["question"], ids["quiz"], ["s3", "cloudfront"])
+
+    yield db, ids
+
+    async with pool.acquire() as conn:
+        await conn.execute('DELETE FROM "AcademyUserProfile" WHERE id = $1', ids["profile"])
+        await conn.execute('DELETE FROM "Quiz" WHERE id = $1', ids["quiz"])
+        await conn.execute('DELETE FROM "Flashcard" WHERE id = $1', ids["card"])
+        await conn.execute('DELETE FROM "FlashcardDeck" WHERE id = $1', ids["deck"])
+        await conn.execute('DELETE FROM "AcademyChallenge" WHERE "scenarioId" = $1', ids["scenario"])
+        await conn.execute('DELETE FROM "AcademyScenario" WHERE id = $1', ids["scenario"])
+        await conn.execute('DELETE FROM "AcademyLocation" WHERE id = $1', ids["location"])
+    await db.close_pool()
+
+
+async def _stats(db, profile_id):
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        totals = await conn.fetchrow('SELECT * FROM "LearnerStats" WHERE "profileId" = $1', profile_id)
+        services = await conn.fetch('SELECT * FROM "LearnerServiceStats" WHERE "profileId" = $1', profile_id)
+    return totals, {row["service"]: row for row in services}
+
+
+async def test_rebuild_counts_challenges_through_attempts(learner):
+    db, ids = learner
+    await db.rebuild_learner_stats(ids["profile"])
+
+    totals, services = await _stats(db, ids["profile"])
+    assert (totals["challengeAttempts"], totals["challengesCompleted"], totals["challengePoints"]) == (4, 1, 100)
+    assert (services["s3"]["challengeAttempts"], services["s3"]["challengesCompleted"]) == (4, 1)
+    assert (services["cloudfront"]["challengeAttempts"], services["cloudfront"]["challengesCompleted"]) == (3, 1)
+
+
+async def test_flashcard_review_increments_stats(learner):
+    db, ids = learner
+    # First write backfills from history, including this review
+    await db.update_flashcard_progress(ids["profile"], ids["deck"], ids["card"], quality=4)
+    totals, services = await _stats(db, ids["profile"])
+    assert (totals["flashcardDecks"], totals["flashcardCards"], totals["flashcardReviews"]) == (1, 1, 1)
+    assert totals["challengeAttempts"] == 4
+
+    # Later writes are folded in incrementally
+    await db.update_flashcard_progress(ids["profile"], ids["deck"], ids["card"], quality=1)
+    totals, services = await _stats(db, ids["profile"])
+    assert (totals["flashcardDecks"], totals["flashcardCards"]) == (1, 1)
+    assert (totals["flashcardReviews"], totals["flashcardCorrect"]) == (2, 1)
+    assert (services["s3"]["flashcardReviews"], services["s3"]["flashcardCorrect"]) == (2, 1)
+
+
+async def test_snapshot_lists_challenge_progress(learner):
+    db, ids = learner
+    snapshot = await db.get_learner_snapshot(ids["profile"])
+
+    progress = snapshot["analysis"]["challenge_progress"]
+    assert [(p["challengeId"], p["attemptCount"]) for p in progress] == [(ids["challenge2"], 1), (ids["challenge1"], 3)]
+    scenario = snapshot["journey"]["scenarios"][0]
+    assert scenario["id"] == ids["attempt"]
+    assert (scenario["challengesCompleted"], scenario["totalChallenges"]) == (1, 2)
+
+    assert await db.get_learner_snapshot(f"missing-{ids['profile']}") is None
+
+
+async def test_challenge_update_increments_stats(learner):
+    db, ids = learner
+    await db.rebuild_learner_stats(ids["profile"])
+
+    await db.update_challenge_progress(ids["profile"], ids["challenge2"], "completed", points_earned=50)
+    totals, services = await _stats(db, ids["profile"])
+    assert (totals["challengeAttempts"], totals["challengesCompleted"], totals["challengePoints"]) == (5, 2, 150)
+    assert (services["s3"]["challengeAttempts"], services["s3"]["challengesCompleted"]) == (5, 2)
+
+    progress = await db.get_challenge_progress(ids["profile"], ids["challenge2"])
+    assert (progress["status"], progress["attempts"], progress["points_earned"]) == ("completed", 2, 50)
+
+
+async def test_quiz_attempt_increments_stats(learner):
+    db, ids = learner
+    await db.rebuild_learner_stats(ids["profile"])
+
+    answers = [{"question_id": ids["question"], "selected_options": ["a"], "is_correct": True, "points_earned": 10}]
+    attempt_id = await db.save_quiz_attempt(ids["profile"], ids["quiz"], answers, 80, True, 120)
+    await db.save_quiz_attempt(ids["profile"], ids["quiz"], [{**answers[0], "is_correct": False}], 40, False, 60)
+
+    totals, services = await _stats(db, ids["profile"])
+    assert (totals["quizAttempts"], totals["quizPassed"], totals["quizScoreSum"]) == (2, 1, 120)
+    assert (totals["quizBestScore"], totals["quizTimeSeconds"]) == (80, 180)
+    for service in ("s3", "cloudfront"):
+        row = services[service]
+        assert (row["quizAttempts"], row["quizScoreSum"], row["quizAnswers"], row["quizCorrect"]) == (2, 120, 2, 1)
+
+    details = await db.get_quiz_attempt_details(attempt_id)
+    assert (details["correct_answers"], details["answers"][0]["points_earned"]) == (1, 10)
+
+    with pytest.raises(ValueError):
+        await db.save_quiz_attempt(ids["profile"], f"missing-{ids['quiz']}", answers, 80, True, 120)
+
+
+async def test_concurrent_first_writes_count_every_attempt(learner):
+    db, ids = learner
+    answers = [{"question_id": ids["question"], "is_correct": True}]
+    # Neither write finds aggregate rows; only one may backfill, the other increments
+    await asyncio.gather(*(
+        db.save_quiz_attempt(ids["profile"], ids["quiz"], answers, 50, False, 10) for _ in range(4)
+    ))
+
+    totals, services = await _stats(db, ids["profile"])
+    assert (totals["quizAttempts"], totals["quizScoreSum"]) == (4, 200)
+    assert services["s3"]["quizAnswers"] == 4
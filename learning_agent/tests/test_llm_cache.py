@@ -0,0 +1,128 @@
+"""
+LLM Response Cache Tests
+========================
+complete_json() with a CachePolicy against a stubbed OpenAI client and a
+throwaway redis-server (conftest.py): exact-match hits, replay to streamed
+callers, LRU eviction past the size bound, embedding-similarity reuse and
+falling back to the model when Redis is down.
+
+Run with: pytest tests/test_llm_cache.py -v
+"""
+import sys
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services import llm_cache  # noqa: E402
+from services.llm_cache import CachePolicy  # noqa: E402
+from services.streaming import complete_json  # noqa: E402
+
+# Embeddings for the answers used below: the first two are near-identical
+VECTORS = {
+    "S3 stores objects across three AZs": [1.0, 0.0, 0.0],
+    "S3 stores objects across 3 AZs": [0.999, 0.03, 0.0],
+    "EBS volumes live in one AZ": [0.0, 1.0, 0.0],
+}
+
+
+class FakeClient:
+    """chat.completions.create returning a numbered verdict (streamed if asked); embeddings from VECTORS."""
+
+    def __init__(self):
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+        self.embeddings = SimpleNamespace(create=self.embed)
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = json.dumps({"call": len(self.calls), "cards": [{"front": "a"}, {"front": "b"}]})
+        if kwargs.get("stream"):
+            async def chunks():
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+            return chunks()
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def embed(self, model, input):
+        return SimpleNamespace(data=[SimpleNamespace(embedding=VECTORS[input])])
+
+
+@pytest.fixture
+def client(r, monkeypatch):
+    async def get_redis():
+        return r
+
+    monkeypatch.setattr(llm_cache, "_get_redis", get_redis)
+    return FakeClient()
+
+
+def _messages(answer, question="Where does S3 store data?"):
+    return [{"role": "system", "content": f"Grade this answer.\nQuestion: {question}"},
+            {"role": "user", "content": answer}]
+
+
+async def _call(client, answer, policy, **kwargs):
+    content = await complete_json(client, cache=policy, model="m", temperature=0.3, messages=_messages(answer), **kwargs)
+    return json.loads(content)["call"]
+
+
+async def test_identical_requests_hit(client):
+    policy = CachePolicy("grade")
+    assert await _call(client, "EBS volumes live in one AZ", policy) == 1
+    assert await _call(client, "EBS volumes live in one AZ  \n", policy) == 1
+    assert len(client.calls) == 1
+
+    # Any change to what is sent to the model is a different request
+    assert await _call(client, "EBS volumes live in one AZ", policy, max_tokens=50) == 2
+    assert await _call(client, "EBS volumes live in one AZ", CachePolicy("other_site")) == 3
+
+
+async def test_hit_is_replayed_to_streamed_callers(client):
+    items = []
+    kwargs = dict(cache=CachePolicy("deck"), model="m", messages=_messages("x"))
+    await complete_json(client, lambda key, item: items.append(item), ("cards",), **kwargs)
+    await complete_json(client, lambda key, item: items.append(item), ("cards",), **kwargs)
+    assert len(client.calls) == 1
+    assert items == [{"front": "a"}, {"front": "b"}] * 2
+
+
+async def test_least_recently_used_entries_are_evicted(client, r, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_MAX_ENTRIES", 3)
+    policy = CachePolicy("grade")
+    for answer in ("a", "b", "c"):
+        await _call(client, answer, policy)
+    await _call(client, "a", policy)  # touch "a" so "b" is the oldest
+    await _call(client, "d", policy)
+
+    assert await r.zcard(llm_cache.LLM_CACHE_INDEX) == 3
+    assert await _call(client, "a", policy) == 1
+    assert await _call(client, "b", policy) == 5  # evicted, asked again
+
+
+async def test_near_identical_answers_share_a_verdict(client):
+    def policy(answer, question="Where does S3 store data?"):
+        return CachePolicy("grade", similar_text=answer, similar_scope=question)
+
+    first = "S3 stores objects across three AZs"
+    assert await _call(client, first, policy(first)) == 1
+    near = "S3 stores objects across 3 AZs"
+    assert await _call(client, near, policy(near)) == 1
+
+    # A different answer, or the same answer to another question, is graded
+    other = "EBS volumes live in one AZ"
+    assert await _call(client, other, policy(other)) == 2
+    assert await _call(client, near, policy(near, "Where does EFS store data?")) == 3
+
+
+async def test_redis_failure_falls_back_to_model(monkeypatch):
+    async def no_redis():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(llm_cache, "_get_redis", no_redis)
+    client = FakeClient()
+    assert await _call(client, "a", CachePolicy("grade")) == 1
+    assert await _call(client, "a", CachePolicy("grade")) == 2
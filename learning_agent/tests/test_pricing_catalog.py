@@ -0,0 +1,178 @@
+"""
+Offline Price Catalogue Tests
+=============================
+Builds a catalogue from small bulk price list offer files and prices
+diagrams against it (no network, no AWS credentials).
+
+Run with: pytest tests/test_pricing_catalog.py -v
+"""
+import io
+import sys
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.aws_pricing import AWSPricingService  # noqa: E402
+from services.pricing_catalog import PriceCatalog, build_catalog, parse_offer  # noqa: E402
+
+
+def _offer(code, products, terms, reserved=None):
+    """An offer file in the bulk price list layout."""
+    def term(sku, dimensions):
+        return {f"{sku}.JRTCKXETXF": {"priceDimensions": {
+            f"{sku}.JRTCKXETXF.{i}": {"unit": unit, "beginRange": str(begin), "pricePerUnit": {"USD": str(usd)}}
+            for i, (unit, begin, usd) in enumerate(dimensions)
+        }}}
+
+    return {
+        "formatVersion": "v1.0",
+        "offerCode": code,
+        "publicationDate": "2026-09-01T00:00:00Z",
+        "products": {
+            sku: {"sku": sku, "attributes": {"regionCode": "us-east-1", "location": "US East (N. Virginia)", **attrs}}
+            for sku, attrs in products.items()
+        },
+        "terms": {
+            **({"Reserved": reserved} if reserved else {}),
+            "OnDemand": {sku: term(sku, dims) for sku, dims in terms.items()},
+        },
+    }
+
+
+EC2 = _offer(
+    "AmazonEC2",
+    {
+        "LINUX": {"usagetype": "BoxUsage:t3.medium", "operation": "RunInstances"},
+        "WINDOWS": {"usagetype": "BoxUsage:t3.medium", "operation": "RunInstances:0002"},
+        "GP3": {"usagetype": "EBS:VolumeUsage.gp3", "operation": ""},
+        "M5": {"usagetype": "USE1-BoxUsage:m5.large", "operation": "RunInstances"},
+    },
+    {
+        "LINUX": [("Hrs", 0, 0.05)],
+        "WINDOWS": [("Hrs", 0, 0.07)],
+        "GP3": [("GB-Mo", 0, 0.09)],
+        "M5": [("Hrs", 0, 0.1)],
+    },
+    # Reserved terms come first in real files and must be skipped
+    reserved={"LINUX": {"x": {"priceDimensions": {"y": {"pricePerUnit": {"USD": "0.01"}}}}}},
+)
+
+S3 = _offer(
+    "AmazonS3",
+    {"STD": {"usagetype": "TimedStorage-ByteHrs"}},
+    {"STD": [("GB-Mo", 0, 0.03), ("GB-Mo", 51200, 0.02)]},
+)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    offers = tmp_path / "offers"
+    offers.mkdir()
+    (offers / "AmazonEC2-us-east-1.json").write_text(json.dumps(EC2, indent=1))
+    (offers / "AmazonS3-us-east-1.json").write_text(json.dumps(S3))
+    path = tmp_path / "catalog.sqlite3"
+    counts = build_catalog(path, from_dir=offers)
+    assert counts == {"AmazonEC2:us-east-1": 4, "AmazonS3:us-east-1": 2}
+    return PriceCatalog(path)
+
+
+class _Chunked(io.StringIO):
+    """Reads a few bytes at a time, so values straddle buffer refills."""
+
+    def read(self, size=-1):
+        return super().read(7)
+
+
+def test_streaming_parse_reads_on_demand_terms_only():
+    meta = {}
+    rows = list(parse_offer(_Chunked(json.dumps(EC2, indent=2)), "us-east-1", meta))
+    assert meta["publicationDate"] == "2026-09-01T00:00:00Z"
+    assert ("AmazonEC2", "us-east-1", "BoxUsage:t3.medium", "RunInstances", 0.0, "Hrs", 0.05) in rows
+    # Region prefixes are stripped from usage types
+    assert any(row[2] == "BoxUsage:m5.large" for row in rows)
+    assert all(row[-1] != 0.01 for row in rows)
+
+
+def test_rates_are_batched_and_cached(catalog):
+    keys = [("AmazonEC2", "us-east-1", "BoxUsage:t3.medium"), ("AmazonEC2", "us-east-1", "BoxUsage:nope")]
+    rates = catalog.rates(keys)
+    assert sorted(rates[keys[0]]) == [("RunInstances", 0.0, 0.05), ("RunInstances:0002", 0.0, 0.07)]
+    assert rates[keys[1]] == []
+    assert catalog.refreshed_at() is not None
+
+
+def test_diagram_priced_from_catalogue_with_node_config(catalog):
+    service = AWSPricingService(catalog=catalog)
+    nodes = [
+        {"id": "web", "data": {"serviceId": "ec2", "label": "Web", "config": {"instanceCount": 2, "storageGB": 50}}},
+        {"id": "big", "data": {"serviceId": "ec2", "label": "Batch", "config": {"instanceType": "m5.large"}}},
+        {"id": "assets", "data": {"serviceId": "s3", "label": "Assets", "config": {"storageGB": 60000}}},
+        {"id": "users", "data": {"serviceId": "iam", "label": "IAM"}},
+    ]
+    estimate = service.estimate_diagram_cost(nodes, buffer=0)
+    by_node = {item["node_id"]: item for item in estimate["breakdown"]}
+
+    assert set(by_node) == {"web", "big", "assets"}
+    # Linux rate, 2 instances x 730h + 2 x 50 GB gp3
+    assert by_node["web"]["monthly_usd"] == pytest.approx(2 * 730 * 0.05 + 100 * 0.09, abs=0.01)
+    assert by_node["big"]["monthly_usd"] == pytest.approx(730 * 0.1 + 30 * 0.09, abs=0.01)
+    # Tiered: 51200 GB at 0.03, the rest at 0.02 (requests priced from seed rates)
+    storage = next(li for li in by_node["assets"]["line_items"] if li["usage_type"] == "TimedStorage-ByteHrs")
+    assert storage["monthly_usd"] == pytest.approx(51200 * 0.03 + 8800 * 0.02, abs=0.01)
+    assert storage["source"] == "catalog"
+    assert estimate["pricing_sources"] == ["catalog", "seed"]
+    assert estimate["total_monthly"] == estimate["subtotal_monthly"]
+
+
+def test_form_config_values_are_converted(catalog):
+    service = AWSPricingService(catalog=catalog)
+    nodes = [
+        {"id": "web", "data": {"serviceId": "ec2", "config": {"instanceCount": "2", "storageGB": "50"}}},
+        {"id": "db", "data": {"serviceId": "rds", "config": {"multiAZ": "false", "storageGB": "20"}}},
+        {"id": "fn", "data": {"serviceId": "lambda", "config": {"memory": "512", "durationMs": "fast"}}},
+        {"id": "net", "data": {"serviceId": "vpc"}},
+    ]
+    by_node = {item["node_id"]: item for item in service.estimate_diagram_cost(nodes, buffer=0)["breakdown"]}
+
+    assert by_node["web"]["monthly_usd"] == pytest.approx(2 * 730 * 0.05 + 100 * 0.09, abs=0.01)
+    assert by_node["db"]["usage_assumptions"]["multi_az"] is False
+    assert by_node["db"]["usage_assumptions"]["storage_gb"] == 20
+    # Unusable values fall back to the default for that key only
+    assert by_node["fn"]["usage_assumptions"] == {"requests": 1_000_000, "duration_ms": 200, "memory_mb": 512}
+    # VPCs are free, not the AmazonVPC assumption
+    assert "net" not in by_node
+
+
+def test_tiers_apply_to_the_diagram_total(catalog):
+    service = AWSPricingService(catalog=catalog)
+    half = {"data": {"serviceId": "s3", "config": {"storageGB": 30000}}}
+    estimate = service.estimate_diagram_cost([half, half], buffer=0)
+    storage = sum(li["monthly_usd"] for item in estimate["breakdown"] for li in item["line_items"]
+                  if li["usage_type"] == "TimedStorage-ByteHrs")
+    assert storage == pytest.approx(51200 * 0.03 + 8800 * 0.02, abs=0.01)
+
+
+def test_seed_rates_without_catalogue(tmp_path):
+    service = AWSPricingService(catalog=PriceCatalog(tmp_path / "missing.sqlite3"))
+    estimate = service.estimate_architecture_cost(["lambda", "api-gateway", "s3", "Amazon S3", "quicksight"])
+    services = [item["service"] for item in estimate["breakdown"]]
+    assert services == ["lambda", "api-gateway", "Amazon S3"]
+    assert estimate["pricing_sources"] == ["seed"]
+    assert estimate["pricing_date"] == "January 2026"
+    assert estimate["total_monthly"] == pytest.approx(estimate["subtotal_monthly"] * 1.15, abs=0.01)
+
+
+def test_estimate_is_sub_millisecond(catalog):
+    service = AWSPricingService(catalog=catalog)
+    services = ["ec2", "rds", "s3", "lambda", "api-gateway", "dynamodb", "alb", "cloudfront",
+                "elasticache", "sqs", "sns", "cognito", "kms", "cloudwatch", "nat-gateway", "waf"]
+    service.estimate_architecture_cost(services)  # warm the rate cache
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        service.estimate_architecture_cost(services)
+    assert (time.perf_counter() - start) / runs < 0.001
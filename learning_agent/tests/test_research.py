@@ -0,0 +1,104 @@
+"""
+Company Research Tests
+======================
+Task-graph research with stubbed search, crawl and analysis steps: steps
+run concurrently, events arrive in completion order, slow steps time out,
+and results are cached by normalized company name and industry.
+
+Run with: pytest tests/test_research.py -v
+"""
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.learning import CompanyInfo, ResearchResult  # noqa: E402
+from services import research  # noqa: E402
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    """Search takes 0.1s (0.3s for the 'scalability' query), crawl 0.1s; cache is a dict."""
+    calls = {"search": 0, "crawl": 0, "analyze": 0}
+    cache = {}
+
+    async def search_web(query, max_results=5, language="en"):
+        calls["search"] += 1
+        await asyncio.sleep(0.3 if "scalability" in query else 0.1)
+        slug = "-".join(query.split()[2:])
+        return [{"url": f"https://example.com/{slug}", "title": slug, "content": f"about {slug}"}]
+
+    async def crawl_url(url):
+        calls["crawl"] += 1
+        await asyncio.sleep(0.1)
+        return {"url": url, "content": f"page {url}", "title": url}
+
+    async def analyze(company_name, industry, snippets, pages, sources, api_key):
+        calls["analyze"] += 1
+        return ResearchResult(
+            company_info=CompanyInfo(name=company_name, industry=industry or "Tech", description="d"),
+            sources=sources,
+            confidence=0.8,
+        )
+
+    async def cached(key):
+        return cache.get(key)
+
+    async def store(key, result):
+        cache[key] = result
+
+    monkeypatch.setattr(research, "search_web", search_web)
+    monkeypatch.setattr(research, "_crawl_url", crawl_url)
+    monkeypatch.setattr(research, "_analyze", analyze)
+    monkeypatch.setattr(research, "_cached_research", cached)
+    monkeypatch.setattr(research, "_cache_research", store)
+    return calls, cache
+
+
+async def test_steps_run_concurrently_and_emit_on_completion(stubs):
+    calls, _ = stubs
+    started = time.perf_counter()
+    events = [e async for e in research.research_company_events("Acme Corp", "FinTech")]
+    elapsed = time.perf_counter() - started
+
+    # 8 searches then up to 5 crawls, serially ~1.3s; as a graph ~ slowest search + one crawl
+    assert calls["search"] == 8 and calls["crawl"] == 5
+    assert elapsed < 0.6
+
+    searched = [e["message"] for e in events if e["type"] == "search"]
+    assert searched[-1].endswith("scalability traffic patterns")  # the slow query finishes last
+    assert any(e["type"] == "status" and e["message"].startswith("📄 Read") for e in events)
+    assert events[-1]["type"] == "research"
+    assert isinstance(events[-1]["result"], ResearchResult)
+
+
+async def test_slow_steps_time_out(stubs, monkeypatch):
+    monkeypatch.setattr(research, "SEARCH_TIMEOUT", 0.2)
+    result = await research.research_company("Acme Corp")
+    assert not any("scalability" in url for url in result.sources)
+    assert len(result.sources) == 5
+
+
+async def test_results_cached_by_normalized_name(stubs):
+    calls, cache = stubs
+    await research.research_company("Acme, Inc.", "FinTech")
+    events = [e async for e in research.research_company_events("  ACME  ", "fintech")]
+
+    assert list(cache) == ["research:company:acme:fintech"]
+    assert calls["analyze"] == 1 and calls["search"] == 8
+    assert events[-1]["result"].company_info.name == "Acme, Inc."
+    assert research.research_cache_key("The Acme Company") == "research:company:acme:"
+
+
+async def test_merge_events_interleaves_by_arrival():
+    async def stream(name, delays):
+        for delay in delays:
+            await asyncio.sleep(delay)
+            yield {"type": name}
+
+    merged = [e["type"] async for e in research.merge_events(stream("a", [0.05, 0.1]), stream("b", [0.01, 0.01]))]
+    assert merged == ["b", "b", "a", "a"]
@@ -0,0 +1,86 @@
+"""
+Resource Catalogue Tests
+========================
+Stale-while-revalidate serving of study resources from Redis
+(generators/resource_fetcher.py) with the crawl replaced by a stub.
+
+Run with: pytest tests/test_resource_catalogue.py -v
+"""
+import sys
+import json
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("crawl4ai")
+pytest.importorskip("sentence_transformers")
+
+from generators import resource_fetcher  # noqa: E402
+
+
+@pytest.fixture
+def crawls(r, monkeypatch):
+    """Crawl stub that takes 0.2s; returns the list of (cert, level) it was asked for."""
+    calls = []
+
+    async def crawl(certification, skill_level):
+        calls.append((certification, skill_level))
+        await asyncio.sleep(0.2)
+        return [{"title": f"{certification} video {len(calls)}", "url": f"https://v/{len(calls)}", "type": "video", "description": ""}]
+
+    async def get_redis():
+        return r
+
+    monkeypatch.setattr(resource_fetcher, "_crawl_study_resources", crawl)
+    monkeypatch.setattr(resource_fetcher, "_get_redis", get_redis)
+    return calls
+
+
+async def _settle():
+    await asyncio.gather(*resource_fetcher._refreshing)
+
+
+async def test_cold_entry_serves_official_links_and_fills_in_background(crawls):
+    started = time.perf_counter()
+    first = await resource_fetcher.fetch_study_resources("solutions-architect-associate", "Beginner", [])
+    assert time.perf_counter() - started < 0.1  # did not wait for the crawl
+    assert first[0]["url"] == "https://aws.amazon.com/certification/solutions-architect-associate/"
+
+    await _settle()
+    second = await resource_fetcher.fetch_study_resources("solutions-architect-associate", "beginner", [])
+    assert second[0]["url"] == "https://v/1"
+    assert crawls == [("solutions-architect-associate", "Beginner")]
+
+
+async def test_stale_entry_served_then_refreshed_once(crawls, r):
+    key = resource_fetcher._catalog_key("developer-associate", "advanced")
+    stale = {"resources": [{"title": "old", "url": "https://old", "type": "video"}], "fetched_at": time.time() - 30 * 86400}
+    await r.set(key, json.dumps(stale))
+
+    served = await asyncio.gather(*(
+        resource_fetcher.fetch_study_resources("developer-associate", "advanced", []) for _ in range(5)
+    ))
+    assert all(s[0]["url"] == "https://old" for s in served)
+
+    await _settle()
+    assert len(crawls) == 1  # concurrent stale reads share one refresh
+    entry = await resource_fetcher.get_catalog_entry("developer-associate", "advanced")
+    assert entry["resources"][0]["url"] == "https://v/1"
+    assert time.time() - entry["fetched_at"] < 5
+
+
+async def test_failed_refresh_keeps_previous_entry(crawls, r, monkeypatch):
+    async def nothing(certification, skill_level):
+        return []
+
+    monkeypatch.setattr(resource_fetcher, "_crawl_study_resources", nothing)
+    key = resource_fetcher._catalog_key("cloud-practitioner", "beginner")
+    await r.set(key, json.dumps({"resources": [{"url": "https://kept"}], "fetched_at": 0}))
+
+    assert await resource_fetcher.refresh_resources("cloud-practitioner", "beginner") is None
+    assert (await resource_fetcher.get_catalog_entry("cloud-practitioner", "beginner"))["resources"] == [{"url": "https://kept"}]
+    assert await r.exists(f"{key}:refreshing")  # retry is held off until the lock expires
@@ -0,0 +1,104 @@
+"""
+Route Contract Tests
+====================
+Response shapes of the crawl, config and game routers with the job store
+and generators stubbed: the crawl status field whitelist, the model list,
+and response_model validation on Cloud Tycoon and Service Slots.
+
+Run with: pytest tests/test_routes.py -v
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("crawl4ai")  # routes package imports the crawler
+
+from generators import cloud_tycoon as tycoon_generator  # noqa: E402
+from generators import service_slots as slots_generator  # noqa: E402
+from routes import cloud_tycoon, config, crawl, service_slots  # noqa: E402
+
+MATCH = {
+    "correct": True,
+    "score": 100.0,
+    "matched": ["s3"],
+    "missing": [],
+    "extra": [],
+    "contract_earned": 5000,
+    "feedback": "All services matched",
+    "required_services": [{"service_id": "s3"}],
+}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(crawl.router, prefix="/api/crawl")
+    app.include_router(config.router, prefix="/api")
+    app.include_router(cloud_tycoon.router, prefix="/api/tycoon")
+    app.include_router(service_slots.router, prefix="/api/slots")
+    return TestClient(app)
+
+
+def _tycoon_validate(client):
+    return client.post("/api/tycoon/validate", json={
+        "use_case_id": "uc_1",
+        "business_name": "Acme",
+        "use_case_title": "Store uploads",
+        "use_case_description": "Durable storage for user uploads",
+        "required_services": [{"service_id": "s3", "service_name": "Amazon S3", "category": "storage", "reason": "Objects"}],
+        "contract_value": 5000,
+        "difficulty": "easy",
+        "submitted_services": ["s3"],
+    })
+
+
+def test_crawl_status_returns_only_public_fields(client, monkeypatch):
+    async def get_crawl_job(job_id):
+        return {"id": job_id, "status": "running", "url": "https://example.com", "tenant_id": "t1",
+                "params": {"max_depth": 2}, "attempts": 1, "worker": "host-1", "created_at": "2026-01-01"}
+
+    monkeypatch.setattr(crawl, "get_crawl_job", get_crawl_job)
+    body = client.get("/api/crawl/status/job1").json()
+    assert body == {"success": True, "job_id": "job1", "status": "running", "url": "https://example.com",
+                    "result": None, "error": None, "created_at": "2026-01-01", "updated_at": None}
+
+
+def test_models_lists_available_models(client):
+    assert list(client.get("/api/models").json()) == ["models"]
+
+
+def test_tycoon_validate_is_checked_against_its_response_model(client, monkeypatch):
+    async def validate_service_match(use_case, submitted_services):
+        return {**MATCH, "debug": "internal"}
+
+    monkeypatch.setattr(tycoon_generator, "validate_service_match", validate_service_match)
+    assert _tycoon_validate(client).json() == MATCH
+
+    async def incomplete_match(use_case, submitted_services):
+        return {key: value for key, value in MATCH.items() if key != "feedback"}
+
+    monkeypatch.setattr(tycoon_generator, "validate_service_match", incomplete_match)
+    assert _tycoon_validate(client).status_code == 500
+
+
+def test_slots_challenge_is_checked_against_its_response_model(client, monkeypatch):
+    async def generate_slot_challenge(user_level, cert_code, api_key=None, model=None):
+        return slots_generator.SlotChallenge(
+            id="slot_1",
+            services=[slots_generator.SlotService(service_id="sqs", service_name="Amazon SQS", category="integration")],
+            pattern_name="Queue-based load leveling",
+            pattern_description="Buffer bursts behind a queue",
+            options=[slots_generator.AnswerOption(id="a", text="Load leveling", is_correct=True, explanation="Queues absorb bursts")],
+            user_level=user_level,
+            base_payout=2.0,
+        )
+
+    monkeypatch.setattr(slots_generator, "generate_slot_challenge", generate_slot_challenge)
+    body = client.post("/api/slots/challenge/generate", json={"user_level": "beginner"}).json()
+    assert body["id"] == "slot_1" and body["base_payout"] == 2.0
+    assert set(body) == set(service_slots.ChallengeResponse.model_fields)
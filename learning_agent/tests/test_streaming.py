@@ -0,0 +1,154 @@
+"""
+Streamed Generation Tests
+=========================
+The shared partial-JSON array parser (shared/streaming), the opt-in
+complete_json() call path with a stubbed OpenAI client, and the SSE events
+stream_generation() sends for items, completion and errors.
+
+Run with: pytest tests/test_streaming.py -v
+"""
+import sys
+import json
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from shared.streaming import StreamingArrayParser  # noqa: E402
+from services.streaming import complete_json, stream_generation  # noqa: E402
+from utils import ApiKeyRequiredError  # noqa: E402
+
+DOCUMENT = {
+    "title": "Deck [draft] {1}",
+    "cards": [
+        {"front": "What is \"S3\"?", "back": "Object storage } ]", "tags": ["s3", "storage"]},
+        {"front": "Max Lambda timeout?", "back": "15 minutes", "tags": []},
+    ],
+    "meta": {"cards": [{"ignored": True}]},
+    "highlights": ["Multi-AZ, \\ failover", "Least privilege"],
+    "scores": [1, 2.5, True, None],
+}
+
+
+def _feed(parser, text, size):
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return events
+
+
+def test_parser_yields_items_in_any_chunking():
+    text = json.dumps(DOCUMENT, indent=2)
+    expected = (
+        [("cards", card) for card in DOCUMENT["cards"]] + [("cards", None)]
+        + [("highlights", h) for h in DOCUMENT["highlights"]] + [("highlights", None)]
+        + [("scores", s) for s in DOCUMENT["scores"]] + [("scores", None)]
+    )
+    for size in (1, 3, 7, len(text)):
+        assert _feed(StreamingArrayParser(("cards", "highlights", "scores")), text, size) == expected
+
+
+def test_parser_ignores_untracked_keys_and_nested_arrays():
+    text = json.dumps(DOCUMENT)
+    assert _feed(StreamingArrayParser(("tags",)), text, 5) == []
+    assert _feed(StreamingArrayParser(("highlights",)), text, 5)[0] == ("highlights", "Multi-AZ, \\ failover")
+
+
+def _chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+class FakeClient:
+    """chat.completions.create that streams `text` in small chunks, or returns it whole."""
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if not kwargs.get("stream"):
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))])
+
+        async def chunks():
+            yield SimpleNamespace(choices=[])
+            for i in range(0, len(self.text), 4):
+                await asyncio.sleep(0)
+                yield _chunk(self.text[i:i + 4])
+            yield _chunk(None)
+
+        return chunks()
+
+
+async def test_complete_json_streams_only_when_asked():
+    text = json.dumps(DOCUMENT)
+    client = FakeClient(text)
+
+    assert await complete_json(client, None, ("cards",), model="m", messages=[]) == text
+    assert "stream" not in client.calls[-1]
+
+    items = []
+    content = await complete_json(client, lambda key, item: items.append((key, item)), ("cards",), model="m", messages=[])
+    assert content == text
+    assert client.calls[-1]["stream"] is True
+    assert items == [("cards", card) for card in DOCUMENT["cards"]]
+
+
+def _events(app, path):
+    with TestClient(app) as client:
+        response = client.post(path)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+
+
+def test_stream_generation_sends_items_then_result():
+    app = FastAPI()
+
+    async def run(on_item):
+        for i in range(3):
+            on_item("questions", {"id": f"q{i}"})
+            await asyncio.sleep(0)
+        on_item("slides", {"title": "Intro"})
+        return {"success": True, "count": 3}
+
+    app.post("/stream")(lambda: stream_generation(run))
+    events = _events(app, "/stream")
+
+    assert events[0] == {"type": "status", "message": "started"}
+    assert events[1:5] == [
+        {"type": "item", "key": "questions", "index": 0, "item": {"id": "q0"}},
+        {"type": "item", "key": "questions", "index": 1, "item": {"id": "q1"}},
+        {"type": "item", "key": "questions", "index": 2, "item": {"id": "q2"}},
+        {"type": "item", "key": "slides", "index": 0, "item": {"title": "Intro"}},
+    ]
+    assert events[5] == {"type": "complete", "result": {"success": True, "count": 3}}
+
+
+def test_stream_generation_reports_errors_with_status():
+    app = FastAPI()
+
+    async def bad_request(on_item):
+        on_item("cards", {"front": "partial"})
+        raise HTTPException(status_code=400, detail="Unknown certification")
+
+    async def no_key(on_item):
+        raise ApiKeyRequiredError("OpenAI API key required")
+
+    async def crash(on_item):
+        raise RuntimeError("model returned invalid JSON")
+
+    app.post("/bad")(lambda: stream_generation(bad_request))
+    app.post("/key")(lambda: stream_generation(no_key))
+    app.post("/crash")(lambda: stream_generation(crash))
+
+    bad = _events(app, "/bad")
+    assert bad[1]["type"] == "item"
+    assert bad[-1] == {"type": "error", "status": 400, "message": "Unknown certification"}
+    assert _events(app, "/key")[-1] == {"type": "error", "status": 402, "message": "OpenAI API key required"}
+    assert _events(app, "/crash")[-1] == {"type": "error", "status": 500, "message": "model returned invalid JSON"}
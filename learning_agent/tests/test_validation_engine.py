@@ -0,0 +1,96 @@
+"""
+Diagram Validation Engine Tests
+===============================
+Exercises the shared rule engine (shared/validation) on React Flow diagrams
+and on the audit request format.
+
+Run with: pytest tests/test_validation_engine.py -v
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from shared.validation import DiagramGraph, RuleContext, ValidationEngine, validate_diagram  # noqa: E402
+
+
+def _flow(*nodes, edges=()):
+    return {
+        "nodes": [
+            {"id": node_id, "type": "awsService", "data": {"service_id": service_id, "label": node_id},
+             **({"parentId": parent} if parent else {})}
+            for node_id, service_id, parent in nodes
+        ],
+        "edges": [{"source": s, "target": t} for s, t in edges],
+    }
+
+
+def test_flat_diagram_keeps_legacy_messages():
+    report = validate_diagram(_flow(("web", "ec2", None), ("db", "rds", None), ("fn", "lambda", None)))
+    assert report.warnings == ["EC2 instances should be in a VPC", "RDS should be in a VPC"]
+    assert "Consider adding a load balancer for high availability" in report.suggestions
+    assert "Lambda accessing RDS should be in a VPC" in report.suggestions
+    assert not report.valid
+
+
+def test_containment_and_edges_are_indexed():
+    diagram = _flow(
+        ("vpc", "vpc", None),
+        ("pub", "subnet-public", "vpc"),
+        ("priv", "subnet-private", "vpc"),
+        ("lb", "alb", "pub"),
+        ("app", "ec2", "priv"),
+        ("db", "rds", "pub"),
+        edges=[("lb", "app"), ("app", "db")],
+    )
+    graph = DiagramGraph.from_react_flow(diagram)
+    assert graph.ancestors("db") == ("pub", "vpc")
+    assert graph.enclosing("app", "vpc") == "vpc"
+    assert graph.connected("app", "rds")
+
+    report = validate_diagram(graph)
+    errors = [f for f in report.findings if f.severity == "error"]
+    assert [f.rule for f in errors] == ["private-data-tier"]
+    assert report.placement_issues(graph)[0]["node_id"] == "db"
+    assert set(report.rule_timings_ms) >= {"vpc-placement", "private-data-tier", "load-balancing"}
+    assert "catalog-placement" in report.skipped
+
+
+def test_catalog_rules_from_audit_request():
+    graph = DiagramGraph.from_nodes(
+        [
+            {"id": "v", "type": "vpc"},
+            {"id": "s", "type": "subnet-private", "parent_id": "v"},
+            {"id": "b", "type": "s3", "parent_id": "s"},
+            {"id": "e", "type": "ec2", "parent_id": "s"},
+            {"id": "igw", "type": "internet-gateway", "parent_id": "v"},
+        ],
+        [{"from": "e", "to": "igw"}],
+    )
+    context = RuleContext.from_available_services(
+        [
+            {"id": "s3", "name": "S3", "scope": "regional", "must_be_inside": ["region"]},
+            {"id": "ec2", "name": "EC2", "is_vpc_resource": True, "must_be_inside": ["subnet-private"]},
+        ],
+        [{"valid_sources": ["internet-gateway"], "valid_targets": ["ec2"]}],
+    )
+    report = ValidationEngine().validate(graph, context)
+
+    placement = report.placement_issues(graph)
+    assert [(p["node_id"], p["severity"]) for p in placement] == [("b", "error")]
+    connections = report.connection_issues()
+    assert connections[0]["source_id"] == "e" and "reversed" in connections[0]["issue"]
+    assert report.has_errors
+
+
+def test_large_diagram_is_validated_in_one_pass():
+    nodes = [("vpc", "vpc", None)]
+    for az in range(3):
+        nodes.append((f"sub{az}", "subnet-private", "vpc"))
+    services = ["ec2", "rds", "lambda", "s3", "alb", "elasticache"]
+    for i in range(494):
+        nodes.append((f"n{i}", services[i % len(services)], f"sub{i % 3}"))
+    edges = [(f"n{i}", f"n{i + 1}") for i in range(493)]
+    report = validate_diagram(_flow(*nodes, edges=edges))
+    assert report.node_count == 498 and report.edge_count == 493
+    assert all(ms >= 0 for ms in report.rule_timings_ms.values())
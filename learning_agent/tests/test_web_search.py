@@ -0,0 +1,169 @@
+"""
+Web Search Cache Tests
+======================
+Runs search_web against a local stub standing in for the Brave API and a
+throwaway redis-server (conftest.py): caching, single-flight coalescing,
+the per-key rate limit and quota back-off.
+
+Run with: pytest tests/test_web_search.py -v
+"""
+import sys
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import web_search  # noqa: E402
+
+
+class StubBrave:
+    """Brave-shaped responses after `delay`; queue (status, headers) pairs in `replies` to override."""
+
+    def __init__(self):
+        self.requests = []
+        self.replies = []
+        self.delay = 0.1
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                stub.requests.append((time.time(), query["q"][0], self.headers["X-Subscription-Token"]))
+                time.sleep(stub.delay)
+                status, headers = stub.replies.pop(0) if stub.replies else (200, {})
+                body = json.dumps({"web": {"results": [
+                    {"title": f"{query['q'][0]} {i}", "url": f"https://r/{i}", "description": "d"}
+                    for i in range(int(query["count"][0]))
+                ]}}).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/res/v1/web/search"
+
+
+@pytest.fixture
+async def brave(r, monkeypatch):
+    stub = StubBrave()
+    client = httpx.AsyncClient()
+    deps = SimpleNamespace(brave_api_key="test-key", http_client=client)
+
+    async def get_redis():
+        return r
+
+    monkeypatch.setattr(web_search, "BRAVE_SEARCH_URL", stub.url)
+    monkeypatch.setattr(web_search, "BRAVE_RATE_PER_SECOND", 20)
+    monkeypatch.setattr(web_search, "get_agent_deps", lambda: deps)
+    monkeypatch.setattr(web_search, "_get_redis", get_redis)
+    yield stub
+    await client.aclose()
+    stub.server.shutdown()
+
+
+def _outcome(name: str) -> float:
+    return REGISTRY.get_sample_value("archistry_search_requests_total", {"outcome": name}) or 0.0
+
+
+async def test_repeat_searches_hit_cache(brave):
+    hits = _outcome("hit")
+    first = await web_search.search_web("Acme Corp  overview", max_results=3)
+    again = await web_search.search_web("acme corp overview", max_results=3)
+    other_count = await web_search.search_web("acme corp overview", max_results=2)
+
+    assert first == again and len(first) == 3 and len(other_count) == 2
+    assert [q for _, q, _ in brave.requests] == ["Acme Corp  overview", "acme corp overview"]
+    assert _outcome("hit") == hits + 1
+
+
+async def test_concurrent_identical_searches_share_one_request(brave):
+    coalesced = _outcome("coalesced")
+    results = await asyncio.gather(*(web_search.search_web("aws lambda", 2) for _ in range(10)))
+    assert len(brave.requests) == 1
+    assert all(r == results[0] for r in results)
+    assert _outcome("coalesced") == coalesced + 9
+
+
+async def test_workers_coalesce_through_redis_lock(brave):
+    # _cached_search directly skips the in-process single-flight, like separate workers
+    key = web_search.search_cache_key("aws s3", 2, "en")
+    results = await asyncio.gather(*(web_search._cached_search(key, "aws s3", 2, "en") for _ in range(4)))
+    assert len(brave.requests) == 1
+    assert all(len(r) == 2 for r in results)
+
+
+async def test_lock_is_only_released_by_its_holder(brave, r, monkeypatch):
+    monkeypatch.setattr(web_search, "LOCK_MS", 100)
+    brave.delay = 0.3
+    key = web_search.search_cache_key("aws iam", 1, "en")
+    lock_key = f"{key}:lock"
+
+    # Our lock expires mid-fetch and another worker takes it
+    fetch = asyncio.create_task(web_search._cached_search(key, "aws iam", 1, "en"))
+    await asyncio.sleep(0.15)
+    await r.set(lock_key, "other-worker", px=5000)
+    assert len(await fetch) == 1
+    assert await r.get(lock_key) == "other-worker"
+
+    # A waiter that gives up on a stuck holder fetches but leaves its lock alone
+    await r.delete(key)
+    assert len(await web_search._cached_search(key, "aws iam", 1, "en")) == 1
+    assert await r.get(lock_key) == "other-worker"
+    assert len(brave.requests) == 2
+
+
+async def test_rate_limit_per_api_key(brave, monkeypatch):
+    monkeypatch.setattr(web_search, "BRAVE_RATE_PER_SECOND", 2)
+    brave.delay = 0
+    await asyncio.gather(*(web_search.search_web(f"query {i}", 1) for i in range(5)))
+
+    per_second = {}
+    for sent, _, _ in brave.requests:
+        per_second[int(sent)] = per_second.get(int(sent), 0) + 1
+    assert len(brave.requests) == 5
+    assert max(per_second.values()) <= 2
+
+
+async def test_429_pauses_key_then_retries(brave, r):
+    brave.delay = 0
+    brave.replies = [(429, {"X-RateLimit-Remaining": "0, 100", "X-RateLimit-Reset": "1, 86400"})]
+    started = time.monotonic()
+    results = await web_search.search_web("throttled", 1)
+
+    assert len(results) == 1 and len(brave.requests) == 2
+    assert brave.requests[1][0] - brave.requests[0][0] >= 0.9
+    assert time.monotonic() - started < 3
+
+
+async def test_exhausted_quota_skips_upstream_and_failures_are_not_cached(brave, monkeypatch):
+    monkeypatch.setattr(web_search, "BRAVE_RATE_WAIT_SECONDS", 0.5)
+    brave.delay = 0
+    brave.replies = [(500, {})]
+    assert await web_search.search_web("flaky", 1) == []
+    assert len(await web_search.search_web("flaky", 1)) == 1  # the error was not cached
+
+    # Monthly quota used up: searches stop going upstream until the reset
+    brave.replies = [(200, {"X-RateLimit-Remaining": "5, 0", "X-RateLimit-Reset": "1, 86400"})]
+    await web_search.search_web("last one", 1)
+    limited = _outcome("rate_limited")
+    assert await web_search.search_web("next", 1) == []
+    assert _outcome("rate_limited") == limited + 1
+    assert len(brave.requests) == 3
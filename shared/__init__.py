@@ -0,0 +1,7 @@
+"""
+Shared code for the CloudArchistry Python services
+===================================================
+Imported by both the Learning Agent and the AWS Drawing Agent. Containers get
+a copy at /app/shared (see the `shared` build context in docker-compose.yml);
+local checkouts resolve it from the repository root.
+"""
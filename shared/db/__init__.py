@@ -0,0 +1,61 @@
+"""
+Shared Data Access Layer
+========================
+asyncpg pool management plus the query functions used by both the Learning
+Agent and the AWS Drawing Agent. Each service configures the pool once at
+import time (see its db.py) and otherwise just calls these functions.
+
+JSON/JSONB columns are decoded to Python objects by codecs registered on the
+pool, and Python objects can be passed directly as JSON/JSONB parameters.
+
+Every exported query function is wrapped with metrics.instrument, so
+render_metrics() reports per-function latency, rows and pool wait time.
+"""
+
+from .pool import (
+    PoolSettings,
+    configure_pool,
+    get_pool_settings,
+    get_pool,
+    close_pool,
+    add_query_hook,
+    remove_query_hook,
+    add_acquire_hook,
+    remove_acquire_hook,
+    logger,
+)
+from .metrics import instrument, current_db_function, render_metrics
+from . import (
+    scenarios,
+    flashcards,
+    notes,
+    quizzes,
+    profiles,
+    coaching,
+    aws_reference,
+    knowledge,
+    journey,
+    ai_config,
+    bug_bounty,
+)
+
+# Expose instrumented versions of every module's public query functions.
+# Calls between modules inside the package stay unwrapped, so time is
+# attributed to the function the service actually called.
+for _module in (
+    scenarios,
+    flashcards,
+    notes,
+    quizzes,
+    profiles,
+    coaching,
+    aws_reference,
+    knowledge,
+    journey,
+    ai_config,
+    bug_bounty,
+):
+    for _name in _module.__all__:
+        globals()[_name] = instrument(getattr(_module, _name))
+
+del _module, _name
@@ -0,0 +1,176 @@
+"""
+Tenant/User AI Configuration
+============================
+OpenAI keys, preferred models and personas.
+"""
+
+from typing import Optional, Dict, Any
+
+from .pool import get_pool
+
+__all__ = [
+    "get_tenant_ai_config",
+    "get_user_ai_config",
+    "update_tenant_ai_config",
+    "update_user_ai_config",
+    "get_user_persona",
+    "update_user_persona",
+]
+
+
+# =============================================================================
+# TENANT/USER AI CONFIGURATION
+# =============================================================================
+
+async def get_tenant_ai_config(tenant_id: str) -> Optional[Dict[str, Any]]:
+    """Get tenant's AI configuration (OpenAI key, preferred model)."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT id, name, "openaiApiKey", "preferredModel"
+            FROM "Tenant"
+            WHERE id = $1
+        """, tenant_id)
+        
+        if not row:
+            return None
+        
+        return {
+            "tenant_id": row["id"],
+            "tenant_name": row["name"],
+            "openai_api_key": row["openaiApiKey"],
+            "preferred_model": row.get("preferredModel", "gpt-4.1"),
+        }
+
+
+async def get_user_ai_config(user_id: str) -> Optional[Dict[str, Any]]:
+    """Get user's AI configuration from AcademyUserProfile."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT id, "displayName", "openaiApiKey", "preferredModel", "skillLevel"
+            FROM "AcademyUserProfile"
+            WHERE id = $1
+        """, user_id)
+        
+        if not row:
+            return None
+        
+        return {
+            "user_id": row["id"],
+            "display_name": row["displayName"],
+            "openai_api_key": row["openaiApiKey"],
+            "preferred_model": row.get("preferredModel", "gpt-4.1"),
+            "skill_level": row["skillLevel"],
+        }
+
+
+async def update_tenant_ai_config(
+    tenant_id: str,
+    openai_api_key: Optional[str] = None,
+    preferred_model: Optional[str] = None,
+) -> bool:
+    """Update tenant's AI configuration."""
+    pool = await get_pool()
+    
+    updates = []
+    params = [tenant_id]
+    param_idx = 2
+    
+    if openai_api_key is not None:
+        updates.append(f'"openaiApiKey" = ${param_idx}')
+        params.append(openai_api_key)
+        param_idx += 1
+    
+    if preferred_model is not None:
+        updates.append(f'"preferredModel" = ${param_idx}')
+        params.append(preferred_model)
+        param_idx += 1
+    
+    if not updates:
+        return False
+    
+    updates.append('"updatedAt" = NOW()')
+    
+    async with pool.acquire() as conn:
+        result = await conn.execute(f"""
+            UPDATE "Tenant"
+            SET {', '.join(updates)}
+            WHERE id = $1
+        """, *params)
+        
+        return "UPDATE 1" in result
+
+
+async def update_user_ai_config(
+    user_id: str,
+    openai_api_key: Optional[str] = None,
+    preferred_model: Optional[str] = None,
+) -> bool:
+    """Update user's AI configuration in AcademyUserProfile."""
+    pool = await get_pool()
+    
+    updates = []
+    params = [user_id]
+    param_idx = 2
+    
+    if openai_api_key is not None:
+        updates.append(f'"openaiApiKey" = ${param_idx}')
+        params.append(openai_api_key)
+        param_idx += 1
+    
+    if preferred_model is not None:
+        updates.append(f'"preferredModel" = ${param_idx}')
+        params.append(preferred_model)
+        param_idx += 1
+    
+    if not updates:
+        return False
+    
+    updates.append('"updatedAt" = NOW()')
+    
+    async with pool.acquire() as conn:
+        result = await conn.execute(f"""
+            UPDATE "AcademyUserProfile"
+            SET {', '.join(updates)}
+            WHERE id = $1
+        """, *params)
+        
+        return "UPDATE 1" in result
+
+
+async def get_user_persona(user_id: str) -> Optional[str]:
+    """Get user's active learning persona."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT settings->>'activePersona' as persona
+            FROM "AcademyUserProfile"
+            WHERE id = $1
+        """, user_id)
+        
+        if row and row["persona"]:
+            return row["persona"]
+        return None
+
+
+async def update_user_persona(user_id: str, persona_id: str) -> bool:
+    """Update user's active learning persona in settings JSON."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        result = await conn.execute("""
+            UPDATE "AcademyUserProfile"
+            SET settings = jsonb_set(
+                COALESCE(settings, '{}')::jsonb,
+                '{activePersona}',
+                to_jsonb($2::text)
+            ),
+            "updatedAt" = NOW()
+            WHERE id = $1
+        """, user_id, persona_id)
+        
+        return "UPDATE 1" in result
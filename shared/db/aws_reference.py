@@ -0,0 +1,69 @@
+"""
+AWS Service Reference
+=====================
+Service reference and migration pattern lookups (kept for backwards compatibility).
+"""
+
+from typing import Optional
+
+from .pool import get_pool
+
+__all__ = [
+    "get_aws_service_reference",
+    "get_migration_pattern",
+]
+
+
+# =============================================================================
+# AWS SERVICE REFERENCE (kept for backwards compatibility)
+# =============================================================================
+
+async def get_aws_service_reference(service_name: str) -> Optional[dict]:
+    """Get reference info for an AWS service."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "AWSServiceReference"
+            WHERE "serviceName" = $1 OR "serviceCode" = $1
+        """, service_name)
+        
+        if not row:
+            return None
+        
+        return {
+            "service_name": row["serviceName"],
+            "full_name": row["fullName"],
+            "category": row["category"],
+            "short_description": row["shortDescription"],
+            "use_cases": row["useCases"] or [],
+            "on_prem_equivalents": row["onPremEquivalents"] or [],
+            "migration_category": row["migrationCategory"],
+            "docs_url": row["docsUrl"],
+        }
+
+
+async def get_migration_pattern(source_type: str, target_service: str) -> Optional[dict]:
+    """Get a migration pattern."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "MigrationPattern"
+            WHERE "sourceType" = $1 AND "targetService" = $2
+            AND "isActive" = true
+        """, source_type, target_service)
+        
+        if not row:
+            return None
+        
+        return {
+            "name": row["name"],
+            "source_type": row["sourceType"],
+            "target_service": row["targetService"],
+            "description": row["fullDescription"],
+            "steps": row["steps"] or [],
+            "complexity": row["complexity"],
+            "estimated_hours": row["estimatedHours"],
+            "aws_services": row["awsServices"] or [],
+        }
@@ -0,0 +1,290 @@
+"""
+Bug Bounty Challenges
+=====================
+Persisted Bug Bounty challenges, including their hidden bugs.
+"""
+
+from typing import Optional, List
+
+from .pool import get_pool, logger
+
+__all__ = [
+    "save_bug_bounty_challenge",
+    "get_bug_bounty_challenge",
+    "update_bug_bounty_progress",
+    "record_bug_bounty_claim",
+    "complete_bug_bounty_challenge",
+    "get_user_bug_bounty_history",
+    "delete_bug_bounty_challenge",
+    "cleanup_old_bug_bounty_challenges",
+]
+
+
+# =============================================================================
+# BUG BOUNTY CHALLENGES
+# =============================================================================
+
+async def save_bug_bounty_challenge(
+    challenge_id: str,
+    profile_id: Optional[str],
+    user_level: str,
+    scenario_type: str,
+    target_cert: Optional[str],
+    description: str,
+    diagram: dict,
+    aws_environment: dict,
+    hidden_bugs: list,
+    bug_count: int,
+    bounty_value: int,
+    time_limit: int,
+) -> str:
+    """
+    Save a generated Bug Bounty challenge to the database.
+    Stores the complete challenge including hidden bugs (answers).
+    
+    Args:
+        user_level: From AcademyUserProfile.skillLevel (beginner, intermediate, advanced, expert)
+        target_cert: From AcademyUserProfile.targetCertification (SAA, SAP, DVA, etc.)
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "BugBountyChallenge" (
+                id, "profileId", difficulty, "scenarioType", "certificationCode",
+                description, diagram, "awsEnvironment", "hiddenBugs",
+                "bugCount", "bountyValue", "timeLimit",
+                status, "startedAt", "bugsFound", score, "claimsHistory",
+                "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, NOW(), $14, $15, $16, NOW(), NOW())
+            ON CONFLICT (id) DO UPDATE SET
+                "updatedAt" = NOW()
+        """,
+            challenge_id,
+            profile_id,
+            user_level,  # Maps to difficulty column in DB
+            scenario_type,
+            target_cert,  # Maps to certificationCode column in DB
+            description,
+            diagram,
+            aws_environment,
+            hidden_bugs,
+            bug_count,
+            bounty_value,
+            time_limit,
+            "active",
+            0,  # bugsFound
+            0,  # score
+            [],  # claimsHistory
+        )
+    
+    logger.info(f"Saved Bug Bounty challenge {challenge_id} with {bug_count} bugs (user_level={user_level}, target_cert={target_cert})")
+    return challenge_id
+
+
+async def get_bug_bounty_challenge(challenge_id: str) -> Optional[dict]:
+    """
+    Get a Bug Bounty challenge by ID.
+    Returns the complete challenge including hidden bugs for validation.
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "BugBountyChallenge" WHERE id = $1
+        """, challenge_id)
+        
+        if not row:
+            return None
+        
+        return {
+            "challenge_id": row["id"],
+            "profile_id": row["profileId"],
+            "user_level": row["difficulty"],  # DB column is 'difficulty', API uses 'user_level'
+            "scenario_type": row["scenarioType"],
+            "target_cert": row["certificationCode"],  # DB column is 'certificationCode', API uses 'target_cert'
+            "description": row["description"],
+            "diagram": row["diagram"] or {},
+            "aws_environment": row["awsEnvironment"] or {},
+            "hidden_bugs": row["hiddenBugs"] or [],
+            "bug_count": row["bugCount"],
+            "bounty_value": row["bountyValue"],
+            "time_limit": row["timeLimit"],
+            "status": row["status"],
+            "started_at": row["startedAt"],
+            "completed_at": row["completedAt"],
+            "bugs_found": row["bugsFound"],
+            "score": row["score"],
+            "claims_history": row["claimsHistory"] or [],
+        }
+
+
+async def update_bug_bounty_progress(
+    challenge_id: str,
+    bugs_found: int,
+    score: int,
+    claim_entry: Optional[dict] = None,
+) -> bool:
+    """
+    Update Bug Bounty challenge progress after a claim is validated.
+    Appends the claim to history and updates score/bugs_found.
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        if claim_entry:
+            # Append claim to history
+            result = await conn.execute("""
+                UPDATE "BugBountyChallenge"
+                SET "bugsFound" = $2,
+                    score = $3,
+                    "claimsHistory" = "claimsHistory"::jsonb || $4::jsonb,
+                    "updatedAt" = NOW()
+                WHERE id = $1
+            """, challenge_id, bugs_found, score, [claim_entry])
+        else:
+            result = await conn.execute("""
+                UPDATE "BugBountyChallenge"
+                SET "bugsFound" = $2,
+                    score = $3,
+                    "updatedAt" = NOW()
+                WHERE id = $1
+            """, challenge_id, bugs_found, score)
+        
+        return "UPDATE 1" in result
+
+
+async def record_bug_bounty_claim(
+    challenge_id: str,
+    bugs_found_delta: int,
+    points: int,
+    claim_entry: Optional[dict] = None,
+) -> Optional[dict]:
+    """
+    Add a validated claim to a challenge's totals in a single UPDATE.
+    Increments happen in the database, so concurrent claims on different
+    workers cannot overwrite each other. Returns the new totals.
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            UPDATE "BugBountyChallenge"
+            SET "bugsFound" = "bugsFound" + $2,
+                score = score + $3,
+                "claimsHistory" = "claimsHistory"::jsonb || $4::jsonb,
+                "updatedAt" = NOW()
+            WHERE id = $1
+            RETURNING "bugsFound", score
+        """, challenge_id, bugs_found_delta, points, [claim_entry] if claim_entry else [])
+        
+        if not row:
+            return None
+        return {"bugs_found": row["bugsFound"], "score": row["score"]}
+
+
+async def complete_bug_bounty_challenge(
+    challenge_id: str,
+    final_score: int,
+    bugs_found: int,
+    status: str = "completed",
+) -> bool:
+    """
+    Mark a Bug Bounty challenge as completed (time expired or user finished).
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        result = await conn.execute("""
+            UPDATE "BugBountyChallenge"
+            SET status = $2,
+                "completedAt" = NOW(),
+                score = $3,
+                "bugsFound" = $4,
+                "updatedAt" = NOW()
+            WHERE id = $1
+        """, challenge_id, status, final_score, bugs_found)
+        
+        return "UPDATE 1" in result
+
+
+async def get_user_bug_bounty_history(
+    profile_id: str,
+    limit: int = 20,
+) -> List[dict]:
+    """
+    Get a user's Bug Bounty challenge history.
+    Returns recent challenges with scores and status.
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT id, difficulty, "scenarioType", "bugCount", "bountyValue",
+                   status, "startedAt", "completedAt", "bugsFound", score
+            FROM "BugBountyChallenge"
+            WHERE "profileId" = $1
+            ORDER BY "createdAt" DESC
+            LIMIT $2
+        """, profile_id, limit)
+        
+        return [
+            {
+                "challenge_id": row["id"],
+                "difficulty": row["difficulty"],
+                "scenario_type": row["scenarioType"],
+                "bug_count": row["bugCount"],
+                "bounty_value": row["bountyValue"],
+                "status": row["status"],
+                "started_at": row["startedAt"],
+                "completed_at": row["completedAt"],
+                "bugs_found": row["bugsFound"],
+                "score": row["score"],
+            }
+            for row in rows
+        ]
+
+
+async def delete_bug_bounty_challenge(challenge_id: str) -> bool:
+    """
+    Delete a Bug Bounty challenge from the database.
+    Called when user exits the game to keep DB clean.
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        result = await conn.execute("""
+            DELETE FROM "BugBountyChallenge" WHERE id = $1
+        """, challenge_id)
+        
+        deleted = "DELETE 1" in result
+        if deleted:
+            logger.info(f"Deleted Bug Bounty challenge {challenge_id}")
+        return deleted
+
+
+async def cleanup_old_bug_bounty_challenges(hours_old: int = 24) -> int:
+    """
+    Clean up old/abandoned Bug Bounty challenges.
+    Deletes challenges older than specified hours.
+    Can be called periodically or on startup.
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        result = await conn.execute("""
+            DELETE FROM "BugBountyChallenge"
+            WHERE "createdAt" < NOW() - make_interval(hours => $1)
+        """, hours_old)
+        
+        # Extract count from result like "DELETE 5"
+        count = 0
+        if "DELETE" in result:
+            try:
+                count = int(result.split()[1])
+            except (IndexError, ValueError):
+                pass
+        
+        if count > 0:
+            logger.info(f"Cleaned up {count} old Bug Bounty challenges")
+        return count
@@ -0,0 +1,108 @@
+"""
+Coaching Sessions
+=================
+Coaching chat sessions and messages.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, List
+
+from .pool import get_pool
+
+__all__ = [
+    "save_coaching_message",
+    "create_coaching_session",
+    "get_session_history",
+]
+
+
+# =============================================================================
+# COACHING SESSIONS
+# =============================================================================
+
+async def save_coaching_message(
+    session_id: str,
+    role: str,
+    content: str,
+    metadata: Optional[dict] = None,
+) -> str:
+    """Save a coaching chat message."""
+    pool = await get_pool()
+    
+    import uuid
+    message_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "CoachingMessage" (
+                id, "sessionId", role, content, "contentType", metadata, "createdAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7)
+        """,
+            message_id,
+            session_id,
+            role,
+            content,
+            "text",
+            metadata or {},
+            datetime.now(timezone.utc),
+        )
+        
+        # Update session message count
+        await conn.execute("""
+            UPDATE "CoachingSession" 
+            SET "messageCount" = "messageCount" + 1,
+                "lastMessageAt" = NOW(),
+                "updatedAt" = NOW()
+            WHERE id = $1
+        """, session_id)
+    
+    return message_id
+
+
+async def create_coaching_session(
+    session_id: str,
+    scenario_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    """Create a new coaching session."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "CoachingSession" (
+                id, "profileId", "scenarioId", title, status,
+                "messageCount", "startedAt", "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $7, $7)
+        """,
+            session_id,
+            user_id,  # profileId
+            scenario_id,
+            "Coaching Session",
+            "active",
+            0,
+            datetime.now(timezone.utc),
+        )
+    
+    return session_id
+
+
+async def get_session_history(session_id: str, limit: int = 50) -> List[dict]:
+    """Get chat history for a session."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT * FROM "CoachingMessage"
+            WHERE "sessionId" = $1
+            ORDER BY "createdAt" DESC
+            LIMIT $2
+        """, session_id, limit)
+        
+        return [
+            {
+                "role": row["role"],
+                "content": row["content"],
+                "created_at": row["createdAt"].isoformat(),
+            }
+            for row in reversed(rows)
+        ]
@@ -0,0 +1,483 @@
+"""
+Flashcards
+==========
+Flashcard decks, spaced-repetition progress and platform content lookups.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any
+
+from .pool import get_pool, logger
+from .journey import _record_flashcard_stats
+
+__all__ = [
+    "save_flashcard_deck",
+    "get_flashcard_deck",
+    "get_active_platform_content",
+    "get_existing_flashcard_topics",
+    "get_existing_quiz_questions",
+    "get_flashcard_decks_for_scenario",
+    "get_user_flashcard_progress",
+    "update_flashcard_progress",
+    "get_cards_due_for_review",
+]
+
+
+# =============================================================================
+# FLASHCARDS
+# =============================================================================
+
+async def save_flashcard_deck(
+    deck_data: dict,
+    generated_by: str = "ai",
+    scenario_id: str = None,
+    profile_id: str = None,
+    certification_code: str = None,
+    deck_type: str = "certification",
+) -> str:
+    """Save a flashcard deck - supports both scenario-based and certification-based."""
+    pool = await get_pool()
+    
+    import uuid
+    deck_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "FlashcardDeck" (
+                id, "scenarioId", "profileId", "certificationCode", "deckType",
+                title, description, "generatedBy",
+                "totalCards", "isActive", "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $11)
+        """,
+            deck_id,
+            scenario_id,
+            profile_id,
+            certification_code,
+            deck_type,
+            deck_data.get("title", "Flashcards"),
+            deck_data.get("description", ""),
+            generated_by,
+            len(deck_data.get("cards", [])),
+            True,
+            datetime.now(timezone.utc),
+        )
+        
+        # Save cards
+        for idx, card in enumerate(deck_data.get("cards", [])):
+            card_id = str(uuid.uuid4())
+            await conn.execute("""
+                INSERT INTO "Flashcard" (
+                    id, "deckId", front, back, "frontType", "backType",
+                    tags, difficulty, "awsServices", "orderIndex", "createdAt", "updatedAt"
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $11)
+            """,
+                card_id,
+                deck_id,
+                card.get("front", ""),
+                card.get("back", ""),
+                "text",
+                "text",
+                card.get("tags", []),
+                card.get("difficulty", "medium"),
+                card.get("aws_services", []),
+                idx,
+                datetime.now(timezone.utc),
+            )
+    
+    logger.info(f"Saved flashcard deck {deck_id} with {len(deck_data.get('cards', []))} cards")
+    return deck_id
+
+
+async def get_flashcard_deck(deck_id: str) -> Optional[dict]:
+    """Get a flashcard deck with all cards."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "FlashcardDeck" WHERE id = $1
+        """, deck_id)
+        
+        if not row:
+            return None
+        
+        cards = await conn.fetch("""
+            SELECT * FROM "Flashcard" 
+            WHERE "deckId" = $1 
+            ORDER BY "orderIndex"
+        """, deck_id)
+        
+        return {
+            "id": row["id"],
+            "scenario_id": row["scenarioId"],
+            "title": row["title"],
+            "description": row["description"],
+            "total_cards": row["totalCards"],
+            "cards": [
+                {
+                    "id": c["id"],
+                    "front": c["front"],
+                    "back": c["back"],
+                    "difficulty": c["difficulty"],
+                    "aws_services": c["awsServices"] or [],
+                    "tags": c["tags"] or [],
+                }
+                for c in cards
+            ],
+        }
+
+
+async def get_active_platform_content() -> Dict[str, Any]:
+    """
+    Fetch all active platform content for study plan generation.
+    Returns games, exams, scenarios, flashcards, and quizzes.
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        # Fetch active game modes
+        games = await conn.fetch("""
+            SELECT slug, name, description, icon, "minPlayers", "maxPlayers"
+            FROM "GameType"
+            WHERE "isActive" = true
+            ORDER BY name
+        """)
+        
+        # Fetch active practice exams
+        exams = await conn.fetch("""
+            SELECT slug, title, "certificationCode", description, "questionCount"
+            FROM "PracticeExam"
+            WHERE "isActive" = true
+            ORDER BY "certificationCode"
+        """)
+        
+        # Fetch active scenarios (world challenges)
+        scenarios = await conn.fetch("""
+            SELECT id, title, description, difficulty
+            FROM "AcademyScenario"
+            WHERE "isActive" = true
+            ORDER BY "createdAt" DESC
+            LIMIT 20
+        """)
+        
+        # Fetch active flashcard decks
+        flashcard_decks = await conn.fetch("""
+            SELECT id, title, description, "totalCards"
+            FROM "FlashcardDeck"
+            WHERE "isActive" = true
+            ORDER BY "createdAt" DESC
+            LIMIT 20
+        """)
+        
+        # Fetch active quizzes
+        quizzes = await conn.fetch("""
+            SELECT id, title, description
+            FROM "Quiz"
+            WHERE "isActive" = true
+            ORDER BY "createdAt" DESC
+            LIMIT 20
+        """)
+        
+        return {
+            "games": [dict(row) for row in games],
+            "exams": [dict(row) for row in exams],
+            "scenarios": [dict(row) for row in scenarios],
+            "flashcard_decks": [dict(row) for row in flashcard_decks],
+            "quizzes": [dict(row) for row in quizzes],
+        }
+
+
+async def get_existing_flashcard_topics(certification_code: str = None, limit: int = 50) -> List[str]:
+    """Get existing flashcard front questions to avoid duplicates."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        if certification_code:
+            rows = await conn.fetch("""
+                SELECT f.front FROM "Flashcard" f
+                JOIN "FlashcardDeck" d ON f."deckId" = d.id
+                WHERE d."certificationCode" = $1 AND d."isActive" = true
+                ORDER BY d."createdAt" DESC
+                LIMIT $2
+            """, certification_code, limit)
+        else:
+            rows = await conn.fetch("""
+                SELECT front FROM "Flashcard" f
+                JOIN "FlashcardDeck" d ON f."deckId" = d.id
+                WHERE d."isActive" = true
+                ORDER BY d."createdAt" DESC
+                LIMIT $1
+            """, limit)
+        
+        return [row["front"] for row in rows]
+
+
+async def get_existing_quiz_questions(certification_code: str = None, limit: int = 50) -> List[str]:
+    """Get existing quiz questions to avoid duplicates."""
+    try:
+        pool = await get_pool()
+        
+        async with pool.acquire() as conn:
+            if certification_code:
+                rows = await conn.fetch("""
+                    SELECT q.question FROM "QuizQuestion" q
+                    JOIN "AcademyQuiz" qz ON q."quizId" = qz.id
+                    WHERE qz."certificationCode" = $1
+                    ORDER BY qz."createdAt" DESC
+                    LIMIT $2
+                """, certification_code, limit)
+            else:
+                rows = await conn.fetch("""
+                    SELECT question FROM "QuizQuestion" q
+                    JOIN "AcademyQuiz" qz ON q."quizId" = qz.id
+                    ORDER BY qz."createdAt" DESC
+                    LIMIT $1
+                """, limit)
+            
+            return [row["question"] for row in rows]
+    except Exception as e:
+        logger.warning(f"Could not get existing questions: {e}")
+        return []
+
+
+async def get_flashcard_decks_for_scenario(scenario_id: str) -> List[dict]:
+    """Get all flashcard decks for a scenario."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT id, title, description, "totalCards", "createdAt"
+            FROM "FlashcardDeck" 
+            WHERE "scenarioId" = $1 AND "isActive" = true
+            ORDER BY "createdAt" DESC
+        """, scenario_id)
+        
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "description": row["description"],
+                "total_cards": row["totalCards"],
+                "created_at": row["createdAt"].isoformat(),
+            }
+            for row in rows
+        ]
+
+
+async def get_user_flashcard_progress(profile_id: str, deck_id: str) -> Optional[dict]:
+    """Get user's progress on a flashcard deck."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "FlashcardUserProgress" 
+            WHERE "profileId" = $1 AND "deckId" = $2
+        """, profile_id, deck_id)
+        
+        if not row:
+            return None
+        
+        # Get individual card progress
+        card_progress = await conn.fetch("""
+            SELECT fp.*, f.front, f.back, f.difficulty
+            FROM "FlashcardProgress" fp
+            JOIN "Flashcard" f ON fp."cardId" = f.id
+            WHERE fp."userProgressId" = $1
+            ORDER BY fp."nextReviewAt" ASC NULLS LAST
+        """, row["id"])
+        
+        return {
+            "id": row["id"],
+            "cards_studied": row["cardsStudied"],
+            "cards_mastered": row["cardsMastered"],
+            "total_reviews": row["totalReviews"],
+            "current_streak": row["currentStreak"],
+            "last_studied_at": row["lastStudiedAt"].isoformat() if row["lastStudiedAt"] else None,
+            "card_progress": [
+                {
+                    "card_id": cp["cardId"],
+                    "front": cp["front"],
+                    "status": cp["status"],
+                    "ease_factor": cp["easeFactor"],
+                    "interval": cp["interval"],
+                    "next_review_at": cp["nextReviewAt"].isoformat() if cp["nextReviewAt"] else None,
+                    "total_reviews": cp["totalReviews"],
+                    "correct_count": cp["correctCount"],
+                }
+                for cp in card_progress
+            ],
+        }
+
+
+async def update_flashcard_progress(
+    profile_id: str,
+    deck_id: str,
+    card_id: str,
+    quality: int,  # 0-5 (SM-2 algorithm: 0=complete blackout, 5=perfect)
+) -> dict:
+    """Update spaced repetition progress for a flashcard."""
+    pool = await get_pool()
+    import uuid
+    from datetime import timedelta
+    
+    async with pool.acquire() as conn, conn.transaction():
+        # Get or create user progress
+        user_progress = await conn.fetchrow("""
+            SELECT * FROM "FlashcardUserProgress" 
+            WHERE "profileId" = $1 AND "deckId" = $2
+        """, profile_id, deck_id)
+        
+        if not user_progress:
+            progress_id = str(uuid.uuid4())
+            await conn.execute("""
+                INSERT INTO "FlashcardUserProgress" (
+                    id, "profileId", "deckId", "cardsStudied", "cardsMastered",
+                    "totalReviews", "lastStudiedAt", "currentStreak", "createdAt", "updatedAt"
+                ) VALUES ($1, $2, $3, 0, 0, 0, NOW(), 0, NOW(), NOW())
+            """, progress_id, profile_id, deck_id)
+        else:
+            progress_id = user_progress["id"]
+        
+        # Get or create card progress
+        card_progress = await conn.fetchrow("""
+            SELECT * FROM "FlashcardProgress" 
+            WHERE "userProgressId" = $1 AND "cardId" = $2
+        """, progress_id, card_id)
+        
+        now = datetime.now(timezone.utc)
+        
+        if not card_progress:
+            # New card - initialize SM-2 values
+            ease_factor = 2.5
+            interval = 1
+            repetitions = 0
+            card_progress_id = str(uuid.uuid4())
+        else:
+            card_progress_id = card_progress["id"]
+            ease_factor = card_progress["easeFactor"]
+            interval = card_progress["interval"]
+            repetitions = card_progress["repetitions"]
+        
+        # SM-2 Algorithm
+        if quality >= 3:
+            # Correct response
+            if repetitions == 0:
+                interval = 1
+            elif repetitions == 1:
+                interval = 6
+            else:
+                interval = int(interval * ease_factor)
+            repetitions += 1
+        else:
+            # Incorrect - reset
+            repetitions = 0
+            interval = 1
+        
+        # Update ease factor
+        ease_factor = max(1.3, ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)))
+        
+        # Determine status
+        if repetitions == 0:
+            status = "learning"
+        elif interval >= 21:
+            status = "mastered"
+        else:
+            status = "review"
+        
+        next_review = now + timedelta(days=interval)
+        
+        # Upsert card progress
+        if not card_progress:
+            await conn.execute("""
+                INSERT INTO "FlashcardProgress" (
+                    id, "userProgressId", "cardId", "easeFactor", "interval",
+                    "repetitions", status, "nextReviewAt", "lastReviewAt",
+                    "totalReviews", "correctCount", "createdAt", "updatedAt"
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, 1, $10, NOW(), NOW())
+            """, card_progress_id, progress_id, card_id, ease_factor, interval,
+                repetitions, status, next_review, now, 1 if quality >= 3 else 0)
+        else:
+            await conn.execute("""
+                UPDATE "FlashcardProgress" SET
+                    "easeFactor" = $1, "interval" = $2, "repetitions" = $3,
+                    status = $4, "nextReviewAt" = $5, "lastReviewAt" = $6,
+                    "totalReviews" = "totalReviews" + 1,
+                    "correctCount" = "correctCount" + $7,
+                    "updatedAt" = NOW()
+                WHERE id = $8
+            """, ease_factor, interval, repetitions, status, next_review, now,
+                1 if quality >= 3 else 0, card_progress_id)
+        
+        # Update user progress stats
+        await conn.execute("""
+            UPDATE "FlashcardUserProgress" SET
+                "totalReviews" = "totalReviews" + 1,
+                "lastStudiedAt" = NOW(),
+                "updatedAt" = NOW()
+            WHERE id = $1
+        """, progress_id)
+        
+        await _record_flashcard_stats(
+            conn,
+            profile_id,
+            card_id,
+            correct=quality >= 3,
+            new_deck=not user_progress,
+            new_card=not card_progress,
+            was_mastered=bool(card_progress) and card_progress["status"] == "mastered",
+            is_mastered=status == "mastered",
+        )
+        
+        return {
+            "card_id": card_id,
+            "status": status,
+            "ease_factor": ease_factor,
+            "interval": interval,
+            "next_review_at": next_review.isoformat(),
+        }
+
+
+async def get_cards_due_for_review(profile_id: str, deck_id: str, limit: int = 20) -> List[dict]:
+    """Get flashcards due for review (spaced repetition)."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        # Get user progress ID
+        user_progress = await conn.fetchrow("""
+            SELECT id FROM "FlashcardUserProgress" 
+            WHERE "profileId" = $1 AND "deckId" = $2
+        """, profile_id, deck_id)
+        
+        if not user_progress:
+            # No progress yet - return first cards from deck
+            cards = await conn.fetch("""
+                SELECT id, front, back, difficulty, "awsServices", tags
+                FROM "Flashcard" 
+                WHERE "deckId" = $1
+                ORDER BY "orderIndex"
+                LIMIT $2
+            """, deck_id, limit)
+        else:
+            # Get cards due for review + new cards
+            cards = await conn.fetch("""
+                SELECT f.id, f.front, f.back, f.difficulty, f."awsServices", f.tags,
+                       fp.status, fp."nextReviewAt"
+                FROM "Flashcard" f
+                LEFT JOIN "FlashcardProgress" fp ON f.id = fp."cardId" 
+                    AND fp."userProgressId" = $1
+                WHERE f."deckId" = $2
+                AND (fp.id IS NULL OR fp."nextReviewAt" <= NOW())
+                ORDER BY fp."nextReviewAt" ASC NULLS FIRST
+                LIMIT $3
+            """, user_progress["id"], deck_id, limit)
+        
+        return [
+            {
+                "id": c["id"],
+                "front": c["front"],
+                "back": c["back"],
+                "difficulty": c["difficulty"],
+                "aws_services": c["awsServices"] or [],
+                "status": c.get("status", "new"),
+            }
+            for c in cards
+        ]
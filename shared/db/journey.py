@@ -0,0 +1,491 @@
+"""
+Learner Stats & Journey Reports
+===============================
+Materialized learner aggregates, journey snapshots and saved reports.
+"""
+
+from typing import Optional, List, Dict, Any
+
+import asyncpg
+
+from .pool import get_pool, logger
+
+__all__ = [
+    "rebuild_learner_stats",
+    "get_learner_snapshot",
+    "get_learner_journey_data",
+    "get_learner_strengths_weaknesses",
+    "save_journey_report",
+    "get_journey_reports",
+]
+
+
+# =============================================================================
+# LEARNER STATS - materialized per-profile / per-service aggregates
+# =============================================================================
+# "LearnerStats" (one row per profile) and "LearnerServiceStats" (one row per
+# profile + AWS service) are maintained incrementally by save_quiz_attempt,
+# update_challenge_progress and update_flashcard_progress inside the same
+# transaction as the activity write. Profiles that predate the tables are
+# backfilled from history once, on their first write or snapshot read.
+
+async def _ensure_learner_stats(conn: asyncpg.Connection, profile_id: str) -> bool:
+    """
+    Make sure the profile has aggregate rows.
+    
+    Returns True if the rows were (re)built from history just now - callers
+    that have already written their activity rows must then skip their own
+    increment, because the rebuild already counted it. Must run inside the
+    caller's transaction: concurrent first writes for a profile are
+    serialized on an advisory lock, so only one of them rebuilds and the
+    others see its rows and increment them.
+    """
+    exists_sql = 'SELECT 1 FROM "LearnerStats" WHERE "profileId" = $1'
+    if await conn.fetchval(exists_sql, profile_id):
+        return False
+    await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", profile_id)
+    if await conn.fetchval(exists_sql, profile_id):
+        return False
+    await rebuild_learner_stats(profile_id, conn=conn)
+    return True
+
+
+async def rebuild_learner_stats(profile_id: str, conn: Optional[asyncpg.Connection] = None) -> None:
+    """Recompute a profile's aggregate rows from its full activity history."""
+    if conn is None:
+        pool = await get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            await rebuild_learner_stats(profile_id, conn=conn)
+        return
+    
+    import uuid
+    
+    await conn.execute("""
+        DELETE FROM "LearnerServiceStats" WHERE "profileId" = $1
+    """, profile_id)
+    await conn.execute("""
+        DELETE FROM "LearnerStats" WHERE "profileId" = $1
+    """, profile_id)
+    
+    await conn.execute("""
+        INSERT INTO "LearnerStats" (
+            id, "profileId",
+            "quizAttempts", "quizPassed", "quizScoreSum", "quizBestScore", "quizTimeSeconds",
+            "challengeAttempts", "challengesCompleted", "challengePoints",
+            "flashcardDecks", "flashcardCards", "flashcardMastered", "flashcardReviews", "flashcardCorrect",
+            "createdAt", "updatedAt"
+        )
+        SELECT $2, $1,
+               q.attempts, q.passed, q.score_sum, q.best_score, q.time_seconds,
+               c.attempts, c.completed, c.points,
+               f.decks, f.cards, f.mastered, f.reviews, f.correct,
+               NOW(), NOW()
+        FROM (
+            SELECT COUNT(*) AS attempts,
+                   COUNT(*) FILTER (WHERE passed) AS passed,
+                   COALESCE(SUM(score), 0) AS score_sum,
+                   COALESCE(MAX(score), 0) AS best_score,
+                   COALESCE(SUM("timeSpentSeconds"), 0) AS time_seconds
+            FROM "QuizAttempt"
+            WHERE "profileId" = $1
+        ) q, (
+            SELECT COALESCE(SUM(cp."attemptsCount"), 0) AS attempts,
+                   COUNT(*) FILTER (WHERE cp.status = 'completed') AS completed,
+                   COALESCE(SUM(cp."pointsEarned"), 0) AS points
+            FROM "ChallengeProgress" cp
+            JOIN "ScenarioAttempt" sa ON sa.id = cp."attemptId"
+            WHERE sa."profileId" = $1
+        ) c, (
+            SELECT COUNT(DISTINCT up.id) AS decks,
+                   COUNT(fp.id) AS cards,
+                   COUNT(fp.id) FILTER (WHERE fp.status = 'mastered') AS mastered,
+                   COALESCE(SUM(fp."totalReviews"), 0) AS reviews,
+                   COALESCE(SUM(fp."correctCount"), 0) AS correct
+            FROM "FlashcardUserProgress" up
+            LEFT JOIN "FlashcardProgress" fp ON fp."userProgressId" = up.id
+            WHERE up."profileId" = $1
+        ) f
+        ON CONFLICT ("profileId") DO NOTHING
+    """, profile_id, str(uuid.uuid4()))
+    
+    await conn.execute("""
+        WITH quiz AS (
+            SELECT svc AS service, qa."attemptId", at.score,
+                   COUNT(*) AS answers,
+                   COUNT(*) FILTER (WHERE qa."isCorrect") AS correct
+            FROM "QuizAttempt" at
+            JOIN "QuizAnswer" qa ON qa."attemptId" = at.id
+            JOIN "QuizQuestion" qq ON qq.id = qa."questionId"
+            CROSS JOIN LATERAL jsonb_array_elements_text(qq."awsServices") AS svc
+            WHERE at."profileId" = $1
+            GROUP BY svc, qa."attemptId", at.score
+        ), challenge AS (
+            SELECT svc AS service,
+                   SUM(cp."attemptsCount") AS attempts,
+                   COUNT(*) FILTER (WHERE cp.status = 'completed') AS completed
+            FROM "ChallengeProgress" cp
+            JOIN "ScenarioAttempt" sa ON sa.id = cp."attemptId"
+            JOIN "AcademyChallenge" ac ON ac.id = cp."challengeId"
+            CROSS JOIN LATERAL jsonb_array_elements_text(ac."awsServices") AS svc
+            WHERE sa."profileId" = $1
+            GROUP BY svc
+        ), flashcard AS (
+            SELECT svc AS service,
+                   SUM(fp."totalReviews") AS reviews,
+                   SUM(fp."correctCount") AS correct
+            FROM "FlashcardUserProgress" up
+            JOIN "FlashcardProgress" fp ON fp."userProgressId" = up.id
+            JOIN "Flashcard" f ON f.id = fp."cardId"
+            CROSS JOIN LATERAL jsonb_array_elements_text(f."awsServices") AS svc
+            WHERE up."profileId" = $1
+            GROUP BY svc
+        )
+        INSERT INTO "LearnerServiceStats" (
+            id, "profileId", service,
+            "quizAttempts", "quizScoreSum", "quizAnswers", "quizCorrect",
+            "challengeAttempts", "challengesCompleted",
+            "flashcardReviews", "flashcardCorrect", "updatedAt"
+        )
+        SELECT gen_random_uuid()::text, $1, service,
+               SUM(quiz_attempts), SUM(quiz_score_sum), SUM(quiz_answers), SUM(quiz_correct),
+               SUM(challenge_attempts), SUM(challenges_completed),
+               SUM(flashcard_reviews), SUM(flashcard_correct), NOW()
+        FROM (
+            SELECT service, COUNT(*) AS quiz_attempts, SUM(score) AS quiz_score_sum,
+                   SUM(answers) AS quiz_answers, SUM(correct) AS quiz_correct,
+                   0 AS challenge_attempts, 0 AS challenges_completed,
+                   0 AS flashcard_reviews, 0 AS flashcard_correct
+            FROM quiz GROUP BY service
+            UNION ALL
+            SELECT service, 0, 0, 0, 0, attempts, completed, 0, 0 FROM challenge
+            UNION ALL
+            SELECT service, 0, 0, 0, 0, 0, 0, reviews, correct FROM flashcard
+        ) per_source
+        GROUP BY service
+        ON CONFLICT ("profileId", service) DO NOTHING
+    """, profile_id)
+    
+    logger.info(f"Rebuilt learner stats for profile {profile_id}")
+
+
+async def _record_quiz_stats(
+    conn: asyncpg.Connection,
+    profile_id: str,
+    answers: List[dict],
+    score: float,
+    passed: bool,
+    time_spent_seconds: int,
+) -> None:
+    """Fold one quiz attempt into the learner aggregates."""
+    if await _ensure_learner_stats(conn, profile_id):
+        return
+    
+    await conn.execute("""
+        UPDATE "LearnerStats" SET
+            "quizAttempts" = "quizAttempts" + 1,
+            "quizPassed" = "quizPassed" + $2,
+            "quizScoreSum" = "quizScoreSum" + $3,
+            "quizBestScore" = GREATEST("quizBestScore", $3),
+            "quizTimeSeconds" = "quizTimeSeconds" + $4,
+            "updatedAt" = NOW()
+        WHERE "profileId" = $1
+    """, profile_id, 1 if passed else 0, float(score), time_spent_seconds or 0)
+    
+    if not answers:
+        return
+    
+    await conn.execute("""
+        INSERT INTO "LearnerServiceStats" (
+            id, "profileId", service,
+            "quizAttempts", "quizScoreSum", "quizAnswers", "quizCorrect", "updatedAt"
+        )
+        SELECT gen_random_uuid()::text, $1, svc, 1, $4,
+               COUNT(*), COUNT(*) FILTER (WHERE a.is_correct), NOW()
+        FROM unnest($2::text[], $3::bool[]) AS a(question_id, is_correct)
+        JOIN "QuizQuestion" qq ON qq.id = a.question_id
+        CROSS JOIN LATERAL jsonb_array_elements_text(qq."awsServices") AS svc
+        GROUP BY svc
+        ON CONFLICT ("profileId", service) DO UPDATE SET
+            "quizAttempts" = "LearnerServiceStats"."quizAttempts" + 1,
+            "quizScoreSum" = "LearnerServiceStats"."quizScoreSum" + EXCLUDED."quizScoreSum",
+            "quizAnswers" = "LearnerServiceStats"."quizAnswers" + EXCLUDED."quizAnswers",
+            "quizCorrect" = "LearnerServiceStats"."quizCorrect" + EXCLUDED."quizCorrect",
+            "updatedAt" = NOW()
+    """,
+        profile_id,
+        [a["question_id"] for a in answers],
+        [bool(a.get("is_correct", False)) for a in answers],
+        float(score),
+    )
+
+
+async def _record_challenge_stats(
+    conn: asyncpg.Connection,
+    profile_id: str,
+    challenge_id: str,
+    newly_completed: bool,
+    points_gained: int,
+) -> None:
+    """Fold one challenge progress update into the learner aggregates."""
+    if await _ensure_learner_stats(conn, profile_id):
+        return
+    
+    await conn.execute("""
+        UPDATE "LearnerStats" SET
+            "challengeAttempts" = "challengeAttempts" + 1,
+            "challengesCompleted" = "challengesCompleted" + $2,
+            "challengePoints" = "challengePoints" + $3,
+            "updatedAt" = NOW()
+        WHERE "profileId" = $1
+    """, profile_id, 1 if newly_completed else 0, points_gained)
+    
+    await conn.execute("""
+        INSERT INTO "LearnerServiceStats" (
+            id, "profileId", service, "challengeAttempts", "challengesCompleted", "updatedAt"
+        )
+        SELECT gen_random_uuid()::text, $1, svc, 1, $3, NOW()
+        FROM (
+            SELECT DISTINCT jsonb_array_elements_text(ac."awsServices") AS svc
+            FROM "AcademyChallenge" ac
+            WHERE ac.id = $2
+        ) services
+        ON CONFLICT ("profileId", service) DO UPDATE SET
+            "challengeAttempts" = "LearnerServiceStats"."challengeAttempts" + 1,
+            "challengesCompleted" = "LearnerServiceStats"."challengesCompleted" + EXCLUDED."challengesCompleted",
+            "updatedAt" = NOW()
+    """, profile_id, challenge_id, 1 if newly_completed else 0)
+
+
+async def _record_flashcard_stats(
+    conn: asyncpg.Connection,
+    profile_id: str,
+    card_id: str,
+    correct: bool,
+    new_deck: bool,
+    new_card: bool,
+    was_mastered: bool,
+    is_mastered: bool,
+) -> None:
+    """Fold one flashcard review into the learner aggregates."""
+    if await _ensure_learner_stats(conn, profile_id):
+        return
+    
+    await conn.execute("""
+        UPDATE "LearnerStats" SET
+            "flashcardDecks" = "flashcardDecks" + $2,
+            "flashcardCards" = "flashcardCards" + $3,
+            "flashcardMastered" = "flashcardMastered" + $4,
+            "flashcardReviews" = "flashcardReviews" + 1,
+            "flashcardCorrect" = "flashcardCorrect" + $5,
+            "updatedAt" = NOW()
+        WHERE "profileId" = $1
+    """,
+        profile_id,
+        1 if new_deck else 0,
+        1 if new_card else 0,
+        int(is_mastered) - int(was_mastered),
+        1 if correct else 0,
+    )
+    
+    await conn.execute("""
+        INSERT INTO "LearnerServiceStats" (
+            id, "profileId", service, "flashcardReviews", "flashcardCorrect", "updatedAt"
+        )
+        SELECT gen_random_uuid()::text, $1, svc, 1, $3, NOW()
+        FROM (
+            SELECT DISTINCT jsonb_array_elements_text(f."awsServices") AS svc
+            FROM "Flashcard" f
+            WHERE f.id = $2
+        ) services
+        ON CONFLICT ("profileId", service) DO UPDATE SET
+            "flashcardReviews" = "LearnerServiceStats"."flashcardReviews" + 1,
+            "flashcardCorrect" = "LearnerServiceStats"."flashcardCorrect" + EXCLUDED."flashcardCorrect",
+            "updatedAt" = NOW()
+    """, profile_id, card_id, 1 if correct else 0)
+
+
+# =============================================================================
+# LEARNER JOURNEY REPORTS
+# =============================================================================
+
+# Everything the journey endpoints need, in a single statement. Each sub-select
+# is either a single-row lookup or a bounded, index-backed LIMIT, so the cost
+# does not grow with the learner's history.
+_LEARNER_SNAPSHOT_SQL = """
+    WITH services AS (
+        SELECT service,
+               "quizScoreSum" / "quizAttempts" AS avg_score,
+               "quizAttempts" AS attempts
+        FROM "LearnerServiceStats"
+        WHERE "profileId" = $1 AND "quizAttempts" > 0
+    )
+    SELECT
+        (SELECT row_to_json(p) FROM (
+            SELECT id, "displayName", "skillLevel", "totalPoints", level AS "currentLevel",
+                   "totalTimeMinutes", "createdAt"
+            FROM "AcademyUserProfile"
+            WHERE id = $1
+        ) p) AS profile,
+        (SELECT row_to_json(ls) FROM "LearnerStats" ls WHERE ls."profileId" = $1) AS stats,
+        (SELECT COALESCE(json_agg(sa), '[]'::json) FROM (
+            SELECT sa.id, sa."scenarioId", sa.status, sa."pointsEarned" AS score, sa."startedAt", sa."completedAt",
+                   (SELECT COUNT(*) FROM "ChallengeProgress" cp
+                    WHERE cp."attemptId" = sa.id AND cp.status = 'completed') AS "challengesCompleted",
+                   (SELECT COUNT(*) FROM "AcademyChallenge" ac
+                    WHERE ac."scenarioId" = sa."scenarioId") AS "totalChallenges"
+            FROM "ScenarioAttempt" sa
+            WHERE sa."profileId" = $1
+            ORDER BY sa."startedAt" DESC
+            LIMIT 20
+        ) sa) AS scenarios,
+        (SELECT COALESCE(json_agg(cs), '[]'::json) FROM (
+            SELECT id, title, "messageCount", "startedAt", "lastMessageAt"
+            FROM "CoachingSession"
+            WHERE "profileId" = $1
+            ORDER BY "startedAt" DESC
+            LIMIT 10
+        ) cs) AS coaching_sessions,
+        (SELECT COALESCE(json_agg(cp), '[]'::json) FROM (
+            -- ChallengeProgress belongs to a profile through its ScenarioAttempt
+            SELECT cp."challengeId", cp.status, cp."pointsEarned" AS score, cp."attemptsCount" AS "attemptCount"
+            FROM "ScenarioAttempt" sa
+            JOIN "ChallengeProgress" cp ON cp."attemptId" = sa.id
+            WHERE sa."profileId" = $1
+            ORDER BY sa."startedAt" DESC, cp."startedAt" DESC NULLS LAST
+            LIMIT 20
+        ) cp) AS challenge_progress,
+        (SELECT COALESCE(json_agg(w), '[]'::json) FROM (
+            SELECT service, avg_score, attempts FROM services
+            WHERE avg_score < 70
+            ORDER BY avg_score ASC
+            LIMIT 5
+        ) w) AS weak_areas,
+        (SELECT COALESCE(json_agg(s), '[]'::json) FROM (
+            SELECT service, avg_score, attempts FROM services
+            WHERE avg_score >= 80
+            ORDER BY avg_score DESC
+            LIMIT 5
+        ) s) AS strong_areas
+"""
+
+
+async def get_learner_snapshot(profile_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the learner journey data and strengths/weaknesses analysis in one round trip.
+    
+    Returns {"journey": ..., "analysis": ...} or None if the profile does not exist.
+    """
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(_LEARNER_SNAPSHOT_SQL, profile_id)
+        if not row or not row["profile"]:
+            return None
+        
+        if not row["stats"]:
+            # First read for a profile that predates the aggregate tables
+            async with conn.transaction():
+                await _ensure_learner_stats(conn, profile_id)
+            row = await conn.fetchrow(_LEARNER_SNAPSHOT_SQL, profile_id)
+    
+    stats = row["stats"] or {}
+    quiz_attempts = stats.get("quizAttempts", 0)
+    flashcard_cards = stats.get("flashcardCards", 0)
+    
+    return {
+        "journey": {
+            "profile": row["profile"],
+            "scenarios": row["scenarios"],
+            "quiz_stats": {
+                "total_quizzes": quiz_attempts,
+                "avg_score": stats.get("quizScoreSum", 0) / quiz_attempts if quiz_attempts else None,
+                "passed_count": stats.get("quizPassed", 0),
+            },
+            "flashcard_stats": {
+                "decks_studied": stats.get("flashcardDecks", 0),
+                "total_cards_reviewed": stats.get("flashcardReviews", 0),
+                "avg_mastery": stats.get("flashcardMastered", 0) / flashcard_cards * 100 if flashcard_cards else None,
+            },
+            "coaching_sessions": row["coaching_sessions"],
+        },
+        "analysis": {
+            "weak_areas": row["weak_areas"],
+            "strong_areas": row["strong_areas"],
+            "challenge_progress": row["challenge_progress"],
+        },
+    }
+
+
+async def get_learner_journey_data(profile_id: str) -> Dict[str, Any]:
+    """Get comprehensive learning journey data for a user."""
+    snapshot = await get_learner_snapshot(profile_id)
+    return snapshot["journey"] if snapshot else None
+
+
+async def get_learner_strengths_weaknesses(profile_id: str) -> Dict[str, Any]:
+    """Analyze learner's strengths and weaknesses based on quiz/challenge performance."""
+    snapshot = await get_learner_snapshot(profile_id)
+    if not snapshot:
+        return {"weak_areas": [], "strong_areas": [], "challenge_progress": []}
+    return snapshot["analysis"]
+
+
+async def save_journey_report(
+    profile_id: str,
+    report_type: str,
+    content: str,
+    summary: str,
+    metadata: Dict[str, Any] = None,
+) -> str:
+    """Save a generated learning journey report."""
+    pool = await get_pool()
+    
+    import uuid
+    report_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "AcademyKnowledgeChunk" (
+                url, "chunkNumber", content, metadata, "sourceId", "createdAt"
+            ) VALUES ($1, 0, $2, $3, $4, NOW())
+        """, 
+            f"journey-report://{profile_id}/{report_id}",
+            content,
+            {
+                "report_id": report_id,
+                "profile_id": profile_id,
+                "report_type": report_type,
+                "summary": summary,
+                **(metadata or {})
+            },
+            f"journey-reports-{profile_id}"
+        )
+    
+    return report_id
+
+
+async def get_journey_reports(profile_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Get saved journey reports for a user."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT url, content, metadata, "createdAt"
+            FROM "AcademyKnowledgeChunk"
+            WHERE url LIKE $1
+            ORDER BY "createdAt" DESC
+            LIMIT $2
+        """, f"journey-report://{profile_id}/%", limit)
+        
+        reports = []
+        for row in rows:
+            meta = row["metadata"] or {}
+            reports.append({
+                "report_id": meta.get("report_id"),
+                "report_type": meta.get("report_type"),
+                "summary": meta.get("summary"),
+                "content": row["content"],
+                "created_at": row["createdAt"].isoformat() if row["createdAt"] else None,
+            })
+        
+        return reports
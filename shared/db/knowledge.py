@@ -0,0 +1,314 @@
+"""
+Knowledge Crawling
+==================
+Knowledge sources and chunks, mirroring the crawl4ai schema.
+"""
+
+from typing import Optional, List, Dict, Any
+
+from .pool import get_pool, logger
+
+__all__ = [
+    "ensure_knowledge_source",
+    "add_knowledge_chunk",
+    "add_knowledge_chunks_batch",
+    "search_knowledge_chunks",
+    "get_knowledge_sources",
+    "delete_knowledge_source",
+    "save_crawled_page",
+    "search_crawled_pages",
+    "ensure_source",
+]
+
+
+# =============================================================================
+# KNOWLEDGE CRAWLING - Mirrors crawl4ai schema
+# =============================================================================
+
+async def ensure_knowledge_source(
+    source_id: str,
+    summary: Optional[str] = None,
+    word_count: int = 0,
+    title: Optional[str] = None,
+    category: Optional[str] = None,
+    aws_services: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+) -> str:
+    """Ensure a knowledge source exists (upsert). Mirrors crawl4ai sources table."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "AcademyKnowledgeSource" (
+                id, summary, "totalWordCount", title, category,
+                "awsServices", tags, "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, NOW(), NOW())
+            ON CONFLICT (id) DO UPDATE SET
+                summary = COALESCE(EXCLUDED.summary, "AcademyKnowledgeSource".summary),
+                "totalWordCount" = COALESCE(EXCLUDED."totalWordCount", "AcademyKnowledgeSource"."totalWordCount"),
+                title = COALESCE(EXCLUDED.title, "AcademyKnowledgeSource".title),
+                "updatedAt" = NOW()
+        """,
+            source_id,
+            summary,
+            word_count,
+            title,
+            category,
+            aws_services or [],
+            tags or [],
+        )
+    
+    logger.info(f"Ensured knowledge source: {source_id}")
+    return source_id
+
+
+async def add_knowledge_chunk(
+    url: str,
+    chunk_number: int,
+    content: str,
+    metadata: dict,
+    source_id: str,
+    embedding: Optional[List[float]] = None,
+) -> int:
+    """Add a knowledge chunk. Mirrors crawl4ai crawled_pages table."""
+    pool = await get_pool()
+    
+    # Format embedding for pgvector
+    embedding_str = None
+    if embedding:
+        embedding_str = "[" + ",".join(str(x) for x in embedding) + "]"
+    
+    async with pool.acquire() as conn:
+        result = await conn.fetchrow("""
+            INSERT INTO "AcademyKnowledgeChunk" (
+                url, "chunkNumber", content, metadata, "sourceId", embedding, "createdAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6::vector, NOW())
+            ON CONFLICT (url, "chunkNumber") DO UPDATE SET
+                content = EXCLUDED.content,
+                metadata = EXCLUDED.metadata,
+                embedding = EXCLUDED.embedding
+            RETURNING id
+        """, url, chunk_number, content, metadata, source_id, embedding_str)
+        
+        return result["id"]
+
+
+async def add_knowledge_chunks_batch(
+    chunks: List[dict],  # [{"url": str, "chunk_number": int, "content": str, "metadata": dict, "source_id": str, "embedding": List[float]}]
+) -> int:
+    """Add multiple knowledge chunks in batch."""
+    pool = await get_pool()
+    count = 0
+    
+    async with pool.acquire() as conn:
+        for chunk in chunks:
+            embedding_str = None
+            if chunk.get("embedding"):
+                embedding_str = "[" + ",".join(str(x) for x in chunk["embedding"]) + "]"
+            
+            try:
+                await conn.execute("""
+                    INSERT INTO "AcademyKnowledgeChunk" (
+                        url, "chunkNumber", content, metadata, "sourceId", embedding, "createdAt"
+                    ) VALUES ($1, $2, $3, $4, $5, $6::vector, NOW())
+                    ON CONFLICT (url, "chunkNumber") DO UPDATE SET
+                        content = EXCLUDED.content,
+                        metadata = EXCLUDED.metadata,
+                        embedding = EXCLUDED.embedding
+                """, 
+                    chunk["url"],
+                    chunk["chunk_number"],
+                    chunk["content"],
+                    chunk.get("metadata", {}),
+                    chunk["source_id"],
+                    embedding_str,
+                )
+                count += 1
+            except Exception as e:
+                logger.error(f"Error adding chunk {chunk['url']} #{chunk['chunk_number']}: {e}")
+    
+    logger.info(f"Added {count} knowledge chunks")
+    return count
+
+
+async def search_knowledge_chunks(
+    query_embedding: List[float],
+    limit: int = 10,
+    source_filter: Optional[str] = None,
+) -> List[dict]:
+    """Search knowledge chunks by vector similarity. Mirrors crawl4ai match_crawled_pages."""
+    pool = await get_pool()
+    
+    embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
+    
+    async with pool.acquire() as conn:
+        if source_filter:
+            rows = await conn.fetch("""
+                SELECT id, url, "chunkNumber", content, metadata, "sourceId",
+                       1 - (embedding <=> $1::vector) as similarity
+                FROM "AcademyKnowledgeChunk"
+                WHERE "sourceId" = $3
+                ORDER BY embedding <=> $1::vector
+                LIMIT $2
+            """, embedding_str, limit, source_filter)
+        else:
+            rows = await conn.fetch("""
+                SELECT id, url, "chunkNumber", content, metadata, "sourceId",
+                       1 - (embedding <=> $1::vector) as similarity
+                FROM "AcademyKnowledgeChunk"
+                ORDER BY embedding <=> $1::vector
+                LIMIT $2
+            """, embedding_str, limit)
+        
+        return [
+            {
+                "id": row["id"],
+                "url": row["url"],
+                "chunk_number": row["chunkNumber"],
+                "content": row["content"],
+                "metadata": row["metadata"] or {},
+                "source_id": row["sourceId"],
+                "similarity": float(row["similarity"]),
+            }
+            for row in rows
+        ]
+
+
+async def get_knowledge_sources(limit: int = 50) -> List[dict]:
+    """List all knowledge sources."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT s.id, s.summary, s."totalWordCount", s.title, s.category,
+                   s."awsServices", s.tags, s."createdAt",
+                   COUNT(c.id) as chunk_count
+            FROM "AcademyKnowledgeSource" s
+            LEFT JOIN "AcademyKnowledgeChunk" c ON s.id = c."sourceId"
+            GROUP BY s.id
+            ORDER BY s."createdAt" DESC
+            LIMIT $1
+        """, limit)
+        
+        return [
+            {
+                "id": row["id"],
+                "summary": row["summary"],
+                "total_word_count": row["totalWordCount"],
+                "title": row["title"],
+                "category": row["category"],
+                "aws_services": row["awsServices"] or [],
+                "tags": row["tags"] or [],
+                "chunk_count": row["chunk_count"],
+                "created_at": row["createdAt"].isoformat(),
+            }
+            for row in rows
+        ]
+
+
+async def delete_knowledge_source(source_id: str) -> bool:
+    """Delete a knowledge source and its chunks (CASCADE)."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        result = await conn.execute("""
+            DELETE FROM "AcademyKnowledgeSource" WHERE id = $1
+        """, source_id)
+        
+        return "DELETE 1" in result
+
+
+# =============================================================================
+# CRAWL4AI COMPATIBILITY FUNCTIONS
+# These functions match the interface expected by utils.py
+# =============================================================================
+
+async def save_crawled_page(
+    url: str,
+    chunk_number: int,
+    content: str,
+    source_id: str,
+    metadata: Dict[str, Any] = None,
+    embedding: List[float] = None,
+    tenant_id: str = None,  # Ignored - no tenant isolation for agent knowledge
+) -> int:
+    """Save a crawled page chunk. Maps to AcademyKnowledgeChunk."""
+    pool = await get_pool()
+    
+    embedding_str = None
+    if embedding:
+        embedding_str = "[" + ",".join(str(x) for x in embedding) + "]"
+    
+    async with pool.acquire() as conn:
+        # Ensure source exists first
+        await conn.execute("""
+            INSERT INTO "AcademyKnowledgeSource" (id, "createdAt", "updatedAt")
+            VALUES ($1, NOW(), NOW())
+            ON CONFLICT (id) DO NOTHING
+        """, source_id)
+        
+        result = await conn.fetchrow("""
+            INSERT INTO "AcademyKnowledgeChunk" (url, "chunkNumber", content, metadata, "sourceId", embedding, "createdAt")
+            VALUES ($1, $2, $3, $4, $5, $6::vector, NOW())
+            ON CONFLICT (url, "chunkNumber") DO UPDATE SET
+                content = EXCLUDED.content,
+                metadata = EXCLUDED.metadata,
+                embedding = EXCLUDED.embedding
+            RETURNING id
+        """, url, chunk_number, content, metadata or {}, source_id, embedding_str)
+        
+        return result["id"]
+
+
+async def search_crawled_pages(
+    embedding: List[float],
+    limit: int = 10,
+    source_id: str = None,
+    tenant_id: str = None,  # Ignored
+    metadata_filter: Dict[str, Any] = None,  # Not implemented yet
+) -> List[Dict[str, Any]]:
+    """Search crawled pages by vector similarity. Maps to AcademyKnowledgeChunk."""
+    pool = await get_pool()
+    
+    embedding_str = "[" + ",".join(str(x) for x in embedding) + "]"
+    
+    async with pool.acquire() as conn:
+        if source_id:
+            rows = await conn.fetch("""
+                SELECT id, url, "chunkNumber" as chunk_number, content, metadata, "sourceId" as source_id,
+                       1 - (embedding <=> $1::vector) as similarity
+                FROM "AcademyKnowledgeChunk"
+                WHERE "sourceId" = $3
+                ORDER BY embedding <=> $1::vector
+                LIMIT $2
+            """, embedding_str, limit, source_id)
+        else:
+            rows = await conn.fetch("""
+                SELECT id, url, "chunkNumber" as chunk_number, content, metadata, "sourceId" as source_id,
+                       1 - (embedding <=> $1::vector) as similarity
+                FROM "AcademyKnowledgeChunk"
+                ORDER BY embedding <=> $1::vector
+                LIMIT $2
+            """, embedding_str, limit)
+        
+        return [dict(row) for row in rows]
+
+
+async def ensure_source(
+    source_id: str,
+    summary: str = None,
+    word_count: int = 0,
+    tenant_id: str = None,
+) -> None:
+    """Ensure a source exists. Maps to AcademyKnowledgeSource."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "AcademyKnowledgeSource" (id, summary, "totalWordCount", "createdAt", "updatedAt")
+            VALUES ($1, $2, $3, NOW(), NOW())
+            ON CONFLICT (id) DO UPDATE SET
+                summary = COALESCE(EXCLUDED.summary, "AcademyKnowledgeSource".summary),
+                "totalWordCount" = GREATEST("AcademyKnowledgeSource"."totalWordCount", EXCLUDED."totalWordCount"),
+                "updatedAt" = NOW()
+        """, source_id, summary, word_count)
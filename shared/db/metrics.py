@@ -0,0 +1,258 @@
+"""
+Database Instrumentation
+========================
+Prometheus metrics for the shared data access layer plus an opt-in
+EXPLAIN (ANALYZE, BUFFERS) sampler for slow read-only statements.
+
+Every public query function exported by shared.db is wrapped with
+`instrument`, which records its latency, the rows it returned and errors,
+and tags the statements it runs so per-statement timings can be attributed
+to the calling function. Pool wait time and acquisition counts come from the
+pool's acquire hooks.
+
+Under gunicorn set PROMETHEUS_MULTIPROC_DIR so /metrics aggregates all workers
+(see learning_agent/gunicorn.conf.py).
+"""
+
+import os
+import time
+import random
+import asyncio
+import functools
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from .pool import (
+    add_acquire_hook,
+    add_query_hook,
+    get_pool,
+    get_pool_settings,
+    logger,
+)
+
+__all__ = [
+    "instrument",
+    "current_db_function",
+    "render_metrics",
+]
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+# gunicorn.conf.py creates the multiprocess directory, but processes it never
+# runs (the crawl worker, scripts) inherit the variable from the image too, and
+# prometheus_client fails to create its metric files without the directory.
+_multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _multiproc_dir:
+    os.makedirs(_multiproc_dir, exist_ok=True)
+
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+FUNCTION_SECONDS = Histogram(
+    "archistry_db_function_seconds",
+    "Wall time of shared.db query functions, including pool wait",
+    ["function"],
+    buckets=_LATENCY_BUCKETS,
+)
+FUNCTION_ROWS = Counter(
+    "archistry_db_function_rows",
+    "Rows returned to callers by shared.db query functions",
+    ["function"],
+)
+FUNCTION_ERRORS = Counter(
+    "archistry_db_function_errors",
+    "shared.db query functions that raised",
+    ["function"],
+)
+QUERY_SECONDS = Histogram(
+    "archistry_db_query_seconds",
+    "Per-statement execution time, attributed to the calling query function",
+    ["function"],
+    buckets=_LATENCY_BUCKETS,
+)
+QUERY_ERRORS = Counter(
+    "archistry_db_query_errors",
+    "Statements that raised, attributed to the calling query function",
+    ["function"],
+)
+POOL_WAIT_SECONDS = Histogram(
+    "archistry_db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection (also counts acquisitions)",
+    buckets=_WAIT_BUCKETS,
+)
+POOL_SIZE = Gauge(
+    "archistry_db_pool_size",
+    "Open connections in the pool",
+    multiprocess_mode="livesum",
+)
+POOL_IDLE = Gauge(
+    "archistry_db_pool_idle",
+    "Idle connections in the pool when last sampled",
+    multiprocess_mode="livesum",
+)
+EXPLAIN_SAMPLES = Counter(
+    "archistry_db_explain_samples",
+    "Slow statements whose plan was captured",
+    ["function"],
+)
+
+
+# =============================================================================
+# FUNCTION INSTRUMENTATION
+# =============================================================================
+
+current_db_function: ContextVar[str] = ContextVar("current_db_function", default="unattributed")
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def _row_count(result: Any) -> int:
+    if result is None or isinstance(result, (bool, int, float, str)):
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+def instrument(fn: F) -> F:
+    """Record latency, rows returned and errors for an async query function."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = current_db_function.set(name)
+        start = time.perf_counter()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception:
+            FUNCTION_ERRORS.labels(name).inc()
+            raise
+        finally:
+            FUNCTION_SECONDS.labels(name).observe(time.perf_counter() - start)
+            current_db_function.reset(token)
+        FUNCTION_ROWS.labels(name).inc(_row_count(result))
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+# =============================================================================
+# HOOKS
+# =============================================================================
+
+def _observe_query(record: Any) -> None:
+    # asyncpg delivers query records via loop.call_soon, which carries the
+    # caller's context, so current_db_function still names the caller here.
+    function = current_db_function.get()
+    QUERY_SECONDS.labels(function).observe(record.elapsed)
+    if record.exception is not None:
+        QUERY_ERRORS.labels(function).inc()
+
+
+def _observe_acquire(wait: float, pool: Any) -> None:
+    POOL_WAIT_SECONDS.observe(wait)
+    POOL_SIZE.set(pool.get_size())
+    POOL_IDLE.set(pool.get_idle_size())
+
+
+# =============================================================================
+# EXPLAIN SAMPLER
+# =============================================================================
+# Only single statements that start with SELECT/WITH are explained, inside a
+# read-only transaction that is always rolled back, so a sampled statement can
+# never write. Each distinct statement is explained at most once per interval.
+
+EXPLAIN_INTERVAL_SECONDS = 300.0
+_EXPLAIN_FUNCTION = "explain_sampler"
+# asyncpg's own type introspection also goes through the query loggers
+_INTERNAL_MARKERS = ("set_config(", "typeinfo_tree")
+_last_explained: Dict[str, float] = {}
+_explain_tasks: set = set()
+
+
+def _is_explainable(query: str) -> bool:
+    statement = query.strip().rstrip(";")
+    if not statement or ";" in statement:
+        return False
+    if any(marker in statement for marker in _INTERNAL_MARKERS):
+        return False
+    head = statement.split(None, 1)[0].upper()
+    return head in ("SELECT", "WITH") and "FOR UPDATE" not in statement.upper()
+
+
+def _sample_slow_query(record: Any) -> None:
+    settings = get_pool_settings()
+    if settings.explain_ms <= 0 or record.exception is not None:
+        return
+    if record.elapsed * 1000 < settings.explain_ms:
+        return
+    if current_db_function.get() == _EXPLAIN_FUNCTION or not _is_explainable(record.query):
+        return
+    if random.random() >= settings.explain_sample_rate:
+        return
+
+    now = time.monotonic()
+    if now - _last_explained.get(record.query, float("-inf")) < EXPLAIN_INTERVAL_SECONDS:
+        return
+    _last_explained[record.query] = now
+
+    task = asyncio.get_running_loop().create_task(
+        _explain(record.query, tuple(record.args or ()), record.elapsed, current_db_function.get())
+    )
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+async def _explain(query: str, args: Tuple, elapsed: float, function: str) -> None:
+    current_db_function.set(_EXPLAIN_FUNCTION)
+    try:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            tr = conn.transaction(readonly=True)
+            await tr.start()
+            try:
+                rows = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {query}", *args)
+            finally:
+                await tr.rollback()
+    except Exception as e:
+        logger.debug(f"EXPLAIN sample failed for {function}: {e}")
+        return
+
+    EXPLAIN_SAMPLES.labels(function).inc()
+    plan = "\n".join(row[0] for row in rows)
+    statement = " ".join(query.split())
+    logger.warning(
+        f"Slow query plan ({elapsed * 1000:.0f} ms in {function}): {statement[:300]}\n{plan}"
+    )
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Prometheus exposition body and content type for a /metrics endpoint."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+add_query_hook(_observe_query)
+add_query_hook(_sample_slow_query)
+add_acquire_hook(_observe_acquire)
@@ -0,0 +1,213 @@
+"""
+Study Notes
+===========
+Study notes, reading progress and annotations.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, List
+
+from .pool import get_pool, logger
+
+__all__ = [
+    "save_study_notes",
+    "get_study_notes",
+    "get_study_notes_for_scenario",
+    "get_user_notes_progress",
+    "update_notes_progress",
+    "add_annotation",
+]
+
+
+# =============================================================================
+# STUDY NOTES
+# =============================================================================
+
+async def save_study_notes(
+    scenario_id: str,
+    notes_data: dict,
+    generated_by: str = "ai",
+) -> str:
+    """Save study notes."""
+    pool = await get_pool()
+    
+    import uuid
+    notes_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "StudyNotes" (
+                id, "scenarioId", title, content, sections,
+                "generatedBy", "awsServices", version, "isActive", "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $10)
+        """,
+            notes_id,
+            scenario_id,
+            notes_data.get("title", "Study Notes"),
+            notes_data.get("content", ""),
+            [
+                {"id": s.get("id"), "title": s.get("title"), "level": s.get("level")}
+                for s in notes_data.get("sections", [])
+            ],
+            generated_by,
+            notes_data.get("aws_services", []),
+            1,
+            True,
+            datetime.now(timezone.utc),
+        )
+    
+    logger.info(f"Saved study notes {notes_id}")
+    return notes_id
+
+
+async def get_study_notes(notes_id: str) -> Optional[dict]:
+    """Get study notes by ID."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "StudyNotes" WHERE id = $1
+        """, notes_id)
+        
+        if not row:
+            return None
+        
+        return {
+            "id": row["id"],
+            "scenario_id": row["scenarioId"],
+            "title": row["title"],
+            "content": row["content"],
+            "sections": row["sections"] or [],
+            "aws_services": row["awsServices"] or [],
+            "version": row["version"],
+            "created_at": row["createdAt"].isoformat(),
+        }
+
+
+async def get_study_notes_for_scenario(scenario_id: str) -> List[dict]:
+    """Get all study notes for a scenario."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT id, title, version, "createdAt"
+            FROM "StudyNotes" 
+            WHERE "scenarioId" = $1 AND "isActive" = true
+            ORDER BY "createdAt" DESC
+        """, scenario_id)
+        
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "version": row["version"],
+                "created_at": row["createdAt"].isoformat(),
+            }
+            for row in rows
+        ]
+
+
+async def get_user_notes_progress(profile_id: str, notes_id: str) -> Optional[dict]:
+    """Get user's progress on study notes."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "StudyNotesProgress" 
+            WHERE "profileId" = $1 AND "notesId" = $2
+        """, profile_id, notes_id)
+        
+        if not row:
+            return None
+        
+        # Get annotations
+        annotations = await conn.fetch("""
+            SELECT * FROM "StudyAnnotation"
+            WHERE "progressId" = $1
+            ORDER BY "createdAt" DESC
+        """, row["id"])
+        
+        return {
+            "id": row["id"],
+            "read_progress": row["readProgress"],
+            "completed_sections": row["completedSections"] or [],
+            "time_spent_minutes": row["timeSpentMinutes"],
+            "last_read_at": row["lastReadAt"].isoformat() if row["lastReadAt"] else None,
+            "annotations": [
+                {
+                    "id": a["id"],
+                    "section_id": a["sectionId"],
+                    "type": a["type"],
+                    "content": a["content"],
+                    "selection_text": a["selectionText"],
+                    "created_at": a["createdAt"].isoformat(),
+                }
+                for a in annotations
+            ],
+        }
+
+
+async def update_notes_progress(
+    profile_id: str,
+    notes_id: str,
+    read_progress: float,
+    completed_sections: List[str],
+    time_spent_minutes: int = 0,
+) -> str:
+    """Update user's progress on study notes."""
+    pool = await get_pool()
+    import uuid
+    
+    async with pool.acquire() as conn:
+        # Upsert progress
+        row = await conn.fetchrow("""
+            SELECT id FROM "StudyNotesProgress" 
+            WHERE "profileId" = $1 AND "notesId" = $2
+        """, profile_id, notes_id)
+        
+        if row:
+            await conn.execute("""
+                UPDATE "StudyNotesProgress" SET
+                    "readProgress" = $1,
+                    "completedSections" = $2,
+                    "timeSpentMinutes" = "timeSpentMinutes" + $3,
+                    "lastReadAt" = NOW(),
+                    "updatedAt" = NOW()
+                WHERE id = $4
+            """, read_progress, completed_sections, time_spent_minutes, row["id"])
+            return row["id"]
+        else:
+            progress_id = str(uuid.uuid4())
+            await conn.execute("""
+                INSERT INTO "StudyNotesProgress" (
+                    id, "profileId", "notesId", "readProgress", "completedSections",
+                    "timeSpentMinutes", "lastReadAt", "createdAt", "updatedAt"
+                ) VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW(), NOW())
+            """, progress_id, profile_id, notes_id, read_progress, 
+                completed_sections, time_spent_minutes)
+            return progress_id
+
+
+async def add_annotation(
+    progress_id: str,
+    section_id: str,
+    annotation_type: str,  # highlight, note, bookmark
+    content: str,
+    selection_text: Optional[str] = None,
+) -> str:
+    """Add an annotation to study notes."""
+    pool = await get_pool()
+    import uuid
+    
+    annotation_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "StudyAnnotation" (
+                id, "progressId", "sectionId", type, content,
+                "selectionText", "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW())
+        """, annotation_id, progress_id, section_id, annotation_type, 
+            content, selection_text)
+    
+    return annotation_id
@@ -0,0 +1,327 @@
+"""
+Connection Pool
+===============
+One asyncpg pool per process, sized per service and per worker count, with
+JSON/JSONB and timestamp codecs and query hooks registered on every connection.
+
+Environment (all optional):
+    DATABASE_URL                    Postgres DSN (required to connect)
+    DB_POOL_MIN_SIZE                Connections kept open per worker (default 2)
+    DB_POOL_MAX_SIZE                Hard per-worker cap; overrides the budget below
+    DB_MAX_CONNECTIONS              Connection budget for the whole service, split
+                                    across workers (default set by the service)
+    DB_STATEMENT_CACHE_SIZE         Prepared statements cached per connection (default 512)
+    DB_STATEMENT_CACHE_LIFETIME     Seconds a cached statement may live (default 3600)
+    DB_COMMAND_TIMEOUT              Per-statement timeout in seconds (default 60)
+    DB_PGBOUNCER                    "true" when behind pgbouncer in transaction mode -
+                                    disables the statement cache, which it cannot support
+    DB_SLOW_QUERY_MS                Log statements slower than this (default 500, 0 = off)
+    DB_EXPLAIN_MS                   Log EXPLAIN (ANALYZE, BUFFERS) plans for read-only
+                                    statements slower than this (default 0 = off)
+    DB_EXPLAIN_SAMPLE_RATE          Fraction of slow statements to EXPLAIN (default 1.0)
+
+Any of the above can be overridden for a single service by prefixing it with the
+service name, e.g. LEARNING_AGENT_DB_POOL_MAX_SIZE or AWS_DRAWING_AGENT_DB_MAX_CONNECTIONS.
+"""
+
+import os
+import json
+import time
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional
+
+import asyncpg
+
+logger = logging.getLogger("cloud-academy-db")
+
+
+# =============================================================================
+# SETTINGS
+# =============================================================================
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Pool sizing and per-connection tuning for one service process."""
+    service: str = "archistry"
+    dsn: Optional[str] = None
+    min_size: int = 2
+    max_size: int = 10
+    statement_cache_size: int = 512
+    max_cached_statement_lifetime: int = 3600
+    max_inactive_connection_lifetime: float = 300.0
+    command_timeout: Optional[float] = 60.0
+    slow_query_ms: float = 500.0
+    explain_ms: float = 0.0
+    explain_sample_rate: float = 1.0
+    
+    @classmethod
+    def from_env(
+        cls,
+        service: str,
+        workers: Optional[int] = None,
+        max_connections: int = 40,
+    ) -> "PoolSettings":
+        """
+        Build settings for a service from the environment.
+        
+        The per-worker max size is DB_POOL_MAX_SIZE if set, otherwise the
+        service's DB_MAX_CONNECTIONS budget (default `max_connections`) divided
+        by the number of workers, so adding gunicorn workers does not exhaust
+        Postgres max_connections.
+        """
+        prefix = service.upper().replace("-", "_") + "_"
+        
+        def env(name: str, default: Any) -> Any:
+            value = os.getenv(prefix + name, os.getenv(name))
+            if value is None or value == "":
+                return default
+            return type(default)(value) if default is not None else value
+        
+        if workers is None:
+            workers = env("WORKERS", 0) or int(
+                os.getenv("GUNICORN_WORKERS") or os.getenv("WEB_CONCURRENCY") or 1
+            )
+        workers = max(1, workers)
+        
+        min_size = env("DB_POOL_MIN_SIZE", 2)
+        max_size = env("DB_POOL_MAX_SIZE", 0) or env("DB_MAX_CONNECTIONS", max_connections) // workers
+        max_size = max(min_size, max_size)
+        
+        statement_cache_size = env("DB_STATEMENT_CACHE_SIZE", 512)
+        if env("DB_PGBOUNCER", "false").lower() == "true":
+            statement_cache_size = 0
+        
+        command_timeout = env("DB_COMMAND_TIMEOUT", 60.0)
+        
+        return cls(
+            service=service,
+            dsn=os.getenv("DATABASE_URL"),
+            min_size=min_size,
+            max_size=max_size,
+            statement_cache_size=statement_cache_size,
+            max_cached_statement_lifetime=env("DB_STATEMENT_CACHE_LIFETIME", 3600),
+            command_timeout=command_timeout or None,
+            slow_query_ms=env("DB_SLOW_QUERY_MS", 500.0),
+            explain_ms=env("DB_EXPLAIN_MS", 0.0),
+            explain_sample_rate=env("DB_EXPLAIN_SAMPLE_RATE", 1.0),
+        )
+
+
+# =============================================================================
+# QUERY HOOKS
+# =============================================================================
+# Hooks receive an asyncpg LoggedQuery (query, args, timeout, elapsed,
+# exception, conn_addr, conn_params) after every statement on every pooled
+# connection. They run inline on the event loop, so keep them cheap.
+
+QueryHook = Callable[[Any], None]
+_query_hooks: List[QueryHook] = []
+
+
+def add_query_hook(hook: QueryHook) -> None:
+    """Register a callback invoked after each statement with its timing."""
+    if hook not in _query_hooks:
+        _query_hooks.append(hook)
+
+
+def remove_query_hook(hook: QueryHook) -> None:
+    """Unregister a callback added with add_query_hook."""
+    if hook in _query_hooks:
+        _query_hooks.remove(hook)
+
+
+def _dispatch_query(record: Any) -> None:
+    for hook in _query_hooks:
+        try:
+            hook(record)
+        except Exception as e:
+            logger.debug(f"Query hook {hook!r} failed: {e}")
+
+
+def _log_slow_query(record: Any) -> None:
+    threshold_ms = get_pool_settings().slow_query_ms
+    elapsed_ms = record.elapsed * 1000
+    if threshold_ms > 0 and elapsed_ms >= threshold_ms:
+        query = " ".join(record.query.split())
+        logger.warning(f"Slow query ({elapsed_ms:.0f} ms): {query[:300]}")
+
+
+# =============================================================================
+# ACQUIRE HOOKS
+# =============================================================================
+# Hooks receive (wait_seconds, pool) each time a caller gets a connection from
+# the pool via `async with pool.acquire()`.
+
+AcquireHook = Callable[[float, asyncpg.Pool], None]
+_acquire_hooks: List[AcquireHook] = []
+
+
+def add_acquire_hook(hook: AcquireHook) -> None:
+    """Register a callback invoked with the time spent waiting for a connection."""
+    if hook not in _acquire_hooks:
+        _acquire_hooks.append(hook)
+
+
+def remove_acquire_hook(hook: AcquireHook) -> None:
+    """Unregister a callback added with add_acquire_hook."""
+    if hook in _acquire_hooks:
+        _acquire_hooks.remove(hook)
+
+
+def _dispatch_acquire(wait: float, pool: asyncpg.Pool) -> None:
+    for hook in _acquire_hooks:
+        try:
+            hook(wait, pool)
+        except Exception as e:
+            logger.debug(f"Acquire hook {hook!r} failed: {e}")
+
+
+class _TimedAcquire:
+    """Wraps asyncpg's PoolAcquireContext to time the wait for a connection."""
+    
+    __slots__ = ("_ctx", "_pool")
+    
+    def __init__(self, ctx, pool: asyncpg.Pool):
+        self._ctx = ctx
+        self._pool = pool
+    
+    async def __aenter__(self) -> asyncpg.Connection:
+        start = time.perf_counter()
+        conn = await self._ctx.__aenter__()
+        _dispatch_acquire(time.perf_counter() - start, self._pool)
+        return conn
+    
+    async def __aexit__(self, *exc) -> None:
+        await self._ctx.__aexit__(*exc)
+    
+    def __await__(self):
+        return self._acquire().__await__()
+    
+    async def _acquire(self) -> asyncpg.Connection:
+        start = time.perf_counter()
+        conn = await self._ctx
+        _dispatch_acquire(time.perf_counter() - start, self._pool)
+        return conn
+
+
+class InstrumentedPool:
+    """
+    asyncpg.Pool proxy whose acquire() reports wait time to the acquire hooks.
+    Everything else (release, close, get_size, fetch, ...) is delegated.
+    """
+    
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+    
+    def acquire(self, *, timeout: Optional[float] = None) -> _TimedAcquire:
+        return _TimedAcquire(self._pool.acquire(timeout=timeout), self._pool)
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+
+# =============================================================================
+# POOL
+# =============================================================================
+
+def _encode_json(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+# Binary timestamp wire format: microseconds since 2000-01-01
+_PG_EPOCH = datetime(2000, 1, 1)
+
+
+def _encode_timestamp(value: datetime) -> tuple:
+    # Prisma DateTime columns are "timestamp without time zone" holding UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return ((value - _PG_EPOCH) // timedelta(microseconds=1),)
+
+
+def _decode_timestamp(value: tuple) -> datetime:
+    return _PG_EPOCH + timedelta(microseconds=value[0])
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Per-connection setup: JSON and timestamp codecs and query hooks."""
+    # Decode json/jsonb columns to Python objects and accept Python objects
+    # as parameters, so query functions never json.loads/json.dumps per row.
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(
+            typename,
+            encoder=_encode_json,
+            decoder=json.loads,
+            schema="pg_catalog",
+        )
+    # Accept timezone-aware datetimes (datetime.now(timezone.utc)) as UTC.
+    await conn.set_type_codec(
+        "timestamp",
+        encoder=_encode_timestamp,
+        decoder=_decode_timestamp,
+        schema="pg_catalog",
+        format="tuple",
+    )
+    conn.add_query_logger(_dispatch_query)
+
+
+_pool: Optional[InstrumentedPool] = None
+_settings: Optional[PoolSettings] = None
+
+
+def configure_pool(settings: PoolSettings) -> None:
+    """Set the settings used when the pool is first created."""
+    global _settings
+    if _pool is not None:
+        logger.warning("configure_pool called after the pool was created - ignored until close_pool")
+    _settings = settings
+
+
+def get_pool_settings() -> PoolSettings:
+    """Settings for this process (defaults from the environment if not configured)."""
+    global _settings
+    if _settings is None:
+        _settings = PoolSettings.from_env(os.getenv("SERVICE_NAME", "archistry"))
+    return _settings
+
+
+async def get_pool() -> InstrumentedPool:
+    """Get or create database connection pool."""
+    global _pool
+    if _pool is None:
+        settings = get_pool_settings()
+        dsn = settings.dsn or os.getenv("DATABASE_URL")
+        if not dsn:
+            raise ValueError("DATABASE_URL not set")
+        
+        add_query_hook(_log_slow_query)
+        
+        pool = await asyncpg.create_pool(
+            dsn,
+            min_size=settings.min_size,
+            max_size=settings.max_size,
+            statement_cache_size=settings.statement_cache_size,
+            max_cached_statement_lifetime=settings.max_cached_statement_lifetime,
+            max_inactive_connection_lifetime=settings.max_inactive_connection_lifetime,
+            command_timeout=settings.command_timeout,
+            server_settings={"application_name": settings.service},
+            init=_init_connection,
+        )
+        _pool = InstrumentedPool(pool)
+        logger.info(
+            f"Database pool created for {settings.service} "
+            f"(min={settings.min_size}, max={settings.max_size}, "
+            f"statement_cache={settings.statement_cache_size})"
+        )
+    return _pool
+
+
+async def close_pool():
+    """Close database connection pool."""
+    global _pool
+    if _pool:
+        await _pool.close()
+        _pool = None
+        logger.info("Database pool closed")
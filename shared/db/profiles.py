@@ -0,0 +1,223 @@
+"""
+User Profile & Progress
+=======================
+Academy user profiles, points and challenge progress.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, List
+
+from .pool import get_pool, logger
+from .journey import _record_challenge_stats
+
+__all__ = [
+    "get_user_profile",
+    "update_user_points",
+    "list_scenarios_for_location",
+    "get_challenge_progress",
+    "update_challenge_progress",
+]
+
+
+# =============================================================================
+# USER PROFILE & PROGRESS
+# =============================================================================
+
+async def get_user_profile(user_id: str, tenant_id: str) -> Optional[dict]:
+    """Get or create academy user profile."""
+    pool = await get_pool()
+    import uuid
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "AcademyUserProfile"
+            WHERE "userId" = $1 AND "tenantId" = $2
+        """, user_id, tenant_id)
+        
+        if not row:
+            # Create new profile
+            profile_id = str(uuid.uuid4())
+            await conn.execute("""
+                INSERT INTO "AcademyUserProfile" (
+                    id, "userId", "tenantId", "displayName", level,
+                    "totalPoints", "currentStreak", "preferences",
+                    "createdAt", "updatedAt"
+                ) VALUES ($1, $2, $3, '', 1, 0, 0, '{}', NOW(), NOW())
+            """, profile_id, user_id, tenant_id)
+            
+            return {
+                "id": profile_id,
+                "user_id": user_id,
+                "level": 1,
+                "total_points": 0,
+                "current_streak": 0,
+                "preferences": {},
+            }
+        
+        return {
+            "id": row["id"],
+            "user_id": row["userId"],
+            "display_name": row["displayName"],
+            "level": row["level"],
+            "total_points": row["totalPoints"],
+            "current_streak": row["currentStreak"],
+            "longest_streak": row["longestStreak"],
+            "preferences": row["preferences"] or {},
+            "last_active_at": row["lastActiveAt"].isoformat() if row["lastActiveAt"] else None,
+        }
+
+
+async def update_user_points(profile_id: str, points: int, source: str) -> dict:
+    """Add points to user and check for level up."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        # Get current profile
+        profile = await conn.fetchrow("""
+            SELECT * FROM "AcademyUserProfile" WHERE id = $1
+        """, profile_id)
+        
+        new_total = profile["totalPoints"] + points
+        
+        # Calculate level (simple formula: level = sqrt(points / 100) + 1)
+        import math
+        new_level = int(math.sqrt(new_total / 100)) + 1
+        leveled_up = new_level > profile["level"]
+        
+        await conn.execute("""
+            UPDATE "AcademyUserProfile" SET
+                "totalPoints" = $1,
+                level = $2,
+                "lastActiveAt" = NOW(),
+                "updatedAt" = NOW()
+            WHERE id = $3
+        """, new_total, new_level, profile_id)
+        
+        return {
+            "points_added": points,
+            "total_points": new_total,
+            "level": new_level,
+            "leveled_up": leveled_up,
+        }
+
+
+async def list_scenarios_for_location(location_id: str) -> List[dict]:
+    """List all scenarios for a location."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT id, title, description, difficulty, "estimatedMinutes",
+                   "maxPoints", "targetLevel", "createdAt"
+            FROM "AcademyScenario"
+            WHERE "locationId" = $1 AND "isActive" = true
+            ORDER BY "createdAt" DESC
+        """, location_id)
+        
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "description": row["description"],
+                "difficulty": row["difficulty"],
+                "estimated_minutes": row["estimatedMinutes"],
+                "max_points": row["maxPoints"],
+                "target_level": row["targetLevel"],
+                "created_at": row["createdAt"].isoformat(),
+            }
+            for row in rows
+        ]
+
+
+async def get_challenge_progress(profile_id: str, challenge_id: str) -> Optional[dict]:
+    """Get user's progress on a specific challenge (from their latest scenario attempt)."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT cp.*, c.title, c.description, c.points
+            FROM "ChallengeProgress" cp
+            JOIN "ScenarioAttempt" sa ON sa.id = cp."attemptId"
+            JOIN "AcademyChallenge" c ON cp."challengeId" = c.id
+            WHERE sa."profileId" = $1 AND cp."challengeId" = $2
+            ORDER BY sa."startedAt" DESC
+            LIMIT 1
+        """, profile_id, challenge_id)
+        
+        if not row:
+            return None
+        
+        return {
+            "id": row["id"],
+            "challenge_id": row["challengeId"],
+            "challenge_title": row["title"],
+            "status": row["status"],
+            "points_earned": row["pointsEarned"],
+            "attempts": row["attemptsCount"],
+            "time_spent_minutes": row["timeSpentMinutes"],
+            "started_at": row["startedAt"].isoformat() if row["startedAt"] else None,
+            "completed_at": row["completedAt"].isoformat() if row["completedAt"] else None,
+        }
+
+
+async def update_challenge_progress(
+    profile_id: str,
+    challenge_id: str,
+    status: str,  # not_started, in_progress, completed, failed
+    points_earned: int = 0,
+    time_spent_minutes: int = 0,
+) -> Optional[str]:
+    """
+    Update user's progress on a challenge.
+    
+    Progress is kept per scenario attempt, so this writes to the learner's
+    latest attempt at the challenge's scenario. Returns None if there is none.
+    """
+    pool = await get_pool()
+    import uuid
+    
+    async with pool.acquire() as conn, conn.transaction():
+        attempt_id = await conn.fetchval("""
+            SELECT sa.id
+            FROM "ScenarioAttempt" sa
+            JOIN "AcademyChallenge" ac ON ac."scenarioId" = sa."scenarioId"
+            WHERE sa."profileId" = $1 AND ac.id = $2
+            ORDER BY sa."startedAt" DESC
+            LIMIT 1
+        """, profile_id, challenge_id)
+        if not attempt_id:
+            logger.warning(f"No scenario attempt for profile {profile_id} and challenge {challenge_id}")
+            return None
+        
+        row = await conn.fetchrow("""
+            SELECT id, status, "pointsEarned" FROM "ChallengeProgress"
+            WHERE "attemptId" = $1 AND "challengeId" = $2
+        """, attempt_id, challenge_id)
+        
+        now = datetime.now(timezone.utc)
+        newly_completed = status == "completed" and (not row or row["status"] != "completed")
+        points_gained = max(0, points_earned - (row["pointsEarned"] or 0)) if row else points_earned
+        
+        if row:
+            await conn.execute("""
+                UPDATE "ChallengeProgress" SET
+                    status = $1,
+                    "pointsEarned" = GREATEST("pointsEarned", $2),
+                    "attemptsCount" = "attemptsCount" + 1,
+                    "timeSpentMinutes" = "timeSpentMinutes" + $3,
+                    "completedAt" = CASE WHEN $1 = 'completed' THEN $4 ELSE "completedAt" END
+                WHERE id = $5
+            """, status, points_earned, time_spent_minutes, now, row["id"])
+            progress_id = row["id"]
+        else:
+            progress_id = str(uuid.uuid4())
+            await conn.execute("""
+                INSERT INTO "ChallengeProgress" (
+                    id, "attemptId", "challengeId", status, "pointsEarned",
+                    "attemptsCount", "timeSpentMinutes", "startedAt", "completedAt"
+                ) VALUES ($1, $2, $3, $4, $5, 1, $6, $7, $8)
+            """, progress_id, attempt_id, challenge_id, status, points_earned,
+                time_spent_minutes, now, now if status == "completed" else None)
+        
+        await _record_challenge_stats(conn, profile_id, challenge_id, newly_completed, points_gained)
+        return progress_id
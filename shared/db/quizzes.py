@@ -0,0 +1,305 @@
+"""
+Quizzes
+=======
+Quizzes, attempts and answer history.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, List
+
+from .pool import get_pool, logger
+from .journey import _record_quiz_stats
+
+__all__ = [
+    "save_quiz",
+    "get_quiz",
+    "get_quizzes_for_scenario",
+    "save_quiz_attempt",
+    "get_quiz_attempts",
+    "get_quiz_attempt_details",
+    "get_user_quiz_stats",
+]
+
+
+# =============================================================================
+# QUIZZES
+# =============================================================================
+
+async def save_quiz(
+    scenario_id: str,
+    quiz_data: dict,
+    generated_by: str = "ai",
+) -> str:
+    """Save a quiz."""
+    pool = await get_pool()
+    
+    import uuid
+    quiz_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "Quiz" (
+                id, "scenarioId", title, description, "quizType",
+                "passingScore", "questionCount", "generatedBy",
+                "isActive", "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $10)
+        """,
+            quiz_id,
+            scenario_id,
+            quiz_data.get("title", "Quiz"),
+            quiz_data.get("description", ""),
+            "standard",
+            quiz_data.get("passing_score", 70),
+            len(quiz_data.get("questions", [])),
+            generated_by,
+            True,
+            datetime.now(timezone.utc),
+        )
+        
+        # Save questions
+        for idx, q in enumerate(quiz_data.get("questions", [])):
+            q_id = q.get("id", str(uuid.uuid4()))
+            await conn.execute("""
+                INSERT INTO "QuizQuestion" (
+                    id, "quizId", question, "questionType", options,
+                    explanation, difficulty, points, "awsServices",
+                    tags, "orderIndex", "createdAt", "updatedAt"
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $12)
+            """,
+                q_id,
+                quiz_id,
+                q.get("question", ""),
+                q.get("question_type", "multiple_choice"),
+                [
+                    {"id": o.get("id"), "text": o.get("text"), "isCorrect": o.get("is_correct")}
+                    for o in q.get("options", [])
+                ],
+                q.get("explanation", ""),
+                q.get("difficulty", "medium"),
+                q.get("points", 10),
+                q.get("aws_services", []),
+                q.get("tags", []),
+                idx,
+                datetime.now(timezone.utc),
+            )
+    
+    logger.info(f"Saved quiz {quiz_id} with {len(quiz_data.get('questions', []))} questions")
+    return quiz_id
+
+
+async def get_quiz(quiz_id: str) -> Optional[dict]:
+    """Get a quiz with all questions."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "Quiz" WHERE id = $1
+        """, quiz_id)
+        
+        if not row:
+            return None
+        
+        questions = await conn.fetch("""
+            SELECT * FROM "QuizQuestion" 
+            WHERE "quizId" = $1 
+            ORDER BY "orderIndex"
+        """, quiz_id)
+        
+        return {
+            "id": row["id"],
+            "scenario_id": row["scenarioId"],
+            "title": row["title"],
+            "description": row["description"],
+            "quiz_type": row["quizType"],
+            "passing_score": row["passingScore"],
+            "question_count": row["questionCount"],
+            "questions": [
+                {
+                    "id": q["id"],
+                    "question": q["question"],
+                    "question_type": q["questionType"],
+                    "options": q["options"] or [],
+                    "explanation": q["explanation"],
+                    "difficulty": q["difficulty"],
+                    "points": q["points"],
+                    "aws_services": q["awsServices"] or [],
+                    "tags": q["tags"] or [],
+                }
+                for q in questions
+            ],
+        }
+
+
+async def get_quizzes_for_scenario(scenario_id: str) -> List[dict]:
+    """Get all quizzes for a scenario."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT id, title, description, "questionCount", "passingScore", "createdAt"
+            FROM "Quiz" 
+            WHERE "scenarioId" = $1 AND "isActive" = true
+            ORDER BY "createdAt" DESC
+        """, scenario_id)
+        
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "description": row["description"],
+                "question_count": row["questionCount"],
+                "passing_score": row["passingScore"],
+                "created_at": row["createdAt"].isoformat(),
+            }
+            for row in rows
+        ]
+
+
+async def save_quiz_attempt(
+    profile_id: str,
+    quiz_id: str,
+    answers: List[dict],  # [{"question_id": str, "selected_options": [str], "free_text": str}]
+    score: int,
+    passed: bool,
+    time_spent_seconds: int,
+) -> str:
+    """Save a completed quiz attempt. Raises ValueError for an unknown quiz."""
+    pool = await get_pool()
+    import uuid
+    
+    attempt_id = str(uuid.uuid4())
+    
+    async with pool.acquire() as conn, conn.transaction():
+        # Get question count
+        quiz = await conn.fetchrow("""
+            SELECT "questionCount" FROM "Quiz" WHERE id = $1
+        """, quiz_id)
+        if not quiz:
+            raise ValueError(f"Quiz {quiz_id} not found")
+        
+        correct_count = len([a for a in answers if a.get("is_correct", False)])
+        points_earned = sum(a.get("points_earned", 0) for a in answers)
+        
+        await conn.execute("""
+            INSERT INTO "QuizAttempt" (
+                id, "profileId", "quizId", status, score, passed, "pointsEarned",
+                "questionsAnswered", "questionsCorrect", "totalQuestions", "timeSpentSeconds",
+                "completedAt", "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, 'completed', $4, $5, $6, $7, $8, $9, $10, NOW(), NOW(), NOW())
+        """, attempt_id, profile_id, quiz_id, score, passed, points_earned,
+            len(answers), correct_count, quiz["questionCount"], time_spent_seconds)
+        
+        # Save individual answers
+        for answer in answers:
+            answer_id = str(uuid.uuid4())
+            await conn.execute("""
+                INSERT INTO "QuizAnswer" (
+                    id, "attemptId", "questionId", "selectedOptions",
+                    "textAnswer", "isCorrect", "pointsAwarded", "answeredAt"
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
+            """, answer_id, attempt_id, answer["question_id"],
+                answer.get("selected_options", []),
+                answer.get("free_text"),
+                answer.get("is_correct", False),
+                answer.get("points_earned", 0))
+        
+        await _record_quiz_stats(conn, profile_id, answers, score, passed, time_spent_seconds)
+    
+    logger.info(f"Saved quiz attempt {attempt_id}: {score}% ({'passed' if passed else 'failed'})")
+    return attempt_id
+
+
+async def get_quiz_attempts(profile_id: str, quiz_id: str) -> List[dict]:
+    """Get all attempts for a quiz by a user."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        rows = await conn.fetch("""
+            SELECT * FROM "QuizAttempt"
+            WHERE "profileId" = $1 AND "quizId" = $2
+            ORDER BY "completedAt" DESC
+        """, profile_id, quiz_id)
+        
+        return [
+            {
+                "id": row["id"],
+                "score": row["score"],
+                "passed": row["passed"],
+                "questions_answered": row["questionsAnswered"],
+                "correct_answers": row["questionsCorrect"],
+                "time_spent_seconds": row["timeSpentSeconds"],
+                "completed_at": row["completedAt"].isoformat(),
+            }
+            for row in rows
+        ]
+
+
+async def get_quiz_attempt_details(attempt_id: str) -> Optional[dict]:
+    """Get detailed results of a quiz attempt."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        attempt = await conn.fetchrow("""
+            SELECT * FROM "QuizAttempt" WHERE id = $1
+        """, attempt_id)
+        
+        if not attempt:
+            return None
+        
+        answers = await conn.fetch("""
+            SELECT qa.*, qq.question, qq.explanation, qq.options
+            FROM "QuizAnswer" qa
+            JOIN "QuizQuestion" qq ON qa."questionId" = qq.id
+            WHERE qa."attemptId" = $1
+            ORDER BY qq."orderIndex"
+        """, attempt_id)
+        
+        return {
+            "id": attempt["id"],
+            "quiz_id": attempt["quizId"],
+            "score": attempt["score"],
+            "passed": attempt["passed"],
+            "questions_answered": attempt["questionsAnswered"],
+            "correct_answers": attempt["questionsCorrect"],
+            "time_spent_seconds": attempt["timeSpentSeconds"],
+            "completed_at": attempt["completedAt"].isoformat(),
+            "answers": [
+                {
+                    "question_id": a["questionId"],
+                    "question": a["question"],
+                    "selected_options": a["selectedOptions"] or [],
+                    "correct_options": [o["id"] for o in a["options"] if o.get("isCorrect")],
+                    "free_text_answer": a["textAnswer"],
+                    "is_correct": a["isCorrect"],
+                    "points_earned": a["pointsAwarded"],
+                    "explanation": a["explanation"],
+                }
+                for a in answers
+            ],
+        }
+
+
+async def get_user_quiz_stats(profile_id: str) -> dict:
+    """Get overall quiz statistics for a user."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        stats = await conn.fetchrow("""
+            SELECT 
+                COUNT(*) as total_attempts,
+                COUNT(CASE WHEN passed THEN 1 END) as passed_count,
+                AVG(score) as avg_score,
+                SUM("timeSpentSeconds") as total_time,
+                MAX(score) as best_score
+            FROM "QuizAttempt"
+            WHERE "profileId" = $1
+        """, profile_id)
+        
+        return {
+            "total_attempts": stats["total_attempts"] or 0,
+            "passed_count": stats["passed_count"] or 0,
+            "pass_rate": (stats["passed_count"] / stats["total_attempts"] * 100) if stats["total_attempts"] else 0,
+            "avg_score": float(stats["avg_score"]) if stats["avg_score"] else 0,
+            "total_time_minutes": (stats["total_time"] or 0) // 60,
+            "best_score": stats["best_score"] or 0,
+        }
@@ -0,0 +1,143 @@
+"""
+Scenarios
+=========
+Generated scenarios and their challenges.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from .pool import get_pool, logger
+
+__all__ = [
+    "save_scenario",
+    "get_scenario",
+]
+
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+
+async def save_scenario(
+    location_id: str,
+    scenario_data: dict,
+    company_info: Optional[dict] = None,
+    generated_by: str = "learning_agent",
+) -> str:
+    """Save a generated scenario to the database."""
+    pool = await get_pool()
+    
+    scenario_id = scenario_data.get("id")
+    
+    async with pool.acquire() as conn:
+        await conn.execute("""
+            INSERT INTO "AcademyScenario" (
+                id, "locationId", title, description, "businessContext",
+                difficulty, "technicalRequirements", "complianceRequirements",
+                constraints, "learningObjectives", tags, "estimatedMinutes",
+                "maxPoints", "targetLevel", "companyInfo", "generatedBy",
+                "isActive", "createdAt", "updatedAt"
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $18)
+            ON CONFLICT (id) DO UPDATE SET
+                title = EXCLUDED.title,
+                description = EXCLUDED.description,
+                "updatedAt" = NOW()
+        """,
+            scenario_id,
+            location_id,
+            scenario_data.get("scenario_title", ""),
+            scenario_data.get("scenario_description", ""),
+            scenario_data.get("business_context", ""),
+            scenario_data.get("difficulty", "intermediate"),
+            scenario_data.get("technical_requirements", []),
+            scenario_data.get("compliance_requirements", []),
+            scenario_data.get("constraints", []),
+            scenario_data.get("learning_objectives", []),
+            scenario_data.get("tags", []),
+            scenario_data.get("estimated_total_time_minutes", 60),
+            sum(c.get("points", 100) for c in scenario_data.get("challenges", [])),
+            scenario_data.get("difficulty", "intermediate"),
+            company_info or None,
+            generated_by,
+            True,
+            datetime.now(timezone.utc),
+        )
+        
+        # Save challenges
+        for idx, challenge in enumerate(scenario_data.get("challenges", [])):
+            await conn.execute("""
+                INSERT INTO "AcademyChallenge" (
+                    id, "scenarioId", title, description, difficulty,
+                    "orderIndex", points, "bonusPoints", hints,
+                    "successCriteria", "awsServices", "estimatedMinutes",
+                    "createdAt", "updatedAt"
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $13)
+                ON CONFLICT (id) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    "updatedAt" = NOW()
+            """,
+                challenge.get("id"),
+                scenario_id,
+                challenge.get("title", ""),
+                challenge.get("description", ""),
+                challenge.get("difficulty", "intermediate"),
+                idx,
+                challenge.get("points", 100),
+                0,
+                challenge.get("hints", []),
+                challenge.get("success_criteria", []),
+                challenge.get("aws_services_relevant", []),
+                challenge.get("estimated_time_minutes", 15),
+                datetime.now(timezone.utc),
+            )
+    
+    logger.info(f"Saved scenario {scenario_id} with {len(scenario_data.get('challenges', []))} challenges")
+    return scenario_id
+
+
+async def get_scenario(scenario_id: str) -> Optional[dict]:
+    """Get a scenario by ID."""
+    pool = await get_pool()
+    
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow("""
+            SELECT * FROM "AcademyScenario" WHERE id = $1
+        """, scenario_id)
+        
+        if not row:
+            return None
+        
+        # Get challenges
+        challenges = await conn.fetch("""
+            SELECT * FROM "AcademyChallenge" 
+            WHERE "scenarioId" = $1 
+            ORDER BY "orderIndex"
+        """, scenario_id)
+        
+        return {
+            "id": row["id"],
+            "scenario_title": row["title"],
+            "scenario_description": row["description"],
+            "business_context": row["businessContext"],
+            "difficulty": row["difficulty"],
+            "technical_requirements": row["technicalRequirements"] or [],
+            "compliance_requirements": row["complianceRequirements"] or [],
+            "constraints": row["constraints"] or [],
+            "learning_objectives": row["learningObjectives"] or [],
+            "tags": row["tags"] or [],
+            "company_info": row["companyInfo"],
+            "challenges": [
+                {
+                    "id": c["id"],
+                    "title": c["title"],
+                    "description": c["description"],
+                    "difficulty": c["difficulty"],
+                    "points": c["points"],
+                    "hints": c["hints"] or [],
+                    "success_criteria": c["successCriteria"] or [],
+                    "aws_services_relevant": c["awsServices"] or [],
+                }
+                for c in challenges
+            ],
+        }
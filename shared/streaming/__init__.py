@@ -0,0 +1,23 @@
+"""
+Streaming Helpers
+=================
+Incremental JSON parsing and server-sent events, shared by the AWS Drawing
+Agent (streamed diagrams) and the Learning Agent (streamed generators).
+
+A model asked for {"cards": [...], ...} streams its answer token by token;
+StreamingArrayParser hands back each card as soon as it is complete, and
+sse() frames it for the client. Pure Python, no service dependencies.
+
+    parser = StreamingArrayParser(("cards",))
+    for key, item in parser.feed(delta):
+        yield sse({"type": "item", "key": key, "item": item})
+"""
+
+from .parser import StreamingArrayParser
+from .sse import SSE_HEADERS, sse
+
+__all__ = [
+    "StreamingArrayParser",
+    "SSE_HEADERS",
+    "sse",
+]
@@ -0,0 +1,99 @@
+"""
+Incremental parsing of a streamed JSON object's top-level arrays.
+"""
+
+import json
+import logging
+from typing import Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingArrayParser:
+    """
+    Incrementally extracts the items of top-level arrays in a streamed JSON
+    object.
+
+    feed() returns (key, item) pairs for every item completed by the chunk,
+    and (key, None) when the array under `key` closes. Items may be objects,
+    arrays, strings or other scalars. Only the item being received is
+    buffered, so each character is processed once.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = frozenset(keys)
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key_chars: List[str] = []
+        self._key: Optional[str] = None
+        self._in_array = False
+        self._item: Optional[List[str]] = None
+        self._scalar = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Optional[Any]]]:
+        events: List[Tuple[str, Optional[Any]]] = []
+        for ch in chunk:
+            item = self._item
+
+            if self._in_string:
+                if item is not None:
+                    item.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if item is not None and self._depth == 2:
+                        self._emit(events)
+                elif self._depth == 1:
+                    self._key_chars.append(ch)
+                continue
+
+            if self._scalar:
+                # numbers / true / false / null end at the next separator
+                if ch != "," and ch != "]" and not ch.isspace():
+                    item.append(ch)
+                    continue
+                self._emit(events)
+                item = None
+            elif item is not None:
+                item.append(ch)
+
+            # top-level object is depth 1, the array 2, its items 3
+            starts_item = item is None and self._in_array and self._depth == 2
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._key_chars = []
+                elif starts_item:
+                    self._item = ['"']
+            elif ch == ":" and self._depth == 1:
+                self._key = "".join(self._key_chars)
+            elif ch == "{" or ch == "[":
+                if starts_item:
+                    self._item = [ch]
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._key in self.keys:
+                    self._in_array = True
+            elif ch == "}" or ch == "]":
+                self._depth -= 1
+                if self._depth == 2 and item is not None:
+                    self._emit(events)
+                elif self._depth == 1 and self._in_array:
+                    self._in_array = False
+                    events.append((self._key, None))
+            elif starts_item and ch != "," and not ch.isspace():
+                self._item = [ch]
+                self._scalar = True
+        return events
+
+    def _emit(self, events: List[Tuple[str, Optional[Any]]]) -> None:
+        text = "".join(self._item)
+        self._item = None
+        self._scalar = False
+        try:
+            events.append((self._key, json.loads(text)))
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping unparseable streamed item under '{self._key}': {e}")
@@ -0,0 +1,18 @@
+"""
+Server-sent events framing.
+"""
+
+import json
+from typing import Any, Dict
+
+# No caching, and no proxy buffering (nginx holds the whole response otherwise)
+SSE_HEADERS: Dict[str, str] = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse(event: Dict[str, Any]) -> str:
+    """Format an event as a server-sent events frame."""
+    return f"data: {json.dumps(event)}\n\n"
@@ -0,0 +1,32 @@
+"""
+Diagram Validation Engine
+=========================
+Rule engine shared by the AWS Drawing Agent (/diagrams/validate, portfolio
+enhancement) and the Learning Agent (diagram audit).
+
+A diagram is parsed once into an indexed DiagramGraph (containment,
+adjacency, service buckets); a declarative rule set then runs against that
+graph with per-rule timing. Pure Python, no service dependencies.
+
+    report = validate_diagram(react_flow_diagram)
+    report.to_dict()  # {"valid", "warnings", "suggestions", "findings", "stats"}
+"""
+
+from .graph import DiagramGraph, canonical_service
+from .rules import DEFAULT_RULES, Finding, Rule, RuleContext, ServiceSpec, rule
+from .engine import ValidationEngine, ValidationReport, default_engine, validate_diagram
+
+__all__ = [
+    "DiagramGraph",
+    "canonical_service",
+    "DEFAULT_RULES",
+    "Finding",
+    "Rule",
+    "RuleContext",
+    "ServiceSpec",
+    "rule",
+    "ValidationEngine",
+    "ValidationReport",
+    "default_engine",
+    "validate_diagram",
+]
@@ -0,0 +1,123 @@
+"""
+Validation Engine
+=================
+Parses a diagram once into a DiagramGraph and evaluates a rule set against
+it, timing every rule.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Union
+
+from .graph import DiagramGraph
+from .rules import DEFAULT_RULES, Finding, Rule, RuleContext
+
+BLOCKING = ("error", "warning")
+
+
+@dataclass
+class ValidationReport:
+    findings: List[Finding] = field(default_factory=list)
+    rule_timings_ms: Dict[str, float] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    parse_ms: float = 0.0
+    node_count: int = 0
+    edge_count: int = 0
+
+    @property
+    def warnings(self) -> List[str]:
+        return [f.message for f in self.findings if f.severity in BLOCKING]
+
+    @property
+    def suggestions(self) -> List[str]:
+        return [f.message for f in self.findings if f.severity == "suggestion"]
+
+    @property
+    def valid(self) -> bool:
+        return not any(f.severity in BLOCKING for f in self.findings)
+
+    @property
+    def has_errors(self) -> bool:
+        return any(f.severity == "error" for f in self.findings)
+
+    def placement_issues(self, graph: DiagramGraph) -> List[Dict]:
+        """Placement findings in the audit response shape (one per node)."""
+        return [
+            {
+                "node_id": node_id,
+                "service_id": graph.service.get(node_id) or "",
+                "issue": f.message,
+                "suggestion": f.suggestion,
+                "severity": "warning" if f.severity == "suggestion" else f.severity,
+            }
+            for f in self.findings if f.kind == "placement"
+            for node_id in f.node_ids
+        ]
+
+    def connection_issues(self) -> List[Dict]:
+        """Connection findings in the audit response shape."""
+        return [
+            {
+                "source_id": f.node_ids[0],
+                "target_id": f.node_ids[1],
+                "issue": f.message,
+                "suggestion": f.suggestion,
+                "severity": "warning" if f.severity == "suggestion" else f.severity,
+            }
+            for f in self.findings if f.kind == "connection" and len(f.node_ids) == 2
+        ]
+
+    def to_dict(self) -> Dict:
+        """Legacy validator shape plus structured findings and timings."""
+        return {
+            "valid": self.valid,
+            "warnings": self.warnings,
+            "suggestions": self.suggestions,
+            "findings": [f.to_dict() for f in self.findings],
+            "stats": {
+                "nodes": self.node_count,
+                "edges": self.edge_count,
+                "parse_ms": round(self.parse_ms, 3),
+                "rule_timings_ms": {k: round(v, 3) for k, v in self.rule_timings_ms.items()},
+                "skipped_rules": self.skipped,
+            },
+        }
+
+
+class ValidationEngine:
+    """Evaluates a rule set against a diagram parsed once into an indexed graph."""
+
+    def __init__(self, rules: Optional[Iterable[Rule]] = None):
+        self.rules: List[Rule] = list(DEFAULT_RULES if rules is None else rules)
+
+    def parse(self, diagram: Dict) -> DiagramGraph:
+        return DiagramGraph.from_react_flow(diagram)
+
+    def validate(
+        self,
+        diagram: Union[Dict, DiagramGraph],
+        context: Optional[RuleContext] = None,
+    ) -> ValidationReport:
+        report = ValidationReport()
+        start = time.perf_counter()
+        graph = diagram if isinstance(diagram, DiagramGraph) else self.parse(diagram)
+        report.parse_ms = (time.perf_counter() - start) * 1000
+        report.node_count = len(graph)
+        report.edge_count = len(graph.edges)
+        context = context or RuleContext()
+
+        for rule in self.rules:
+            if not rule.applies(graph, context):
+                report.skipped.append(rule.id)
+                continue
+            start = time.perf_counter()
+            report.findings.extend(rule.check(graph, context))
+            report.rule_timings_ms[rule.id] = (time.perf_counter() - start) * 1000
+        return report
+
+
+default_engine = ValidationEngine()
+
+
+def validate_diagram(diagram: Union[Dict, DiagramGraph], context: Optional[RuleContext] = None) -> ValidationReport:
+    return default_engine.validate(diagram, context)
@@ -0,0 +1,212 @@
+"""
+Indexed Diagram Graph
+=====================
+Parses a diagram once into the indexes every validation rule needs, so rules
+never rescan the node list:
+
+- nodes by id, with each node's canonical service id ("subnet-public",
+  "availability-zone", ...) and label
+- parent/child containment, with memoized ancestor chains
+- directed and undirected adjacency lists
+- service-type buckets (service id -> node ids)
+
+Accepts React Flow diagrams (data.service_id / data.serviceId, parentId /
+parentNode, edges with source/target, layout-engine "group" nodes) and the
+Learning Agent audit format (node type is the service id, parent_id,
+connections with from/to).
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Node types that say nothing about the AWS service a node represents
+GENERIC_TYPES = frozenset({
+    "awsService", "awsResource", "group", "label", "default", "service",
+    "input", "output", "text", "note", "custom",
+})
+
+# Client spellings -> canonical ids (see normalizeServiceId in aws-placement-rules.ts)
+SERVICE_ALIASES: Dict[str, str] = {
+    "availabilityZone": "availability-zone",
+    "awsCloud": "aws-cloud",
+    "securityGroup": "security-group",
+    "autoScaling": "auto-scaling",
+    "public-subnet": "subnet-public",
+    "private-subnet": "subnet-private",
+    "publicSubnet": "subnet-public",
+    "privateSubnet": "subnet-private",
+}
+
+CONTAINER_SERVICES = frozenset({
+    "aws-cloud", "region", "availability-zone", "vpc",
+    "subnet", "subnet-public", "subnet-private",
+})
+SUBNET_SERVICES = frozenset({"subnet", "subnet-public", "subnet-private"})
+
+ROOT = "canvas"  # parent kind of top-level nodes
+
+
+def canonical_service(service_id: Optional[str]) -> Optional[str]:
+    if not service_id:
+        return None
+    return SERVICE_ALIASES.get(service_id, service_id)
+
+
+def _node_service(node: Dict) -> Optional[str]:
+    data = node.get("data") or {}
+    service_id = data.get("service_id") or data.get("serviceId")
+    node_type = node.get("type") or ""
+    if not service_id and node_type not in GENERIC_TYPES:
+        service_id = node_type
+    if not service_id and node_type == "group":
+        # Containers emitted by the layout engine / frontend template
+        if data.get("isVPC"):
+            service_id = "vpc"
+        elif data.get("isPublic"):
+            service_id = "subnet-public"
+        elif data.get("isPrivate"):
+            service_id = "subnet-private"
+        elif node.get("id") in SERVICE_ALIASES or node.get("id") in CONTAINER_SERVICES:
+            service_id = node["id"]
+    service_id = canonical_service(service_id)
+    if service_id == "subnet" and data.get("subnetType") in ("public", "private"):
+        service_id = f"subnet-{data['subnetType']}"
+    return service_id
+
+
+class DiagramGraph:
+    """Read-only, indexed view of one diagram."""
+
+    def __init__(self):
+        self.nodes: Dict[str, Dict] = {}
+        self.service: Dict[str, Optional[str]] = {}
+        self.label: Dict[str, str] = {}
+        self.parent: Dict[str, Optional[str]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.by_service: Dict[str, List[str]] = {}
+        self.out_edges: Dict[str, List[str]] = {}
+        self.in_edges: Dict[str, List[str]] = {}
+        self.edges: List[Tuple[str, str]] = []
+        self._ancestors: Dict[str, Tuple[str, ...]] = {}
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_react_flow(cls, diagram: Dict) -> "DiagramGraph":
+        graph = cls()
+        for node in diagram.get("nodes", []) or []:
+            parent = node.get("parentId") or node.get("parentNode") or node.get("parent_id")
+            graph._add_node(node, parent)
+        for edge in diagram.get("edges", []) or []:
+            graph._add_edge(edge.get("source") or edge.get("from"), edge.get("target") or edge.get("to"))
+        graph._link()
+        return graph
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Dict], connections: Iterable[Dict]) -> "DiagramGraph":
+        """Learning Agent format: {id, type, label, parent_id} nodes, {from, to} connections."""
+        graph = cls()
+        for node in nodes:
+            graph._add_node(node, node.get("parent_id") or node.get("parentId"))
+        for conn in connections:
+            graph._add_edge(conn.get("from") or conn.get("source"), conn.get("to") or conn.get("target"))
+        graph._link()
+        return graph
+
+    def _add_node(self, node: Dict, parent: Optional[str]) -> None:
+        node_id = node.get("id")
+        if not node_id:
+            return
+        data = node.get("data") or {}
+        service_id = _node_service(node)
+        self.nodes[node_id] = node
+        self.service[node_id] = service_id
+        self.label[node_id] = str(node.get("label") or data.get("label") or service_id or node_id)
+        self.parent[node_id] = parent
+        self.out_edges[node_id] = []
+        self.in_edges[node_id] = []
+        if service_id:
+            self.by_service.setdefault(service_id, []).append(node_id)
+
+    def _add_edge(self, source: Optional[str], target: Optional[str]) -> None:
+        if source and target:
+            self.edges.append((source, target))
+
+    def _link(self) -> None:
+        # Drop parents/edges that point at unknown nodes
+        for node_id, parent in self.parent.items():
+            if parent not in self.nodes:
+                self.parent[node_id] = None
+            else:
+                self.children.setdefault(parent, []).append(node_id)
+        self.edges = [(s, t) for s, t in self.edges if s in self.nodes and t in self.nodes]
+        for source, target in self.edges:
+            self.out_edges[source].append(target)
+            self.in_edges[target].append(source)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def services(self) -> FrozenSet[str]:
+        return frozenset(self.by_service)
+
+    @property
+    def has_containment(self) -> bool:
+        return bool(self.children)
+
+    def has(self, *service_ids: str) -> bool:
+        """True if any of the given services is on the diagram."""
+        return any(service_id in self.by_service for service_id in service_ids)
+
+    def nodes_of(self, *service_ids: str) -> List[str]:
+        found: List[str] = []
+        for service_id in service_ids:
+            found.extend(self.by_service.get(service_id, ()))
+        return found
+
+    def ancestors(self, node_id: str) -> Tuple[str, ...]:
+        """Containers enclosing a node, innermost first (cycle safe)."""
+        cached = self._ancestors.get(node_id)
+        if cached is not None:
+            return cached
+        chain: List[str] = []
+        seen: Set[str] = {node_id}
+        current = self.parent.get(node_id)
+        while current and current not in seen:
+            if current in self._ancestors:
+                chain.append(current)
+                chain.extend(a for a in self._ancestors[current] if a not in seen)
+                break
+            chain.append(current)
+            seen.add(current)
+            current = self.parent.get(current)
+        result = tuple(chain)
+        self._ancestors[node_id] = result
+        return result
+
+    def parent_kind(self, node_id: str) -> str:
+        """Canonical service id of the direct container, or "canvas"."""
+        parent = self.parent.get(node_id)
+        if not parent:
+            return ROOT
+        return self.service.get(parent) or self.nodes[parent].get("type") or ROOT
+
+    def enclosing(self, node_id: str, *service_ids: str) -> Optional[str]:
+        """Nearest ancestor whose service is one of `service_ids`."""
+        for ancestor in self.ancestors(node_id):
+            if self.service.get(ancestor) in service_ids:
+                return ancestor
+        return None
+
+    def neighbors(self, node_id: str) -> List[str]:
+        return self.out_edges.get(node_id, []) + self.in_edges.get(node_id, [])
+
+    def connected(self, node_id: str, *service_ids: str) -> bool:
+        """True if the node has an edge (either direction) to one of the services."""
+        return any(self.service.get(other) in service_ids for other in self.neighbors(node_id))
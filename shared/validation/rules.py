@@ -0,0 +1,333 @@
+"""
+Validation Rules
+================
+Declarative rule set evaluated against a shared DiagramGraph.
+
+A rule is a check function plus metadata: the service ids that trigger it
+(the engine skips rules whose trigger services are absent without calling
+them) and whether it needs the per-request service catalogue. Rules only
+read the graph's indexes; none of them walks the raw node list.
+
+Severities follow the audit golden rule (aws-placement-rules.ts):
+- error: hard placement violation, the only thing that can fail a diagram
+- warning: architectural problem worth fixing
+- suggestion: best-practice improvement
+- note: diagram abstraction nuance, informational only
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .graph import CONTAINER_SERVICES, ROOT, SUBNET_SERVICES, DiagramGraph, canonical_service
+
+SEVERITIES = ("error", "warning", "suggestion", "note")
+
+VPC_RESOURCES = (
+    "ec2", "rds", "aurora", "elasticache", "redshift", "neptune", "documentdb", "memorydb",
+    "alb", "nlb", "elb", "nat-gateway", "ecs", "eks", "efs", "bastion",
+)
+DATABASES = ("rds", "aurora", "elasticache", "redshift", "neptune", "documentdb", "memorydb")
+COMPUTE = ("ec2", "ecs", "eks", "fargate", "auto-scaling")
+LOAD_BALANCERS = ("alb", "nlb", "elb")
+
+# Wording kept from the original validator for the common cases
+VPC_MESSAGES = {
+    "ec2": "EC2 instances should be in a VPC",
+    "rds": "RDS should be in a VPC",
+}
+
+
+@dataclass
+class Finding:
+    """One issue reported by a rule."""
+    rule: str
+    severity: str
+    message: str
+    suggestion: str = ""
+    node_ids: Tuple[str, ...] = ()
+    kind: str = "architecture"  # "placement" | "connection" | "architecture"
+
+    def to_dict(self) -> Dict:
+        return {
+            "rule": self.rule,
+            "severity": self.severity,
+            "kind": self.kind,
+            "message": self.message,
+            "suggestion": self.suggestion,
+            "node_ids": list(self.node_ids),
+        }
+
+
+@dataclass(frozen=True)
+class ServiceSpec:
+    """Placement/connection constraints for one service (from aws-placement-rules.ts)."""
+    id: str
+    name: str
+    scope: str = "regional"
+    is_vpc_resource: bool = False
+    is_container: bool = False
+    must_be_inside: FrozenSet[str] = frozenset()
+    can_connect_to: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class RuleContext:
+    """Per-request inputs for catalogue-driven rules."""
+    catalog: Dict[str, ServiceSpec] = field(default_factory=dict)
+    edge_index: Dict[str, Set[str]] = field(default_factory=dict)  # source -> valid targets
+
+    @classmethod
+    def from_available_services(
+        cls,
+        services: Iterable[Dict],
+        edge_types: Optional[Iterable[Dict]] = None,
+    ) -> "RuleContext":
+        """Build from the audit request's available_services / edge_types payloads."""
+        catalog: Dict[str, ServiceSpec] = {}
+        for service in services:
+            service_id = canonical_service(service.get("id"))
+            if not service_id:
+                continue
+            catalog[service_id] = ServiceSpec(
+                id=service_id,
+                name=service.get("name") or service_id,
+                scope=service.get("scope") or "regional",
+                is_vpc_resource=bool(service.get("is_vpc_resource")),
+                is_container=bool(service.get("is_container")),
+                must_be_inside=frozenset(canonical_service(p) for p in service.get("must_be_inside") or ()),
+                can_connect_to=frozenset(canonical_service(t) for t in service.get("can_connect_to") or ()),
+            )
+        edge_index: Dict[str, Set[str]] = {}
+        for edge_type in edge_types or ():
+            sources = edge_type.get("valid_sources") or edge_type.get("validSources") or ()
+            targets = {canonical_service(t) for t in edge_type.get("valid_targets") or edge_type.get("validTargets") or ()}
+            for source in sources:
+                edge_index.setdefault(canonical_service(source), set()).update(targets)
+        return cls(catalog=catalog, edge_index=edge_index)
+
+
+CheckFn = Callable[[DiagramGraph, RuleContext], Iterable[Finding]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: str
+    description: str
+    check: CheckFn
+    requires: FrozenSet[str] = frozenset()  # run only if one of these services is present
+    needs_catalog: bool = False
+
+    def applies(self, graph: DiagramGraph, context: RuleContext) -> bool:
+        if self.needs_catalog and not context.catalog:
+            return False
+        return not self.requires or graph.has(*self.requires)
+
+
+DEFAULT_RULES: List[Rule] = []
+
+
+def rule(rule_id: str, description: str, requires: Iterable[str] = (), needs_catalog: bool = False):
+    """Register a check function in DEFAULT_RULES."""
+    def register(check: CheckFn) -> CheckFn:
+        DEFAULT_RULES.append(Rule(rule_id, description, check, frozenset(requires), needs_catalog))
+        return check
+    return register
+
+
+def _names(graph: DiagramGraph, node_ids: Iterable[str]) -> str:
+    return ", ".join(sorted({graph.label[n] for n in node_ids}))
+
+
+# =============================================================================
+# Architecture rules (always on)
+# =============================================================================
+
+@rule("vpc-placement", "VPC resources must live inside a VPC", requires=VPC_RESOURCES)
+def check_vpc_placement(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    if not graph.has("vpc"):
+        for service_id in VPC_RESOURCES:
+            node_ids = graph.by_service.get(service_id)
+            if node_ids:
+                message = VPC_MESSAGES.get(service_id, f"{graph.label[node_ids[0]]} should be in a VPC")
+                yield Finding("vpc-placement", "warning", message, "Add a VPC with subnets and place it inside",
+                              tuple(node_ids), "placement")
+        return
+    if not graph.has_containment:
+        return  # Flat diagram: nothing says where things sit
+    outside = [n for n in graph.nodes_of(*VPC_RESOURCES) if not graph.enclosing(n, "vpc")]
+    if outside:
+        yield Finding("vpc-placement", "warning", f"Outside the VPC: {_names(graph, outside)}",
+                      "Move VPC resources into a subnet of the VPC", tuple(outside), "placement")
+
+
+@rule("private-data-tier", "Databases belong in private subnets", requires=DATABASES)
+def check_private_data_tier(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    for node_id in graph.nodes_of(*DATABASES):
+        if graph.service[node_id] in context.catalog and graph.parent_kind(node_id) == "subnet-public":
+            continue  # Reported by catalog-placement
+        subnet = graph.enclosing(node_id, *SUBNET_SERVICES)
+        if subnet and graph.service[subnet] == "subnet-public":
+            yield Finding("private-data-tier", "error", f"{graph.label[node_id]} is in a public subnet",
+                          "Databases should be in private subnets", (node_id,), "placement")
+
+
+@rule("load-balancing", "Compute should sit behind a load balancer", requires=COMPUTE + LOAD_BALANCERS)
+def check_load_balancing(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    if graph.has("ec2") and not graph.has(*LOAD_BALANCERS):
+        yield Finding("load-balancing", "suggestion", "Consider adding a load balancer for high availability",
+                      node_ids=tuple(graph.by_service["ec2"]))
+    if graph.edges:
+        idle = [n for n in graph.nodes_of(*LOAD_BALANCERS) if not graph.connected(n, *COMPUTE)]
+        if idle and graph.has(*COMPUTE):
+            yield Finding("load-balancing", "suggestion", f"{_names(graph, idle)} has no compute targets",
+                          "Connect the load balancer to the instances or tasks it serves", tuple(idle))
+
+
+@rule("multi-az", "Databases and compute should span Availability Zones", requires=DATABASES + ("ec2",))
+def check_multi_az(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    # Only judge spread when the diagram actually models zones (AZs or several subnets)
+    zoned = graph.has("availability-zone") or len(graph.nodes_of(*SUBNET_SERVICES)) > 1
+    if graph.has("rds") and not zoned:
+        yield Finding("multi-az", "suggestion", "Consider using Multi-AZ for RDS in production",
+                      node_ids=tuple(graph.by_service["rds"]))
+    if not zoned:
+        return
+    for group, label in ((DATABASES, "database"), (("ec2",), "EC2")):
+        node_ids = graph.nodes_of(*group)
+        if not node_ids:
+            continue
+        zones = {graph.enclosing(n, "availability-zone") or graph.enclosing(n, *SUBNET_SERVICES) for n in node_ids}
+        if len(zones) < 2:
+            yield Finding("multi-az", "suggestion",
+                          f"Every {label} node is in a single Availability Zone",
+                          "Spread it across at least two AZs for resilience", tuple(node_ids))
+
+
+@rule("nat-gateway-ha", "One NAT Gateway per AZ for private subnets", requires=("nat-gateway",))
+def check_nat_gateway_ha(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    zones = graph.by_service.get("availability-zone", [])
+    nats = graph.by_service["nat-gateway"]
+    if len(zones) > 1 and len(nats) < len(zones):
+        yield Finding("nat-gateway-ha", "suggestion",
+                      f"{len(nats)} NAT Gateway(s) for {len(zones)} Availability Zones",
+                      "A NAT Gateway per AZ avoids a cross-AZ single point of failure", tuple(nats))
+
+
+@rule("lambda-vpc-access", "Lambda reaching VPC databases must be VPC-attached", requires=("lambda",))
+def check_lambda_vpc_access(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    if not graph.has(*DATABASES):
+        return
+    if not graph.edges:
+        if graph.has("rds"):
+            yield Finding("lambda-vpc-access", "suggestion", "Lambda accessing RDS should be in a VPC",
+                          node_ids=tuple(graph.by_service["lambda"]))
+        return
+    detached = [
+        n for n in graph.by_service["lambda"]
+        if graph.connected(n, *DATABASES) and not graph.enclosing(n, "vpc")
+    ]
+    if detached:
+        yield Finding("lambda-vpc-access", "suggestion", "Lambda accessing RDS should be in a VPC",
+                      "Attach the function to the VPC's private subnets", tuple(detached))
+
+
+@rule("iam-roles", "Instances should use IAM roles for AWS API access", requires=("ec2",))
+def check_iam_roles(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    if not graph.has("s3"):
+        return
+    ec2 = graph.by_service["ec2"]
+    if graph.edges:
+        ec2 = [n for n in ec2 if graph.connected(n, "s3")]
+    if ec2:
+        yield Finding("iam-roles", "suggestion", "Consider using IAM roles instead of access keys",
+                      node_ids=tuple(ec2))
+
+
+@rule("unconnected-services", "Services should take part in at least one flow")
+def check_unconnected(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    if not graph.edges:
+        return
+    lonely = [
+        n for n, service_id in graph.service.items()
+        if service_id and service_id not in CONTAINER_SERVICES
+        and not graph.children.get(n) and not graph.out_edges[n] and not graph.in_edges[n]
+    ]
+    if lonely:
+        yield Finding("unconnected-services", "note", f"Not connected to anything: {_names(graph, lonely)}",
+                      "Show how these services interact with the rest of the architecture", tuple(lonely))
+
+
+# =============================================================================
+# Catalogue rules (need the per-request service catalogue)
+# =============================================================================
+
+def _placement_severity(spec: ServiceSpec, parent_kind: str) -> str:
+    """Mirror of classifyPlacementSeverity in aws-placement-rules.ts."""
+    in_network = parent_kind == "vpc" or parent_kind in SUBNET_SERVICES
+    if spec.scope in ("global", "edge") and in_network:
+        return "error"
+    if spec.scope == "regional" and not spec.is_vpc_resource and parent_kind in SUBNET_SERVICES:
+        return "error"
+    if parent_kind == "security-group":
+        return "error"
+    if spec.id in DATABASES and parent_kind == "subnet-public":
+        return "error"
+    return "warning"
+
+
+@rule("catalog-placement", "Services sit in a container they are allowed in", needs_catalog=True)
+def check_catalog_placement(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    for node_id, service_id in graph.service.items():
+        spec = context.catalog.get(service_id)
+        parent_kind = graph.parent_kind(node_id)
+        if not spec or parent_kind == ROOT or parent_kind in spec.must_be_inside:
+            continue
+        if not spec.is_vpc_resource and spec.scope in ("global", "edge", "regional"):
+            scope = {"global": "Global", "edge": "Edge"}.get(spec.scope, "Regional")
+            issue = f"{spec.name} is a {scope} service that exists outside VPCs"
+        else:
+            issue = f"{spec.name} is not listed as valid inside {parent_kind}"
+        allowed = ", ".join(sorted(spec.must_be_inside)) or "the canvas"
+        yield Finding("catalog-placement", _placement_severity(spec, parent_kind), issue,
+                      f"Move {spec.name} to: {allowed}", (node_id,), "placement")
+
+
+_NETWORK_CONTAINERS = frozenset({"vpc", "subnet-public", "subnet-private", "region", "availability-zone", "aws-cloud"})
+
+
+def _connection_severity(source: str, target: str) -> str:
+    """Mirror of classifyConnectionSeverity in aws-placement-rules.ts."""
+    if source == "internet-gateway" and target in ("alb", "nlb"):
+        return "note"
+    if source == target and source in ("rds", "aurora"):
+        return "note"
+    if "cloudwatch" in (source, target):
+        return "note"
+    if target in _NETWORK_CONTAINERS and source not in _NETWORK_CONTAINERS:
+        return "warning" if (source, target) == ("internet-gateway", "vpc") else "error"
+    if source in _NETWORK_CONTAINERS and target not in _NETWORK_CONTAINERS:
+        return "error"
+    return "warning"
+
+
+@rule("catalog-connections", "Connections follow a known AWS relationship", needs_catalog=True)
+def check_catalog_connections(graph: DiagramGraph, context: RuleContext) -> Iterator[Finding]:
+    for source_id, target_id in graph.edges:
+        source, target = graph.service[source_id], graph.service[target_id]
+        if not source or not target:
+            continue
+        if context.edge_index:
+            if target in context.edge_index.get(source, ()):
+                continue
+            if source in context.edge_index.get(target, ()):
+                issue = f"Connection direction is reversed: {target} -> {source}"
+            else:
+                issue = f"No known relationship between {source} and {target}"
+        else:
+            spec = context.catalog.get(source)
+            if not spec or not spec.can_connect_to or target in spec.can_connect_to:
+                continue
+            issue = f"{spec.name} typically doesn't connect directly to {target}"
+        yield Finding("catalog-connections", _connection_severity(source, target), issue,
+                      "Review AWS documentation for valid integration patterns",
+                      (source_id, target_id), "connection")